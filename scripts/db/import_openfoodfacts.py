@@ -0,0 +1,55 @@
+"""
+Chargement du magasin local OpenFoodFacts depuis un export en masse.
+
+Usage:
+  python scripts/db/import_openfoodfacts.py <export.jsonl.gz|export.parquet> [--magasin CHEMIN]
+  python scripts/db/import_openfoodfacts.py --stats [--magasin CHEMIN]
+
+Exports: https://world.openfoodfacts.org/data (JSONL gzippé ou Parquet).
+Par défaut le magasin est ``OFF_MAGASIN_LOCAL`` (data/openfoodfacts/produits.sqlite).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import du magasin local OpenFoodFacts")
+    parser.add_argument("export", nargs="?", type=Path, help="Export JSONL(.gz) ou Parquet")
+    parser.add_argument("--magasin", help="Fichier SQLite du magasin (défaut: OFF_MAGASIN_LOCAL)")
+    parser.add_argument("--stats", action="store_true", help="Affiche le contenu du magasin")
+    args = parser.parse_args()
+
+    from src.core.config import obtenir_parametres
+    from src.services.integrations.magasin_produits import MagasinProduits
+
+    chemin = args.magasin or obtenir_parametres().OFF_MAGASIN_LOCAL
+    if not chemin:
+        print("❌ OFF_MAGASIN_LOCAL est vide et --magasin n'est pas fourni")
+        sys.exit(1)
+
+    magasin = MagasinProduits(chemin)
+
+    if args.export:
+        if not args.export.exists():
+            print(f"❌ Fichier introuvable: {args.export}")
+            sys.exit(1)
+        debut = time.perf_counter()
+        total = magasin.charger_export(args.export)
+        print(f"✅ {total} produits chargés en {time.perf_counter() - debut:.1f}s → {chemin}")
+        print(f"   Cache négatif purgé: {magasin.purger_inconnus_expires()} entrée(s)")
+
+    if args.stats or not args.export:
+        stats = magasin.statistiques()
+        print(f"📦 Magasin {chemin}")
+        print(f"   Produits: {stats['produits']}")
+        print(f"   Codes inconnus (cache négatif): {stats['codes_inconnus']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -162,7 +162,8 @@ $$ LANGUAGE plpgsql;
 -- Contient : schema_migrations, profils_utilisateurs, preferences_utilisateurs,
 --            config_meteo, alertes_meteo, sauvegardes, historique_actions,
 --            etats_persistants, gamification, automations, logs_securite,
---            job_executions, openfoodfacts_cache
+--            job_executions, openfoodfacts_cache, journal_audit,
+--            agregats_usage
 -- ============================================================================
 
 -- Source: 03_systeme.sql
@@ -172,7 +173,8 @@ $$ LANGUAGE plpgsql;
 -- Contient : schema_migrations, profils_utilisateurs, preferences_utilisateurs,
 --            config_meteo, alertes_meteo, sauvegardes, historique_actions,
 --            etats_persistants, gamification, automations, logs_securite,
---            job_executions, openfoodfacts_cache
+--            job_executions, openfoodfacts_cache, journal_audit,
+--            agregats_usage
 -- ============================================================================
 -- PARTIE 2 : TABLE DE SUIVI DES MIGRATIONS
 -- ============================================================================
@@ -441,6 +443,8 @@ CREATE TABLE IF NOT EXISTS openfoodfacts_cache (
     nutrition_data JSONB,
     allergenes JSONB DEFAULT '[]',
     image_url VARCHAR(500),
+    etag VARCHAR(200),
+    empreinte VARCHAR(64),
     last_updated TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     cree_le TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
 );
@@ -558,6 +562,33 @@ CREATE INDEX IF NOT EXISTS ix_logs_securite_event_type ON logs_securite(event_ty
 CREATE INDEX IF NOT EXISTS ix_logs_securite_created_at ON logs_securite(created_at);
 CREATE INDEX IF NOT EXISTS ix_logs_securite_event_type_created_at ON logs_securite(event_type, created_at);
 CREATE INDEX IF NOT EXISTS ix_logs_securite_user_created_at ON logs_securite(user_id, created_at);
+-- Journal d'audit transversal (ServiceAudit, écriture par lots)
+CREATE TABLE IF NOT EXISTS journal_audit (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+    action VARCHAR(200) NOT NULL,
+    source VARCHAR(100) NOT NULL DEFAULT '',
+    utilisateur_id VARCHAR(255),
+    entite_type VARCHAR(100) NOT NULL DEFAULT '',
+    entite_id VARCHAR(100),
+    details JSONB DEFAULT '{}'::jsonb,
+    ip_address VARCHAR(45)
+);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_timestamp_id ON journal_audit(timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_timestamp_id ON journal_audit(entite_type, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_id_timestamp_id ON journal_audit(entite_type, entite_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_source_timestamp_id ON journal_audit(source, timestamp, id);
+-- Agrégats d'usage par minute / heure (ServiceAnalytics, fusion à l'écriture)
+CREATE TABLE IF NOT EXISTS agregats_usage (
+    id SERIAL PRIMARY KEY,
+    granularite VARCHAR(10) NOT NULL,
+    debut TIMESTAMP NOT NULL,
+    compteurs JSONB NOT NULL DEFAULT '{}'::jsonb,
+    durees JSONB NOT NULL DEFAULT '{}'::jsonb,
+    modifie_le TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_agregats_usage_granularite_debut UNIQUE (granularite, debut),
+    CONSTRAINT ck_agregats_usage_granularite CHECK (granularite IN ('minute', 'heure'))
+);
 CREATE INDEX IF NOT EXISTS idx_action_history_user_id ON historique_actions(user_id);
 CREATE INDEX IF NOT EXISTS idx_action_history_action_type ON historique_actions(action_type);
 CREATE INDEX IF NOT EXISTS idx_action_history_cree_le ON historique_actions(cree_le DESC);
@@ -1434,6 +1465,21 @@ CREATE INDEX IF NOT EXISTS ix_historique_inventaire_ingredient ON historique_inv
 CREATE INDEX IF NOT EXISTS ix_historique_inventaire_type ON historique_inventaire(type_modification);
 CREATE INDEX IF NOT EXISTS ix_historique_inventaire_date ON historique_inventaire(date_modification);
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Durées de vie observées (agrégats incrémentaux, job stats_duree_vie)
+CREATE TABLE IF NOT EXISTS stats_duree_vie (
+    id SERIAL PRIMARY KEY,
+    portee VARCHAR(20) NOT NULL,
+    cle VARCHAR(200) NOT NULL,
+    nb_observations INTEGER NOT NULL DEFAULT 0,
+    moyenne_jours FLOAT NOT NULL DEFAULT 0,
+    m2 FLOAT NOT NULL DEFAULT 0,
+    derniere_observation TIMESTAMP WITH TIME ZONE,
+    modifie_le TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_stats_duree_vie_portee_cle UNIQUE (portee, cle),
+    CONSTRAINT ck_stats_duree_vie_portee CHECK (portee IN ('categorie', 'ingredient'))
+);
+
 
 -- ─────────────────────────────────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS articles_courses (
@@ -3446,7 +3492,7 @@ CREATE INDEX IF NOT EXISTS idx_habitat_zones_jardin_plan ON habitat_zones_jardin
 -- ASSISTANT MATANNE — Tables Jeux
 -- ============================================================================
 -- Contient : jeux_equipes, jeux_matchs, paris_sportifs, loto, euromillions,
---            séries, alertes, cotes_historique
+--            séries, alertes, cotes_historique, stats_mensuelles
 -- ============================================================================
 
 
@@ -3455,7 +3501,7 @@ CREATE INDEX IF NOT EXISTS idx_habitat_zones_jardin_plan ON habitat_zones_jardin
 -- ASSISTANT MATANNE — Tables Jeux
 -- ============================================================================
 -- Contient : jeux_equipes, jeux_matchs, paris_sportifs, loto, euromillions,
---            séries, alertes, cotes_historique
+--            séries, alertes, cotes_historique, stats_mensuelles
 -- ============================================================================
 -- ─────────────────────────────────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS jeux_equipes (
@@ -3541,6 +3587,8 @@ CREATE TABLE IF NOT EXISTS jeux_series (
 CREATE INDEX IF NOT EXISTS ix_jeux_series_type_jeu_championnat ON jeux_series(type_jeu, championnat);
 CREATE INDEX IF NOT EXISTS ix_jeux_series_type_jeu_marche ON jeux_series(type_jeu, marche);
 CREATE INDEX IF NOT EXISTS ix_jeux_series_value ON jeux_series((frequence * serie_actuelle) DESC);
+CREATE INDEX IF NOT EXISTS ix_jeux_series_opportunites ON jeux_series(type_jeu, (frequence * serie_actuelle) DESC)
+    WHERE serie_actuelle >= 3 AND frequence * serie_actuelle >= 2.0;
 
 
 -- ─────────────────────────────────────────────────────────────────────────────
@@ -3737,6 +3785,24 @@ CREATE INDEX IF NOT EXISTS idx_cotes_hist_match ON jeux_cotes_historique(match_i
 CREATE INDEX IF NOT EXISTS idx_cotes_hist_timestamp ON jeux_cotes_historique(timestamp_cote DESC);
 CREATE INDEX IF NOT EXISTS idx_cotes_hist_bookmaker ON jeux_cotes_historique(bookmaker);
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Cumuls mensuels des paris / grilles résolus (StatsPersonnellesService),
+-- tenus à jour par les triggers trg_*_stats_mensuelles (12_triggers.sql)
+CREATE TABLE IF NOT EXISTS jeux_stats_mensuelles (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL DEFAULT 0,
+    type_jeu VARCHAR(20) NOT NULL,
+    mois DATE NOT NULL,
+    nb INTEGER NOT NULL DEFAULT 0,
+    mises NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    gains NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    modifie_le TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_jeux_stats_mensuelles UNIQUE (user_id, type_jeu, mois),
+    CONSTRAINT ck_jeux_stats_mensuelles_type CHECK (type_jeu IN ('paris', 'loto', 'euromillions'))
+);
+CREATE INDEX IF NOT EXISTS idx_paris_user_date ON jeux_paris_sportifs(user_id, cree_le);
+CREATE INDEX IF NOT EXISTS idx_grilles_loto_date ON jeux_grilles_loto(date_creation DESC);
+
 
 -- Source: 09_notifications.sql
 -- ============================================================================
@@ -4238,6 +4304,76 @@ DROP TRIGGER IF EXISTS trg_repas_planning_notify ON repas;
 CREATE TRIGGER trg_repas_planning_notify
     AFTER INSERT OR UPDATE OR DELETE ON repas
     FOR EACH ROW EXECUTE FUNCTION notify_planning_changed();
+
+-- ============================================================================
+-- Trigger : cumuls mensuels des jeux (jeux_stats_mensuelles)
+-- Chaque écriture retire la contribution de l'ancienne ligne et ajoute celle
+-- de la nouvelle. Lecture via to_jsonb: la colonne de date (cree_le ou
+-- date_creation), user_id et statut varient d'une table de jeu à l'autre.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION appliquer_stats_jeux_mensuelles(
+    p_type_jeu TEXT,
+    p_tarif NUMERIC,
+    p_ligne JSONB,
+    p_signe INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    v_date TIMESTAMPTZ := COALESCE(p_ligne->>'cree_le', p_ligne->>'date_creation')::TIMESTAMPTZ;
+BEGIN
+    -- Paris non résolus ignorés (les grilles n'ont pas de statut)
+    IF v_date IS NULL OR (
+        p_ligne ? 'statut'
+        AND COALESCE(p_ligne->>'statut', '') NOT IN ('gagnant', 'perdant', 'gagne', 'perdu')
+    ) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO jeux_stats_mensuelles AS s (user_id, type_jeu, mois, nb, mises, gains)
+    VALUES (
+        COALESCE((p_ligne->>'user_id')::INTEGER, 0),
+        p_type_jeu,
+        date_trunc('month', v_date)::DATE,
+        p_signe,
+        p_signe * COALESCE((p_ligne->>'mise')::NUMERIC, p_tarif),
+        p_signe * COALESCE((p_ligne->>'gain')::NUMERIC, 0)
+    )
+    ON CONFLICT (user_id, type_jeu, mois) DO UPDATE SET
+        nb = s.nb + EXCLUDED.nb,
+        mises = s.mises + EXCLUDED.mises,
+        gains = s.gains + EXCLUDED.gains,
+        modifie_le = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- TG_ARGV: type de jeu, mise par défaut d'une grille
+CREATE OR REPLACE FUNCTION maj_stats_jeux_mensuelles()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(OLD), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(NEW), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_paris_stats_mensuelles ON jeux_paris_sportifs;
+CREATE TRIGGER trg_paris_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_paris_sportifs
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('paris', '0');
+
+DROP TRIGGER IF EXISTS trg_grilles_loto_stats_mensuelles ON jeux_grilles_loto;
+CREATE TRIGGER trg_grilles_loto_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_loto
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('loto', '2.20');
+
+DROP TRIGGER IF EXISTS trg_grilles_euromillions_stats_mensuelles ON jeux_grilles_euromillions;
+CREATE TRIGGER trg_grilles_euromillions_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_euromillions
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('euromillions', '2.50');
 -- ============================================================================
 
 -- Source: 13_views.sql
@@ -4478,7 +4614,7 @@ shared_tables TEXT[] := ARRAY[
     'repas_batch', 'config_batch_cooking', 'sessions_batch_cooking',
     'etapes_batch_cooking', 'preparations_batch', 'batch_cooking_congelation',
     -- Inventaire & Courses
-    'inventaire', 'historique_inventaire', 'listes_courses',
+    'inventaire', 'historique_inventaire', 'stats_duree_vie', 'listes_courses',
     'articles_courses', 'correspondances_drive', 'historique_achats',
     'modeles_courses', 'articles_modeles', 'articles_achats_famille',
     -- Planning & Calendrier
@@ -4510,6 +4646,7 @@ shared_tables TEXT[] := ARRAY[
     'jeux_historique', 'jeux_series', 'jeux_alertes', 'jeux_configuration',
     'jeux_tirages_euromillions', 'jeux_grilles_euromillions', 'jeux_stats_euromillions',
     'jeux_cotes_historique', 'jeux_bankroll_historique',
+    'jeux_stats_mensuelles',
     -- Temps Entretien & Jardin
     'plans_jardin', 'zones_jardin', 'plantes_jardin', 'actions_plantes',
     'pieces_maison', 'objets_maison', 'sessions_travail',
@@ -4575,6 +4712,35 @@ CREATE POLICY "authenticated_deny_logs_securite"
     FOR ALL TO authenticated
     USING (false)
     WITH CHECK (false);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- 9.6 Journal d'audit admin-only
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE IF EXISTS public.journal_audit ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_journal_audit" ON public.journal_audit;
+CREATE POLICY "service_role_access_journal_audit"
+    ON public.journal_audit
+    FOR ALL TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+DROP POLICY IF EXISTS "authenticated_deny_journal_audit" ON public.journal_audit;
+CREATE POLICY "authenticated_deny_journal_audit"
+    ON public.journal_audit
+    FOR ALL TO authenticated
+    USING (false)
+    WITH CHECK (false);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- 9.7 Agrégats d'usage (service_role uniquement)
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE IF EXISTS public.agregats_usage ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_agregats_usage" ON public.agregats_usage;
+CREATE POLICY "service_role_access_agregats_usage"
+    ON public.agregats_usage
+    FOR ALL TO service_role
+    USING (true)
+    WITH CHECK (true);
 -- ============================================================================
 
 -- Source: 16_seed_data.sql
@@ -0,0 +1,27 @@
+-- Migration: agrégats d'usage persistants pour ServiceAnalytics
+-- Date: 2026-10-18
+-- Objectif: les statistiques d'usage sont tenues en agrégats par minute et
+--           par heure (compteurs + croquis de durées) au fil des événements,
+--           écrits périodiquement ici et rechargés au démarrage: l'historique
+--           survit aux redémarrages sans conserver les événements bruts.
+
+CREATE TABLE IF NOT EXISTS agregats_usage (
+    id SERIAL PRIMARY KEY,
+    granularite VARCHAR(10) NOT NULL,
+    debut TIMESTAMP NOT NULL,
+    compteurs JSONB NOT NULL DEFAULT '{}'::jsonb,
+    durees JSONB NOT NULL DEFAULT '{}'::jsonb,
+    modifie_le TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_agregats_usage_granularite_debut UNIQUE (granularite, debut),
+    CONSTRAINT ck_agregats_usage_granularite CHECK (granularite IN ('minute', 'heure'))
+);
+
+ALTER TABLE public.agregats_usage ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_agregats_usage" ON public.agregats_usage;
+CREATE POLICY "service_role_access_agregats_usage" ON public.agregats_usage
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+COMMENT ON TABLE agregats_usage IS
+    'Agrégats d''usage (pages, actions, durées) par minute et par heure';
+COMMENT ON COLUMN agregats_usage.durees IS
+    'Croquis DDSketch des durées de page (alvéoles logarithmiques, erreur relative 1 %)';
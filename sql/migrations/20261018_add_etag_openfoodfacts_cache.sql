@@ -0,0 +1,13 @@
+-- Migration: colonnes de rafraîchissement incrémental pour openfoodfacts_cache
+-- Date: 2026-10-18
+-- Objectif: le job sync_openfoodfacts envoie des requêtes conditionnelles
+--           (If-None-Match) et ne réécrit pas les produits inchangés.
+
+ALTER TABLE openfoodfacts_cache
+    ADD COLUMN IF NOT EXISTS etag VARCHAR(200),
+    ADD COLUMN IF NOT EXISTS empreinte VARCHAR(64);
+
+COMMENT ON COLUMN openfoodfacts_cache.etag IS
+    'ETag de la dernière réponse OpenFoodFacts (requête conditionnelle)';
+COMMENT ON COLUMN openfoodfacts_cache.empreinte IS
+    'SHA-256 du contenu produit utile (détection des produits inchangés)';
@@ -0,0 +1,108 @@
+-- Migration: cumuls mensuels des paris et grilles (jeux_stats_mensuelles)
+-- Date: 2026-10-18
+-- Objectif: ROI et évolution mensuelle des statistiques personnelles lisent
+--           une ligne par (utilisateur, jeu, mois) au lieu de charger tout
+--           l'historique des paris et grilles. Des triggers appliquent un
+--           delta à chaque écriture; le remplissage initial rejoue les lignes
+--           existantes.
+
+CREATE TABLE IF NOT EXISTS jeux_stats_mensuelles (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL DEFAULT 0,
+    type_jeu VARCHAR(20) NOT NULL,
+    mois DATE NOT NULL,
+    nb INTEGER NOT NULL DEFAULT 0,
+    mises NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    gains NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    modifie_le TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_jeux_stats_mensuelles UNIQUE (user_id, type_jeu, mois),
+    CONSTRAINT ck_jeux_stats_mensuelles_type CHECK (type_jeu IN ('paris', 'loto', 'euromillions'))
+);
+
+-- Mois partiel en tête de période: agrégé sur les tables brutes
+CREATE INDEX IF NOT EXISTS idx_paris_user_date ON jeux_paris_sportifs(user_id, cree_le);
+CREATE INDEX IF NOT EXISTS idx_grilles_loto_date ON jeux_grilles_loto(date_creation DESC);
+
+CREATE OR REPLACE FUNCTION appliquer_stats_jeux_mensuelles(
+    p_type_jeu TEXT,
+    p_tarif NUMERIC,
+    p_ligne JSONB,
+    p_signe INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    v_date TIMESTAMPTZ := COALESCE(p_ligne->>'cree_le', p_ligne->>'date_creation')::TIMESTAMPTZ;
+BEGIN
+    -- Paris non résolus ignorés (les grilles n'ont pas de statut)
+    IF v_date IS NULL OR (
+        p_ligne ? 'statut'
+        AND COALESCE(p_ligne->>'statut', '') NOT IN ('gagnant', 'perdant', 'gagne', 'perdu')
+    ) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO jeux_stats_mensuelles AS s (user_id, type_jeu, mois, nb, mises, gains)
+    VALUES (
+        COALESCE((p_ligne->>'user_id')::INTEGER, 0),
+        p_type_jeu,
+        date_trunc('month', v_date)::DATE,
+        p_signe,
+        p_signe * COALESCE((p_ligne->>'mise')::NUMERIC, p_tarif),
+        p_signe * COALESCE((p_ligne->>'gain')::NUMERIC, 0)
+    )
+    ON CONFLICT (user_id, type_jeu, mois) DO UPDATE SET
+        nb = s.nb + EXCLUDED.nb,
+        mises = s.mises + EXCLUDED.mises,
+        gains = s.gains + EXCLUDED.gains,
+        modifie_le = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- TG_ARGV: type de jeu, mise par défaut d'une grille
+CREATE OR REPLACE FUNCTION maj_stats_jeux_mensuelles()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(OLD), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(NEW), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_paris_stats_mensuelles ON jeux_paris_sportifs;
+CREATE TRIGGER trg_paris_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_paris_sportifs
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('paris', '0');
+
+DROP TRIGGER IF EXISTS trg_grilles_loto_stats_mensuelles ON jeux_grilles_loto;
+CREATE TRIGGER trg_grilles_loto_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_loto
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('loto', '2.20');
+
+DROP TRIGGER IF EXISTS trg_grilles_euromillions_stats_mensuelles ON jeux_grilles_euromillions;
+CREATE TRIGGER trg_grilles_euromillions_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_euromillions
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('euromillions', '2.50');
+
+-- Remplissage initial (idempotent)
+DELETE FROM jeux_stats_mensuelles;
+SELECT appliquer_stats_jeux_mensuelles('paris', 0, to_jsonb(t), 1) FROM jeux_paris_sportifs t;
+SELECT appliquer_stats_jeux_mensuelles('loto', 2.20, to_jsonb(t), 1) FROM jeux_grilles_loto t;
+SELECT appliquer_stats_jeux_mensuelles('euromillions', 2.50, to_jsonb(t), 1)
+FROM jeux_grilles_euromillions t;
+
+ALTER TABLE public.jeux_stats_mensuelles ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_jeux_stats_mensuelles" ON public.jeux_stats_mensuelles;
+CREATE POLICY "service_role_access_jeux_stats_mensuelles" ON public.jeux_stats_mensuelles
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+DROP POLICY IF EXISTS "authenticated_access_jeux_stats_mensuelles" ON public.jeux_stats_mensuelles;
+CREATE POLICY "authenticated_access_jeux_stats_mensuelles" ON public.jeux_stats_mensuelles
+    FOR ALL TO authenticated USING (true) WITH CHECK (true);
+
+COMMENT ON TABLE jeux_stats_mensuelles IS
+    'Cumuls mensuels (nb, mises, gains) des paris résolus et des grilles, par utilisateur';
+COMMENT ON COLUMN jeux_stats_mensuelles.user_id IS
+    '0 pour les grilles (non rattachées à un utilisateur)';
@@ -0,0 +1,39 @@
+-- Migration: table journal_audit et index de consultation
+-- Date: 2026-10-18
+-- Objectif: ServiceAudit écrit le journal par lots (au lieu d'un INSERT par
+--           action) et le relit depuis la base pour que tous les workers
+--           voient le même historique. Les index composites se terminent par
+--           (timestamp, id): pagination par curseur, du plus récent au plus
+--           ancien, sans OFFSET.
+
+CREATE TABLE IF NOT EXISTS journal_audit (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+    action VARCHAR(200) NOT NULL,
+    source VARCHAR(100) NOT NULL DEFAULT '',
+    utilisateur_id VARCHAR(255),
+    entite_type VARCHAR(100) NOT NULL DEFAULT '',
+    entite_id VARCHAR(100),
+    details JSONB DEFAULT '{}'::jsonb,
+    ip_address VARCHAR(45)
+);
+
+CREATE INDEX IF NOT EXISTS ix_journal_audit_timestamp_id
+    ON journal_audit(timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_timestamp_id
+    ON journal_audit(entite_type, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_id_timestamp_id
+    ON journal_audit(entite_type, entite_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_source_timestamp_id
+    ON journal_audit(source, timestamp, id);
+
+ALTER TABLE public.journal_audit ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_journal_audit" ON public.journal_audit;
+CREATE POLICY "service_role_access_journal_audit" ON public.journal_audit
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+DROP POLICY IF EXISTS "authenticated_deny_journal_audit" ON public.journal_audit;
+CREATE POLICY "authenticated_deny_journal_audit" ON public.journal_audit
+    FOR ALL TO authenticated USING (false) WITH CHECK (false);
+
+COMMENT ON TABLE journal_audit IS
+    'Journal d''audit transversal (actions métier capturées via le bus d''événements)';
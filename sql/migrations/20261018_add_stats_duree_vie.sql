@@ -0,0 +1,32 @@
+-- Migration: agrégats de durée de vie pour la prédiction de péremption
+-- Date: 2026-10-18
+-- Objectif: la prédiction de péremption lit des statistiques pré-agrégées
+--           (Welford: nombre, moyenne, m2) au lieu de rescanner
+--           historique_inventaire; le job stats_duree_vie n'intègre que les
+--           lignes d'historique postérieures au dernier identifiant traité.
+
+CREATE TABLE IF NOT EXISTS stats_duree_vie (
+    id SERIAL PRIMARY KEY,
+    portee VARCHAR(20) NOT NULL,
+    cle VARCHAR(200) NOT NULL,
+    nb_observations INTEGER NOT NULL DEFAULT 0,
+    moyenne_jours FLOAT NOT NULL DEFAULT 0,
+    m2 FLOAT NOT NULL DEFAULT 0,
+    derniere_observation TIMESTAMP WITH TIME ZONE,
+    modifie_le TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_stats_duree_vie_portee_cle UNIQUE (portee, cle),
+    CONSTRAINT ck_stats_duree_vie_portee CHECK (portee IN ('categorie', 'ingredient'))
+);
+
+ALTER TABLE public.stats_duree_vie ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_stats_duree_vie" ON public.stats_duree_vie;
+CREATE POLICY "service_role_access_stats_duree_vie" ON public.stats_duree_vie
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+DROP POLICY IF EXISTS "authenticated_access_stats_duree_vie" ON public.stats_duree_vie;
+CREATE POLICY "authenticated_access_stats_duree_vie" ON public.stats_duree_vie
+    FOR ALL TO authenticated USING (true) WITH CHECK (true);
+
+COMMENT ON TABLE stats_duree_vie IS
+    'Durées de vie observées (ajout → consommation) par catégorie ou ingrédient';
+COMMENT ON COLUMN stats_duree_vie.m2 IS
+    'Somme des carrés des écarts à la moyenne (variance = m2 / (n - 1))';
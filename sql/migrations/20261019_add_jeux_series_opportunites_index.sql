@@ -0,0 +1,10 @@
+-- Migration: index partiel des opportunités de séries
+-- Date: 2026-10-19
+-- Objectif: SeriesService.detecter_opportunites filtre en SQL sur
+--           serie_actuelle >= 3 et value (frequence * serie_actuelle) >= seuil;
+--           l'index partiel ne couvre que les séries au-dessus du seuil d'alerte
+--           (SEUIL_SERIES_MINIMUM / SEUIL_VALUE_ALERTE) et reste petit alors que
+--           les résultats du jour sont appliqués en un seul UPDATE ensembliste.
+
+CREATE INDEX IF NOT EXISTS ix_jeux_series_opportunites ON jeux_series(type_jeu, (frequence * serie_actuelle) DESC)
+    WHERE serie_actuelle >= 3 AND frequence * serie_actuelle >= 2.0;
@@ -4,7 +4,8 @@
 -- Contient : schema_migrations, profils_utilisateurs, preferences_utilisateurs,
 --            config_meteo, alertes_meteo, sauvegardes, historique_actions,
 --            etats_persistants, gamification, automations, logs_securite,
---            job_executions, openfoodfacts_cache
+--            job_executions, openfoodfacts_cache, journal_audit,
+--            agregats_usage
 -- ============================================================================
 -- PARTIE 2 : TABLE DE SUIVI DES MIGRATIONS
 -- ============================================================================
@@ -269,6 +270,8 @@ CREATE TABLE IF NOT EXISTS openfoodfacts_cache (
     nutrition_data JSONB,
     allergenes JSONB DEFAULT '[]',
     image_url VARCHAR(500),
+    etag VARCHAR(200),
+    empreinte VARCHAR(64),
     last_updated TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     cree_le TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
 );
@@ -386,6 +389,33 @@ CREATE INDEX IF NOT EXISTS ix_logs_securite_event_type ON logs_securite(event_ty
 CREATE INDEX IF NOT EXISTS ix_logs_securite_created_at ON logs_securite(created_at);
 CREATE INDEX IF NOT EXISTS ix_logs_securite_event_type_created_at ON logs_securite(event_type, created_at);
 CREATE INDEX IF NOT EXISTS ix_logs_securite_user_created_at ON logs_securite(user_id, created_at);
+-- Journal d'audit transversal (ServiceAudit, écriture par lots)
+CREATE TABLE IF NOT EXISTS journal_audit (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW(),
+    action VARCHAR(200) NOT NULL,
+    source VARCHAR(100) NOT NULL DEFAULT '',
+    utilisateur_id VARCHAR(255),
+    entite_type VARCHAR(100) NOT NULL DEFAULT '',
+    entite_id VARCHAR(100),
+    details JSONB DEFAULT '{}'::jsonb,
+    ip_address VARCHAR(45)
+);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_timestamp_id ON journal_audit(timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_timestamp_id ON journal_audit(entite_type, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_entite_id_timestamp_id ON journal_audit(entite_type, entite_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_journal_audit_source_timestamp_id ON journal_audit(source, timestamp, id);
+-- Agrégats d'usage par minute / heure (ServiceAnalytics, fusion à l'écriture)
+CREATE TABLE IF NOT EXISTS agregats_usage (
+    id SERIAL PRIMARY KEY,
+    granularite VARCHAR(10) NOT NULL,
+    debut TIMESTAMP NOT NULL,
+    compteurs JSONB NOT NULL DEFAULT '{}'::jsonb,
+    durees JSONB NOT NULL DEFAULT '{}'::jsonb,
+    modifie_le TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_agregats_usage_granularite_debut UNIQUE (granularite, debut),
+    CONSTRAINT ck_agregats_usage_granularite CHECK (granularite IN ('minute', 'heure'))
+);
 CREATE INDEX IF NOT EXISTS idx_action_history_user_id ON historique_actions(user_id);
 CREATE INDEX IF NOT EXISTS idx_action_history_action_type ON historique_actions(action_type);
 CREATE INDEX IF NOT EXISTS idx_action_history_cree_le ON historique_actions(cree_le DESC);
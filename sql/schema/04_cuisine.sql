@@ -346,6 +346,21 @@ CREATE INDEX IF NOT EXISTS ix_historique_inventaire_ingredient ON historique_inv
 CREATE INDEX IF NOT EXISTS ix_historique_inventaire_type ON historique_inventaire(type_modification);
 CREATE INDEX IF NOT EXISTS ix_historique_inventaire_date ON historique_inventaire(date_modification);
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Durées de vie observées (agrégats incrémentaux, job stats_duree_vie)
+CREATE TABLE IF NOT EXISTS stats_duree_vie (
+    id SERIAL PRIMARY KEY,
+    portee VARCHAR(20) NOT NULL,
+    cle VARCHAR(200) NOT NULL,
+    nb_observations INTEGER NOT NULL DEFAULT 0,
+    moyenne_jours FLOAT NOT NULL DEFAULT 0,
+    m2 FLOAT NOT NULL DEFAULT 0,
+    derniere_observation TIMESTAMP WITH TIME ZONE,
+    modifie_le TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_stats_duree_vie_portee_cle UNIQUE (portee, cle),
+    CONSTRAINT ck_stats_duree_vie_portee CHECK (portee IN ('categorie', 'ingredient'))
+);
+
 
 -- ─────────────────────────────────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS articles_courses (
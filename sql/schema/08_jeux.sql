@@ -2,7 +2,7 @@
 -- ASSISTANT MATANNE — Tables Jeux
 -- ============================================================================
 -- Contient : jeux_equipes, jeux_matchs, paris_sportifs, loto, euromillions,
---            séries, alertes, cotes_historique
+--            séries, alertes, cotes_historique, stats_mensuelles
 -- ============================================================================
 -- ─────────────────────────────────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS jeux_equipes (
@@ -88,6 +88,8 @@ CREATE TABLE IF NOT EXISTS jeux_series (
 CREATE INDEX IF NOT EXISTS ix_jeux_series_type_jeu_championnat ON jeux_series(type_jeu, championnat);
 CREATE INDEX IF NOT EXISTS ix_jeux_series_type_jeu_marche ON jeux_series(type_jeu, marche);
 CREATE INDEX IF NOT EXISTS ix_jeux_series_value ON jeux_series((frequence * serie_actuelle) DESC);
+CREATE INDEX IF NOT EXISTS ix_jeux_series_opportunites ON jeux_series(type_jeu, (frequence * serie_actuelle) DESC)
+    WHERE serie_actuelle >= 3 AND frequence * serie_actuelle >= 2.0;
 
 
 -- ─────────────────────────────────────────────────────────────────────────────
@@ -284,6 +286,24 @@ CREATE INDEX IF NOT EXISTS idx_cotes_hist_match ON jeux_cotes_historique(match_i
 CREATE INDEX IF NOT EXISTS idx_cotes_hist_timestamp ON jeux_cotes_historique(timestamp_cote DESC);
 CREATE INDEX IF NOT EXISTS idx_cotes_hist_bookmaker ON jeux_cotes_historique(bookmaker);
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Cumuls mensuels des paris / grilles résolus (StatsPersonnellesService),
+-- tenus à jour par les triggers trg_*_stats_mensuelles (12_triggers.sql)
+CREATE TABLE IF NOT EXISTS jeux_stats_mensuelles (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL DEFAULT 0,
+    type_jeu VARCHAR(20) NOT NULL,
+    mois DATE NOT NULL,
+    nb INTEGER NOT NULL DEFAULT 0,
+    mises NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    gains NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    modifie_le TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_jeux_stats_mensuelles UNIQUE (user_id, type_jeu, mois),
+    CONSTRAINT ck_jeux_stats_mensuelles_type CHECK (type_jeu IN ('paris', 'loto', 'euromillions'))
+);
+CREATE INDEX IF NOT EXISTS idx_paris_user_date ON jeux_paris_sportifs(user_id, cree_le);
+CREATE INDEX IF NOT EXISTS idx_grilles_loto_date ON jeux_grilles_loto(date_creation DESC);
+
 
 -- Source: 09_notifications.sql
 -- ============================================================================
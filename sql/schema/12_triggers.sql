@@ -82,6 +82,76 @@ DROP TRIGGER IF EXISTS trg_repas_planning_notify ON repas;
 CREATE TRIGGER trg_repas_planning_notify
     AFTER INSERT OR UPDATE OR DELETE ON repas
     FOR EACH ROW EXECUTE FUNCTION notify_planning_changed();
+
+-- ============================================================================
+-- Trigger : cumuls mensuels des jeux (jeux_stats_mensuelles)
+-- Chaque écriture retire la contribution de l'ancienne ligne et ajoute celle
+-- de la nouvelle. Lecture via to_jsonb: la colonne de date (cree_le ou
+-- date_creation), user_id et statut varient d'une table de jeu à l'autre.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION appliquer_stats_jeux_mensuelles(
+    p_type_jeu TEXT,
+    p_tarif NUMERIC,
+    p_ligne JSONB,
+    p_signe INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    v_date TIMESTAMPTZ := COALESCE(p_ligne->>'cree_le', p_ligne->>'date_creation')::TIMESTAMPTZ;
+BEGIN
+    -- Paris non résolus ignorés (les grilles n'ont pas de statut)
+    IF v_date IS NULL OR (
+        p_ligne ? 'statut'
+        AND COALESCE(p_ligne->>'statut', '') NOT IN ('gagnant', 'perdant', 'gagne', 'perdu')
+    ) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO jeux_stats_mensuelles AS s (user_id, type_jeu, mois, nb, mises, gains)
+    VALUES (
+        COALESCE((p_ligne->>'user_id')::INTEGER, 0),
+        p_type_jeu,
+        date_trunc('month', v_date)::DATE,
+        p_signe,
+        p_signe * COALESCE((p_ligne->>'mise')::NUMERIC, p_tarif),
+        p_signe * COALESCE((p_ligne->>'gain')::NUMERIC, 0)
+    )
+    ON CONFLICT (user_id, type_jeu, mois) DO UPDATE SET
+        nb = s.nb + EXCLUDED.nb,
+        mises = s.mises + EXCLUDED.mises,
+        gains = s.gains + EXCLUDED.gains,
+        modifie_le = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- TG_ARGV: type de jeu, mise par défaut d'une grille
+CREATE OR REPLACE FUNCTION maj_stats_jeux_mensuelles()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(OLD), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM appliquer_stats_jeux_mensuelles(TG_ARGV[0], TG_ARGV[1]::NUMERIC, to_jsonb(NEW), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_paris_stats_mensuelles ON jeux_paris_sportifs;
+CREATE TRIGGER trg_paris_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_paris_sportifs
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('paris', '0');
+
+DROP TRIGGER IF EXISTS trg_grilles_loto_stats_mensuelles ON jeux_grilles_loto;
+CREATE TRIGGER trg_grilles_loto_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_loto
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('loto', '2.20');
+
+DROP TRIGGER IF EXISTS trg_grilles_euromillions_stats_mensuelles ON jeux_grilles_euromillions;
+CREATE TRIGGER trg_grilles_euromillions_stats_mensuelles
+    AFTER INSERT OR UPDATE OR DELETE ON jeux_grilles_euromillions
+    FOR EACH ROW EXECUTE FUNCTION maj_stats_jeux_mensuelles('euromillions', '2.50');
 -- ============================================================================
 
 -- Source: 13_views.sql
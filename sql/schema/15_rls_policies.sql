@@ -69,7 +69,7 @@ shared_tables TEXT[] := ARRAY[
     'repas_batch', 'config_batch_cooking', 'sessions_batch_cooking',
     'etapes_batch_cooking', 'preparations_batch', 'batch_cooking_congelation',
     -- Inventaire & Courses
-    'inventaire', 'historique_inventaire', 'listes_courses',
+    'inventaire', 'historique_inventaire', 'stats_duree_vie', 'listes_courses',
     'articles_courses', 'correspondances_drive', 'historique_achats',
     'modeles_courses', 'articles_modeles', 'articles_achats_famille',
     -- Planning & Calendrier
@@ -101,6 +101,7 @@ shared_tables TEXT[] := ARRAY[
     'jeux_historique', 'jeux_series', 'jeux_alertes', 'jeux_configuration',
     'jeux_tirages_euromillions', 'jeux_grilles_euromillions', 'jeux_stats_euromillions',
     'jeux_cotes_historique', 'jeux_bankroll_historique',
+    'jeux_stats_mensuelles',
     -- Temps Entretien & Jardin
     'plans_jardin', 'zones_jardin', 'plantes_jardin', 'actions_plantes',
     'pieces_maison', 'objets_maison', 'sessions_travail',
@@ -166,6 +167,35 @@ CREATE POLICY "authenticated_deny_logs_securite"
     FOR ALL TO authenticated
     USING (false)
     WITH CHECK (false);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- 9.6 Journal d'audit admin-only
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE IF EXISTS public.journal_audit ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_journal_audit" ON public.journal_audit;
+CREATE POLICY "service_role_access_journal_audit"
+    ON public.journal_audit
+    FOR ALL TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+DROP POLICY IF EXISTS "authenticated_deny_journal_audit" ON public.journal_audit;
+CREATE POLICY "authenticated_deny_journal_audit"
+    ON public.journal_audit
+    FOR ALL TO authenticated
+    USING (false)
+    WITH CHECK (false);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- 9.7 Agrégats d'usage (service_role uniquement)
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE IF EXISTS public.agregats_usage ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "service_role_access_agregats_usage" ON public.agregats_usage;
+CREATE POLICY "service_role_access_agregats_usage"
+    ON public.agregats_usage
+    FOR ALL TO service_role
+    USING (true)
+    WITH CHECK (true);
 -- ============================================================================
 
 -- Source: 16_seed_data.sql
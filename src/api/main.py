@@ -190,6 +190,17 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     except Exception:
         logger.debug("Listener invalidation cache déjà arrêté ou non initialisé")
 
+    try:
+        from src.api.websocket.diffusion import arreter_diffusion
+
+        arreter_diffusion()
+    except Exception:
+        logger.debug("Backplane WebSocket déjà arrêté ou non initialisé")
+
+    from src.core.async_utils import fermer_client_http
+
+    await fermer_client_http()
+
 
 # ═══════════════════════════════════════════════════════════
 # APPLICATION FASTAPI
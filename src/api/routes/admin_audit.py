@@ -49,27 +49,36 @@ async def lister_audit_logs(
     entite_type: str | None = Query(None, description="Filtrer par type d'entité"),
     depuis: datetime | None = Query(None, description="Date de début (ISO 8601)"),
     jusqu_a: datetime | None = Query(None, description="Date de fin (ISO 8601)"),
+    curseur: str | None = Query(
+        None, description="Page suivante (curseur_suivant de la réponse précédente)"
+    ),
     user: dict[str, Any] = Depends(require_role("admin")),
 ):
     """Retourne les logs d'audit paginés avec filtres."""
     from src.services.core.audit import obtenir_service_audit
 
     service = obtenir_service_audit()
-    resultat = service.consulter(
-        action=action,
-        entite_type=entite_type,
-        depuis=depuis,
-        jusqu_a=jusqu_a,
-        limite=par_page,
-        page=page,
-    )
+    try:
+        resultat = service.consulter(
+            action=action,
+            entite_type=entite_type,
+            depuis=depuis,
+            jusqu_a=jusqu_a,
+            limite=par_page,
+            page=page,
+            curseur=curseur,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
+    total = resultat.total
     return {
         "items": [e.model_dump() for e in resultat.entrees],
-        "total": resultat.total,
+        "total": total,
         "page": resultat.page,
         "par_page": resultat.par_page,
-        "pages_totales": max(1, (resultat.total + par_page - 1) // par_page),
+        "pages_totales": None if total is None else max(1, (total + par_page - 1) // par_page),
+        "curseur_suivant": resultat.curseur_suivant,
     }
 
 
@@ -36,6 +36,8 @@ _LABELS_JOBS: dict[str, str] = {
     "archive_batches_expires": "J4 Archivage préparations batch expirées (02h00)",
     "rapport_maison_mensuel": "J5 Rapport maison mensuel (1er/mois 09h30)",
     "sync_openfoodfacts": "J6 Sync cache OpenFoodFacts (dim 03h00)",
+    "snapshot_dashboard": "Précalcul snapshot dashboard (toutes les 15 min)",
+    "stats_duree_vie": "Statistiques durée de vie inventaire (toutes les heures, h40)",
     "prediction_courses_weekly": "JOB-1 Prédiction courses hebdo (dim 10h00)",
     "analyse_nutrition_hebdo": "JOB-3 Analyse nutrition hebdo (dim 20h00)",
     "alertes_energie": "JOB-4 Alertes énergie (07h00)",
@@ -30,6 +30,7 @@ from src.api.schemas.ia_transverses import (
     TelegramConversationnelResponse,
 )
 from src.api.utils import executer_async, executer_avec_session, gerer_exception_api
+from src.core.db.periodes import filtre_mois
 from src.services.core.service_ia import obtenir_service_innovations_core
 
 logger = logging.getLogger(__name__)
@@ -127,8 +128,7 @@ def _calculer_budget_unifie(session: Any, mois: int, annee: int) -> dict[str, An
     total_famille = (
         session.query(func.sum(BudgetFamille.montant))
         .filter(
-            func.extract("month", BudgetFamille.date) == mois,
-            func.extract("year", BudgetFamille.date) == annee,
+            filtre_mois(BudgetFamille.date, annee, mois),
         )
         .scalar()
         or 0
@@ -142,8 +142,7 @@ def _calculer_budget_unifie(session: Any, mois: int, annee: int) -> dict[str, An
     mises_jeux = (
         session.query(func.sum(PariSportif.mise))
         .filter(
-            func.extract("month", PariSportif.cree_le) == mois,
-            func.extract("year", PariSportif.cree_le) == annee,
+            filtre_mois(PariSportif.cree_le, annee, mois),
             PariSportif.est_virtuel == False,  # noqa: E712
         )
         .scalar()
@@ -152,8 +151,7 @@ def _calculer_budget_unifie(session: Any, mois: int, annee: int) -> dict[str, An
     gains_jeux = (
         session.query(func.sum(PariSportif.gain))
         .filter(
-            func.extract("month", PariSportif.cree_le) == mois,
-            func.extract("year", PariSportif.cree_le) == annee,
+            filtre_mois(PariSportif.cree_le, annee, mois),
             PariSportif.est_virtuel == False,  # noqa: E712
         )
         .scalar()
@@ -343,247 +341,12 @@ async def obtenir_tableau_bord(
     """
 
     def _query():
-        with executer_avec_session() as session:
-            from src.core.models import (
-                ActiviteFamille,
-                AnnonceHabitat,
-                ArticleInventaire,
-                BudgetFamille,
-                ProjetDecoHabitat,
-                Recette,
-                Repas,
-                StockMaison,
-                TacheEntretien,
-                ZoneJardinHabitat,
-            )
-
-            aujourd_hui = date.today()
-            debut_semaine = aujourd_hui - timedelta(days=aujourd_hui.weekday())
-            fin_semaine = debut_semaine + timedelta(days=6)
-            debut_mois = aujourd_hui.replace(day=1)
-
-            # Statistiques rapides
-            recettes_total = session.query(func.count(Recette.id)).scalar() or 0
-
-            repas_semaine = (
-                session.query(func.count(Repas.id))
-                .filter(
-                    Repas.date_repas >= debut_semaine,
-                    Repas.date_repas <= fin_semaine,
-                )
-                .scalar()
-                or 0
-            )
-
-            # TÃ¢ches entretien en retard
-            taches_retard = (
-                session.query(func.count(TacheEntretien.id))
-                .filter(
-                    TacheEntretien.prochaine_fois < aujourd_hui,
-                    TacheEntretien.fait == False,  # noqa: E712
-                )
-                .scalar()
-                or 0
-            )
-
-            # ActivitÃ©s Ã  venir (7 prochains jours)
-            activites_a_venir = (
-                session.query(func.count(ActiviteFamille.id))
-                .filter(
-                    ActiviteFamille.date_prevue >= aujourd_hui,
-                    ActiviteFamille.date_prevue <= aujourd_hui + timedelta(days=7),
-                )
-                .scalar()
-                or 0
-            )
-
-            # Stocks en alerte
-            stocks_alerte = (
-                session.query(func.count(StockMaison.id))
-                .filter(StockMaison.quantite <= StockMaison.seuil_alerte)
-                .scalar()
-                or 0
-            )
-
-            # Budget du mois
-            budget_total = (
-                session.query(func.sum(BudgetFamille.montant))
-                .filter(BudgetFamille.date >= debut_mois)
-                .scalar()
-                or 0
-            )
+        from src.services.dashboard.snapshot import obtenir_service_snapshot_dashboard
 
-            budget_par_cat = (
-                session.query(
-                    BudgetFamille.categorie,
-                    func.sum(BudgetFamille.montant).label("total"),
-                )
-                .filter(BudgetFamille.date >= debut_mois)
-                .group_by(BudgetFamille.categorie)
-                .all()
-            )
-
-            # Prochaines activitÃ©s (5 max)
-            prochaines = (
-                session.query(ActiviteFamille)
-                .filter(ActiviteFamille.date_prevue >= aujourd_hui)
-                .order_by(ActiviteFamille.date_prevue.asc())
-                .limit(5)
-                .all()
-            )
-
-            # Alertes: articles inventaire bientÃ´t pÃ©rimÃ©s (7 jours)
-            alertes = []
-            try:
-                articles_perissables = (
-                    session.query(ArticleInventaire)
-                    .filter(
-                        ArticleInventaire.date_peremption.isnot(None),
-                        ArticleInventaire.date_peremption <= aujourd_hui + timedelta(days=7),
-                        ArticleInventaire.date_peremption >= aujourd_hui,
-                    )
-                    .order_by(ArticleInventaire.date_peremption.asc())
-                    .limit(10)
-                    .all()
-                )
-                for a in articles_perissables:
-                    jours = (a.date_peremption - aujourd_hui).days
-                    alertes.append(
-                        {
-                            "type": "peremption",
-                            "message": f"{a.nom} expire dans {jours} jour(s)",
-                            "urgence": "haute" if jours <= 2 else "moyenne",
-                        }
-                    )
-            except Exception as e:
-                logger.warning("[dashboard] Alertes pÃ©remption non chargÃ©es: %s", e)
-
-            if stocks_alerte > 0:
-                alertes.append(
-                    {
-                        "type": "stock",
-                        "message": f"{stocks_alerte} stock(s) maison en alerte",
-                        "urgence": "moyenne",
-                    }
-                )
-
-            habitat_alertes = (
-                session.query(func.count(AnnonceHabitat.id))
-                .filter(AnnonceHabitat.statut.in_(["alerte", "nouveau"]))
-                .scalar()
-                or 0
+        with executer_avec_session() as session:
+            return obtenir_service_snapshot_dashboard().obtenir_snapshot(
+                str(user.get("id", "default")), db=session
             )
-            budget_deco = session.query(func.sum(ProjetDecoHabitat.budget_depense)).scalar() or 0
-            zones_jardin = session.query(func.count(ZoneJardinHabitat.id)).scalar() or 0
-            if habitat_alertes > 0:
-                alertes.append(
-                    {
-                        "type": "habitat",
-                        "message": f"{habitat_alertes} annonce(s) habitat a qualifier",
-                        "urgence": "moyenne",
-                    }
-                )
-
-            if taches_retard > 0:
-                alertes.append(
-                    {
-                        "type": "entretien",
-                        "message": f"{taches_retard} tÃ¢che(s) d'entretien en retard",
-                        "urgence": "haute" if taches_retard > 3 else "moyenne",
-                    }
-                )
-
-            # B8: Documents expirés ou expirant bientôt
-            try:
-                from src.core.models import DocumentFamille
-
-                docs_expires = (
-                    session.query(func.count(DocumentFamille.id))
-                    .filter(
-                        DocumentFamille.date_expiration.isnot(None),
-                        DocumentFamille.actif.is_(True),
-                        DocumentFamille.date_expiration < aujourd_hui,
-                    )
-                    .scalar()
-                    or 0
-                )
-                docs_bientot = (
-                    session.query(func.count(DocumentFamille.id))
-                    .filter(
-                        DocumentFamille.date_expiration.isnot(None),
-                        DocumentFamille.actif.is_(True),
-                        DocumentFamille.date_expiration >= aujourd_hui,
-                        DocumentFamille.date_expiration <= aujourd_hui + timedelta(days=30),
-                    )
-                    .scalar()
-                    or 0
-                )
-                if docs_expires > 0:
-                    alertes.append(
-                        {
-                            "type": "document_expire",
-                            "message": f"{docs_expires} document(s) expiré(s) à renouveler",
-                            "urgence": "haute",
-                        }
-                    )
-                if docs_bientot > 0:
-                    alertes.append(
-                        {
-                            "type": "document_bientot",
-                            "message": f"{docs_bientot} document(s) expirent dans les 30 jours",
-                            "urgence": "moyenne",
-                        }
-                    )
-            except Exception as e:
-                logger.warning("[dashboard] Alertes documents non chargées: %s", e)
-
-            # Repas du jour
-            repas_aujourd_hui = []
-            try:
-                repas_jour = (
-                    session.query(Repas).filter(Repas.date_repas == aujourd_hui).all()
-                )
-                repas_aujourd_hui = [
-                    {
-                        "type_repas": r.type_repas,
-                        "recette_nom": r.recette.nom if r.recette else r.notes,
-                    }
-                    for r in repas_jour
-                ]
-            except Exception as e:
-                logger.warning("[dashboard] Repas du jour non chargés: %s", e)
-
-            return {
-                "statistiques": {
-                    "recettes_total": recettes_total,
-                    "repas_planifies_semaine": repas_semaine,
-                    "articles_courses": 0,
-                    "taches_entretien_en_retard": taches_retard,
-                    "activites_a_venir": activites_a_venir,
-                    "stocks_en_alerte": stocks_alerte,
-                },
-                "budget_mois": {
-                    "total_mois": float(budget_total),
-                    "par_categorie": {cat: float(total) for cat, total in budget_par_cat},
-                },
-                "habitat": {
-                    "alertes": int(habitat_alertes),
-                    "budget_deco_depense": float(budget_deco),
-                    "zones_jardin": int(zones_jardin),
-                },
-                "prochaines_activites": [
-                    {
-                        "id": a.id,
-                        "titre": a.titre,
-                        "date_prevue": a.date_prevue.isoformat(),
-                        "type_activite": a.type_activite,
-                        "lieu": a.lieu,
-                    }
-                    for a in prochaines
-                ],
-                "alertes": alertes,
-                "repas_aujourd_hui": repas_aujourd_hui,
-            }
 
     return await executer_async(_query)
 
@@ -1067,8 +830,7 @@ async def obtenir_tendances_ia(
                     session.query(func.sum(ReleveCompteur.consommation_periode))
                     .filter(
                         ReleveCompteur.type_compteur == "electricite",
-                        func.extract("month", ReleveCompteur.date_releve) == mois,
-                        func.extract("year", ReleveCompteur.date_releve) == annee,
+                        filtre_mois(ReleveCompteur.date_releve, annee, mois),
                     )
                     .scalar()
                     or 0
@@ -20,6 +20,7 @@ from src.api.schemas.errors import (
     REPONSES_LISTE,
 )
 from src.api.utils import gerer_exception_api
+from src.core.db.periodes import filtre_annee, filtre_mois
 
 logger = logging.getLogger(__name__)
 
@@ -120,11 +121,10 @@ async def statistiques_budget(
             # Filtrer par pÃ©riode si spÃ©cifiÃ©
             if mois and annee:
                 query = query.filter(
-                    func.extract("month", BudgetFamille.date) == mois,
-                    func.extract("year", BudgetFamille.date) == annee,
+                    filtre_mois(BudgetFamille.date, annee, mois),
                 )
             elif annee:
-                query = query.filter(func.extract("year", BudgetFamille.date) == annee)
+                query = query.filter(filtre_annee(BudgetFamille.date, annee))
 
             # Total
             total = query.with_entities(func.sum(BudgetFamille.montant)).scalar() or 0
@@ -237,8 +237,7 @@ def _charger_historique_budget_6_mois(session: Any) -> list[dict[str, Any]]:
                 func.sum(BudgetFamille.montant).label("total"),
             )
             .filter(
-                func.extract("month", BudgetFamille.date) == m,
-                func.extract("year", BudgetFamille.date) == a,
+                filtre_mois(BudgetFamille.date, a, m),
             )
             .group_by(BudgetFamille.categorie)
             .all()
@@ -366,8 +365,7 @@ async def anomalies_budget(
                     func.sum(BudgetFamille.montant).label("total"),
                 )
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois_courant,
-                    func.extract("year", BudgetFamille.date) == annee_courante,
+                    filtre_mois(BudgetFamille.date, annee_courante, mois_courant),
                 )
                 .group_by(BudgetFamille.categorie)
                 .all()
@@ -388,8 +386,7 @@ async def anomalies_budget(
                         func.sum(BudgetFamille.montant).label("total"),
                     )
                     .filter(
-                        func.extract("month", BudgetFamille.date) == m,
-                        func.extract("year", BudgetFamille.date) == a,
+                        filtre_mois(BudgetFamille.date, a, m),
                     )
                     .group_by(BudgetFamille.categorie)
                     .all()
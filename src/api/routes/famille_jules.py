@@ -814,23 +814,17 @@ async def obtenir_aujourd_hui_histoire(
     """Retourne les souvenirs familiaux correspondant au jour/mois actuel."""
 
     def _query() -> dict[str, Any]:
-        from sqlalchemy import extract
-
+        from src.core.db.periodes import filtre_meme_jour
         from src.core.models.famille import EvenementFamilial, Jalon
 
         aujourd_hui = date.today()
-        mois = aujourd_hui.month
-        jour = aujourd_hui.day
 
         with executer_avec_session() as session:
             elements: list[dict[str, Any]] = []
 
             jalons = (
                 session.query(Jalon)
-                .filter(
-                    extract("month", Jalon.date_atteint) == mois,
-                    extract("day", Jalon.date_atteint) == jour,
-                )
+                .filter(filtre_meme_jour(Jalon.date_atteint, aujourd_hui))
                 .order_by(Jalon.date_atteint.desc())
                 .limit(limite)
                 .all()
@@ -851,8 +845,7 @@ async def obtenir_aujourd_hui_histoire(
                 session.query(EvenementFamilial)
                 .filter(
                     EvenementFamilial.actif.is_(True),
-                    extract("month", EvenementFamilial.date_evenement) == mois,
-                    extract("day", EvenementFamilial.date_evenement) == jour,
+                    filtre_meme_jour(EvenementFamilial.date_evenement, aujourd_hui),
                 )
                 .order_by(EvenementFamilial.date_evenement.desc())
                 .limit(limite)
@@ -264,6 +264,7 @@ async def generer_grille_ia_euromillions(
     - frequences: Numéros chauds
     - retards: Numéros en retard
     - ia_creative: Génération créative par Mistral
+    - monte_carlo: Meilleure grille d'un pool simulé (pondération équilibrée)
     """
     from src.services.jeux.euromillions_ia import obtenir_euromillions_ia_service
 
@@ -279,6 +280,8 @@ async def generer_grille_ia_euromillions(
             grille = service.generer_grille_retards(stats)
         elif strategie == "ia_creative":
             grille = service.generer_grille_ia_creative(stats)
+        elif strategie == "monte_carlo":
+            grille = service.generer_grilles_monte_carlo(stats, nb_grilles=1)[0]
         else:  # equilibree par défaut
             grille = service.generer_grille_equilibree(stats)
         return {
@@ -236,37 +236,9 @@ async def generer_grille_loto(
             numeros = sorted(random.sample(range(1, 50), 5))
             chance = random.randint(1, 10)
             return {"numeros": numeros, "special": [chance], "strategie": strategie}
-        # Weighted sampling par value
-        nums = list(range(1, 50))
-        weights = []
-        for n in nums:
-            stat = stats.numeros_principaux.get(n)
-            if stat:
-                w = max(stat.value, 0.1)
-            else:
-                w = 0.1
-            weights.append(w)
-        numeros = []
-        available = list(zip(nums, weights, strict=False))
-        for _ in range(5):
-            chosen = random.choices(
-                [x[0] for x in available],
-                weights=[x[1] for x in available],
-                k=1,
-            )[0]
-            numeros.append(chosen)
-            available = [(n, w) for n, w in available if n != chosen]
-        # Chance
-        chance_nums = list(range(1, 11))
-        chance_weights = []
-        for n in chance_nums:
-            stat = stats.numeros_chance.get(n)
-            if stat:
-                w = max(stat.value, 0.1)
-            else:
-                w = 0.1
-            chance_weights.append(w)
-        chance = random.choices(chance_nums, weights=chance_weights, k=1)[0]
+        # Grille tirée parmi les meilleures d'un pool simulé (numéros pondérés par value)
+        grille = svc.tirer_grille(stats)
+        numeros, chance = grille["numeros"], grille["numero_chance"]
         result = {"numeros": sorted(numeros), "special": [chance], "strategie": strategie}
         if payload.sauvegarder:
             from src.services.jeux import obtenir_loto_crud_service
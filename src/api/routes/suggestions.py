@@ -453,10 +453,10 @@ async def predictions_courses(
     service = obtenir_ml_predictions()
     noms = [a.strip() for a in articles.split(",") if a.strip()]
 
-    predictions = []
-    for article in noms:
-        pred = service.consommation.predire(article, horizon_jours=horizon)
-        predictions.append(pred.model_dump() if hasattr(pred, "model_dump") else pred.__dict__)
+    predictions = [
+        pred.model_dump() if hasattr(pred, "model_dump") else pred.__dict__
+        for pred in service.consommation.predire_lot(noms, horizon_jours=horizon)
+    ]
 
     return {"predictions": predictions, "horizon_jours": horizon}
 
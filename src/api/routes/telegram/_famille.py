@@ -44,9 +44,10 @@ async def _envoyer_resume_jules(chat_id: str) -> None:
 
 
 async def _envoyer_resume_budget(chat_id: str) -> None:
-    from sqlalchemy import extract, func
+    from sqlalchemy import func
 
     from src.core.db import obtenir_contexte_db
+    from src.core.db.periodes import filtre_mois
     from src.core.models.famille import BudgetFamille
     from src.services.integrations.telegram import (
         envoyer_message_interactif,
@@ -58,8 +59,7 @@ async def _envoyer_resume_budget(chat_id: str) -> None:
         total = (
             session.query(func.sum(BudgetFamille.montant))
             .filter(
-                extract("month", BudgetFamille.date) == aujourd_hui.month,
-                extract("year", BudgetFamille.date) == aujourd_hui.year,
+                filtre_mois(BudgetFamille.date, aujourd_hui.year, aujourd_hui.month),
             )
             .scalar()
         ) or 0
@@ -67,8 +67,7 @@ async def _envoyer_resume_budget(chat_id: str) -> None:
         top_categories = (
             session.query(BudgetFamille.categorie, func.sum(BudgetFamille.montant).label("total"))
             .filter(
-                extract("month", BudgetFamille.date) == aujourd_hui.month,
-                extract("year", BudgetFamille.date) == aujourd_hui.year,
+                filtre_mois(BudgetFamille.date, aujourd_hui.year, aujourd_hui.month),
             )
             .group_by(BudgetFamille.categorie)
             .order_by(func.sum(BudgetFamille.montant).desc())
@@ -280,10 +280,11 @@ class AdminAuditLogsResponse(BaseModel):
     """Liste paginée des logs d'audit."""
 
     items: list[AdminAuditLogEntry] = Field(default_factory=list)
-    total: int = 0
+    total: int | None = 0  # None en pagination par curseur (non compté)
     page: int = 1
     par_page: int = 50
-    pages_totales: int = 1
+    pages_totales: int | None = 1
+    curseur_suivant: str | None = None
 
 
 class AdminAuditStatsResponse(BaseModel):
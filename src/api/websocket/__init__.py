@@ -3,6 +3,7 @@ Package WebSocket — Collaboration temps réel multi-modules.
 
 Modules:
 - manager: ConnectionManager générique partagé
+- diffusion: Encodage unique, files d'envoi bornées, backplane inter-workers
 - types: Types de messages WebSocket extensibles
 - planning: Collaboration sur le planning repas
 - notes: Collaboration sur les notes
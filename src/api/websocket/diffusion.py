@@ -0,0 +1,464 @@
+"""
+Diffusion WebSocket multi-workers.
+
+- Encodage unique: un message broadcasté est sérialisé une seule fois en
+  texte JSON, puis envoyé tel quel (``send_text``) à chaque socket.
+- Files d'envoi bornées par connexion: un client lent ne bloque pas le
+  broadcast; si sa file déborde, la connexion est fermée (code 1013) et le
+  client se reconnecte puis se resynchronise.
+- Backplane pub/sub: chaque broadcast est republié vers les autres workers
+  uvicorn via Redis (``REDIS_URL``) ou PostgreSQL ``LISTEN/NOTIFY``.
+  Sélection via ``WS_BACKPLANE`` (auto, redis, postgres, local).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+CANAL_DIFFUSION = "ws_diffusion"
+TAILLE_FILE_ENVOI = 256
+TIMEOUT_ENVOI_S = 5.0
+# Limite PostgreSQL NOTIFY: 8000 octets par payload
+TAILLE_MAX_NOTIFY = 7900
+
+
+def encoder_message(message: dict[str, Any]) -> str:
+    """Sérialise un message une seule fois (même format que ``send_json``)."""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# ═══════════════════════════════════════════════════════════
+# CONNEXION AVEC FILE D'ENVOI BORNÉE
+# ═══════════════════════════════════════════════════════════
+
+
+class ConnexionWS:
+    """Socket + file d'envoi bornée consommée par une tâche dédiée.
+
+    ``envoyer()`` ne bloque jamais: le message est déposé dans la file de la
+    connexion (y compris depuis une autre boucle ou un thread, via
+    ``call_soon_threadsafe``) et la tâche d'envoi l'écrit sur la socket.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        taille_file: int = TAILLE_FILE_ENVOI,
+        timeout_envoi: float = TIMEOUT_ENVOI_S,
+    ):
+        self.websocket = websocket
+        self.timeout_envoi = timeout_envoi
+        self._file: asyncio.Queue[str] = asyncio.Queue(maxsize=taille_file)
+        self._boucle = asyncio.get_running_loop()
+        self._fermee = False
+        self._tache = self._boucle.create_task(self._boucle_envoi())
+
+    @property
+    def fermee(self) -> bool:
+        return self._fermee
+
+    def envoyer(self, payload: str) -> bool:
+        """Dépose un message pré-encodé dans la file. Retourne False si rejeté."""
+        if self._fermee:
+            return False
+
+        try:
+            courante = asyncio.get_running_loop()
+        except RuntimeError:
+            courante = None
+
+        if courante is self._boucle:
+            return self._deposer(payload)
+
+        try:
+            self._boucle.call_soon_threadsafe(self._deposer, payload)
+        except RuntimeError:
+            # Boucle de la connexion déjà fermée
+            self._fermee = True
+            return False
+        return True
+
+    def _deposer(self, payload: str) -> bool:
+        if self._fermee:
+            return False
+        try:
+            self._file.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(
+                "WS: file d'envoi saturée (%d messages), fermeture du client lent",
+                self._file.maxsize,
+            )
+            obtenir_diffuseur().statistiques["connexions_saturees"] += 1
+            self._fermee = True
+            self._tache.cancel()
+            self._boucle.create_task(self._fermer_socket(code=1013))
+            return False
+
+    async def _boucle_envoi(self) -> None:
+        while True:
+            payload = await self._file.get()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(payload), timeout=self.timeout_envoi
+                )
+            except TimeoutError:
+                logger.warning("Timeout envoi WS: socket non réactive")
+            except Exception as e:
+                logger.warning(f"Erreur envoi WS: {e}")
+                self._fermee = True
+                return
+
+    async def _fermer_socket(self, code: int) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), timeout=self.timeout_envoi)
+        except Exception:
+            logger.debug("Fermeture socket WS échouée", exc_info=True)
+
+    def fermer(self) -> None:
+        """Arrête la tâche d'envoi (la socket est fermée par son propriétaire)."""
+        self._fermee = True
+        if not self._tache.done():
+            try:
+                self._boucle.call_soon_threadsafe(self._tache.cancel)
+            except RuntimeError:
+                pass
+
+
+# ═══════════════════════════════════════════════════════════
+# BACKPLANES PUB/SUB
+# ═══════════════════════════════════════════════════════════
+
+
+class Backplane(Protocol):
+    """Transport pub/sub entre workers."""
+
+    nom: str
+
+    def demarrer(self, callback: Any) -> None: ...
+
+    def publier(self, donnees: str) -> None: ...
+
+    def arreter(self) -> None: ...
+
+
+class BackplaneLocal:
+    """Mono-processus: aucune republication."""
+
+    nom = "local"
+
+    def demarrer(self, callback: Any) -> None:
+        return None
+
+    def publier(self, donnees: str) -> None:
+        return None
+
+    def arreter(self) -> None:
+        return None
+
+
+class _BackplaneThread(ABC):
+    """Base commune: écoute dans un thread démon, publication sérialisée.
+
+    La publication passe par un exécuteur mono-thread pour conserver l'ordre
+    des messages sans bloquer la boucle asyncio.
+    """
+
+    nom = "thread"
+
+    def __init__(self, delai_reconnexion_s: float = 2.0):
+        self.delai_reconnexion_s = delai_reconnexion_s
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ws-{self.nom}")
+
+    def demarrer(self, callback: Any) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._boucle_reconnexion,
+            args=(callback,),
+            name=f"ws-backplane-{self.nom}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _boucle_reconnexion(self, callback: Any) -> None:
+        while not self._stop.is_set():
+            try:
+                self._ecouter(callback)
+            except Exception as exc:
+                if self._stop.is_set():
+                    break
+                logger.warning(
+                    "Backplane WS %s indisponible (%s), reconnexion dans %.1fs",
+                    self.nom,
+                    exc,
+                    self.delai_reconnexion_s,
+                )
+                time.sleep(self.delai_reconnexion_s)
+
+    @abstractmethod
+    def _ecouter(self, callback: Any) -> None:
+        """Écoute le canal jusqu'à déconnexion (lève une exception pour reconnecter)."""
+
+    def publier(self, donnees: str) -> None:
+        self._executeur.submit(self._publier_sync, donnees)
+
+    @abstractmethod
+    def _publier_sync(self, donnees: str) -> None:
+        """Publie un message déjà encodé sur le canal (appel bloquant)."""
+
+    def arreter(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+
+class BackplanePostgres(_BackplaneThread):
+    """PostgreSQL ``LISTEN/NOTIFY`` (même mécanique que l'invalidation cache)."""
+
+    nom = "postgres"
+
+    def _ecouter(self, callback: Any) -> None:
+        from src.core.caching.invalidation_listener import extraire_payload_notification
+        from src.core.db import obtenir_moteur
+
+        raw_conn = obtenir_moteur().raw_connection()
+        try:
+            dbapi_conn = raw_conn.connection if hasattr(raw_conn, "connection") else raw_conn
+            try:
+                dbapi_conn.set_isolation_level(0)
+            except Exception:
+                dbapi_conn.autocommit = True
+
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute(f"LISTEN {CANAL_DIFFUSION};")
+            finally:
+                cursor.close()
+
+            logger.info("✅ Backplane WS actif sur canal PostgreSQL '%s'", CANAL_DIFFUSION)
+
+            while not self._stop.is_set():
+                pret, _, _ = select.select([dbapi_conn], [], [], 1.0)
+                if not pret:
+                    continue
+                if hasattr(dbapi_conn, "poll"):
+                    dbapi_conn.poll()
+                notifies = getattr(dbapi_conn, "notifies", None)
+                if not isinstance(notifies, list):
+                    continue
+                while notifies:
+                    callback(extraire_payload_notification(notifies.pop(0)))
+        finally:
+            try:
+                raw_conn.close()
+            except Exception:
+                logger.debug("Fermeture raw_connection WS échouée", exc_info=True)
+
+    def publier(self, donnees: str) -> None:
+        if len(donnees.encode("utf-8")) > TAILLE_MAX_NOTIFY:
+            logger.warning(
+                "Message WS trop volumineux pour NOTIFY (%d octets), diffusion locale uniquement",
+                len(donnees.encode("utf-8")),
+            )
+            return
+        super().publier(donnees)
+
+    def _publier_sync(self, donnees: str) -> None:
+        from sqlalchemy import text
+
+        from src.core.db import obtenir_moteur
+
+        try:
+            with obtenir_moteur().begin() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:canal, :payload)"),
+                    {"canal": CANAL_DIFFUSION, "payload": donnees},
+                )
+        except Exception:
+            logger.warning("Publication NOTIFY WS échouée", exc_info=True)
+
+
+class BackplaneRedis(_BackplaneThread):
+    """Redis pub/sub (utilisé quand ``REDIS_URL`` est configuré)."""
+
+    nom = "redis"
+
+    def __init__(self, url: str, delai_reconnexion_s: float = 2.0):
+        import redis
+
+        super().__init__(delai_reconnexion_s)
+        self._client = redis.from_url(url, decode_responses=True)
+
+    def _ecouter(self, callback: Any) -> None:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(CANAL_DIFFUSION)
+            logger.info("✅ Backplane WS actif sur canal Redis '%s'", CANAL_DIFFUSION)
+            while not self._stop.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    callback(message["data"])
+        finally:
+            pubsub.close()
+
+    def _publier_sync(self, donnees: str) -> None:
+        try:
+            self._client.publish(CANAL_DIFFUSION, donnees)
+        except Exception:
+            logger.warning("Publication Redis WS échouée", exc_info=True)
+
+
+def creer_backplane(mode: str | None = None) -> Backplane:
+    """Choisit le backplane: Redis si configuré, sinon PostgreSQL, sinon local."""
+    from src.core.config import obtenir_parametres
+
+    parametres = obtenir_parametres()
+    mode = (mode or getattr(parametres, "WS_BACKPLANE", "auto") or "auto").lower()
+
+    if mode in ("auto", "redis") and parametres.REDIS_URL:
+        from src.core.caching.redis import est_redis_disponible
+
+        if est_redis_disponible():
+            return BackplaneRedis(parametres.REDIS_URL)
+
+    if mode in ("auto", "postgres"):
+        try:
+            from src.core.db import obtenir_moteur
+
+            if obtenir_moteur().dialect.name == "postgresql":
+                return BackplanePostgres()
+        except Exception:
+            logger.debug("Moteur DB indisponible pour le backplane WS", exc_info=True)
+
+    return BackplaneLocal()
+
+
+# ═══════════════════════════════════════════════════════════
+# DIFFUSEUR (routage local + republication inter-workers)
+# ═══════════════════════════════════════════════════════════
+
+
+class DiffuseurWS:
+    """Relie les ConnectionManager de ce worker au backplane.
+
+    Enveloppe inter-workers: ``[origine, type, resource_id, exclu]\\n<payload>``
+    — le payload déjà encodé n'est jamais re-sérialisé.
+    """
+
+    def __init__(self, backplane: Backplane | None = None):
+        self.origine = uuid.uuid4().hex[:12]
+        self._backplane = backplane
+        self._managers: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._demarre = False
+        self.statistiques: dict[str, int] = {
+            "publies": 0,
+            "recus": 0,
+            "connexions_saturees": 0,
+        }
+
+    @property
+    def backplane(self) -> Backplane:
+        if self._backplane is None:
+            self._backplane = creer_backplane()
+        return self._backplane
+
+    def enregistrer(self, manager: Any) -> None:
+        """Associe un manager à son type de ressource (le dernier gagne)."""
+        self._managers[manager.resource_type] = manager
+
+    def demarrer(self) -> None:
+        """Démarre l'écoute du backplane (idempotent)."""
+        with self._lock:
+            if self._demarre:
+                return
+            self._demarre = True
+        self.backplane.demarrer(self.recevoir)
+        logger.info("Diffusion WS: backplane %s (worker %s)", self.backplane.nom, self.origine)
+
+    def publier(
+        self, resource_type: str, resource_id: int, payload: str, exclude_user: str | None
+    ) -> None:
+        """Republie un message déjà diffusé localement vers les autres workers."""
+        if isinstance(self.backplane, BackplaneLocal):
+            return
+        entete = json.dumps([self.origine, resource_type, resource_id, exclude_user])
+        self.backplane.publier(f"{entete}\n{payload}")
+        self.statistiques["publies"] += 1
+
+    def recevoir(self, donnees: str) -> None:
+        """Callback backplane: diffuse localement un message d'un autre worker."""
+        try:
+            entete, payload = donnees.split("\n", 1)
+            origine, resource_type, resource_id, exclude_user = json.loads(entete)
+        except Exception:
+            logger.debug("Enveloppe WS invalide ignorée", exc_info=True)
+            return
+
+        if origine == self.origine:
+            return
+
+        manager = self._managers.get(resource_type)
+        if manager is None:
+            return
+
+        self.statistiques["recus"] += 1
+        manager.diffuser_local(resource_id, payload, exclude_user)
+
+    def arreter(self) -> None:
+        with self._lock:
+            self._demarre = False
+        if self._backplane is not None:
+            self._backplane.arreter()
+
+
+_diffuseur: DiffuseurWS | None = None
+_diffuseur_lock = threading.Lock()
+
+
+def obtenir_diffuseur() -> DiffuseurWS:
+    """Retourne le diffuseur WS du worker courant (singleton)."""
+    global _diffuseur
+    if _diffuseur is None:
+        with _diffuseur_lock:
+            if _diffuseur is None:
+                _diffuseur = DiffuseurWS()
+    return _diffuseur
+
+
+def arreter_diffusion() -> None:
+    """Arrête le backplane (appelé à l'arrêt de l'application)."""
+    if _diffuseur is not None:
+        _diffuseur.arreter()
+
+
+__all__ = [
+    "BackplaneLocal",
+    "BackplanePostgres",
+    "BackplaneRedis",
+    "ConnexionWS",
+    "DiffuseurWS",
+    "arreter_diffusion",
+    "creer_backplane",
+    "encoder_message",
+    "obtenir_diffuseur",
+]
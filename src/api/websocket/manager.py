@@ -3,6 +3,10 @@ Gestionnaire de connexions WebSocket générique.
 
 Partagé entre tous les modules de collaboration temps réel.
 Paramétré par un type de ressource (liste, planning, note, projet).
+
+Les messages sont encodés une fois puis déposés dans la file bornée de
+chaque connexion; les broadcasts sont republiés vers les autres workers
+via le backplane (voir ``diffusion``).
 """
 
 import asyncio
@@ -13,6 +17,8 @@ from typing import Any
 
 from fastapi import WebSocket
 
+from .diffusion import ConnexionWS, encoder_message, obtenir_diffuseur
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,14 +27,17 @@ class ConnectionManager:
     Gestionnaire de connexions WebSocket générique.
 
     Maintient les connexions actives par resource_id
-    et gère le broadcast des messages.
+    et gère le broadcast des messages (local + autres workers).
     """
 
     def __init__(self, resource_type: str = "resource"):
         self.resource_type = resource_type
-        self._connexions: dict[int, dict[str, WebSocket]] = defaultdict(dict)
+        self._connexions: dict[int, dict[str, ConnexionWS]] = defaultdict(dict)
         self._users: dict[int, dict[str, dict[str, Any]]] = defaultdict(dict)
+        # id(websocket) → ConnexionWS, pour router send_personal dans la même file
+        self._par_socket: dict[int, ConnexionWS] = {}
         self._lock = asyncio.Lock()
+        obtenir_diffuseur().enregistrer(self)
 
     async def connect(
         self,
@@ -39,9 +48,16 @@ class ConnectionManager:
     ) -> None:
         """Connecte un utilisateur à une ressource."""
         await websocket.accept()
+        obtenir_diffuseur().demarrer()
 
+        connexion = ConnexionWS(websocket)
         async with self._lock:
-            self._connexions[resource_id][user_id] = websocket
+            precedente = self._connexions[resource_id].get(user_id)
+            if precedente is not None:
+                precedente.fermer()
+                self._par_socket.pop(id(precedente.websocket), None)
+            self._connexions[resource_id][user_id] = connexion
+            self._par_socket[id(websocket)] = connexion
             self._users[resource_id][user_id] = {
                 "username": username,
                 "connected_at": datetime.now(UTC).isoformat(),
@@ -74,8 +90,11 @@ class ConnectionManager:
         """Déconnecte un utilisateur."""
         async with self._lock:
             username = self._users[resource_id].get(user_id, {}).get("username", "Inconnu")
-            self._connexions[resource_id].pop(user_id, None)
+            connexion = self._connexions[resource_id].pop(user_id, None)
             self._users[resource_id].pop(user_id, None)
+            if connexion is not None:
+                connexion.fermer()
+                self._par_socket.pop(id(connexion.websocket), None)
 
             if not self._connexions[resource_id]:
                 del self._connexions[resource_id]
@@ -100,23 +119,34 @@ class ConnectionManager:
         message: dict[str, Any],
         exclude_user: str | None = None,
     ) -> None:
-        """Envoie un message à tous les utilisateurs d'une ressource."""
-        connexions = self._connexions.get(resource_id, {})
-        tasks: list[asyncio.Task[None]] = []
-        for uid, ws in connexions.items():
-            if uid != exclude_user:
-                tasks.append(asyncio.ensure_future(self._safe_send(ws, message)))
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        """Envoie un message à tous les utilisateurs d'une ressource, tous workers confondus.
+
+        Le message est sérialisé une seule fois; l'envoi effectif est asynchrone
+        (files par connexion), un client lent ne retarde donc pas les autres.
+        """
+        payload = encoder_message(message)
+        self.diffuser_local(resource_id, payload, exclude_user)
+        obtenir_diffuseur().publier(self.resource_type, resource_id, payload, exclude_user)
+
+    def diffuser_local(
+        self, resource_id: int, payload: str, exclude_user: str | None = None
+    ) -> int:
+        """Dépose un message pré-encodé dans la file des connexions de ce worker."""
+        envoyes = 0
+        for uid, connexion in list(self._connexions.get(resource_id, {}).items()):
+            if uid != exclude_user and connexion.envoyer(payload):
+                envoyes += 1
+        return envoyes
 
     async def send_personal(self, websocket: WebSocket, message: dict[str, Any]) -> None:
-        """Envoie un message à un client spécifique."""
-        await self._safe_send(websocket, message)
-
-    async def _safe_send(self, websocket: WebSocket, message: dict[str, Any]) -> None:
-        """Envoie un message avec gestion d'erreur."""
+        """Envoie un message à un client spécifique (ordre préservé avec les broadcasts)."""
+        payload = encoder_message(message)
+        connexion = self._par_socket.get(id(websocket))
+        if connexion is not None and not connexion.fermee:
+            connexion.envoyer(payload)
+            return
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(payload)
         except Exception as e:
             logger.warning(f"Erreur envoi WS {self.resource_type}: {e}")
 
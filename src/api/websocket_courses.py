@@ -25,8 +25,6 @@ Usage:
     }));
 """
 
-import asyncio
-import json
 import logging
 from collections import defaultdict
 from datetime import UTC, datetime
@@ -36,6 +34,7 @@ from typing import Any
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
 from src.api.utils import executer_async, executer_avec_session
+from src.api.websocket.manager import ConnectionManager as BaseConnectionManager
 
 logger = logging.getLogger(__name__)
 
@@ -73,120 +72,17 @@ class WSMessageType(StrEnum):
 # ═══════════════════════════════════════════════════════════
 
 
-class ConnectionManager:
+class ConnectionManager(BaseConnectionManager):
     """
     Gestionnaire de connexions WebSocket par liste de courses.
 
     Maintient la liste des connexions actives par liste_id
-    et gère le broadcast des messages à tous les clients d'une liste.
+    et gère le broadcast des messages à tous les clients d'une liste,
+    y compris ceux connectés à d'autres workers (backplane partagé).
     """
 
     def __init__(self):
-        # {liste_id: {user_id: WebSocket}}
-        self._connexions: dict[int, dict[str, WebSocket]] = defaultdict(dict)
-        # {liste_id: {user_id: {"username": str, "connected_at": datetime}}}
-        self._users: dict[int, dict[str, dict[str, Any]]] = defaultdict(dict)
-
-    async def connect(
-        self,
-        websocket: WebSocket,
-        liste_id: int,
-        user_id: str,
-        username: str = "Anonyme",
-    ) -> None:
-        """Connecte un utilisateur à une liste."""
-        await websocket.accept()
-
-        self._connexions[liste_id][user_id] = websocket
-        self._users[liste_id][user_id] = {
-            "username": username,
-            "connected_at": datetime.now(UTC).isoformat(),
-        }
-
-        logger.info(f"🔌 WS: {username} ({user_id}) connecté à liste #{liste_id}")
-
-        # Notifier les autres utilisateurs
-        await self.broadcast(
-            liste_id,
-            {
-                "type": WSMessageType.USER_JOINED,
-                "user_id": user_id,
-                "username": username,
-                "timestamp": datetime.now(UTC).isoformat(),
-            },
-            exclude_user=user_id,
-        )
-
-        # Envoyer la liste des utilisateurs connectés au nouvel arrivant
-        await self.send_personal(
-            websocket,
-            {
-                "type": WSMessageType.USERS_LIST,
-                "users": [{"user_id": uid, **info} for uid, info in self._users[liste_id].items()],
-            },
-        )
-
-    async def disconnect(self, liste_id: int, user_id: str) -> None:
-        """Déconnecte un utilisateur d'une liste."""
-        username = self._users.get(liste_id, {}).get(user_id, {}).get("username", "Inconnu")
-        self._connexions.get(liste_id, {}).pop(user_id, None)
-        self._users.get(liste_id, {}).pop(user_id, None)
-
-        logger.info(f"🔌 WS: {username} ({user_id}) déconnecté de liste #{liste_id}")
-
-        # Notifier les autres utilisateurs avant de supprimer les conteneurs vides.
-        # Les envois sont protégés par un timeout dans _safe_send pour éviter les
-        # blocages quand un client se ferme au même moment.
-        await self.broadcast(
-            liste_id,
-            {
-                "type": WSMessageType.USER_LEFT,
-                "user_id": user_id,
-                "username": username,
-                "timestamp": datetime.now(UTC).isoformat(),
-            },
-            exclude_user=user_id,
-        )
-
-        # Nettoyer les listes vides
-        if liste_id in self._connexions and not self._connexions[liste_id]:
-            del self._connexions[liste_id]
-        if liste_id in self._users and not self._users[liste_id]:
-            del self._users[liste_id]
-
-    async def broadcast(
-        self,
-        liste_id: int,
-        message: dict[str, Any],
-        exclude_user: str | None = None,
-    ) -> None:
-        """Envoie un message à tous les utilisateurs d'une liste."""
-        connexions = self._connexions.get(liste_id, {})
-
-        for uid, ws in list(connexions.items()):
-            if uid != exclude_user:
-                await self._safe_send(ws, message)
-
-    async def send_personal(self, websocket: WebSocket, message: dict[str, Any]) -> None:
-        """Envoie un message à un client spécifique."""
-        await self._safe_send(websocket, message)
-
-    async def _safe_send(self, websocket: WebSocket, message: dict[str, Any]) -> None:
-        """Envoie un message avec garde-fou contre les sockets bloquées."""
-        try:
-            await asyncio.wait_for(websocket.send_json(message), timeout=1.0)
-        except TimeoutError:
-            logger.warning("Timeout envoi WS: socket non réactive")
-        except Exception as e:
-            logger.warning(f"Erreur envoi WS: {e}")
-
-    def get_connected_users(self, liste_id: int) -> list[dict[str, Any]]:
-        """Retourne la liste des utilisateurs connectés à une liste."""
-        return [{"user_id": uid, **info} for uid, info in self._users.get(liste_id, {}).items()]
-
-    def get_connection_count(self, liste_id: int) -> int:
-        """Retourne le nombre de connexions pour une liste."""
-        return len(self._connexions.get(liste_id, {}))
+        super().__init__("courses")
 
 
 # Instance globale
@@ -67,6 +67,16 @@ _LAZY_IMPORTS: dict[str, tuple[str, str]] = {
     "BulkheadPolicy": (".resilience", "BulkheadPolicy"),
     "FallbackPolicy": (".resilience", "FallbackPolicy"),
     "PolicyComposee": (".resilience", "PolicyComposee"),
+    "PolicyAsync": (".resilience", "PolicyAsync"),
+    "BudgetRetry": (".resilience", "BudgetRetry"),
+    "RetryPolicyAsync": (".resilience", "RetryPolicyAsync"),
+    "TimeoutPolicyAsync": (".resilience", "TimeoutPolicyAsync"),
+    "BulkheadPolicyAsync": (".resilience", "BulkheadPolicyAsync"),
+    "ConcurrenceAdaptativePolicy": (".resilience", "ConcurrenceAdaptativePolicy"),
+    "FallbackPolicyAsync": (".resilience", "FallbackPolicyAsync"),
+    "PolicyComposeeAsync": (".resilience", "PolicyComposeeAsync"),
+    "ErreurSurcharge": (".resilience", "ErreurSurcharge"),
+    "obtenir_limiteur": (".resilience", "obtenir_limiteur"),
     # Observability (Correlation ID)
     "ContexteExecution": (".observability", "ContexteExecution"),
     "obtenir_contexte": (".observability", "obtenir_contexte"),
@@ -11,7 +11,7 @@ from .circuit_breaker import (
 )
 from .client import ClientIA, obtenir_client_ia
 from .embeddings import embedder_texte, embedder_texte_local, signature_ann, similarite_cosine
-from .parser import AnalyseurIA, analyser_liste_reponse
+from .parser import AnalyseurIA, AnalyseurJSONIncremental, analyser_liste_reponse, localiser_json
 from .rate_limit import RateLimitIA
 from .router import Fournisseur, RouteurIA, obtenir_routeur_ia
 from .streaming import StreamingMixin
@@ -22,6 +22,8 @@ __all__ = [
     "obtenir_client_ia",
     "AnalyseurIA",
     "analyser_liste_reponse",
+    "AnalyseurJSONIncremental",
+    "localiser_json",
     "CacheIA",
     "CircuitBreaker",
     "EtatCircuit",
@@ -25,6 +25,7 @@ from .embeddings import (
     signature_ann,
     similarite_cosine,
 )
+from .gabarits import partie_variable
 
 logger = logging.getLogger(__name__)
 
@@ -254,9 +255,11 @@ class CacheIA:
         logger.info(f"Nettoyage cache IA (âge max: {age_max_secondes}s)")
 
     @staticmethod
-    def _cle_index_semantique(systeme: str, modele: str) -> str:
-        """Construit la clé d'index sémantique isolée par système et modèle."""
-        identifiant = hashlib.sha256(f"{modele}|{systeme}".encode()).hexdigest()[:16]
+    def _cle_index_semantique(systeme: str, modele: str, gabarit: str | None = None) -> str:
+        """Construit la clé d'index sémantique isolée par système, modèle et gabarit."""
+        # Sans gabarit, la clé reste celle des index déjà en cache
+        cle = f"{modele}|{systeme}" if gabarit is None else f"{modele}|{systeme}|{gabarit}"
+        identifiant = hashlib.sha256(cle.encode()).hexdigest()[:16]
         return f"{CacheIA.PREFIXE_INDEX_SEMANTIQUE}{identifiant}"
 
     @staticmethod
@@ -269,7 +272,10 @@ class CacheIA:
         ttl: int,
     ) -> None:
         """Mémorise les métadonnées prompt pour la recherche sémantique future."""
-        cle_index = CacheIA._cle_index_semantique(systeme=systeme, modele=modele)
+        # Prompts issus d'un gabarit compilé: seule la partie variable est comparée
+        # (le préfixe commun rendrait tous ces prompts « proches »)
+        gabarit, prompt = partie_variable(prompt)
+        cle_index = CacheIA._cle_index_semantique(systeme=systeme, modele=modele, gabarit=gabarit)
         index = _cache().get(cle_index, default=[])
         if not isinstance(index, list):
             index = []
@@ -308,12 +314,13 @@ class CacheIA:
         ttl: int | None,
     ) -> str | None:
         """Recherche une réponse de prompt sémantiquement proche."""
-        cle_index = CacheIA._cle_index_semantique(systeme=systeme, modele=modele)
+        gabarit, variable = partie_variable(prompt)
+        cle_index = CacheIA._cle_index_semantique(systeme=systeme, modele=modele, gabarit=gabarit)
         index = _cache().get(cle_index, default=[])
         if not isinstance(index, list) or not index:
             return None
 
-        prompt_vecteur, provider = embedder_texte(prompt, prefer_externe=True)
+        prompt_vecteur, provider = embedder_texte(variable, prefer_externe=True)
         signature_cible = signature_ann(prompt_vecteur)
         meilleur_score = 0.0
         meilleure_entree: dict[str, Any] | None = None
@@ -14,6 +14,7 @@ from typing import Any
 
 import httpx
 
+from ..async_utils import obtenir_client_http
 from ..config import obtenir_parametres
 from ..exceptions import ErreurLimiteDebit, ErreurServiceIA
 from .streaming import StreamingMixin
@@ -123,10 +124,14 @@ class ClientIA(VisionMixin, StreamingMixin):
         if not peut_appeler:
             raise ErreurLimiteDebit(message_erreur, message_utilisateur=message_erreur)
 
-        # Vérifier cache
+        # Vérifier cache (hors boucle: la recherche sémantique peut appeler l'API d'embeddings)
         if utiliser_cache:
-            cache = CacheIA.obtenir(
-                prompt=prompt, systeme=prompt_systeme, temperature=temperature, modele=self.modele
+            cache = await asyncio.to_thread(
+                CacheIA.obtenir,
+                prompt=prompt,
+                systeme=prompt_systeme,
+                temperature=temperature,
+                modele=self.modele,
             )
 
             if cache:
@@ -149,7 +154,8 @@ class ClientIA(VisionMixin, StreamingMixin):
 
                 # Cacher résultat
                 if utiliser_cache:
-                    CacheIA.definir(
+                    await asyncio.to_thread(
+                        CacheIA.definir,
                         prompt=prompt,
                         reponse=reponse,
                         systeme=prompt_systeme,
@@ -258,36 +264,37 @@ class ClientIA(VisionMixin, StreamingMixin):
 
         messages.append({"role": "user", "content": prompt})
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            reponse = await client.post(
-                f"{self.url_base}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.cle_api}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.modele,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    **({"response_format": response_format} if response_format else {}),
-                },
+        client = obtenir_client_http()
+        reponse = await client.post(
+            f"{self.url_base}/chat/completions",
+            timeout=self.timeout,
+            headers={
+                "Authorization": f"Bearer {self.cle_api}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.modele,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                **({"response_format": response_format} if response_format else {}),
+            },
+        )
+
+        reponse.raise_for_status()
+        resultat = reponse.json()
+
+        # Vérifier que la réponse contient au moins un choix
+        if not resultat.get("choices") or len(resultat["choices"]) == 0:
+            raise ErreurServiceIA(
+                "Réponse IA invalide: pas de contenu",
+                message_utilisateur="Service IA retourné une réponse vide",
             )
 
-            reponse.raise_for_status()
-            resultat = reponse.json()
-
-            # Vérifier que la réponse contient au moins un choix
-            if not resultat.get("choices") or len(resultat["choices"]) == 0:
-                raise ErreurServiceIA(
-                    "Réponse IA invalide: pas de contenu",
-                    message_utilisateur="Service IA retourné une réponse vide",
-                )
-
-            contenu = resultat["choices"][0]["message"]["content"]
-            logger.info(f"[OK] Réponse reçue ({len(contenu)} caractères)")
+        contenu = resultat["choices"][0]["message"]["content"]
+        logger.info(f"[OK] Réponse reçue ({len(contenu)} caractères)")
 
-            return contenu
+        return contenu
 
     # ═══════════════════════════════════════════════════════════
     # HELPERS SYNCHRONES
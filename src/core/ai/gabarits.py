@@ -0,0 +1,182 @@
+"""
+Gabarits de prompts compilés — préfixe statique stable, contexte borné.
+
+Les gros prompts (planning, enrichissement de recettes) étaient reconstruits
+par concaténation à chaque appel, avec les consignes statiques mêlées aux
+données variables. Un ``GabaritPrompt`` est compilé une seule fois:
+
+- Les sections statiques (consignes, schéma JSON, règles) sont assemblées en
+  un préfixe identique octet pour octet d'un appel à l'autre, placé en tête
+  du prompt: le cache de préfixe côté fournisseur et les clés exactes de
+  ``CacheIA`` peuvent alors servir
+- Le préfixe est identifié par une empreinte SHA-256 (``empreinte``); les
+  gabarits compilés sont enregistrés pour que ``CacheIA`` compare
+  sémantiquement la seule partie variable des prompts (``partie_variable``)
+- Les sections dynamiques sont rendues après le préfixe et tronquées, par
+  priorité croissante, pour tenir dans un budget de tokens estimé
+  localement (``estimer_tokens``, sans appel réseau ni tokenizer externe)
+
+Usage:
+    from src.core.ai.gabarits import GabaritPrompt, SectionDynamique
+
+    GABARIT = GabaritPrompt("resume", ["Résume en JSON.", "RÈGLES: ..."])
+    rendu = GABARIT.rendre(
+        [SectionDynamique("notes", "NOTES:\\n- a\\n- b", priorite=1, par_lignes=True)],
+        budget_tokens=2000,
+    )
+    rendu.texte  # préfixe statique + sections retenues
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "GabaritPrompt",
+    "PromptRendu",
+    "SectionDynamique",
+    "estimer_tokens",
+    "partie_variable",
+]
+
+# Mots, nombres, ponctuation isolée: approximation des découpages BPE
+_MOTIF_JETONS = re.compile(r"\w+|[^\w\s]")
+_CARACTERES_PAR_SOUS_MOT = 4
+
+_GABARITS: dict[str, GabaritPrompt] = {}
+_VERROU = threading.Lock()
+
+
+def estimer_tokens(texte: str) -> int:
+    """Estimation locale du nombre de tokens d'un texte.
+
+    Chaque signe de ponctuation compte pour un token, chaque mot pour un
+    token par tranche de 4 caractères (les mots longs et accentués sont
+    découpés en sous-mots par les tokenizers BPE). L'erreur reste de l'ordre
+    de 10-15 % sur du français, suffisant pour borner un contexte.
+    """
+    return sum(
+        1 + (len(jeton) - 1) // _CARACTERES_PAR_SOUS_MOT for jeton in _MOTIF_JETONS.findall(texte)
+    )
+
+
+@dataclass(frozen=True)
+class SectionDynamique:
+    """Section variable d'un prompt.
+
+    Attributes:
+        nom: Identifiant (journalisation, ``PromptRendu.sections_tronquees``)
+        texte: Contenu rendu; une section vide est ignorée
+        priorite: ``None`` = section obligatoire, jamais tronquée; sinon les
+            priorités les plus basses sont tronquées en premier
+        par_lignes: Tronquer ligne par ligne depuis la fin (listes) plutôt
+            que supprimer la section entière; la première ligne (titre) est
+            conservée tant qu'il reste au moins un élément
+    """
+
+    nom: str
+    texte: str
+    priorite: int | None = None
+    par_lignes: bool = False
+
+
+@dataclass(frozen=True)
+class PromptRendu:
+    """Prompt final et métadonnées de rendu."""
+
+    texte: str
+    empreinte_prefixe: str
+    tokens_estimes: int
+    sections_tronquees: tuple[str, ...] = field(default=())
+
+
+class GabaritPrompt:
+    """Gabarit compilé: préfixe statique figé + sections dynamiques bornées.
+
+    Args:
+        nom: Nom du gabarit (journalisation)
+        sections_statiques: Textes constants, dans l'ordre, joints par
+            ``separateur``. Ne doivent contenir aucune donnée variable.
+        separateur: Séparateur entre sections (statiques et dynamiques)
+    """
+
+    def __init__(self, nom: str, sections_statiques: Iterable[str], separateur: str = "\n\n"):
+        self.nom = nom
+        self.separateur = separateur
+        self.prefixe = separateur.join(s.strip("\n") for s in sections_statiques)
+        self.empreinte = hashlib.sha256(self.prefixe.encode("utf-8")).hexdigest()[:16]
+        self.tokens_prefixe = estimer_tokens(self.prefixe)
+        with _VERROU:
+            _GABARITS[self.empreinte] = self
+
+    def rendre(
+        self,
+        sections: Sequence[SectionDynamique],
+        budget_tokens: int | None = None,
+    ) -> PromptRendu:
+        """Assemble le prompt; tronque les sections optionnelles hors budget.
+
+        Le budget couvre le prompt entier (préfixe compris). Si les sections
+        obligatoires le dépassent à elles seules, le prompt est rendu tel
+        quel et un avertissement est journalisé.
+        """
+        textes = [s.texte.strip("\n") for s in sections]
+        total = self.tokens_prefixe + sum(estimer_tokens(t) for t in textes)
+        tronquees: list[str] = []
+
+        if budget_tokens is not None and total > budget_tokens:
+            optionnelles = sorted(
+                (i for i, s in enumerate(sections) if s.priorite is not None and textes[i]),
+                key=lambda i: sections[i].priorite,
+            )
+            for i in optionnelles:
+                if total <= budget_tokens:
+                    break
+                tronquees.append(sections[i].nom)
+                if sections[i].par_lignes:
+                    # Retirer les derniers éléments un à un (le titre reste);
+                    # l'estimation est additive sur les lignes
+                    lignes = textes[i].split("\n")
+                    while len(lignes) > 2 and total > budget_tokens:
+                        total -= estimer_tokens(lignes.pop())
+                    textes[i] = "\n".join(lignes)
+                    if total <= budget_tokens:
+                        break
+                total -= estimer_tokens(textes[i])
+                textes[i] = ""
+
+            if total > budget_tokens:
+                logger.warning(
+                    f"Prompt '{self.nom}': sections obligatoires hors budget "
+                    f"(~{total} tokens estimés > {budget_tokens})"
+                )
+            logger.debug(f"Prompt '{self.nom}': sections tronquées {tronquees}")
+
+        texte = self.separateur.join([self.prefixe, *(t for t in textes if t)])
+        return PromptRendu(texte, self.empreinte, total, tuple(tronquees))
+
+
+def partie_variable(prompt: str) -> tuple[str | None, str]:
+    """Sépare un prompt rendu en (empreinte du gabarit, partie variable).
+
+    Retourne ``(None, prompt)`` si le prompt ne commence par aucun préfixe
+    de gabarit compilé.
+    """
+    with _VERROU:
+        gabarits = list(_GABARITS.values())
+    meilleur: GabaritPrompt | None = None
+    for gabarit in gabarits:
+        if prompt.startswith(gabarit.prefixe) and (
+            meilleur is None or len(gabarit.prefixe) > len(meilleur.prefixe)
+        ):
+            meilleur = gabarit
+    if meilleur is None:
+        return None, prompt
+    return meilleur.empreinte, prompt[len(meilleur.prefixe) :].lstrip("\n")
@@ -1,21 +1,125 @@
 """
 Analyseur JSON IA Ultra-Robuste
 Gère tous les cas edge des réponses Mistral/GPT
+
+Chemin rapide: la première valeur JSON équilibrée est localisée en une
+passe (automate sur les seuls caractères structurants, sauts en C via
+regex), décodée avec ``orjson`` si installé (sinon ``json``) et validée par
+un ``TypeAdapter`` mis en cache. Les stratégies de réparation ne servent
+qu'en cas d'échec; la stratégie gagnante est comptée
+(``AnalyseurIA.obtenir_statistiques``).
+
+``AnalyseurJSONIncremental`` applique le même automate à un flux (streaming
+SSE): chaque élément de la liste de résultats est disponible dès que son
+accolade fermante arrive.
 """
 
-__all__ = ["AnalyseurIA", "analyser_liste_reponse"]
+__all__ = [
+    "AnalyseurIA",
+    "AnalyseurJSONIncremental",
+    "analyser_liste_reponse",
+    "localiser_json",
+]
 
 import json
 import logging
 import re
-from typing import TypeVar
+from collections import Counter
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
 
-from pydantic import BaseModel, ValidationError, create_model
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle: repli sur json (stdlib)
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Caractères significatifs pour l'automate; tout le reste est sauté par la regex
+_STRUCTURE = re.compile(r'["\\{}\[\]]')
+_OUVRANT = re.compile(r"[\[{]")
+_FERMANT_DE = {"}": "{", "]": "["}
+_CLE_FINALE = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*$')
+
+
+def _decoder_json(texte: str) -> Any:
+    """Décode un texte JSON (orjson si disponible). Lève ``json.JSONDecodeError``."""
+    if orjson is not None:
+        return orjson.loads(texte)  # orjson.JSONDecodeError hérite de json.JSONDecodeError
+    return json.loads(texte)
+
+
+@lru_cache(maxsize=256)
+def _adaptateur(type_cible: Any) -> TypeAdapter:
+    """``TypeAdapter`` compilé une fois par type cible."""
+    return TypeAdapter(type_cible)
+
+
+@lru_cache(maxsize=32)
+def _enveloppe_liste(cle_liste: str) -> type[BaseModel]:
+    """Modèle ``{cle_liste: list[dict]}`` (créé une fois par clé)."""
+    return create_model("EnveloppeDict", **{cle_liste: (list[dict], ...)})
+
+
+class _Balayeur:
+    """Automate JSON minimal: chaînes, échappements et pile d'imbrication.
+
+    L'état est conservé entre deux appels à ``balayer`` (flux par morceaux).
+    Produit ``(position, caractere, profondeur)`` pour chaque ouvrant/fermant
+    hors chaîne; la profondeur est celle de la valeur ouverte ou refermée.
+    """
+
+    __slots__ = ("pile", "dans_chaine", "echappe")
+
+    def __init__(self):
+        self.pile: list[str] = []
+        self.dans_chaine = False
+        self.echappe = -1  # position du caractère échappé par un « \ »
+
+    def balayer(self, texte: str, debut: int = 0) -> Iterator[tuple[int, str, int]]:
+        for correspondance in _STRUCTURE.finditer(texte, debut):
+            i = correspondance.start()
+            if i == self.echappe:
+                continue
+            caractere = texte[i]
+            if self.dans_chaine:
+                if caractere == "\\":
+                    self.echappe = i + 1
+                elif caractere == '"':
+                    self.dans_chaine = False
+            elif caractere == '"':
+                self.dans_chaine = True
+            elif caractere in "{[":
+                self.pile.append(caractere)
+                yield i, caractere, len(self.pile)
+            elif caractere in "}]":
+                # Fermant orphelin ou croisé: ignoré (même tolérance que la réparation)
+                if self.pile and self.pile[-1] == _FERMANT_DE[caractere]:
+                    profondeur = len(self.pile)
+                    self.pile.pop()
+                    yield i, caractere, profondeur
+
+
+def localiser_json(texte: str, debut: int = 0) -> tuple[int, int] | None:
+    """Bornes ``[debut, fin)`` du premier objet/liste JSON équilibré, ou None.
+
+    Examples:
+        >>> localiser_json('Voici: {"a": [1, "}"]} fin')
+        (7, 22)
+    """
+    ouvrant = _OUVRANT.search(texte, debut)
+    if ouvrant is None:
+        return None
+    for position, caractere, profondeur in _Balayeur().balayer(texte, ouvrant.start()):
+        if caractere in "}]" and profondeur == 1:
+            return ouvrant.start(), position + 1
+    return None
+
 
 class AnalyseurIA:
     """
@@ -27,8 +131,40 @@ class AnalyseurIA:
     3. Réparation intelligente
     4. Parse partiel
     5. Fallback
+
+    Précédées d'un chemin rapide (localisation en une passe + décodage +
+    ``TypeAdapter`` en cache) qui couvre les réponses bien formées.
     """
 
+    _statistiques: Counter[str] = Counter()
+    """Nombre de succès par stratégie (``rapide``, ``direct``, ``extraction``...)."""
+
+    @staticmethod
+    def _compter(strategie: str) -> None:
+        AnalyseurIA._statistiques[strategie] += 1
+
+    @staticmethod
+    def obtenir_statistiques() -> dict[str, int]:
+        """Succès par stratégie depuis le démarrage (ou la dernière remise à zéro)."""
+        return dict(AnalyseurIA._statistiques)
+
+    @staticmethod
+    def reinitialiser_statistiques() -> None:
+        AnalyseurIA._statistiques.clear()
+
+    @staticmethod
+    def extraire_json(reponse: str) -> Any:
+        """Chemin rapide: décode la première valeur JSON objet/liste de la réponse.
+
+        Raises:
+            ValueError: Aucune valeur équilibrée, ou JSON invalide
+                (``json.JSONDecodeError`` est une sous-classe de ``ValueError``)
+        """
+        bornes = localiser_json(reponse)
+        if bornes is None:
+            raise ValueError("Aucun objet/liste JSON complet trouvé")
+        return _decoder_json(reponse[bornes[0] : bornes[1]])
+
     @staticmethod
     def analyser(
         reponse: str, modele: type[T], valeur_secours: dict | None = None, strict: bool = False
@@ -48,10 +184,20 @@ class AnalyseurIA:
         Raises:
             ValidationError si échec ET (strict=True OU pas de fallback)
         """
+        # Chemin rapide: une passe, pas de nettoyage regex
+        try:
+            result = _adaptateur(modele).validate_python(AnalyseurIA.extraire_json(reponse))
+            AnalyseurIA._compter("rapide")
+            logger.debug(f"[OK] Chemin rapide réussi pour {modele.__name__}")
+            return result
+        except (ValidationError, ValueError) as e:
+            logger.debug(f"Chemin rapide échoué: {str(e)[:100]}")
+
         # Stratégie 1: Parse direct
         try:
             nettoye = AnalyseurIA._nettoyer_basique(reponse)
             result = modele.model_validate_json(nettoye)
+            AnalyseurIA._compter("direct")
             logger.info(f"[OK] Stratégie 1 (parse direct) réussie pour {modele.__name__}")
             return result
         except (ValidationError, json.JSONDecodeError) as e:
@@ -62,6 +208,7 @@ class AnalyseurIA:
         try:
             json_str = AnalyseurIA._extraire_objet_json(reponse)
             result = modele.model_validate_json(json_str)
+            AnalyseurIA._compter("extraction")
             logger.info(f"[OK] Stratégie 2 (extraction JSON) réussie pour {modele.__name__}")
             return result
         except (ValidationError, json.JSONDecodeError, ValueError) as e:
@@ -73,6 +220,7 @@ class AnalyseurIA:
             repare = AnalyseurIA._reparer_intelligemment(reponse)
             donnees = json.loads(repare)
             result = modele(**donnees)
+            AnalyseurIA._compter("reparation")
             logger.info(f"[OK] Stratégie 3 (réparation) réussie pour {modele.__name__}")
             return result
         except (ValidationError, json.JSONDecodeError, TypeError) as e:
@@ -84,6 +232,7 @@ class AnalyseurIA:
             donnees_partielles = AnalyseurIA._analyser_partiel(reponse, modele)
             if donnees_partielles:
                 result = modele(**donnees_partielles)
+                AnalyseurIA._compter("partiel")
                 logger.info(f"[OK] Stratégie 4 (parse partiel) réussie pour {modele.__name__}")
                 return result
         except Exception as e:
@@ -96,9 +245,11 @@ class AnalyseurIA:
                 f"[!]  Toutes stratégies échouées, utilisation fallback pour {modele.__name__}"
             )
             logger.warning(f"   Response IA brute (300 chars): {reponse[:300]}")
+            AnalyseurIA._compter("secours")
             return modele(**valeur_secours)
 
         # Échec total
+        AnalyseurIA._compter("echec")
         logger.error(
             f"[ERROR] Impossible d'analyser réponse pour {modele.__name__}: {reponse[:200]}"
         )
@@ -124,46 +275,9 @@ class AnalyseurIA:
         Gère correctement les structures imbriquées et les chaînes de caractères.
         """
         texte = AnalyseurIA._nettoyer_basique(texte)
-
-        pile = []
-        debut = None
-        in_string = False
-        escape = False
-
-        for i, char in enumerate(texte):
-            # Gestion des chaînes de caractères
-            if in_string:
-                if escape:
-                    escape = False
-                elif char == "\\":
-                    escape = True
-                elif char == '"':
-                    in_string = False
-                continue
-
-            # Si on n'est pas dans une chaîne
-            if char == '"':
-                in_string = True
-                continue
-
-            if char == "{":
-                if not pile:
-                    debut = i
-                pile.append("{")
-            elif char == "[":
-                if not pile:
-                    debut = i
-                pile.append("[")
-            elif char == "}":
-                if pile and pile[-1] == "{":
-                    pile.pop()
-                if not pile and debut is not None:
-                    return texte[debut : i + 1]
-            elif char == "]":
-                if pile and pile[-1] == "[":
-                    pile.pop()
-                if not pile and debut is not None:
-                    return texte[debut : i + 1]
+        bornes = localiser_json(texte)
+        if bornes is not None:
+            return texte[bornes[0] : bornes[1]]
 
         raise ValueError("Aucun objet/liste JSON complet trouvé")
 
@@ -381,16 +495,19 @@ def analyser_liste_reponse(
     reponse_debut = reponse[:500] if len(reponse) > 500 else reponse
     logger.debug(f"RAW AI RESPONSE (first 500 chars): {repr(reponse_debut)}")
 
-    # Stratégie 1: Essayer de parser comme liste directe
+    # Stratégie 1: Essayer de parser comme liste directe (chemin rapide, puis nettoyage)
     try:
-        json_str = AnalyseurIA._extraire_objet_json(reponse)
-        items_data = json.loads(json_str)
+        try:
+            items_data = AnalyseurIA.extraire_json(reponse)
+        except ValueError:
+            items_data = json.loads(AnalyseurIA._extraire_objet_json(reponse))
         logger.debug(f"[S1] JSON parsed successfully: {type(items_data)}")
 
         # Si c'est une liste directe
         if isinstance(items_data, list):
             result = _valider_items(items_data, modele_item)
             if result:
+                AnalyseurIA._compter("liste_directe")
                 logger.info(f"✅ [S1] Liste directe — {len(result)}/{len(items_data)} items valides pour {modele_item.__name__}")
                 return result
 
@@ -400,6 +517,7 @@ def analyser_liste_reponse(
             if isinstance(items_list, list):
                 result = _valider_items(items_list, modele_item)
                 if result:
+                    AnalyseurIA._compter("liste_cle")
                     logger.info(f"✅ [S1] Clé '{cle_liste}' — {len(result)}/{len(items_list)} items valides pour {modele_item.__name__}")
                     return result
 
@@ -409,6 +527,7 @@ def analyser_liste_reponse(
                 if isinstance(val, list) and val and isinstance(val[0], dict):
                     result = _valider_items(val, modele_item)
                     if result:
+                        AnalyseurIA._compter("liste_cle_alternative")
                         logger.info(f"✅ [S1b] Clé alternative '{key}' — {len(result)}/{len(val)} items valides pour {modele_item.__name__}")
                         return result
     except Exception as e:
@@ -425,6 +544,7 @@ def analyser_liste_reponse(
             if isinstance(items_list, list):
                 result = _valider_items(items_list, modele_item)
                 if result:
+                    AnalyseurIA._compter("liste_regex")
                     logger.info(f"✅ [S2] Regex array — {len(result)}/{len(items_list)} items valides pour {modele_item.__name__}")
                     return result
     except Exception as e:
@@ -434,10 +554,7 @@ def analyser_liste_reponse(
     # On utilise list[dict] pour l'enveloppe afin d'éviter que Pydantic rejette le batch
     # entier à cause d'un seul item invalide, puis on valide les dicts un par un.
     try:
-        EnveloppeDict = create_model(
-            "EnveloppeDict",
-            **{cle_liste: (list[dict], ...)},
-        )
+        EnveloppeDict = _enveloppe_liste(cle_liste)
 
         donnees_enveloppe = AnalyseurIA.analyser(
             reponse,
@@ -449,6 +566,7 @@ def analyser_liste_reponse(
         if items_bruts:
             result = _valider_items(items_bruts, modele_item)
             if result:
+                AnalyseurIA._compter("liste_enveloppe")
                 logger.info(f"✅ [S3] Enveloppe dict — {len(result)}/{len(items_bruts)} items valides pour {modele_item.__name__}")
                 return result
     except Exception as e:
@@ -466,3 +584,103 @@ def analyser_liste_reponse(
         f"Réponse IA (500 chars): {repr(reponse_debut)}"
     )
     return []
+
+
+class AnalyseurJSONIncremental:
+    """Analyse incrémentale d'une réponse JSON reçue par morceaux (streaming).
+
+    Les éléments (objets) de la liste de résultats — liste racine, ou liste
+    ``cle_liste`` de l'objet racine — sont décodés et validés dès que leur
+    fermant arrive. Chaque caractère n'est examiné qu'une fois sur toute la
+    durée du flux.
+
+    Args:
+        modele_item: Modèle Pydantic des éléments (None = dicts bruts)
+        cle_liste: Clé de la liste dans l'objet racine
+
+    Usage:
+        analyseur = AnalyseurJSONIncremental(JourPlanning)
+        async for morceau in client.appeler_streaming(prompt):
+            for jour in analyseur.ajouter(morceau):
+                afficher(jour)
+    """
+
+    def __init__(self, modele_item: type[BaseModel] | None = None, cle_liste: str = "items"):
+        self.modele_item = modele_item
+        self.cle_liste = cle_liste
+        self.texte = ""
+        self._position = 0
+        self._balayeur = _Balayeur()
+        self._debut_racine: int | None = None
+        self._profondeur_items: int | None = None
+        self._debut_item: int | None = None
+        self._fin_racine: int | None = None
+        self.nb_items = 0
+        self.nb_rejetes = 0
+
+    @property
+    def termine(self) -> bool:
+        """True dès que la valeur JSON racine est refermée."""
+        return self._fin_racine is not None
+
+    def ajouter(self, morceau: str) -> list[Any]:
+        """Ajoute un morceau du flux; retourne les éléments nouvellement complets."""
+        self.texte += morceau
+        if self.termine:
+            return []
+        texte = self.texte
+        if self._debut_racine is None:
+            ouvrant = _OUVRANT.search(texte, self._position)
+            if ouvrant is None:
+                self._position = len(texte)
+                return []
+            self._debut_racine = self._position = ouvrant.start()
+
+        nouveaux: list[Any] = []
+        for position, caractere, profondeur in self._balayeur.balayer(texte, self._position):
+            if caractere in "{[":
+                if self._profondeur_items is None and caractere == "[":
+                    if profondeur == 1 or (
+                        profondeur == 2 and self._cle_precedente(texte, position) == self.cle_liste
+                    ):
+                        self._profondeur_items = profondeur + 1
+                elif profondeur == self._profondeur_items and self._debut_item is None:
+                    self._debut_item = position
+            else:
+                if profondeur == self._profondeur_items and self._debut_item is not None:
+                    element = self._valider(texte[self._debut_item : position + 1])
+                    if element is not None:
+                        nouveaux.append(element)
+                    self._debut_item = None
+                elif profondeur == 1:
+                    self._fin_racine = position + 1
+                    break
+        # Reprise après le dernier caractère examiné (l'automate garde son état)
+        self._position = self._fin_racine or len(texte)
+        return nouveaux
+
+    def resultat(self) -> Any:
+        """Valeur racine complète décodée (None si le flux n'est pas terminé)."""
+        if not self.termine:
+            return None
+        return _decoder_json(self.texte[self._debut_racine : self._fin_racine])
+
+    @staticmethod
+    def _cle_precedente(texte: str, position: int) -> str | None:
+        """Clé JSON précédant immédiatement une valeur (``"cle": [``)."""
+        correspondance = _CLE_FINALE.search(texte, max(0, position - 200), position)
+        return correspondance.group(1) if correspondance else None
+
+    def _valider(self, fragment: str) -> Any:
+        try:
+            donnees = _decoder_json(fragment)
+            if self.modele_item is None:
+                element = donnees
+            else:
+                element = _adaptateur(self.modele_item).validate_python(donnees)
+        except (ValidationError, ValueError) as exc:
+            self.nb_rejetes += 1
+            logger.debug(f"[parser] Élément de flux ignoré: {str(exc)[:150]}")
+            return None
+        self.nb_items += 1
+        return element
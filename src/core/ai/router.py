@@ -36,7 +36,7 @@ from dataclasses import dataclass, field
 from enum import Enum, StrEnum
 from typing import Any, AsyncGenerator
 
-import httpx
+from ..async_utils import obtenir_client_http
 
 logger = logging.getLogger(__name__)
 
@@ -498,20 +498,21 @@ class RouteurIA:
             "max_tokens": max_tokens,
         }
 
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            response = await client.post(
-                f"{config.url_base}/chat/completions",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            result = response.json()
+        client = obtenir_client_http()
+        response = await client.post(
+            f"{config.url_base}/chat/completions",
+            headers=headers,
+            timeout=config.timeout,
+            json=payload,
+        )
+        response.raise_for_status()
+        result = response.json()
 
-            choices = result.get("choices", [])
-            if not choices:
-                raise ValueError("Réponse vide du fournisseur")
+        choices = result.get("choices", [])
+        if not choices:
+            raise ValueError("Réponse vide du fournisseur")
 
-            return choices[0]["message"]["content"]
+        return choices[0]["message"]["content"]
 
     async def appeler_streaming(
         self,
@@ -562,39 +563,40 @@ class RouteurIA:
 
         debut = time.time()
 
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            async with client.stream(
-                "POST",
-                f"{config.url_base}/chat/completions",
-                headers=headers,
-                json={
-                    "model": config.modele,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    "stream": True,
-                },
-            ) as response:
-                response.raise_for_status()
-
-                async for line in response.aiter_lines():
-                    if not line or not line.startswith("data: "):
-                        continue
-                    data = line[6:]
-                    if data == "[DONE]":
-                        break
-                    try:
-                        import json
-
-                        chunk = json.loads(data)
-                        choices = chunk.get("choices", [])
-                        if choices:
-                            content = choices[0].get("delta", {}).get("content", "")
-                            if content:
-                                yield content
-                    except Exception as e:
-                        logger.debug(f"Échec parsing chunk streaming: {e}")
-                        continue
+        client = obtenir_client_http()
+        async with client.stream(
+            "POST",
+            f"{config.url_base}/chat/completions",
+            headers=headers,
+            timeout=config.timeout,
+            json={
+                "model": config.modele,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                try:
+                    import json
+
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices", [])
+                    if choices:
+                        content = choices[0].get("delta", {}).get("content", "")
+                        if content:
+                            yield content
+                except Exception as e:
+                    logger.debug(f"Échec parsing chunk streaming: {e}")
+                    continue
 
         latence = (time.time() - debut) * 1000
         self._health[config.nom].enregistrer_succes(latence)
@@ -3,6 +3,10 @@ Client IA — Module Streaming SSE
 
 Appel API avec réponse progressive (Server-Sent Events).
 Extrait du client monolithique pour une meilleure maintenabilité.
+
+``appeler_streaming_items`` analyse le flux au fil de l'eau
+(``AnalyseurJSONIncremental``): chaque élément structuré est disponible
+avant la fin de la réponse.
 """
 
 __all__ = ["StreamingMixin"]
@@ -10,9 +14,9 @@ __all__ = ["StreamingMixin"]
 import logging
 from typing import TYPE_CHECKING
 
-import httpx
-
+from ..async_utils import obtenir_client_http
 from ..exceptions import ErreurLimiteDebit, ErreurServiceIA
+from .parser import AnalyseurJSONIncremental, analyser_liste_reponse
 from .rate_limit import RateLimitIA
 
 logger = logging.getLogger(__name__)
@@ -86,52 +90,91 @@ class StreamingMixin:
 
         full_response: list[str] = []
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            async with client.stream(
-                "POST",
-                f"{self.url_base}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.cle_api}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.modele,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    "stream": True,
-                },
-            ) as response:
-                response.raise_for_status()
-
-                async for line in response.aiter_lines():
-                    if not line or not line.startswith("data: "):
-                        continue
-
-                    data = line[6:]  # Remove "data: " prefix
-
-                    if data == "[DONE]":
-                        break
-
-                    try:
-                        import json
-
-                        chunk_json = json.loads(data)
-                        choices = chunk_json.get("choices", [])
-
-                        if choices:
-                            delta = choices[0].get("delta", {})
-                            content = delta.get("content", "")
-
-                            if content:
-                                full_response.append(content)
-                                yield content
-
-                    except Exception as e:
-                        logger.debug(f"Erreur parsing chunk streaming: {e}")
-                        continue
+        client = obtenir_client_http()
+        async with client.stream(
+            "POST",
+            f"{self.url_base}/chat/completions",
+            timeout=self.timeout,
+            headers={
+                "Authorization": f"Bearer {self.cle_api}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.modele,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line or not line.startswith("data: "):
+                    continue
+
+                data = line[6:]  # Remove "data: " prefix
+
+                if data == "[DONE]":
+                    break
+
+                try:
+                    import json
+
+                    chunk_json = json.loads(data)
+                    choices = chunk_json.get("choices", [])
+
+                    if choices:
+                        delta = choices[0].get("delta", {})
+                        content = delta.get("content", "")
+
+                        if content:
+                            full_response.append(content)
+                            yield content
+
+                except Exception as e:
+                    logger.debug(f"Erreur parsing chunk streaming: {e}")
+                    continue
 
         # Enregistrer l'appel
         total_content = "".join(full_response)
         RateLimitIA.enregistrer_appel(service="mistral_streaming")
         logger.info(f"[OK] Streaming terminé ({len(total_content)} caractères)")
+
+    async def appeler_streaming_items(
+        self,
+        prompt: str,
+        modele_item,
+        cle_liste: str = "items",
+        prompt_systeme: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ):
+        """
+        Appel streaming d'une réponse JSON ``{cle_liste: [...]}`` (ou liste).
+
+        Chaque élément est validé et produit dès que son objet JSON est
+        complet dans le flux. Si l'analyse incrémentale n'a rien produit
+        (réponse mal formée), la réponse complète passe par
+        ``analyser_liste_reponse`` (stratégies de réparation).
+
+        Yields:
+            Instances de ``modele_item``
+
+        Usage:
+            async for jour in client.appeler_streaming_items(prompt, JourPlanning):
+                afficher(jour)
+        """
+        analyseur = AnalyseurJSONIncremental(modele_item, cle_liste=cle_liste)
+        async for morceau in self.appeler_streaming(
+            prompt,
+            prompt_systeme=prompt_systeme,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ):
+            for element in analyseur.ajouter(morceau):
+                yield element
+
+        if analyseur.nb_items == 0:
+            for element in analyser_liste_reponse(analyseur.texte, modele_item, cle_liste):
+                yield element
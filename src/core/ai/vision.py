@@ -10,8 +10,7 @@ __all__ = ["VisionMixin"]
 import logging
 from typing import TYPE_CHECKING
 
-import httpx
-
+from ..async_utils import obtenir_client_http
 from ..exceptions import ErreurServiceIA
 
 logger = logging.getLogger(__name__)
@@ -75,30 +74,31 @@ class VisionMixin:
             }
         ]
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.url_base}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.cle_api}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": vision_model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                },
+        client = obtenir_client_http()
+        response = await client.post(
+            f"{self.url_base}/chat/completions",
+            timeout=60.0,
+            headers={
+                "Authorization": f"Bearer {self.cle_api}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": vision_model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+        )
+
+        response.raise_for_status()
+        result = response.json()
+
+        if not result.get("choices"):
+            raise ErreurServiceIA(
+                "Réponse vision vide", message_utilisateur="L'analyse de l'image a échoué"
             )
 
-            response.raise_for_status()
-            result = response.json()
-
-            if not result.get("choices"):
-                raise ErreurServiceIA(
-                    "Réponse vision vide", message_utilisateur="L'analyse de l'image a échoué"
-                )
-
-            content = result["choices"][0]["message"]["content"]
-            logger.info(f"[OK] Vision: {len(content)} caractères extraits")
+        content = result["choices"][0]["message"]["content"]
+        logger.info(f"[OK] Vision: {len(content)} caractères extraits")
 
-            return content
+        return content
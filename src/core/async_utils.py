@@ -6,36 +6,211 @@ Utilitaire async pour FastAPI.
 Dans certains contextes (tâches synchrones appelées depuis un event loop
 FastAPI), l'utilisation directe de ``asyncio.run()`` provoque des conflits.
 Ce module fournit un wrapper sûr qui fonctionne dans tous les contextes.
+
+Tous les points d'entrée synchrones (jobs cron, services sync, alias
+``_sync``) partagent une unique boucle d'événements tournant dans un thread
+d'arrière-plan. Les clients HTTP async et les pools liés à une boucle
+survivent ainsi d'un appel à l'autre, sans coût de démarrage de boucle.
+Les coroutines exécutées sur cette boucle ne doivent pas bloquer (I/O
+synchrone, session DB) : ``asyncio.to_thread`` pour ces portions.
 """
 
-__all__ = ["executer_async"]
+__all__ = [
+    "BoucleArrierePlan",
+    "executer_async",
+    "fermer_client_http",
+    "obtenir_boucle_arriere_plan",
+    "obtenir_client_http",
+]
 
 import asyncio
 import atexit
 import concurrent.futures
 import logging
+import os
+import threading
+import weakref
 from collections.abc import Coroutine
-from typing import TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
-# Executor singleton réutilisé entre appels (évite la création/destruction
-# d'un ThreadPoolExecutor à chaque invocation)
-_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="async-bridge")
-atexit.register(_EXECUTOR.shutdown, wait=False)
+# Timeout par défaut d'un appel synchrone bridgé (secondes)
+TIMEOUT_DEFAUT = 120.0
+
+
+class BoucleArrierePlan:
+    """Boucle d'événements persistante exécutée dans un thread démon.
+
+    Les coroutines soumises via :meth:`submit` sont planifiées sur cette
+    boucle avec ``asyncio.run_coroutine_threadsafe`` ; l'appelant récupère un
+    ``concurrent.futures.Future`` qu'il peut attendre de façon bloquante.
+
+    La boucle est démarrée paresseusement et redémarrée automatiquement
+    après un ``fork()`` (workers uvicorn/gunicorn), le thread n'étant pas
+    hérité par le processus enfant.
+
+    Example::
+
+        boucle = obtenir_boucle_arriere_plan()
+        future = boucle.submit(client.appeler(prompt="..."))
+        reponse = future.result(timeout=30)
+    """
+
+    def __init__(self, nom: str = "async-bridge") -> None:
+        self._nom = nom
+        self._verrou = threading.Lock()
+        self._boucle: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    # ─── Cycle de vie ───────────────────────────────────────
+
+    def _demarrer(self) -> asyncio.AbstractEventLoop:
+        """Démarre (ou redémarre) la boucle si nécessaire. Thread-safe."""
+        with self._verrou:
+            if self._boucle is not None and self._pid == os.getpid() and self.est_active:
+                return self._boucle
+
+            boucle = asyncio.new_event_loop()
+            pret = threading.Event()
+
+            def _executer() -> None:
+                asyncio.set_event_loop(boucle)
+                boucle.call_soon(pret.set)
+                try:
+                    boucle.run_forever()
+                finally:
+                    try:
+                        boucle.run_until_complete(fermer_client_http())
+                        boucle.run_until_complete(boucle.shutdown_asyncgens())
+                    finally:
+                        boucle.close()
+
+            thread = threading.Thread(target=_executer, name=self._nom, daemon=True)
+            thread.start()
+            pret.wait()
+
+            self._boucle = boucle
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.debug("Boucle d'arrière-plan '%s' démarrée", self._nom)
+            return boucle
+
+    @property
+    def est_active(self) -> bool:
+        """Indique si la boucle tourne dans le processus courant."""
+        return (
+            self._boucle is not None
+            and self._thread is not None
+            and self._thread.is_alive()
+            and self._boucle.is_running()
+        )
+
+    def dans_thread_boucle(self) -> bool:
+        """Indique si l'appelant s'exécute sur le thread de la boucle."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def arreter(self, timeout: float = 5.0) -> None:
+        """Arrête la boucle et attend la fin du thread."""
+        with self._verrou:
+            boucle, thread = self._boucle, self._thread
+            self._boucle = None
+            self._thread = None
+            self._pid = None
+
+        if boucle is None or thread is None or not thread.is_alive():
+            return
+        boucle.call_soon_threadsafe(boucle.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        logger.debug("Boucle d'arrière-plan '%s' arrêtée", self._nom)
+
+    # ─── Soumission ─────────────────────────────────────────
+
+    def submit[R](self, coro: Coroutine[Any, Any, R]) -> concurrent.futures.Future[R]:
+        """Planifie une coroutine sur la boucle et retourne un Future thread-safe."""
+        boucle = self._demarrer()
+        return asyncio.run_coroutine_threadsafe(coro, boucle)
+
+    def executer[R](
+        self, coro: Coroutine[Any, Any, R], timeout: float | None = TIMEOUT_DEFAUT
+    ) -> R:
+        """Exécute une coroutine sur la boucle et bloque jusqu'au résultat.
+
+        Raises:
+            TimeoutError: Si le résultat n'est pas disponible à temps (la
+                coroutine est alors annulée).
+        """
+        if self.dans_thread_boucle():
+            # Appel sync imbriqué depuis la boucle elle-même : attendre le
+            # Future bloquerait la boucle (deadlock). On isole dans un thread.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                return pool.submit(asyncio.run, coro).result(timeout=timeout)
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+
+_boucle_globale = BoucleArrierePlan()
+atexit.register(_boucle_globale.arreter)
+
+# Un client HTTP async par boucle (un AsyncClient est lié à sa boucle)
+_clients_http: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def obtenir_client_http() -> httpx.AsyncClient:
+    """Retourne le ``httpx.AsyncClient`` partagé par la boucle courante.
+
+    Le pool de connexions (keep-alive, sessions TLS) est ainsi réutilisé
+    d'un appel à l'autre. Le timeout se passe à chaque requête ; ne pas
+    fermer le client (``fermer_client_http`` à l'arrêt de la boucle).
+    """
+    import httpx
+
+    boucle = asyncio.get_running_loop()
+    client = _clients_http.get(boucle)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient()
+        _clients_http[boucle] = client
+    return client
+
+
+async def fermer_client_http() -> None:
+    """Ferme le client HTTP partagé de la boucle courante, s'il existe."""
+    client = _clients_http.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def obtenir_boucle_arriere_plan() -> BoucleArrierePlan:
+    """Retourne la boucle d'arrière-plan partagée par le processus."""
+    return _boucle_globale
 
 
-def executer_async[T](coro: Coroutine[object, object, T]) -> T:
+def executer_async[T](
+    coro: Coroutine[object, object, T], timeout: float | None = TIMEOUT_DEFAUT
+) -> T:
     """Exécute une coroutine de manière sûre, compatible FastAPI.
 
-    - S'il existe déjà un event loop running (FastAPI), utilise un thread
-      dédié pour éviter les deadlocks.
-    - Sinon, crée un loop temporaire.
+    La coroutine est exécutée sur la boucle d'arrière-plan persistante, que
+    l'appelant soit ou non déjà dans un event loop (FastAPI) : pas de
+    deadlock, pas de création de boucle par appel.
 
     Args:
         coro: La coroutine à exécuter.
+        timeout: Délai maximal d'attente en secondes (``None`` = illimité).
 
     Returns:
         Le résultat de la coroutine.
@@ -49,14 +224,4 @@ def executer_async[T](coro: Coroutine[object, object, T]) -> T:
 
         result = executer_async(service.suggerer_activites(age, meteo))
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        # Un event loop tourne déjà — on exécute dans un thread séparé
-        future = _EXECUTOR.submit(asyncio.run, coro)
-        return future.result(timeout=120)
-    else:
-        return asyncio.run(coro)
+    return _boucle_globale.executer(coro, timeout=timeout)
@@ -210,6 +210,14 @@ class Parametres(BaseSettings):
     OPENWEATHER_CITY: str = "Paris,FR"
     """Ville pour les prévisions météo (format: Ville,Code)."""
 
+    # ── OpenFoodFacts ──
+
+    OFF_MAGASIN_LOCAL: str = "data/openfoodfacts/produits.sqlite"
+    """Magasin local de produits (SQLite) consulté avant l'API. Vide = désactivé."""
+
+    OFF_RECHERCHE_LIVE: bool = True
+    """Interroge l'API OpenFoodFacts quand le produit est absent du magasin local."""
+
     # ═══════════════════════════════════════════════════════════
     # RATE LIMITING
     # ═══════════════════════════════════════════════════════════
@@ -236,6 +244,9 @@ class Parametres(BaseSettings):
     REDIS_URL: str = ""
     """URL Redis pour cache distribué (ex: redis://localhost:6379/0). Vide = désactivé."""
 
+    WS_BACKPLANE: str = "auto"
+    """Backplane WebSocket multi-workers: auto, redis, postgres ou local (mono-processus)."""
+
     SENTRY_DSN: str = ""
     """DSN Sentry pour le error tracking (ex: https://xxx@sentry.io/yyy). Vide = désactivé."""
 
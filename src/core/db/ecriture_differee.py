@@ -0,0 +1,137 @@
+"""
+Écriture différée - Persistance best-effort de journaux tenus en mémoire.
+
+Mécanique partagée par les services qui accumulent en mémoire puis
+écrivent en base par lots (audit, analytics):
+
+- Base utilisée seulement sur PostgreSQL, ou si une fabrique de session
+  est fournie (tests, autre moteur)
+- Après un échec, la base est mise en pause ``pause_indisponible``
+  secondes: les écritures restent en mémoire et aucun appel ne bloque
+- Thread de fond démarré à la première écriture, qui vidange toutes les
+  ``intervalle`` secondes (ou dès ``signaler()``) et une dernière fois à
+  l'arrêt du processus
+
+Usage::
+
+    from src.core.db.ecriture_differee import EcrivainDiffere
+
+    ecrivain = EcrivainDiffere("audit", self.vidanger, intervalle=2.0)
+    if ecrivain.active():
+        file.append(entree)
+        ecrivain.demarrer()
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["EcrivainDiffere", "heure_locale_naive"]
+
+
+def heure_locale_naive(moment: datetime | None) -> datetime | None:
+    """Heure locale naïve (convention des horodatages des journaux en mémoire)."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
+
+
+class EcrivainDiffere:
+    """Accès base en pause après échec et thread de vidange périodique.
+
+    Args:
+        nom: Nom du journal (thread et logs)
+        vidanger: Écrit ce qui est en attente; appelé par le thread de fond
+        intervalle: Délai max (s) entre deux vidanges en arrière-plan
+        pause_indisponible: Durée (s) sans tentative DB après un échec
+        fabrique_session: Contexte de session DB (défaut: ``obtenir_contexte_db``,
+            utilisé seulement sur PostgreSQL)
+        asynchrone: Vidange par un thread de fond (sinon à la charge de l'appelant)
+    """
+
+    def __init__(
+        self,
+        nom: str,
+        vidanger: Callable[[], int],
+        intervalle: float,
+        pause_indisponible: float = 30.0,
+        fabrique_session: Callable[[], AbstractContextManager[Session]] | None = None,
+        asynchrone: bool = True,
+    ):
+        self.nom = nom
+        self.intervalle = intervalle
+        self.pause_indisponible = pause_indisponible
+        self.asynchrone = asynchrone
+        self._vidanger = vidanger
+        self._fabrique_session = fabrique_session
+        self._postgres: bool | None = None
+        self._pause_jusqua = 0.0
+        self._signal = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._verrou = threading.Lock()
+
+    def active(self) -> bool:
+        """Base utilisable (PostgreSQL, ou session fournie) et pas en pause."""
+        if time.monotonic() < self._pause_jusqua:
+            return False
+        if self._fabrique_session is not None:
+            return True
+        if self._postgres is None:
+            try:
+                from src.core.db import obtenir_moteur
+
+                self._postgres = obtenir_moteur().dialect.name == "postgresql"
+            except Exception as e:
+                self.suspendre(e)
+                return False
+        return self._postgres
+
+    def suspendre(self, erreur: Exception) -> None:
+        """Met la base en pause (table absente, connexion perdue...)."""
+        logger.debug(f"Journal {self.nom} en base indisponible: {erreur}")
+        self._pause_jusqua = time.monotonic() + self.pause_indisponible
+
+    def session(self) -> AbstractContextManager[Session]:
+        if self._fabrique_session is not None:
+            return self._fabrique_session()
+        from src.core.db import obtenir_contexte_db
+
+        return obtenir_contexte_db()
+
+    def demarrer(self) -> None:
+        """Démarre le thread de vidange (une seule fois, mode asynchrone)."""
+        if not self.asynchrone or self._thread is not None:
+            return
+        with self._verrou:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._boucle, name=f"{self.nom}-ecriture", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self._vidanger)
+
+    def signaler(self) -> None:
+        """Réveille le thread de fond sans attendre la fin de l'intervalle."""
+        self._signal.set()
+
+    def _boucle(self) -> None:
+        while True:
+            self._signal.wait(self.intervalle)
+            self._signal.clear()
+            try:
+                self._vidanger()
+            except Exception as e:  # pragma: no cover - le thread ne doit pas mourir
+                logger.debug(f"Écriture {self.nom}: {e}")
@@ -0,0 +1,176 @@
+"""
+Périodes - Filtres de dates « sargables » pour les requêtes SQLAlchemy.
+
+``extract("month", col) == m`` applique une fonction à la colonne: l'index
+B-tree sur ``col`` devient inutilisable et la requête parcourt toute la
+table. Ces helpers expriment les mêmes périodes (mois, semaine ISO,
+trimestre, année) comme un intervalle semi-ouvert ``[debut, fin)`` sur la
+colonne brute, résolu par un simple parcours d'index.
+
+Usage::
+
+    from src.core.db.periodes import filtre_mois
+
+    session.query(func.sum(BudgetFamille.montant)).filter(
+        filtre_mois(BudgetFamille.date, annee, mois)
+    )
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, and_, cast, extract, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+__all__ = [
+    "bornes_annee",
+    "bornes_mois",
+    "bornes_semaine_iso",
+    "bornes_trimestre",
+    "cle_mois",
+    "entre_bornes",
+    "expression_index_mois",
+    "filtre_annee",
+    "filtre_meme_jour",
+    "filtre_mois",
+    "filtre_semaine_iso",
+    "filtre_trimestre",
+    "index_mois",
+    "mois_decale",
+]
+
+
+# ═══════════════════════════════════════════════════════════
+# BORNES [debut, fin)
+# ═══════════════════════════════════════════════════════════
+
+
+def mois_decale(annee: int, mois: int, decalage: int) -> tuple[int, int]:
+    """
+    Retourne (année, mois) décalé de ``decalage`` mois.
+
+    Examples:
+        >>> mois_decale(2026, 1, -1)
+        (2025, 12)
+    """
+    index = int(annee) * 12 + int(mois) - 1 + decalage
+    return index // 12, index % 12 + 1
+
+
+def index_mois(annee: int, mois: int) -> int:
+    """Index absolu d'un mois (``annee * 12 + mois - 1``), continu entre les années."""
+    return int(annee) * 12 + int(mois) - 1
+
+
+def cle_mois(index: int) -> str:
+    """Clé ``YYYY-MM`` d'un index de mois."""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def bornes_mois(annee: int, mois: int) -> tuple[date, date]:
+    """
+    Bornes semi-ouvertes d'un mois: premier jour, premier jour du mois suivant.
+
+    Examples:
+        >>> bornes_mois(2025, 12)
+        (datetime.date(2025, 12, 1), datetime.date(2026, 1, 1))
+    """
+    annee_fin, mois_fin = mois_decale(annee, mois, 1)
+    return date(int(annee), int(mois), 1), date(annee_fin, mois_fin, 1)
+
+
+def bornes_annee(annee: int) -> tuple[date, date]:
+    """Bornes semi-ouvertes d'une année civile."""
+    return date(int(annee), 1, 1), date(int(annee) + 1, 1, 1)
+
+
+def bornes_trimestre(annee: int, trimestre: int) -> tuple[date, date]:
+    """Bornes semi-ouvertes d'un trimestre (1-4)."""
+    if not 1 <= trimestre <= 4:
+        raise ValueError(f"Trimestre invalide: {trimestre}")
+    debut, _ = bornes_mois(annee, 3 * trimestre - 2)
+    _, fin = bornes_mois(annee, 3 * trimestre)
+    return debut, fin
+
+
+def bornes_semaine_iso(annee: int, semaine: int) -> tuple[date, date]:
+    """
+    Bornes semi-ouvertes d'une semaine ISO (lundi, lundi suivant).
+
+    Examples:
+        >>> bornes_semaine_iso(2026, 1)
+        (datetime.date(2025, 12, 29), datetime.date(2026, 1, 5))
+    """
+    debut = date.fromisocalendar(int(annee), int(semaine), 1)
+    return debut, date.fromordinal(debut.toordinal() + 7)
+
+
+# ═══════════════════════════════════════════════════════════
+# PRÉDICATS
+# ═══════════════════════════════════════════════════════════
+
+
+def _borne(colonne: Any, valeur: date) -> date | datetime:
+    """Adapte une borne au type de la colonne (minuit pour un DateTime)."""
+    if isinstance(getattr(colonne, "type", None), DateTime) and not isinstance(valeur, datetime):
+        return datetime.combine(valeur, time.min)
+    return valeur
+
+
+def entre_bornes(colonne: Any, debut: date, fin: date) -> ColumnElement[bool]:
+    """Prédicat ``debut <= colonne < fin`` (utilise l'index de la colonne)."""
+    return and_(colonne >= _borne(colonne, debut), colonne < _borne(colonne, fin))
+
+
+def expression_index_mois(colonne: Any) -> ColumnElement[int]:
+    """
+    Index de mois d'une colonne date, pour ``SELECT`` / ``GROUP BY``.
+
+    Même clé que :func:`index_mois`, portable PostgreSQL/SQLite (à la
+    différence de ``date_trunc``). Ne pas l'utiliser dans un ``WHERE``:
+    filtrer avec :func:`entre_bornes`.
+    """
+    return cast(extract("year", colonne) * 12 + extract("month", colonne) - 1, Integer)
+
+
+def filtre_mois(colonne: Any, annee: int, mois: int) -> ColumnElement[bool]:
+    """Équivalent indexable de ``extract("year") == annee AND extract("month") == mois``."""
+    return entre_bornes(colonne, *bornes_mois(annee, mois))
+
+
+def filtre_annee(colonne: Any, annee: int) -> ColumnElement[bool]:
+    """Équivalent indexable de ``extract("year", colonne) == annee``."""
+    return entre_bornes(colonne, *bornes_annee(annee))
+
+
+def filtre_trimestre(colonne: Any, annee: int, trimestre: int) -> ColumnElement[bool]:
+    """Équivalent indexable de ``extract("quarter", colonne) == trimestre`` sur une année."""
+    return entre_bornes(colonne, *bornes_trimestre(annee, trimestre))
+
+
+def filtre_semaine_iso(colonne: Any, annee: int, semaine: int) -> ColumnElement[bool]:
+    """Équivalent indexable de ``extract("week", colonne) == semaine`` (année ISO)."""
+    return entre_bornes(colonne, *bornes_semaine_iso(annee, semaine))
+
+
+def filtre_meme_jour(
+    colonne: Any, reference: date, annees_passees: int = 120, annees_futures: int = 5
+) -> ColumnElement[bool]:
+    """
+    Dates tombant le même jour/mois que ``reference`` (anniversaires).
+
+    Remplace ``extract("month") == m AND extract("day") == j`` par une liste
+    ``IN`` d'une date par année de la fenêtre: autant de recherches ponctuelles
+    dans l'index. Un 29 février n'est recherché que les années bissextiles.
+    """
+    dates = []
+    for annee in range(reference.year - annees_passees, reference.year + annees_futures + 1):
+        try:
+            dates.append(reference.replace(year=annee))
+        except ValueError:  # 29 février, année non bissextile
+            continue
+    if isinstance(getattr(colonne, "type", None), DateTime):
+        return or_(*(entre_bornes(colonne, d, date.fromordinal(d.toordinal() + 1)) for d in dates))
+    return colonne.in_(dates)
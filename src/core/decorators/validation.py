@@ -1,5 +1,6 @@
 """Décorateurs: validation Pydantic automatique et résilience composée."""
 
+import inspect
 import logging
 from collections.abc import Callable
 from functools import wraps
@@ -121,6 +122,7 @@ def avec_resilience(
     timeout_s: float | None = None,
     fallback: Any = None,
     circuit: str | None = None,
+    limiteur: str | None = None,
     log_level: str = "error",
     afficher_ui: bool = False,
 ):
@@ -128,13 +130,17 @@ def avec_resilience(
     Décorateur unifié de résilience — compose retry, timeout, circuit breaker et fallback.
 
     Construit la chaîne de policies à la décoration (pas à chaque appel)
-    pour une performance optimale.
+    pour une performance optimale. Les fonctions ``async def`` reçoivent
+    les policies asyncio natives (pas de thread par appel, timeout qui
+    annule réellement la coroutine).
 
     Args:
         retry: Nombre de retentatives (0 = pas de retry)
         timeout_s: Timeout en secondes (None = pas de timeout)
         fallback: Valeur retournée en cas d'échec final (None = relève l'exception)
         circuit: Nom du circuit breaker (None = pas de circuit breaker)
+        limiteur: Nom du limiteur de concurrence adaptatif partagé
+            (fonctions async uniquement; None = pas de limiteur)
         log_level: Niveau de log pour les erreurs ('debug', 'info', 'warning', 'error')
         afficher_ui: Afficher l'erreur dans l'UI
 
@@ -153,6 +159,11 @@ def avec_resilience(
         def charger_donnees() -> list[dict]:
             return db.query(Model).all()
 
+        # Appel HTTP async: au-delà de la capacité de l'aval, délestage rapide
+        @avec_resilience(retry=2, timeout_s=15, limiteur="ntfy")
+        async def envoyer(notification) -> Resultat:
+            return await client.post(url, content=notification.message)
+
         # Simple protection avec fallback
         @avec_resilience(fallback={})
         def operation_risquee() -> dict:
@@ -161,6 +172,11 @@ def avec_resilience(
     _fallback = _NO_FALLBACK if fallback is None else fallback
 
     def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            return _avec_resilience_async(
+                func, retry, timeout_s, _fallback, circuit, limiteur, log_level
+            )
+
         # Construire la chaîne de policies à la décoration (lazy import)
         from src.core.resilience import (
             PolicyComposee,
@@ -208,3 +224,57 @@ def avec_resilience(
         return wrapper  # type: ignore
 
     return decorator
+
+
+def _avec_resilience_async[F: Callable[..., Any]](
+    func: F,
+    retry: int,
+    timeout_s: float | None,
+    _fallback: Any,
+    circuit: str | None,
+    limiteur: str | None,
+    log_level: str,
+) -> F:
+    """Variante de ``avec_resilience`` pour les coroutines (policies async)."""
+    from src.core.resilience import (
+        PolicyComposeeAsync,
+        RetryPolicyAsync,
+        TimeoutPolicyAsync,
+        obtenir_limiteur,
+    )
+
+    policies = []
+    if timeout_s is not None:
+        policies.append(TimeoutPolicyAsync(timeout_secondes=timeout_s))
+    if retry > 0:
+        policies.append(RetryPolicyAsync(max_tentatives=retry, delai_base=1.0, jitter=True))
+    if limiteur is not None:
+        # Au plus près de l'appel: la limite reflète la latence de l'aval seul
+        policies.append(obtenir_limiteur(limiteur))
+
+    composed = PolicyComposeeAsync(policies) if policies else None
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        async def _inner() -> Any:
+            if circuit is not None:
+                from src.core.ai.circuit_breaker import obtenir_circuit
+
+                cb = obtenir_circuit(circuit)
+                return await cb.appeler_async(fn=lambda: func(*args, **kwargs))
+            return await func(*args, **kwargs)
+
+        try:
+            if composed is not None:
+                return await composed.executer(_inner)
+            return await _inner()
+
+        except Exception as e:
+            log_fn = getattr(logger, log_level.lower(), logger.error)
+            log_fn(f"Erreur dans {func.__name__}: {e}")
+
+            if _fallback is not _NO_FALLBACK:
+                return _fallback
+            raise
+
+    return wrapper  # type: ignore
@@ -4,6 +4,7 @@ Modèles pour l'inventaire et le stock.
 Contient :
 - ArticleInventaire : Stock d'un ingrédient
 - HistoriqueInventaire : Trace des modifications
+- StatistiqueDureeVie : Durées de vie observées, agrégées incrémentalement
 """
 
 from datetime import date, datetime
@@ -15,8 +16,10 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -164,3 +167,44 @@ class HistoriqueInventaire(Base):
 
     def __repr__(self) -> str:
         return f"<HistoriqueInventaire(article={self.article_id}, type={self.type_modification})>"
+
+
+class StatistiqueDureeVie(Base):
+    """Durée de vie observée (ajout → consommation), agrégée incrémentalement.
+
+    Une ligne par catégorie ou par ingrédient, mise à jour par le job
+    ``stats_duree_vie`` à partir des nouvelles lignes d'historique
+    (algorithme de Welford: moyenne et variance sans rescanner l'historique).
+
+    Attributes:
+        portee: "categorie" ou "ingredient"
+        cle: Nom de catégorie (minuscules) ou ID d'ingrédient
+        nb_observations: Nombre de durées observées
+        moyenne_jours: Moyenne des durées (jours)
+        m2: Somme des carrés des écarts (variance = m2 / (n - 1))
+        derniere_observation: Date de la dernière consommation prise en compte
+    """
+
+    __tablename__ = "stats_duree_vie"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    portee: Mapped[str] = mapped_column(String(20), nullable=False)
+    cle: Mapped[str] = mapped_column(String(200), nullable=False)
+    nb_observations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    moyenne_jours: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    m2: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    derniere_observation: Mapped[datetime | None] = mapped_column(DateTime)
+    modifie_le: Mapped[datetime] = mapped_column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("portee", "cle", name="uq_stats_duree_vie_portee_cle"),
+        CheckConstraint("portee IN ('categorie', 'ingredient')", name="ck_stats_duree_vie_portee"),
+    )
+
+    @property
+    def variance(self) -> float:
+        """Variance d'échantillon des durées (0 si moins de 2 observations)."""
+        return self.m2 / (self.nb_observations - 1) if self.nb_observations > 1 else 0.0
+
+    def __repr__(self) -> str:
+        return f"<StatistiqueDureeVie({self.portee}={self.cle}, n={self.nb_observations})>"
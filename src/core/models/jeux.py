@@ -10,14 +10,18 @@ from typing import Optional
 from sqlalchemy import (
     JSON,
     Boolean,
+    CheckConstraint,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -395,6 +399,40 @@ class HistoriqueJeux(CreeLeMixin, Base):
         return self.paris_gagnes / total * 100
 
 
+class StatsJeuxMensuelles(Base):
+    """Cumuls mensuels des paris / grilles résolus, par utilisateur et par jeu.
+
+    Table SQL: jeux_stats_mensuelles
+    Tenue à jour par trigger (delta à chaque INSERT/UPDATE/DELETE sur les
+    tables de paris et de grilles): les statistiques personnelles lisent
+    quelques lignes au lieu de tout l'historique. ``user_id`` vaut 0 pour
+    les grilles, qui ne sont pas rattachées à un utilisateur.
+    """
+
+    __tablename__ = "jeux_stats_mensuelles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    type_jeu: Mapped[str] = mapped_column(String(20), nullable=False)
+    mois: Mapped[date] = mapped_column(Date, nullable=False)  # premier jour du mois
+
+    nb: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mises: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=Decimal("0"))
+    gains: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=Decimal("0"))
+    modifie_le: Mapped[datetime] = mapped_column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "type_jeu", "mois", name="uq_jeux_stats_mensuelles"),
+        CheckConstraint(
+            "type_jeu IN ('paris', 'loto', 'euromillions')",
+            name="ck_jeux_stats_mensuelles_type",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StatsJeuxMensuelles({self.type_jeu} user={self.user_id} {self.mois})>"
+
+
 # ═══════════════════════════════════════════════════════════════════
 # ENUMS SÉRIES
 # ═══════════════════════════════════════════════════════════════════
@@ -476,6 +514,17 @@ class SerieJeux(CreeLeMixin, Base):
     derniere_occurrence: Mapped[date | None] = mapped_column(Date, nullable=True)
     derniere_mise_a_jour: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
 
+    __table_args__ = (
+        # Opportunités (SEUIL_SERIES_MINIMUM / SEUIL_VALUE_ALERTE du SeriesService):
+        # index partiel réduit aux seules séries au-dessus du seuil.
+        Index(
+            "ix_jeux_series_opportunites",
+            "type_jeu",
+            text("(frequence * serie_actuelle) DESC"),
+            postgresql_where=text("serie_actuelle >= 3 AND frequence * serie_actuelle >= 2.0"),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Serie {self.type_jeu}/{self.championnat or 'global'}/{self.marche}: {self.serie_actuelle}>"
 
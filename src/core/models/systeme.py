@@ -4,6 +4,8 @@ Modèles SQLAlchemy pour le système et les sauvegardes.
 Contient :
 - Backup : Historique des sauvegardes
 - HistoriqueAction : Historique des actions utilisateur (audit)
+- JournalAudit : Journal d'audit transversal (ServiceAudit)
+- AgregatUsage : Agrégats d'usage par minute/heure (ServiceAnalytics)
 """
 
 from datetime import datetime
@@ -12,11 +14,13 @@ from uuid import UUID
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    CheckConstraint,
     DateTime,
     Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
@@ -144,6 +148,75 @@ class LogSecurite(CreeLeMixin, Base):
         )
 
 
+class JournalAudit(Base):
+    """Journal d'audit transversal alimenté par le bus d'événements.
+
+    Table SQL: journal_audit
+    Écrit par lots par ``ServiceAudit``; lu du plus récent au plus ancien
+    avec pagination par curseur ``(timestamp, id)``, d'où les index
+    composites terminés par ces deux colonnes.
+    """
+
+    __tablename__ = "journal_audit"
+
+    # INTEGER sous SQLite: seule clé primaire auto-incrémentée par ce moteur
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    action: Mapped[str] = mapped_column(String(200), nullable=False)
+    source: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    utilisateur_id: Mapped[str | None] = mapped_column(String(255))
+    entite_type: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    entite_id: Mapped[str | None] = mapped_column(String(100))
+    details: Mapped[dict | None] = mapped_column(JSONB, default=dict)
+    ip_address: Mapped[str | None] = mapped_column(String(45))
+
+    __table_args__ = (
+        Index("ix_journal_audit_timestamp_id", "timestamp", "id"),
+        Index("ix_journal_audit_entite_timestamp_id", "entite_type", "timestamp", "id"),
+        Index(
+            "ix_journal_audit_entite_id_timestamp_id",
+            "entite_type",
+            "entite_id",
+            "timestamp",
+            "id",
+        ),
+        Index("ix_journal_audit_source_timestamp_id", "source", "timestamp", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<JournalAudit(id={self.id}, action='{self.action}', entite='{self.entite_type}')>"
+
+
+class AgregatUsage(Base):
+    """Agrégat d'usage d'une minute ou d'une heure (ServiceAnalytics).
+
+    Table SQL: agregats_usage
+    Une ligne par tranche: compteurs ``{type: {cible: nombre}}`` et
+    croquis de durées par page, fusionnés à chaque écriture.
+    """
+
+    __tablename__ = "agregats_usage"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    granularite: Mapped[str] = mapped_column(String(10), nullable=False)
+    debut: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    compteurs: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    durees: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    modifie_le: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
+    )
+
+    __table_args__ = (
+        UniqueConstraint("granularite", "debut", name="uq_agregats_usage_granularite_debut"),
+        CheckConstraint("granularite IN ('minute', 'heure')", name="ck_agregats_usage_granularite"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AgregatUsage(granularite='{self.granularite}', debut={self.debut})>"
+
+
 # ═══════════════════════════════════════════════════════════
 # TABLE IA_SUGGESTIONS_HISTORIQUE
 # ═══════════════════════════════════════════════════════════
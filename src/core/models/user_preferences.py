@@ -202,6 +202,8 @@ class OpenFoodFactsCache(CreeLeMixin, Base):
         ecoscore: Note Eco-Score (A-E)
         nutrition_data: Données nutritionnelles complètes (JSONB)
         image_url: URL de l'image produit
+        etag: ETag de la dernière réponse OpenFoodFacts
+        empreinte: Empreinte du contenu (détection des produits inchangés)
     """
 
     __tablename__ = "openfoodfacts_cache"
@@ -223,6 +225,10 @@ class OpenFoodFactsCache(CreeLeMixin, Base):
     allergenes: Mapped[dict[str, Any] | None] = mapped_column(JSONB, default=list)
     image_url: Mapped[str | None] = mapped_column(String(500))
 
+    # Rafraîchissement incrémental (ETag HTTP + empreinte SHA-256 du contenu)
+    etag: Mapped[str | None] = mapped_column(String(200))
+    empreinte: Mapped[str | None] = mapped_column(String(64))
+
     # Timestamps (last_updated reste manuel — nom non-standard)
     last_updated: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
 
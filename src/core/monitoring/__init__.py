@@ -27,6 +27,7 @@ Usage::
 
 from .collector import (
     CollecteurMetriques,
+    HistogrammeLogLineaire,
     MetriqueType,
     PointMetrique,
     collecteur,
@@ -54,6 +55,7 @@ from .sentry import (
 
 __all__ = [
     "CollecteurMetriques",
+    "HistogrammeLogLineaire",
     "MetriqueType",
     "PointMetrique",
     "SanteSysteme",
@@ -9,14 +9,25 @@ Trois types de métriques:
 Le collecteur maintient un historique glissant configurable (par défaut
 les 2000 derniers points par métrique) et offre un *snapshot* structuré
 pour l'affichage dans un tableau de bord.
+
+Coût constant par point: chaque série a son propre verrou (pas de
+contention globale), l'historique est un tampon circulaire préalloué et
+les histogrammes sont log-linéaires à alvéoles fixes (façon HDR), donc
+fusionnables et de mémoire bornée. Les statistiques du *snapshot*
+(médiane, p95, p99...) portent sur une fenêtre récente, comme
+l'historique: deux histogrammes alternés d'une demi-fenêtre chacun,
+fusionnés à la lecture; l'histogramme cumulé depuis le démarrage reste
+disponible via ``obtenir_histogramme``. Le *snapshot* dépend du nombre de
+séries, pas du nombre de points. Les jeux de labels sont internés: une
+même combinaison n'est stockée qu'une fois.
 """
 
 from __future__ import annotations
 
-import statistics
+import math
 import threading
 import time
-from collections import deque
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any
@@ -51,33 +62,195 @@ class PointMetrique:
 
 
 # ───────────────────────────────────────────────────────────
-# STOCKAGE INTERNE
+# HISTOGRAMME LOG-LINÉAIRE
 # ───────────────────────────────────────────────────────────
 
+SOUS_ALVEOLES = 64
+"""Alvéoles linéaires par puissance de 2: erreur relative ≤ 1/128 (~0,8 %)."""
 
-@dataclass
-class _SerieMetrique:
-    """Série temporelle pour une métrique nommée."""
+EXPOSANT_MIN = -20  # 2^-21 ≈ 5e-7
+EXPOSANT_MAX = 44  # 2^44 ≈ 1,8e13
+
+
+class HistogrammeLogLineaire:
+    """Histogramme à alvéoles fixes, mémoire bornée et fusionnable.
+
+    Chaque puissance de 2 est découpée en ``SOUS_ALVEOLES`` alvéoles
+    linéaires (mantisse de ``math.frexp``): l'enregistrement est un calcul
+    d'index et un incrément de dictionnaire. Seules les alvéoles touchées
+    sont allouées (quelques dizaines en pratique, sur ``TAILLE`` possibles):
+    une série par label reste légère. Les valeurs ≤ 0 (ou sous la plage)
+    sont comptées à part; min, max, somme et somme des carrés restent exacts.
+    """
+
+    __slots__ = ("compteurs", "zeros", "nombre", "somme", "somme_carres", "min", "max")
+
+    TAILLE = (EXPOSANT_MAX - EXPOSANT_MIN + 1) * SOUS_ALVEOLES
+
+    def __init__(self) -> None:
+        self.compteurs: dict[int, int] = {}
+        self.zeros = 0
+        self.nombre = 0
+        self.somme = 0.0
+        self.somme_carres = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @staticmethod
+    def _index(valeur: float) -> int:
+        mantisse, exposant = math.frexp(valeur)  # valeur = mantisse × 2^exposant, m ∈ [0.5, 1)
+        if exposant < EXPOSANT_MIN:
+            return -1
+        if exposant > EXPOSANT_MAX or valeur == math.inf:
+            return HistogrammeLogLineaire.TAILLE - 1
+        return (exposant - EXPOSANT_MIN) * SOUS_ALVEOLES + int((mantisse - 0.5) * 2 * SOUS_ALVEOLES)
+
+    @staticmethod
+    def _centre(index: int) -> float:
+        exposant, alveole = divmod(index, SOUS_ALVEOLES)
+        return math.ldexp(0.5 + (alveole + 0.5) / (2 * SOUS_ALVEOLES), exposant + EXPOSANT_MIN)
+
+    def ajouter(self, valeur: float) -> None:
+        self.nombre += 1
+        self.somme += valeur
+        self.somme_carres += valeur * valeur
+        if valeur < self.min:
+            self.min = valeur
+        if valeur > self.max:
+            self.max = valeur
+        index = self._index(valeur) if valeur > 0 else -1
+        if index < 0:
+            self.zeros += 1
+        else:
+            self.compteurs[index] = self.compteurs.get(index, 0) + 1
+
+    def fusionner(self, autre: HistogrammeLogLineaire) -> None:
+        """Ajoute les comptes d'un autre histogramme (autre worker, autre période)."""
+        for index, compte in autre.compteurs.items():
+            self.compteurs[index] = self.compteurs.get(index, 0) + compte
+        self.zeros += autre.zeros
+        self.nombre += autre.nombre
+        self.somme += autre.somme
+        self.somme_carres += autre.somme_carres
+        self.min = min(self.min, autre.min)
+        self.max = max(self.max, autre.max)
+
+    def quantiles(self, *qs: float) -> list[float]:
+        """Quantiles (0-1) en un seul parcours des alvéoles, bornés à [min, max]."""
+        if not self.nombre:
+            return [0.0 for _ in qs]
+        dernier = self.nombre - 1
+        # Extrêmes exacts; les rangs intermédiaires sont lus dans les alvéoles
+        resultats = [self.min if q <= 0 else self.max for q in qs]
+        rangs = sorted((q * dernier, i) for i, q in enumerate(qs) if 0 < q * dernier < dernier)
+        position = 0
+        cumul = self.zeros
+        while position < len(rangs) and rangs[position][0] < cumul:
+            resultats[rangs[position][1]] = self.min
+            position += 1
+        for index, compte in sorted(self.compteurs.items()):
+            if position == len(rangs):
+                break
+            cumul += compte
+            while position < len(rangs) and rangs[position][0] < cumul:
+                resultats[rangs[position][1]] = min(max(self._centre(index), self.min), self.max)
+                position += 1
+        return resultats
+
+    @property
+    def moyenne(self) -> float:
+        return self.somme / self.nombre if self.nombre else 0.0
+
+    @property
+    def ecart_type(self) -> float:
+        """Écart-type d'échantillon (n - 1), comme ``statistics.stdev``."""
+        if self.nombre < 2:
+            return 0.0
+        variance = (self.somme_carres - self.somme * self.somme / self.nombre) / (self.nombre - 1)
+        return math.sqrt(max(variance, 0.0))
 
-    type: MetriqueType
-    points: deque[PointMetrique]
-    total: float = 0.0  # somme cumulée (compteur) / dernière valeur (jauge)
 
-    def ajouter(self, point: PointMetrique) -> None:
-        self.points.append(point)
-        if self.type == MetriqueType.COMPTEUR:
-            self.total += point.valeur
-        elif self.type == MetriqueType.JAUGE:
-            self.total = point.valeur
-        # Histogramme: total = somme des valeurs
-        elif self.type == MetriqueType.HISTOGRAMME:
-            self.total += point.valeur
+# ───────────────────────────────────────────────────────────
+# STOCKAGE INTERNE
+# ───────────────────────────────────────────────────────────
+
+
+class _SerieMetrique:
+    """Série d'une métrique nommée: total, historique circulaire, histogramme."""
+
+    __slots__ = (
+        "type",
+        "total",
+        "nombre",
+        "verrou",
+        "valeurs",
+        "horodatages",
+        "labels",
+        "curseur",
+        "histogramme",
+        "fenetre",
+        "fenetre_precedente",
+        "demi_fenetre",
+    )
+
+    def __init__(self, type_metrique: MetriqueType, taille: int) -> None:
+        self.type = type_metrique
+        self.total = 0.0  # somme cumulée (compteur, histogramme) / dernière valeur (jauge)
+        self.nombre = 0
+        self.verrou = threading.Lock()
+        # Tampon circulaire préalloué: aucun objet conteneur créé par point
+        self.valeurs = array("d", bytes(8 * taille))
+        self.horodatages = array("d", bytes(8 * taille))
+        self.labels: list[dict[str, str] | None] = [None] * taille
+        self.curseur = 0
+        self.histogramme = (
+            HistogrammeLogLineaire() if type_metrique == MetriqueType.HISTOGRAMME else None
+        )
+        # Fenêtre récente: entre demi_fenetre et 2 × demi_fenetre derniers points
+        self.fenetre = HistogrammeLogLineaire()
+        self.fenetre_precedente = HistogrammeLogLineaire()
+        self.demi_fenetre = max(1, taille // 2)
+
+    def ajouter(self, valeur: float, horodatage: float, labels: dict[str, str]) -> None:
+        with self.verrou:
+            curseur = self.curseur
+            self.valeurs[curseur] = valeur
+            self.horodatages[curseur] = horodatage
+            self.labels[curseur] = labels
+            self.curseur = curseur + 1 if curseur + 1 < len(self.valeurs) else 0
+            self.nombre += 1
+            if self.type == MetriqueType.JAUGE:
+                self.total = valeur
+            else:
+                self.total += valeur
+                if self.histogramme is not None:
+                    self.histogramme.ajouter(valeur)
+                    if self.fenetre.nombre >= self.demi_fenetre:
+                        self.fenetre_precedente = self.fenetre
+                        self.fenetre = HistogrammeLogLineaire()
+                    self.fenetre.ajouter(valeur)
+
+    def histogramme_recent(self) -> HistogrammeLogLineaire:
+        """Histogramme de la fenêtre récente (sous verrou)."""
+        recent = HistogrammeLogLineaire()
+        recent.fusionner(self.fenetre_precedente)
+        recent.fusionner(self.fenetre)
+        return recent
+
+    def indices_recents(self) -> range | list[int]:
+        """Index du tampon du plus ancien au plus récent (sous verrou)."""
+        taille = len(self.valeurs)
+        if self.nombre < taille:
+            return range(self.nombre)
+        return [(self.curseur + i) % taille for i in range(taille)]
 
 
 # ───────────────────────────────────────────────────────────
 # COLLECTEUR
 # ───────────────────────────────────────────────────────────
 
+MAX_LABELS_INTERNES = 10_000
+
 
 class CollecteurMetriques:
     """Collecteur de métriques centralisé et thread-safe.
@@ -92,14 +265,37 @@ class CollecteurMetriques:
     """
 
     def __init__(self, taille_historique: int = 2000) -> None:
-        self._lock = threading.RLock()
+        self._lock = threading.RLock()  # création de séries et labels uniquement
         self._series: dict[str, _SerieMetrique] = {}
         self._taille = taille_historique
         self._heure_creation = time.monotonic()
         self._labels_globaux: dict[str, str] = {}
+        self._labels_internes: dict[tuple[tuple[str, str], ...], dict[str, str]] = {}
 
     # ── Enregistrement ──────────────────────────────────────
 
+    def _serie(self, nom: str, type_metrique: MetriqueType) -> _SerieMetrique:
+        serie = self._series.get(nom)
+        if serie is None:
+            with self._lock:
+                serie = self._series.get(nom)
+                if serie is None:
+                    serie = self._series[nom] = _SerieMetrique(type_metrique, self._taille)
+        return serie
+
+    def _interner(self, labels: dict[str, str] | None) -> dict[str, str]:
+        """Labels fusionnés avec les globaux, une instance par combinaison."""
+        if not labels:
+            return self._labels_globaux
+        cle = tuple(labels.items())
+        fusionnes = self._labels_internes.get(cle)
+        if fusionnes is None:
+            fusionnes = {**self._labels_globaux, **labels}
+            with self._lock:
+                if len(self._labels_internes) < MAX_LABELS_INTERNES:
+                    fusionnes = self._labels_internes.setdefault(cle, fusionnes)
+        return fusionnes
+
     def enregistrer(
         self,
         nom: str,
@@ -125,46 +321,45 @@ class CollecteurMetriques:
         PointMetrique
             Le point enregistré.
         """
-        merged_labels = {**self._labels_globaux, **(labels or {})}
-        point = PointMetrique(
+        horodatage = time.time()
+        labels_internes = self._interner(labels)
+        self._serie(nom, type_metrique).ajouter(valeur, horodatage, labels_internes)
+        return PointMetrique(
             nom=nom,
             valeur=valeur,
             type=type_metrique,
-            timestamp=time.time(),
-            labels=merged_labels,
+            timestamp=horodatage,
+            labels=dict(labels_internes),
         )
 
-        with self._lock:
-            if nom not in self._series:
-                self._series[nom] = _SerieMetrique(
-                    type=type_metrique,
-                    points=deque(maxlen=self._taille),
-                )
-            serie = self._series[nom]
-            serie.ajouter(point)
-
-        return point
+    def _enregistrer_rapide(
+        self, nom: str, valeur: float, type_metrique: MetriqueType, labels: dict[str, str] | None
+    ) -> None:
+        """Comme ``enregistrer`` sans construire de ``PointMetrique``."""
+        self._serie(nom, type_metrique).ajouter(valeur, time.time(), self._interner(labels))
 
     def incrementer(
         self, nom: str, increment: float = 1.0, labels: dict[str, str] | None = None
     ) -> None:
         """Raccourci pour incrémenter un compteur."""
-        self.enregistrer(nom, increment, MetriqueType.COMPTEUR, labels)
+        self._enregistrer_rapide(nom, increment, MetriqueType.COMPTEUR, labels)
 
     def jauge(self, nom: str, valeur: float, labels: dict[str, str] | None = None) -> None:
         """Raccourci pour définir une jauge."""
-        self.enregistrer(nom, valeur, MetriqueType.JAUGE, labels)
+        self._enregistrer_rapide(nom, valeur, MetriqueType.JAUGE, labels)
 
     def histogramme(self, nom: str, valeur: float, labels: dict[str, str] | None = None) -> None:
         """Raccourci pour enregistrer une valeur d'histogramme."""
-        self.enregistrer(nom, valeur, MetriqueType.HISTOGRAMME, labels)
+        self._enregistrer_rapide(nom, valeur, MetriqueType.HISTOGRAMME, labels)
 
     # ── Labels globaux ──────────────────────────────────────
 
     def definir_labels_globaux(self, labels: dict[str, str]) -> None:
         """Définit des labels appliqués à tous les futurs points."""
         with self._lock:
-            self._labels_globaux.update(labels)
+            # Nouveaux objets: les points déjà enregistrés gardent leurs labels
+            self._labels_globaux = {**self._labels_globaux, **labels}
+            self._labels_internes = {}
 
     # ── Snapshot ────────────────────────────────────────────
 
@@ -191,57 +386,54 @@ class CollecteurMetriques:
                 }
         """
         with self._lock:
-            resultat: dict[str, Any] = {
-                "timestamp": time.time(),
-                "uptime_seconds": time.monotonic() - self._heure_creation,
-                "metriques": {},
-            }
-
-            for nom, serie in self._series.items():
-                info: dict[str, Any] = {
-                    "type": serie.type.name,
-                    "total": serie.total,
-                    "nb_points": len(serie.points),
-                }
-
-                if serie.points:
-                    dernier = serie.points[-1]
-                    info["dernier_point"] = {
-                        "valeur": dernier.valeur,
-                        "timestamp": dernier.timestamp,
-                        "labels": dernier.labels,
-                    }
+            series = list(self._series.items())
 
-                    # Statistiques détaillées pour les histogrammes
-                    if serie.type == MetriqueType.HISTOGRAMME and len(serie.points) >= 2:
-                        valeurs = [p.valeur for p in serie.points]
-                        info["statistiques"] = {
-                            "min": min(valeurs),
-                            "max": max(valeurs),
-                            "moyenne": statistics.mean(valeurs),
-                            "mediane": statistics.median(valeurs),
-                            "ecart_type": statistics.stdev(valeurs),
-                            "p95": _percentile(valeurs, 0.95),
-                            "p99": _percentile(valeurs, 0.99),
-                        }
+        resultat: dict[str, Any] = {
+            "timestamp": time.time(),
+            "uptime_seconds": time.monotonic() - self._heure_creation,
+            "metriques": {},
+        }
+        for nom, serie in series:
+            resultat["metriques"][nom] = _info_serie(serie)
+        return resultat
 
-                resultat["metriques"][nom] = info
+    def obtenir_serie(self, nom: str) -> list[PointMetrique]:
+        """Retourne l'historique récent d'une métrique (au plus ``taille_historique`` points)."""
+        serie = self._series.get(nom)
+        if serie is None:
+            return []
+        with serie.verrou:
+            return [
+                PointMetrique(
+                    nom=nom,
+                    valeur=serie.valeurs[i],
+                    type=serie.type,
+                    timestamp=serie.horodatages[i],
+                    labels=dict(serie.labels[i] or {}),
+                )
+                for i in serie.indices_recents()
+            ]
 
-            return resultat
+    def obtenir_histogramme(self, nom: str, recent: bool = False) -> HistogrammeLogLineaire | None:
+        """Copie de l'histogramme d'une métrique (fusionnable), ou None.
 
-    def obtenir_serie(self, nom: str) -> list[PointMetrique]:
-        """Retourne la série complète pour une métrique."""
-        with self._lock:
-            serie = self._series.get(nom)
-            if serie is None:
-                return []
-            return list(serie.points)
+        Cumulé depuis le démarrage, ou sur la fenêtre récente du snapshot
+        si ``recent``.
+        """
+        serie = self._series.get(nom)
+        if serie is None or serie.histogramme is None:
+            return None
+        with serie.verrou:
+            if recent:
+                return serie.histogramme_recent()
+            copie = HistogrammeLogLineaire()
+            copie.fusionner(serie.histogramme)
+        return copie
 
     def obtenir_total(self, nom: str) -> float:
         """Retourne le total/dernière valeur d'une métrique."""
-        with self._lock:
-            serie = self._series.get(nom)
-            return serie.total if serie else 0.0
+        serie = self._series.get(nom)
+        return serie.total if serie else 0.0
 
     def lister_metriques(self) -> list[str]:
         """Retourne la liste des noms de métriques enregistrées."""
@@ -251,14 +443,19 @@ class CollecteurMetriques:
     def reinitialiser(self) -> None:
         """Réinitialise toutes les métriques."""
         with self._lock:
-            self._series.clear()
+            self._series = {}
+            self._labels_internes = {}
             self._heure_creation = time.monotonic()
 
     def filtrer_par_prefixe(self, prefixe: str) -> dict[str, Any]:
         """Retourne un snapshot filtré par préfixe de nom."""
-        snap = self.snapshot()
-        snap["metriques"] = {k: v for k, v in snap["metriques"].items() if k.startswith(prefixe)}
-        return snap
+        with self._lock:
+            series = [(n, s) for n, s in self._series.items() if n.startswith(prefixe)]
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": time.monotonic() - self._heure_creation,
+            "metriques": {nom: _info_serie(serie) for nom, serie in series},
+        }
 
 
 # ───────────────────────────────────────────────────────────
@@ -266,15 +463,39 @@ class CollecteurMetriques:
 # ───────────────────────────────────────────────────────────
 
 
-def _percentile(valeurs: list[float], p: float) -> float:
-    """Calcule le percentile *p* (0-1) d'une liste triée."""
-    sorted_vals = sorted(valeurs)
-    k = (len(sorted_vals) - 1) * p
-    f = int(k)
-    c = f + 1
-    if c >= len(sorted_vals):
-        return sorted_vals[-1]
-    return sorted_vals[f] + (k - f) * (sorted_vals[c] - sorted_vals[f])
+def _info_serie(serie: _SerieMetrique) -> dict[str, Any]:
+    """Résumé d'une série pour le snapshot (coût indépendant du nombre de points)."""
+    with serie.verrou:
+        info: dict[str, Any] = {
+            "type": serie.type.name,
+            "total": serie.total,
+            "nb_points": serie.nombre,
+        }
+        if not serie.nombre:
+            return info
+
+        dernier = serie.curseur - 1 if serie.curseur else len(serie.valeurs) - 1
+        info["dernier_point"] = {
+            "valeur": serie.valeurs[dernier],
+            "timestamp": serie.horodatages[dernier],
+            "labels": dict(serie.labels[dernier] or {}),
+        }
+
+        # Statistiques détaillées pour les histogrammes (fenêtre récente)
+        histo = serie.histogramme_recent() if serie.histogramme is not None else None
+        if histo is not None and histo.nombre >= 2:
+            mediane, p95, p99 = histo.quantiles(0.5, 0.95, 0.99)
+            info["statistiques"] = {
+                "min": histo.min,
+                "max": histo.max,
+                "moyenne": histo.moyenne,
+                "mediane": mediane,
+                "ecart_type": histo.ecart_type,
+                "p95": p95,
+                "p99": p99,
+                "nb_points_fenetre": histo.nombre,
+            }
+    return info
 
 
 # ───────────────────────────────────────────────────────────
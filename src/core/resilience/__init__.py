@@ -7,7 +7,15 @@ Fournit des stratégies réutilisables :
 - BulkheadPolicy: Isolation des ressources
 - FallbackPolicy: Valeurs de repli
 
-Toutes les policies sont composables via l'opérateur ``+``
+Variantes asyncio natives (sans thread par appel) :
+- RetryPolicyAsync: Jitter complet et budget de retentatives (BudgetRetry)
+- TimeoutPolicyAsync: ``asyncio.timeout``
+- BulkheadPolicyAsync: Isolation avec file d'attente bornée
+- ConcurrenceAdaptativePolicy: Limite ajustée à la latence de l'aval
+- FallbackPolicyAsync: Valeurs de repli
+
+Toutes les policies sont composables via l'opérateur ``+`` (sync avec
+sync, async avec async)
 
 Usage::
     from src.core.resilience import RetryPolicy, TimeoutPolicy
@@ -20,6 +28,10 @@ Usage::
     policy = TimeoutPolicy(30) + RetryPolicy(3) + BulkheadPolicy(5)
     result = policy.executer(lambda: api.call())
 
+    # Policies async
+    policy = TimeoutPolicyAsync(10) + RetryPolicyAsync(3) + obtenir_limiteur("mistral")
+    result = await policy.executer(lambda: client.get(url))
+
 Note: ``executer()`` retourne directement le résultat (T) ou lève une exception.
 """
 
@@ -31,6 +43,19 @@ from .policies import (
     RetryPolicy,
     TimeoutPolicy,
 )
+from .policies_async import (
+    BudgetRetry,
+    BulkheadPolicyAsync,
+    ConcurrenceAdaptativePolicy,
+    ErreurSurcharge,
+    FallbackPolicyAsync,
+    PolicyAsync,
+    PolicyComposeeAsync,
+    RetryPolicyAsync,
+    TimeoutPolicyAsync,
+    obtenir_limiteur,
+    obtenir_statistiques_limiteurs,
+)
 
 __all__ = [
     "Policy",
@@ -39,4 +64,15 @@ __all__ = [
     "BulkheadPolicy",
     "FallbackPolicy",
     "PolicyComposee",
+    "PolicyAsync",
+    "BudgetRetry",
+    "RetryPolicyAsync",
+    "TimeoutPolicyAsync",
+    "BulkheadPolicyAsync",
+    "ConcurrenceAdaptativePolicy",
+    "FallbackPolicyAsync",
+    "PolicyComposeeAsync",
+    "ErreurSurcharge",
+    "obtenir_limiteur",
+    "obtenir_statistiques_limiteurs",
 ]
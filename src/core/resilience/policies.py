@@ -33,12 +33,16 @@ class Policy[T](ABC):
 
     def __add__(self, other: Policy[T]) -> PolicyComposee[T]:
         """Compose deux policies: self puis other."""
+        if not isinstance(other, Policy):
+            return NotImplemented
         if isinstance(other, PolicyComposee):
             return PolicyComposee([self, *other.policies])
         return PolicyComposee([self, other])
 
     def __radd__(self, other: Policy[T]) -> PolicyComposee[T]:
         """Support addition inversée."""
+        if not isinstance(other, Policy):
+            return NotImplemented
         if isinstance(other, PolicyComposee):
             return PolicyComposee([*other.policies, self])
         return PolicyComposee([other, self])
@@ -258,6 +262,8 @@ class PolicyComposee(Policy[T]):
         return wrapped_fn()
 
     def __add__(self, other: Policy[T]) -> PolicyComposee[T]:
+        if not isinstance(other, Policy):
+            return NotImplemented
         if isinstance(other, PolicyComposee):
             return PolicyComposee(self.policies + other.policies)
         return PolicyComposee(self.policies + [other])
@@ -0,0 +1,606 @@
+"""
+Policies async - Stratégies de résilience natives asyncio.
+
+Pendant des policies de ``policies.py`` pour les coroutines: aucun saut de
+thread par appel (``asyncio.timeout`` au lieu du ThreadPoolExecutor partagé),
+bulkhead à file d'attente bornée, retry à jitter complet avec budget de
+retentatives, et limiteur de concurrence adaptatif qui réduit sa limite
+quand la latence de l'aval augmente.
+
+Les policies se composent avec ``+`` comme leurs équivalents synchrones;
+mélanger une policy synchrone et une policy async lève ``TypeError``.
+
+Les compteurs de places sont protégés par un ``threading.Lock`` et les
+attentes réveillées via ``call_soon_threadsafe``: une même instance peut
+être partagée entre plusieurs event loops (routes FastAPI, ``executer_async``
+des services synchrones) sans être liée à l'une d'elles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ErreurSurcharge(RuntimeError):
+    """Appel rejeté immédiatement faute de capacité (délestage)."""
+
+
+class PolicyAsync[T](ABC):
+    """Politique de résilience abstraite pour les coroutines."""
+
+    @abstractmethod
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Exécute la coroutine fn avec la politique appliquée."""
+        ...
+
+    def __add__(self, other: PolicyAsync[T]) -> PolicyComposeeAsync[T]:
+        """Compose deux policies: self puis other."""
+        if not isinstance(other, PolicyAsync):
+            raise TypeError(f"Impossible de composer {type(self).__name__} avec {other!r}")
+        if isinstance(other, PolicyComposeeAsync):
+            return PolicyComposeeAsync([self, *other.policies])
+        return PolicyComposeeAsync([self, other])
+
+    def __radd__(self, other: Any) -> PolicyComposeeAsync[T]:
+        """Support addition inversée."""
+        if not isinstance(other, PolicyAsync):
+            raise TypeError(f"Impossible de composer {other!r} avec {type(self).__name__}")
+        return PolicyComposeeAsync([other, self])
+
+
+# ═══════════════════════════════════════════════════════════
+# RETRY
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class BudgetRetry:
+    """
+    Budget de retentatives partagé (token bucket).
+
+    Chaque appel dépose ``ratio`` jeton, chaque retentative en consomme un:
+    en régime d'erreurs, les retries restent bornés à ~``ratio`` × le trafic
+    au lieu de le multiplier par ``max_tentatives``. ``min_par_seconde``
+    garantit quelques retries même à faible trafic.
+
+    Args:
+        ratio: Retentatives autorisées par appel (défaut: 0.2, soit +20 %)
+        min_par_seconde: Recharge minimale indépendante du trafic
+        capacite: Jetons maximum accumulés
+    """
+
+    ratio: float = 0.2
+    min_par_seconde: float = 1.0
+    capacite: float = 10.0
+    _jetons: float = field(init=False, repr=False)
+    _derniere_recharge: float = field(init=False, repr=False)
+    _verrou: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self._jetons = self.capacite
+        self._derniere_recharge = time.monotonic()
+
+    def _recharger(self) -> None:
+        maintenant = time.monotonic()
+        self._jetons = min(
+            self.capacite,
+            self._jetons + (maintenant - self._derniere_recharge) * self.min_par_seconde,
+        )
+        self._derniere_recharge = maintenant
+
+    def enregistrer_appel(self) -> None:
+        with self._verrou:
+            self._recharger()
+            self._jetons = min(self.capacite, self._jetons + self.ratio)
+
+    def autoriser_retry(self) -> bool:
+        """Consomme un jeton si disponible."""
+        with self._verrou:
+            self._recharger()
+            if self._jetons < 1:
+                return False
+            self._jetons -= 1
+            return True
+
+    @property
+    def jetons(self) -> float:
+        with self._verrou:
+            self._recharger()
+            return self._jetons
+
+
+@dataclass
+class RetryPolicyAsync[T](PolicyAsync[T]):
+    """
+    Politique de retentatives async avec backoff exponentiel et jitter complet.
+
+    Le délai avant la tentative n+1 est tiré uniformément dans
+    ``[0, min(delai_max, delai_base × facteur_backoff^n)]`` (« full jitter »),
+    ce qui désynchronise les clients qui échouent ensemble.
+
+    Args:
+        max_tentatives: Nombre max de tentatives (défaut: 3)
+        delai_base: Délai initial en secondes (défaut: 1.0)
+        facteur_backoff: Multiplicateur entre tentatives (défaut: 2.0)
+        delai_max: Plafond du délai entre tentatives (défaut: 30.0)
+        jitter: Jitter complet (défaut: True), sinon délai exact
+        exceptions_a_retry: Types d'exceptions à retenter (toutes si vide)
+        budget: Budget de retentatives, partageable entre policies
+
+    Usage::
+        budget = BudgetRetry(ratio=0.1)
+        policy = RetryPolicyAsync(max_tentatives=3, budget=budget)
+        result = await policy.executer(lambda: client.get(url))
+    """
+
+    max_tentatives: int = 3
+    delai_base: float = 1.0
+    facteur_backoff: float = 2.0
+    delai_max: float = 30.0
+    jitter: bool = True
+    exceptions_a_retry: tuple[type[Exception], ...] = field(default_factory=tuple)
+    budget: BudgetRetry | None = None
+
+    def _delai(self, tentative: int) -> float:
+        delai = min(self.delai_max, self.delai_base * (self.facteur_backoff**tentative))
+        return random.uniform(0, delai) if self.jitter else delai
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        if self.budget is not None:
+            self.budget.enregistrer_appel()
+
+        for tentative in range(self.max_tentatives):
+            try:
+                return await fn()
+            except Exception as e:
+                if self.exceptions_a_retry and not isinstance(e, self.exceptions_a_retry):
+                    raise
+                if isinstance(e, ErreurSurcharge) or tentative == self.max_tentatives - 1:
+                    raise
+                if self.budget is not None and not self.budget.autoriser_retry():
+                    logger.warning(f"[Retry] Budget de retentatives épuisé, abandon: {e}")
+                    raise
+
+                delai = self._delai(tentative)
+                logger.warning(
+                    f"[Retry] Tentative {tentative + 1}/{self.max_tentatives} "
+                    f"échouée, retry dans {delai:.2f}s: {e}"
+                )
+                await asyncio.sleep(delai)
+
+        raise Exception("Échec après toutes les tentatives")
+
+
+# ═══════════════════════════════════════════════════════════
+# TIMEOUT
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class TimeoutPolicyAsync[T](PolicyAsync[T]):
+    """
+    Politique de timeout async (``asyncio.timeout``, sans thread).
+
+    La coroutine est annulée à l'expiration; lève ``TimeoutError`` comme
+    ``TimeoutPolicy``.
+
+    Args:
+        timeout_secondes: Durée max d'exécution (défaut: 30.0)
+
+    Usage::
+        policy = TimeoutPolicyAsync(timeout_secondes=10.0)
+        result = await policy.executer(lambda: client.get(url))
+    """
+
+    timeout_secondes: float = 30.0
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            async with asyncio.timeout(self.timeout_secondes) as delai:
+                return await fn()
+        except TimeoutError:
+            if delai.expired():
+                raise TimeoutError(f"Timeout après {self.timeout_secondes}s") from None
+            raise
+
+
+# ═══════════════════════════════════════════════════════════
+# BULKHEAD / CONCURRENCE
+# ═══════════════════════════════════════════════════════════
+
+
+class _Attente:
+    __slots__ = ("boucle", "future", "accordee")
+
+    def __init__(self, boucle: asyncio.AbstractEventLoop, future: asyncio.Future[None]):
+        self.boucle = boucle
+        self.future = future
+        self.accordee = False
+
+
+def _reveiller(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _PorteConcurrence:
+    """
+    Sémaphore à limite ajustable et file d'attente FIFO bornée.
+
+    Une place libérée est transférée directement au premier en attente
+    (pas de course avec les nouveaux arrivants). Utilisable depuis
+    plusieurs event loops.
+    """
+
+    def __init__(self, limite: int, max_file: int | None) -> None:
+        self.limite = limite
+        self.max_file = max_file
+        self.en_cours = 0
+        self.rejets = 0
+        self._attentes: deque[_Attente] = deque()
+        self._verrou = threading.Lock()
+
+    @property
+    def en_attente(self) -> int:
+        return len(self._attentes)
+
+    async def acquerir(self, timeout: float | None) -> None:
+        with self._verrou:
+            if self.en_cours < self.limite and not self._attentes:
+                self.en_cours += 1
+                return
+            if self.max_file is not None and len(self._attentes) >= self.max_file:
+                self.rejets += 1
+                raise ErreurSurcharge(
+                    f"Capacité saturée ({self.en_cours}/{self.limite} en cours, "
+                    f"{len(self._attentes)} en attente)"
+                )
+            boucle = asyncio.get_running_loop()
+            attente = _Attente(boucle, boucle.create_future())
+            self._attentes.append(attente)
+
+        try:
+            async with asyncio.timeout(timeout):
+                await attente.future
+        except BaseException as e:
+            with self._verrou:
+                if attente.accordee:
+                    # Place accordée pendant l'annulation: la rendre
+                    self.en_cours -= 1
+                    self._admettre()
+                else:
+                    self._attentes.remove(attente)
+                    if isinstance(e, TimeoutError):
+                        self.rejets += 1
+            if isinstance(e, TimeoutError):
+                raise ErreurSurcharge(
+                    f"Capacité saturée ({self.limite} exécutions en cours), "
+                    f"impossible d'acquérir un slot après {timeout}s"
+                ) from None
+            raise
+
+    def liberer(self) -> None:
+        with self._verrou:
+            self.en_cours -= 1
+            self._admettre()
+
+    def ajuster(self, limite: int) -> None:
+        with self._verrou:
+            self.limite = limite
+            self._admettre()
+
+    def _admettre(self) -> None:
+        """Attribue les places libres aux premiers en attente (sous verrou)."""
+        while self._attentes and self.en_cours < self.limite:
+            attente = self._attentes.popleft()
+            if attente.boucle.is_closed():
+                continue
+            attente.accordee = True
+            self.en_cours += 1
+            attente.boucle.call_soon_threadsafe(_reveiller, attente.future)
+
+
+@dataclass
+class BulkheadPolicyAsync[T](PolicyAsync[T]):
+    """
+    Politique d'isolation async (bulkhead pattern).
+
+    Au-delà de ``max_concurrent`` appels, les suivants attendent dans une
+    file bornée à ``max_file``; au-delà, ils sont rejetés immédiatement
+    (``ErreurSurcharge``) au lieu de s'accumuler sans limite.
+
+    Args:
+        max_concurrent: Nombre max d'exécutions simultanées (défaut: 10)
+        timeout_acquisition: Temps max pour obtenir un slot (défaut: 5.0)
+        max_file: Nombre max d'appels en attente (None = illimité)
+
+    Usage::
+        policy = BulkheadPolicyAsync(max_concurrent=5, max_file=20)
+        result = await policy.executer(lambda: client.get(url))
+    """
+
+    max_concurrent: int = 10
+    timeout_acquisition: float = 5.0
+    max_file: int | None = None
+    _porte: _PorteConcurrence = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._porte = _PorteConcurrence(self.max_concurrent, self.max_file)
+
+    @property
+    def en_cours(self) -> int:
+        return self._porte.en_cours
+
+    @property
+    def en_attente(self) -> int:
+        return self._porte.en_attente
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        await self._porte.acquerir(self.timeout_acquisition)
+        try:
+            return await fn()
+        finally:
+            self._porte.liberer()
+
+
+@dataclass
+class ConcurrenceAdaptativePolicy[T](PolicyAsync[T]):
+    """
+    Limiteur de concurrence adaptatif (gradient + décroissance multiplicative).
+
+    La latence de chaque succès alimente deux moyennes mobiles: une courte
+    (état actuel de l'aval) et une longue (référence). Le gradient
+    ``référence / courte`` (borné à [0.5, 1]) fait baisser la limite dès que
+    la latence monte; sans dégradation, la limite croît vers
+    limite + √limite (marge de file) tant qu'elle est réellement utilisée. Un timeout
+    ou une exception de ``exceptions_surcharge`` la multiplie par
+    ``facteur_reduction`` (AIMD).
+
+    Les appels au-delà de la limite attendent au plus ``timeout_attente``
+    dans une file bornée à ``max_file``, puis sont délestés
+    (``ErreurSurcharge``).
+
+    Args:
+        limite_initiale: Limite de départ (défaut: 10)
+        limite_min: Limite plancher (défaut: 1)
+        limite_max: Limite plafond (défaut: 100)
+        max_file: Nombre max d'appels en attente (défaut: 50)
+        timeout_attente: Attente max d'une place en secondes (défaut: 1.0)
+        facteur_reduction: Multiplicateur sur surcharge (défaut: 0.7)
+        tolerance: Dégradation de latence tolérée sans réduire (défaut: 1.5)
+        lissage: Poids de la nouvelle limite calculée (défaut: 0.2)
+        exceptions_surcharge: Exceptions signalant un aval saturé
+
+    Placé avant le timeout (``limiteur + TimeoutPolicyAsync(...)``), chaque
+    timeout compte comme une surcharge; placé après, l'appel annulé n'est
+    pas observé (ni succès ni échantillon de latence).
+
+    Usage::
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=8, limite_max=64)
+        policy = limiteur + TimeoutPolicyAsync(10)
+        result = await policy.executer(lambda: client.post(url, json=payload))
+    """
+
+    limite_initiale: int = 10
+    limite_min: int = 1
+    limite_max: int = 100
+    max_file: int | None = 50
+    timeout_attente: float | None = 1.0
+    facteur_reduction: float = 0.7
+    tolerance: float = 1.5
+    lissage: float = 0.2
+    exceptions_surcharge: tuple[type[Exception], ...] = (TimeoutError,)
+    _limite: float = field(init=False, repr=False)
+    _latence_courte: float | None = field(init=False, repr=False, default=None)
+    _latence_reference: float | None = field(init=False, repr=False, default=None)
+    _porte: _PorteConcurrence = field(init=False, repr=False)
+    _verrou: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    ALPHA_COURT = 0.3
+    ALPHA_REFERENCE = 0.02
+
+    def __post_init__(self) -> None:
+        self._limite = float(min(max(self.limite_initiale, self.limite_min), self.limite_max))
+        self._porte = _PorteConcurrence(int(self._limite), self.max_file)
+
+    @property
+    def limite(self) -> int:
+        return self._porte.limite
+
+    @property
+    def en_cours(self) -> int:
+        return self._porte.en_cours
+
+    def observer(self, latence: float | None, surcharge: bool = False) -> int:
+        """Met à jour la limite après un appel; retourne la nouvelle limite.
+
+        Args:
+            latence: Durée de l'appel réussi (None si échec)
+            surcharge: L'échec signale un aval saturé
+        """
+        with self._verrou:
+            if surcharge:
+                self._limite *= self.facteur_reduction
+            elif latence is not None:
+                if self._latence_courte is None or self._latence_reference is None:
+                    self._latence_courte = self._latence_reference = latence
+                else:
+                    self._latence_courte += self.ALPHA_COURT * (latence - self._latence_courte)
+                    self._latence_reference += self.ALPHA_REFERENCE * (
+                        latence - self._latence_reference
+                    )
+                gradient = min(
+                    1.0, self.tolerance * self._latence_reference / max(self._latence_courte, 1e-9)
+                )
+                if gradient < 1.0:
+                    cible = self._limite * max(0.5, gradient)
+                elif self._porte.en_cours + 1 >= self._limite / 2:
+                    cible = self._limite + math.sqrt(self._limite)
+                else:
+                    cible = self._limite  # limite non utilisée: pas de croissance
+                self._limite += self.lissage * (cible - self._limite)
+            self._limite = min(max(self._limite, self.limite_min), self.limite_max)
+            nouvelle = max(self.limite_min, int(self._limite))
+        if nouvelle != self._porte.limite:
+            self._porte.ajuster(nouvelle)
+        return nouvelle
+
+    def statistiques(self) -> dict[str, Any]:
+        return {
+            "limite": self._porte.limite,
+            "en_cours": self._porte.en_cours,
+            "en_attente": self._porte.en_attente,
+            "rejets": self._porte.rejets,
+            "latence_courte_ms": round((self._latence_courte or 0) * 1000, 2),
+            "latence_reference_ms": round((self._latence_reference or 0) * 1000, 2),
+        }
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        await self._porte.acquerir(self.timeout_attente)
+        debut = time.monotonic()
+        try:
+            resultat = await fn()
+        except Exception as e:
+            self.observer(None, surcharge=isinstance(e, self.exceptions_surcharge))
+            raise
+        except asyncio.CancelledError:
+            # Appel abandonné: ni succès ni surcharge, aucun échantillon de latence
+            raise
+        finally:
+            self._porte.liberer()
+        self.observer(time.monotonic() - debut)
+        return resultat
+
+
+# ═══════════════════════════════════════════════════════════
+# FALLBACK / COMPOSITION
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class FallbackPolicyAsync[T](PolicyAsync[T]):
+    """
+    Politique de fallback async.
+
+    Args:
+        fallback_value: Valeur à retourner en cas d'erreur
+        fallback_fn: Ou fonction (sync ou async) recevant l'exception
+        log_erreur: Logger l'erreur originale (défaut: True)
+
+    Usage::
+        policy = FallbackPolicyAsync(fallback_value=[])
+        result = await policy.executer(lambda: fetch_items())
+    """
+
+    fallback_value: T | None = None
+    fallback_fn: Callable[[Exception], T | Awaitable[T]] | None = None
+    log_erreur: bool = True
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fn()
+        except Exception as e:
+            if self.log_erreur:
+                logger.warning(f"[Fallback] Erreur capturée, utilisation fallback: {e}")
+
+            if self.fallback_fn:
+                resultat = self.fallback_fn(e)
+                return await resultat if inspect.isawaitable(resultat) else resultat
+
+            if self.fallback_value is not None:
+                return self.fallback_value
+
+            raise
+
+
+@dataclass
+class PolicyComposeeAsync[T](PolicyAsync[T]):
+    """
+    Composition de plusieurs policies async (onion model, première → dernière).
+
+    Usage::
+        policy = TimeoutPolicyAsync(30) + RetryPolicyAsync(3) + BulkheadPolicyAsync(5)
+    """
+
+    policies: list[PolicyAsync[Any]]
+
+    async def executer(self, fn: Callable[[], Awaitable[T]]) -> T:
+        wrapped_fn = fn
+        for policy in reversed(self.policies):
+            wrapped_fn = _make_policy_wrapper_async(policy, wrapped_fn)
+        return await wrapped_fn()
+
+    def __add__(self, other: PolicyAsync[T]) -> PolicyComposeeAsync[T]:
+        if isinstance(other, PolicyComposeeAsync):
+            return PolicyComposeeAsync(self.policies + other.policies)
+        if not isinstance(other, PolicyAsync):
+            raise TypeError(f"Impossible de composer PolicyComposeeAsync avec {other!r}")
+        return PolicyComposeeAsync(self.policies + [other])
+
+    def __repr__(self) -> str:
+        noms = [p.__class__.__name__ for p in self.policies]
+        return f"PolicyComposeeAsync({noms})"
+
+
+def _make_policy_wrapper_async(
+    p: PolicyAsync[Any], f: Callable[[], Awaitable[Any]]
+) -> Callable[[], Awaitable[Any]]:
+    """Crée un wrapper qui applique une policy async sur une coroutine function."""
+
+    async def wrapper() -> Any:
+        return await p.executer(f)
+
+    return wrapper
+
+
+# ═══════════════════════════════════════════════════════════
+# LIMITEURS NOMMÉS
+# ═══════════════════════════════════════════════════════════
+
+_limiteurs: dict[str, ConcurrenceAdaptativePolicy[Any]] = {}
+_limiteurs_lock = threading.Lock()
+
+
+def obtenir_limiteur(nom: str, **options: Any) -> ConcurrenceAdaptativePolicy[Any]:
+    """
+    Retourne le limiteur adaptatif partagé ``nom`` (créé au premier appel).
+
+    Les options ne sont prises en compte qu'à la création.
+    """
+    with _limiteurs_lock:
+        if nom not in _limiteurs:
+            _limiteurs[nom] = ConcurrenceAdaptativePolicy(**options)
+        return _limiteurs[nom]
+
+
+def obtenir_statistiques_limiteurs() -> dict[str, dict[str, Any]]:
+    with _limiteurs_lock:
+        return {nom: limiteur.statistiques() for nom, limiteur in _limiteurs.items()}
+
+
+__all__ = [
+    "ErreurSurcharge",
+    "PolicyAsync",
+    "BudgetRetry",
+    "RetryPolicyAsync",
+    "TimeoutPolicyAsync",
+    "BulkheadPolicyAsync",
+    "ConcurrenceAdaptativePolicy",
+    "FallbackPolicyAsync",
+    "PolicyComposeeAsync",
+    "obtenir_limiteur",
+    "obtenir_statistiques_limiteurs",
+]
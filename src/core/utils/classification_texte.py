@@ -0,0 +1,157 @@
+"""
+Classification de textes par mots-clés — une seule expression compilée.
+
+Remplace les boucles ``any(mot in texte for mot in MOTS)`` (coût
+O(textes × mots-clés) en Python) par un classifieur construit une fois:
+
+- Casse ignorée (« PÂTES » = « pâtes »), ligatures conservées pour que la
+  longueur des mots-clés (leur priorité) reste celle de la table.
+  Accents à sens unique: un texte sans accent (« pates ») trouve le mot-clé
+  accentué, mais un accent présent dans le texte doit correspondre
+  (« pâtés » ne contient pas « pâtes »)
+- Une expression régulière unique, factorisée en trie (préfixes communs
+  partagés: l'échec à une position est décidé dès le premier caractère)
+  et évaluée en lookahead à chaque position: le mot-clé le plus long
+  commençant à chaque position est trouvé en une passe (moteur C)
+- L'expression porte sur les formes sans accents; chaque correspondance est
+  ensuite vérifiée contre les mots-clés accentués. Les mots-clés préfixes
+  d'un mot trouvé (« pois » dans « pois chiche ») sont ajoutés via une
+  fermeture précalculée
+- Cache LRU des résultats par texte (noms de plats très répétitifs)
+
+Usage:
+    from src.core.utils.classification_texte import ClassifieurMotsCles
+
+    classifieur = ClassifieurMotsCles({"legumes": ["courgette"], "feculents": ["riz"]})
+    classifieur.categories("Riz aux courgettes")  # frozenset({"legumes", "feculents"})
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+
+__all__ = ["ClassifieurMotsCles", "normaliser_texte"]
+
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "’": "'"})
+_APOSTROPHES = str.maketrans({"’": "'"})
+
+
+@lru_cache(maxsize=8192)
+def normaliser_texte(texte: str) -> str:
+    """Minuscules sans accents (NFKD), ligatures dépliées; espaces conservés."""
+    texte = texte.casefold().translate(_LIGATURES)
+    if texte.isascii():
+        return texte
+    return "".join(c for c in unicodedata.normalize("NFKD", texte) if not unicodedata.combining(c))
+
+
+def _normaliser_casse(texte: str) -> str:
+    """Minuscules, apostrophes droites; accents et ligatures conservés (NFC)."""
+    texte = texte.casefold().translate(_APOSTROPHES)
+    return texte if texte.isascii() else unicodedata.normalize("NFC", texte)
+
+
+@lru_cache(maxsize=1024)
+def _sans_accent(caractere: str) -> str:
+    """Lettre de base d'un caractère accentué (inchangé s'il n'en a pas une seule)."""
+    base = normaliser_texte(caractere)
+    return base if len(base) == 1 else caractere
+
+
+def _replier(texte: str) -> str:
+    """Retire les accents caractère par caractère (longueur conservée)."""
+    return texte if texte.isascii() else "".join(map(_sans_accent, texte))
+
+
+def _compatible(mot: str, extrait: str) -> bool:
+    """True si ``extrait`` (même longueur) s'écrit comme ``mot``, accents omis permis."""
+    return mot == extrait or all(
+        m == t or (t == _sans_accent(t) and _sans_accent(m) == t)
+        for m, t in zip(mot, extrait, strict=True)
+    )
+
+
+def _motif_trie(mots: Iterable[str]) -> str:
+    """Alternance regex factorisée en trie; le quantificateur ``?`` glouton
+    fait correspondre le mot le plus long à une position donnée."""
+    trie: dict[str, dict] = {}
+    for mot in mots:
+        noeud = trie
+        for caractere in mot:
+            noeud = noeud.setdefault(caractere, {})
+        noeud[""] = {}
+
+    def _rendu(noeud: dict[str, dict]) -> str:
+        branches = [re.escape(c) + _rendu(suite) for c, suite in sorted(noeud.items()) if c]
+        if not branches:
+            return ""
+        if "" in noeud:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return _rendu(trie)
+
+
+class ClassifieurMotsCles:
+    """Classifieur multi-catégories par mots-clés (sous-chaînes).
+
+    Args:
+        table: Catégorie → mots-clés. L'ordre des catégories fixe la priorité
+            de ``premiere``.
+        taille_cache: Nombre de textes dont le résultat est mémorisé
+    """
+
+    def __init__(self, table: Mapping[str, Iterable[str]], taille_cache: int = 4096):
+        self.ordre: tuple[str, ...] = tuple(table)
+        self._categories_par_mot: dict[str, set[str]] = {}
+        for categorie, mots in table.items():
+            for mot in mots:
+                mot_normalise = _normaliser_casse(mot)
+                if mot_normalise:
+                    self._categories_par_mot.setdefault(mot_normalise, set()).add(categorie)
+
+        # Forme sans accents → mots-clés accentués qui la partagent ("pâtes", "pâtés")
+        self._accentues: dict[str, tuple[str, ...]] = {}
+        for mot in self._categories_par_mot:
+            replie = _replier(mot)
+            self._accentues[replie] = (*self._accentues.get(replie, ()), mot)
+
+        replies = list(self._accentues)
+        # Fermeture: un mot trouvé à une position implique ses mots-clés préfixes
+        self._prefixes: dict[str, tuple[str, ...]] = {
+            replie: tuple(autre for autre in replies if replie.startswith(autre))
+            for replie in replies
+        }
+        self._motif = re.compile("(?=(" + _motif_trie(replies) + "))") if replies else None
+        self._rang = {categorie: i for i, categorie in enumerate(self.ordre)}
+        self.mots = lru_cache(maxsize=taille_cache)(self._mots)
+        self.categories = lru_cache(maxsize=taille_cache)(self._categories)
+
+    def _mots(self, texte: str | None) -> frozenset[str]:
+        """Mots-clés (normalisés) présents dans ``texte``."""
+        if not texte or self._motif is None:
+            return frozenset()
+        texte = _normaliser_casse(texte)
+        trouves: set[str] = set()
+        for correspondance in self._motif.finditer(_replier(texte)):
+            debut = correspondance.start()
+            for prefixe in self._prefixes[correspondance.group(1)]:
+                extrait = texte[debut : debut + len(prefixe)]
+                trouves.update(m for m in self._accentues[prefixe] if _compatible(m, extrait))
+        return frozenset(trouves)
+
+    def _categories(self, texte: str | None) -> frozenset[str]:
+        """Toutes les catégories dont au moins un mot-clé apparaît dans ``texte``."""
+        return frozenset(c for mot in self.mots(texte) for c in self._categories_par_mot[mot])
+
+    def premiere(self, texte: str | None) -> str | None:
+        """Catégorie trouvée la plus prioritaire (ordre de la table), ou None."""
+        trouvees = self.categories(texte)
+        return min(trouvees, key=self._rang.__getitem__) if trouvees else None
+
+    def contient(self, texte: str | None, categorie: str) -> bool:
+        """True si ``texte`` contient un mot-clé de ``categorie``."""
+        return categorie in self.categories(texte)
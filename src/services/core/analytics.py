@@ -8,9 +8,12 @@ Suit le comportement utilisateur dans l'application:
 - Statistiques d'adoption des modules
 
 Architecture:
-- Buffer mémoire haute performance (deque)
+- Agrégats incrémentaux par minute et par heure (compteurs + croquis de
+  durées DDSketch), tenus à jour à chaque événement
+- Persistance périodique des agrégats (table ``agregats_usage``),
+  rechargés au démarrage
+- Buffer mémoire borné (deque) pour le parcours récent
 - Souscription automatique au bus d'événements
-- Agrégation statistique intégrée
 - Export pour dashboard (Plotly)
 
 Usage:
@@ -30,17 +33,26 @@ Usage:
 
 from __future__ import annotations
 
+import itertools
 import logging
+import math
+import threading
 import time
 from collections import Counter, defaultdict, deque
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field
 
+from src.core.db.ecriture_differee import EcrivainDiffere, heure_locale_naive
 from src.services.core.registry import service_factory
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,12 +104,143 @@ class MesureTemps:
         self._service.suivre_page(self._cible, duree_ms=duree_ms)
 
 
+# ═══════════════════════════════════════════════════════════
+# AGRÉGATS
+# ═══════════════════════════════════════════════════════════
+
+
+PRECISION_CROQUIS = 0.01  # erreur relative des quantiles de durée
+
+
+class CroquisDurees:
+    """Croquis de quantiles à erreur relative bornée (DDSketch).
+
+    Une durée ``x`` est comptée dans l'alvéole ``ceil(log_γ x)`` avec
+    ``γ = (1 + α) / (1 - α)``: tout quantile est restitué à ``α`` près en
+    relatif. La taille ne dépend que de l'étendue des valeurs (~700
+    alvéoles au plus de 1 ms à 1 h pour α = 1 %), et deux croquis se
+    fusionnent en additionnant leurs alvéoles.
+    """
+
+    _GAMMA = (1 + PRECISION_CROQUIS) / (1 - PRECISION_CROQUIS)
+    _LOG_GAMMA = math.log(_GAMMA)
+
+    def __init__(self) -> None:
+        self.alveoles: Counter[int] = Counter()
+        self.zeros = 0
+        self.nombre = 0
+        self.somme = 0.0
+
+    def ajouter(self, valeur: float) -> None:
+        if valeur > 0:
+            self.alveoles[math.ceil(math.log(valeur) / self._LOG_GAMMA)] += 1
+        else:
+            self.zeros += 1
+        self.nombre += 1
+        self.somme += valeur
+
+    def fusionner(self, autre: CroquisDurees) -> None:
+        self.alveoles.update(autre.alveoles)
+        self.zeros += autre.zeros
+        self.nombre += autre.nombre
+        self.somme += autre.somme
+
+    @property
+    def moyenne(self) -> float:
+        return self.somme / self.nombre if self.nombre else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Valeur du quantile ``q`` (0-1), à ``PRECISION_CROQUIS`` près."""
+        if not self.nombre:
+            return 0.0
+        rang = q * (self.nombre - 1)
+        cumul = self.zeros
+        if rang < cumul:
+            return 0.0
+        for indice in sorted(self.alveoles):
+            cumul += self.alveoles[indice]
+            if cumul > rang:
+                return 2 * self._GAMMA**indice / (self._GAMMA + 1)
+        return 2 * self._GAMMA ** max(self.alveoles) / (self._GAMMA + 1)
+
+    def vers_dict(self) -> dict[str, Any]:
+        return {
+            "alveoles": {str(i): n for i, n in self.alveoles.items()},
+            "zeros": self.zeros,
+            "nombre": self.nombre,
+            "somme": self.somme,
+        }
+
+    @classmethod
+    def depuis_dict(cls, donnees: dict[str, Any]) -> CroquisDurees:
+        croquis = cls()
+        croquis.alveoles.update({int(i): n for i, n in donnees.get("alveoles", {}).items()})
+        croquis.zeros = donnees.get("zeros", 0)
+        croquis.nombre = donnees.get("nombre", 0)
+        croquis.somme = donnees.get("somme", 0.0)
+        return croquis
+
+
+@dataclass
+class Agregat:
+    """Compteurs ``{type: {cible: nombre}}`` et durées par page d'une période."""
+
+    compteurs: defaultdict[str, Counter[str]] = field(default_factory=lambda: defaultdict(Counter))
+    durees: defaultdict[str, CroquisDurees] = field(
+        default_factory=lambda: defaultdict(CroquisDurees)
+    )
+
+    def ajouter(self, type_evt: str, cible: str, duree_ms: float | None = None) -> None:
+        self.compteurs[type_evt][cible] += 1
+        if duree_ms is not None:
+            self.durees[cible].ajouter(duree_ms)
+
+    def fusionner(self, autre: Agregat) -> None:
+        for type_evt, compteur in autre.compteurs.items():
+            self.compteurs[type_evt].update(compteur)
+        for cible, croquis in autre.durees.items():
+            self.durees[cible].fusionner(croquis)
+
+    @property
+    def total(self) -> int:
+        return sum(sum(compteur.values()) for compteur in self.compteurs.values())
+
+    def vers_colonnes(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        return (
+            {type_evt: dict(compteur) for type_evt, compteur in self.compteurs.items()},
+            {cible: croquis.vers_dict() for cible, croquis in self.durees.items()},
+        )
+
+    @classmethod
+    def depuis_colonnes(cls, compteurs: dict | None, durees: dict | None) -> Agregat:
+        agregat = cls()
+        for type_evt, valeurs in (compteurs or {}).items():
+            agregat.compteurs[type_evt].update(valeurs)
+        for cible, croquis in (durees or {}).items():
+            agregat.durees[cible] = CroquisDurees.depuis_dict(croquis)
+        return agregat
+
+
 # ═══════════════════════════════════════════════════════════
 # SERVICE
 # ═══════════════════════════════════════════════════════════
 
 
-TAILLE_BUFFER = 50_000  # Max événements en mémoire
+TAILLE_BUFFER = 5_000  # Événements bruts gardés pour le parcours récent
+GRANULARITES: dict[str, int] = {"minute": 60, "heure": 3600}
+RETENTION_MINUTES = 2 * 3600  # agrégats par minute en mémoire (secondes)
+RETENTION_HEURES = 30 * 86400  # agrégats par heure en mémoire et rechargés
+PURGE_MINUTES_DB = 2 * 86400  # lignes « minute » supprimées au-delà
+PURGE_HEURES_DB = 400 * 86400  # lignes « heure » supprimées au-delà
+INTERVALLE_ECRITURE = 60.0  # secondes entre deux écritures des agrégats
+PAUSE_DB_INDISPONIBLE = 300.0
+
+_Cle = tuple[str, int]  # (granularité, début en secondes epoch)
+
+
+def _module(page: str) -> str:
+    """Premier segment: "cuisine.recettes" → "cuisine"."""
+    return page.split(".")[0] if "." in page else page
 
 
 class ServiceAnalytics:
@@ -105,16 +248,48 @@ class ServiceAnalytics:
 
     Collecte et agrège les métriques de comportement utilisateur
     pour comprendre l'adoption des modules et optimiser l'UX.
+
+    Chaque événement incrémente, en O(1), l'agrégat de sa minute, celui de
+    son heure et l'agrégat global: les lectures ne parcourent jamais les
+    événements. Une période se calcule en fusionnant les agrégats horaires
+    qu'elle couvre entièrement et les agrégats par minute de ses bords
+    (précision: la minute sur ``RETENTION_MINUTES``, l'heure au-delà).
+
+    Sur PostgreSQL, les agrégats modifiés sont fusionnés dans la table
+    ``agregats_usage`` toutes les ``INTERVALLE_ECRITURE`` secondes par un
+    thread de fond, et rechargés au démarrage (``charger_historique``).
     """
 
-    def __init__(self, taille_buffer: int = TAILLE_BUFFER):
+    def __init__(
+        self,
+        taille_buffer: int = TAILLE_BUFFER,
+        intervalle_ecriture: float = INTERVALLE_ECRITURE,
+        fabrique_session: Callable[[], AbstractContextManager[Session]] | None = None,
+        asynchrone: bool = True,
+    ):
         self._buffer: deque[EvenementUsage] = deque(maxlen=taille_buffer)
         self._souscrit: bool = False
-
-        # Compteurs rapides (O(1) lookup)
-        self._compteur_pages: Counter = Counter()
-        self._compteur_actions: Counter = Counter()
-        self._temps_pages: defaultdict[str, list[float]] = defaultdict(list)
+        self._verrou = threading.Lock()
+
+        # Agrégats incrémentaux
+        self._agregats: dict[_Cle, Agregat] = {}
+        self._total = Agregat()
+        self._heures: Counter[int] = Counter()
+        self._premier: datetime | None = None
+        self._dernier: datetime | None = None
+        self._minute_courante = 0
+
+        # Persistance (agrégats modifiés depuis la dernière écriture)
+        self._ecrivain = EcrivainDiffere(
+            "analytics",
+            self.vidanger,
+            intervalle=intervalle_ecriture,
+            pause_indisponible=PAUSE_DB_INDISPONIBLE,
+            fabrique_session=fabrique_session,
+            asynchrone=asynchrone,
+        )
+        self._modifies: dict[_Cle, Agregat] = {}
+        self._verrou_ecriture = threading.Lock()
 
         # Session tracking
         self._page_courante: str | None = None
@@ -164,14 +339,6 @@ class ServiceAnalytics:
             duree_ms: Temps passé sur la page en ms
             details: Métadonnées additionnelles
         """
-        self._compteur_pages[page] += 1
-
-        if duree_ms is not None:
-            self._temps_pages[page].append(duree_ms)
-            # Limiter la mémoire des temps
-            if len(self._temps_pages[page]) > 1000:
-                self._temps_pages[page] = self._temps_pages[page][-500:]
-
         self._enregistrer(
             type_evt="page_vue",
             cible=page,
@@ -190,7 +357,6 @@ class ServiceAnalytics:
             action: Type d'action (ex: "recette.favori", "courses.valider")
             details: Métadonnées additionnelles
         """
-        self._compteur_actions[action] += 1
         self._enregistrer(
             type_evt="action",
             cible=action,
@@ -246,22 +412,10 @@ class ServiceAnalytics:
             limite: Nombre max de résultats
 
         Returns:
-            Liste de dicts {page, vues, temps_moyen_ms}
+            Liste de dicts {page, vues, temps_moyen_ms, temps_p95_ms}
         """
-        resultats = []
-        for page, count in self._compteur_pages.most_common(limite):
-            temps = self._temps_pages.get(page, [])
-            temps_moyen = sum(temps) / len(temps) if temps else 0
-
-            resultats.append(
-                {
-                    "page": page,
-                    "vues": count,
-                    "temps_moyen_ms": round(temps_moyen, 1),
-                }
-            )
-
-        return resultats
+        with self._verrou:
+            return self._top_pages(self._total, limite)
 
     def top_actions(self, limite: int = 10) -> list[dict[str, Any]]:
         """Retourne les actions les plus effectuées.
@@ -272,10 +426,8 @@ class ServiceAnalytics:
         Returns:
             Liste de dicts {action, count}
         """
-        return [
-            {"action": action, "count": count}
-            for action, count in self._compteur_actions.most_common(limite)
-        ]
+        with self._verrou:
+            return self._top_actions(self._total, limite)
 
     def repartition_modules(self) -> dict[str, int]:
         """Retourne la répartition d'usage par module.
@@ -285,13 +437,8 @@ class ServiceAnalytics:
         Returns:
             Dict {module: nombre_vues}
         """
-        modules: Counter = Counter()
-        for page, count in self._compteur_pages.items():
-            # Extraire le module (premier segment: "cuisine.recettes" → "cuisine")
-            module = page.split(".")[0] if "." in page else page
-            modules[module] += count
-
-        return dict(modules.most_common())
+        with self._verrou:
+            return self._repartition(self._total)
 
     def heures_actives(self) -> dict[int, int]:
         """Retourne la distribution d'activité par heure de la journée.
@@ -299,10 +446,8 @@ class ServiceAnalytics:
         Returns:
             Dict {heure (0-23): nombre_événements}
         """
-        heures: Counter = Counter()
-        for evt in self._buffer:
-            heures[evt.timestamp.hour] += 1
-        return dict(sorted(heures.items()))
+        with self._verrou:
+            return dict(sorted(self._heures.items()))
 
     def parcours_recent(self, limite: int = 20) -> list[dict[str, Any]]:
         """Retourne les derniers événements (parcours utilisateur).
@@ -313,7 +458,7 @@ class ServiceAnalytics:
         Returns:
             Liste d'événements récents
         """
-        recents = list(self._buffer)[-limite:]
+        recents = list(itertools.islice(reversed(self._buffer), limite))
         return [
             {
                 "timestamp": evt.timestamp.isoformat(),
@@ -321,7 +466,7 @@ class ServiceAnalytics:
                 "cible": evt.cible,
                 "duree_ms": evt.duree_ms,
             }
-            for evt in reversed(recents)
+            for evt in recents
         ]
 
     def obtenir_statistiques(
@@ -331,55 +476,207 @@ class ServiceAnalytics:
     ) -> StatistiquesUsage:
         """Retourne les statistiques agrégées d'usage.
 
+        Sans période: agrégat global tenu à jour (temps constant). Avec
+        période: fusion des agrégats horaires et par minute concernés.
+
         Args:
-            depuis: Date de début (défaut: début du buffer)
+            depuis: Date de début (défaut: début de l'historique)
             jusqu_a: Date de fin (défaut: maintenant)
 
         Returns:
             StatistiquesUsage complètes
         """
-        evenements = list(self._buffer)
-
-        # Filtrer par période
-        if depuis:
-            evenements = [e for e in evenements if e.timestamp >= depuis]
-        if jusqu_a:
-            evenements = [e for e in evenements if e.timestamp <= jusqu_a]
-
-        pages_vues = [e for e in evenements if e.type == "page_vue"]
-        actions = [e for e in evenements if e.type == "action"]
-
-        # Temps moyen sur les pages
-        temps = [e.duree_ms for e in pages_vues if e.duree_ms is not None]
-        temps_moyen = sum(temps) / len(temps) if temps else 0
-
-        return StatistiquesUsage(
-            periode_debut=evenements[0].timestamp if evenements else None,
-            periode_fin=evenements[-1].timestamp if evenements else None,
-            total_pages_vues=len(pages_vues),
-            total_actions=len(actions),
-            pages_uniques=len({e.cible for e in pages_vues}),
-            temps_moyen_page_ms=round(temps_moyen, 1),
-            top_pages=self.top_pages(10),
-            top_actions=self.top_actions(10),
-            repartition_modules=self.repartition_modules(),
-            heures_actives=self.heures_actives(),
-        )
+        depuis, jusqu_a = heure_locale_naive(depuis), heure_locale_naive(jusqu_a)
+        with self._verrou:
+            if depuis is None and jusqu_a is None:
+                agregat, heures = self._total, self._heures
+            else:
+                agregat, heures = self._fusionner_periode(depuis, jusqu_a)
+            pages = agregat.compteurs.get("page_vue", Counter())
+            durees = CroquisDurees()
+            for croquis in agregat.durees.values():
+                durees.fusionner(croquis)
+            vide = agregat.total == 0
+
+            return StatistiquesUsage(
+                periode_debut=None if vide else max(filter(None, (depuis, self._premier))),
+                periode_fin=None if vide else min(filter(None, (jusqu_a, self._dernier))),
+                total_pages_vues=sum(pages.values()),
+                total_actions=sum(agregat.compteurs.get("action", Counter()).values()),
+                pages_uniques=len(pages),
+                temps_moyen_page_ms=round(durees.moyenne, 1),
+                top_pages=self._top_pages(agregat, 10),
+                top_actions=self._top_actions(agregat, 10),
+                repartition_modules=self._repartition(agregat),
+                heures_actives=dict(sorted(heures.items())),
+            )
 
     def vider(self) -> int:
-        """Vide le buffer d'analytics.
+        """Vide le buffer et les agrégats en mémoire (la base est conservée).
 
         Returns:
             Nombre d'événements supprimés
         """
-        n = len(self._buffer)
-        self._buffer.clear()
-        self._compteur_pages.clear()
-        self._compteur_actions.clear()
-        self._temps_pages.clear()
+        with self._verrou:
+            n = self._total.total
+            self._buffer.clear()
+            self._agregats.clear()
+            self._modifies.clear()
+            self._total = Agregat()
+            self._heures.clear()
+            self._premier = self._dernier = None
         logger.info(f"Analytics buffer vidé ({n} événements)")
         return n
 
+    # ─── Persistance des agrégats ───
+
+    def charger_historique(self) -> int:
+        """Recharge les agrégats récents depuis la base (au démarrage).
+
+        Returns:
+            Nombre d'agrégats chargés
+        """
+        if not self._ecrivain.active():
+            return 0
+        from sqlalchemy import or_, select
+
+        from src.core.models.systeme import AgregatUsage
+
+        maintenant = time.time()
+        horizons = {"heure": RETENTION_HEURES, "minute": RETENTION_MINUTES}
+        try:
+            with self._ecrivain.session() as session:
+                lignes = session.scalars(
+                    select(AgregatUsage).where(
+                        or_(
+                            *(
+                                (AgregatUsage.granularite == granularite)
+                                & (AgregatUsage.debut >= datetime.fromtimestamp(maintenant - duree))
+                                for granularite, duree in horizons.items()
+                            )
+                        )
+                    )
+                ).all()
+                charges = [
+                    (
+                        (ligne.granularite, int(ligne.debut.timestamp())),
+                        Agregat.depuis_colonnes(ligne.compteurs, ligne.durees),
+                    )
+                    for ligne in lignes
+                ]
+        except Exception as e:
+            self._ecrivain.suspendre(e)
+            return 0
+
+        with self._verrou:
+            for cle, agregat in charges:
+                self._agregats.setdefault(cle, Agregat()).fusionner(agregat)
+                if cle[0] != "heure":
+                    continue
+                self._total.fusionner(agregat)
+                debut = datetime.fromtimestamp(cle[1])
+                self._heures[debut.hour] += agregat.total
+                self._premier = min(filter(None, (self._premier, debut)))
+                self._dernier = max(filter(None, (self._dernier, debut + timedelta(seconds=3599))))
+        logger.info(f"Analytics: {len(charges)} agrégats rechargés")
+        return len(charges)
+
+    def vidanger(self) -> int:
+        """Fusionne en base les agrégats modifiés depuis la dernière écriture.
+
+        Returns:
+            Nombre d'agrégats écrits
+        """
+        with self._verrou_ecriture:
+            with self._verrou:
+                modifies, self._modifies = self._modifies, {}
+            if not modifies:
+                return 0
+            try:
+                self._persister(modifies)
+            except Exception as e:
+                # Rien n'est perdu: les deltas repartent au prochain essai
+                with self._verrou:
+                    for cle, agregat in modifies.items():
+                        self._modifies.setdefault(cle, Agregat()).fusionner(agregat)
+                self._ecrivain.suspendre(e)
+                return 0
+        return len(modifies)
+
+    def _persister(self, modifies: dict[_Cle, Agregat]) -> None:
+        """Fusion lecture-écriture sous verrou de ligne (plusieurs workers).
+
+        Les tranches absentes sont d'abord créées vides par un
+        ``INSERT … ON CONFLICT DO NOTHING``: deux workers qui ouvrent la même
+        tranche ne se heurtent plus sur la contrainte d'unicité, et
+        ``FOR UPDATE`` verrouille ensuite des lignes qui existent toutes.
+        """
+        from sqlalchemy import delete, insert, select, tuple_
+
+        from src.core.models.systeme import AgregatUsage
+
+        debuts = {cle: datetime.fromtimestamp(cle[1]) for cle in modifies}
+        with self._ecrivain.session() as session:
+            dialecte = session.get_bind().dialect.name
+            if dialecte == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as insert_dialecte
+            elif dialecte == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as insert_dialecte
+            else:
+                insert_dialecte = None
+            if insert_dialecte is not None:
+                session.execute(
+                    insert_dialecte(AgregatUsage).on_conflict_do_nothing(
+                        index_elements=["granularite", "debut"]
+                    ),
+                    [
+                        {"granularite": cle[0], "debut": debut, "compteurs": {}, "durees": {}}
+                        for cle, debut in debuts.items()
+                    ],
+                )
+            existants = {
+                (ligne.granularite, ligne.debut): ligne
+                for ligne in session.scalars(
+                    select(AgregatUsage)
+                    .where(
+                        tuple_(AgregatUsage.granularite, AgregatUsage.debut).in_(
+                            [(cle[0], debut) for cle, debut in debuts.items()]
+                        )
+                    )
+                    .with_for_update()
+                )
+            }
+            nouvelles = []
+            for cle, delta in modifies.items():
+                ligne = existants.get((cle[0], debuts[cle]))
+                if ligne is None:
+                    # Dialecte sans ON CONFLICT: insertion directe
+                    compteurs, durees = delta.vers_colonnes()
+                    nouvelles.append(
+                        {
+                            "granularite": cle[0],
+                            "debut": debuts[cle],
+                            "compteurs": compteurs,
+                            "durees": durees,
+                        }
+                    )
+                    continue
+                fusion = Agregat.depuis_colonnes(ligne.compteurs, ligne.durees)
+                fusion.fusionner(delta)
+                ligne.compteurs, ligne.durees = fusion.vers_colonnes()
+            if nouvelles:
+                session.execute(insert(AgregatUsage), nouvelles)
+
+            maintenant = time.time()
+            for granularite, duree in (("minute", PURGE_MINUTES_DB), ("heure", PURGE_HEURES_DB)):
+                session.execute(
+                    delete(AgregatUsage).where(
+                        AgregatUsage.granularite == granularite,
+                        AgregatUsage.debut < datetime.fromtimestamp(maintenant - duree),
+                    )
+                )
+            session.commit()
+
     # ─── Interne ───
 
     def _enregistrer(
@@ -388,16 +685,99 @@ class ServiceAnalytics:
         cible: str,
         duree_ms: float | None = None,
         details: dict[str, Any] | None = None,
+        horodatage: datetime | None = None,
     ) -> None:
-        """Enregistre un événement dans le buffer."""
+        """Enregistre un événement: buffer récent et agrégats incrémentaux."""
         evt = EvenementUsage(
-            timestamp=datetime.now(),
+            timestamp=horodatage or datetime.now(),
             type=type_evt,
             cible=cible,
             duree_ms=duree_ms,
             details=details or {},
         )
-        self._buffer.append(evt)
+        persister = self._ecrivain.active()
+        secondes = int(evt.timestamp.timestamp())
+
+        with self._verrou:
+            self._buffer.append(evt)
+            if secondes // 60 != self._minute_courante:
+                self._minute_courante = secondes // 60
+                self._purger(secondes)
+            for granularite, pas in GRANULARITES.items():
+                cle = (granularite, secondes - secondes % pas)
+                self._agregats.setdefault(cle, Agregat()).ajouter(type_evt, cible, duree_ms)
+                if persister:
+                    self._modifies.setdefault(cle, Agregat()).ajouter(type_evt, cible, duree_ms)
+            self._total.ajouter(type_evt, cible, duree_ms)
+            self._heures[evt.timestamp.hour] += 1
+            self._premier = self._premier or evt.timestamp
+            self._dernier = evt.timestamp
+
+        if persister:
+            self._ecrivain.demarrer()
+
+    def _purger(self, maintenant: int) -> None:
+        """Retire de la mémoire les agrégats sortis de leur rétention."""
+        limites = {"minute": maintenant - RETENTION_MINUTES, "heure": maintenant - RETENTION_HEURES}
+        for cle in [c for c in self._agregats if c[1] < limites[c[0]]]:
+            del self._agregats[cle]
+
+    def _fusionner_periode(
+        self, depuis: datetime | None, jusqu_a: datetime | None
+    ) -> tuple[Agregat, Counter[int]]:
+        """Agrégat et heures actives d'une période, par fusion de tranches.
+
+        Heures entièrement couvertes: agrégat horaire. Heures partielles:
+        agrégats par minute s'ils sont encore en mémoire, sinon l'heure.
+        """
+        debut = depuis.timestamp() if depuis else -math.inf
+        fin = jusqu_a.timestamp() if jusqu_a else math.inf
+        horizon_minutes = self._minute_courante * 60 - RETENTION_MINUTES
+        resultat, heures = Agregat(), Counter()
+
+        def _ajouter(agregat: Agregat, tranche: int) -> None:
+            resultat.fusionner(agregat)
+            heures[datetime.fromtimestamp(tranche).hour] += agregat.total
+
+        for (granularite, tranche), agregat in self._agregats.items():
+            if granularite != "heure" or tranche + 3600 <= debut or tranche > fin:
+                continue
+            if (debut <= tranche and tranche + 3600 <= fin) or tranche < horizon_minutes:
+                _ajouter(agregat, tranche)
+                continue
+            for minute in range(tranche, tranche + 3600, 60):
+                if debut - 60 < minute <= fin and ("minute", minute) in self._agregats:
+                    _ajouter(self._agregats[("minute", minute)], minute)
+        return resultat, heures
+
+    @staticmethod
+    def _top_pages(agregat: Agregat, limite: int) -> list[dict[str, Any]]:
+        resultats = []
+        for page, count in agregat.compteurs.get("page_vue", Counter()).most_common(limite):
+            croquis = agregat.durees.get(page)
+            resultats.append(
+                {
+                    "page": page,
+                    "vues": count,
+                    "temps_moyen_ms": round(croquis.moyenne, 1) if croquis else 0,
+                    "temps_p95_ms": round(croquis.quantile(0.95), 1) if croquis else 0,
+                }
+            )
+        return resultats
+
+    @staticmethod
+    def _top_actions(agregat: Agregat, limite: int) -> list[dict[str, Any]]:
+        return [
+            {"action": action, "count": count}
+            for action, count in agregat.compteurs.get("action", Counter()).most_common(limite)
+        ]
+
+    @staticmethod
+    def _repartition(agregat: Agregat) -> dict[str, int]:
+        modules: Counter[str] = Counter()
+        for page, count in agregat.compteurs.get("page_vue", Counter()).items():
+            modules[_module(page)] += count
+        return dict(modules.most_common())
 
 
 # ═══════════════════════════════════════════════════════════
@@ -409,12 +789,15 @@ class ServiceAnalytics:
 def obtenir_analytics() -> ServiceAnalytics:
     """Factory singleton pour le service d'analytics d'usage."""
     service = ServiceAnalytics()
+    service.charger_historique()
     service.souscrire_bus()
     return service
 
 
 __all__ = [
     "ServiceAnalytics",
+    "Agregat",
+    "CroquisDurees",
     "EvenementUsage",
     "StatistiquesUsage",
     "MesureTemps",
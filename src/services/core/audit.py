@@ -8,8 +8,13 @@ Enregistre toutes les actions utilisateur importantes:
 
 Architecture:
 - Souscrit automatiquement au bus d'événements (wildcard "*")
-- Persiste dans une table `journal_audit` en base
-- Fournit une API de query pour UI et exports
+- Persiste dans une table `journal_audit` en base, par INSERT groupés
+  écrits par un thread de fond (lots de ``TAILLE_LOT`` ou toutes les
+  ``INTERVALLE_ECRITURE`` secondes)
+- Fournit une API de query pour UI et exports: lecture en base (même
+  résultat depuis n'importe quel worker) avec pagination par curseur
+  ``(timestamp, id)``, repli sur le buffer mémoire indexé (entité, source,
+  tranche horaire) si la base est indisponible
 
 Usage:
     from src.services.core.audit import obtenir_service_audit
@@ -26,19 +31,30 @@ Usage:
 
     # Consultation
     historique = service.consulter(entite_type="recette", limite=50)
+    suite = service.consulter(entite_type="recette", curseur=historique.curseur_suivant)
 """
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
-from collections import deque
+import threading
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field
 
+from src.core.db.ecriture_differee import EcrivainDiffere, heure_locale_naive
 from src.services.core.registry import service_factory
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,9 +81,10 @@ class ResultatRecherche(BaseModel):
     """Résultat paginé d'une recherche dans l'audit."""
 
     entrees: list[EntreeAudit] = Field(default_factory=list)
-    total: int = 0
+    total: int | None = 0  # None si non compté (pagination par curseur)
     page: int = 1
     par_page: int = 50
+    curseur_suivant: str | None = None
 
 
 # ═══════════════════════════════════════════════════════════
@@ -101,24 +118,214 @@ _MAPPING_ENTITE: dict[str, str] = {
 }
 
 
+TAILLE_LOT = 200
+INTERVALLE_ECRITURE = 2.0  # secondes entre deux écritures par lot
+PAUSE_DB_INDISPONIBLE = 30.0  # secondes sans tentative DB après un échec
+DUREE_TRANCHE = 3600  # index temporel: tranches d'une heure
+
+
+def _cle_entite(entite_id: int | str | None) -> str | None:
+    return None if entite_id is None else str(entite_id)
+
+
+def _tranche(moment: datetime) -> int:
+    return int(moment.timestamp()) // DUREE_TRANCHE
+
+
+def encoder_curseur(entree: EntreeAudit) -> str:
+    """Curseur opaque désignant la position ``(timestamp, id)`` d'une entrée."""
+    brut = f"{entree.timestamp.isoformat()}|{entree.id}"
+    return base64.urlsafe_b64encode(brut.encode()).decode().rstrip("=")
+
+
+def decoder_curseur(curseur: str) -> tuple[datetime, int]:
+    """Inverse de ``encoder_curseur``.
+
+    Raises:
+        ValueError: Curseur illisible
+    """
+    try:
+        brut = base64.urlsafe_b64decode(curseur + "=" * (-len(curseur) % 4)).decode()
+        horodatage, identifiant = brut.rsplit("|", 1)
+        return datetime.fromisoformat(horodatage), int(identifiant)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Curseur d'audit invalide: {curseur!r}") from e
+
+
+@dataclass(frozen=True)
+class _Filtres:
+    """Critères de recherche normalisés (mémoire et base)."""
+
+    entite_type: str | None = None
+    entite_id: str | None = None
+    action: str | None = None
+    source: str | None = None
+    depuis: datetime | None = None
+    jusqu_a: datetime | None = None
+    avant: tuple[datetime, int] | None = None  # curseur: strictement plus ancien
+
+    def accepte(self, e: EntreeAudit) -> bool:
+        return (
+            (not self.entite_type or e.entite_type == self.entite_type)
+            and (self.entite_id is None or _cle_entite(e.entite_id) == self.entite_id)
+            and (not self.action or self.action in e.action)
+            and (not self.source or e.source == self.source)
+            and (self.depuis is None or e.timestamp >= self.depuis)
+            and (self.jusqu_a is None or e.timestamp <= self.jusqu_a)
+            and (self.avant is None or (e.timestamp, e.id or 0) < self.avant)
+        )
+
+
+class _JournalMemoire:
+    """Buffer FIFO borné et index secondaires (entité, source, tranche horaire).
+
+    Chaque index conserve l'ordre d'insertion: l'entrée évincée du buffer est
+    toujours en tête de ses files d'index, l'éviction coûte O(1).
+    """
+
+    def __init__(self, capacite: int):
+        self.entrees: deque[EntreeAudit] = deque(maxlen=capacite)
+        self.par_type: dict[str, deque[EntreeAudit]] = {}
+        self.par_entite: dict[tuple[str, str], deque[EntreeAudit]] = {}
+        self.par_source: dict[str, deque[EntreeAudit]] = {}
+        self.par_tranche: dict[int, deque[EntreeAudit]] = {}
+
+    def _cles(self, e: EntreeAudit) -> Iterator[tuple[dict, Any]]:
+        yield self.par_type, e.entite_type
+        if e.entite_id is not None:
+            yield self.par_entite, (e.entite_type, _cle_entite(e.entite_id))
+        yield self.par_source, e.source
+        yield self.par_tranche, _tranche(e.timestamp)
+
+    def ajouter(self, e: EntreeAudit) -> None:
+        if len(self.entrees) == self.entrees.maxlen:
+            ancienne = self.entrees.popleft()
+            for index, cle in self._cles(ancienne):
+                file = index.get(cle)
+                if file and file[0] is ancienne:
+                    file.popleft()
+                    if not file:
+                        del index[cle]
+        self.entrees.append(e)
+        for index, cle in self._cles(e):
+            index.setdefault(cle, deque()).append(e)
+
+    def vider(self) -> None:
+        self.entrees.clear()
+        for index in (self.par_type, self.par_entite, self.par_source, self.par_tranche):
+            index.clear()
+
+    def _candidats(self, f: _Filtres) -> tuple[Iterable[EntreeAudit], deque[EntreeAudit] | None]:
+        """Plus petite file indexée couvrant les filtres d'égalité (du plus
+        récent au plus ancien), et cette file si elle ne contient que des
+        résultats (aucun autre filtre à appliquer)."""
+        files: list[tuple[deque[EntreeAudit], bool]] = []
+        if f.entite_type and f.entite_id is not None:
+            cle = (f.entite_type, f.entite_id)
+            files.append((self.par_entite.get(cle, deque()), not f.source))
+        elif f.entite_type:
+            files.append((self.par_type.get(f.entite_type, deque()), not f.source))
+        if f.source:
+            seule = not f.entite_type and f.entite_id is None
+            files.append((self.par_source.get(f.source, deque()), seule))
+        reste = bool(f.action or f.depuis or f.jusqu_a or f.avant)
+        if files:
+            file, couvre = min(files, key=lambda item: len(item[0]))
+            return reversed(file), file if couvre and not reste else None
+        if f.depuis or f.jusqu_a or f.avant:
+            return self._par_periode(f), None
+        return reversed(self.entrees), self.entrees if f.entite_id is None and not reste else None
+
+    def _par_periode(self, f: _Filtres) -> Iterator[EntreeAudit]:
+        fins = [m for m in (f.jusqu_a, f.avant[0] if f.avant else None) if m is not None]
+        haut = _tranche(min(fins)) if fins else None
+        bas = _tranche(f.depuis) if f.depuis else None
+        for tranche in reversed(self.par_tranche):
+            if (haut is None or tranche <= haut) and (bas is None or tranche >= bas):
+                yield from reversed(self.par_tranche[tranche])
+
+    def rechercher(
+        self, f: _Filtres, nombre: int, decalage: int, compter: bool
+    ) -> tuple[list[EntreeAudit], int | None]:
+        """``nombre`` entrées après ``decalage`` résultats, et le total si demandé."""
+        candidats, exacte = self._candidats(f)
+        if exacte is not None:
+            # File d'index exacte: accès direct à la page, total = sa longueur
+            dernier = len(exacte) - 1
+            fin = min(len(exacte), decalage + nombre)
+            page = [exacte[dernier - i] for i in range(decalage, fin)]
+            return page, len(exacte) if compter else None
+
+        resultats: list[EntreeAudit] = []
+        total = 0
+        for e in candidats:
+            if f.depuis is not None and e.timestamp < f.depuis:
+                break  # candidats du plus récent au plus ancien
+            if not f.accepte(e):
+                continue
+            total += 1
+            if total <= decalage:
+                continue
+            if len(resultats) < nombre:
+                resultats.append(e)
+            elif not compter:
+                break
+        return resultats, total if compter else None
+
+
 class ServiceAudit:
     """Service d'audit trail transversal.
 
     - Souscrit au bus d'événements pour enregistrement automatique
-    - Persiste en mémoire (buffer) + base de données (si disponible)
-    - Fournit recherche par type, entité, période
+    - Persiste en mémoire (buffer indexé) + base de données par lots
+    - Fournit recherche par type, entité, source, période
+
+    La base (PostgreSQL, table ``journal_audit``) est la source de vérité:
+    tous les workers y lisent le même historique, par pages ordonnées sur
+    ``(timestamp, id)`` servies par les index composites. Le buffer mémoire
+    ne sert que si la base est indisponible (ou absente, ex. SQLite). Les
+    actions d'un worker sont visibles des autres après l'écriture de leur
+    lot (``intervalle_ecriture`` au plus).
     """
 
-    def __init__(self, taille_buffer: int = 10_000):
+    def __init__(
+        self,
+        taille_buffer: int = 10_000,
+        taille_lot: int = TAILLE_LOT,
+        intervalle_ecriture: float = INTERVALLE_ECRITURE,
+        fabrique_session: Callable[[], AbstractContextManager[Session]] | None = None,
+        asynchrone: bool = True,
+    ):
         """Initialise le service d'audit.
 
         Args:
             taille_buffer: Taille max du buffer mémoire (FIFO).
+            taille_lot: Nombre max de lignes par INSERT groupé.
+            intervalle_ecriture: Délai max (s) avant écriture d'un lot incomplet.
+            fabrique_session: Contexte de session DB (défaut: ``obtenir_contexte_db``,
+                utilisé seulement sur PostgreSQL).
+            asynchrone: Écriture par un thread de fond (sinon synchrone, à
+                chaque lot complet et avant chaque consultation).
         """
-        self._buffer: deque[EntreeAudit] = deque(maxlen=taille_buffer)
+        self._journal = _JournalMemoire(taille_buffer)
+        self._buffer = self._journal.entrees
+        self._verrou = threading.Lock()
         self._compteur: int = 0
         self._souscrit: bool = False
 
+        self.taille_lot = max(1, taille_lot)
+        self._ecrivain = EcrivainDiffere(
+            "audit",
+            self.vidanger,
+            intervalle=intervalle_ecriture,
+            pause_indisponible=PAUSE_DB_INDISPONIBLE,
+            fabrique_session=fabrique_session,
+            asynchrone=asynchrone,
+        )
+        self._en_attente: deque[EntreeAudit] = deque(maxlen=taille_buffer)
+        self._verrou_ecriture = threading.Lock()
+        self._persistance: Counter[str] = Counter()
+
     # ─── Souscription au bus ───
 
     def souscrire_bus(self) -> None:
@@ -187,23 +394,22 @@ class ServiceAudit:
         Returns:
             EntreeAudit créée
         """
-        self._compteur += 1
-
-        entree = EntreeAudit(
-            id=self._compteur,
-            timestamp=datetime.now(),
-            action=action,
-            source=source,
-            utilisateur_id=utilisateur_id,
-            entite_type=entite_type,
-            entite_id=entite_id,
-            details=details or {},
-        )
-
-        self._buffer.append(entree)
-
-        # Persister en DB (async, best-effort)
-        self._persister_en_db(entree)
+        with self._verrou:
+            self._compteur += 1
+            entree = EntreeAudit(
+                id=self._compteur,
+                timestamp=datetime.now(),
+                action=action,
+                source=source,
+                utilisateur_id=utilisateur_id,
+                entite_type=entite_type,
+                entite_id=entite_id,
+                details=details or {},
+            )
+            self._journal.ajouter(entree)
+
+        # Persister en DB (par lots, best-effort)
+        self._planifier_ecriture(entree)
 
         logger.debug(f"Audit: {action} sur {entite_type}#{entite_id} par {source}")
         return entree
@@ -218,8 +424,15 @@ class ServiceAudit:
         jusqu_a: datetime | None = None,
         limite: int = 50,
         page: int = 1,
+        curseur: str | None = None,
+        compter: bool | None = None,
     ) -> ResultatRecherche:
-        """Consulte le journal d'audit avec filtres.
+        """Consulte le journal d'audit avec filtres, du plus récent au plus ancien.
+
+        Deux modes de pagination: ``page`` (décalage, compatible avec
+        l'existant) ou ``curseur`` (``curseur_suivant`` de la page
+        précédente): coût proportionnel à la page quelle que soit la
+        profondeur.
 
         Args:
             entite_type: Filtrer par type d'entité
@@ -229,41 +442,50 @@ class ServiceAudit:
             depuis: Date de début
             jusqu_a: Date de fin
             limite: Nombre max de résultats par page
-            page: Numéro de page (1-based)
+            page: Numéro de page (1-based, ignoré avec un curseur)
+            curseur: Position de reprise (prioritaire sur ``page``)
+            compter: Calculer le total (défaut: seulement sans curseur)
 
         Returns:
             ResultatRecherche paginé
-        """
-        resultats = list(self._buffer)
-
-        # Filtres
-        if entite_type:
-            resultats = [e for e in resultats if e.entite_type == entite_type]
-        if entite_id is not None:
-            resultats = [e for e in resultats if e.entite_id == entite_id]
-        if action:
-            resultats = [e for e in resultats if action in e.action]
-        if source:
-            resultats = [e for e in resultats if e.source == source]
-        if depuis:
-            resultats = [e for e in resultats if e.timestamp >= depuis]
-        if jusqu_a:
-            resultats = [e for e in resultats if e.timestamp <= jusqu_a]
-
-        # Trier par date décroissante
-        resultats.sort(key=lambda e: e.timestamp, reverse=True)
-
-        # Pagination
-        total = len(resultats)
-        debut = (page - 1) * limite
-        fin = debut + limite
-        page_resultats = resultats[debut:fin]
 
+        Raises:
+            ValueError: Curseur invalide
+        """
+        filtres = _Filtres(
+            entite_type=entite_type or None,
+            entite_id=_cle_entite(entite_id),
+            action=action or None,
+            source=source or None,
+            depuis=heure_locale_naive(depuis),
+            jusqu_a=heure_locale_naive(jusqu_a),
+            avant=decoder_curseur(curseur) if curseur else None,
+        )
+        if compter is None:
+            compter = curseur is None
+        page = max(1, page)
+        decalage = 0 if curseur else (page - 1) * limite
+
+        trouve: tuple[list[EntreeAudit], int | None] | None = None
+        if self._ecrivain.active():
+            self.vidanger()  # lire ses propres écritures
+            try:
+                trouve = self._consulter_db(filtres, limite + 1, decalage, compter)
+            except Exception as e:
+                self._ecrivain.suspendre(e)
+        if trouve is None:
+            with self._verrou:
+                trouve = self._journal.rechercher(filtres, limite + 1, decalage, compter)
+
+        entrees, total = trouve
+        suite = len(entrees) > limite
+        entrees = entrees[:limite]
         return ResultatRecherche(
-            entrees=page_resultats,
+            entrees=entrees,
             total=total,
             page=page,
             par_page=limite,
+            curseur_suivant=encoder_curseur(entrees[-1]) if suite else None,
         )
 
     def statistiques(self) -> dict[str, Any]:
@@ -272,21 +494,21 @@ class ServiceAudit:
         Returns:
             Dict avec compteurs par action, entité, source
         """
-        from collections import Counter
-
-        entrees = list(self._buffer)
-
-        actions = Counter(e.action for e in entrees)
-        entites = Counter(e.entite_type for e in entrees)
-        sources = Counter(e.source for e in entrees)
+        with self._verrou:
+            actions = Counter(e.action for e in self._buffer)
+            entites = Counter({k: len(v) for k, v in self._journal.par_type.items()})
+            sources = Counter({k: len(v) for k, v in self._journal.par_source.items()})
+            total = len(self._buffer)
 
         return {
-            "total_entrees": len(entrees),
+            "total_entrees": total,
             "par_action": dict(actions.most_common(20)),
             "par_entite": dict(entites.most_common(20)),
             "par_source": dict(sources.most_common(20)),
             "buffer_capacite": self._buffer.maxlen,
             "souscrit_bus": self._souscrit,
+            "en_attente_persistance": len(self._en_attente),
+            "persistance": dict(self._persistance),
         }
 
     def vider(self) -> int:
@@ -295,42 +517,134 @@ class ServiceAudit:
         Returns:
             Nombre d'entrées supprimées
         """
-        n = len(self._buffer)
-        self._buffer.clear()
+        with self._verrou:
+            n = len(self._buffer)
+            self._journal.vider()
         logger.info(f"Buffer audit vidé ({n} entrées)")
         return n
 
-    # ─── Persistance DB (best-effort) ───
+    # ─── Persistance DB (par lots, best-effort) ───
 
-    def _persister_en_db(self, entree: EntreeAudit) -> None:
-        """Persiste une entrée d'audit en base (best-effort, non-bloquant)."""
-        try:
-            from src.core.db import obtenir_contexte_db
-
-            with obtenir_contexte_db() as session:
-                from sqlalchemy import text
-
-                session.execute(
-                    text("""
-                        INSERT INTO journal_audit (timestamp, action, source, utilisateur_id,
-                                                   entite_type, entite_id, details)
-                        VALUES (:timestamp, :action, :source, :utilisateur_id,
-                                :entite_type, :entite_id, :details::jsonb)
-                    """),
-                    {
-                        "timestamp": entree.timestamp,
-                        "action": entree.action,
-                        "source": entree.source,
-                        "utilisateur_id": entree.utilisateur_id,
-                        "entite_type": entree.entite_type,
-                        "entite_id": str(entree.entite_id) if entree.entite_id else None,
-                        "details": str(entree.details),
-                    },
+    def vidanger(self) -> int:
+        """Écrit en base les entrées en attente (INSERT groupés de ``taille_lot``).
+
+        Returns:
+            Nombre d'entrées écrites
+        """
+        ecrites = 0
+        with self._verrou_ecriture:
+            while self._en_attente:
+                lot: list[EntreeAudit] = []
+                while self._en_attente and len(lot) < self.taille_lot:
+                    lot.append(self._en_attente.popleft())
+                try:
+                    self._persister_lot(lot)
+                except Exception as e:
+                    # Best-effort: lot abandonné, base mise en pause
+                    self._persistance["echecs"] += len(lot)
+                    self._ecrivain.suspendre(e)
+                    break
+                self._persistance["lots"] += 1
+                self._persistance["lignes"] += len(lot)
+                ecrites += len(lot)
+        return ecrites
+
+    def _planifier_ecriture(self, entree: EntreeAudit) -> None:
+        if not self._ecrivain.active():
+            return
+        with self._verrou:
+            if len(self._en_attente) == self._en_attente.maxlen:
+                # Base trop lente: la plus ancienne entrée en attente est évincée
+                self._persistance["perdues"] += 1
+            self._en_attente.append(entree)
+        if not self._ecrivain.asynchrone:
+            if len(self._en_attente) >= self.taille_lot:
+                self.vidanger()
+            return
+        self._ecrivain.demarrer()
+        if len(self._en_attente) >= self.taille_lot:
+            self._ecrivain.signaler()
+
+    def _persister_lot(self, lot: list[EntreeAudit]) -> None:
+        """Un seul INSERT multi-lignes pour tout le lot."""
+        from sqlalchemy import insert
+
+        from src.core.models.systeme import JournalAudit
+
+        lignes = [
+            {
+                "timestamp": e.timestamp,
+                "action": e.action,
+                "source": e.source,
+                "utilisateur_id": e.utilisateur_id,
+                "entite_type": e.entite_type,
+                "entite_id": _cle_entite(e.entite_id),
+                "details": json.loads(json.dumps(e.details, default=str)),
+                "ip_address": e.ip_address,
+            }
+            for e in lot
+        ]
+        with self._ecrivain.session() as session:
+            session.execute(insert(JournalAudit), lignes)
+            session.commit()
+
+    def _consulter_db(
+        self, f: _Filtres, nombre: int, decalage: int, compter: bool
+    ) -> tuple[list[EntreeAudit], int | None]:
+        """Page servie par les index ``(…, timestamp, id)``: parcours
+        descendant borné par ``LIMIT``, curseur en comparaison de tuples."""
+        from sqlalchemy import func, select, tuple_
+
+        from src.core.models.systeme import JournalAudit
+
+        conditions = []
+        if f.entite_type:
+            conditions.append(JournalAudit.entite_type == f.entite_type)
+        if f.entite_id is not None:
+            conditions.append(JournalAudit.entite_id == f.entite_id)
+        if f.action:
+            conditions.append(JournalAudit.action.contains(f.action, autoescape=True))
+        if f.source:
+            conditions.append(JournalAudit.source == f.source)
+        if f.depuis:
+            conditions.append(JournalAudit.timestamp >= f.depuis)
+        if f.jusqu_a:
+            conditions.append(JournalAudit.timestamp <= f.jusqu_a)
+
+        requete = select(JournalAudit).where(*conditions)
+        if f.avant:
+            position = tuple_(JournalAudit.timestamp, JournalAudit.id)
+            requete = requete.where(position < tuple_(*f.avant))
+        requete = requete.order_by(JournalAudit.timestamp.desc(), JournalAudit.id.desc())
+        if decalage:
+            requete = requete.offset(decalage)
+        requete = requete.limit(nombre)
+
+        with self._ecrivain.session() as session:
+            entrees = [
+                EntreeAudit(
+                    id=ligne.id,
+                    timestamp=ligne.timestamp,
+                    action=ligne.action,
+                    source=ligne.source or "",
+                    utilisateur_id=ligne.utilisateur_id,
+                    entite_type=ligne.entite_type or "",
+                    entite_id=(
+                        int(ligne.entite_id)
+                        if ligne.entite_id and ligne.entite_id.isdigit()
+                        else ligne.entite_id
+                    ),
+                    details=ligne.details or {},
+                    ip_address=ligne.ip_address,
+                )
+                for ligne in session.scalars(requete)
+            ]
+            total = None
+            if compter:
+                total = session.scalar(
+                    select(func.count()).select_from(JournalAudit).where(*conditions)
                 )
-                session.commit()
-        except Exception:
-            # Best-effort: si la table n'existe pas encore, on ne crash pas
-            pass
+        return entrees, total
 
 
 # ═══════════════════════════════════════════════════════════
@@ -350,5 +664,7 @@ __all__ = [
     "ServiceAudit",
     "EntreeAudit",
     "ResultatRecherche",
+    "decoder_curseur",
+    "encoder_curseur",
     "obtenir_service_audit",
 ]
@@ -7,6 +7,7 @@ Ce package regroupe les classes fondamentales des services:
 - IOService: Import/Export universel (CSV, JSON)
 - Mixins IA: RecipeAIMixin, PlanningAIMixin, InventoryAIMixin
 - Async utils: sync_wrapper pour conversion async→sync
+- Bulk: bulk_upsert (préchargement par clé + écriture groupée)
 - Protocols: Contrats d'interface (PEP 544)
 
 Imports paresseux (__getattr__) pour performance au démarrage.
@@ -23,6 +24,7 @@ _LAZY_IMPORTS: dict[str, tuple[str, str]] = {
     "ServiceMeta": (".async_utils", "ServiceMeta"),
     "dual_api": (".async_utils", "dual_api"),
     "run_sync": (".async_utils", "run_sync"),
+    "submit": (".async_utils", "submit"),
     "is_async_method": (".async_utils", "is_async_method"),
     "get_sync_name": (".async_utils", "get_sync_name"),
     # ─── AI Service ───
@@ -32,6 +34,10 @@ _LAZY_IMPORTS: dict[str, tuple[str, str]] = {
     "RecipeAIMixin": (".ai_mixins", "RecipeAIMixin"),
     "PlanningAIMixin": (".ai_mixins", "PlanningAIMixin"),
     "InventoryAIMixin": (".ai_mixins", "InventoryAIMixin"),
+    # ─── Bulk upsert ───
+    "bulk_upsert": (".bulk", "bulk_upsert"),
+    "precharger_par_cle": (".bulk", "precharger_par_cle"),
+    "ResultatUpsert": (".bulk", "ResultatUpsert"),
     # ─── CRUD Service ───
     "BaseService": (".types", "BaseService"),
     "T": (".types", "T"),
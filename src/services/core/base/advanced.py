@@ -169,7 +169,9 @@ class AdvancedQueryMixin:
         """Création en masse avec fusion intelligente.
 
         Crée ou met à jour des entités en fonction d'une clé de fusion.
-        Utile pour l'import de données avec déduplication.
+        Utile pour l'import de données avec déduplication. Les existants sont
+        préchargés en une requête ``IN`` et les créations écrites en
+        ``executemany`` (voir ``bulk.bulk_upsert``).
 
         Args:
             items_data: Liste de dictionnaires de données
@@ -188,29 +190,17 @@ class AdvancedQueryMixin:
         """
 
         def _execute(session: Session) -> tuple[int, int]:
-            created = merged = 0
-            for data in items_data:
-                merge_value = data.get(merge_key)
-                if not merge_value:
-                    continue
-
-                existing = (
-                    session.query(self.model)
-                    .filter(getattr(self.model, merge_key) == merge_value)
-                    .first()
-                )
-
-                if existing:
-                    existing_dict = self._model_to_dict(existing)
-                    merged_data = merge_strategy(existing_dict, data)
-                    for key, value in merged_data.items():
-                        if hasattr(existing, key):
-                            setattr(existing, key, value)
-                    merged += 1
-                else:
-                    entity = self.model(**_filtrer_donnees_modele(self.model, data))
-                    session.add(entity)
-                    created += 1
+            from .bulk import bulk_upsert
+
+            resultat = bulk_upsert(
+                session,
+                self.model,
+                [_filtrer_donnees_modele(self.model, data) for data in items_data],
+                merge_key,
+                fusion=merge_strategy,
+                vers_dict=self._model_to_dict,
+            )
+            created, merged = resultat.crees, resultat.mis_a_jour
 
             session.commit()
             logger.info(f"Bulk: {created} créés, {merged} fusionnés")
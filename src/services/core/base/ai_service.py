@@ -9,6 +9,7 @@ chaque fichier à taille raisonnable tout en conservant la même API publique.
     par la couche UI via l'Event Bus.
 """
 
+import asyncio
 import inspect
 import json
 import logging
@@ -135,9 +136,10 @@ class BaseAIService(
         temp = temperature if temperature is not None else self.default_temperature
         cache_category = category or self.cache_prefix
 
-        # ✅ Vérifier cache AVANT rate limit (économise les quotas)
+        # ✅ Vérifier cache AVANT rate limit (économise les quotas), hors boucle
         if use_cache:
-            cached = CacheIA.obtenir(
+            cached = await asyncio.to_thread(
+                CacheIA.obtenir,
                 prompt=prompt,
                 systeme=system_prompt,
                 temperature=temp,
@@ -212,7 +214,8 @@ class BaseAIService(
 
         # Sauvegarder dans cache
         if use_cache and response:
-            CacheIA.definir(
+            await asyncio.to_thread(
+                CacheIA.definir,
                 prompt=prompt,
                 reponse=response,
                 systeme=system_prompt,
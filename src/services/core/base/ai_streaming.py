@@ -105,8 +105,6 @@ class AIStreamingMixin:
             for chunk in service.call_with_streaming_sync("Génère une recette"):
                 yield chunk  # Transmettre au client SSE
         """
-        import asyncio
-        import concurrent.futures
 
         async def collect_chunks():
             chunks = []
@@ -119,18 +117,9 @@ class AIStreamingMixin:
                 chunks.append(chunk)
             return chunks
 
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-
-        if loop is not None:
-            # Event loop active — use thread
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, collect_chunks())
-                chunks = future.result()
-        else:
-            chunks = asyncio.run(collect_chunks())
+        from src.services.core.base.async_utils import run_sync
+
+        chunks = run_sync(collect_chunks())
 
         # Yield les chunks un par un
         yield from chunks
@@ -8,18 +8,20 @@ Features:
 - sync_wrapper: Décorateur pour créer une version sync d'une méthode async
 - ServiceMeta: Metaclass qui génère automatiquement les méthodes _sync
 - @dual_api: Décorateur de classe pour activer le dual API async/sync
+- run_sync / submit: Exécution sur la boucle d'arrière-plan persistante
 """
 
 from __future__ import annotations
 
-import asyncio
 import concurrent.futures
 import functools
 import inspect
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Coroutine
 from typing import Any, ParamSpec, TypeVar
 
+from src.core.async_utils import obtenir_boucle_arriere_plan
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -51,8 +53,9 @@ def sync_wrapper[**P, T](async_method: Callable[P, Awaitable[T]]) -> Callable[P,
     """
     Décorateur qui crée automatiquement une version synchrone d'une méthode async.
 
-    Gère intelligemment les cas où une boucle d'événements est déjà en cours
-    (comme dans certains contextes sync) en utilisant un ThreadPoolExecutor.
+    La coroutine est soumise à la boucle d'événements persistante d'arrière-plan
+    (voir ``src.core.async_utils.BoucleArrierePlan``), ce qui fonctionne aussi
+    lorsqu'une boucle est déjà en cours dans le thread appelant.
 
     Args:
         async_method: La méthode async à wrapper
@@ -74,26 +77,9 @@ def sync_wrapper[**P, T](async_method: Callable[P, Awaitable[T]]) -> Callable[P,
 
     @functools.wraps(async_method)
     def sync_method(*args: P.args, **kwargs: P.kwargs) -> T:
-        # Essayer d'obtenir la boucle courante
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-
-        # Créer la coroutine
-        coro = async_method(*args, **kwargs)
-
-        if loop is not None:
-            # Si une boucle d'événements est en cours, utiliser un thread séparé
-            logger.debug(
-                f"Event loop détectée, exécution de {async_method.__name__} dans un thread..."
-            )
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result()  # type: ignore[return-value]
-
-        # Pas de boucle d'événements, créer une nouvelle et exécuter
-        return asyncio.run(coro)  # type: ignore[return-value]
+        # La coroutine est exécutée sur la boucle d'arrière-plan partagée,
+        # qu'une boucle soit déjà active ou non dans le thread appelant
+        return run_sync(async_method(*args, **kwargs))
 
     return sync_method
 
@@ -259,14 +245,17 @@ def dual_api[T](cls: type[T]) -> type[T]:
 # ═══════════════════════════════════════════════════════════
 
 
-def run_sync[T](coro: Awaitable[T]) -> T:
+def run_sync[T](coro: Awaitable[T], timeout: float | None = None) -> T:
     """
     Exécute une coroutine de manière synchrone.
 
-    Gère intelligemment les cas où une boucle d'événements est déjà active.
+    Utilise la boucle d'événements persistante d'arrière-plan : pas de
+    nouvelle boucle ni de nouveau thread par appel, et les ressources liées à
+    la boucle (clients HTTP async, pools) sont réutilisées entre appels.
 
     Args:
         coro: La coroutine à exécuter
+        timeout: Délai maximal d'attente en secondes (``None`` = illimité)
 
     Returns:
         Le résultat de la coroutine
@@ -278,18 +267,27 @@ def run_sync[T](coro: Awaitable[T]) -> T:
         # Dans un contexte sync:
         data = run_sync(fetch_data())
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+    if not inspect.iscoroutine(coro):
+        # Awaitable générique (Future, objet __await__) : l'envelopper
+        async def _attendre() -> T:
+            return await coro
+
+        coro = _attendre()
+
+    return obtenir_boucle_arriere_plan().executer(coro, timeout=timeout)  # type: ignore[arg-type]
+
+
+def submit[T](coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """
+    Planifie une coroutine sur la boucle d'arrière-plan sans bloquer.
 
-    if loop is not None:
-        # Event loop active — use thread
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, coro)
-            return future.result()  # type: ignore[return-value]
+    Args:
+        coro: La coroutine à exécuter
 
-    return asyncio.run(coro)  # type: ignore[return-value]
+    Returns:
+        Un ``concurrent.futures.Future`` résolu avec le résultat de la coroutine
+    """
+    return obtenir_boucle_arriere_plan().submit(coro)
 
 
 def is_async_method(method: Any) -> bool:
@@ -308,6 +306,7 @@ __all__ = [
     "ServiceMeta",
     "dual_api",
     "run_sync",
+    "submit",
     "is_async_method",
     "get_sync_name",
 ]
@@ -0,0 +1,286 @@
+"""
+Upsert en masse — préchargement par clé, écriture groupée.
+
+Remplace le motif « une requête de recherche + un ``flush()`` par ligne »
+par un nombre constant d'aller-retours, quel que soit le volume:
+
+1. Préchargement des lignes existantes par clé normalisée (``IN`` par lots)
+2. Construction des insertions et des fusions en mémoire
+3. Écriture: ``UPDATE`` groupés par l'unit of work, ``INSERT ... RETURNING``
+   en ``executemany`` (``ON CONFLICT DO NOTHING`` si une contrainte
+   d'unicité est fournie), puis récupération des IDs
+
+Usage:
+    ::
+
+        from src.services.core.base.bulk import bulk_upsert
+
+        resultat = bulk_upsert(
+            session,
+            Ingredient,
+            [{"nom": "Tomates", "unite": "kg"}, {"nom": "Oignons"}],
+            cle="nom",
+            insensible_casse=True,
+            conflit_sur=("nom",),
+        )
+        resultat.ids["tomates"]  # → id de l'ingrédient
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, insert, select
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+TAILLE_LOT_DEFAUT = 500
+
+Fusion = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
+
+
+@dataclass
+class ResultatUpsert:
+    """Résultat d'un upsert en masse.
+
+    Attributes:
+        ids: Clé normalisée → ID de la ligne (créée ou existante)
+        crees: Nombre de lignes insérées
+        mis_a_jour: Nombre de lignes fusionnées avec une ligne existante
+        cles_creees: Clés normalisées des lignes insérées
+    """
+
+    ids: dict[Any, int] = field(default_factory=dict)
+    crees: int = 0
+    mis_a_jour: int = 0
+    cles_creees: list[Any] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.crees + self.mis_a_jour
+
+
+def normaliser_cle(valeur: Any, insensible_casse: bool = False) -> Any:
+    """Normalise une valeur de clé (strip + minuscules pour les chaînes)."""
+    if insensible_casse and isinstance(valeur, str):
+        return valeur.strip().lower()
+    return valeur
+
+
+def _par_lots(valeurs: Sequence[Any], taille: int) -> Iterable[Sequence[Any]]:
+    for debut in range(0, len(valeurs), taille):
+        yield valeurs[debut : debut + taille]
+
+
+def _colonnes_modele(model: type[Any]) -> set[str]:
+    return {attr.key for attr in model.__mapper__.column_attrs}
+
+
+def _entite_vers_dict(entite: Any) -> dict[str, Any]:
+    return {attr.key: getattr(entite, attr.key) for attr in entite.__mapper__.column_attrs}
+
+
+def precharger_par_cle(
+    session: Session,
+    model: type[Any],
+    cle: str,
+    valeurs: Iterable[Any],
+    *,
+    filtres: Sequence[Any] = (),
+    insensible_casse: bool = False,
+    taille_lot: int = TAILLE_LOT_DEFAUT,
+) -> dict[Any, Any]:
+    """Charge les entités existantes pour un ensemble de clés.
+
+    Une requête ``IN`` par lot de ``taille_lot`` valeurs (au lieu d'une
+    requête par valeur). En cas de doublons insensibles à la casse en base,
+    la première entité rencontrée (plus petit ID) est retenue.
+
+    Args:
+        session: Session SQLAlchemy
+        model: Modèle ORM
+        cle: Nom de l'attribut servant de clé
+        valeurs: Valeurs de clé recherchées
+        filtres: Conditions supplémentaires (ex: ``Modele.liste_id == 3``)
+        insensible_casse: Compare ``lower(colonne)`` aux valeurs normalisées
+        taille_lot: Nombre maximal de valeurs par requête
+
+    Returns:
+        Dict clé normalisée → entité
+    """
+    colonne = getattr(model, cle)
+    normalisees = list(
+        dict.fromkeys(
+            normaliser_cle(v, insensible_casse) for v in valeurs if v is not None and v != ""
+        )
+    )
+    existants: dict[Any, Any] = {}
+
+    for lot in _par_lots(normalisees, taille_lot):
+        cible = func.lower(colonne) if insensible_casse else colonne
+        requete = select(model).where(cible.in_(lot), *filtres).order_by(model.id)
+        for entite in session.execute(requete).scalars():
+            existants.setdefault(normaliser_cle(getattr(entite, cle), insensible_casse), entite)
+
+    return existants
+
+
+def bulk_upsert(
+    session: Session,
+    model: type[Any],
+    lignes: Iterable[dict[str, Any]],
+    cle: str,
+    *,
+    fusion: Fusion | None = None,
+    filtres: Sequence[Any] = (),
+    insensible_casse: bool = False,
+    conflit_sur: Sequence[str] | None = None,
+    vers_dict: Callable[[Any], dict[str, Any]] | None = None,
+    taille_lot: int = TAILLE_LOT_DEFAUT,
+) -> ResultatUpsert:
+    """Insère ou fusionne des lignes en un nombre constant de requêtes.
+
+    Les lignes sans valeur de clé sont ignorées. Plusieurs lignes partageant
+    la même clé sont fusionnées entre elles avant écriture. La session n'est
+    pas commitée: l'appelant garde la maîtrise de la transaction.
+
+    Args:
+        session: Session SQLAlchemy
+        model: Modèle ORM (doit exposer une colonne ``id``)
+        lignes: Données à écrire (les clés hors modèle sont ignorées)
+        cle: Attribut servant de clé de déduplication
+        fusion: ``(existant, nouveau) -> valeurs à appliquer``. Par défaut,
+            les valeurs de ``nouveau`` écrasent celles de l'existant.
+        filtres: Conditions restreignant les lignes existantes candidates
+        insensible_casse: Clé comparée en minuscules, sans espaces de bord
+        conflit_sur: Colonnes d'une contrainte d'unicité — active
+            ``ON CONFLICT DO NOTHING`` (PostgreSQL/SQLite) puis la fusion des
+            lignes insérées entre-temps par une autre transaction
+        vers_dict: Conversion entité → dict passée à ``fusion``
+        taille_lot: Taille des lots pour ``IN`` et ``executemany``
+
+    Returns:
+        ResultatUpsert avec les IDs indexés par clé normalisée
+    """
+    fusion = fusion or (lambda existant, nouveau: nouveau)
+    vers_dict = vers_dict or _entite_vers_dict
+    colonnes = _colonnes_modele(model)
+    resultat = ResultatUpsert()
+
+    # 1. Dédoublonnage en mémoire (les doublons sont fusionnés entre eux)
+    a_ecrire: dict[Any, dict[str, Any]] = {}
+    for ligne in lignes:
+        valeur = ligne.get(cle)
+        if valeur is None or valeur == "":
+            continue
+        donnees = {k: v for k, v in ligne.items() if k in colonnes}
+        cle_norm = normaliser_cle(valeur, insensible_casse)
+        if cle_norm in a_ecrire:
+            a_ecrire[cle_norm].update(fusion(a_ecrire[cle_norm], donnees))
+            resultat.mis_a_jour += 1
+        else:
+            a_ecrire[cle_norm] = donnees
+
+    if not a_ecrire:
+        return resultat
+
+    # 2. Préchargement des existants en une requête par lot
+    existants = precharger_par_cle(
+        session,
+        model,
+        cle,
+        a_ecrire.keys(),
+        filtres=filtres,
+        insensible_casse=insensible_casse,
+        taille_lot=taille_lot,
+    )
+
+    def _fusionner(entite: Any, donnees: dict[str, Any]) -> None:
+        for attribut, valeur in fusion(vers_dict(entite), donnees).items():
+            if attribut in colonnes and attribut != "id" and getattr(entite, attribut) != valeur:
+                setattr(entite, attribut, valeur)
+
+    a_inserer: dict[Any, dict[str, Any]] = {}
+    for cle_norm, donnees in a_ecrire.items():
+        entite = existants.get(cle_norm)
+        if entite is None:
+            a_inserer[cle_norm] = donnees
+            continue
+        _fusionner(entite, donnees)
+        resultat.ids[cle_norm] = entite.id
+        resultat.mis_a_jour += 1
+
+    # 3. Insertions groupées (les UPDATE partent avec le flush automatique).
+    # Un executemany applique le jeu de colonnes de sa première ligne à tout
+    # le lot: les lignes sont regroupées par jeu de colonnes pour que les
+    # valeurs par défaut des colonnes absentes soient conservées.
+    if a_inserer:
+        colonne_cle = getattr(model, cle)
+        par_colonnes: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for donnees in a_inserer.values():
+            par_colonnes.setdefault(frozenset(donnees), []).append(donnees)
+        for groupe in par_colonnes.values():
+            for lot in _par_lots(groupe, taille_lot):
+                requete = _requete_insertion(session, model, conflit_sur)
+                lignes_retour = session.execute(requete.returning(model.id, colonne_cle), list(lot))
+                for id_, valeur in lignes_retour:
+                    cle_norm = normaliser_cle(valeur, insensible_casse)
+                    if cle_norm in a_inserer and cle_norm not in resultat.ids:
+                        resultat.ids[cle_norm] = id_
+                        resultat.cles_creees.append(cle_norm)
+                        resultat.crees += 1
+
+        # Lignes écartées par ON CONFLICT: la contrainte d'unicité prime sur
+        # les filtres, la ligne en conflit est rechargée sans eux puis fusionnée
+        manquantes = [k for k in a_inserer if k not in resultat.ids]
+        if manquantes:
+            concurrents = precharger_par_cle(
+                session,
+                model,
+                cle,
+                manquantes,
+                insensible_casse=insensible_casse,
+                taille_lot=taille_lot,
+            )
+            for cle_norm, entite in concurrents.items():
+                _fusionner(entite, a_inserer[cle_norm])
+                resultat.ids[cle_norm] = entite.id
+                resultat.mis_a_jour += 1
+
+    session.flush()
+    logger.debug(
+        "Bulk upsert %s: %d créés, %d fusionnés",
+        getattr(model, "__tablename__", model),
+        resultat.crees,
+        resultat.mis_a_jour,
+    )
+    return resultat
+
+
+def _requete_insertion(session: Session, model: type[Any], conflit_sur: Sequence[str] | None):
+    """Construit l'INSERT adapté au dialecte (``ON CONFLICT DO NOTHING`` si possible)."""
+    if conflit_sur:
+        dialecte = session.get_bind().dialect.name
+        if dialecte == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as insert_dialecte
+        elif dialecte == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as insert_dialecte
+        else:
+            return insert(model)
+        return insert_dialecte(model).on_conflict_do_nothing(index_elements=list(conflit_sur))
+    return insert(model)
+
+
+__all__ = [
+    "ResultatUpsert",
+    "TAILLE_LOT_DEFAUT",
+    "bulk_upsert",
+    "normaliser_cle",
+    "precharger_par_cle",
+]
@@ -27,6 +27,8 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import func, text
 
+from src.core.db.periodes import filtre_mois
+
 from .jobs_backup import (
     executer_job_backup_auto_hebdo_json,
     executer_job_rappels_jardin_saisonniers,
@@ -646,11 +648,10 @@ def _job_digest_telegram_matinal() -> None:
     """Envoie le digest Telegram matinal (repas, tâches, péremptions) à 07h30."""
 
     try:
-        import asyncio
-
+        from src.core.async_utils import executer_async
         from src.services.integrations.telegram import envoyer_digest_matinal
 
-        resultat = asyncio.run(envoyer_digest_matinal())
+        resultat = executer_async(envoyer_digest_matinal())
 
         if resultat:
             logger.info("Digest Telegram matinal envoyé")
@@ -765,8 +766,7 @@ def _job_rappel_courses_ntfy() -> None:
 
             return
 
-        import asyncio
-
+        from src.core.async_utils import executer_async
         from src.services.core.notifications.notif_ntfy import obtenir_service_ntfy
 
         service = obtenir_service_ntfy()
@@ -775,7 +775,7 @@ def _job_rappel_courses_ntfy() -> None:
 
             return await service.envoyer_rappel_courses(nb_articles)
 
-        resultat = asyncio.run(_envoyer())
+        resultat = executer_async(_envoyer())
 
         if resultat.succes:
             logger.info("Rappel courses ntfy envoyé (%d articles)", nb_articles)
@@ -1395,8 +1395,7 @@ def _job_rapport_mensuel_budget() -> None:
             total_famille = (
                 session.query(func.sum(BudgetFamille.montant))
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois,
-                    func.extract("year", BudgetFamille.date) == annee,
+                    filtre_mois(BudgetFamille.date, annee, mois),
                 )
                 .scalar()
                 or 0
@@ -1412,8 +1411,7 @@ def _job_rapport_mensuel_budget() -> None:
             mises = (
                 session.query(func.sum(PariSportif.mise))
                 .filter(
-                    func.extract("month", PariSportif.cree_le) == mois,
-                    func.extract("year", PariSportif.cree_le) == annee,
+                    filtre_mois(PariSportif.cree_le, annee, mois),
                 )
                 .scalar()
                 or 0
@@ -1422,8 +1420,7 @@ def _job_rapport_mensuel_budget() -> None:
             gains = (
                 session.query(func.sum(PariSportif.gain))
                 .filter(
-                    func.extract("month", PariSportif.cree_le) == mois,
-                    func.extract("year", PariSportif.cree_le) == annee,
+                    filtre_mois(PariSportif.cree_le, annee, mois),
                 )
                 .scalar()
                 or 0
@@ -1979,96 +1976,109 @@ def _job_rapport_maison_mensuel() -> None:
 
 
 def _job_sync_openfoodfacts() -> None:
-    """J6 — Refresh cache OpenFoodFacts pour les articles scannés les 30 derniers jours (dim 03h00)."""
+    """J6 — Refresh cache OpenFoodFacts des articles scannés (dim 03h00).
+
+    Récupération concurrente cadencée (seau à jetons), requêtes conditionnelles
+    (ETag / empreinte) et un upsert groupé par lot de produits modifiés.
+    """
 
     try:
-        import time
-        from datetime import datetime, timedelta
+        from sqlalchemy import select
 
+        from src.core.async_utils import executer_async
+        from src.core.config import obtenir_parametres
         from src.core.db import obtenir_contexte_db
         from src.core.models import ArticleInventaire
         from src.core.models.user_preferences import OpenFoodFactsCache
-        from src.services.integrations.produit import OpenFoodFactsService
-
-        service = OpenFoodFactsService()
-
-        horizon = datetime.utcnow() - timedelta(days=30)
+        from src.core.monitoring import MetriqueType, enregistrer_metrique
+        from src.services.core.base.bulk import bulk_upsert, precharger_par_cle
+        from src.services.integrations.sync_openfoodfacts import RafraichisseurOpenFoodFacts
 
         with obtenir_contexte_db() as session:
-            # Articles scannés (avec code-barres) ajoutés ou modifiés dans les 30 derniers jours
+            # Codes-barres distincts de l'inventaire, sans charger les articles
 
-            articles = (
-                session.query(ArticleInventaire)
-                .filter(
-                    ArticleInventaire.code_barres.isnot(None),
-                    ArticleInventaire.code_barres != "",
-                )
-                .limit(100)
-                .all()
+            codes_barres = list(
+                session.execute(
+                    select(ArticleInventaire.code_barres)
+                    .where(
+                        ArticleInventaire.code_barres.isnot(None),
+                        ArticleInventaire.code_barres != "",
+                    )
+                    .distinct()
+                ).scalars()
             )
 
-            codes_barres = list({a.code_barres for a in articles if a.code_barres})
-
-        nb_maj = 0
-
-        for code in codes_barres:
-            try:
-                produit = service.rechercher_produit(code)
-
-                if produit is None:
-                    continue
-
-                with obtenir_contexte_db() as session:
-                    cache_entry = (
-                        session.query(OpenFoodFactsCache)
-                        .filter(OpenFoodFactsCache.code_barres == code)
-                        .first()
-                    )
+            # ETag / empreinte connus: une requête IN par lot
 
-                    if cache_entry is None:
-                        cache_entry = OpenFoodFactsCache(code_barres=code)
+            etats = {
+                code: (entree.etag, entree.empreinte)
+                for code, entree in precharger_par_cle(
+                    session, OpenFoodFactsCache, "code_barres", codes_barres
+                ).items()
+            }
 
-                        session.add(cache_entry)
+        def _ecrire_lot(lignes: list[dict]) -> int:
+            with obtenir_contexte_db() as session:
+                resultat = bulk_upsert(
+                    session,
+                    OpenFoodFactsCache,
+                    lignes,
+                    cle="code_barres",
+                    conflit_sur=("code_barres",),
+                )
 
-                    cache_entry.nom = produit.nom
+                session.commit()
 
-                    cache_entry.marque = produit.marque
+            return resultat.total
 
-                    cache_entry.categorie = produit.categorie
+        magasin = None
 
-                    cache_entry.nutriscore = produit.nutriscore
+        if obtenir_parametres().OFF_MAGASIN_LOCAL:
+            from src.services.integrations.magasin_produits import obtenir_magasin_produits
 
-                    cache_entry.nova_group = produit.nova_group
+            magasin = obtenir_magasin_produits()
 
-                    cache_entry.ecoscore = produit.ecoscore
+        rafraichisseur = RafraichisseurOpenFoodFacts(magasin=magasin)
 
-                    cache_entry.nutrition_data = produit.nutrition_data
+        metriques = executer_async(
+            rafraichisseur.rafraichir(codes_barres, etats, ecrire=_ecrire_lot), timeout=None
+        )
 
-                    cache_entry.image_url = produit.image_url
+        for nom, valeur in metriques.to_dict().items():
+            enregistrer_metrique(f"openfoodfacts.sync.{nom}", valeur, MetriqueType.JAUGE)
 
-                    cache_entry.last_updated = datetime.utcnow()
+        logger.info(
+            "J6 sync_openfoodfacts terminée: %d code(s), %d modifié(s), %d inchangé(s), "
+            "%d inconnu(s), %d erreur(s), %d écrit(s) en %.1fs (%.2f codes/s)",
+            metriques.codes,
+            metriques.modifies,
+            metriques.inchanges,
+            metriques.inconnus,
+            metriques.erreurs,
+            metriques.ecrits,
+            metriques.duree_s,
+            metriques.debit,
+        )
 
-                    session.commit()
+    except Exception:
+        logger.exception("Erreur job J6 sync_openfoodfacts")
 
-                nb_maj += 1
 
-                # Respecter l'API publique OpenFoodFacts (throttle léger)
+def _job_snapshot_dashboard() -> None:
+    """Précalcule le snapshot agrégé du tableau de bord (toutes les 15 min)."""
 
-                time.sleep(0.5)
+    try:
+        from src.services.dashboard.snapshot import obtenir_service_snapshot_dashboard
 
-            except Exception:
-                logger.debug(
-                    "J6: impossible de mettre à jour le code-barres %s", code, exc_info=True
-                )
+        snapshot = obtenir_service_snapshot_dashboard().precalculer()
 
-        logger.info(
-            "J6 sync_openfoodfacts terminée: %d produit(s) mis à jour sur %d",
-            nb_maj,
-            len(codes_barres),
+        logger.debug(
+            "snapshot_dashboard précalculé: %d alerte(s)",
+            len(snapshot.get("alertes", [])),
         )
 
     except Exception:
-        logger.exception("Erreur job J6 sync_openfoodfacts")
+        logger.exception("Erreur job snapshot_dashboard")
 
 
 def _job_prediction_courses_weekly() -> None:
@@ -3453,6 +3463,24 @@ def _job_expiration_recettes_suggestion() -> None:
         logger.exception("Erreur anti_gaspi_recettes expiration_recettes_suggestion")
 
 
+def _job_stats_duree_vie() -> None:
+    """Anti-gaspi — Intègre les nouvelles consommations dans ``stats_duree_vie``."""
+
+    try:
+        from src.services.cuisine import obtenir_service_prediction_peremption
+
+        resultat = obtenir_service_prediction_peremption().mettre_a_jour_statistiques()
+
+        logger.info(
+            "stats_duree_vie: %d évènement(s), %d durée(s) intégrée(s)",
+            resultat.get("evenements", 0),
+            resultat.get("observations", 0),
+        )
+
+    except Exception:
+        logger.exception("Erreur job stats_duree_vie")
+
+
 def _job_stock_prediction_reapprovisionnement() -> None:
     """Prédiction stock — Prédit les réapprovisionnements hebdomadaires à surveiller."""
 
@@ -3723,8 +3751,7 @@ def _job_nutrition_adultes_weekly() -> None:
     """Nutrition adultes — Génère un bilan nutritionnel adulte hebdomadaire lié à Garmin."""
 
     try:
-        import asyncio
-
+        from src.core.async_utils import executer_async
         from src.services.core.notifications.notif_dispatcher import get_dispatcher_notifications
         from src.services.cuisine.inter_module_garmin_nutrition_adultes import (
             get_garmin_nutrition_adultes_service,
@@ -3754,7 +3781,7 @@ def _job_nutrition_adultes_weekly() -> None:
 
         niveau_ia = mapping_niveau.get(niveau, "modere")
 
-        bilan = asyncio.run(
+        bilan = executer_async(
             get_nutrition_famille_ai_service().analyser_nutrition_personne(
                 personne_nom=str(besoins.get("nom_profil", "Adulte principal")),
                 age_ans=35,
@@ -4136,15 +4163,14 @@ def _job_suggestion_soiree() -> None:
     """Suggestion légère de soirée couple le vendredi soir."""
 
     try:
-        import asyncio
-
+        from src.core.async_utils import executer_async
         from src.services.core.notifications.notif_dispatcher import get_dispatcher_notifications
         from src.services.famille.soiree_ai import obtenir_service_soiree_ai
 
         suggestion = ""
 
         try:
-            suggestion = asyncio.run(
+            suggestion = executer_async(
                 obtenir_service_soiree_ai().suggerer_soirees(
                     budget=70,
                     duree_heures=3.0,
@@ -4243,6 +4269,8 @@ _REGISTRE_JOBS: dict[str, tuple[str, Callable[[], None]]] = {
     "archive_batches_expires": ("Archivage batch expiré", _job_archive_batches_expires),
     "rapport_maison_mensuel": ("Rapport maison mensuel", _job_rapport_maison_mensuel),
     "sync_openfoodfacts": ("Sync cache OpenFoodFacts", _job_sync_openfoodfacts),
+    "snapshot_dashboard": ("Précalcul snapshot dashboard", _job_snapshot_dashboard),
+    "stats_duree_vie": ("Statistiques durée de vie inventaire", _job_stats_duree_vie),
     # Jobs planifiés supplémentaires
     "recap_weekend_dimanche_soir": (
         "Recap weekend dimanche soir",
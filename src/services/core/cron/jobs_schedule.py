@@ -61,6 +61,8 @@ def configurer_jobs_planifies(planifier_job) -> None:
         CronTrigger(day_of_week="sun", hour=3, minute=0),
         replace_existing=True,
     )
+    planifier_job("snapshot_dashboard", CronTrigger(minute="*/15"), replace_existing=True)
+    planifier_job("stats_duree_vie", CronTrigger(minute=40), replace_existing=True)
 
     # Jobs CRON & notifications
     planifier_job(
@@ -33,6 +33,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from src.core.db import obtenir_contexte_db
+from src.core.db.periodes import filtre_mois
 
 logger = logging.getLogger(__name__)
 
@@ -441,8 +442,7 @@ def sync_budget_consolidation():
             total_famille = (
                 session.query(func.sum(BudgetFamille.montant))
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois,
-                    func.extract("year", BudgetFamille.date) == annee,
+                    filtre_mois(BudgetFamille.date, annee, mois),
                 )
                 .scalar()
                 or 0
@@ -676,9 +676,10 @@ def configurer_jobs_bridges(scheduler: BackgroundScheduler) -> None:
 
 def resume_mensuel_jeux_telegram():
     """E2: Résumé mensuel automatique des dépenses jeux → Telegram."""
-    import asyncio
     from datetime import date
 
+    from src.core.async_utils import executer_async
+
     logger.info("🎲 Résumé mensuel jeux")
 
     try:
@@ -695,13 +696,12 @@ def resume_mensuel_jeux_telegram():
             annee_cible = aujourd_hui.year
 
         with obtenir_contexte_db() as session:
-            from sqlalchemy import extract, func
+            from sqlalchemy import func
 
             paris = (
                 session.query(PariSportif)
                 .filter(
-                    extract("month", PariSportif.cree_le) == mois_cible,
-                    extract("year", PariSportif.cree_le) == annee_cible,
+                    filtre_mois(PariSportif.cree_le, annee_cible, mois_cible),
                 )
                 .all()
             )
@@ -716,7 +716,7 @@ def resume_mensuel_jeux_telegram():
 
         from src.services.integrations.telegram import envoyer_resume_mensuel_jeux
 
-        asyncio.run(
+        executer_async(
             envoyer_resume_mensuel_jeux(
                 mois=mois_cible,
                 annee=annee_cible,
@@ -742,7 +742,7 @@ def resume_mensuel_jeux_telegram():
 
 def alertes_inventaire_bas():
     """E4: Vérifie les articles en dessous du seuil minimum → Telegram."""
-    import asyncio
+    from src.core.async_utils import executer_async
 
     logger.info("📦 Vérification inventaire bas")
 
@@ -783,7 +783,7 @@ def alertes_inventaire_bas():
 
         from src.services.integrations.telegram import envoyer_alerte_inventaire_bas
 
-        asyncio.run(envoyer_alerte_inventaire_bas(articles_liste))
+        executer_async(envoyer_alerte_inventaire_bas(articles_liste))
 
     except Exception as e:
         logger.error(f"❌ Erreur alertes inventaire bas: {e}", exc_info=True)
@@ -800,9 +800,10 @@ def rapport_mensuel_auto() -> None:
     Génère le bilan du mois précédent (données + synthèse IA)
     et l'envoie par email à EMAIL_FAMILLE si configuré.
     """
-    import asyncio
     import os
 
+    from src.core.async_utils import executer_async
+
     logger.info("📘 Génération rapport mensuel automatique")
 
     email_famille = os.getenv("EMAIL_FAMILLE", "")
@@ -827,7 +828,7 @@ def rapport_mensuel_auto() -> None:
         from src.services.rapports.bilan_mensuel import obtenir_bilan_mensuel_service
 
         service_bilan = obtenir_bilan_mensuel_service()
-        bilan = asyncio.run(service_bilan.generer_bilan(mois_prec))
+        bilan = executer_async(service_bilan.generer_bilan(mois_prec))
 
         donnees = bilan.get("donnees", {})
         rapport = {
@@ -942,6 +942,24 @@ def _sync_charges_vers_dashboard(event: EvenementDomaine) -> None:
         logger.warning("Échec invalidation cache charges->dashboard: %s", e)
 
 
+def _invalider_snapshot_dashboard(event: EvenementDomaine) -> None:
+    """Invalide le snapshot agrégé du dashboard principal (cache + précalcul)."""
+
+    try:
+        from src.services.dashboard.snapshot import obtenir_service_snapshot_dashboard
+
+        nb = obtenir_service_snapshot_dashboard().invalider()
+
+        logger.debug(
+            "Snapshot dashboard invalidé (%d entrées) suite à %s",
+            nb,
+            event.type,
+        )
+
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Échec invalidation snapshot dashboard: %s", e)
+
+
 # -----------------------------------------------------------
 
 # INTERACTIONS INTER-MODULES (EventBus)
@@ -2301,6 +2319,15 @@ def enregistrer_subscribers() -> int:
 
     compteur += 1
 
+    # Snapshot agrégé du dashboard principal
+
+    from src.services.dashboard.snapshot import EVENEMENTS_INVALIDATION
+
+    for pattern in EVENEMENTS_INVALIDATION:
+        bus.souscrire(pattern, _invalider_snapshot_dashboard, priority=95)
+
+        compteur += 1
+
     # -- Inter-modules EventBus enrichi --
 
     bus.souscrire("jardin.recolte", _proposer_recettes_saison_depuis_recolte, priority=80)
@@ -5,10 +5,13 @@ Gère les opérations qui échouent (réseau, DB indisponible) en les mettant
 en file d'attente pour un retry automatique avec backoff exponentiel.
 
 Architecture:
-- File d'attente persistante en mémoire (deque) + fichier JSON (survit aux redémarrages)
-- Retry automatique avec backoff exponentiel (1s → 2s → 4s → 8s → max 60s)
+- File d'attente en mémoire (dict ordonné par id) + journal append-only avec
+  snapshot/compaction (survit aux redémarrages et aux crashs en cours d'écriture)
+- Enqueue / acquittement en O(1) (une ligne de journal)
+- Retry automatique avec backoff exponentiel (1s → 2s → 4s → 8s → max 60s),
+  planifié dans un min-heap indexé sur la date de prochaine tentative
 - Souscription au bus d'événements pour capturer les échecs
-- Traitement batch périodique (manuellement ou via timer)
+- Traitement par lots avec concurrence bornée (manuellement ou via timer)
 
 Usage:
     from src.services.core.file_attente import obtenir_file_attente
@@ -32,10 +35,9 @@ Usage:
 from __future__ import annotations
 
 import importlib
-import json
 import logging
+import threading
 import time
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, StrEnum, auto
@@ -44,6 +46,11 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from src.services.core.journal_file import (
+    JournalFile,
+    PlanningRetries,
+    executer_en_parallele,
+)
 from src.services.core.registry import service_factory
 
 logger = logging.getLogger(__name__)
@@ -104,8 +111,9 @@ BACKOFF_BASE = 1.0  # secondes
 BACKOFF_MAX = 60.0  # secondes
 MAX_TENTATIVES_DEFAUT = 5
 TAILLE_FILE_MAX = 1000
+CONCURRENCE_DEFAUT = 4
 
-# Fichier de persistance
+# Fichier de persistance (snapshot; le journal est à côté: .file_attente.json.journal)
 FICHIER_PERSISTANCE = Path("data/.file_attente.json")
 
 
@@ -113,18 +121,24 @@ class ServiceFileAttente:
     """Service de file d'attente pour opérations différées.
 
     Stocke les opérations échouées et les retente avec backoff exponentiel.
-    Persiste en fichier JSON pour survivre aux redémarrages.
+    Persiste via un journal append-only (voir ``journal_file``) pour survivre
+    aux redémarrages.
     """
 
     def __init__(
         self,
         max_tentatives: int = MAX_TENTATIVES_DEFAUT,
         fichier: Path | None = None,
+        concurrence: int = CONCURRENCE_DEFAUT,
     ):
-        self._file: deque[OperationEnAttente] = deque(maxlen=TAILLE_FILE_MAX)
+        self._file: dict[int, OperationEnAttente] = {}
+        self._planning = PlanningRetries()
         self._compteur: int = 0
         self._max_tentatives = max_tentatives
+        self._concurrence = concurrence
         self._fichier = fichier or FICHIER_PERSISTANCE
+        self._journal = JournalFile(self._fichier)
+        self._lock = threading.RLock()
         self._stats_globales = {
             "total_enqueue": 0,
             "total_reussies": 0,
@@ -155,66 +169,85 @@ class ServiceFileAttente:
         Returns:
             OperationEnAttente créée
         """
-        self._compteur += 1
-        self._stats_globales["total_enqueue"] += 1
-
-        op = OperationEnAttente(
-            id=self._compteur,
-            operation=operation,
-            callback=callback,
-            payload=payload,
-            max_tentatives=max_tentatives or self._max_tentatives,
-        )
+        with self._lock:
+            self._compteur += 1
+            self._stats_globales["total_enqueue"] += 1
+
+            op = OperationEnAttente(
+                id=self._compteur,
+                operation=operation,
+                callback=callback,
+                payload=payload,
+                max_tentatives=max_tentatives or self._max_tentatives,
+            )
+
+            if len(self._file) >= TAILLE_FILE_MAX:
+                # Capacité atteinte: l'opération la plus ancienne est évincée
+                self._acquitter(next(iter(self._file)))
 
-        self._file.append(op)
-        self._persister()
+            self._file[op.id] = op
+            self._planning.planifier(op.id, op.prochaine_tentative.timestamp())
+            self._journal.ajouter(op.id, op.model_dump(mode="json"))
+            self._compacter_si_necessaire()
 
         logger.info(
             f"File d'attente: ajout #{op.id} '{operation}' (file: {len(self._file)} éléments)"
         )
         return op
 
-    def traiter(self) -> ResultatTraitement:
-        """Traite toutes les opérations en attente (batch).
+    def traiter(
+        self,
+        limite: int | None = None,
+        concurrence: int | None = None,
+    ) -> ResultatTraitement:
+        """Traite les opérations dont la prochaine tentative est passée (batch).
 
-        Retente les opérations dont la prochaine tentative est passée.
+        Les opérations dues sont extraites du min-heap de planification puis
+        exécutées en parallèle (au plus ``concurrence`` à la fois).
         Applique le backoff exponentiel en cas d'échec.
 
+        Args:
+            limite: Nombre max d'opérations traitées (None = toutes les dues)
+            concurrence: Exécutions simultanées (défaut: valeur du service)
+
         Returns:
             ResultatTraitement avec compteurs
         """
         debut = time.monotonic()
-        maintenant = datetime.now()
 
         traitees = 0
         reussies = 0
         echouees = 0
         abandonnees = 0
 
-        # Copier la file pour itération (on modifie en place)
-        operations_a_traiter = [
-            op
-            for op in self._file
-            if op.statut == StatutOperation.EN_ATTENTE and op.prochaine_tentative <= maintenant
-        ]
-
-        for op in operations_a_traiter:
-            traitees += 1
-            op.statut = StatutOperation.EN_COURS
-            op.tentatives += 1
-
-            succes = self._executer_operation(op)
-
-            if succes:
-                op.statut = StatutOperation.REUSSI
-                reussies += 1
-                self._stats_globales["total_reussies"] += 1
-                logger.info(f"File d'attente: #{op.id} '{op.operation}' réussie")
-            else:
-                if op.tentatives >= op.max_tentatives:
+        with self._lock:
+            ids_dus = self._planning.extraire_dues(time.time(), limite)
+            operations_a_traiter = [self._file[i] for i in ids_dus if i in self._file]
+            for op in operations_a_traiter:
+                op.statut = StatutOperation.EN_COURS
+                op.tentatives += 1
+
+        succes_par_op = executer_en_parallele(
+            self._executer_operation,
+            operations_a_traiter,
+            concurrence or self._concurrence,
+        )
+
+        with self._lock:
+            for op, succes in zip(operations_a_traiter, succes_par_op, strict=True):
+                traitees += 1
+
+                if succes:
+                    op.statut = StatutOperation.REUSSI
+                    reussies += 1
+                    self._stats_globales["total_reussies"] += 1
+                    self._acquitter(op.id)
+                    logger.info(f"File d'attente: #{op.id} '{op.operation}' réussie")
+                elif op.tentatives >= op.max_tentatives:
                     op.statut = StatutOperation.ABANDONNE
                     abandonnees += 1
                     self._stats_globales["total_abandonnees"] += 1
+                    self._acquitter(op.id)
                     logger.warning(
                         f"File d'attente: #{op.id} '{op.operation}' abandonnée "
                         f"après {op.tentatives} tentatives"
@@ -230,18 +263,27 @@ class ServiceFileAttente:
                     op.statut = StatutOperation.EN_ATTENTE
                     echouees += 1
                     self._stats_globales["total_echouees"] += 1
+                    self._planning.planifier(op.id, op.prochaine_tentative.timestamp())
+                    self._journal.modifier(
+                        op.id,
+                        op.model_dump(
+                            mode="json",
+                            include={
+                                "statut",
+                                "tentatives",
+                                "derniere_erreur",
+                                "prochaine_tentative",
+                                "backoff_secondes",
+                            },
+                        ),
+                    )
                     logger.debug(
                         f"File d'attente: #{op.id} '{op.operation}' échouée, "
                         f"retry dans {delai:.0f}s"
                     )
 
-        # Nettoyer les opérations terminées (réussies ou abandonnées)
-        self._file = deque(
-            (op for op in self._file if op.statut == StatutOperation.EN_ATTENTE),
-            maxlen=TAILLE_FILE_MAX,
-        )
-
-        self._persister()
+            self._compacter_si_necessaire()
+            restantes = len(self._file)
 
         duree = (time.monotonic() - debut) * 1000
 
@@ -250,7 +292,7 @@ class ServiceFileAttente:
             reussies=reussies,
             echouees=echouees,
             abandonnees=abandonnees,
-            restantes=len(self._file),
+            restantes=restantes,
             duree_ms=round(duree, 2),
         )
 
@@ -268,7 +310,7 @@ class ServiceFileAttente:
         Returns:
             Liste d'opérations
         """
-        resultats = list(self._file)
+        resultats = list(self._file.values())
         if statut:
             resultats = [op for op in resultats if op.statut == statut]
         return resultats[:limite]
@@ -279,9 +321,11 @@ class ServiceFileAttente:
         Returns:
             Nombre d'opérations supprimées
         """
-        n = len(self._file)
-        self._file.clear()
-        self._persister()
+        with self._lock:
+            n = len(self._file)
+            self._file.clear()
+            self._planning.vider()
+            self._journal.compacter([])
         logger.info(f"File d'attente vidée ({n} opérations)")
         return n
 
@@ -294,15 +338,12 @@ class ServiceFileAttente:
         Returns:
             True si supprimée
         """
-        avant = len(self._file)
-        self._file = deque(
-            (op for op in self._file if op.id != operation_id),
-            maxlen=TAILLE_FILE_MAX,
-        )
-        if len(self._file) < avant:
-            self._persister()
+        with self._lock:
+            if operation_id not in self._file:
+                return False
+            self._acquitter(operation_id)
+            self._compacter_si_necessaire()
             return True
-        return False
 
     def statistiques(self) -> dict[str, Any]:
         """Retourne les statistiques de la file.
@@ -310,10 +351,11 @@ class ServiceFileAttente:
         Returns:
             Dict avec compteurs et état de la file
         """
-        en_attente = sum(1 for op in self._file if op.statut == StatutOperation.EN_ATTENTE)
+        operations = list(self._file.values())
+        en_attente = sum(1 for op in operations if op.statut == StatutOperation.EN_ATTENTE)
 
         operations_par_type: dict[str, int] = {}
-        for op in self._file:
+        for op in operations:
             operations_par_type[op.operation] = operations_par_type.get(op.operation, 0) + 1
 
         return {
@@ -372,39 +414,38 @@ class ServiceFileAttente:
 
     # ─── Persistance ───
 
-    def _persister(self) -> None:
-        """Persiste la file en fichier JSON (best-effort)."""
-        try:
-            self._fichier.parent.mkdir(parents=True, exist_ok=True)
-            donnees = [op.model_dump(mode="json") for op in self._file]
-            self._fichier.write_text(
-                json.dumps(donnees, default=str, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
-        except Exception as e:
-            logger.debug(f"Persistance file d'attente échouée: {e}")
+    def _acquitter(self, operation_id: int) -> None:
+        """Retire une opération de la file (O(1): une ligne de journal)."""
+        self._file.pop(operation_id, None)
+        self._planning.retirer(operation_id)
+        self._journal.supprimer(operation_id)
+
+    def _compacter_si_necessaire(self) -> None:
+        """Snapshot + troncature du journal quand il dépasse le seuil."""
+        self._journal.compacter_si_necessaire(
+            op.model_dump(mode="json") for op in self._file.values()
+        )
 
     def _charger_persistance(self) -> None:
-        """Charge la file depuis le fichier JSON (si existant)."""
+        """Recharge la file depuis le snapshot + journal (si existants)."""
         try:
-            if self._fichier.exists():
-                donnees = json.loads(self._fichier.read_text(encoding="utf-8"))
-                for d in donnees:
-                    try:
-                        op = OperationEnAttente(**d)
-                        # Re-mettre en attente si elle était en cours
-                        if op.statut == StatutOperation.EN_COURS:
-                            op.statut = StatutOperation.EN_ATTENTE
-                        if op.statut == StatutOperation.EN_ATTENTE:
-                            self._file.append(op)
-                            self._compteur = max(self._compteur, op.id)
-                    except Exception:
-                        pass  # Ignorer les entrées corrompues
-
-                if self._file:
-                    logger.info(
-                        f"File d'attente: {len(self._file)} opérations restaurées depuis le fichier"
-                    )
+            for d in self._journal.charger().values():
+                try:
+                    op = OperationEnAttente(**d)
+                    # Re-mettre en attente si elle était en cours
+                    if op.statut == StatutOperation.EN_COURS:
+                        op.statut = StatutOperation.EN_ATTENTE
+                    if op.statut == StatutOperation.EN_ATTENTE:
+                        self._file[op.id] = op
+                        self._planning.planifier(op.id, op.prochaine_tentative.timestamp())
+                        self._compteur = max(self._compteur, op.id)
+                except Exception:
+                    pass  # Ignorer les entrées corrompues
+
+            if self._file:
+                logger.info(
+                    f"File d'attente: {len(self._file)} opérations restaurées depuis le fichier"
+                )
         except Exception as e:
             logger.debug(f"Chargement file d'attente échoué: {e}")
 
@@ -0,0 +1,295 @@
+"""
+Backend durable pour les files d'attente serveur.
+
+Remplace la réécriture complète d'un fichier JSON à chaque opération par:
+- un journal append-only (JSON Lines): une ligne par ajout / modification /
+  acquittement, soit O(1) par opération;
+- un snapshot périodique (compaction) écrit de façon atomique
+  (fichier temporaire + ``os.replace``), puis troncature du journal.
+
+Au chargement, le snapshot est relu puis le journal rejoué. Une dernière
+ligne tronquée (crash en cours d'écriture) est ignorée. Le rejeu est
+idempotent: un crash entre l'écriture du snapshot et la troncature du
+journal ne corrompt pas l'état.
+
+Le snapshot garde le format historique (liste JSON d'enregistrements), les
+fichiers de persistance existants sont donc relus tels quels.
+
+Fournit aussi:
+- ``PlanningRetries``: min-heap des prochaines tentatives (suppression paresseuse)
+- ``executer_en_parallele``: exécution d'un lot avec concurrence bornée
+
+Usage:
+    from src.services.core.journal_file import JournalFile
+
+    journal = JournalFile(Path("data/.ma_file.json"))
+    etat = journal.charger()                    # {id: enregistrement}
+    journal.ajouter("42", {"id": 42, ...})
+    journal.modifier("42", {"tentatives": 1})
+    journal.supprimer("42")
+    journal.compacter_si_necessaire(etat.values())
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+SEUIL_COMPACTION_DEFAUT = 1000
+
+
+class JournalFile:
+    """Journal append-only + snapshot pour une file d'enregistrements indexés par ``id``.
+
+    Args:
+        snapshot: Chemin du snapshot JSON (le journal est ``<snapshot>.journal``)
+        seuil_compaction: Nombre minimal d'entrées de journal avant compaction
+        fsync: Force ``os.fsync`` après chaque écriture (résiste aux coupures
+            de courant, au prix d'un appel système par opération)
+    """
+
+    def __init__(
+        self,
+        snapshot: Path,
+        seuil_compaction: int = SEUIL_COMPACTION_DEFAUT,
+        fsync: bool = False,
+    ):
+        self.snapshot = Path(snapshot)
+        self.journal = self.snapshot.with_name(self.snapshot.name + ".journal")
+        self.seuil_compaction = seuil_compaction
+        self.fsync = fsync
+        self._flux: IO[str] | None = None
+        self._entrees = 0
+        self._lock = threading.Lock()
+
+    @property
+    def entrees_journal(self) -> int:
+        """Nombre d'entrées écrites depuis le dernier snapshot."""
+        return self._entrees
+
+    # ─── Lecture ───
+
+    def charger(self) -> dict[str, dict[str, Any]]:
+        """Reconstruit l'état: snapshot puis rejeu du journal.
+
+        Returns:
+            Dict ``str(id)`` → enregistrement, dans l'ordre d'insertion
+        """
+        etat: dict[str, dict[str, Any]] = {}
+
+        if self.snapshot.exists():
+            try:
+                for enregistrement in json.loads(self.snapshot.read_text(encoding="utf-8")):
+                    if isinstance(enregistrement, dict) and "id" in enregistrement:
+                        etat[str(enregistrement["id"])] = enregistrement
+            except Exception as e:
+                logger.warning(f"Snapshot file illisible ({self.snapshot}): {e}")
+
+        self._entrees = 0
+        if self.journal.exists():
+            with self.journal.open(encoding="utf-8") as flux:
+                for numero, ligne in enumerate(flux, start=1):
+                    if not ligne.strip():
+                        continue
+                    try:
+                        entree = json.loads(ligne)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Journal {self.journal.name}: ligne {numero} ignorée")
+                        continue
+                    self._appliquer(etat, entree)
+                    self._entrees += 1
+
+        return etat
+
+    @staticmethod
+    def _appliquer(etat: dict[str, dict[str, Any]], entree: dict[str, Any]) -> None:
+        cle = str(entree.get("id"))
+        type_entree = entree.get("t")
+        if type_entree == "put":
+            etat.pop(cle, None)  # ré-insertion en fin d'ordre
+            etat[cle] = entree["d"]
+        elif type_entree == "upd":
+            if cle in etat:
+                etat[cle].update(entree["d"])
+        elif type_entree == "del":
+            etat.pop(cle, None)
+
+    # ─── Écriture O(1) ───
+
+    def ajouter(self, cle: Any, enregistrement: dict[str, Any]) -> None:
+        """Journalise un enregistrement complet (ajout ou remplacement)."""
+        self._ecrire({"t": "put", "id": str(cle), "d": enregistrement})
+
+    def modifier(self, cle: Any, champs: dict[str, Any]) -> None:
+        """Journalise une modification partielle."""
+        self._ecrire({"t": "upd", "id": str(cle), "d": champs})
+
+    def supprimer(self, cle: Any) -> None:
+        """Journalise un acquittement / une suppression."""
+        self._ecrire({"t": "del", "id": str(cle)})
+
+    def _ecrire(self, entree: dict[str, Any]) -> None:
+        ligne = json.dumps(entree, default=str, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            try:
+                flux = self._ouvrir()
+                flux.write(ligne + "\n")
+                flux.flush()
+                if self.fsync:
+                    os.fsync(flux.fileno())
+                self._entrees += 1
+            except Exception as e:
+                logger.debug(f"Écriture journal {self.journal.name} échouée: {e}")
+
+    def _ouvrir(self) -> IO[str]:
+        if self._flux is None or self._flux.closed:
+            self.journal.parent.mkdir(parents=True, exist_ok=True)
+            self._flux = self.journal.open("a", encoding="utf-8")
+        return self._flux
+
+    # ─── Compaction ───
+
+    def compacter(self, enregistrements: Iterable[dict[str, Any]]) -> None:
+        """Écrit un snapshot atomique de l'état courant puis tronque le journal."""
+        donnees = list(enregistrements)
+        with self._lock:
+            try:
+                self.snapshot.parent.mkdir(parents=True, exist_ok=True)
+                temporaire = self.snapshot.with_name(self.snapshot.name + ".tmp")
+                with temporaire.open("w", encoding="utf-8") as flux:
+                    json.dump(donnees, flux, default=str, ensure_ascii=False)
+                    flux.flush()
+                    if self.fsync:
+                        os.fsync(flux.fileno())
+                os.replace(temporaire, self.snapshot)
+
+                if self._flux is not None:
+                    self._flux.close()
+                    self._flux = None
+                self.journal.unlink(missing_ok=True)
+                self._entrees = 0
+            except Exception as e:
+                logger.debug(f"Compaction {self.snapshot.name} échouée: {e}")
+
+    def compacter_si_necessaire(self, enregistrements: Iterable[dict[str, Any]]) -> bool:
+        """Compacte quand le journal dépasse le seuil (coût amorti O(1) par opération).
+
+        Args:
+            enregistrements: État vivant (évalué seulement si compaction)
+
+        Returns:
+            True si une compaction a eu lieu
+        """
+        if self._entrees < self.seuil_compaction:
+            return False
+        self.compacter(enregistrements)
+        return True
+
+    def fermer(self) -> None:
+        """Ferme le flux du journal."""
+        with self._lock:
+            if self._flux is not None:
+                self._flux.close()
+                self._flux = None
+
+
+class PlanningRetries:
+    """Min-heap des prochaines tentatives ``(timestamp, -priorite, ordre, cle)``.
+
+    Les entrées obsolètes (opération acquittée ou replanifiée) sont ignorées
+    au dépilement: ``planifier`` remplace l'entrée courante d'une clé, sans
+    recherche dans le tas.
+    """
+
+    def __init__(self):
+        self._tas: list[tuple[float, int, int, Any]] = []
+        self._courantes: dict[Any, int] = {}  # clé → ordre de l'entrée valide
+        self._ordre = 0
+
+    def __len__(self) -> int:
+        return len(self._courantes)
+
+    def planifier(self, cle: Any, timestamp: float, priorite: int = 0) -> None:
+        """Planifie (ou replanifie) une clé; ``priorite`` ordonne les clés dues."""
+        self._ordre += 1
+        self._courantes[cle] = self._ordre
+        heapq.heappush(self._tas, (timestamp, -priorite, self._ordre, cle))
+
+    def retirer(self, cle: Any) -> None:
+        """Déplanifie une clé (suppression paresseuse)."""
+        self._courantes.pop(cle, None)
+
+    def prochaine(self) -> float | None:
+        """Timestamp de la prochaine tentative valide (None si vide)."""
+        self._purger_tete()
+        return self._tas[0][0] if self._tas else None
+
+    def extraire_dues(self, maintenant: float, limite: int | None = None) -> list[Any]:
+        """Dépile les clés dont la date est atteinte.
+
+        Les clés dues sont rendues par priorité décroissante puis date
+        croissante; au-delà de ``limite``, elles restent planifiées.
+        """
+        dues: list[tuple[int, float, int, Any]] = []
+        while True:
+            self._purger_tete()
+            if not self._tas or self._tas[0][0] > maintenant:
+                break
+            timestamp, priorite, ordre, cle = heapq.heappop(self._tas)
+            dues.append((priorite, timestamp, ordre, cle))
+
+        dues.sort()
+        retenues = dues if limite is None else dues[:limite]
+        for priorite, timestamp, ordre, cle in dues[len(retenues) :]:
+            heapq.heappush(self._tas, (timestamp, priorite, ordre, cle))
+        for *_, cle in retenues:
+            self._courantes.pop(cle, None)
+        return [cle for *_, cle in retenues]
+
+    def vider(self) -> None:
+        """Déplanifie toutes les clés."""
+        self._tas.clear()
+        self._courantes.clear()
+
+    def _purger_tete(self) -> None:
+        while self._tas:
+            _, _, ordre, cle = self._tas[0]
+            if self._courantes.get(cle) == ordre:
+                return
+            heapq.heappop(self._tas)
+
+
+def executer_en_parallele(
+    fonction: Callable[[Any], Any],
+    elements: list[Any],
+    concurrence: int = 4,
+) -> list[Any]:
+    """Applique ``fonction`` à chaque élément avec au plus ``concurrence`` threads.
+
+    Returns:
+        Résultats dans l'ordre des éléments
+    """
+    if concurrence <= 1 or len(elements) <= 1:
+        return [fonction(element) for element in elements]
+
+    with ThreadPoolExecutor(
+        max_workers=min(concurrence, len(elements)), thread_name_prefix="file-attente"
+    ) as executeur:
+        return list(executeur.map(fonction, elements))
+
+
+__all__ = [
+    "JournalFile",
+    "PlanningRetries",
+    "SEUIL_COMPACTION_DEFAUT",
+    "executer_en_parallele",
+]
@@ -636,8 +636,7 @@ class DispatcherNotifications:
         """Envoie via ntfy.sh."""
 
         try:
-            import asyncio
-
+            from src.core.async_utils import executer_async
             from src.services.core.notifications.notif_ntfy import obtenir_service_ntfy
             from src.services.core.notifications.types import NotificationNtfy
 
@@ -654,7 +653,7 @@ class DispatcherNotifications:
 
                 return await service.envoyer(notif)
 
-            resultat = asyncio.run(_send())
+            resultat = executer_async(_send())
 
             return bool(getattr(resultat, "succes", False))
 
@@ -715,8 +714,7 @@ class DispatcherNotifications:
         """Envoie via Telegram Bot API."""
 
         try:
-            import asyncio
-
+            from src.core.async_utils import executer_async
             from src.core.config import obtenir_parametres
             from src.services.integrations.telegram import (
                 envoyer_alerte_budget_depassement,
@@ -799,7 +797,7 @@ class DispatcherNotifications:
 
                     return await envoyer_message_telegram(destinataire, message)
 
-            return asyncio.run(_send())
+            return executer_async(_send())
 
         except Exception as e:
             logger.error("Erreur Telegram : %s", e)
@@ -8,8 +8,11 @@ Complète le Service Worker (client-side) avec un mécanisme serveur pour:
 - Persister la queue sur disque (survit aux redémarrages)
 
 Architecture:
-- Queue FIFO persistante (JSON file-backed)
-- Retry avec backoff exponentiel
+- Queue persistante: journal append-only + snapshot/compaction (O(1) par
+  ajout / acquittement, voir ``journal_file``)
+- Retry avec backoff exponentiel planifié (min-heap sur la prochaine
+  tentative, sans ``sleep`` bloquant)
+- Traitement par lots avec concurrence bornée
 - Dead-letter queue pour les erreurs non-récupérables
 - Intégration event bus pour notification de sync
 
@@ -34,11 +37,10 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import logging
+import threading
 import time
 import uuid
-from collections import deque
 from datetime import datetime
 from enum import Enum, StrEnum
 from pathlib import Path
@@ -46,6 +48,11 @@ from typing import Any, Callable
 
 from pydantic import BaseModel, Field
 
+from src.services.core.journal_file import (
+    JournalFile,
+    PlanningRetries,
+    executer_en_parallele,
+)
 from src.services.core.registry import service_factory
 
 logger = logging.getLogger(__name__)
@@ -78,6 +85,7 @@ class OperationFile(BaseModel):
     max_tentatives: int = 3
     cree_le: datetime = Field(default_factory=datetime.now)
     derniere_tentative: datetime | None = None
+    prochaine_tentative: datetime | None = None
     erreur: str | None = None
     resultat: dict[str, Any] | None = None
 
@@ -104,19 +112,27 @@ QUEUE_DIR = Path("data/offline_queue")
 QUEUE_FILE = QUEUE_DIR / "queue.json"
 DEAD_LETTER_FILE = QUEUE_DIR / "dead_letter.json"
 
+BACKOFF_MAX = 30.0  # secondes
+CONCURRENCE_DEFAUT = 4
+
 
 class ServiceFileAttente:
     """File d'attente côté serveur pour synchronisation offline.
 
-    - Persiste sur disque (JSON)
-    - Retry avec backoff exponentiel
+    - Persiste sur disque (journal append-only + snapshot)
+    - Retry avec backoff exponentiel planifié
     - Dead-letter queue
     - Handlers d'opérations enregistrables
     """
 
-    def __init__(self):
-        self._file: deque[OperationFile] = deque()
-        self._dead_letter: list[OperationFile] = []
+    def __init__(self, concurrence: int = CONCURRENCE_DEFAUT):
+        self._file: dict[str, OperationFile] = {}
+        self._dead_letter: dict[str, OperationFile] = {}
+        self._planning = PlanningRetries()
+        self._journal = JournalFile(QUEUE_FILE)
+        self._journal_dead_letter = JournalFile(DEAD_LETTER_FILE)
+        self._concurrence = concurrence
+        self._lock = threading.RLock()
         self._handlers: dict[str, Callable] = {}
         self._terminees: int = 0
         self._derniere_sync: datetime | None = None
@@ -131,38 +147,50 @@ class ServiceFileAttente:
     # ─── Persistance ───
 
     def _charger(self) -> None:
-        """Charge la queue depuis le fichier JSON."""
-        if QUEUE_FILE.exists():
-            try:
-                data = json.loads(QUEUE_FILE.read_text(encoding="utf-8"))
-                for item in data:
-                    self._file.append(OperationFile(**item))
+        """Recharge la queue et la dead-letter depuis snapshot + journal."""
+        try:
+            for item in self._journal.charger().values():
+                op = OperationFile(**item)
+                if op.statut == StatutOperation.EN_COURS:
+                    op.statut = StatutOperation.EN_ATTENTE
+                self._file[op.id] = op
+                self._planifier(op)
+            if self._file:
                 logger.info(f"Queue offline chargée: {len(self._file)} opérations")
-            except Exception as e:
-                logger.warning(f"Erreur chargement queue: {e}")
-
-        if DEAD_LETTER_FILE.exists():
-            try:
-                data = json.loads(DEAD_LETTER_FILE.read_text(encoding="utf-8"))
-                self._dead_letter = [OperationFile(**item) for item in data]
-            except Exception:
-                pass
-
-    def _sauvegarder(self) -> None:
-        """Sauvegarde la queue sur disque."""
+        except Exception as e:
+            logger.warning(f"Erreur chargement queue: {e}")
+
         try:
-            data = [op.model_dump(mode="json") for op in self._file]
-            QUEUE_FILE.write_text(
-                json.dumps(data, default=str, ensure_ascii=False), encoding="utf-8"
-            )
+            self._dead_letter = {
+                item["id"]: OperationFile(**item)
+                for item in self._journal_dead_letter.charger().values()
+            }
+        except Exception:
+            pass
 
-            if self._dead_letter:
-                dl_data = [op.model_dump(mode="json") for op in self._dead_letter]
-                DEAD_LETTER_FILE.write_text(
-                    json.dumps(dl_data, default=str, ensure_ascii=False), encoding="utf-8"
-                )
-        except Exception as e:
-            logger.warning(f"Erreur sauvegarde queue: {e}")
+    def _planifier(self, op: OperationFile) -> None:
+        """Inscrit l'opération dans le min-heap (priorité haute d'abord à date égale)."""
+        date = op.prochaine_tentative or op.cree_le
+        self._planning.planifier(op.id, date.timestamp(), op.priorite)
+
+    def _retirer(self, op: OperationFile) -> None:
+        """Acquitte une opération de la file (O(1))."""
+        self._file.pop(op.id, None)
+        self._planning.retirer(op.id)
+        self._journal.supprimer(op.id)
+
+    def _mettre_en_dead_letter(self, op: OperationFile) -> None:
+        self._retirer(op)
+        self._dead_letter[op.id] = op
+        self._journal_dead_letter.ajouter(op.id, op.model_dump(mode="json"))
+
+    def _compacter_si_necessaire(self) -> None:
+        self._journal.compacter_si_necessaire(
+            op.model_dump(mode="json") for op in self._file.values()
+        )
+        self._journal_dead_letter.compacter_si_necessaire(
+            op.model_dump(mode="json") for op in self._dead_letter.values()
+        )
 
     # ─── Enregistrement de handlers ───
 
@@ -202,44 +230,66 @@ class ServiceFileAttente:
             priorite=priorite,
             max_tentatives=max_tentatives,
         )
-        self._file.append(op)
-        self._sauvegarder()
+        with self._lock:
+            self._file[op.id] = op
+            self._planifier(op)
+            self._journal.ajouter(op.id, op.model_dump(mode="json"))
+            self._compacter_si_necessaire()
         logger.info(f"Opération ajoutée: {operation} (priorité={priorite})")
         return op
 
-    def traiter_file(self, limite: int | None = None) -> list[OperationFile]:
-        """Traite les opérations en attente dans la file.
+    def traiter_file(
+        self,
+        limite: int | None = None,
+        concurrence: int | None = None,
+    ) -> list[OperationFile]:
+        """Traite les opérations dues de la file, par lot.
+
+        Les opérations dont la prochaine tentative est atteinte sont extraites
+        du min-heap (priorité décroissante à date égale) puis exécutées avec au
+        plus ``concurrence`` handlers simultanés.
 
         Args:
             limite: Nombre max d'opérations à traiter (None = toutes)
+            concurrence: Exécutions simultanées (défaut: valeur du service)
 
         Returns:
             Liste des opérations traitées
         """
-        traitees: list[OperationFile] = []
-
-        # Trier par priorité (décroissante) puis date (croissante)
-        ops_a_traiter = sorted(
-            [op for op in self._file if op.statut == StatutOperation.EN_ATTENTE],
-            key=lambda o: (-o.priorite, o.cree_le),
-        )
-
-        if limite:
-            ops_a_traiter = ops_a_traiter[:limite]
-
-        for op in ops_a_traiter:
-            resultat = self._executer_operation(op)
-            traitees.append(resultat)
-
-        # Nettoyer les opérations terminées de la file
-        self._file = deque(
-            op
-            for op in self._file
-            if op.statut not in (StatutOperation.TERMINEE, StatutOperation.DEAD_LETTER)
+        with self._lock:
+            ids_dus = self._planning.extraire_dues(time.time(), limite)
+            ops_a_traiter = [self._file[i] for i in ids_dus if i in self._file]
+
+        traitees = executer_en_parallele(
+            self._executer_operation,
+            ops_a_traiter,
+            concurrence or self._concurrence,
         )
 
-        self._derniere_sync = datetime.now()
-        self._sauvegarder()
+        with self._lock:
+            for op in traitees:
+                if op.statut == StatutOperation.TERMINEE:
+                    self._retirer(op)
+                elif op.statut == StatutOperation.DEAD_LETTER:
+                    self._mettre_en_dead_letter(op)
+                else:
+                    self._planifier(op)
+                    self._journal.modifier(
+                        op.id,
+                        op.model_dump(
+                            mode="json",
+                            include={
+                                "statut",
+                                "tentatives",
+                                "derniere_tentative",
+                                "prochaine_tentative",
+                                "erreur",
+                            },
+                        ),
+                    )
+
+            self._derniere_sync = datetime.now()
+            self._compacter_si_necessaire()
 
         # Émettre événement de sync
         self._emettre_sync_terminee(traitees)
@@ -247,14 +297,13 @@ class ServiceFileAttente:
         return traitees
 
     def _executer_operation(self, op: OperationFile) -> OperationFile:
-        """Exécute une opération avec retry."""
+        """Exécute une opération; en cas d'échec, planifie la prochaine tentative."""
         handler = self._handlers.get(op.operation)
 
         if not handler:
             logger.warning(f"Pas de handler pour '{op.operation}'")
             op.statut = StatutOperation.DEAD_LETTER
             op.erreur = f"Handler non trouvé pour '{op.operation}'"
-            self._dead_letter.append(op)
             return op
 
         op.statut = StatutOperation.EN_COURS
@@ -274,18 +323,19 @@ class ServiceFileAttente:
 
             if op.tentatives >= op.max_tentatives:
                 op.statut = StatutOperation.DEAD_LETTER
-                self._dead_letter.append(op)
                 logger.warning(f"Opération {op.id} en dead-letter après {op.tentatives} tentatives")
             else:
                 op.statut = StatutOperation.EN_ATTENTE
-                # Backoff exponentiel: 2^tentatives secondes
-                time.sleep(min(2**op.tentatives, 30))
+                # Backoff exponentiel: 2^tentatives secondes, replanifié (non bloquant)
+                op.prochaine_tentative = datetime.fromtimestamp(
+                    time.time() + min(2**op.tentatives, BACKOFF_MAX)
+                )
 
         return op
 
     def statut(self) -> StatutFile:
         """Retourne le statut global de la file."""
-        ops = list(self._file)
+        ops = list(self._file.values())
         return StatutFile(
             en_attente=sum(1 for o in ops if o.statut == StatutOperation.EN_ATTENTE),
             en_cours=sum(1 for o in ops if o.statut == StatutOperation.EN_COURS),
@@ -318,7 +368,7 @@ class ServiceFileAttente:
         Returns:
             Liste des opérations non-récupérables
         """
-        return list(self._dead_letter)
+        return list(self._dead_letter.values())
 
     def rejouer_dead_letter(self, operation_id: str) -> OperationFile | None:
         """Rejoue une opération depuis la dead-letter queue.
@@ -329,18 +379,21 @@ class ServiceFileAttente:
         Returns:
             OperationFile rejouée ou None si non trouvée
         """
-        for i, op in enumerate(self._dead_letter):
-            if op.id == operation_id:
-                # Remettre en file avec tentatives remises à zéro
-                op.statut = StatutOperation.EN_ATTENTE
-                op.tentatives = 0
-                op.erreur = None
-                self._file.append(op)
-                self._dead_letter.pop(i)
-                self._sauvegarder()
-                logger.info(f"Opération {operation_id} remise en file depuis dead-letter")
-                return op
-        return None
+        with self._lock:
+            op = self._dead_letter.pop(operation_id, None)
+            if op is None:
+                return None
+            # Remettre en file avec tentatives remises à zéro
+            op.statut = StatutOperation.EN_ATTENTE
+            op.tentatives = 0
+            op.erreur = None
+            op.prochaine_tentative = None
+            self._journal_dead_letter.supprimer(operation_id)
+            self._file[op.id] = op
+            self._planifier(op)
+            self._journal.ajouter(op.id, op.model_dump(mode="json"))
+        logger.info(f"Opération {operation_id} remise en file depuis dead-letter")
+        return op
 
     def vider(self) -> int:
         """Vide la file d'attente (pour maintenance).
@@ -348,9 +401,11 @@ class ServiceFileAttente:
         Returns:
             Nombre d'opérations supprimées
         """
-        n = len(self._file)
-        self._file.clear()
-        self._sauvegarder()
+        with self._lock:
+            n = len(self._file)
+            self._file.clear()
+            self._planning.vider()
+            self._journal.compacter([])
         logger.info(f"File d'attente vidée ({n} opérations)")
         return n
 
@@ -12,6 +12,9 @@ import logging
 import re as _re
 from collections import defaultdict
 from datetime import date
+from functools import lru_cache
+
+from src.core.utils.classification_texte import ClassifieurMotsCles
 
 # Normalisations de noms d'ingrédients pour la déduplication
 
@@ -62,6 +65,17 @@ def _normaliser_ingredient(nom: str) -> str:
     return key.strip()
 
 
+@lru_cache(maxsize=1)
+def _classifieur_familles() -> ClassifieurMotsCles:
+    """Classifieur compilé une fois: chaque clé de MAPPING_FAMILLES est une catégorie."""
+    from src.services.cuisine.courses.constantes import MAPPING_FAMILLES
+
+    # Priorité aux clés les plus longues (ex: "lait d'avoine" avant "lait")
+    return ClassifieurMotsCles(
+        {mot_cle: [mot_cle] for mot_cle in sorted(MAPPING_FAMILLES, key=len, reverse=True)}
+    )
+
+
 def detecter_famille(nom: str) -> tuple[str | None, str | None]:
     """Détecte la famille et sous-famille d'un ingrédient par son nom.
 
@@ -70,12 +84,8 @@ def detecter_famille(nom: str) -> tuple[str | None, str | None]:
     """
     from src.services.cuisine.courses.constantes import MAPPING_FAMILLES
 
-    nom_normalise = nom.casefold().strip()
-    # Priorité aux clés les plus longues (ex: "lait d'avoine" avant "lait")
-    for mot_cle in sorted(MAPPING_FAMILLES, key=len, reverse=True):
-        if mot_cle.casefold() in nom_normalise:
-            return MAPPING_FAMILLES[mot_cle]
-    return None, None
+    mot_cle = _classifieur_familles().premiere(nom.strip())
+    return MAPPING_FAMILLES[mot_cle] if mot_cle else (None, None)
 
 
 def _parser_texte_courses(texte: str, source_label: str) -> list[tuple[str, float, str]]:
@@ -336,6 +346,7 @@ from src.core.models import (
     Repas,
 )
 from src.services.core.base import BaseAIService
+from src.services.core.base.bulk import bulk_upsert, normaliser_cle
 from src.services.core.event_bus_mixin import emettre_evenement_simple
 
 from .constantes import MAPPING_RAYONS, PRIORITES
@@ -343,6 +354,33 @@ from .types import ArticleCourse, ListeCoursesIntelligente, SuggestionSubstituti
 
 logger = logging.getLogger(__name__)
 
+_UNITES_VAGUES = (None, "", "pcs", "piece", "pièce")
+
+
+def _fusionner_unite_ingredient(existant: dict, nouveau: dict) -> dict:
+    """Met à jour l'unité d'un ingrédient existant si l'article en fournit une plus précise."""
+
+    if nouveau.get("unite") not in _UNITES_VAGUES and existant.get("unite") in _UNITES_VAGUES:
+        return {"unite": nouveau["unite"]}
+
+    return {}
+
+
+def _fusionner_article_courses(existant: dict, nouveau: dict) -> dict:
+    """Cumule la quantité d'un article déjà présent (non acheté) dans la liste."""
+
+    notes_actuelles = existant.get("notes") or ""
+
+    return {
+        "quantite_necessaire": (existant.get("quantite_necessaire") or 0)
+        + (nouveau.get("quantite_necessaire") or 0),
+        "notes": (
+            notes_actuelles
+            if "planning" in notes_actuelles
+            else f"{notes_actuelles} + planning".strip()
+        ),
+    }
+
 
 class ServiceCoursesIntelligentes(BaseAIService):
     """Service pour generer des listes de courses intelligentes depuis le planning."""
@@ -700,64 +738,41 @@ class ServiceCoursesIntelligentes(BaseAIService):
 
         liste_id = liste_active.id
 
-        for article in articles:
-            # Chercher ou creer l'ingredient (matching exact insensible à la casse)
-
-            ingredient = db.query(Ingredient).filter(Ingredient.nom.ilike(article.nom)).first()
-
-            if not ingredient:
-                ingredient = Ingredient(
-                    nom=article.nom, categorie=article.rayon, unite=article.unite or "pcs"
-                )
-
-                db.add(ingredient)
-
-                db.flush()
-
-            elif article.unite and article.unite not in ("pcs", "piece", "pièce", ""):
-                # Mettre à jour l'unité de l'ingrédient si on a une unité plus précise
-
-                if ingredient.unite in (None, "", "pcs", "piece", "pièce"):
-                    ingredient.unite = article.unite
-
-            # Verifier si deja dans la liste de courses
-
-            existant = (
-                db.query(ArticleCourses)
-                .filter(
-                    ArticleCourses.liste_id == liste_id,
-                    ArticleCourses.ingredient_id == ingredient.id,
-                    ArticleCourses.achete == False,
-                )
-                .first()
-            )
-
-            if existant:
-                # Mettre a jour quantite
-
-                existant.quantite_necessaire = (
-                    existant.quantite_necessaire or 0
-                ) + article.a_acheter
-
-                notes_actuelles = existant.notes or ""
-
-                if "planning" not in notes_actuelles:
-                    existant.notes = f"{notes_actuelles} + planning".strip()
-
-                ids_crees.append(existant.id)
+        # 1. Ingrédients: un préchargement IN + un INSERT groupé (matching insensible à la casse)
+
+        resultat_ingredients = bulk_upsert(
+            db,
+            Ingredient,
+            [
+                {"nom": article.nom, "categorie": article.rayon, "unite": article.unite or "pcs"}
+                for article in articles
+            ],
+            cle="nom",
+            fusion=_fusionner_unite_ingredient,
+            insensible_casse=True,
+            conflit_sur=("nom",),
+        )
 
-            else:
-                # Creer nouvel article courses
+        ingredient_ids = [
+            resultat_ingredients.ids.get(normaliser_cle(article.nom, insensible_casse=True))
+            for article in articles
+        ]
 
-                item = ArticleCourses(
-                    liste_id=liste_id,
-                    ingredient_id=ingredient.id,
-                    quantite_necessaire=article.a_acheter,
-                    priorite={1: "haute", 2: "moyenne", 3: "basse"}.get(
+        # 2. Articles de courses: fusion des quantités avec les articles non achetés de la liste
+
+        resultat_articles = bulk_upsert(
+            db,
+            ArticleCourses,
+            [
+                {
+                    "liste_id": liste_id,
+                    "ingredient_id": ingredient_id,
+                    "quantite_necessaire": article.a_acheter,
+                    "priorite": {1: "haute", 2: "moyenne", 3: "basse"}.get(
                         article.priorite, "moyenne"
                     ),
-                    rayon_magasin=article.rayon,
-                    notes=(
+                    "rayon_magasin": article.rayon,
+                    "notes": (
                         "Depuis planning: "
                         + ", ".join(
                             [
@@ -766,15 +781,22 @@ class ServiceCoursesIntelligentes(BaseAIService):
                             ]
                         )
                     ),
-                    achete=False,
-                    suggere_par_ia=True,
-                )
-
-                db.add(item)
-
-                db.flush()
+                    "achete": False,
+                    "suggere_par_ia": True,
+                }
+                for article, ingredient_id in zip(articles, ingredient_ids, strict=True)
+                if ingredient_id is not None
+            ],
+            cle="ingredient_id",
+            fusion=_fusionner_article_courses,
+            filtres=(ArticleCourses.liste_id == liste_id, ArticleCourses.achete == False),
+        )
 
-                ids_crees.append(item.id)
+        ids_crees = [
+            resultat_articles.ids[ingredient_id]
+            for ingredient_id in ingredient_ids
+            if ingredient_id in resultat_articles.ids
+        ]
 
         db.commit()
 
@@ -86,8 +86,9 @@ class CoursesBudgetInteractionService:
         Returns:
             Dict avec total_mois, nb_achats, moyenne_par_achat
         """
-        from sqlalchemy import extract, func
+        from sqlalchemy import func
 
+        from src.core.db.periodes import filtre_mois
         from src.core.models import BudgetFamille
 
         mois = mois or date_type.today().month
@@ -99,8 +100,7 @@ class CoursesBudgetInteractionService:
                 func.count(BudgetFamille.id),
             )
             .filter(
-                extract("month", BudgetFamille.date) == mois,
-                extract("year", BudgetFamille.date) == annee,
+                filtre_mois(BudgetFamille.date, annee, mois),
                 BudgetFamille.categorie.in_(["alimentation", "courses"]),
             )
             .first()
@@ -0,0 +1,208 @@
+"""
+Recherche des recettes candidates d'une semaine en une seule requête.
+
+Contient les fonctions pour:
+- Classement des créneaux (jour × repas) par classe de protéine
+- Chargement de tous les candidats de la semaine en une requête (fonctions
+  de fenêtrage ``row_number() OVER (PARTITION BY classe)``: les N premiers
+  candidats de chaque classe, plus un vivier de repli)
+- Affectation des candidats aux créneaux par un optimiseur glouton à
+  pénalités (réutilisation d'une recette, même recette la veille)
+
+Une semaine de 7 jours × 3 repas coûte ainsi une requête au lieu d'une
+(voire deux) par créneau.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+CLASSE_POISSON = "poisson"
+CLASSE_VIANDE = "viande"
+CLASSE_VEGETARIEN = "vegetarien"
+CLASSE_EQUILIBRE = "equilibre"
+CLASSE_REPLI = "repli"
+
+PENALITE_REUTILISATION = 10.0
+"""Coût ajouté par proposition antérieure de la même recette dans la semaine."""
+
+PENALITE_VEILLE = 25.0
+"""Coût ajouté si la recette est proposée pour un créneau de la veille."""
+
+
+@dataclass(frozen=True)
+class Creneau:
+    """Un repas à pourvoir: jour, type de repas et contrainte de protéine."""
+
+    jour_index: int
+    type_repas: str
+    type_proteine: str
+    raison: str = ""
+
+
+def classe_proteine(type_proteine: str | None) -> str:
+    """Classe de candidats correspondant au type de protéine d'un jour.
+
+    Examples:
+        >>> classe_proteine("poisson_gras")
+        'poisson'
+        >>> classe_proteine("volaille")
+        'equilibre'
+    """
+    if type_proteine in ("poisson", "poisson_blanc", "poisson_gras"):
+        return CLASSE_POISSON
+    if type_proteine == "viande_rouge":
+        return CLASSE_VIANDE
+    if type_proteine == "vegetarien":
+        return CLASSE_VEGETARIEN
+    return CLASSE_EQUILIBRE
+
+
+def charger_candidats(
+    db: Session,
+    creneaux: Sequence[Creneau],
+    ingredients_exclus: Iterable[str] = (),
+    nb_options: int = 3,
+) -> dict[str, list[dict[str, Any]]]:
+    """Charge en une requête les candidats de toutes les classes de la semaine.
+
+    Chaque classe reçoit au plus ``nb_options × nb créneaux de la classe``
+    recettes équilibrées (assez pour des options toutes distinctes), le
+    vivier de repli autant de recettes quelconques que de créneaux × options.
+    Les recettes dont la description mentionne un ingrédient exclu sont
+    écartées de toutes les classes, repli compris.
+
+    Returns:
+        Dict classe → candidats ``{id, nom, description, temps_total,
+        type_proteines}`` dans l'ordre de préférence (id croissant)
+    """
+    from src.core.models import Recette
+
+    besoins = Counter(classe_proteine(c.type_proteine) for c in creneaux)
+    if not besoins:
+        return {}
+    besoins[CLASSE_REPLI] = len(creneaux)
+
+    type_proteines = func.coalesce(Recette.type_proteines, "")
+    equilibre = Recette.est_equilibre.is_(True)
+    conditions = {
+        CLASSE_POISSON: and_(equilibre, type_proteines.ilike("%poisson%")),
+        CLASSE_VIANDE: and_(equilibre, type_proteines.ilike("%viande%")),
+        CLASSE_VEGETARIEN: and_(equilibre, Recette.est_vegetarien.is_(True)),
+        CLASSE_EQUILIBRE: equilibre,
+        CLASSE_REPLI: literal(True),
+    }
+
+    colonnes = [
+        Recette.id,
+        Recette.nom,
+        Recette.description,
+        Recette.temps_preparation,
+        Recette.temps_cuisson,
+        Recette.type_proteines,
+    ]
+    for classe in besoins:
+        membre = case((conditions[classe], 1), else_=0)
+        colonnes.append(membre.label(f"est_{classe}"))
+        colonnes.append(
+            func.row_number().over(partition_by=membre, order_by=Recette.id).label(f"rang_{classe}")
+        )
+
+    filtres = [
+        ~func.coalesce(Recette.description, "").ilike(f"%{ingredient}%")
+        for ingredient in ingredients_exclus
+    ]
+    classees = select(*colonnes).where(*filtres).subquery()
+    requete = (
+        select(classees)
+        .where(
+            or_(
+                *(
+                    and_(
+                        classees.c[f"est_{classe}"] == 1,
+                        classees.c[f"rang_{classe}"] <= nb * nb_options,
+                    )
+                    for classe, nb in besoins.items()
+                )
+            )
+        )
+        .order_by(classees.c.id)
+    )
+
+    candidats: dict[str, list[dict[str, Any]]] = {classe: [] for classe in besoins}
+    for ligne in db.execute(requete).mappings():
+        recette = {
+            "id": ligne["id"],
+            "nom": ligne["nom"],
+            "description": ligne["description"],
+            "temps_total": (ligne["temps_preparation"] or 0) + (ligne["temps_cuisson"] or 0),
+            "type_proteines": ligne["type_proteines"],
+        }
+        for classe, nb in besoins.items():
+            if ligne[f"est_{classe}"] == 1 and ligne[f"rang_{classe}"] <= nb * nb_options:
+                candidats[classe].append(recette)
+    return candidats
+
+
+def affecter_candidats(
+    creneaux: Sequence[Creneau],
+    candidats: dict[str, list[dict[str, Any]]],
+    nb_options: int = 3,
+) -> list[list[dict[str, Any]]]:
+    """Répartit les candidats sur les créneaux (glouton à pénalités).
+
+    Pour chaque créneau, dans l'ordre, les candidats de sa classe sont notés
+    ``rang + PENALITE_REUTILISATION × propositions antérieures
+    + PENALITE_VEILLE si proposée la veille``; les ``nb_options`` moins
+    coûteux sont retenus, complétés au besoin par le vivier de repli
+    (marqués ``repli=True``).
+
+    Returns:
+        Pour chaque créneau, la liste de ses options (copies des candidats)
+    """
+    utilisations: Counter[int] = Counter()
+    par_jour: dict[int, set[int]] = {}
+    affectation: list[list[dict[str, Any]]] = []
+
+    def _cout(rang: int, recette: dict[str, Any], jour_index: int) -> float:
+        cout = rang + PENALITE_REUTILISATION * utilisations[recette["id"]]
+        if recette["id"] in par_jour.get(jour_index - 1, ()):
+            cout += PENALITE_VEILLE
+        return cout
+
+    for creneau in creneaux:
+        options: list[dict[str, Any]] = []
+        retenus: set[int] = set()
+        for classe, repli in (
+            (classe_proteine(creneau.type_proteine), False),
+            (CLASSE_REPLI, True),
+        ):
+            if len(options) >= nb_options:
+                break
+            pool = [r for r in candidats.get(classe, []) if r["id"] not in retenus]
+            pool = sorted(
+                enumerate(pool), key=lambda item: _cout(item[0], item[1], creneau.jour_index)
+            )
+            for _, recette in pool[: nb_options - len(options)]:
+                options.append({**recette, "repli": repli})
+                retenus.add(recette["id"])
+
+        for option in options:
+            utilisations[option["id"]] += 1
+        par_jour.setdefault(creneau.jour_index, set()).update(retenus)
+        affectation.append(options)
+    return affectation
+
+
+__all__ = [
+    "Creneau",
+    "affecter_candidats",
+    "charger_candidats",
+    "classe_proteine",
+]
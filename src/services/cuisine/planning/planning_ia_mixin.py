@@ -16,6 +16,7 @@ from typing import Any
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.core.ai.gabarits import SectionDynamique
 from src.core.caching import obtenir_cache
 from src.core.date_utils.helpers import obtenir_noms_jours_semaine
 from src.core.decorators import avec_gestion_erreurs, avec_session_db
@@ -23,7 +24,14 @@ from src.core.models import Planning, Repas
 from src.core.monitoring import chronometre
 from src.services.core.event_bus_mixin import emettre_evenement_simple
 
+from .candidats import Creneau, affecter_candidats, charger_candidats
 from .nutrition import determine_protein_type
+from .prompts import (
+    BUDGET_TOKENS_PLANNING,
+    GABARIT_ENRICHISSEMENT,
+    GABARIT_PLANNING,
+    PLANNING_RAPPEL,
+)
 from .types import JourPlanning, ParametresEquilibre, RecetteEnrichieIA
 
 logger = logging.getLogger(__name__)
@@ -315,7 +323,8 @@ class PlanningIAGenerationMixin:
         """Suggère des recettes équilibrées pour chaque jour.
 
         Retourne 3 options par jour avec score d'équilibre.
-        Utilise les fonctions pures de planning.utils.
+        Utilise les fonctions pures de planning.utils; les candidats de toute
+        la semaine sont chargés en une requête puis répartis (voir ``candidats``).
 
         Args:
             semaine_debut: Date de début de semaine
@@ -326,90 +335,49 @@ class PlanningIAGenerationMixin:
         Returns:
             List de dicts {jour, type_repas, suggestions: [{nom, description, raison}]}
         """
-        from src.core.models import Recette
-
         # Utiliser planning.utils pour les jours de la semaine
         jours_semaine = obtenir_noms_jours_semaine()
-        suggestions_globales = []
-
+        creneaux = []
         for idx, jour_name in enumerate(jours_semaine):
-            jour_lower = jour_name.lower()
-            date_jour = semaine_debut + timedelta(days=idx)
-
             # Utiliser planning.utils pour déterminer le type de protéine
             type_proteine, raison_jour = determine_protein_type(
-                jour_lower,
+                jour_name.lower(),
                 poisson_jours=parametres.poisson_jours,
                 viande_rouge_jours=parametres.viande_rouge_jours,
                 vegetarien_jours=parametres.vegetarien_jours,
                 poisson_blanc_jours=parametres.poisson_blanc_jours,
                 poisson_gras_jours=parametres.poisson_gras_jours,
             )
+            creneaux.append(Creneau(idx, type_repas, type_proteine, raison_jour))
 
-            # Requête base pour récupérer 3 recettes de ce type
-            query = db.query(Recette).filter(Recette.est_equilibre)
-
-            # Filtrer par type de protéine (poisson_blanc et poisson_gras → filtre sur "poisson")
-            if type_proteine in ("poisson", "poisson_blanc", "poisson_gras"):
-                query = query.filter(Recette.type_proteines.ilike("%poisson%"))
-            elif type_proteine == "viande_rouge":
-                query = query.filter(Recette.type_proteines.ilike("%viande%"))
-            elif type_proteine == "vegetarien":
-                query = query.filter(Recette.est_vegetarien)
-
-            # Exclure les ingrédients interdits
-            for ingredient_exc in parametres.ingredients_exclus:
-                # Filtre basique (devrait utiliser une vraie relation en prod)
-                query = query.filter(~Recette.description.ilike(f"%{ingredient_exc}%"))
-
-            # Récupérer 3 suggestions
-            recettes = query.limit(3).all()
-
-            suggestions_jour = []
-            for recette in recettes:
-                suggestions_jour.append(
-                    {
-                        "id": recette.id,
-                        "nom": recette.nom,
-                        "description": recette.description,
-                        "temps_total": (recette.temps_preparation or 0)
-                        + (recette.temps_cuisson or 0),
-                        "type_repas": type_repas,
-                        "raison": raison_jour,
-                        "type_proteines": recette.type_proteines,
-                    }
-                )
-
-            # Si pas assez, ajouter des recettes équilibrées quelconques
-            if len(suggestions_jour) < 3:
-                autres = (
-                    db.query(Recette)
-                    .filter(Recette.id.notin_([s["id"] for s in suggestions_jour]))
-                    .limit(3 - len(suggestions_jour))
-                    .all()
-                )
-
-                for recette in autres:
-                    suggestions_jour.append(
-                        {
-                            "id": recette.id,
-                            "nom": recette.nom,
-                            "description": recette.description,
-                            "temps_total": (recette.temps_preparation or 0)
-                            + (recette.temps_cuisson or 0),
-                            "type_repas": type_repas,
-                            "raison": "📝 Alternative équilibrée",
-                            "type_proteines": getattr(recette, "type_proteines", "mixte"),
-                        }
-                    )
+        # Tous les candidats de la semaine en une requête, puis répartition
+        # en mémoire (les mêmes recettes ne sont pas proposées tous les jours)
+        candidats = charger_candidats(db, creneaux, parametres.ingredients_exclus)
+        affectation = affecter_candidats(creneaux, candidats)
 
+        suggestions_globales = []
+        for creneau, options in zip(creneaux, affectation, strict=True):
+            date_jour = semaine_debut + timedelta(days=creneau.jour_index)
             suggestions_globales.append(
                 {
-                    "jour": jour_name,
-                    "jour_index": idx,
+                    "jour": jours_semaine[creneau.jour_index],
+                    "jour_index": creneau.jour_index,
                     "date": date_jour.isoformat(),
-                    "raison_jour": raison_jour,
-                    "suggestions": suggestions_jour[:3],
+                    "raison_jour": creneau.raison,
+                    "suggestions": [
+                        {
+                            "id": option["id"],
+                            "nom": option["nom"],
+                            "description": option["description"],
+                            "temps_total": option["temps_total"],
+                            "type_repas": type_repas,
+                            "raison": (
+                                "📝 Alternative équilibrée" if option["repli"] else creneau.raison
+                            ),
+                            "type_proteines": option["type_proteines"] or "mixte",
+                        }
+                        for option in options
+                    ],
                 }
             )
 
@@ -551,67 +519,20 @@ class PlanningIAGenerationMixin:
         poisson_gras_ligne = (
             f"- POISSON GRAS : exactement {nb_poisson_gras} repas AU TOTAL (saumon, maquereau, sardines, hareng, truite saumonée — comptent ensemble) — oméga-3 essentiels OMS"
             if nb_poisson_gras > 0
-            else ""
+            else "- Pas de poisson gras cette semaine"
         )
-        poisson_lines = "\n".join(filter(None, [poisson_blanc_ligne, poisson_gras_ligne]))
         vegetarien_ligne = (
             f"- Minimum {nb_vegetarien} repas VÉGÉTARIEN ou à base de LÉGUMES SECS cette semaine (lentilles, pois chiches, haricots rouges/blancs, fèves, œufs, tofu) — PNNS : légumineuses au moins 2x/semaine"
             if nb_vegetarien > 0
             else ""
         )
-        oms_section = f"""
-ÉQUILIBRE NUTRITIONNEL HEBDOMADAIRE (recommandations PNNS/OMS — OBLIGATOIRE) :
-
-🐟 POISSONS :
-{poisson_lines}
-
-🥩 VIANDE TOTALE (bœuf + veau + agneau + porc + abats) ≤ 500 g/semaine soit 3–4 repas MAX :
-- VIANDE ROUGE : maximum {viande_rouge_max} repas/semaine. Alterner entre :
-  • Bœuf : steak, bourguignon, bœuf stroganoff, hachis, daube, joue braisée, rosbif
-  • Veau : escalope, blanquette, osso buco, rôti, piccata
-  • Agneau : côtelettes grillées, gigot, souris braisée, épaule confite, navarin, curry d'agneau
-- PORC : 1 repas/semaine (côtelette, rôti, filet mignon, sauté, travers, échine, porc au caramel)
-  → Total viande rouge + porc = max {viande_rouge_max + 1} repas/semaine (cap PNNS 500 g)
-
-🥺 CHARCUTERIE ≤ 150 g/semaine (max 3 tranches de jambon) :
-- Jambon blanc, lardons, saucisse, saucisson comptent dans ce quota
-- Si jambon ou lardons sont utilisés en proteine_accompagnement, c'est 1 usage charcuterie
-- Ne PAS utiliser de la charcuterie à plus de 2 repas dans la semaine (accompagnement inclus)
-
-🌿 VÉGÉTARIEN & LÉGUMES SECS (PNNS : légumineuses au moins 2x/semaine) :
-{vegetarien_ligne}
-- Les légumes secs comptent : lentilles, pois chiches, haricots rouges/blancs, fèves
-- Peuvent être un plat principal (dal, salade de lentilles) OU un accompagnement (pois chiches en salade)
-
-🐔 VOLAILLE — pour les jours restants, VARIER les espèces et modes de cuisson :
-  • Poulet (3-4x max) : rôti entier, cuisse, escalope grillée, curry, wok, basquaise, sauté, pané maison
-  • Dinde (1-2x) : escalope poêlée, rôti, émincé sauce moutarde, sauté aux légumes, pané
-  • Canard (0-1x) : magret grillé, aiguillettes sautées, cuisse confite (plutôt automne/hiver), parmentier de canard
-  • Pintade ou autre volaille (0-1x) : rôtie, en cocotte, braisée, lapin en moutarde/chasseur
-  RÈGLE : ne JAMAIS avoir plus de 2 repas poulet consécutifs — alterner avec dinde/canard/pintade
-
-🍞 FÉCULENTS COMPLETS (PNNS : au moins 1 féculent complet par jour) :
-- Privilégier les versions complètes : riz complet, pâtes complètes, pain complet, semoule complète
-- Au moins 1 féculent complet/jour dans les champs feculents (pas obligatoirement TOUS en complet)
-- Huiles : privilégier huile d'olive, colza, noix (PNNS : ALLER VERS ces matières grasses de qualité)
-
-🍳 FAIT MAISON (PNNS : privilégier le fait maison avec produits frais/conserve/surgelé peu transformés) :
-- Tous les plats proposés doivent être CUISINABLES MAISON avec des ingrédients frais
-- JAMAIS de plats industriels : pas de pizza surgelée, pas de lasagnes du commerce, pas de nuggets industriels
-- Si pizza/nuggets/cordons bleus : toujours MAISON (pizza maison, nuggets maison, cordon bleu maison)
-- Les conserves et surgelés peu transformés sont OK : légumes surgelés, conserves de tomates, pois chiches en boîte
-
-🍽 PLAISIR/PRATIQUE : maximum 1 repas par semaine (cordon bleu maison, nuggets maison, croque-monsieur, quiche maison, pizza maison)
-
-🔁 ALTERNANCE : ne jamais mettre 2 fois le même ingrédient principal à 2 repas consécutifs (déjeuner ou dîner)
-- Varier les féculents : alterner pâtes, riz, pommes de terre, semoule, légumineuses
-- Alterner dans la semaine : viande, volaille, poisson, œufs, légumes secs (PNNS)
-
-⚠️ RÉDUIRE (PNNS) :
-- Limiter sel et sucre ajouté dans les préparations
-- Limiter la charcuterie (déjà capée à 150 g ci-dessus)
-- Pas de boissons sucrées (sodas, jus industriels) — eau ou infusions uniquement
-- Éviter les produits ultra-transformés (NOVA 4) : plats préparés industriels, sauces toutes faites, céréales très sucrées"""
+        viande_rouge_ligne = (
+            f"- VIANDE ROUGE : maximum {viande_rouge_max} repas/semaine — total viande rouge + porc = max {viande_rouge_max + 1} repas/semaine (cap PNNS 500 g)"
+        )
+        # Seuls les quotas chiffrés varient: le guide PNNS/OMS est dans le préfixe statique
+        quotas_section = "QUOTAS PROTÉINES DE LA SEMAINE (OBLIGATOIRE) :\n" + "\n".join(
+            filter(None, [poisson_blanc_ligne, poisson_gras_ligne, viande_rouge_ligne, vegetarien_ligne])
+        )
 
         # Section robots cuisine disponibles
         robots_section = (
@@ -708,102 +629,28 @@ JULES ({jules_age_mois} mois — mange les mêmes plats adaptés) :
             else ""
         )
 
-        prompt = f"""GENERATE A 7-DAY MEAL PLAN (MONDAY-SUNDAY) IN JSON FORMAT ONLY.
-
-CONTEXT:
-{context}{saison_section}{saison_produits_section}{oms_section}{jules_section}{allergies_section}{robots_section}{favoris_section}{legumes_section}{feculents_section}{plats_section}{cuisines_section}{restes_section}{recettes_section}
-
-OUTPUT ONLY THIS JSON STRUCTURE (no other text, no markdown, no code blocks):
-{{"items": [
-  {{
-    "jour": "Lundi",
-    "petit_dejeuner": "Tartines beurre confiture",
-    "petit_dejeuner_est_recette": false,
-    "dejeuner": "Pâtes carbonara",
-    "dejeuner_entree": "Salade verte",
-    "dejeuner_entree_est_recette": false,
-    "dejeuner_laitage": "Yaourt nature",
-    "dejeuner_legumes": "Haricots verts vapeur",
-    "dejeuner_feculents": "Pâtes",
-    "dejeuner_dessert": "Tarte aux pommes",
-    "dejeuner_dessert_est_recette": true,
-    "dejeuner_proteine_accompagnement": null,
-    "dejeuner_est_reste": false,
-    "dejeuner_reste_source": null,
-    "gouter": "Pain au chocolat",
-    "gouter_est_recette": false,
-    "gouter_laitage": "Yaourt nature",
-    "gouter_fruit": "Pomme",
-    "gouter_gateau": "Cake maison",
-    "diner": "Filet de colin sauce citronnée",
-    "diner_entree": null,
-    "diner_entree_est_recette": false,
-    "diner_laitage": "Fromage",
-    "diner_legumes": "Courgettes sautées",
-    "diner_feculents": "Riz vapeur",
-    "diner_dessert": null,
-    "diner_dessert_est_recette": false,
-    "diner_proteine_accompagnement": null,
-    "diner_est_reste": false,
-    "diner_reste_source": null,
-    "dejeuner_plat_jules": "couper petit",
-    "diner_plat_jules": null
-  }}
-]}}
-
-RULES:
-1. Return ONLY valid JSON with exactly 7 items (one per day: Lundi→Dimanche)
-2. dejeuner and diner (le PLAT principal): ONLY the main dish/recipe name — NEVER include sides, accompaniments, or ingredients in this field. Correct: "Poulet curry", "Filet de saumon", "Gratin dauphinois". FORBIDDEN: "Poulet curry, riz basmati, carottes vapeur" or "Saumon avec haricots verts". Sides go ONLY in legumes/feculents fields. Max 40 chars, no parentheses.
-3. petit_dejeuner: TOUJOURS un petit-déjeuner français classique SAIN. PRIVILÉGIER : tartines pain complet/céréales, porridge flocons avoine, muesli non sucré, yaourt nature + fruit frais, pain complet beurre confiture. LIMITER (PNNS) : céréales sucrées du commerce (Chocapic, Frosties, etc.), viennoiseries (max 2x/semaine le week-end). En semaine: texte court simple (tartines pain complet, porridge, muesli fruit, yaourt fruit). Le week-end: peut être est_recette=true pour des préparations MAISON (crêpes, gaufres, pain perdu, pancakes, granola maison). ABSOLUMENT INTERDIT: omelette, œufs brouillés, œufs sur le plat, quiche, tout plat salé cuisiné.
-4. entree/dessert: optional — include only if the meal complexity warrants it; est_recette=true only if real preparation steps needed. DESSERTS (PNNS) : PRIVILÉGIER le fait maison et les fruits (compote maison, tarte aux fruits, cl afoutis, mousse chocolat maison, salade de fruits). LIMITER : crèmes dessert industrielles, glaces, gâteaux du commerce. Ne PAS mettre un dessert sucré à chaque repas — alterner fruit, yaourt, et dessert élaboré.
-5. laitage: text only (yaourt, fromage blanc, fromage, petits-suisses...) — never est_recette
-6. gouter: MANDATORY — always a non-null short text representing the cereal product. PRIVILÉGIER FAIT MAISON (PNNS) : pain complet, cake maison, galette avoine maison, biscuits maison, pain d'épices maison, crêpes maison, muffins maison. LIMITER : biscuits industriels, gâteaux du commerce, barres chocolatées. gouter_laitage MANDATORY (yaourt nature, fromage frais, fromage blanc — éviter crèmes dessert sucrées). gouter_fruit MANDATORY — whole fruit (pomme, poire, banane, raisin, clémentine...) OR compote maison — NEVER a juice. gouter_gateau MANDATORY — same as gouter: a HEALTHY cereal product fait maison de préférence. gouter and gouter_gateau should match. Inclure régulièrement des fruits à coque non salés (noix, amandes, noisettes) dans le goûter (PNNS : aliments délaissés à réintroduire). CRITICAL VARIETY RULE: NEVER repeat the same gouter, gouter_gateau, gouter_fruit, or gouter_laitage on 2 consecutive days. ALL 7 goûters MUST be different: different cereal product each day (e.g. Lundi=cake maison, Mardi=galette avoine maison, Mercredi=crêpes maison, Jeudi=biscuits maison, Vendredi=pain complet beurre, Samedi=muffins maison, Dimanche=pain d'épices maison), different fruit each day (pomme/poire/banane/raisin/clémentine/orange/fraises...), vary laitage too (yaourt nature/fromage blanc/fromage frais/petits-suisses). Repeating the same goûter item twice in the same week is FORBIDDEN.
-7. PROTEINS — strictly follow the PNNS balance section above. Weekly protein budget: {nb_poisson_blanc}x white fish, {nb_poisson_gras}x fatty fish, max {viande_rouge_max}x red meat + 1x pork (total meat ≤ {viande_rouge_max + 1} meals = PNNS 500g cap), min {nb_vegetarien}x vegetarian/legumes secs (PNNS: légumineuses ≥ 2x/week), max 1x comfort meal, remaining days=POULTRY (poulet 3-4x, dinde 1-2x, canard 0-1x, pintade/lapin 0-1x). Charcuterie (jambon, lardons, saucisse) max 2 usages/week across all fields (PNNS 150g cap). NEVER more than 2 consecutive chicken meals. Prefer féculents complets at least once/day. Alternate viande/volaille/poisson/œufs/légumes secs throughout the week.
-8. 4-PORTIONS STRATEGY (MANDATORY MINIMUM: 3 LUNCHES MUST BE LEFTOVERS) — for sauces/gratins/soups/stews/lasagnes/risottos/currys/woks/poêlées/cocottes/tajines/mijotés/rôtis/boulettes: set dejeuner_est_reste=true the NEXT DAY with dejeuner_reste_source="dîner de [JOUR]", AND copy the EXACT NAME of the previous day's diner field into dejeuner — verbatim, no variation (WRONG example: Monday diner='Saumon en papillote' → Tuesday dejeuner='Gratin de courgettes'; CORRECT: Tuesday dejeuner='Saumon en papillote'). MANDATORY: at least 3 of the 6 lunches (Mardi→Dimanche) MUST be leftovers — NOT optional. Plan your dinners intentionally: choose at least 3-4 dinner dishes that ARE reheatable. CRITICAL: dejeuner_reste_source MUST reference the IMMEDIATELY PREVIOUS day — never a future day, never the same day. Example: Mardi's lunch can only reference "dîner de Lundi", NEVER "dîner de Mercredi" or later. Mercredi's lunch → "dîner de Mardi". IMPORTANT: A reste of a viande rouge dish still counts as 1 viande rouge occurrence in your max {viande_rouge_max} total — plan accordingly. ABSOLUTE RULES FOR RESTES: (a) NEVER set est_reste=true without a non-null reste_source — if you cannot name a real previous meal as the source, set est_reste=false; (b) diner_est_reste MUST ALWAYS be false — dinners are ALWAYS fresh preparations, NEVER leftovers. This field is permanently banned from ever being true in this app; (c) NEVER set any est_reste=true on Dimanche diner (last meal of the week — no identifiable source). RISOTTO STAYS RULE: for RESTES of dishes like risotto, quiche, gratin — feculents=null (the dish already contains its own starch — adding "Riz vapeur" or similar is FORBIDDEN). COMPLEMENTS MANDATORY FOR RESTES: even when dejeuner_est_reste=true, ALWAYS fill dejeuner_laitage (yaourt, fromage blanc, fromage...) AND dejeuner_dessert (fruit, compote, dessert maison...) — the dish is reheated but the meal is still completed with a dairy and a fruit/dessert, exactly like any other lunch. NEVER leave dejeuner_laitage=null or dejeuner_dessert=null on a reste.
-9. null is valid ONLY for entree, laitage, dessert, reste_source, proteine_accompagnement. For RESTES (dejeuner_est_reste=true or diner_est_reste=true): copy legumes, feculents AND proteine_accompagnement from the original dish — do NOT return null for legumes/feculents. Example: if the source was 'Bœuf bourguignon' with legumes='Poêlée de légumes' and feculents='Pâtes', the reste must also have legumes='Poêlée de légumes' and feculents='Pâtes'. For all other meals (non-restes): legumes and feculents are MANDATORY (never null) — fill them with what is in the dish — EXCEPT when the dish ALREADY CONTAINS vegetables or starches in its name or composition. CRITICAL: if the dish name contains "légumes", "aux légumes", "de légumes", "légumes de saison", or any specific vegetable name → legumes=null (the dish already provides vegetables, adding more is redundant). EXAMPLES where legumes=null: 'Poulet curry coco légumes' → legumes=null (dish already has vegetables). 'Poêlée de tofu légumes croquants' → legumes=null. 'Bœuf bourguignon' → legumes=null (carrots, mushrooms, onions are IN the dish). 'Pot-au-feu' → legumes=null (full of vegetables). 'Ratatouille' → legumes=null (dish IS vegetables). EXAMPLES where legumes is filled: 'Poulet rôti' → legumes='Haricots verts vapeur' (plain roasted chicken needs a vegetable side). 'Saumon grillé' → legumes='Épinards sautés' (plain fish needs a side). 'Steak de bœuf grillé' → legumes='Salade verte' (plain meat needs a side). VEGETABLE DUPLICATION EXCEPTION: If a SPECIFIC vegetable is in the dish name, NEVER repeat it in legumes. 'Risotto aux asperges' → legumes MUST NOT be 'Asperges vapeur'. 'Poulet aux courgettes' → legumes MUST NOT be 'Courgettes sautées'. 'Dinde aux champignons' → legumes MUST NOT be 'Champignons sautés'. General rule: a dish that already has vegetables in its name or composition does NOT need additional vegetable sides — set legumes=null.
-10. No explanations, no text, ONLY JSON
-11. MANDATORY — PLATS À INCLURE: every dish listed in the "PLATS À INCLURE" section MUST appear at least once as dejeuner or diner. Do NOT ignore them.
-12. PNNS4 ASSIETTE ÉQUILIBRÉE — for every dejeuner and diner that is NOT a reste AND NOT a dish-as-starch (see Rule 17), the meal MUST include BOTH:
-    a) legumes field: ≥ half the plate (haricots verts, courgettes sautées, brocoli vapeur, carottes, épinards, poêlée de légumes...) — NEVER null. PNNS: 5 fruits et légumes/jour = au moins 3 portions de légumes/jour (midi + soir + entrée/gouter).
-    b) feculents field: ~1/4 of the plate (riz, pâtes, pommes de terre, semoule, quinoa...) — NEVER null. Prefer COMPLET versions at least once per day (riz complet, pâtes complètes, pain complet).
-    EXCEPTION: for dishes that ARE their own starch (see Rule 17), set feculents=null and legumes=side vegetable. NEVER leave legumes null except when the vegetable is literally in the dish name (see Rule 9).
-13. NO DISH REPETITION — Never plan the exact same main dish (dejeuner or diner) more than once across the 7 days. This includes CONCEPTUALLY IDENTICAL dishes with slightly different names: 'Rôti de poulet aux herbes' and 'Poulet rôti aux légumes' are BOTH roasted chicken — only ONE per week. 'Filet de saumon grillé' and 'Pavé de saumon' are BOTH salmon — only ONE per week. Rule: same protein + same cooking method = forbidden repetition. Vary BOTH the protein source AND the cooking technique throughout the week.
-14. PROTEIN MANDATORY — every dejeuner and diner MUST contain a protein source. If the main dish has NO visible protein in its name, you MUST fill proteine_accompagnement. MANDATORY EXAMPLES: 'Gratin dauphinois' → proteine_accompagnement='Jambon blanc' (NEVER null); 'Tarte aux poireaux' → 'Lardons' or 'Saumon poché'; 'Risotto aux légumes' → 'Crevettes sautées' or 'Blanc de poulet'; 'Ratatouille' → 'Blanc de poulet grillé'; 'Soupe de légumes' → 'Pain complet fromage' or 'Œuf dur'; 'Poêlée de légumes' → 'Blanc de dinde'. Rule: a dish with no animal or legume protein keyword in its name ALWAYS needs proteine_accompagnement. For restes, copy proteine_accompagnement from the source dish. Never plan a meal with zero protein across all fields.
-15. ABSOLUTE FORBIDDEN INGREDIENTS — Ingredients listed in "INGRÉDIENTS INTERDITS" are STRICTLY BANNED in EVERY field without ANY exception: dejeuner, diner, entree, legumes, feculents, dessert, petit_dejeuner, laitage, gouter_fruit, gouter_gateau, proteine_accompagnement, and ALL other fields. The ban EXTENDS to all preparations containing that ingredient (if 'concombre' is forbidden → 'concombre à la crème', 'salade de concombre', 'tzatziki' are ALL forbidden — same for champignons, marrons, etc.). There is NO exception. This is the most critical rule.
-16. ENTREE NEVER DUPLICATES LEGUMES — dejeuner_entree and dejeuner_legumes (and their diner_ equivalents) MUST contain different dishes or vegetables. If entree is 'Salade de carottes', legumes MUST be a different vegetable ('Haricots verts', 'Brocoli vapeur'...). Having the same or equivalent value in both fields is FORBIDDEN.
-17. DISH-AS-STARCH: feculents=null WHEN THE DISH IS ITS OWN STARCH — Never list as féculent an ingredient that is the structural base of the dish itself. Set feculents=null in these cases:
-    - 'Quiche lorraine' / 'Quiche aux poireaux': feculents=null (pâte brisée IS the dish — FORBIDDEN: feculents='Pâte brisée')
-    - 'Tarte salée': feculents=null (same reason)
-    - 'Gratin dauphinois': feculents=null (pommes de terre ARE the dish — FORBIDDEN: feculents='Pommes de terre')
-    - 'Tartiflette' / 'Hachis parmentier': feculents=null (pommes de terre = dish base)
-    - 'Risotto': feculents=null (riz IS the risotto — FORBIDDEN: feculents='Riz' or feculents='Quinoa')
-    - This applies to ALL risotto variants: 'Risotto aux asperges', 'Risotto aux champignons', 'Risotto aux fruits de mer' — ALL → feculents=null regardless of the accompanying vegetable or ingredient
-    - 'Lasagnes': feculents=null (pasta IS the structure)
-    - 'Lentilles à la tomate' / 'Dal' / 'Pois chiches' / 'Salade de lentilles' / 'Soupe de lentilles' / 'Lentilles vinaigrette': feculents=null (toutes les préparations à base de légumineuses = féculent+protéine combinés — JAMAIS ajouter riz ou autre féculent en accompagnement)
-    In ALL these cases: legumes MUST be filled with a vegetable side (e.g. 'Salade verte', 'Haricots verts', 'Épinards') — NEVER another cold salad alongside a lentil salad (e.g. 'Carottes râpées' with 'Salade de lentilles' = FORBIDDEN, both are cold salads — use a COOKED vegetable instead: 'Haricots verts', 'Brocoli vapeur', 'Courgettes sautées').
-    PROTEIN CHECK: quiche, tarte salée, gratin, risotto, lasagnes have no obvious standalone protein → ALWAYS fill proteine_accompagnement (see Rule 14 examples).
-18. VEGETABLE & STARCH COHERENCE — legumes AND feculents MUST make culinary sense with the main dish. Think like a real chef:
-    LÉGUMES :
-    - Poulet rôti → haricots verts, petits pois, carottes glacées, haricots plats, ratatouille
-    - Poisson grillé (cabillaud, lieu noir, sole) → haricots verts, courgettes, épinards vapeur, fenouil braisé
-    - Bœuf bourguignon, daube → carottes, champignons, navets (partie du plat — legumes='Légumes du plat' ou 'Salade verte')
-    - Pot-au-feu → carottes, navets, poireaux (IN the dish — legumes='Légumes du bouillon' ou 'Salade verte en entrée')
-    - Pâtes (bolognaise, carbonara, pesto) → salade verte, courgettes sautées — NEVER heavy steamed vegetable with rich pasta sauce
-    - Plats méditerranéens (ratatouille, poulet basquaise, moussaka) → salade verte, tomates — AVOID Northern vegetables (choux de Bruxelles, endives)
-    - FORBIDDEN: 'Épinards' avec 'Poulet basquaise'; 'Choux de Bruxelles' avec 'Sole meunière'; 'Carottes vapeur' avec 'Moules marinières'
-    FÉCULENTS :
-    - Plats asiatiques (wok, curry, poulet thaï, porc au caramel) → riz basmati, riz thaï, nouilles sautées — JAMAIS semoule/pommes de terre
-    - Plats méditerranéens/maghrébins (tajine, couscous, kefta) → semoule, boulgour — JAMAIS riz basmati
-    - Plats français classiques (poulet rôti, bœuf bourguignon, blanquette) → pommes de terre vapeur, purée, pâtes — cohérent
-    - Plats italiens (osso buco, saltimbocca, piccata) → risotto, polenta, pâtes fraîches — JAMAIS semoule
-    - Plats indiens (curry, korma, dal) → riz basmati, naan — JAMAIS pommes de terre vapeur
-    - Poisson grillé/vapeur → riz vapeur, pommes de terre vapeur, écrasé de pommes de terre — JAMAIS pâtes
-    - Plats mexicains (fajitas, chili) → riz, tortillas — JAMAIS semoule/boulgour
-    - Si le plat EST son propre féculent (risotto, quiche, lasagnes, tartiflette, hachis parmentier, gnocchi) → feculents=null ou 'Salade verte'
-    - If the requested lists (LÉGUMES/FÉCULENTS À INCLURE) conflict with the dish, match them to the MOST coherent dish available that week.
-19. CREATIVITY & VARIETY — Each generation MUST be unique and surprising. Do NOT fall back on the same "safe" dishes every time (avoid always choosing poulet rôti, pâtes bolognaise, saumon grillé as defaults). Explore the full spectrum: cuisines du monde (asiatique, méditerranéenne, mexicaine, indienne, libanaise...), techniques variées (mijoté, grillé, wok, four, vapeur), et des plats moins classiques. Sois CRÉATIF et propose des combinaisons inattendues tout en restant familial."""
-
-        logger.info(f"🤖 Generating AI weekly plan starting {semaine_debut}")
+        # Consignes statiques en préfixe (gabarit compilé), données de la semaine ensuite;
+        # les listes de préférence les moins critiques sont tronquées hors budget
+        contexte_section = (
+            f"CONTEXT:\n{context}{saison_section}{saison_produits_section}\n\n{quotas_section}"
+            f"{jules_section}{allergies_section}{legumes_section}{feculents_section}"
+            f"{plats_section}{cuisines_section}{restes_section}"
+        )
+        rendu = GABARIT_PLANNING.rendre(
+            [
+                SectionDynamique("contexte", contexte_section),
+                SectionDynamique("recettes_favorites", recettes_section, priorite=1, par_lignes=True),
+                SectionDynamique("aliments_favoris", favoris_section, priorite=2, par_lignes=True),
+                SectionDynamique("robots", robots_section, priorite=3, par_lignes=True),
+                SectionDynamique("rappel", PLANNING_RAPPEL),
+            ],
+            budget_tokens=BUDGET_TOKENS_PLANNING,
+        )
+        prompt = rendu.texte
+        logger.info(
+            f"🤖 Generating AI weekly plan starting {semaine_debut} "
+            f"(~{rendu.tokens_estimes} tokens, préfixe {rendu.empreinte_prefixe})"
+        )
 
         # Appel IA avec auto rate limiting & parsing
         # use_cache=False : chaque génération doit produire un planning UNIQUE (pas de réponse recyclée)
@@ -1208,32 +1055,24 @@ RULES:
             planning_id: ID du planning dont les recettes stubs sont à enrichir.
         """
         try:
-            from src.core.db import obtenir_contexte_db
-            from src.core.models import EtapeRecette, Ingredient, RecetteIngredient, Repas
-            from src.core.models.recettes import Recette
+            from sqlalchemy import select, union
 
+            from src.core.db import obtenir_contexte_db
+            from src.core.models import Repas
+
+            # Recettes du planning (plat, entrée, dessert) sans étape: une requête
+            recettes_planning = union(
+                *(
+                    select(colonne).where(Repas.planning_id == planning_id)
+                    for colonne in (
+                        Repas.recette_id,
+                        Repas.entree_recette_id,
+                        Repas.dessert_recette_id,
+                    )
+                )
+            )
             with obtenir_contexte_db() as session:
-                # Collecter tous les recette_id liés au planning
-                repas_list = session.query(Repas).filter(Repas.planning_id == planning_id).all()
-                recette_ids: set[int] = set()
-                for r in repas_list:
-                    for rid in (r.recette_id, r.entree_recette_id, r.dessert_recette_id):
-                        if rid is not None:
-                            recette_ids.add(rid)
-
-                if not recette_ids:
-                    return
-
-                # Filtrer celles sans étapes (stubs) — stocker (id, nom) pour éviter les objets détachés
-                stubs_data: list[tuple[int, str]] = []
-                for recette in session.query(Recette).filter(Recette.id.in_(recette_ids)).all():
-                    has_etapes = (
-                        session.query(EtapeRecette)
-                        .filter(EtapeRecette.recette_id == recette.id)
-                        .first()
-                    ) is not None
-                    if not has_etapes:
-                        stubs_data.append((recette.id, recette.nom))
+                stubs_data = self._stubs_sans_etapes(session, recettes_planning)
 
             if not stubs_data:
                 logger.debug("[planning] Aucune recette stub à enrichir pour planning %d", planning_id)
@@ -1253,6 +1092,25 @@ RULES:
     # HELPERS SHARED: appel IA + sauvegarde + enrichissement global
     # ═══════════════════════════════════════════════════════════
 
+    @staticmethod
+    def _stubs_sans_etapes(session: Session, recette_ids: Any = None) -> list[tuple[int, str]]:
+        """``(id, nom)`` des recettes sans aucune étape, en une requête.
+
+        Args:
+            recette_ids: Ids (liste ou sous-requête) à considérer; ``None`` = toutes.
+        """
+        from sqlalchemy import exists
+
+        from src.core.models import EtapeRecette
+        from src.core.models.recettes import Recette
+
+        query = session.query(Recette.id, Recette.nom).filter(
+            ~exists().where(EtapeRecette.recette_id == Recette.id)
+        )
+        if recette_ids is not None:
+            query = query.filter(Recette.id.in_(recette_ids))
+        return [(rid, nom) for rid, nom in query.order_by(Recette.id)]
+
     def _enrichir_stubs_data(self, stubs_data: list[tuple[int, str]], context: str = "") -> int:
         """Appel IA + sauvegarde étapes/ingrédients pour une liste de stubs ``(id, nom)``.
 
@@ -1299,31 +1157,9 @@ RULES:
 
         noms = [nom for _, nom in stubs_data]
         liste_noms = "\n".join(f"{i + 1}. {nom}" for i, nom in enumerate(noms))
-        prompt = f"""For each recipe listed below, generate practical cooking steps and main ingredients.
-
-OUTPUT ONLY THIS JSON (no other text, no markdown, no code blocks):
-{{"items": [
-  {{
-    "nom": "Pâtes carbonara",
-    "temps_preparation": 10,
-    "temps_cuisson": 15,
-    "portions": 4,
-    "difficulte": "facile",
-    "ingredients": [{{"nom": "spaghetti", "quantite": 400, "unite": "g"}}, {{"nom": "lardons", "quantite": 200, "unite": "g"}}, {{"nom": "oeufs", "quantite": 3, "unite": "pièce"}}],
-    "etapes": ["Faire bouillir l'eau salée et cuire les spaghetti al dente.", "Faire revenir les lardons à sec dans une poêle.", "Mélanger les oeufs battus avec le parmesan.", "Égoutter les pâtes, hors du feu mélanger avec les lardons puis la sauce oeufs-parmesan."]
-  }}
-]}}
-
-RULES:
-1. Return ONLY valid JSON — no text before or after
-2. One item per recipe, in the SAME ORDER as the input list
-3. etapes: array of French strings, 3-8 steps each, describing the actual cooking process
-4. ingredients: array of {{nom, quantite, unite}}, 3-12 items
-5. Keep nom identical to the input recipe name
-6. No explanations, ONLY JSON
-
-Recipes to enrich:
-{liste_noms}"""
+        prompt = GABARIT_ENRICHISSEMENT.rendre(
+            [SectionDynamique("recettes", f"Recipes to enrich:\n{liste_noms}")]
+        ).texte
 
         enriched = self.call_with_list_parsing_sync(
             prompt=prompt,
@@ -1435,22 +1271,9 @@ Recipes to enrich:
         """
         try:
             from src.core.db import obtenir_contexte_db
-            from src.core.models import EtapeRecette
-            from src.core.models.recettes import Recette
 
             with obtenir_contexte_db() as session:
-                query = session.query(Recette)
-                if recette_ids:
-                    query = query.filter(Recette.id.in_(recette_ids))
-                stubs_data: list[tuple[int, str]] = []
-                for recette in query.all():
-                    has_etapes = (
-                        session.query(EtapeRecette)
-                        .filter(EtapeRecette.recette_id == recette.id)
-                        .first()
-                    ) is not None
-                    if not has_etapes:
-                        stubs_data.append((recette.id, recette.nom))
+                stubs_data = self._stubs_sans_etapes(session, recette_ids or None)
 
             if not stubs_data:
                 logger.info("[planning] Aucune recette stub à enrichir (global)")
@@ -1 +1 @@
-"""Service de prediction de peremption personnalisee (IA7)."""from __future__ import annotationsfrom collections import defaultdictfrom datetime import date, timedeltafrom typing import Anyfrom sqlalchemy.orm import Sessionfrom src.core.decorators import avec_gestion_erreurs, avec_session_dbfrom src.services.core.registry import service_factory_FACTEURS_CONSERVATION = {    "congel": 1.8,    "frigo": 1.0,    "placard": 1.25,    "cave": 1.4,}class ServicePredictionPeremption:    """Predictions basees sur duree de vie observee + facteur conservation."""    def _facteur_conservation(self, emplacement: str | None) -> float:        em = (emplacement or "").lower()        for key, facteur in _FACTEURS_CONSERVATION.items():            if key in em:                return facteur        return 1.0    @avec_gestion_erreurs(default_return={})    @avec_session_db    def calculer_durees_vie_moyennes(self, *, db: Session | None = None) -> dict[str, float]:        """Estime une duree de vie moyenne (jours) par categorie depuis l'historique inventaire."""        if db is None:            return {}        from src.core.models.inventaire import ArticleInventaire, HistoriqueInventaire        historiques = (            db.query(HistoriqueInventaire)            .order_by(                HistoriqueInventaire.article_id.asc(), HistoriqueInventaire.date_modification.asc()            )            .all()        )        dates_ajout: dict[int, date] = {}        durees_par_categorie: dict[str, list[int]] = defaultdict(list)        # Mapper article -> categorie ingredient        articles = db.query(ArticleInventaire).all()        categorie_par_article: dict[int, str] = {}        for article in articles:            categorie_par_article[article.id] = (article.categorie or "autre").lower()        for h in historiques:            article_id = int(h.article_id)            type_modif = (h.type_modification or "").lower()            d_modif = h.date_modification.date()            if type_modif == "ajout":                dates_ajout[article_id] = d_modif                continue            # Considere une consommation complete quand quantite_apres est nulle            quantite_apres = h.quantite_apres            est_consomme = type_modif == "suppression" or (                quantite_apres is not None and float(quantite_apres) <= 0            )            if not est_consomme:                continue            d_ajout = dates_ajout.get(article_id)            if d_ajout is None:                continue            delta = (d_modif - d_ajout).days            if delta <= 0:                continue            categorie = categorie_par_article.get(article_id, "autre")            durees_par_categorie[categorie].append(delta)        moyennes: dict[str, float] = {}        for categorie, valeurs in durees_par_categorie.items():            if valeurs:                moyennes[categorie] = round(sum(valeurs) / len(valeurs), 1)        # Fallback global si peu d'historique        if not moyennes:            moyennes = {                "fruits": 6.0,                "legumes": 7.0,                "produits laitiers": 5.0,                "viandes": 4.0,                "autre": 7.0,            }        return moyennes    @avec_gestion_erreurs(default_return={"items": [], "total": 0})    @avec_session_db    def predire_peremptions_personnalisees(        self,        horizon_jours: int = 7,        *,        db: Session | None = None,    ) -> dict[str, Any]:        """Retourne les alertes proactives basees sur prediction personnalisee."""        if db is None:            return {"items": [], "total": 0}        from src.core.models.inventaire import ArticleInventaire        today = date.today()        horizon = today + timedelta(days=horizon_jours)        moyennes = self.calculer_durees_vie_moyennes(db=db)        rows = db.query(ArticleInventaire).filter(ArticleInventaire.quantite > 0).all()        items: list[dict[str, Any]] = []        for article in rows:            categorie = (article.categorie or "autre").lower()            duree_ref = float(moyennes.get(categorie, moyennes.get("autre", 7.0)))            facteur = self._facteur_conservation(article.emplacement)            # Approximation age produit: depuis derniere mise a jour inventaire.            age_jours = 0            if article.derniere_maj:                age_jours = max(0, (today - article.derniere_maj.date()).days)            jours_restants_predits = int(max(0.0, (duree_ref * facteur) - age_jours))            date_predite = today + timedelta(days=jours_restants_predits)            if date_predite > horizon:                continue            niveau = "moyenne"            if jours_restants_predits <= 2:                niveau = "haute"            if jours_restants_predits <= 1:                niveau = "critique"            items.append(                {                    "article_id": article.id,                    "nom": article.nom,                    "categorie": categorie,                    "emplacement": article.emplacement,                    "date_peremption_db": article.date_peremption.isoformat()                    if article.date_peremption                    else None,                    "date_peremption_predite": date_predite.isoformat(),                    "jours_restants_predits": jours_restants_predits,                    "niveau": niveau,                }            )        items.sort(key=lambda x: (x["jours_restants_predits"], x["nom"] or ""))        return {"items": items, "total": len(items)}@service_factory("prediction_peremption", tags={"cuisine", "anti_gaspillage", "ia"})def obtenir_service_prediction_peremption() -> ServicePredictionPeremption:    """Factory singleton du service prediction peremption."""    return ServicePredictionPeremption()obtenir_service_prediction_peremption = obtenir_service_prediction_peremption
\ No newline at end of file
+"""Service de prediction de peremption personnalisee (IA7).Les durees de vie observees (ajout -> consommation) sont agregees de faconincrementale dans ``stats_duree_vie`` (nombre, moyenne, m2 de Welford) par lejob ``stats_duree_vie``: seules les lignes d'historique posterieures audernier identifiant traite (moins une fenetre de relecture) sont lues. Lespredictions lisent ces agregats sans les mettre a jour ni rescanner``historique_inventaire``."""from __future__ import annotationsfrom bisect import bisect_rightfrom collections import defaultdictfrom datetime import date, datetime, timedeltafrom typing import Anyfrom sqlalchemy import String, and_, cast, func, or_from sqlalchemy.orm import Session, contains_eagerfrom src.core.decorators import avec_gestion_erreurs, avec_session_dbfrom src.services.core.registry import service_factory_FACTEURS_CONSERVATION = {    "congel": 1.8,    "frigo": 1.0,    "placard": 1.25,    "cave": 1.4,}_DUREES_PAR_DEFAUT = {    "fruits": 6.0,    "legumes": 7.0,    "produits laitiers": 5.0,    "viandes": 4.0,    "autre": 7.0,}_NAMESPACE_ETAT = "stats_duree_vie"# Observations minimales avant de preferer la duree propre a l'ingredient_MIN_OBSERVATIONS_INGREDIENT = 3# Identifiants relus sous le dernier traite: une ligne validee apres une ligne# d'identifiant superieur (transactions concurrentes) n'est pas perdue_FENETRE_RELECTURE = 1000def fusionner_welford(    a: tuple[int, float, float], b: tuple[int, float, float]) -> tuple[int, float, float]:    """Fusionne deux agregats (nombre, moyenne, m2) — formule de Chan et al."""    n_a, moyenne_a, m2_a = a    n_b, moyenne_b, m2_b = b    n = n_a + n_b    if n == 0:        return 0, 0.0, 0.0    delta = moyenne_b - moyenne_a    return n, moyenne_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / nclass ServicePredictionPeremption:    """Predictions basees sur duree de vie observee + facteur conservation."""    def _facteur_conservation(self, emplacement: str | None) -> float:        em = (emplacement or "").lower()        for key, facteur in _FACTEURS_CONSERVATION.items():            if key in em:                return facteur        return 1.0    @avec_gestion_erreurs(default_return={"evenements": 0, "observations": 0})    @avec_session_db    def mettre_a_jour_statistiques(self, *, db: Session | None = None) -> dict[str, int]:        """Integre les nouvelles consommations de l'historique dans ``stats_duree_vie``.        Ne lit que les lignes d'historique d'identifiant superieur au dernier        traite (memorise dans ``etats_persistants``) et les ajouts des articles        concernes; le cout est proportionnel au delta, pas a l'historique.        Les ``_FENETRE_RELECTURE`` identifiants precedents sont relus: les        consommations deja integrees y sont memorisees et ignorees.        """        if db is None:            return {"evenements": 0, "observations": 0}        from src.core.models import EtatPersistantDB        from src.core.models.inventaire import HistoriqueInventaire, StatistiqueDureeVie        from src.core.models.recettes import Ingredient        from src.services.core.base.bulk import precharger_par_cle        etat = (            db.query(EtatPersistantDB)            .filter(                EtatPersistantDB.namespace == _NAMESPACE_ETAT,                EtatPersistantDB.user_id == "default",            )            .with_for_update()            .first()        )        donnees_etat = (etat.data or {}) if etat else {}        dernier_id = int(donnees_etat.get("dernier_id", 0))        deja_integres = set(donnees_etat.get("ids_recents", []))        max_id = db.query(func.max(HistoriqueInventaire.id)).scalar()        if not max_id:            return {"evenements": 0, "observations": 0}        H = HistoriqueInventaire        type_modif = func.lower(func.coalesce(H.type_modification, ""))        lignes = (            db.query(H.id, H.article_id, H.ingredient_id, H.date_modification, Ingredient.categorie)            .outerjoin(Ingredient, Ingredient.id == H.ingredient_id)            .filter(                H.id > dernier_id - _FENETRE_RELECTURE,                H.id <= max_id,                type_modif != "ajout",                or_(type_modif == "suppression", H.quantite_apres <= 0),            )            .all()        )        consommations = [c for c in lignes if c.id not in deja_integres]        ids_recents = sorted(c.id for c in lignes if c.id > max_id - _FENETRE_RELECTURE)        if not consommations and etat is not None and max_id <= dernier_id:            return {"evenements": 0, "observations": 0}        # Dates d'ajout triees par article (uniquement les articles consommes)        ajouts: dict[int, list[datetime]] = defaultdict(list)        articles = list({int(c.article_id) for c in consommations})        for debut in range(0, len(articles), 500):            for article_id, d_ajout in (                db.query(H.article_id, H.date_modification)                .filter(                    H.article_id.in_(articles[debut : debut + 500]),                    H.id <= max_id,                    type_modif == "ajout",                )                .all()            ):                ajouts[int(article_id)].append(d_ajout)        for dates in ajouts.values():            dates.sort()        deltas: dict[tuple[str, str], list[int]] = defaultdict(list)        dernieres: dict[tuple[str, str], datetime] = {}        for c in consommations:            dates = ajouts.get(int(c.article_id), [])            position = bisect_right(dates, c.date_modification)            if position == 0:                continue            delta = (c.date_modification.date() - dates[position - 1].date()).days            if delta <= 0:                continue            for cle in (                ("categorie", (c.categorie or "autre").lower()),                ("ingredient", str(c.ingredient_id)),            ):                deltas[cle].append(delta)                if cle not in dernieres or c.date_modification > dernieres[cle]:                    dernieres[cle] = c.date_modification        for portee in ("categorie", "ingredient"):            cles = [cle for p, cle in deltas if p == portee]            existantes = precharger_par_cle(                db,                StatistiqueDureeVie,                "cle",                cles,                filtres=(StatistiqueDureeVie.portee == portee,),            )            for cle in cles:                valeurs = deltas[(portee, cle)]                moyenne = sum(valeurs) / len(valeurs)                lot = (len(valeurs), moyenne, sum((v - moyenne) ** 2 for v in valeurs))                stat = existantes.get(cle)                if stat is None:                    stat = StatistiqueDureeVie(portee=portee, cle=cle)                    db.add(stat)                    courant = (0, 0.0, 0.0)                else:                    courant = (stat.nb_observations, stat.moyenne_jours, stat.m2)                stat.nb_observations, stat.moyenne_jours, stat.m2 = fusionner_welford(courant, lot)                derniere = dernieres[(portee, cle)]                if stat.derniere_observation is None or derniere > stat.derniere_observation:                    stat.derniere_observation = derniere        if etat is None:            etat = EtatPersistantDB(namespace=_NAMESPACE_ETAT, user_id="default", data={})            db.add(etat)        etat.data = {            **(etat.data or {}),            "dernier_id": max(int(max_id), dernier_id),            "ids_recents": ids_recents,        }        db.commit()        return {            "evenements": len(consommations),            "observations": sum(len(v) for (p, _), v in deltas.items() if p == "categorie"),        }    @avec_gestion_erreurs(default_return={})    @avec_session_db    def calculer_durees_vie_moyennes(self, *, db: Session | None = None) -> dict[str, float]:        """Duree de vie moyenne (jours) par categorie, lue dans ``stats_duree_vie``."""        if db is None:            return {}        from src.core.models.inventaire import StatistiqueDureeVie        # Lecture seule: l'integration des nouvelles consommations est faite        # par le job ``stats_duree_vie`` (verrou et commit hors des lectures)        rows = (            db.query(StatistiqueDureeVie.cle, StatistiqueDureeVie.moyenne_jours)            .filter(                StatistiqueDureeVie.portee == "categorie",                StatistiqueDureeVie.nb_observations > 0,            )            .all()        )        moyennes = {cle: round(float(moyenne), 1) for cle, moyenne in rows}        # Fallback global si peu d'historique        if not moyennes:            moyennes = dict(_DUREES_PAR_DEFAUT)        return moyennes    @avec_gestion_erreurs(default_return={"items": [], "total": 0})    @avec_session_db    def predire_peremptions_personnalisees(        self,        horizon_jours: int = 7,        *,        db: Session | None = None,    ) -> dict[str, Any]:        """Retourne les alertes proactives basees sur prediction personnalisee."""        if db is None:            return {"items": [], "total": 0}        from src.core.models.inventaire import ArticleInventaire, StatistiqueDureeVie        from src.core.models.recettes import Ingredient        today = date.today()        horizon = today + timedelta(days=horizon_jours)        moyennes = self.calculer_durees_vie_moyennes(db=db)        # Tout le garde-manger en une requete: article + ingredient + stats ingredient        rows = (            db.query(ArticleInventaire, StatistiqueDureeVie)            .join(ArticleInventaire.ingredient)            .outerjoin(                StatistiqueDureeVie,                and_(                    StatistiqueDureeVie.portee == "ingredient",                    StatistiqueDureeVie.cle == cast(Ingredient.id, String),                ),            )            .options(contains_eager(ArticleInventaire.ingredient))            .filter(ArticleInventaire.quantite > 0)            .all()        )        items: list[dict[str, Any]] = []        for article, stat in rows:            categorie = (article.categorie or "autre").lower()            if stat is not None and stat.nb_observations >= _MIN_OBSERVATIONS_INGREDIENT:                duree_ref = float(stat.moyenne_jours)            else:                duree_ref = float(moyennes.get(categorie, moyennes.get("autre", 7.0)))            facteur = self._facteur_conservation(article.emplacement)            # Approximation age produit: depuis derniere mise a jour inventaire.            age_jours = 0            if article.derniere_maj:                age_jours = max(0, (today - article.derniere_maj.date()).days)            jours_restants_predits = int(max(0.0, (duree_ref * facteur) - age_jours))            date_predite = today + timedelta(days=jours_restants_predits)            if date_predite > horizon:                continue            niveau = "moyenne"            if jours_restants_predits <= 2:                niveau = "haute"            if jours_restants_predits <= 1:                niveau = "critique"            items.append(                {                    "article_id": article.id,                    "nom": article.nom,                    "categorie": categorie,                    "emplacement": article.emplacement,                    "date_peremption_db": article.date_peremption.isoformat()                    if article.date_peremption                    else None,                    "date_peremption_predite": date_predite.isoformat(),                    "jours_restants_predits": jours_restants_predits,                    "niveau": niveau,                }            )        items.sort(key=lambda x: (x["jours_restants_predits"], x["nom"] or ""))        return {"items": items, "total": len(items)}@service_factory("prediction_peremption", tags={"cuisine", "anti_gaspillage", "ia"})def obtenir_service_prediction_peremption() -> ServicePredictionPeremption:    """Factory singleton du service prediction peremption."""    return ServicePredictionPeremption()obtenir_service_prediction_peremption = obtenir_service_prediction_peremption
\ No newline at end of file
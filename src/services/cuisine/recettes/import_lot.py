@@ -0,0 +1,325 @@
+"""
+Import de recettes en lot — téléchargements concurrents, cache HTML disque.
+
+Pipeline de ``RecipeImportService.import_batch``:
+
+1. Les URLs sont dédoublonnées (l'ordre des résultats suit celui des URLs)
+2. Les pages sont téléchargées en parallèle (``concurrence`` au plus), avec
+   une politesse par hôte: ``par_hote`` requêtes simultanées au plus et une
+   requête toutes les ``intervalle_hote`` secondes
+3. Cache HTML disque adressé par contenu (``CacheHTML``): une page vérifiée
+   depuis moins de ``ttl_frais`` n'est pas retéléchargée; au-delà, requête
+   conditionnelle (``If-None-Match`` / ``If-Modified-Since``, 304 = page
+   reprise du cache)
+4. L'analyse tourne hors de la boucle d'événements (``asyncio.to_thread``):
+   JSON-LD lu sans DOM quand la page en contient, sinon parser par site et
+   repli IA (``RecipeImportService._analyser_page``)
+
+Usage:
+    from src.services.cuisine.recettes.import_lot import ImportateurLot
+
+    importateur = ImportateurLot(service, concurrence=8, par_hote=2)
+    resultats = await importateur.importer(urls)
+    importateur.metriques.to_dict()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import httpx
+
+from src.services.cuisine.recettes.parsers import ImportResult
+from src.services.integrations.sync_openfoodfacts import SeauJetons
+
+if TYPE_CHECKING:
+    from src.services.cuisine.recettes.import_url import RecipeImportService
+
+logger = logging.getLogger(__name__)
+
+RACINE_CACHE_HTML = Path(__file__).resolve().parents[4] / "data" / "cache" / "html_recettes"
+TTL_FRAIS_DEFAUT = 86400.0  # 24h sans revalidation
+CONCURRENCE_DEFAUT = 8
+PAR_HOTE_DEFAUT = 2
+INTERVALLE_HOTE_DEFAUT = 1.0  # secondes entre deux requêtes vers un même hôte
+
+
+# ═══════════════════════════════════════════════════════════
+# CACHE HTML ADRESSÉ PAR CONTENU
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class EntreeHTML:
+    """Page en cache: métadonnées de revalidation et contenu."""
+
+    url: str
+    empreinte: str
+    etag: str | None = None
+    last_modified: str | None = None
+    verifie_le: float = 0.0
+    corps: str = ""
+
+
+def _ecrire_atomique(chemin: Path, donnees: bytes) -> None:
+    """Écrit un fichier via un temporaire renommé (lecteurs concurrents sûrs)."""
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporaire = tempfile.mkstemp(dir=chemin.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fichier:
+            fichier.write(donnees)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        Path(temporaire).unlink(missing_ok=True)
+        raise
+
+
+class CacheHTML:
+    """Cache disque des pages de recettes, adressé par contenu.
+
+    - ``objets/<ab>/<sha256>.html``: contenu, stocké une seule fois même si
+      plusieurs URLs (redirections, paramètres de suivi) servent la même page
+    - ``index/<sha256(url)>.json``: empreinte, ETag, Last-Modified et date de
+      dernière vérification de chaque URL
+
+    Args:
+        racine: Répertoire du cache (créé à la première écriture)
+        ttl_frais: Durée (s) pendant laquelle une page est servie sans requête
+    """
+
+    def __init__(self, racine: Path | str = RACINE_CACHE_HTML, ttl_frais: float = TTL_FRAIS_DEFAUT):
+        self.racine = Path(racine)
+        self.ttl_frais = ttl_frais
+
+    def _chemin_index(self, url: str) -> Path:
+        return self.racine / "index" / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _chemin_objet(self, empreinte: str) -> Path:
+        return self.racine / "objets" / empreinte[:2] / f"{empreinte}.html"
+
+    def lire(self, url: str) -> EntreeHTML | None:
+        """Entrée de l'URL avec son contenu, ou None (absente ou incomplète)."""
+        try:
+            meta = json.loads(self._chemin_index(url).read_text(encoding="utf-8"))
+            entree = EntreeHTML(**meta)
+            entree.corps = self._chemin_objet(entree.empreinte).read_text(encoding="utf-8")
+        except (OSError, ValueError, TypeError):
+            return None
+        return entree
+
+    def est_frais(self, entree: EntreeHTML) -> bool:
+        return time.time() - entree.verifie_le < self.ttl_frais
+
+    @staticmethod
+    def entetes_conditionnels(entree: EntreeHTML | None) -> dict[str, str]:
+        """En-têtes de revalidation d'une entrée (vide si rien de connu)."""
+        entetes: dict[str, str] = {}
+        if entree is not None and entree.etag:
+            entetes["If-None-Match"] = entree.etag
+        if entree is not None and entree.last_modified:
+            entetes["If-Modified-Since"] = entree.last_modified
+        return entetes
+
+    def enregistrer(
+        self,
+        url: str,
+        corps: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> EntreeHTML:
+        """Stocke une page téléchargée (contenu dédoublonné par empreinte)."""
+        donnees = corps.encode("utf-8")
+        empreinte = hashlib.sha256(donnees).hexdigest()
+        objet = self._chemin_objet(empreinte)
+        if not objet.exists():
+            _ecrire_atomique(objet, donnees)
+        entree = EntreeHTML(url, empreinte, etag, last_modified, time.time(), corps)
+        self._ecrire_index(entree)
+        return entree
+
+    def confirmer(self, entree: EntreeHTML) -> EntreeHTML:
+        """Marque une entrée comme revalidée (réponse 304)."""
+        entree.verifie_le = time.time()
+        self._ecrire_index(entree)
+        return entree
+
+    def _ecrire_index(self, entree: EntreeHTML) -> None:
+        meta = {k: v for k, v in asdict(entree).items() if k != "corps"}
+        _ecrire_atomique(self._chemin_index(entree.url), json.dumps(meta).encode("utf-8"))
+
+
+# ═══════════════════════════════════════════════════════════
+# IMPORT CONCURRENT
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class MetriquesImportLot:
+    """Compteurs d'un import en lot."""
+
+    urls: int = 0
+    requetes: int = 0
+    depuis_cache: int = 0  # page fraîche, aucune requête
+    revalides: int = 0  # réponse 304
+    telecharges: int = 0
+    erreurs: int = 0
+    reussis: int = 0
+    duree_s: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _hote(url: str) -> str:
+    return urlparse(url).netloc.lower().removeprefix("www.")
+
+
+class ImportateurLot:
+    """Téléchargement concurrent et analyse d'une liste d'URLs de recettes.
+
+    Args:
+        service: Service d'import (analyse des pages, client IA)
+        cache: Cache HTML disque (None = pas de cache)
+        concurrence: Téléchargements simultanés au plus, tous hôtes confondus
+        par_hote: Téléchargements simultanés au plus vers un même hôte
+        intervalle_hote: Délai minimal (s) entre deux requêtes vers un même hôte
+        timeout: Timeout HTTP (secondes)
+        transport: Transport httpx (tests: serveur local / MockTransport)
+    """
+
+    def __init__(
+        self,
+        service: RecipeImportService,
+        cache: CacheHTML | None = None,
+        concurrence: int = CONCURRENCE_DEFAUT,
+        par_hote: int = PAR_HOTE_DEFAUT,
+        intervalle_hote: float = INTERVALLE_HOTE_DEFAUT,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.service = service
+        self.cache = cache
+        self.concurrence = max(1, concurrence)
+        self.par_hote = max(1, par_hote)
+        self.intervalle_hote = intervalle_hote
+        self.timeout = timeout
+        self.transport = transport
+        self.metriques = MetriquesImportLot()
+        self._hotes: dict[str, tuple[asyncio.Semaphore, SeauJetons]] = {}
+
+    async def importer(
+        self, urls: Iterable[str], use_ai_fallback: bool = True
+    ) -> list[ImportResult]:
+        """Importe les recettes des URLs; un résultat par URL, dans l'ordre."""
+        urls = list(urls)
+        uniques = list(dict.fromkeys(urls))
+        self.metriques = MetriquesImportLot(urls=len(uniques))
+        self._hotes = {}
+        debut = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrence)
+
+        async with httpx.AsyncClient(
+            headers={"User-Agent": self.service.USER_AGENT},
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=self.transport,
+            limits=httpx.Limits(max_connections=self.concurrence),
+        ) as client:
+
+            async def _un(url: str) -> ImportResult:
+                if urlparse(url).scheme not in ("http", "https"):
+                    return ImportResult(
+                        success=False,
+                        message="URL invalide (doit commencer par http:// ou https://)",
+                    )
+                async with semaphore:
+                    html, echec = await self._telecharger(client, url)
+                if echec is not None:
+                    self.metriques.erreurs += 1
+                    return echec
+                try:
+                    return await asyncio.to_thread(
+                        self.service._analyser_page, html, url, use_ai_fallback
+                    )
+                except Exception as e:
+                    self.metriques.erreurs += 1
+                    logger.error(f"Analyse de {url} échouée: {e}")
+                    return ImportResult(
+                        success=False, message=f"Erreur d'analyse: {e}", errors=[str(e)]
+                    )
+
+            reponses = await asyncio.gather(*(_un(u) for u in uniques))
+            resultats = dict(zip(uniques, reponses, strict=True))
+
+        self.metriques.reussis = sum(1 for r in resultats.values() if r.success)
+        self.metriques.duree_s = time.perf_counter() - debut
+        return [resultats[url] for url in urls]
+
+    def _limites_hote(self, url: str) -> tuple[asyncio.Semaphore, SeauJetons]:
+        hote = _hote(url)
+        if hote not in self._hotes:
+            debit = 1 / self.intervalle_hote if self.intervalle_hote > 0 else 0
+            self._hotes[hote] = (asyncio.Semaphore(self.par_hote), SeauJetons(debit))
+        return self._hotes[hote]
+
+    async def _telecharger(
+        self, client: httpx.AsyncClient, url: str
+    ) -> tuple[str, ImportResult | None]:
+        """Retourne ``(html, None)`` ou ``("", résultat d'échec)``."""
+        entree = self.cache.lire(url) if self.cache is not None else None
+        if entree is not None and self.cache.est_frais(entree):
+            self.metriques.depuis_cache += 1
+            return entree.corps, None
+
+        semaphore_hote, seau = self._limites_hote(url)
+        async with semaphore_hote:
+            await seau.acquerir()
+            self.metriques.requetes += 1
+            try:
+                reponse = await client.get(url, headers=CacheHTML.entetes_conditionnels(entree))
+            except httpx.HTTPError as e:
+                return "", ImportResult(
+                    success=False,
+                    message=f"Impossible de télécharger la page: {e}",
+                    errors=[str(e)],
+                )
+
+        if reponse.status_code == 304 and entree is not None:
+            self.metriques.revalides += 1
+            self.cache.confirmer(entree)
+            return entree.corps, None
+        if reponse.status_code >= 400:
+            return "", ImportResult(
+                success=False,
+                message=f"Erreur HTTP {reponse.status_code}",
+                errors=[f"{reponse.status_code} pour {url}"],
+            )
+
+        # Forcer UTF-8 (même choix que l'import unitaire)
+        reponse.encoding = "utf-8"
+        html = reponse.text
+        self.metriques.telecharges += 1
+        if self.cache is not None:
+            self.cache.enregistrer(
+                url, html, reponse.headers.get("ETag"), reponse.headers.get("Last-Modified")
+            )
+        return html, None
+
+
+__all__ = [
+    "CacheHTML",
+    "EntreeHTML",
+    "ImportateurLot",
+    "MetriquesImportLot",
+]
@@ -16,17 +16,21 @@ Fonctionnalités:
 
 - Import en lot depuis fichier d'URLs
 
+- Chemin rapide JSON-LD (sans DOM), téléchargements en lot concurrents et
+
+  cache HTML disque (voir import_lot.py)
+
 """
 
 import logging
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 
 from src.core.ai import ClientIA, obtenir_client_ia
 from src.core.decorators import avec_gestion_erreurs, avec_resilience
 from src.services.core.base import BaseAIService
+from src.services.cuisine.recettes.import_lot import CacheHTML, ImportateurLot
 
 # Parsers et schémas extraits dans parsers.py
 from src.services.cuisine.recettes.parsers import (
@@ -37,6 +41,8 @@ from src.services.cuisine.recettes.parsers import (
     ImportResult,
     MarmitonParser,
     RecipeParser,
+    construire_soupe,
+    extraire_recette_jsonld,
 )
 
 # Rétrocompatibilité: re-export des classes pour les imports existants
@@ -123,6 +129,8 @@ class RecipeImportService(BaseAIService):
             follow_redirects=True,
         )
 
+        self.cache_html = CacheHTML()
+
     def _get_parser_for_url(self, url: str) -> type:
         """Retourne le parser approprié pour l'URL."""
 
@@ -195,19 +203,35 @@ class RecipeImportService(BaseAIService):
                 success=False, message=f"Impossible de télécharger la page: {e}", errors=[str(e)]
             )
 
-        # Parser le HTML
+        return self._analyser_page(html_content, url, use_ai_fallback)
+
+    def _analyser_page(
+        self, html_content: str, url: str, use_ai_fallback: bool = True
+    ) -> ImportResult:
+        """
+
+        Extrait la recette d'une page téléchargée.
 
-        soup = BeautifulSoup(html_content, "html.parser")
 
-        # Choisir le parser approprié
+
+        JSON-LD schema.org lu directement dans le HTML si présent; sinon DOM
+
+        complet et parser du site, puis repli IA si la confiance est basse.
+
+        """
 
         parser_class = self._get_parser_for_url(url)
 
-        logger.debug(f"Utilisation du parser: {parser_class.__name__}")
+        # Chemin rapide: données structurées, sans construire le DOM
+
+        recipe = extraire_recette_jsonld(html_content, url, parser_class.SITE)
 
-        # Extraire la recette
+        if recipe is None:
+            soup = construire_soupe(html_content)
 
-        recipe = parser_class.parse(soup, url)
+            logger.debug(f"Utilisation du parser: {parser_class.__name__}")
+
+            recipe = parser_class.parse(soup, url)
 
         # Vérifier la qualité de l'extraction
 
@@ -259,7 +283,7 @@ class RecipeImportService(BaseAIService):
 
         # Nettoyer le HTML pour réduire les tokens
 
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = construire_soupe(html_content)
 
         # Supprimer scripts, styles, nav, footer, etc.
 
@@ -374,35 +398,49 @@ Réponds en JSON avec cette structure exacte:
 
         return None
 
-    def import_batch(self, urls: list[str]) -> list[ImportResult]:
+    def import_batch(self, urls: list[str], use_ai_fallback: bool = True) -> list[ImportResult]:
         """
 
         Importe plusieurs recettes en lot.
 
 
 
+        Téléchargements concurrents (limités par hôte) et cache HTML disque:
+
+        voir ``ImportateurLot``.
+
+
+
         Args:
 
             urls: Liste d'URLs à importer
 
+            use_ai_fallback: Utiliser l'IA si l'extraction classique échoue
+
 
 
         Returns:
 
-            Liste de résultats d'import
+            Liste de résultats d'import (dans l'ordre des URLs)
 
         """
 
-        results = []
+        if not urls:
+            return []
+
+        from src.core.async_utils import executer_async
 
-        for url in urls:
-            result = self.import_from_url(url)
+        importateur = ImportateurLot(self, cache=self.cache_html)
 
-            results.append(result)
+        results = executer_async(importateur.importer(urls, use_ai_fallback), timeout=None)
 
-        successes = sum(1 for r in results if r.success)
+        metriques = importateur.metriques
 
-        logger.info(f"📊 Import lot terminé: {successes}/{len(urls)} réussis")
+        logger.info(
+            f"📊 Import lot terminé: {metriques.reussis}/{metriques.urls} réussis "
+            f"({metriques.requetes} requêtes, {metriques.depuis_cache} depuis le cache, "
+            f"{metriques.revalides} revalidées, {metriques.duree_s:.1f}s)"
+        )
 
         return results
 
@@ -5,18 +5,35 @@ Classes de parsing spécialisées par site (Marmiton, CuisineAZ, etc.)
 et parser générique utilisant schema.org et heuristiques.
 
 Inclut les schémas Pydantic pour les recettes importées.
+
+``extraire_recette_jsonld`` lit le bloc schema.org Recipe directement dans
+le HTML brut, sans construire le DOM; les parsers par site ne servent que
+lorsque la page n'en contient pas (DOM construit par lxml si disponible).
 """
 
 import json
 import logging
 import re
+from typing import Any
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
 
+try:
+    import lxml  # noqa: F401
+
+    ANALYSEUR_HTML = "lxml"
+except ImportError:  # pragma: no cover - dépendance déclarée
+    ANALYSEUR_HTML = "html.parser"
+
 logger = logging.getLogger(__name__)
 
+_MOTIF_JSONLD = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
 # ═══════════════════════════════════════════════════════════
 # SCHÉMAS
 # ═══════════════════════════════════════════════════════════
@@ -65,9 +82,17 @@ class ImportResult(BaseModel):
 # ═══════════════════════════════════════════════════════════
 
 
+def construire_soupe(html: str) -> BeautifulSoup:
+    """Construit le DOM d'une page (lxml si installé, sinon ``html.parser``)."""
+    return BeautifulSoup(html, ANALYSEUR_HTML)
+
+
 class RecipeParser:
     """Parser de base pour les recettes."""
 
+    SITE: str | None = None
+    """Nom du site pour ``source_site`` (None = domaine de l'URL)."""
+
     @staticmethod
     def clean_text(text: str | None) -> str:
         """Nettoie le texte."""
@@ -158,10 +183,81 @@ class RecipeParser:
         # Pas de pattern trouvé, garder le texte entier comme nom
         return ImportedIngredient(nom=text.title())
 
+    @staticmethod
+    def trouver_recette_jsonld(data: Any) -> dict | None:
+        """Retourne le nœud schema.org ``Recipe`` d'un bloc JSON-LD.
+
+        Gère les blocs liste (``[BreadcrumbList, Recipe]``), les graphes
+        (``{"@graph": [...]}``) et les types multiples (``["Recipe", ...]``).
+        """
+        a_visiter = [data]
+        while a_visiter:
+            noeud = a_visiter.pop(0)
+            if isinstance(noeud, list):
+                a_visiter.extend(noeud)
+            elif isinstance(noeud, dict):
+                types = noeud.get("@type")
+                if types == "Recipe" or (isinstance(types, list) and "Recipe" in types):
+                    return noeud
+                if isinstance(noeud.get("@graph"), list):
+                    a_visiter.extend(noeud["@graph"])
+        return None
+
+    @staticmethod
+    def remplir_depuis_jsonld(recipe: ImportedRecipe, data: dict) -> ImportedRecipe:
+        """Remplit une recette depuis un nœud schema.org ``Recipe``."""
+        recipe.nom = data.get("name", "")
+        recipe.description = data.get("description", "")
+
+        # Image
+        image = data.get("image")
+        if isinstance(image, list):
+            image = image[0] if image else None
+        if isinstance(image, dict):
+            image = image.get("url")
+        recipe.image_url = image if isinstance(image, str) else None
+
+        # Temps
+        if "prepTime" in data:
+            recipe.temps_preparation = RecipeParser.parse_duration(data["prepTime"])
+        if "cookTime" in data:
+            recipe.temps_cuisson = RecipeParser.parse_duration(data["cookTime"])
+
+        # Portions
+        if "recipeYield" in data:
+            recipe.portions = RecipeParser.parse_portions(str(data["recipeYield"]))
+
+        # Ingrédients
+        for ing_text in data.get("recipeIngredient", []):
+            ing = RecipeParser.parse_ingredient(ing_text)
+            if ing.nom:
+                recipe.ingredients.append(ing)
+
+        # Étapes (HowToSection: étapes dans itemListElement)
+        instructions = data.get("recipeInstructions", [])
+        if isinstance(instructions, str):
+            recipe.etapes = [s.strip() for s in instructions.split(".") if s.strip()]
+        elif isinstance(instructions, list):
+            for step in instructions:
+                if isinstance(step, str):
+                    recipe.etapes.append(step)
+                elif isinstance(step, dict) and isinstance(step.get("itemListElement"), list):
+                    recipe.etapes.extend(
+                        s.get("text", "") if isinstance(s, dict) else str(s)
+                        for s in step["itemListElement"]
+                    )
+                elif isinstance(step, dict):
+                    recipe.etapes.append(step.get("text", ""))
+
+        recipe.confiance_score = 0.9
+        return recipe
+
 
 class MarmitonParser(RecipeParser):
     """Parser spécialisé pour Marmiton."""
 
+    SITE = "Marmiton"
+
     @staticmethod
     def parse(soup: BeautifulSoup, url: str) -> ImportedRecipe:
         """Parse une page Marmiton.
@@ -169,62 +265,14 @@ class MarmitonParser(RecipeParser):
         Tente d'abord le JSON-LD (schema.org Recipe) qui est propre, UTF-8,
         sans doublons et contient cookTime. Fallback HTML si absent.
         """
-        recipe = ImportedRecipe(source_url=url, source_site="Marmiton")
+        recipe = ImportedRecipe(source_url=url, source_site=MarmitonParser.SITE)
 
         # 1. JSON-LD en priorité (données structurées, fiables)
         for script in soup.find_all("script", type="application/ld+json"):
             try:
-                data = json.loads(script.string)
-
-                # Peut être une liste (ex: [@type BreadcrumbList, @type Recipe])
-                if isinstance(data, list):
-                    data = next(
-                        (d for d in data if isinstance(d, dict) and d.get("@type") == "Recipe"),
-                        None,
-                    )
-
-                if isinstance(data, dict) and data.get("@type") == "Recipe":
-                    recipe.nom = data.get("name", "")
-                    recipe.description = data.get("description", "")
-
-                    # Image
-                    image = data.get("image")
-                    if isinstance(image, list):
-                        recipe.image_url = image[0] if image else None
-                    elif isinstance(image, dict):
-                        recipe.image_url = image.get("url")
-                    elif isinstance(image, str):
-                        recipe.image_url = image
-
-                    # Temps
-                    if "prepTime" in data:
-                        recipe.temps_preparation = RecipeParser.parse_duration(data["prepTime"])
-                    if "cookTime" in data:
-                        recipe.temps_cuisson = RecipeParser.parse_duration(data["cookTime"])
-
-                    # Portions
-                    if "recipeYield" in data:
-                        recipe.portions = RecipeParser.parse_portions(str(data["recipeYield"]))
-
-                    # Ingrédients
-                    for ing_text in data.get("recipeIngredient", []):
-                        ing = RecipeParser.parse_ingredient(ing_text)
-                        if ing.nom:
-                            recipe.ingredients.append(ing)
-
-                    # Étapes
-                    instructions = data.get("recipeInstructions", [])
-                    if isinstance(instructions, str):
-                        recipe.etapes = [s.strip() for s in instructions.split(".") if s.strip()]
-                    elif isinstance(instructions, list):
-                        for step in instructions:
-                            if isinstance(step, str):
-                                recipe.etapes.append(step)
-                            elif isinstance(step, dict):
-                                recipe.etapes.append(step.get("text", ""))
-
-                    recipe.confiance_score = 0.9
-                    return recipe
+                data = RecipeParser.trouver_recette_jsonld(json.loads(script.string))
+                if data is not None:
+                    return RecipeParser.remplir_depuis_jsonld(recipe, data)
             except Exception as e:
                 logger.debug("Erreur parsing JSON-LD Marmiton: %s", e)
                 continue
@@ -302,10 +350,12 @@ class MarmitonParser(RecipeParser):
 class CuisineAZParser(RecipeParser):
     """Parser spécialisé pour CuisineAZ."""
 
+    SITE = "CuisineAZ"
+
     @staticmethod
     def parse(soup: BeautifulSoup, url: str) -> ImportedRecipe:
         """Parse une page CuisineAZ."""
-        recipe = ImportedRecipe(source_url=url, source_site="CuisineAZ")
+        recipe = ImportedRecipe(source_url=url, source_site=CuisineAZParser.SITE)
 
         # Titre
         title = soup.find("h1", class_=re.compile(r"title", re.I))
@@ -402,51 +452,9 @@ class GenericRecipeParser(RecipeParser):
         # 1. Essayer JSON-LD (schema.org Recipe)
         for script in soup.find_all("script", type="application/ld+json"):
             try:
-                data = json.loads(script.string)
-
-                # Peut être une liste
-                if isinstance(data, list):
-                    data = next(
-                        (d for d in data if isinstance(d, dict) and d.get("@type") == "Recipe"),
-                        None,
-                    )
-
-                if isinstance(data, dict) and data.get("@type") == "Recipe":
-                    recipe.nom = data.get("name", "")
-                    recipe.description = data.get("description", "")
-                    recipe.image_url = (
-                        data.get("image", [None])[0]
-                        if isinstance(data.get("image"), list)
-                        else data.get("image")
-                    )
-
-                    # Temps
-                    if "prepTime" in data:
-                        recipe.temps_preparation = RecipeParser.parse_duration(data["prepTime"])
-                    if "cookTime" in data:
-                        recipe.temps_cuisson = RecipeParser.parse_duration(data["cookTime"])
-                    if "recipeYield" in data:
-                        recipe.portions = RecipeParser.parse_portions(str(data["recipeYield"]))
-
-                    # Ingrédients
-                    for ing_text in data.get("recipeIngredient", []):
-                        ing = RecipeParser.parse_ingredient(ing_text)
-                        if ing.nom:
-                            recipe.ingredients.append(ing)
-
-                    # Étapes
-                    instructions = data.get("recipeInstructions", [])
-                    if isinstance(instructions, str):
-                        recipe.etapes = [s.strip() for s in instructions.split(".") if s.strip()]
-                    elif isinstance(instructions, list):
-                        for step in instructions:
-                            if isinstance(step, str):
-                                recipe.etapes.append(step)
-                            elif isinstance(step, dict):
-                                recipe.etapes.append(step.get("text", ""))
-
-                    recipe.confiance_score = 0.9
-                    return recipe
+                data = RecipeParser.trouver_recette_jsonld(json.loads(script.string))
+                if data is not None:
+                    return RecipeParser.remplir_depuis_jsonld(recipe, data)
             except Exception as e:
                 logger.debug("Erreur parsing JSON-LD bloc: %s", e)
                 continue
@@ -540,3 +548,35 @@ class GenericRecipeParser(RecipeParser):
         if recipe.image_url:
             score += 0.15
         return min(score, 1.0)
+
+
+# ═══════════════════════════════════════════════════════════
+# CHEMIN RAPIDE JSON-LD
+# ═══════════════════════════════════════════════════════════
+
+
+def extraire_recette_jsonld(
+    html: str, url: str, source_site: str | None = None
+) -> ImportedRecipe | None:
+    """Extrait la recette schema.org JSON-LD du HTML brut, sans DOM.
+
+    Les blocs ``<script type="application/ld+json">`` sont repérés par
+    expression régulière (leur contenu est du texte brut, non échappé) et
+    décodés directement. Une recette sans nom ni ingrédients n'est pas
+    retenue: le DOM complet est alors nécessaire.
+
+    Returns:
+        Recette (confiance 0.9) ou None si la page n'a pas de Recipe exploitable
+    """
+    for bloc in _MOTIF_JSONLD.finditer(html):
+        try:
+            data = RecipeParser.trouver_recette_jsonld(json.loads(bloc.group(1)))
+        except ValueError:
+            continue
+        if data is None:
+            continue
+        recipe = ImportedRecipe(source_url=url, source_site=source_site or urlparse(url).netloc)
+        RecipeParser.remplir_depuis_jsonld(recipe, data)
+        if recipe.nom and recipe.ingredients:
+            return recipe
+    return None
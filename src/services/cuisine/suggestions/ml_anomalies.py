@@ -15,18 +15,21 @@ Usage:
 from __future__ import annotations
 
 import logging
-import pickle
 from datetime import datetime
 from typing import Any
 
 import numpy as np
 
-from .ml_schemas import MODELS_DIR, AnomalieDepense
+from .ml_registre import RegistreModeles, obtenir_registre_modeles
+from .ml_schemas import AnomalieDepense
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["DetecteurAnomaliesDepenses"]
 
+NOM_MODELE = "anomalies"
+FORMAT_FEATURES = 1
+
 
 class DetecteurAnomaliesDepenses:
     """Détecte les dépenses anormales via Isolation Forest.
@@ -35,39 +38,45 @@ class DetecteurAnomaliesDepenses:
     et pattern temporel.
     """
 
-    def __init__(self):
+    def __init__(self, registre: RegistreModeles | None = None):
         self._modele = None
         self._scaler = None
         self._categories: list[str] = []
-        self._modele_path = MODELS_DIR / "anomalies_model.pkl"
+        self._index_categories: dict[str, int] = {}
+        self._registre = registre or obtenir_registre_modeles()
+        self._generation = 0
+        self._modele_path = self._registre.chemin(NOM_MODELE)
         self._charger()
 
     def _charger(self) -> bool:
-        """Charge le modèle sérialisé."""
-        if self._modele_path.exists():
-            try:
-                with open(self._modele_path, "rb") as f:
-                    data = pickle.load(f)  # noqa: S301
-                self._modele = data.get("modele")
-                self._scaler = data.get("scaler")
-                self._categories = data.get("categories", [])
-                return True
-            except Exception:
-                pass
-        return False
+        """Synchronise l'instance avec le modèle partagé du registre."""
+        entree = self._registre.obtenir(NOM_MODELE, format_attendu=FORMAT_FEATURES)
+        if entree is None:
+            return False
+        if entree.generation != self._generation:
+            self._generation = entree.generation
+            self._modele = entree.donnees.get("modele")
+            self._scaler = entree.donnees.get("scaler")
+            self._definir_categories(entree.donnees.get("categories", []))
+        return True
+
+    def _definir_categories(self, categories: list[str]) -> None:
+        self._categories = list(categories)
+        self._index_categories = {c: i for i, c in enumerate(self._categories)}
 
     def _sauvegarder(self) -> None:
-        """Sauvegarde le modèle."""
+        """Publie le modèle dans le registre (écriture atomique sur disque)."""
         try:
-            with open(self._modele_path, "wb") as f:
-                pickle.dump(
-                    {
-                        "modele": self._modele,
-                        "scaler": self._scaler,
-                        "categories": self._categories,
-                    },
-                    f,
-                )
+            entree = self._registre.publier(
+                NOM_MODELE,
+                {
+                    "modele": self._modele,
+                    "scaler": self._scaler,
+                    "categories": self._categories,
+                },
+                format_features=FORMAT_FEATURES,
+            )
+            self._generation = entree.generation
         except Exception as e:
             logger.warning(f"Erreur sauvegarde: {e}")
 
@@ -95,11 +104,7 @@ class DetecteurAnomaliesDepenses:
         except ValueError:
             dt = datetime.now()
 
-        cat_idx = (
-            self._categories.index(categorie)
-            if categorie in self._categories
-            else len(self._categories)
-        )
+        cat_idx = self._index_categories.get(categorie, len(self._categories))
 
         return [
             montant,
@@ -131,7 +136,9 @@ class DetecteurAnomaliesDepenses:
             from sklearn.preprocessing import StandardScaler
 
             # Collecter les catégories
-            self._categories = sorted(set(d.get("categorie", "Autre") for d in historique_depenses))
+            self._definir_categories(
+                sorted(set(d.get("categorie", "Autre") for d in historique_depenses))
+            )
 
             X = [self._preparer_features(d) for d in historique_depenses]
             X_arr = np.array(X)
@@ -182,7 +189,8 @@ class DetecteurAnomaliesDepenses:
         Returns:
             Liste des anomalies détectées
         """
-        if not self._modele or not self._scaler:
+        self._charger()
+        if not self._modele or not self._scaler or not depenses:
             return []
 
         anomalies = []
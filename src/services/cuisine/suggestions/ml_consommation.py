@@ -11,24 +11,28 @@ Usage:
     modele = ModeleConsommationML()
     modele.entrainer(historique_achats)
     prediction = modele.predire("tomates", horizon_jours=7)
+    predictions = modele.predire_lot(["tomates", "lait"], horizon_jours=7)
 """
 
 from __future__ import annotations
 
 import logging
-import pickle
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Any
 
 import numpy as np
 
-from .ml_schemas import MODELS_DIR, PredictionML
+from .ml_registre import RegistreModeles, hachage_stable, obtenir_registre_modeles
+from .ml_schemas import PredictionML
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["ModeleConsommationML"]
 
+NOM_MODELE = "consommation"
+# v2: hash d'article stable entre processus (CRC32 au lieu de hash())
+FORMAT_FEATURES = 2
+
 
 class ModeleConsommationML:
     """Prédit la consommation d'articles via régression.
@@ -37,46 +41,51 @@ class ModeleConsommationML:
     (jour semaine, mois, semaine année, tendance).
     """
 
-    def __init__(self):
+    def __init__(self, registre: RegistreModeles | None = None):
         self._modele = None
         self._scaler = None
         self._articles_connus: set[str] = set()
-        self._modele_path = MODELS_DIR / "consommation_model.pkl"
+        self._registre = registre or obtenir_registre_modeles()
+        self._generation = 0
+        self._modele_path = self._registre.chemin(NOM_MODELE)
 
         # Charger modèle existant
         self._charger()
 
     def _charger(self) -> bool:
-        """Charge un modèle sérialisé s'il existe."""
-        if self._modele_path.exists():
-            try:
-                with open(self._modele_path, "rb") as f:
-                    data = pickle.load(f)  # noqa: S301
-                self._modele = data.get("modele")
-                self._scaler = data.get("scaler")
-                self._articles_connus = data.get("articles", set())
-                logger.info(f"Modèle consommation chargé ({len(self._articles_connus)} articles)")
-                return True
-            except Exception as e:
-                logger.warning(f"Erreur chargement modèle: {e}")
-        return False
+        """Synchronise l'instance avec le modèle partagé du registre."""
+        entree = self._registre.obtenir(NOM_MODELE, format_attendu=FORMAT_FEATURES)
+        if entree is None:
+            return False
+        if entree.generation != self._generation:
+            self._generation = entree.generation
+            self._modele = entree.donnees.get("modele")
+            self._scaler = entree.donnees.get("scaler")
+            self._articles_connus = set(entree.donnees.get("articles", set()))
+        return True
 
     def _sauvegarder(self) -> None:
-        """Sauvegarde le modèle sur disque."""
+        """Publie le modèle dans le registre (écriture atomique sur disque)."""
         try:
-            with open(self._modele_path, "wb") as f:
-                pickle.dump(
-                    {
-                        "modele": self._modele,
-                        "scaler": self._scaler,
-                        "articles": self._articles_connus,
-                    },
-                    f,
-                )
+            entree = self._registre.publier(
+                NOM_MODELE,
+                {
+                    "modele": self._modele,
+                    "scaler": self._scaler,
+                    "articles": self._articles_connus,
+                },
+                format_features=FORMAT_FEATURES,
+            )
+            self._generation = entree.generation
             logger.info("Modèle consommation sauvegardé")
         except Exception as e:
             logger.warning(f"Erreur sauvegarde modèle: {e}")
 
+    @staticmethod
+    def _hash_article(article: str) -> float:
+        """Feature article stable entre processus, dans [0, 1)."""
+        return hachage_stable(article.lower()) / 1000.0
+
     def _extraire_features(self, date_val: datetime) -> list[float]:
         """Extrait les features temporelles d'une date.
 
@@ -141,8 +150,7 @@ class ModeleConsommationML:
 
                 features = self._extraire_features(dt)
                 # Ajouter un hash de l'article comme feature
-                article_hash = float(hash(article.lower()) % 1000) / 1000.0
-                features.append(article_hash)
+                features.append(self._hash_article(article))
 
                 X.append(features)
                 y.append(quantite)
@@ -204,56 +212,91 @@ class ModeleConsommationML:
         Returns:
             PredictionML
         """
+        return self.predire_lot([article], horizon_jours, date_depart)[0]
+
+    def predire_lot(
+        self,
+        articles: list[str],
+        horizon_jours: int = 7,
+        date_depart: datetime | None = None,
+    ) -> list[PredictionML]:
+        """Prédit la consommation de plusieurs articles en un seul appel au modèle.
+
+        La matrice ``articles × jours de l'horizon`` est transformée et
+        évaluée en une fois (au lieu d'un ``predict`` par article et par jour).
+
+        Args:
+            articles: Noms des articles
+            horizon_jours: Nombre de jours de prévision
+            date_depart: Date de début (défaut: maintenant)
+
+        Returns:
+            Une PredictionML par article, dans l'ordre
+        """
         date_depart = date_depart or datetime.now()
+        self._charger()
 
-        if self._modele is None or self._scaler is None:
+        if self._modele is None or self._scaler is None or not articles or horizon_jours < 1:
             # Fallback statistique
-            return PredictionML(
-                article=article,
-                quantite_predite=0.0,
-                confiance=0.0,
-                methode="statistique",
-                horizon_jours=horizon_jours,
-            )
+            return [
+                PredictionML(
+                    article=article,
+                    quantite_predite=0.0,
+                    confiance=0.0,
+                    methode="statistique",
+                    horizon_jours=horizon_jours,
+                )
+                for article in articles
+            ]
 
         try:
-            # Prédire pour chaque jour de l'horizon
-            predictions_jour = []
-            article_hash = float(hash(article.lower()) % 1000) / 1000.0
-
-            for j in range(horizon_jours):
-                dt = date_depart + timedelta(days=j)
-                features = self._extraire_features(dt)
-                features.append(article_hash)
-                x = np.array([features])
-                x_scaled = self._scaler.transform(x)
-                pred = max(0, self._modele.predict(x_scaled)[0])
-                predictions_jour.append(pred)
-
-            total = sum(predictions_jour)
-            # Intervalle de confiance simplifié (±20%)
-            ic_bas = total * 0.8
-            ic_haut = total * 1.2
-
-            confiance = min(1.0, 0.5 + len(self._articles_connus) / 100.0)
-            if article.lower() not in self._articles_connus:
-                confiance *= 0.5
-
-            return PredictionML(
-                article=article,
-                quantite_predite=round(total, 2),
-                intervalle_confiance=(round(ic_bas, 2), round(ic_haut, 2)),
-                confiance=round(confiance, 2),
-                methode="ml",
-                horizon_jours=horizon_jours,
+            # Features temporelles communes à tous les articles
+            jours = np.array(
+                [
+                    self._extraire_features(date_depart + timedelta(days=j))
+                    for j in range(horizon_jours)
+                ]
+            )
+            hashes = np.array([self._hash_article(article) for article in articles])
+            X = np.hstack(
+                [
+                    np.tile(jours, (len(articles), 1)),
+                    np.repeat(hashes, horizon_jours)[:, None],
+                ]
             )
+            predictions_jour = np.maximum(0, self._modele.predict(self._scaler.transform(X)))
+            totaux = predictions_jour.reshape(len(articles), horizon_jours).sum(axis=1)
+
+            confiance_base = min(1.0, 0.5 + len(self._articles_connus) / 100.0)
+            resultats = []
+            for article, total in zip(articles, totaux, strict=True):
+                total = float(total)
+                confiance = confiance_base
+                if article.lower() not in self._articles_connus:
+                    confiance *= 0.5
+
+                # Intervalle de confiance simplifié (±20%)
+                resultats.append(
+                    PredictionML(
+                        article=article,
+                        quantite_predite=round(total, 2),
+                        intervalle_confiance=(round(total * 0.8, 2), round(total * 1.2, 2)),
+                        confiance=round(confiance, 2),
+                        methode="ml",
+                        horizon_jours=horizon_jours,
+                    )
+                )
+            return resultats
 
         except Exception as e:
             logger.error(f"Erreur prédiction: {e}")
-            return PredictionML(
-                article=article,
-                quantite_predite=0.0,
-                confiance=0.0,
-                methode="erreur",
-                horizon_jours=horizon_jours,
-            )
+            return [
+                PredictionML(
+                    article=article,
+                    quantite_predite=0.0,
+                    confiance=0.0,
+                    methode="erreur",
+                    horizon_jours=horizon_jours,
+                )
+                for article in articles
+            ]
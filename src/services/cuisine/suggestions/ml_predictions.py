@@ -6,6 +6,7 @@ Les 3 modèles ML sont maintenant divisés en modules séparés:
 - ml_anomalies.py: DetecteurAnomaliesDepenses (Isolation Forest)
 - ml_satisfaction.py: ScoreSatisfactionRepas (RandomForestRegressor)
 - ml_schemas.py: Schémas Pydantic partagés (PredictionML, AnomalieDepense, ScoreRepas)
+- ml_registre.py: Registre processus des modèles (chargement unique, hot-swap)
 
 Ce fichier maintient la rétro-compatibilité des imports existants.
 """
@@ -0,0 +1,247 @@
+"""
+Registre des modèles ML — chargement unique, vérification de version, hot-swap.
+
+Les modèles sérialisés (``data/ml_models/*_model.pkl``) sont chargés une seule
+fois par processus et partagés entre toutes les instances de service:
+
+- Chargement via ``joblib.load(mmap_mode="r")``: les tableaux numpy des
+  modèles écrits par ``joblib.dump`` sont mappés en mémoire au lieu d'être
+  copiés (les anciens fichiers ``pickle`` restent lisibles)
+- Vérification de version: format de features attendu (refus si obsolète)
+  et version scikit-learn d'entraînement (avertissement si différente)
+- Hot-swap: un fichier republié (autre processus, cron d'entraînement) est
+  détecté par ``stat`` (au plus toutes les ``intervalle_verification`` s)
+  et rechargé; ``publier`` remplace le fichier de façon atomique
+
+Encodage déterministe des features catégorielles: ``hachage_stable`` et
+``EncodeurHachage`` (CRC32) ne dépendent ni de ``PYTHONHASHSEED`` ni de
+l'ordre des clés des dicts, contrairement à ``hash()``.
+
+Usage:
+    from src.services.cuisine.suggestions.ml_registre import obtenir_registre_modeles
+
+    entree = obtenir_registre_modeles().obtenir("satisfaction", format_attendu=2)
+    if entree:
+        entree.donnees["modele"].predict(X)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.services.core.registry import service_factory
+
+from .ml_schemas import MODELS_DIR
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "EncodeurHachage",
+    "ModeleCharge",
+    "RegistreModeles",
+    "hachage_stable",
+    "obtenir_registre_modeles",
+]
+
+CLE_FORMAT = "format_features"
+CLE_SKLEARN = "version_sklearn"
+
+
+# ═══════════════════════════════════════════════════════════
+# ENCODAGE DÉTERMINISTE
+# ═══════════════════════════════════════════════════════════
+
+
+def hachage_stable(texte: str, modulo: int = 1000) -> int:
+    """Hash stable entre processus (CRC32), dans ``[0, modulo)``."""
+    return zlib.crc32(texte.encode("utf-8")) % modulo
+
+
+class EncodeurHachage:
+    """Encodeur de features par hachage (« hashing trick ») déterministe.
+
+    Chaque paire ``cle=valeur`` (valeur textuelle) ou ``cle`` (valeur
+    numérique, pondérée par la valeur) est projetée sur un indice CRC32,
+    avec un signe dérivé du même hash pour limiter le biais des collisions.
+    Le résultat ne dépend pas de l'ordre des clés.
+
+    Args:
+        dimension: Nombre de colonnes produites
+    """
+
+    def __init__(self, dimension: int = 8):
+        self.dimension = max(1, dimension)
+
+    def _indice(self, jeton: str) -> tuple[int, float]:
+        h = zlib.crc32(jeton.encode("utf-8"))
+        return h % self.dimension, -1.0 if (h >> 31) & 1 else 1.0
+
+    def transformer(self, lignes: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Encode des dicts de features en matrice ``(n, dimension)``."""
+        lignes = list(lignes)
+        matrice = np.zeros((len(lignes), self.dimension), dtype=np.float64)
+        for i, ligne in enumerate(lignes):
+            for cle, valeur in ligne.items():
+                if valeur is None:
+                    continue
+                if isinstance(valeur, bool | int | float):
+                    indice, signe = self._indice(str(cle))
+                    matrice[i, indice] += signe * float(valeur)
+                else:
+                    indice, signe = self._indice(f"{cle}={str(valeur).strip().lower()}")
+                    matrice[i, indice] += signe
+        return matrice
+
+
+# ═══════════════════════════════════════════════════════════
+# REGISTRE
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class ModeleCharge:
+    """Modèle chargé et sa provenance."""
+
+    nom: str
+    donnees: dict[str, Any]
+    generation: int  # incrémentée à chaque (re)chargement
+    signature: tuple[int, int]  # (mtime_ns, taille) du fichier
+
+
+class RegistreModeles:
+    """Cache processus des modèles ML sérialisés.
+
+    Args:
+        dossier: Répertoire des fichiers ``<nom>_model.pkl``
+        intervalle_verification: Délai minimal (s) entre deux ``stat`` d'un
+            même fichier pour détecter une republication
+    """
+
+    def __init__(self, dossier: Path | str = MODELS_DIR, intervalle_verification: float = 5.0):
+        self.dossier = Path(dossier)
+        self.intervalle_verification = intervalle_verification
+        self._modeles: dict[str, ModeleCharge | None] = {}
+        self._verifie_le: dict[str, float] = {}
+        self._generation = 0
+        self._verrou = threading.RLock()
+
+    def chemin(self, nom: str) -> Path:
+        return self.dossier / f"{nom}_model.pkl"
+
+    def obtenir(self, nom: str, format_attendu: int = 1) -> ModeleCharge | None:
+        """Retourne le modèle ``nom`` (None si absent, illisible ou obsolète).
+
+        Le fichier n'est relu que s'il a changé depuis le dernier chargement.
+        """
+        maintenant = time.monotonic()
+        with self._verrou:
+            if (
+                nom in self._modeles
+                and maintenant - self._verifie_le.get(nom, 0.0) < self.intervalle_verification
+            ):
+                return self._modeles[nom]
+            self._verifie_le[nom] = maintenant
+
+            chemin = self.chemin(nom)
+            try:
+                stat = chemin.stat()
+            except OSError:
+                self._modeles[nom] = None
+                return None
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            courant = self._modeles.get(nom)
+            if courant is not None and courant.signature == signature:
+                return courant
+
+            donnees = self._lire(chemin)
+            if donnees is None or not self._version_valide(nom, donnees, format_attendu):
+                self._modeles[nom] = None
+                return None
+
+            self._generation += 1
+            entree = ModeleCharge(nom, donnees, self._generation, signature)
+            self._modeles[nom] = entree
+            logger.info(f"Modèle ML '{nom}' chargé (génération {entree.generation})")
+            return entree
+
+    def publier(self, nom: str, donnees: dict[str, Any], format_features: int = 1) -> ModeleCharge:
+        """Écrit un modèle de façon atomique et le rend immédiatement actif."""
+        import joblib
+
+        donnees = {**donnees, CLE_FORMAT: format_features, CLE_SKLEARN: _version_sklearn()}
+        chemin = self.chemin(nom)
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        temporaire = chemin.with_name(f".{chemin.name}.{os.getpid()}.tmp")
+        with self._verrou:
+            joblib.dump(donnees, temporaire)
+            os.replace(temporaire, chemin)
+            stat = chemin.stat()
+            self._generation += 1
+            entree = ModeleCharge(nom, donnees, self._generation, (stat.st_mtime_ns, stat.st_size))
+            self._modeles[nom] = entree
+            self._verifie_le[nom] = time.monotonic()
+            return entree
+
+    def oublier(self, nom: str | None = None) -> None:
+        """Vide le cache (un modèle ou tous); le prochain accès relit le disque."""
+        with self._verrou:
+            if nom is None:
+                self._modeles.clear()
+                self._verifie_le.clear()
+            else:
+                self._modeles.pop(nom, None)
+                self._verifie_le.pop(nom, None)
+
+    @staticmethod
+    def _lire(chemin: Path) -> dict[str, Any] | None:
+        try:
+            import joblib
+
+            donnees = joblib.load(chemin, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Erreur chargement modèle {chemin.name}: {e}")
+            return None
+        return donnees if isinstance(donnees, dict) else None
+
+    @staticmethod
+    def _version_valide(nom: str, donnees: dict[str, Any], format_attendu: int) -> bool:
+        format_fichier = int(donnees.get(CLE_FORMAT, 1))
+        if format_fichier != format_attendu:
+            logger.info(
+                f"Modèle ML '{nom}' ignoré: format de features {format_fichier} "
+                f"(attendu {format_attendu}), ré-entraînement nécessaire"
+            )
+            return False
+        version = donnees.get(CLE_SKLEARN)
+        if version and version != _version_sklearn():
+            logger.warning(
+                f"Modèle ML '{nom}' entraîné avec scikit-learn {version} "
+                f"(installé: {_version_sklearn()})"
+            )
+        return True
+
+
+def _version_sklearn() -> str | None:
+    try:
+        import sklearn
+
+        return sklearn.__version__
+    except ImportError:
+        return None
+
+
+@service_factory("registre_modeles_ml", tags={"cuisine", "ml"})
+def obtenir_registre_modeles() -> RegistreModeles:
+    """Registre processus des modèles ML (singleton)."""
+    return RegistreModeles()
@@ -14,24 +14,31 @@ Usage:
     scorer = ScoreSatisfactionRepas()
     scorer.entrainer(historique_repas)
     score = scorer.predire(recette_features)
+    scores = scorer.predire_lot(candidats_semaine)  # un seul predict
 """
 
 from __future__ import annotations
 
 import logging
-import pickle
 from datetime import datetime
 from statistics import mean
 from typing import Any
 
 import numpy as np
 
-from .ml_schemas import MODELS_DIR, ScoreRepas
+from .ml_registre import EncodeurHachage, RegistreModeles, obtenir_registre_modeles
+from .ml_schemas import ScoreRepas
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["ScoreSatisfactionRepas"]
 
+NOM_MODELE = "satisfaction"
+# v2: catégorie encodée par hachage (au lieu de son rang dans la liste apprise)
+FORMAT_FEATURES = 2
+_ENCODEUR_CATEGORIE = EncodeurHachage(dimension=8)
+_INDEX_WEEKEND = 4
+
 
 class ScoreSatisfactionRepas:
     """Prédit le score de satisfaction d'un repas.
@@ -44,58 +51,67 @@ class ScoreSatisfactionRepas:
     - Jour de la semaine
     """
 
-    def __init__(self):
+    def __init__(self, registre: RegistreModeles | None = None):
         self._modele = None
         self._scaler = None
         self._categories_recettes: list[str] = []
-        self._modele_path = MODELS_DIR / "satisfaction_model.pkl"
+        self._registre = registre or obtenir_registre_modeles()
+        self._generation = 0
+        self._modele_path = self._registre.chemin(NOM_MODELE)
         self._charger()
 
     def _charger(self) -> bool:
-        """Charge le modèle sérialisé."""
-        if self._modele_path.exists():
-            try:
-                with open(self._modele_path, "rb") as f:
-                    data = pickle.load(f)  # noqa: S301
-                self._modele = data.get("modele")
-                self._scaler = data.get("scaler")
-                self._categories_recettes = data.get("categories", [])
-                return True
-            except Exception:
-                pass
-        return False
+        """Synchronise l'instance avec le modèle partagé du registre."""
+        entree = self._registre.obtenir(NOM_MODELE, format_attendu=FORMAT_FEATURES)
+        if entree is None:
+            return False
+        if entree.generation != self._generation:
+            self._generation = entree.generation
+            self._modele = entree.donnees.get("modele")
+            self._scaler = entree.donnees.get("scaler")
+            self._categories_recettes = entree.donnees.get("categories", [])
+        return True
 
     def _sauvegarder(self) -> None:
-        """Sauvegarde le modèle."""
+        """Publie le modèle dans le registre (écriture atomique sur disque)."""
         try:
-            with open(self._modele_path, "wb") as f:
-                pickle.dump(
-                    {
-                        "modele": self._modele,
-                        "scaler": self._scaler,
-                        "categories": self._categories_recettes,
-                    },
-                    f,
-                )
+            entree = self._registre.publier(
+                NOM_MODELE,
+                {
+                    "modele": self._modele,
+                    "scaler": self._scaler,
+                    "categories": self._categories_recettes,
+                },
+                format_features=FORMAT_FEATURES,
+            )
+            self._generation = entree.generation
         except Exception as e:
             logger.warning(f"Erreur sauvegarde: {e}")
 
+    def _matrice_features(self, recettes: list[dict[str, Any]]) -> np.ndarray:
+        """Matrice ``(n, 6 + 8)``: features numériques + catégorie hachée."""
+        numeriques = np.array([self._preparer_features(r) for r in recettes], dtype=np.float64)
+        categories = _ENCODEUR_CATEGORIE.transformer(
+            {"categorie": r.get("categorie", "Autre")} for r in recettes
+        )
+        return np.hstack([numeriques.reshape(len(recettes), -1), categories])
+
     def _preparer_features(self, recette: dict[str, Any]) -> list[float]:
-        """Extrait les features d'une recette.
+        """Extrait les features numériques d'une recette.
 
         Features:
         - nb_ingredients
         - temps_preparation (min)
         - temps_cuisson (min)
-        - categorie_index
         - jour_semaine
         - est_weekend
         - nb_personnes
+
+        La catégorie est encodée à part par hachage (``_matrice_features``).
         """
         nb_ingredients = float(recette.get("nb_ingredients", 5))
         temps_prep = float(recette.get("temps_preparation", 30))
         temps_cuisson = float(recette.get("temps_cuisson", 30))
-        categorie = recette.get("categorie", "Autre")
         nb_personnes = float(recette.get("nb_personnes", 4))
 
         # Date (si disponible)
@@ -110,17 +126,10 @@ class ScoreSatisfactionRepas:
         except ValueError:
             dt = datetime.now()
 
-        cat_idx = (
-            self._categories_recettes.index(categorie)
-            if categorie in self._categories_recettes
-            else len(self._categories_recettes)
-        )
-
         return [
             nb_ingredients,
             temps_prep,
             temps_cuisson,
-            float(cat_idx),
             float(dt.weekday()),
             1.0 if dt.weekday() >= 5 else 0.0,
             nb_personnes,
@@ -149,18 +158,17 @@ class ScoreSatisfactionRepas:
                 set(r.get("categorie", "Autre") for r in historique_repas)
             )
 
-            X = []
-            y = []
-            for repas in historique_repas:
-                note = float(repas.get("note", 0))
-                if 0 <= note <= 5:
-                    X.append(self._preparer_features(repas))
-                    y.append(note)
+            notes = [
+                (repas, float(repas.get("note", 0)))
+                for repas in historique_repas
+                if 0 <= float(repas.get("note", 0)) <= 5
+            ]
 
-            if len(X) < 10:
+            if len(notes) < 10:
                 return {"trained": False, "reason": "insufficient_rated_data"}
 
-            X_arr = np.array(X)
+            X_arr = self._matrice_features([repas for repas, _ in notes])
+            y = [note for _, note in notes]
             y_arr = np.array(y)
 
             self._scaler = StandardScaler()
@@ -181,7 +189,7 @@ class ScoreSatisfactionRepas:
             return {
                 "trained": True,
                 "r2_score": round(score, 3),
-                "n_samples": len(X),
+                "n_samples": len(y),
                 "note_moyenne": round(mean(y), 2),
             }
 
@@ -203,46 +211,67 @@ class ScoreSatisfactionRepas:
         Returns:
             ScoreRepas
         """
-        nom = recette.get("nom", "Recette")
+        return self.predire_lot([recette])[0]
 
-        if not self._modele or not self._scaler:
-            return ScoreRepas(recette=nom, score_predit=3.0)
+    def predire_lot(
+        self,
+        recettes: list[dict[str, Any]],
+    ) -> list[ScoreRepas]:
+        """Prédit le score de satisfaction de plusieurs recettes en un appel.
 
-        try:
-            features = self._preparer_features(recette)
-            X = np.array([features])
-            X_scaled = self._scaler.transform(X)
-            score = float(self._modele.predict(X_scaled)[0])
-            score = max(0.0, min(5.0, score))
-
-            # Analyser les facteurs
-            facteurs_pos = []
-            facteurs_neg = []
-
-            temps_total = float(recette.get("temps_preparation", 30)) + float(
-                recette.get("temps_cuisson", 30)
-            )
-            if temps_total <= 30:
-                facteurs_pos.append("Préparation rapide")
-            elif temps_total > 90:
-                facteurs_neg.append("Temps de préparation long")
-
-            nb_ing = int(recette.get("nb_ingredients", 5))
-            if nb_ing <= 5:
-                facteurs_pos.append("Peu d'ingrédients")
-            elif nb_ing > 12:
-                facteurs_neg.append("Beaucoup d'ingrédients")
-
-            if features[5] == 1.0:  # Weekend
-                facteurs_pos.append("Weekend (plus de temps)")
-
-            return ScoreRepas(
-                recette=nom,
-                score_predit=round(score, 1),
-                facteurs_positifs=facteurs_pos,
-                facteurs_negatifs=facteurs_neg,
-            )
+        Typiquement la matrice des candidats d'une semaine (une ligne par
+        couple jour/recette, la date portant le jour): une seule
+        transformation et un seul ``predict`` pour l'ensemble.
+
+        Args:
+            recettes: Dicts avec features des recettes
 
+        Returns:
+            Un ScoreRepas par recette, dans l'ordre
+        """
+        self._charger()
+
+        if not self._modele or not self._scaler or not recettes:
+            return [ScoreRepas(recette=r.get("nom", "Recette"), score_predit=3.0) for r in recettes]
+
+        try:
+            X = self._matrice_features(recettes)
+            scores = np.clip(self._modele.predict(self._scaler.transform(X)), 0.0, 5.0)
         except Exception as e:
             logger.error(f"Erreur prédiction satisfaction: {e}")
-            return ScoreRepas(recette=nom, score_predit=3.0)
+            return [ScoreRepas(recette=r.get("nom", "Recette"), score_predit=3.0) for r in recettes]
+
+        return [
+            self._expliquer(recette, float(score), bool(X[i, _INDEX_WEEKEND]))
+            for i, (recette, score) in enumerate(zip(recettes, scores, strict=True))
+        ]
+
+    @staticmethod
+    def _expliquer(recette: dict[str, Any], score: float, weekend: bool) -> ScoreRepas:
+        """Construit le ScoreRepas et ses facteurs explicatifs."""
+        facteurs_pos = []
+        facteurs_neg = []
+
+        temps_total = float(recette.get("temps_preparation", 30)) + float(
+            recette.get("temps_cuisson", 30)
+        )
+        if temps_total <= 30:
+            facteurs_pos.append("Préparation rapide")
+        elif temps_total > 90:
+            facteurs_neg.append("Temps de préparation long")
+
+        nb_ing = int(recette.get("nb_ingredients", 5))
+        if nb_ing <= 5:
+            facteurs_pos.append("Peu d'ingrédients")
+        elif nb_ing > 12:
+            facteurs_neg.append("Beaucoup d'ingrédients")
+
+        if weekend:
+            facteurs_pos.append("Weekend (plus de temps)")
+
+        return ScoreRepas(
+            recette=recette.get("nom", "Recette"),
+            score_predit=round(score, 1),
+            facteurs_positifs=facteurs_pos,
+            facteurs_negatifs=facteurs_neg,
+        )
@@ -1 +1 @@
-"""Dashboard - Service de données pour la page d'accueil.Usage:    from src.services.dashboard import AccueilDataService, obtenir_accueil_data_service"""from .anomalies_financieres import (    ServiceAnomaliesFinancieres,    obtenir_service_anomalies_financieres,)from .resume_famille_ia import ResumeFamilleIAService, obtenir_service_resume_famille_iafrom .score_bienetre import ScoreBienEtreService, obtenir_score_bien_etre_servicefrom .score_foyer import ScoreFoyerService, obtenir_score_foyer_servicefrom .service import AccueilDataService, obtenir_accueil_data_service__all__ = [    "AccueilDataService",    "obtenir_accueil_data_service",    "ScoreBienEtreService",    "obtenir_score_bien_etre_service",    "ScoreFoyerService",    "obtenir_score_foyer_service",    "ResumeFamilleIAService",    "obtenir_service_resume_famille_ia",    "ServiceAnomaliesFinancieres",    "obtenir_service_anomalies_financieres",]
\ No newline at end of file
+"""Dashboard - Service de données pour la page d'accueil.Usage:    from src.services.dashboard import AccueilDataService, obtenir_accueil_data_service"""from .anomalies_financieres import (    ServiceAnomaliesFinancieres,    obtenir_service_anomalies_financieres,)from .resume_famille_ia import ResumeFamilleIAService, obtenir_service_resume_famille_iafrom .score_bienetre import ScoreBienEtreService, obtenir_score_bien_etre_servicefrom .score_foyer import ScoreFoyerService, obtenir_score_foyer_servicefrom .series_depenses import ServiceSeriesDepenses, obtenir_service_series_depensesfrom .service import AccueilDataService, obtenir_accueil_data_servicefrom .snapshot import ServiceSnapshotDashboard, obtenir_service_snapshot_dashboard__all__ = [    "AccueilDataService",    "obtenir_accueil_data_service",    "ScoreBienEtreService",    "obtenir_score_bien_etre_service",    "ScoreFoyerService",    "obtenir_score_foyer_service",    "ResumeFamilleIAService",    "obtenir_service_resume_famille_ia",    "ServiceAnomaliesFinancieres",    "obtenir_service_anomalies_financieres",    "ServiceSeriesDepenses",    "obtenir_service_series_depenses",    "ServiceSnapshotDashboard",    "obtenir_service_snapshot_dashboard",]
\ No newline at end of file
@@ -17,6 +17,7 @@ from typing import Any
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.core.db.periodes import filtre_mois
 from src.core.decorators import avec_gestion_erreurs, avec_session_db
 from src.services.core.registry import service_factory
 
@@ -130,8 +131,7 @@ class ScoreFoyerService:
             depenses_mois = (
                 db.query(func.sum(BudgetFamille.montant))
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois,
-                    func.extract("year", BudgetFamille.date) == annee,
+                    filtre_mois(BudgetFamille.date, annee, mois),
                 )
                 .scalar()
             ) or 0
@@ -0,0 +1,231 @@
+"""
+Séries de dépenses - matrices catégorie × mois en une seule requête.
+
+Les sources de dépenses (budget famille, dépenses maison) sont réunies par
+``UNION ALL`` puis agrégées par ``GROUP BY (categorie, mois)``: une fenêtre
+de 3 mois ou de 24 mois coûte le même aller-retour. Le résultat est une
+matrice numpy (lignes = catégories, colonnes = mois croissants) sur laquelle
+les scores d'anomalie sont calculés en bloc.
+
+Usage::
+
+    from src.services.dashboard.series_depenses import obtenir_service_series_depenses
+
+    matrice = obtenir_service_series_depenses().matrice_mensuelle(nb_mois=13)
+    scores = scorer_anomalies(matrice.valeurs, nb_reference=12)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+
+from src.core.db.periodes import (
+    bornes_mois,
+    cle_mois,
+    expression_index_mois,
+    index_mois,
+    mois_decale,
+)
+from src.core.decorators import avec_session_db
+from src.services.core.registry import service_factory
+
+# Constante de cohérence MAD → écart-type pour une loi normale
+_FACTEUR_MAD = 0.6745
+
+
+# ═══════════════════════════════════════════════════════════
+# MATRICE CATÉGORIE × MOIS
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class MatriceDepenses:
+    """Montants agrégés: ``valeurs[i, j]`` = catégorie ``i``, mois ``j``."""
+
+    categories: list[str]
+    mois: list[str]
+    valeurs: np.ndarray = field(repr=False)
+
+    def colonne(self, cle: str) -> dict[str, float]:
+        """Montants non nuls d'un mois, par catégorie."""
+        if cle not in self.mois:
+            return {}
+        j = self.mois.index(cle)
+        return {
+            cat: float(montant)
+            for cat, montant in zip(self.categories, self.valeurs[:, j], strict=True)
+            if montant
+        }
+
+    def serie(self, categorie: str) -> dict[str, float]:
+        """Série mensuelle complète d'une catégorie (zéros compris)."""
+        if categorie not in self.categories:
+            return dict.fromkeys(self.mois, 0.0)
+        i = self.categories.index(categorie)
+        return dict(zip(self.mois, map(float, self.valeurs[i]), strict=True))
+
+
+def _requete_agregee(debut: int, fin: int):
+    """
+    SELECT unique: UNION ALL des sources, agrégé par (categorie, index de mois).
+
+    ``debut``/``fin`` sont des index de mois inclus. Les bornes de date
+    restent sargables côté budget famille (index sur ``date``) et sur
+    ``annee`` côté dépenses maison.
+    """
+    from src.core.models import BudgetFamille
+    from src.core.models.finances import DepenseMaison
+
+    date_debut, _ = bornes_mois(debut // 12, debut % 12 + 1)
+    _, date_fin = bornes_mois(fin // 12, fin % 12 + 1)
+
+    # Index de mois plutôt que date_trunc: même clé de groupement sur les deux
+    # sources (DepenseMaison stocke annee/mois) et portable PostgreSQL/SQLite.
+    index_famille = expression_index_mois(BudgetFamille.date)
+    index_maison = DepenseMaison.annee * 12 + DepenseMaison.mois - 1
+
+    sources = union_all(
+        select(
+            BudgetFamille.categorie.label("categorie"),
+            index_famille.label("mois_index"),
+            BudgetFamille.montant.label("montant"),
+        ).where(BudgetFamille.date >= date_debut, BudgetFamille.date < date_fin),
+        select(
+            DepenseMaison.categorie.label("categorie"),
+            index_maison.label("mois_index"),
+            DepenseMaison.montant.label("montant"),
+        ).where(
+            DepenseMaison.annee.between(debut // 12, fin // 12),
+            index_maison.between(debut, fin),
+        ),
+    ).subquery("sources_depenses")
+
+    return select(
+        sources.c.categorie,
+        sources.c.mois_index,
+        func.sum(sources.c.montant),
+    ).group_by(sources.c.categorie, sources.c.mois_index)
+
+
+class ServiceSeriesDepenses:
+    """Agrège les dépenses de toutes les sources en matrice catégorie × mois."""
+
+    @avec_session_db
+    def matrice_mensuelle(
+        self,
+        fin: date | None = None,
+        nb_mois: int = 12,
+        normaliser: Callable[[str | None], str] | None = None,
+        db: Session | None = None,
+    ) -> MatriceDepenses:
+        """
+        Matrice des ``nb_mois`` mois se terminant au mois de ``fin`` (inclus).
+
+        Args:
+            fin: Date du dernier mois de la fenêtre (aujourd'hui par défaut).
+            nb_mois: Largeur de la fenêtre; n'affecte pas le nombre de requêtes.
+            normaliser: Regroupement optionnel des catégories brutes.
+        """
+        if nb_mois < 1:
+            raise ValueError(f"nb_mois doit être >= 1: {nb_mois}")
+        ref = fin or date.today()
+        index_fin = index_mois(ref.year, ref.month)
+        index_debut = index_mois(*mois_decale(ref.year, ref.month, -(nb_mois - 1)))
+
+        lignes = db.execute(_requete_agregee(index_debut, index_fin)).all()
+
+        noms = [normaliser(c) if normaliser else (c or "autre") for c, _, _ in lignes]
+        ordre = sorted(set(noms))
+        position = {nom: i for i, nom in enumerate(ordre)}
+
+        valeurs = np.zeros((len(ordre), nb_mois))
+        if lignes:
+            rangs = np.array([position[nom] for nom in noms])
+            colonnes = np.array([int(m) for _, m, _ in lignes]) - index_debut
+            montants = np.array([float(total or 0.0) for _, _, total in lignes])
+            # add.at cumule les catégories brutes fusionnées par ``normaliser``
+            np.add.at(valeurs, (rangs, colonnes), montants)
+
+        return MatriceDepenses(
+            categories=ordre,
+            mois=[cle_mois(k) for k in range(index_debut, index_fin + 1)],
+            valeurs=valeurs,
+        )
+
+
+# ═══════════════════════════════════════════════════════════
+# SCORES D'ANOMALIE VECTORISÉS
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class ScoresAnomalies:
+    """Scores du dernier mois de la matrice, un élément par catégorie (NaN si indéfini)."""
+
+    courant: np.ndarray
+    moyenne: np.ndarray
+    variation_pct: np.ndarray
+    zscore: np.ndarray
+    score_robuste: np.ndarray
+    variation_saisonniere_pct: np.ndarray
+    mois_actifs: np.ndarray
+
+
+def _ratio(numerateur: np.ndarray, denominateur: np.ndarray) -> np.ndarray:
+    """Division élément par élément, NaN là où le dénominateur est nul."""
+    resultat = np.full(numerateur.shape, np.nan)
+    np.divide(numerateur, denominateur, out=resultat, where=denominateur > 0)
+    return resultat
+
+
+def scorer_anomalies(valeurs: np.ndarray, nb_reference: int = 12) -> ScoresAnomalies:
+    """
+    Compare la dernière colonne aux ``nb_reference`` mois qui la précèdent.
+
+    - ``variation_pct``: écart relatif à la moyenne de référence;
+    - ``zscore``: écart en écarts-types (ddof=1);
+    - ``score_robuste``: z-score modifié médiane/MAD, insensible aux pics isolés;
+    - ``variation_saisonniere_pct``: écart au même mois de l'année précédente
+      (si la matrice couvre au moins 13 mois).
+    """
+    if valeurs.ndim != 2 or valeurs.shape[1] < 2:
+        raise ValueError("La matrice doit contenir au moins deux mois")
+    courant = valeurs[:, -1]
+    reference = valeurs[:, -1 - min(nb_reference, valeurs.shape[1] - 1) : -1]
+
+    moyenne = reference.mean(axis=1)
+    ecart = courant - moyenne
+    if reference.shape[1] > 1:
+        ecart_type = reference.std(axis=1, ddof=1)
+    else:
+        ecart_type = np.zeros_like(moyenne)
+    mediane = np.median(reference, axis=1)
+    mad = np.median(np.abs(reference - mediane[:, None]), axis=1)
+
+    if valeurs.shape[1] >= 13:
+        saison = valeurs[:, -13]
+        variation_saisonniere = _ratio(courant - saison, saison) * 100
+    else:
+        variation_saisonniere = np.full(courant.shape, np.nan)
+
+    return ScoresAnomalies(
+        courant=courant,
+        moyenne=moyenne,
+        variation_pct=_ratio(ecart, moyenne) * 100,
+        zscore=_ratio(ecart, ecart_type),
+        score_robuste=_ratio(_FACTEUR_MAD * (courant - mediane), mad),
+        variation_saisonniere_pct=variation_saisonniere,
+        mois_actifs=np.count_nonzero(reference, axis=1),
+    )
+
+
+@service_factory("series_depenses", tags={"dashboard", "budget"})
+def obtenir_service_series_depenses() -> ServiceSeriesDepenses:
+    """Factory singleton du service de séries de dépenses."""
+    return ServiceSeriesDepenses()
@@ -0,0 +1,437 @@
+"""
+Service de snapshot agrégé du tableau de bord principal.
+
+Remplace la quinzaine de requêtes scalaires séquentielles de
+``GET /api/v1/dashboard`` par :
+- une seule requête agrégée (sous-requêtes scalaires dans un même SELECT)
+  pour tous les compteurs et sommes ;
+- quatre petites requêtes de listes (budget par catégorie, activités,
+  péremptions, repas du jour) ;
+- un cache par utilisateur invalidé par les événements du bus ;
+- un snapshot précalculé (cron) stocké dans ``etats_persistants`` et
+  partagé par tous les workers.
+
+Chemin chaud : cache (0 aller-retour DB) → snapshot persistant (1) →
+recalcul complet (5, au lieu de ~16).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.core.decorators import avec_session_db
+from src.services.core.registry import service_factory
+
+logger = logging.getLogger(__name__)
+
+# Préfixe des clés de cache (aussi utilisé comme pattern d'invalidation)
+PREFIXE_CACHE = "dashboard_snapshot"
+TTL_CACHE_SECONDES = 120
+
+# Stockage du snapshot précalculé dans etats_persistants
+NAMESPACE_SNAPSHOT = "dashboard_snapshot"
+USER_ID_SNAPSHOT = "foyer"
+
+# Événements du bus qui rendent le snapshot obsolète
+EVENEMENTS_INVALIDATION = (
+    "recette.*",
+    "planning.*",
+    "entretien.*",
+    "activites.*",
+    "stock.*",
+    "inventaire.*",
+    "budget.*",
+    "depenses.*",
+    "documents.*",
+    "habitat.*",
+    "jardin.*",
+    "projets.*",
+)
+
+
+class ServiceSnapshotDashboard:
+    """Construit, met en cache et précalcule le snapshot du tableau de bord."""
+
+    # ═══════════════════════════════════════════════════════════
+    # LECTURE
+    # ═══════════════════════════════════════════════════════════
+
+    def obtenir_snapshot(
+        self, user_id: str = "default", db: Session | None = None
+    ) -> dict[str, Any]:
+        """Retourne le snapshot du jour (cache → snapshot persistant → recalcul)."""
+        from src.core.caching import obtenir_cache
+
+        cache = obtenir_cache()
+        cle = self._cle_cache(user_id)
+
+        snapshot = cache.get(cle)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = self.lire_snapshot_persistant(db=db)
+        if snapshot is None:
+            snapshot = self.calculer_snapshot(db=db)
+            self.enregistrer_snapshot(snapshot, db=db)
+
+        cache.set(cle, snapshot, ttl=TTL_CACHE_SECONDES, tags=["dashboard"])
+        return snapshot
+
+    @avec_session_db
+    def lire_snapshot_persistant(
+        self, aujourd_hui: date | None = None, db: Session | None = None
+    ) -> dict[str, Any] | None:
+        """Lit le snapshot précalculé s'il date d'aujourd'hui (1 aller-retour)."""
+        from src.core.models import EtatPersistantDB
+
+        aujourd_hui = aujourd_hui or date.today()
+        try:
+            data = db.execute(
+                select(EtatPersistantDB.data).where(
+                    EtatPersistantDB.namespace == NAMESPACE_SNAPSHOT,
+                    EtatPersistantDB.user_id == USER_ID_SNAPSHOT,
+                )
+            ).scalar_one_or_none()
+        except Exception as e:
+            logger.debug("[dashboard] Snapshot persistant illisible: %s", e)
+            return None
+
+        if not isinstance(data, dict) or data.get("date") != aujourd_hui.isoformat():
+            return None
+        return data.get("snapshot")
+
+    # ═══════════════════════════════════════════════════════════
+    # CALCUL
+    # ═══════════════════════════════════════════════════════════
+
+    @avec_session_db
+    def calculer_snapshot(
+        self, aujourd_hui: date | None = None, db: Session | None = None
+    ) -> dict[str, Any]:
+        """Calcule le snapshot complet du tableau de bord."""
+        aujourd_hui = aujourd_hui or date.today()
+
+        agregats = self._requete_agregats(db, aujourd_hui)
+        budget_par_cat = self._budget_par_categorie(db, aujourd_hui)
+        prochaines = self._prochaines_activites(db, aujourd_hui)
+        alertes = self._alertes(db, aujourd_hui, agregats)
+        repas_aujourd_hui = self._repas_du_jour(db, aujourd_hui)
+
+        return {
+            "statistiques": {
+                "recettes_total": agregats["recettes_total"],
+                "repas_planifies_semaine": agregats["repas_semaine"],
+                "articles_courses": 0,
+                "taches_entretien_en_retard": agregats["taches_retard"],
+                "activites_a_venir": agregats["activites_a_venir"],
+                "stocks_en_alerte": agregats["stocks_alerte"],
+            },
+            "budget_mois": {
+                "total_mois": float(agregats["budget_total"]),
+                "par_categorie": budget_par_cat,
+            },
+            "habitat": {
+                "alertes": int(agregats["habitat_alertes"]),
+                "budget_deco_depense": float(agregats["budget_deco"]),
+                "zones_jardin": int(agregats["zones_jardin"]),
+            },
+            "prochaines_activites": prochaines,
+            "alertes": alertes,
+            "repas_aujourd_hui": repas_aujourd_hui,
+        }
+
+    def _requete_agregats(self, db: Session, aujourd_hui: date) -> dict[str, Any]:
+        """Tous les compteurs/sommes du dashboard en un seul aller-retour DB."""
+        from src.core.models import (
+            ActiviteFamille,
+            AnnonceHabitat,
+            BudgetFamille,
+            DocumentFamille,
+            ProjetDecoHabitat,
+            Recette,
+            Repas,
+            StockMaison,
+            TacheEntretien,
+            ZoneJardinHabitat,
+        )
+
+        debut_semaine = aujourd_hui - timedelta(days=aujourd_hui.weekday())
+        fin_semaine = debut_semaine + timedelta(days=6)
+        debut_mois = aujourd_hui.replace(day=1)
+
+        def _scalaire(expression, *criteres):
+            sous_requete = select(expression)
+            if criteres:
+                sous_requete = sous_requete.where(*criteres)
+            return sous_requete.scalar_subquery()
+
+        documents_actifs = (
+            DocumentFamille.date_expiration.isnot(None),
+            DocumentFamille.actif.is_(True),
+        )
+
+        requete = select(
+            _scalaire(func.count(Recette.id)).label("recettes_total"),
+            _scalaire(
+                func.count(Repas.id),
+                Repas.date_repas >= debut_semaine,
+                Repas.date_repas <= fin_semaine,
+            ).label("repas_semaine"),
+            _scalaire(
+                func.count(TacheEntretien.id),
+                TacheEntretien.prochaine_fois < aujourd_hui,
+                TacheEntretien.fait == False,  # noqa: E712
+            ).label("taches_retard"),
+            _scalaire(
+                func.count(ActiviteFamille.id),
+                ActiviteFamille.date_prevue >= aujourd_hui,
+                ActiviteFamille.date_prevue <= aujourd_hui + timedelta(days=7),
+            ).label("activites_a_venir"),
+            _scalaire(
+                func.count(StockMaison.id),
+                StockMaison.quantite <= StockMaison.seuil_alerte,
+            ).label("stocks_alerte"),
+            _scalaire(
+                func.sum(BudgetFamille.montant),
+                BudgetFamille.date >= debut_mois,
+            ).label("budget_total"),
+            _scalaire(
+                func.count(AnnonceHabitat.id),
+                AnnonceHabitat.statut.in_(["alerte", "nouveau"]),
+            ).label("habitat_alertes"),
+            _scalaire(func.sum(ProjetDecoHabitat.budget_depense)).label("budget_deco"),
+            _scalaire(func.count(ZoneJardinHabitat.id)).label("zones_jardin"),
+            _scalaire(
+                func.count(DocumentFamille.id),
+                *documents_actifs,
+                DocumentFamille.date_expiration < aujourd_hui,
+            ).label("docs_expires"),
+            _scalaire(
+                func.count(DocumentFamille.id),
+                *documents_actifs,
+                DocumentFamille.date_expiration >= aujourd_hui,
+                DocumentFamille.date_expiration <= aujourd_hui + timedelta(days=30),
+            ).label("docs_bientot"),
+        )
+
+        ligne = db.execute(requete).mappings().one()
+        return {cle: (valeur or 0) for cle, valeur in ligne.items()}
+
+    def _budget_par_categorie(self, db: Session, aujourd_hui: date) -> dict[str, float]:
+        from src.core.models import BudgetFamille
+
+        lignes = db.execute(
+            select(BudgetFamille.categorie, func.sum(BudgetFamille.montant))
+            .where(BudgetFamille.date >= aujourd_hui.replace(day=1))
+            .group_by(BudgetFamille.categorie)
+        ).all()
+        return {cat: float(total or 0) for cat, total in lignes}
+
+    def _prochaines_activites(self, db: Session, aujourd_hui: date) -> list[dict[str, Any]]:
+        from src.core.models import ActiviteFamille
+
+        lignes = db.execute(
+            select(
+                ActiviteFamille.id,
+                ActiviteFamille.titre,
+                ActiviteFamille.date_prevue,
+                ActiviteFamille.type_activite,
+                ActiviteFamille.lieu,
+            )
+            .where(ActiviteFamille.date_prevue >= aujourd_hui)
+            .order_by(ActiviteFamille.date_prevue.asc())
+            .limit(5)
+        ).all()
+        return [
+            {
+                "id": a.id,
+                "titre": a.titre,
+                "date_prevue": a.date_prevue.isoformat(),
+                "type_activite": a.type_activite,
+                "lieu": a.lieu,
+            }
+            for a in lignes
+        ]
+
+    def _alertes(
+        self, db: Session, aujourd_hui: date, agregats: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Alertes péremption (1 requête) + alertes dérivées des agrégats."""
+        from src.core.models import ArticleInventaire, Ingredient
+
+        alertes: list[dict[str, Any]] = []
+        try:
+            # ArticleInventaire.nom est une propriété Python: nom lu sur l'ingrédient
+            perissables = db.execute(
+                select(Ingredient.nom, ArticleInventaire.date_peremption)
+                .join(ArticleInventaire.ingredient)
+                .where(
+                    ArticleInventaire.date_peremption.isnot(None),
+                    ArticleInventaire.date_peremption <= aujourd_hui + timedelta(days=7),
+                    ArticleInventaire.date_peremption >= aujourd_hui,
+                )
+                .order_by(ArticleInventaire.date_peremption.asc())
+                .limit(10)
+            ).all()
+            for nom, date_peremption in perissables:
+                jours = (date_peremption - aujourd_hui).days
+                alertes.append(
+                    {
+                        "type": "peremption",
+                        "message": f"{nom} expire dans {jours} jour(s)",
+                        "urgence": "haute" if jours <= 2 else "moyenne",
+                    }
+                )
+        except Exception as e:
+            logger.warning("[dashboard] Alertes péremption non chargées: %s", e)
+
+        stocks_alerte = agregats["stocks_alerte"]
+        if stocks_alerte > 0:
+            alertes.append(
+                {
+                    "type": "stock",
+                    "message": f"{stocks_alerte} stock(s) maison en alerte",
+                    "urgence": "moyenne",
+                }
+            )
+
+        habitat_alertes = agregats["habitat_alertes"]
+        if habitat_alertes > 0:
+            alertes.append(
+                {
+                    "type": "habitat",
+                    "message": f"{habitat_alertes} annonce(s) habitat a qualifier",
+                    "urgence": "moyenne",
+                }
+            )
+
+        taches_retard = agregats["taches_retard"]
+        if taches_retard > 0:
+            alertes.append(
+                {
+                    "type": "entretien",
+                    "message": f"{taches_retard} tâche(s) d'entretien en retard",
+                    "urgence": "haute" if taches_retard > 3 else "moyenne",
+                }
+            )
+
+        if agregats["docs_expires"] > 0:
+            alertes.append(
+                {
+                    "type": "document_expire",
+                    "message": f"{agregats['docs_expires']} document(s) expiré(s) à renouveler",
+                    "urgence": "haute",
+                }
+            )
+        if agregats["docs_bientot"] > 0:
+            alertes.append(
+                {
+                    "type": "document_bientot",
+                    "message": f"{agregats['docs_bientot']} document(s) expirent dans les 30 jours",
+                    "urgence": "moyenne",
+                }
+            )
+
+        return alertes
+
+    def _repas_du_jour(self, db: Session, aujourd_hui: date) -> list[dict[str, Any]]:
+        """Repas du jour avec le nom de recette joint (pas de lazy-load par repas)."""
+        from src.core.models import Recette, Repas
+
+        try:
+            lignes = db.execute(
+                select(Repas.type_repas, Recette.nom, Repas.notes)
+                .outerjoin(Recette, Repas.recette_id == Recette.id)
+                .where(Repas.date_repas == aujourd_hui)
+            ).all()
+        except Exception as e:
+            logger.warning("[dashboard] Repas du jour non chargés: %s", e)
+            return []
+
+        return [
+            {"type_repas": type_repas, "recette_nom": nom if nom else notes}
+            for type_repas, nom, notes in lignes
+        ]
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTANCE & INVALIDATION
+    # ═══════════════════════════════════════════════════════════
+
+    @avec_session_db
+    def enregistrer_snapshot(
+        self,
+        snapshot: dict[str, Any],
+        aujourd_hui: date | None = None,
+        db: Session | None = None,
+    ) -> bool:
+        """Persiste le snapshot du jour dans ``etats_persistants`` (best-effort)."""
+        from src.core.models import EtatPersistantDB
+
+        aujourd_hui = aujourd_hui or date.today()
+        try:
+            ligne = (
+                db.query(EtatPersistantDB)
+                .filter(
+                    EtatPersistantDB.namespace == NAMESPACE_SNAPSHOT,
+                    EtatPersistantDB.user_id == USER_ID_SNAPSHOT,
+                )
+                .first()
+            )
+            if ligne is None:
+                ligne = EtatPersistantDB(namespace=NAMESPACE_SNAPSHOT, user_id=USER_ID_SNAPSHOT)
+                db.add(ligne)
+            ligne.data = {
+                "date": aujourd_hui.isoformat(),
+                "calcule_le": datetime.now().isoformat(),
+                "snapshot": snapshot,
+            }
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.debug("[dashboard] Snapshot non persisté: %s", e)
+            return False
+
+    def precalculer(self) -> dict[str, Any]:
+        """Recalcule et persiste le snapshot (job cron), puis purge le cache."""
+        snapshot = self.calculer_snapshot()
+        self.enregistrer_snapshot(snapshot)
+        self._invalider_cache()
+        return snapshot
+
+    @avec_session_db
+    def invalider(self, db: Session | None = None) -> int:
+        """Invalide le cache et le snapshot persistant. Retourne le nb d'entrées cache purgées."""
+        from src.core.models import EtatPersistantDB
+
+        try:
+            db.query(EtatPersistantDB).filter(
+                EtatPersistantDB.namespace == NAMESPACE_SNAPSHOT,
+                EtatPersistantDB.user_id == USER_ID_SNAPSHOT,
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.debug("[dashboard] Snapshot persistant non supprimé: %s", e)
+
+        return self._invalider_cache()
+
+    def _invalider_cache(self) -> int:
+        from src.core.caching import obtenir_cache
+
+        return obtenir_cache().invalidate(pattern=PREFIXE_CACHE)
+
+    @staticmethod
+    def _cle_cache(user_id: str) -> str:
+        return f"{PREFIXE_CACHE}_{user_id}"
+
+
+@service_factory("snapshot_dashboard", tags={"dashboard"})
+def obtenir_service_snapshot_dashboard() -> ServiceSnapshotDashboard:
+    """Factory singleton du service de snapshot dashboard."""
+    return ServiceSnapshotDashboard()
@@ -31,9 +31,9 @@ from datetime import date as date_type
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import extract
 from sqlalchemy.orm import Session
 
+from src.core.db.periodes import filtre_mois
 from src.core.decorators import avec_cache, avec_gestion_erreurs, avec_session_db
 from src.core.models import BudgetFamille, BudgetMensuelDB
 from src.services.core.base import BaseService
@@ -321,8 +321,7 @@ class BudgetService(BaseService[BudgetFamille], BudgetAnalysesMixin, BudgetAlert
         """
 
         query = db.query(BudgetFamille).filter(
-            extract("month", BudgetFamille.date) == mois,
-            extract("year", BudgetFamille.date) == annee,
+            filtre_mois(BudgetFamille.date, annee, mois),
         )
 
         if categorie:
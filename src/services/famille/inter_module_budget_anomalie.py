@@ -9,8 +9,9 @@ import logging
 from datetime import date, timedelta
 from typing import Any
 
-from sqlalchemy import extract, func
+from sqlalchemy import func
 
+from src.core.db.periodes import filtre_mois
 from src.core.decorators import avec_gestion_erreurs, avec_session_db
 from src.services.core.registry import service_factory
 
@@ -76,8 +77,7 @@ class BudgetAnomalieNotificationService:
                 func.sum(Depense.montant),
             )
             .filter(
-                extract("month", Depense.date) == mois_courant,
-                extract("year", Depense.date) == annee_courante,
+                filtre_mois(Depense.date, annee_courante, mois_courant),
                 Depense.categorie.in_(CATEGORIES_SURVEILLEES),
             )
             .group_by(Depense.categorie)
@@ -91,8 +91,7 @@ class BudgetAnomalieNotificationService:
                 func.sum(Depense.montant),
             )
             .filter(
-                extract("month", Depense.date) == mois_prec,
-                extract("year", Depense.date) == annee_prec,
+                filtre_mois(Depense.date, annee_prec, mois_prec),
                 Depense.categorie.in_(CATEGORIES_SURVEILLEES),
             )
             .group_by(Depense.categorie)
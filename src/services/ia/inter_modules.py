@@ -206,7 +206,7 @@ def _on_budget_modifie(event: EvenementDomaine) -> None:
 
 def _on_batch_cooking_termine(event: EvenementDomaine) -> None:
     """Handler: Fin de session batch cooking → notification Telegram (E6)."""
-    import asyncio
+    from src.core.async_utils import executer_async
 
     try:
         session_id = event.data.get("session_id")
@@ -216,7 +216,7 @@ def _on_batch_cooking_termine(event: EvenementDomaine) -> None:
 
         from src.services.integrations.telegram import envoyer_confirmation_batch_cooking
 
-        asyncio.run(
+        executer_async(
             envoyer_confirmation_batch_cooking(
                 nom_session=nom_session,
                 nb_recettes=nb_recettes,
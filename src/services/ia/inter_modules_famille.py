@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.core.db.periodes import filtre_mois
 from src.core.decorators import avec_gestion_erreurs, avec_session_db
 
 if TYPE_CHECKING:
@@ -230,8 +231,7 @@ class FamilleBridgesMixin:
         lignes = (
             db.query(BudgetFamille)
             .filter(
-                func.extract("month", BudgetFamille.date) == mois_cible,
-                func.extract("year", BudgetFamille.date) == annee_cible,
+                filtre_mois(BudgetFamille.date, annee_cible, mois_cible),
             )
             .all()
         )
@@ -304,8 +304,7 @@ class FamilleBridgesMixin:
         lignes_famille = (
             db.query(BudgetFamille)
             .filter(
-                func.extract("month", BudgetFamille.date) == mois_cible,
-                func.extract("year", BudgetFamille.date) == annee_cible,
+                filtre_mois(BudgetFamille.date, annee_cible, mois_cible),
             )
             .all()
         )
@@ -336,8 +335,7 @@ class FamilleBridgesMixin:
         total_prec_famille = float(
             db.query(func.coalesce(func.sum(BudgetFamille.montant), 0))
             .filter(
-                func.extract("month", BudgetFamille.date) == mois_prec,
-                func.extract("year", BudgetFamille.date) == annee_prec,
+                filtre_mois(BudgetFamille.date, annee_prec, mois_prec),
             )
             .scalar()
         )
@@ -490,8 +488,7 @@ class FamilleBridgesMixin:
         depenses_mois = float(
             db.query(func.coalesce(func.sum(BudgetFamille.montant), 0))
             .filter(
-                func.extract("month", BudgetFamille.date) == mois_actuel,
-                func.extract("year", BudgetFamille.date) == annee_actuelle,
+                filtre_mois(BudgetFamille.date, annee_actuelle, mois_actuel),
             )
             .scalar()
         )
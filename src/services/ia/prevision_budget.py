@@ -11,6 +11,7 @@ from datetime import date, timedelta
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.core.db.periodes import filtre_mois
 from src.core.decorators import avec_gestion_erreurs, avec_session_db
 from src.services.core.base import BaseAIService
 from src.services.core.registry import service_factory
@@ -56,8 +57,7 @@ class PrevisionBudgetService(BaseAIService):
         depenses_mois = (
             db.query(func.sum(BudgetFamille.montant))
             .filter(
-                func.extract("month", BudgetFamille.date) == mois,
-                func.extract("year", BudgetFamille.date) == annee,
+                filtre_mois(BudgetFamille.date, annee, mois),
             )
             .scalar()
             or 0
@@ -70,8 +70,7 @@ class PrevisionBudgetService(BaseAIService):
                 func.sum(BudgetFamille.montant).label("total"),
             )
             .filter(
-                func.extract("month", BudgetFamille.date) == mois,
-                func.extract("year", BudgetFamille.date) == annee,
+                filtre_mois(BudgetFamille.date, annee, mois),
             )
             .group_by(BudgetFamille.categorie)
             .all()
@@ -95,8 +94,7 @@ class PrevisionBudgetService(BaseAIService):
         depenses_mois_prec = (
             db.query(func.sum(BudgetFamille.montant))
             .filter(
-                func.extract("month", BudgetFamille.date) == mois_prec,
-                func.extract("year", BudgetFamille.date) == annee_prec,
+                filtre_mois(BudgetFamille.date, annee_prec, mois_prec),
             )
             .scalar()
             or 0
@@ -116,8 +114,7 @@ class PrevisionBudgetService(BaseAIService):
             cat_prec = (
                 db.query(func.sum(BudgetFamille.montant))
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois_prec,
-                    func.extract("year", BudgetFamille.date) == annee_prec,
+                    filtre_mois(BudgetFamille.date, annee_prec, mois_prec),
                     BudgetFamille.categorie == cat,
                 )
                 .scalar()
@@ -176,8 +173,7 @@ class PrevisionBudgetService(BaseAIService):
                 func.sum(BudgetFamille.montant).label("total"),
             )
             .filter(
-                func.extract("month", BudgetFamille.date) == mois,
-                func.extract("year", BudgetFamille.date) == annee,
+                filtre_mois(BudgetFamille.date, annee, mois),
             )
             .group_by(BudgetFamille.categorie)
             .all()
@@ -191,8 +187,7 @@ class PrevisionBudgetService(BaseAIService):
             budget_ref = (
                 db.query(func.sum(BudgetFamille.montant))
                 .filter(
-                    func.extract("month", BudgetFamille.date) == mois_prec,
-                    func.extract("year", BudgetFamille.date) == annee_prec,
+                    filtre_mois(BudgetFamille.date, annee_prec, mois_prec),
                     BudgetFamille.categorie == cat,
                 )
                 .scalar()
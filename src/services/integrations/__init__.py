@@ -1 +1 @@
-"""Intégrations externes - Services d'intégration avec APIs tiercesCe package regroupe tous les services d'intégration externe:- Codes-barres (scan et validation)- OpenFoodFacts (enrichissement produits)- OCR Factures (extraction données factures)Utilisation:    from src.services.integrations import (        BarcodeService,        obtenir_service_codes_barres,        OpenFoodFactsService,        obtenir_openfoodfacts_service,        FactureOCRService,        obtenir_facture_ocr_service,    )"""# ═══════════════════════════════════════════════════════════# CODES-BARRES# ═══════════════════════════════════════════════════════════# ═══════════════════════════════════════════════════════════# MÉTÉO (TRANSVERSAL) - réexportation depuis weather/# ═══════════════════════════════════════════════════════════from .codes_barres import (    BarcodeArticle,    # Schémas Pydantic    BarcodeData,    BarcodeRecette,    # Service    BarcodeService,    ScanResultat,    obtenir_service_codes_barres,)# ═══════════════════════════════════════════════════════════# FACTURE OCR# ═══════════════════════════════════════════════════════════from .facture import (    # Helpers    PATTERNS_FOURNISSEURS,    PATTERNS_MONTANTS,    # Schémas Pydantic    DonneesFacture,    # Service    FactureOCRService,    ResultatOCR,    detecter_fournisseur,    extraire_montant,    obtenir_facture_ocr_service,)from .multimodal import (    MultiModalAIService,    obtenir_multimodal_service,)# ═══════════════════════════════════════════════════════════# OPENFOODFACTS# ═══════════════════════════════════════════════════════════from .produit import (    CACHE_TTL,    # Constantes    OPENFOODFACTS_API,    OPENFOODFACTS_SEARCH,    # Dataclasses    NutritionInfo,    # Service    OpenFoodFactsService,    ProduitOpenFoodFacts,    obtenir_openfoodfacts_service,)from .weather import (    AlerteMeteo,    ConseilJardin,    MeteoJour,    PlanArrosage,    ServiceMeteo,    obtenir_service_meteo,)from .webhooks import (    WebhookService,    obtenir_webhook_service,)# ═══════════════════════════════════════════════════════════# EXPORTS# ═══════════════════════════════════════════════════════════__all__ = [    # Codes-barres    "BarcodeService",    "obtenir_service_codes_barres",    "BarcodeData",    "BarcodeArticle",    "BarcodeRecette",    "ScanResultat",    # OpenFoodFacts    "OpenFoodFactsService",    "obtenir_openfoodfacts_service",    "NutritionInfo",    "ProduitOpenFoodFacts",    "OPENFOODFACTS_API",    "OPENFOODFACTS_SEARCH",    "CACHE_TTL",    # Facture OCR    "FactureOCRService",    "obtenir_facture_ocr_service",    "DonneesFacture",    "ResultatOCR",    "PATTERNS_FOURNISSEURS",    "PATTERNS_MONTANTS",    "detecter_fournisseur",    "extraire_montant",    # Météo    "ServiceMeteo",    "obtenir_service_meteo",    "MeteoJour",    "AlerteMeteo",    "ConseilJardin",    "PlanArrosage",    # Multimodal    "MultiModalAIService",    "obtenir_multimodal_service",    # Webhooks    "WebhookService",    "obtenir_webhook_service",]
\ No newline at end of file
+"""Intégrations externes - Services d'intégration avec APIs tiercesCe package regroupe tous les services d'intégration externe:- Codes-barres (scan et validation)- OpenFoodFacts (enrichissement produits)- OCR Factures (extraction données factures)Utilisation:    from src.services.integrations import (        BarcodeService,        obtenir_service_codes_barres,        OpenFoodFactsService,        obtenir_openfoodfacts_service,        FactureOCRService,        obtenir_facture_ocr_service,    )"""# ═══════════════════════════════════════════════════════════# CODES-BARRES# ═══════════════════════════════════════════════════════════# ═══════════════════════════════════════════════════════════# MÉTÉO (TRANSVERSAL) - réexportation depuis weather/# ═══════════════════════════════════════════════════════════from .codes_barres import (    BarcodeArticle,    # Schémas Pydantic    BarcodeData,    BarcodeRecette,    # Service    BarcodeService,    ScanResultat,    obtenir_service_codes_barres,)# ═══════════════════════════════════════════════════════════# FACTURE OCR# ═══════════════════════════════════════════════════════════from .facture import (    # Helpers    PATTERNS_FOURNISSEURS,    PATTERNS_MONTANTS,    # Schémas Pydantic    DonneesFacture,    # Service    FactureOCRService,    ResultatOCR,    detecter_fournisseur,    extraire_montant,    obtenir_facture_ocr_service,)# ═══════════════════════════════════════════════════════════# OPENFOODFACTS# ═══════════════════════════════════════════════════════════from .magasin_produits import (    MagasinProduits,    obtenir_magasin_produits,)from .multimodal import (    MultiModalAIService,    obtenir_multimodal_service,)from .produit import (    CACHE_TTL,    # Constantes    OPENFOODFACTS_API,    OPENFOODFACTS_SEARCH,    # Dataclasses    NutritionInfo,    # Service    OpenFoodFactsService,    ProduitOpenFoodFacts,    obtenir_openfoodfacts_service,)from .weather import (    AlerteMeteo,    ConseilJardin,    MeteoJour,    PlanArrosage,    ServiceMeteo,    obtenir_service_meteo,)from .webhooks import (    WebhookService,    obtenir_webhook_service,)# ═══════════════════════════════════════════════════════════# EXPORTS# ═══════════════════════════════════════════════════════════__all__ = [    # Codes-barres    "BarcodeService",    "obtenir_service_codes_barres",    "BarcodeData",    "BarcodeArticle",    "BarcodeRecette",    "ScanResultat",    # OpenFoodFacts    "OpenFoodFactsService",    "obtenir_openfoodfacts_service",    "NutritionInfo",    "ProduitOpenFoodFacts",    "OPENFOODFACTS_API",    "OPENFOODFACTS_SEARCH",    "CACHE_TTL",    "MagasinProduits",    "obtenir_magasin_produits",    # Facture OCR    "FactureOCRService",    "obtenir_facture_ocr_service",    "DonneesFacture",    "ResultatOCR",    "PATTERNS_FOURNISSEURS",    "PATTERNS_MONTANTS",    "detecter_fournisseur",    "extraire_montant",    # Météo    "ServiceMeteo",    "obtenir_service_meteo",    "MeteoJour",    "AlerteMeteo",    "ConseilJardin",    "PlanArrosage",    # Multimodal    "MultiModalAIService",    "obtenir_multimodal_service",    # Webhooks    "WebhookService",    "obtenir_webhook_service",]
\ No newline at end of file
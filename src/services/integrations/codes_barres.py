@@ -216,11 +216,32 @@ class BarcodeService(BaseService[ArticleInventaire]):
 
         # Évolution possible : vérifier dans les recettes avant de renvoyer "inconnu"
 
-        return ScanResultat(
-            barcode=code,
-            type_scan="inconnu",
-            details={"message": "Code non reconnu - doit être ajouté"},
-        )
+        details: dict[str, Any] = {"message": "Code non reconnu - doit être ajouté"}
+
+        # Pré-remplissage depuis le magasin OpenFoodFacts local (sans appel réseau)
+        produit = self._identifier_produit(code)
+        if produit is not None:
+            details["produit"] = {
+                "nom": produit.nom,
+                "marque": produit.marque,
+                "quantite": produit.quantite,
+                "categories": produit.categories,
+                "nutriscore": produit.nutrition.nutriscore if produit.nutrition else None,
+                "image_url": produit.image_thumb_url or produit.image_url,
+            }
+
+        return ScanResultat(barcode=code, type_scan="inconnu", details=details)
+
+    @staticmethod
+    def _identifier_produit(code: str):
+        """Cherche le produit dans le cache/magasin OpenFoodFacts local."""
+        try:
+            from src.services.integrations.produit import obtenir_service_openfoodfacts
+
+            return obtenir_service_openfoodfacts().rechercher_local(code)
+        except Exception as e:
+            logger.debug(f"Identification OpenFoodFacts locale impossible pour {code}: {e}")
+            return None
 
     # ═══════════════════════════════════════════════════════════
     # GESTION ARTICLES PAR BARCODE
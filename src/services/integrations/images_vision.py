@@ -0,0 +1,205 @@
+"""
+Préparation des images envoyées aux modèles vision.
+
+- ``pretraiter_image``: orientation EXIF appliquée, réduction à la
+  résolution utile du modèle (décodage JPEG directement à l'échelle réduite
+  via ``Image.draft``), réencodage JPEG de qualité bornée sous un budget
+  d'octets. Une photo de téléphone de 4-8 Mo devient ~150-300 Ko.
+- ``empreinte_perceptuelle``: dHash (différences de luminosité entre
+  pixels voisins d'une miniature en niveaux de gris), stable au
+  recadrage léger, à la compression et aux variations d'exposition.
+- ``CachePerceptuel``: résultats d'analyse indexés par empreinte; une image
+  quasi identique (même plat photographié deux fois) réutilise le résultat
+  précédent au lieu d'un nouvel appel vision. Les documents lus mot à mot
+  (tickets, recettes écrites) n'utilisent qu'une correspondance exacte: deux
+  tickets de même mise en page ont des dHash très proches.
+
+Pillow est optionnel: sans lui, les images sont transmises telles quelles
+et le cache perceptuel est inactif.
+"""
+
+from __future__ import annotations
+
+import copy
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+COTE_MAX_VISION = 1024
+"""Plus grand côté utile (pixtral redimensionne au-delà de 1024 px)."""
+
+QUALITE_JPEG = 85
+QUALITE_JPEG_MIN = 55
+TAILLE_MAX_OCTETS = 400_000
+
+TAILLE_EMPREINTE = 16  # dHash 16×16 = 256 bits
+SEUIL_HAMMING = 3  # ~1 % des bits: recompression / léger recadrage seulement
+
+
+@dataclass(frozen=True)
+class ImagePretraitee:
+    """Image prête pour l'appel vision."""
+
+    donnees: bytes
+    mime: str
+    largeur: int
+    hauteur: int
+    taille_origine: int
+    empreinte: int | None = None
+
+
+def _ouvrir(donnees: bytes, cote_max: int) -> Any:
+    """Ouvre l'image, décodée à l'échelle utile et orientée selon l'EXIF."""
+    image = Image.open(io.BytesIO(donnees))
+    # JPEG: décodage DCT à 1/2, 1/4 ou 1/8 si suffisant (beaucoup plus rapide)
+    image.draft("RGB", (cote_max, cote_max))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        fond = Image.new("RGB", image.size, "white")
+        fond.paste(image, mask=image.getchannel("A"))
+        return fond
+    return image.convert("RGB")
+
+
+def empreinte_perceptuelle(image: Any, taille: int = TAILLE_EMPREINTE) -> int:
+    """dHash d'une image PIL: un bit par paire de pixels voisins (taille² bits)."""
+    gris = image.convert("L").resize((taille + 1, taille), Image.Resampling.BILINEAR)
+    pixels = gris.tobytes()
+    empreinte = 0
+    for ligne in range(taille):
+        base = ligne * (taille + 1)
+        for colonne in range(taille):
+            empreinte = (empreinte << 1) | (pixels[base + colonne] > pixels[base + colonne + 1])
+    return empreinte
+
+
+def distance_hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def pretraiter_image(
+    donnees: bytes,
+    cote_max: int = COTE_MAX_VISION,
+    qualite: int = QUALITE_JPEG,
+    taille_max_octets: int = TAILLE_MAX_OCTETS,
+) -> ImagePretraitee | None:
+    """Réduit et réencode une image en JPEG pour un modèle vision.
+
+    La qualité baisse par paliers de 10 (jusqu'à ``QUALITE_JPEG_MIN``) tant
+    que le résultat dépasse ``taille_max_octets``. Un JPEG déjà à la bonne
+    taille, droit et dans le budget est transmis tel quel.
+
+    Returns:
+        Image prétraitée, ou None (Pillow absent, image illisible)
+    """
+    if Image is None:
+        return None
+    try:
+        image = _ouvrir(donnees, cote_max)
+    except Exception as e:
+        logger.debug(f"Prétraitement image impossible: {e}")
+        return None
+
+    image.thumbnail((cote_max, cote_max), Image.Resampling.LANCZOS)
+    empreinte = empreinte_perceptuelle(image)
+
+    tampon = io.BytesIO()
+    while True:
+        tampon.seek(0)
+        tampon.truncate()
+        image.save(tampon, format="JPEG", quality=qualite, optimize=True)
+        if tampon.tell() <= taille_max_octets or qualite <= QUALITE_JPEG_MIN:
+            break
+        qualite = max(QUALITE_JPEG_MIN, qualite - 10)
+
+    sortie = tampon.getvalue()
+    if donnees[:3] == b"\xff\xd8\xff" and len(donnees) <= taille_max_octets:
+        # JPEG déjà conforme: pas de seconde perte de compression
+        with Image.open(io.BytesIO(donnees)) as origine:
+            if origine.size == image.size and origine.getexif().get(0x0112, 1) == 1:
+                sortie = donnees
+    return ImagePretraitee(sortie, "image/jpeg", *image.size, len(donnees), empreinte)
+
+
+class CachePerceptuel:
+    """Résultats d'analyse d'images retrouvés par proximité d'empreinte.
+
+    Les entrées sont cloisonnées par espace (tâche + prompt): seul un même
+    type d'analyse peut être réutilisé. Recherche linéaire par distance de
+    Hamming (quelques centaines d'entrées: ~0,1 ms), éviction LRU et TTL.
+
+    Args:
+        seuil: Distance de Hamming maximale pour un quasi-doublon
+        capacite: Nombre maximal d'entrées (toutes tâches confondues)
+        ttl: Durée de vie d'une entrée (secondes)
+    """
+
+    def __init__(self, seuil: int = SEUIL_HAMMING, capacite: int = 512, ttl: float = 86400.0):
+        self.seuil = seuil
+        self.capacite = capacite
+        self.ttl = ttl
+        self._entrees: OrderedDict[tuple[str, int], tuple[Any, float]] = OrderedDict()
+        self._verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+
+    def obtenir(self, espace: str, empreinte: int, seuil: int | None = None) -> Any | None:
+        """Résultat d'une image quasi identique du même espace, ou None.
+
+        Args:
+            seuil: Distance maximale pour cet appel (0 = empreinte exacte);
+                par défaut celle du cache
+        """
+        limite = time.monotonic() - self.ttl
+        seuil = self.seuil if seuil is None else seuil
+        with self._verrou:
+            meilleure: tuple[str, int] | None = None
+            distance_min = seuil + 1
+            for cle, (_, horodatage) in self._entrees.items():
+                if cle[0] != espace or horodatage < limite:
+                    continue
+                distance = distance_hamming(cle[1], empreinte)
+                if distance < distance_min:
+                    meilleure, distance_min = cle, distance
+            if meilleure is None:
+                self.echecs += 1
+                return None
+            self._entrees.move_to_end(meilleure)
+            self.succes += 1
+            resultat = self._entrees[meilleure][0]
+        logger.debug(f"Cache perceptuel: quasi-doublon ({espace}, distance {distance_min})")
+        return copy.deepcopy(resultat)
+
+    def definir(self, espace: str, empreinte: int, resultat: Any) -> None:
+        with self._verrou:
+            self._entrees[(espace, empreinte)] = (copy.deepcopy(resultat), time.monotonic())
+            self._entrees.move_to_end((espace, empreinte))
+            while len(self._entrees) > self.capacite:
+                self._entrees.popitem(last=False)
+
+    def vider(self) -> None:
+        with self._verrou:
+            self._entrees.clear()
+            self.succes = self.echecs = 0
+
+
+__all__ = [
+    "CachePerceptuel",
+    "ImagePretraitee",
+    "distance_hamming",
+    "empreinte_perceptuelle",
+    "pretraiter_image",
+]
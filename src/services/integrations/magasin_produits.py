@@ -0,0 +1,375 @@
+"""
+Magasin local de produits OpenFoodFacts — lookup code-barres sans réseau.
+
+Niveaux consultés par ``OpenFoodFactsService.rechercher_produit``:
+
+1. Cache mémoire du processus (``obtenir_cache``)
+2. Magasin local (ce module): fichier SQLite indexé sur le code-barres,
+   lu via ``mmap``; survit aux redémarrages des workers
+3. API OpenFoodFacts (optionnelle, rafraîchissement) — le résultat est
+   réécrit dans le magasin
+
+Le magasin se charge en masse depuis un export OpenFoodFacts (JSONL,
+éventuellement gzippé, ou Parquet) et garde un cache négatif (avec TTL)
+des codes inconnus pour ne pas réinterroger l'API à chaque scan.
+
+Usage:
+    from src.services.integrations.magasin_produits import MagasinProduits
+
+    magasin = MagasinProduits("data/openfoodfacts/produits.sqlite")
+    magasin.charger_export("openfoodfacts-products.jsonl.gz")
+    magasin.obtenir("3017620422003")  # → dict brut OpenFoodFacts compacté
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+from src.services.core.registry import service_factory
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════
+# CONSTANTES
+# ═══════════════════════════════════════════════════════════
+
+# Cache négatif: un code inconnu d'OpenFoodFacts n'est pas réinterrogé pendant 7 jours
+TTL_INCONNU = 7 * 86400
+
+TAILLE_LOT_IMPORT = 5000
+
+# Fenêtre mmap (les pages chaudes restent dans le cache de l'OS)
+TAILLE_MMAP = 256 * 1024 * 1024
+
+INCONNU = object()
+"""Sentinelle renvoyée par ``obtenir`` pour un code en cache négatif."""
+
+# Champs OpenFoodFacts lus par ``OpenFoodFactsService._parser_produit``
+CHAMPS_PRODUIT = (
+    "product_name_fr",
+    "product_name",
+    "generic_name_fr",
+    "generic_name",
+    "brands",
+    "quantity",
+    "categories_tags_fr",
+    "categories_tags",
+    "labels_tags_fr",
+    "labels_tags",
+    "allergens_tags",
+    "traces_tags",
+    "image_front_url",
+    "image_front_small_url",
+    "ingredients_text_fr",
+    "ingredients_text",
+    "origins",
+    "conservation_conditions",
+    "nutriscore_grade",
+    "nova_group",
+    "ecoscore_grade",
+    "completeness",
+)
+
+NUTRIMENTS = (
+    "energy-kcal_100g",
+    "proteins_100g",
+    "carbohydrates_100g",
+    "sugars_100g",
+    "fat_100g",
+    "saturated-fat_100g",
+    "fiber_100g",
+    "salt_100g",
+)
+
+
+# ═══════════════════════════════════════════════════════════
+# NORMALISATION
+# ═══════════════════════════════════════════════════════════
+
+
+def _texte_localise(valeur: Any, langue: str = "fr") -> Any:
+    """Aplatit les champs texte multilingues de l'export Parquet (``[{lang, text}]``)."""
+    if not isinstance(valeur, list) or not valeur or not isinstance(valeur[0], dict):
+        return valeur
+    par_langue = {v.get("lang"): v.get("text") for v in valeur if isinstance(v, dict)}
+    return par_langue.get(langue) or par_langue.get("main") or next(iter(par_langue.values()))
+
+
+def _nutriments(valeur: Any) -> dict[str, Any]:
+    """Garde les nutriments utiles, depuis un dict (API/JSONL) ou une liste (Parquet)."""
+    if isinstance(valeur, dict):
+        return {k: valeur[k] for k in NUTRIMENTS if valeur.get(k) is not None}
+    if isinstance(valeur, list):
+        resultat = {}
+        for n in valeur:
+            if isinstance(n, dict) and n.get("100g") is not None:
+                cle = f"{n.get('name')}_100g"
+                if cle in NUTRIMENTS:
+                    resultat[cle] = n["100g"]
+        return resultat
+    return {}
+
+
+def compacter_produit(donnees: dict[str, Any]) -> dict[str, Any]:
+    """Réduit un produit OpenFoodFacts brut aux champs utilisés par l'application."""
+    compact = {}
+    for champ in CHAMPS_PRODUIT:
+        valeur = donnees.get(champ)
+        if hasattr(valeur, "tolist"):  # tableaux numpy/pyarrow
+            valeur = valeur.tolist()
+        if champ in ("product_name", "generic_name", "ingredients_text"):
+            valeur = _texte_localise(valeur)
+        if valeur is None or valeur == "" or valeur == []:
+            continue
+        compact[champ] = valeur
+    nutriments = _nutriments(donnees.get("nutriments"))
+    if nutriments:
+        compact["nutriments"] = nutriments
+    return compact
+
+
+# ═══════════════════════════════════════════════════════════
+# MAGASIN
+# ═══════════════════════════════════════════════════════════
+
+
+class MagasinProduits:
+    """Magasin de produits OpenFoodFacts sur fichier SQLite local.
+
+    Une connexion par thread (SQLite n'est pas partageable entre threads),
+    mode WAL pour des lectures concurrentes pendant un import.
+
+    Args:
+        chemin: Fichier SQLite (``":memory:"`` pour un magasin éphémère)
+        ttl_inconnu: Durée du cache négatif (secondes)
+    """
+
+    def __init__(self, chemin: Path | str, ttl_inconnu: int = TTL_INCONNU):
+        self.chemin = str(chemin)
+        self.ttl_inconnu = ttl_inconnu
+        self._local = threading.local()
+        self._connexion_partagee: sqlite3.Connection | None = None
+        self._verrou_memoire = threading.Lock()
+        self._stats = {"hits": 0, "hits_negatifs": 0, "absents": 0}
+        if self.chemin != ":memory:":
+            Path(self.chemin).parent.mkdir(parents=True, exist_ok=True)
+        self._creer_schema()
+
+    # ─── Connexion ───
+
+    def _connexion(self) -> sqlite3.Connection:
+        if self.chemin == ":memory:":
+            # Une base mémoire n'existe que pour sa connexion: partagée, sérialisée
+            if self._connexion_partagee is None:
+                self._connexion_partagee = sqlite3.connect(":memory:", check_same_thread=False)
+            return self._connexion_partagee
+
+        connexion = getattr(self._local, "connexion", None)
+        if connexion is None:
+            connexion = sqlite3.connect(self.chemin, timeout=5.0)
+            connexion.execute("PRAGMA journal_mode=WAL")
+            connexion.execute("PRAGMA synchronous=NORMAL")
+            connexion.execute(f"PRAGMA mmap_size={TAILLE_MMAP}")
+            self._local.connexion = connexion
+        return connexion
+
+    def _verrou(self):
+        return self._verrou_memoire if self.chemin == ":memory:" else nullcontext()
+
+    def _executer(self, sql: str, parametres: Iterable[Any] = ()) -> list[tuple]:
+        connexion = self._connexion()
+        with self._verrou():
+            return connexion.execute(sql, tuple(parametres)).fetchall()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture (commit à la sortie, rollback sur erreur)."""
+        connexion = self._connexion()
+        with self._verrou(), connexion:
+            yield connexion
+
+    def _creer_schema(self) -> None:
+        with self._transaction() as connexion:
+            connexion.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS produits (
+                    code TEXT PRIMARY KEY,
+                    donnees TEXT NOT NULL,
+                    maj REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS codes_inconnus (
+                    code TEXT PRIMARY KEY,
+                    expire REAL NOT NULL
+                ) WITHOUT ROWID;
+                """
+            )
+
+    # ─── Lecture ───
+
+    def obtenir(self, code: str) -> dict[str, Any] | object | None:
+        """Recherche un code-barres dans le magasin.
+
+        Returns:
+            Dict produit compacté, ``INCONNU`` si le code est en cache négatif,
+            None si le magasin ne sait rien de ce code
+        """
+        lignes = self._executer("SELECT donnees FROM produits WHERE code = ?", (code,))
+        if lignes:
+            self._stats["hits"] += 1
+            return json.loads(lignes[0][0])
+
+        lignes = self._executer("SELECT expire FROM codes_inconnus WHERE code = ?", (code,))
+        if lignes and lignes[0][0] > time.time():
+            self._stats["hits_negatifs"] += 1
+            return INCONNU
+
+        self._stats["absents"] += 1
+        return None
+
+    # ─── Écriture ───
+
+    def enregistrer(self, code: str, donnees: dict[str, Any]) -> None:
+        """Ajoute ou remplace un produit (et lève un éventuel cache négatif)."""
+        self._ecrire_lot([(code, compacter_produit(donnees))])
+
+    def marquer_inconnu(self, code: str, ttl: int | None = None) -> None:
+        """Mémorise qu'un code est inconnu d'OpenFoodFacts pendant ``ttl`` secondes."""
+        expire = time.time() + (self.ttl_inconnu if ttl is None else ttl)
+        with self._transaction() as connexion:
+            connexion.execute(
+                "INSERT OR REPLACE INTO codes_inconnus (code, expire) VALUES (?, ?)",
+                (code, expire),
+            )
+
+    def _ecrire_lot(self, produits: list[tuple[str, dict[str, Any]]]) -> None:
+        maintenant = time.time()
+        lignes = [
+            (code, json.dumps(donnees, ensure_ascii=False, separators=(",", ":")), maintenant)
+            for code, donnees in produits
+        ]
+        with self._transaction() as connexion:
+            connexion.executemany(
+                "INSERT OR REPLACE INTO produits (code, donnees, maj) VALUES (?, ?, ?)", lignes
+            )
+            connexion.executemany(
+                "DELETE FROM codes_inconnus WHERE code = ?", [(ligne[0],) for ligne in lignes]
+            )
+
+    # ─── Import en masse ───
+
+    def charger_export(self, chemin: Path | str, taille_lot: int = TAILLE_LOT_IMPORT) -> int:
+        """Charge un export OpenFoodFacts (``.jsonl``, ``.jsonl.gz`` ou ``.parquet``).
+
+        Les produits sont compactés puis écrits par lots d'une transaction.
+
+        Args:
+            chemin: Fichier d'export
+            taille_lot: Produits par transaction
+
+        Returns:
+            Nombre de produits chargés
+        """
+        chemin = Path(chemin)
+        if chemin.suffix == ".parquet":
+            source = _lire_parquet(chemin)
+        else:
+            source = _lire_jsonl(chemin)
+
+        total = 0
+        lot: list[tuple[str, dict[str, Any]]] = []
+        for produit in source:
+            code = str(produit.get("code") or produit.get("_id") or "").strip()
+            if not code:
+                continue
+            lot.append((code, compacter_produit(produit)))
+            if len(lot) >= taille_lot:
+                self._ecrire_lot(lot)
+                total += len(lot)
+                lot = []
+        if lot:
+            self._ecrire_lot(lot)
+            total += len(lot)
+
+        logger.info(f"Magasin OpenFoodFacts: {total} produits chargés depuis {chemin.name}")
+        return total
+
+    # ─── Maintenance ───
+
+    def purger_inconnus_expires(self) -> int:
+        """Supprime les entrées de cache négatif expirées."""
+        with self._transaction() as connexion:
+            curseur = connexion.execute(
+                "DELETE FROM codes_inconnus WHERE expire <= ?", (time.time(),)
+            )
+        return curseur.rowcount
+
+    def statistiques(self) -> dict[str, int]:
+        """Volumes du magasin et compteurs de lookups du processus."""
+        return {
+            "produits": self._executer("SELECT COUNT(*) FROM produits")[0][0],
+            "codes_inconnus": self._executer("SELECT COUNT(*) FROM codes_inconnus")[0][0],
+            **self._stats,
+        }
+
+
+# ═══════════════════════════════════════════════════════════
+# LECTEURS D'EXPORT
+# ═══════════════════════════════════════════════════════════
+
+
+def _lire_jsonl(chemin: Path) -> Iterator[dict[str, Any]]:
+    ouvrir = gzip.open if chemin.suffix == ".gz" else open
+    with ouvrir(chemin, "rt", encoding="utf-8") as flux:
+        for ligne in flux:
+            if not ligne.strip():
+                continue
+            try:
+                yield json.loads(ligne)
+            except json.JSONDecodeError:
+                continue
+
+
+def _lire_parquet(chemin: Path) -> Iterator[dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow est requis pour charger un export Parquet") from e
+
+    fichier = pq.ParquetFile(chemin)
+    colonnes = [
+        c for c in ("code", *CHAMPS_PRODUIT, "nutriments") if c in fichier.schema_arrow.names
+    ]
+    for lot in fichier.iter_batches(columns=colonnes, batch_size=TAILLE_LOT_IMPORT):
+        yield from lot.to_pylist()
+
+
+# ═══════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════
+
+
+@service_factory("magasin_produits", tags={"integrations", "cache"})
+def obtenir_magasin_produits() -> MagasinProduits:
+    """Factory pour le magasin local de produits (chemin: ``OFF_MAGASIN_LOCAL``)."""
+    from src.core.config import obtenir_parametres
+
+    return MagasinProduits(obtenir_parametres().OFF_MAGASIN_LOCAL)
+
+
+__all__ = [
+    "INCONNU",
+    "MagasinProduits",
+    "TTL_INCONNU",
+    "compacter_produit",
+    "obtenir_magasin_produits",
+]
@@ -3,6 +3,10 @@ Service OpenFoodFacts - Enrichissement des produits par code-barres
 
 Récupère les informations nutritionnelles et descriptives depuis
 l'API gratuite OpenFoodFacts.
+
+Recherche par code-barres à plusieurs niveaux: cache mémoire, magasin local
+(``magasin_produits``, chargé depuis un export OpenFoodFacts), puis API en
+ligne en rafraîchissement optionnel.
 """
 
 import logging
@@ -12,7 +16,13 @@ from datetime import datetime
 import httpx
 
 from src.core.caching import obtenir_cache
+from src.core.config import obtenir_parametres
 from src.core.decorators import avec_gestion_erreurs, avec_resilience
+from src.services.integrations.magasin_produits import (
+    INCONNU,
+    MagasinProduits,
+    obtenir_magasin_produits,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -107,28 +117,95 @@ class OpenFoodFactsService:
     - Images produit
     """
 
-    def __init__(self):
+    def __init__(self, magasin: MagasinProduits | None = None, live: bool | None = None):
+        parametres = obtenir_parametres()
         self.cache = obtenir_cache()
         self.timeout = 10.0
         self.user_agent = "AssistantMatanne/1.0 (contact@example.com)"
+        self.live = parametres.OFF_RECHERCHE_LIVE if live is None else live
+        self.magasin = magasin
+        if magasin is None and parametres.OFF_MAGASIN_LOCAL:
+            try:
+                self.magasin = obtenir_magasin_produits()
+            except Exception as e:
+                logger.warning(f"Magasin local OpenFoodFacts indisponible: {e}")
 
-    @avec_resilience(retry=2, timeout_s=10, fallback=None)
     def rechercher_produit(self, code_barres: str) -> ProduitOpenFoodFacts | None:
         """
         Recherche un produit par son code-barres.
 
+        Consulte le cache mémoire puis le magasin local; l'API n'est appelée
+        que si le code y est absent (ni produit, ni cache négatif) et que la
+        recherche en ligne est activée.
+
         Args:
             code_barres: Code EAN-13, EAN-8 ou UPC
 
         Returns:
             ProduitOpenFoodFacts ou None si non trouvé
         """
-        # Vérifier le cache
+        produit, inconnu = self._consulter_local(code_barres)
+        if produit is not None or inconnu or not self.live:
+            return produit
+
+        return self.rafraichir_produit(code_barres)
+
+    def rechercher_local(self, code_barres: str) -> ProduitOpenFoodFacts | None:
+        """
+        Recherche un produit sans appel réseau (cache mémoire puis magasin local).
+
+        Args:
+            code_barres: Code EAN-13, EAN-8 ou UPC
+
+        Returns:
+            ProduitOpenFoodFacts ou None si absent localement
+        """
+        return self._consulter_local(code_barres)[0]
+
+    def _consulter_local(self, code_barres: str) -> tuple[ProduitOpenFoodFacts | None, bool]:
+        """Cache mémoire puis magasin local.
+
+        Returns:
+            (produit ou None, True si le code est en cache négatif)
+        """
         cache_key = f"off_product_{code_barres}"
         cached = self.cache.get(cache_key)
         if cached:
             logger.debug(f"Cache hit pour {code_barres}")
-            return cached
+            return cached, False
+
+        if self.magasin is None:
+            return None, False
+
+        try:
+            donnees = self.magasin.obtenir(code_barres)
+        except Exception as e:
+            logger.debug(f"Lecture magasin local échouée pour {code_barres}: {e}")
+            return None, False
+
+        if not isinstance(donnees, dict):
+            return None, donnees is INCONNU
+
+        result = self._parser_produit(code_barres, donnees)
+        result.source = "openfoodfacts_local"
+        self.cache.set(cache_key, result, ttl=CACHE_TTL)
+        return result, False
+
+    @avec_resilience(retry=2, timeout_s=10, fallback=None)
+    def rafraichir_produit(self, code_barres: str) -> ProduitOpenFoodFacts | None:
+        """
+        Interroge l'API OpenFoodFacts et met à jour le magasin local.
+
+        Un code inconnu d'OpenFoodFacts est mémorisé en cache négatif; une
+        erreur réseau ou HTTP ne l'est pas.
+
+        Args:
+            code_barres: Code EAN-13, EAN-8 ou UPC
+
+        Returns:
+            ProduitOpenFoodFacts ou None si non trouvé
+        """
+        cache_key = f"off_product_{code_barres}"
 
         try:
             url = f"{OPENFOODFACTS_API}/{code_barres}.json"
@@ -144,6 +221,7 @@ class OpenFoodFactsService:
 
                 if data.get("status") != 1:
                     logger.info(f"Produit {code_barres} non trouvé sur OpenFoodFacts")
+                    self._memoriser(code_barres, None)
                     return None
 
                 product = data.get("product", {})
@@ -152,6 +230,7 @@ class OpenFoodFactsService:
                 # Mettre en cache
                 if result:
                     self.cache.set(cache_key, result, ttl=CACHE_TTL)
+                    self._memoriser(code_barres, product)
 
                 return result
 
@@ -162,7 +241,20 @@ class OpenFoodFactsService:
             logger.error(f"Erreur OpenFoodFacts: {e}")
             return None
 
-    def _parser_produit(self, code_barres: str, data: dict) -> ProduitOpenFoodFacts:
+    def _memoriser(self, code_barres: str, product: dict | None) -> None:
+        """Écrit le résultat de l'API dans le magasin local (None = code inconnu)."""
+        if self.magasin is None:
+            return
+        try:
+            if product is None:
+                self.magasin.marquer_inconnu(code_barres)
+            else:
+                self.magasin.enregistrer(code_barres, product)
+        except Exception as e:
+            logger.debug(f"Écriture magasin local échouée pour {code_barres}: {e}")
+
+    @staticmethod
+    def _parser_produit(code_barres: str, data: dict) -> ProduitOpenFoodFacts:
         """Parse les données brutes OpenFoodFacts."""
 
         # Nom du produit
@@ -0,0 +1,314 @@
+"""
+Rafraîchissement du catalogue OpenFoodFacts — concurrent, cadencé, incrémental.
+
+Pipeline utilisé par le job cron ``sync_openfoodfacts``:
+
+1. Les codes sont traités par lots (``taille_lot``)
+2. Dans un lot, les requêtes partent en parallèle (``concurrence`` au plus),
+   cadencées par un seau à jetons (``debit`` requêtes/s, politesse envers
+   l'API publique)
+3. Requêtes conditionnelles: ``If-None-Match`` avec l'ETag connu (réponse
+   304 = inchangé); à défaut, empreinte SHA-256 du produit compacté comparée
+   à celle stockée — les produits inchangés ne sont pas réécrits
+4. Un seul upsert groupé par lot pour les produits modifiés
+
+Usage:
+    from src.services.integrations.sync_openfoodfacts import RafraichisseurOpenFoodFacts
+
+    rafraichisseur = RafraichisseurOpenFoodFacts(concurrence=4, debit=2.0)
+    metriques = await rafraichisseur.rafraichir(codes, etats, ecrire=ecrire_lot)
+    metriques.debit  # codes/s
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+
+from src.services.integrations.magasin_produits import MagasinProduits, compacter_produit
+from src.services.integrations.produit import OPENFOODFACTS_API, OpenFoodFactsService
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCE_DEFAUT = 4
+DEBIT_DEFAUT = 2.0  # requêtes/s vers l'API publique
+TAILLE_LOT_DEFAUT = 100
+ATTENTE_429_MAX = 30.0  # secondes
+
+EtatProduit = tuple[str | None, str | None]  # (etag, empreinte)
+
+
+# ═══════════════════════════════════════════════════════════
+# MÉTRIQUES
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class MetriquesRafraichissement:
+    """Compteurs d'un passage de rafraîchissement."""
+
+    codes: int = 0
+    requetes: int = 0
+    modifies: int = 0
+    inchanges: int = 0  # 304 ou empreinte identique
+    inconnus: int = 0
+    erreurs: int = 0
+    ecrits: int = 0
+    lots: int = 0
+    duree_s: float = 0.0
+
+    @property
+    def debit(self) -> float:
+        """Codes traités par seconde."""
+        return self.codes / self.duree_s if self.duree_s > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "debit": round(self.debit, 2)}
+
+
+# ═══════════════════════════════════════════════════════════
+# CADENCEMENT
+# ═══════════════════════════════════════════════════════════
+
+
+class SeauJetons:
+    """Seau à jetons asynchrone: ``debit`` jetons/s, rafale de ``capacite``.
+
+    Args:
+        debit: Jetons ajoutés par seconde (<= 0 = illimité)
+        capacite: Nombre maximal de jetons accumulés
+    """
+
+    def __init__(self, debit: float, capacite: float = 1.0):
+        self.debit = debit
+        self.capacite = max(capacite, 1.0)
+        self._jetons = self.capacite
+        self._dernier = time.monotonic()
+        self._verrou = asyncio.Lock()
+
+    async def acquerir(self) -> None:
+        """Attend qu'un jeton soit disponible puis le consomme."""
+        if self.debit <= 0:
+            return
+        async with self._verrou:
+            while True:
+                maintenant = time.monotonic()
+                self._jetons = min(
+                    self.capacite, self._jetons + (maintenant - self._dernier) * self.debit
+                )
+                self._dernier = maintenant
+                if self._jetons >= 1:
+                    self._jetons -= 1
+                    return
+                await asyncio.sleep((1 - self._jetons) / self.debit)
+
+
+# ═══════════════════════════════════════════════════════════
+# CONVERSION
+# ═══════════════════════════════════════════════════════════
+
+
+def empreinte_produit(product: dict[str, Any]) -> str:
+    """Empreinte stable du contenu utile d'un produit OpenFoodFacts."""
+    canonique = json.dumps(compacter_produit(product), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonique.encode("utf-8")).hexdigest()
+
+
+def ligne_cache(
+    code: str, product: dict[str, Any], etag: str | None, empreinte: str
+) -> dict[str, Any]:
+    """Construit la ligne ``openfoodfacts_cache`` d'un produit brut."""
+    produit = OpenFoodFactsService._parser_produit(code, product)
+    nutrition = produit.nutrition
+    return {
+        "code_barres": code,
+        "nom": produit.nom,
+        "marque": produit.marque,
+        "categorie": produit.categories[0] if produit.categories else None,
+        "nutriscore": nutrition.nutriscore if nutrition else None,
+        "nova_group": nutrition.nova_group if nutrition else None,
+        "ecoscore": nutrition.ecoscore if nutrition else None,
+        "nutrition_data": asdict(nutrition) if nutrition else None,
+        "allergenes": produit.allergenes,
+        "image_url": produit.image_url,
+        "etag": etag,
+        "empreinte": empreinte,
+        "last_updated": datetime.now(UTC),
+    }
+
+
+# ═══════════════════════════════════════════════════════════
+# RAFRAÎCHISSEUR
+# ═══════════════════════════════════════════════════════════
+
+
+class RafraichisseurOpenFoodFacts:
+    """Récupération concurrente et cadencée des produits OpenFoodFacts.
+
+    Args:
+        base_url: Endpoint produit (``{base_url}/{code}.json``)
+        concurrence: Requêtes simultanées au plus
+        debit: Requêtes par seconde (seau à jetons)
+        taille_lot: Codes par lot (un upsert par lot)
+        timeout: Timeout HTTP (secondes)
+        transport: Transport httpx (tests: serveur factice / MockTransport)
+        magasin: Magasin local mis à jour avec les produits récupérés
+    """
+
+    def __init__(
+        self,
+        base_url: str = OPENFOODFACTS_API,
+        concurrence: int = CONCURRENCE_DEFAUT,
+        debit: float = DEBIT_DEFAUT,
+        taille_lot: int = TAILLE_LOT_DEFAUT,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        magasin: MagasinProduits | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.concurrence = max(1, concurrence)
+        self.debit = debit
+        self.taille_lot = max(1, taille_lot)
+        self.timeout = timeout
+        self.transport = transport
+        self.magasin = magasin
+        self.user_agent = "AssistantMatanne/1.0 (contact@example.com)"
+
+    async def rafraichir(
+        self,
+        codes: Iterable[str],
+        etats: dict[str, EtatProduit] | None = None,
+        ecrire: Callable[[list[dict[str, Any]]], int] | None = None,
+    ) -> MetriquesRafraichissement:
+        """Rafraîchit une liste de codes-barres.
+
+        Args:
+            codes: Codes à rafraîchir (dédoublonnés)
+            etats: ETag et empreinte connus par code
+            ecrire: Écriture groupée des lignes modifiées d'un lot (appelée
+                hors de la boucle d'événements); retourne le nombre de lignes
+
+        Returns:
+            Métriques du passage
+        """
+        codes = list(dict.fromkeys(c for c in codes if c))
+        etats = etats or {}
+        metriques = MetriquesRafraichissement(codes=len(codes))
+        debut = time.perf_counter()
+
+        seau = SeauJetons(self.debit, capacite=self.concurrence)
+        semaphore = asyncio.Semaphore(self.concurrence)
+
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=self.transport,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(max_connections=self.concurrence),
+        ) as client:
+
+            async def _un(code: str) -> dict[str, Any] | None:
+                async with semaphore:
+                    return await self._recuperer(client, seau, code, etats.get(code), metriques)
+
+            for debut_lot in range(0, len(codes), self.taille_lot):
+                lot = codes[debut_lot : debut_lot + self.taille_lot]
+                resultats = await asyncio.gather(*(_un(code) for code in lot))
+                lignes = [ligne for ligne in resultats if ligne is not None]
+                metriques.lots += 1
+                if lignes and ecrire is not None:
+                    try:
+                        metriques.ecrits += await asyncio.to_thread(ecrire, lignes)
+                    except Exception as e:
+                        metriques.erreurs += len(lignes)
+                        logger.error(f"Écriture lot OpenFoodFacts échouée: {e}")
+
+        metriques.duree_s = time.perf_counter() - debut
+        return metriques
+
+    async def _recuperer(
+        self,
+        client: httpx.AsyncClient,
+        seau: SeauJetons,
+        code: str,
+        etat: EtatProduit | None,
+        metriques: MetriquesRafraichissement,
+    ) -> dict[str, Any] | None:
+        """Récupère un produit; None s'il est inchangé, inconnu ou en erreur."""
+        etag, empreinte_connue = etat or (None, None)
+        entetes = {"If-None-Match": etag} if etag else {}
+
+        for tentative in range(2):
+            await seau.acquerir()
+            metriques.requetes += 1
+            try:
+                reponse = await client.get(f"{self.base_url}/{code}.json", headers=entetes)
+            except httpx.HTTPError as e:
+                logger.debug(f"OpenFoodFacts {code}: {e}")
+                metriques.erreurs += 1
+                return None
+
+            if reponse.status_code == 429 and tentative == 0:
+                attente = _retry_after(reponse.headers.get("Retry-After"))
+                logger.info(f"OpenFoodFacts: limite atteinte, pause de {attente:.0f}s")
+                await asyncio.sleep(attente)
+                continue
+            break
+
+        if reponse.status_code == 304:
+            metriques.inchanges += 1
+            return None
+        if reponse.status_code == 404:
+            metriques.inconnus += 1
+            return None
+        if reponse.status_code != 200:
+            metriques.erreurs += 1
+            return None
+
+        try:
+            donnees = reponse.json()
+        except ValueError:
+            metriques.erreurs += 1
+            return None
+
+        if donnees.get("status") != 1:
+            metriques.inconnus += 1
+            return None
+
+        product = donnees.get("product") or {}
+        empreinte = empreinte_produit(product)
+        if empreinte == empreinte_connue:
+            metriques.inchanges += 1
+            return None
+
+        metriques.modifies += 1
+        if self.magasin is not None:
+            try:
+                await asyncio.to_thread(self.magasin.enregistrer, code, product)
+            except Exception as e:
+                logger.debug(f"Magasin local non mis à jour pour {code}: {e}")
+        return ligne_cache(code, product, reponse.headers.get("ETag"), empreinte)
+
+
+def _retry_after(valeur: str | None) -> float:
+    try:
+        return min(max(float(valeur), 0.0), ATTENTE_429_MAX)
+    except (TypeError, ValueError):
+        return 5.0
+
+
+__all__ = [
+    "MetriquesRafraichissement",
+    "RafraichisseurOpenFoodFacts",
+    "SeauJetons",
+    "empreinte_produit",
+    "ligne_cache",
+]
@@ -15,10 +15,11 @@ Transport : HTTP POST vers https://api.telegram.org/bot{TOKEN}/...
 Webhook : POST /api/v1/telegram/webhook
 """
 
+import asyncio
 import logging
 import time
 from collections import defaultdict
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 import httpx
@@ -701,25 +702,8 @@ async def envoyer_rappel_entretien_maison(message: str) -> bool:
     )
 
 
-async def envoyer_digest_matinal() -> bool:
-    """Digest matinal : résumé de la journée à venir.
-
-    Contenu :
-    - Repas prévus aujourd'hui
-    - Tâches/rendez-vous du jour
-    - Alertes péremption imminentes
-
-    Appelé par le CRON job matinal (7h-8h).
-    """
-    from datetime import date, timedelta
-
-    settings = obtenir_parametres()
-    chat_id = settings.TELEGRAM_CHAT_ID
-
-    if not chat_id:
-        return False
-
-    aujourd_hui = date.today()
+def _sections_digest_matinal(aujourd_hui: date) -> list[str]:
+    """Sections du digest matinal (lectures DB synchrones, à exécuter hors boucle)."""
     sections: list[str] = []
 
     # 1. Repas du jour
@@ -788,6 +772,29 @@ async def envoyer_digest_matinal() -> bool:
     except Exception:
         logger.debug("Digest matinal : tâches indisponibles")
 
+    return sections
+
+
+async def envoyer_digest_matinal() -> bool:
+    """Digest matinal : résumé de la journée à venir.
+
+    Contenu :
+    - Repas prévus aujourd'hui
+    - Tâches/rendez-vous du jour
+    - Alertes péremption imminentes
+
+    Appelé par le CRON job matinal (7h-8h).
+    """
+    settings = obtenir_parametres()
+    chat_id = settings.TELEGRAM_CHAT_ID
+
+    if not chat_id:
+        return False
+
+    aujourd_hui = date.today()
+    # Sessions DB synchrones : dans un thread pour ne pas bloquer la boucle
+    sections = await asyncio.to_thread(_sections_digest_matinal, aujourd_hui)
+
     if not sections:
         message = f"☀️ <b>Bonjour !</b> — {aujourd_hui.strftime('%A %d %B')}\n\nRien de spécial prévu aujourd'hui. Bonne journée !"
     else:
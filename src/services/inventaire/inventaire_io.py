@@ -35,7 +35,7 @@ class InventaireIOMixin:
     - _exporter_json
     - valider_fichier_import
 
-    Utilise self.get_inventaire_complet() et self.ajouter_article()
+    Utilise self.get_inventaire_complet() et self.invalidate_cache()
     du service principal (cooperative mixin pattern).
     """
 
@@ -52,73 +52,135 @@ class InventaireIOMixin:
         Returns:
             Liste des articles importés avec leurs IDs
         """
-        resultats: list[dict[str, Any]] = []
+        from src.core.db import obtenir_contexte_db
+        from src.core.models import ArticleInventaire, Ingredient
+        from src.services.core.base.bulk import ResultatUpsert, bulk_upsert
+
+        resultats: list[dict[str, Any]] = [{} for _ in articles_data]
         errors: list[str] = []
 
+        def _echec(idx: int, nom: str, message: str) -> None:
+            errors.append(f"Ligne {idx + 2}: {message}")
+            resultats[idx] = {"nom": nom, "status": "❌", "message": message}
+
+        # 1. Validation Pydantic de toutes les lignes
+        valides: dict[int, ArticleImport] = {}
         for idx, article_data in enumerate(articles_data):
             try:
-                # Valide avec Pydantic
-                article_import = ArticleImport(**article_data)
-
-                # Cherche ou crée l'ingrédient
-                from src.core.db import obtenir_contexte_db
-                from src.core.models import Ingredient
-
-                db = obtenir_contexte_db().session
-
-                ingredient = db.query(Ingredient).filter_by(nom=article_import.nom).first()
-
-                if not ingredient:
-                    ingredient = Ingredient(
-                        nom=article_import.nom,
-                        unite=article_import.unite,
-                        categorie=article_import.categorie or "Autre",
-                    )
-                    db.add(ingredient)
-                    db.commit()
-                    db.refresh(ingredient)
-
-                    emettre_evenement_simple(
-                        "stock.modifie",
-                        {
-                            "article_id": ingredient.id,
-                            "ingredient_nom": ingredient.nom,
-                            "raison": "import",
-                        },
-                        source="inventaire_io",
-                    )
-
-                # Ajoute l'article à l'inventaire
-                self.ajouter_article(
-                    ingredient_id=ingredient.id,
-                    quantite=article_import.quantite,
-                    quantite_min=article_import.quantite_min,
-                    emplacement=article_import.emplacement,
-                    date_peremption=(
+                valides[idx] = ArticleImport(**article_data)
+            except Exception as e:
+                _echec(idx, article_data.get("nom", "?"), str(e))
+
+        with obtenir_contexte_db() as db:
+
+            def _ecrire_isole(
+                lignes: dict[int, dict[str, Any]],
+                model: type[Any],
+                cle: str,
+                **options: Any,
+            ) -> ResultatUpsert:
+                """Écrit toutes les lignes d'un coup, sinon une par une.
+
+                Une ligne en échec ne doit pas faire échouer tout le lot: en cas
+                d'erreur, repli ligne à ligne (un savepoint chacune).
+                """
+                # Les lignes existantes ne sont jamais modifiées par l'import
+                options.setdefault("fusion", lambda existant, nouveau: {})
+                try:
+                    with db.begin_nested():
+                        return bulk_upsert(db, model, list(lignes.values()), cle, **options)
+                except Exception as e:
+                    logger.warning(f"Import groupé échoué, repli ligne à ligne: {e}")
+                cumul = ResultatUpsert()
+                for idx, ligne in lignes.items():
+                    try:
+                        with db.begin_nested():
+                            resultat = bulk_upsert(db, model, [ligne], cle, **options)
+                    except Exception as erreur_ligne:
+                        _echec(idx, valides[idx].nom, str(erreur_ligne))
+                        continue
+                    cumul.ids.update(resultat.ids)
+                    cumul.cles_creees.extend(resultat.cles_creees)
+                return cumul
+
+            # 2. Cherche ou crée tous les ingrédients en une passe (IN + INSERT groupé)
+            ingredients = _ecrire_isole(
+                {
+                    idx: {
+                        "nom": article_import.nom,
+                        "unite": article_import.unite,
+                        "categorie": article_import.categorie or "Autre",
+                    }
+                    for idx, article_import in valides.items()
+                },
+                Ingredient,
+                "nom",
+                conflit_sur=("nom",),
+            )
+            ids_ingredients: dict[str, int] = ingredients.ids
+
+            # 3. Crée les articles en une passe; un ingrédient déjà en stock
+            # (en base ou plus haut dans le fichier) n'est pas réimporté
+            lignes_articles: dict[int, dict[str, Any]] = {}
+            for idx, article_import in valides.items():
+                if resultats[idx] or article_import.nom not in ids_ingredients:
+                    continue
+                try:
+                    date_peremption = (
                         date.fromisoformat(article_import.date_peremption)
                         if article_import.date_peremption
                         else None
-                    ),
-                )
-
-                resultats.append(
+                    )
+                except ValueError as e:
+                    _echec(idx, article_import.nom, str(e))
+                    continue
+                lignes_articles[idx] = {
+                    "ingredient_id": ids_ingredients[article_import.nom],
+                    "quantite": article_import.quantite,
+                    "quantite_min": article_import.quantite_min,
+                    "emplacement": article_import.emplacement,
+                    "date_peremption": date_peremption,
+                }
+
+            articles = _ecrire_isole(lignes_articles, ArticleInventaire, "ingredient_id")
+            articles_crees = set(articles.cles_creees)
+            db.commit()
+
+            for nom in ingredients.cles_creees:
+                emettre_evenement_simple(
+                    "stock.modifie",
                     {
-                        "nom": article_import.nom,
-                        "status": "✅",
-                        "message": "Importé avec succès",
-                    }
+                        "article_id": ids_ingredients[nom],
+                        "ingredient_nom": nom,
+                        "raison": "import",
+                    },
+                    source="inventaire_io",
                 )
 
-            except Exception as e:
-                errors.append(f"Ligne {idx + 2}: {str(e)}")
-                resultats.append(
+            for idx, ligne in lignes_articles.items():
+                if resultats[idx]:
+                    continue
+                nom = valides[idx].nom
+                ingredient_id = ligne["ingredient_id"]
+                if ingredient_id not in articles_crees:
+                    _echec(idx, nom, "Article déjà présent dans l'inventaire")
+                    continue
+                articles_crees.discard(ingredient_id)
+                resultats[idx] = {"nom": nom, "status": "✅", "message": "Importé avec succès"}
+                emettre_evenement_simple(
+                    "stock.modifie",
                     {
-                        "nom": article_data.get("nom", "?"),
-                        "status": "❌",
-                        "message": str(e),
-                    }
+                        "article_id": articles.ids[ingredient_id],
+                        "ingredient": nom,
+                        "quantite": ligne["quantite"],
+                        "raison": "ajout",
+                    },
+                    source="inventaire",
                 )
 
+        if lignes_articles:
+            self.invalidate_cache()
+
         logger.info(f"✅ {len(resultats) - len(errors)}/{len(resultats)} articles importés")
 
         return resultats
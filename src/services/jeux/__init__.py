@@ -14,6 +14,8 @@ Architecture:
 
 - loto_data.py            : Récupération données Loto FDJ (data.gouv.fr)
 
+- simulation_loterie.py   : Moteur Monte Carlo de grilles (Loto, Euromillions)
+
 - sync_service.py         : Orchestration et persistance en base
 
 - scheduler_service.py    : Jobs automatiques APScheduler
@@ -40,6 +42,7 @@ from typing import TYPE_CHECKING
 _LAZY_IMPORTS: dict[str, str] = {
     # ── Séries ──
     "SeriesService": "series_service",
+    "ResultatSerie": "series_service",
     "obtenir_series_service": "series_service",
     "obtenir_service_series": "series_service",
     "SEUIL_VALUE_ALERTE": "series_service",
@@ -89,6 +92,14 @@ _LAZY_IMPORTS: dict[str, str] = {
     "TirageLoto": "loto_data",
     "obtenir_loto_data_service": "loto_data",
     "obtenir_service_donnees_loto": "loto_data",
+    # ── Simulation loterie ──
+    "LotGrilles": "simulation_loterie",
+    "MoteurMonteCarlo": "simulation_loterie",
+    "REGLES_EUROMILLIONS": "loterie_base",
+    "REGLES_LOTO": "loterie_base",
+    "ReglesLoterie": "loterie_base",
+    "scorer_grilles": "simulation_loterie",
+    "tirer_sans_remise": "simulation_loterie",
     # ── Notifications ──
     "NotificationJeuxService": "notification_service",
     "NotificationJeux": "notification_service",
@@ -211,6 +222,7 @@ if TYPE_CHECKING:
         ScoreMatch,
         StatistiquesMarcheData,
     )
+    from ._internal.loterie_base import REGLES_EUROMILLIONS, REGLES_LOTO, ReglesLoterie
     from ._internal.loto_crud_service import (
         LotoCrudService,
         obtenir_loto_crud_service,
@@ -280,10 +292,17 @@ if TYPE_CHECKING:
         SEUIL_SERIES_MINIMUM,
         SEUIL_VALUE_ALERTE,
         SEUIL_VALUE_HAUTE,
+        ResultatSerie,
         SeriesService,
         obtenir_series_service,
         obtenir_service_series,
     )
+    from ._internal.simulation_loterie import (
+        LotGrilles,
+        MoteurMonteCarlo,
+        scorer_grilles,
+        tirer_sans_remise,
+    )
     from ._internal.sync_service import (
         SyncService,
         obtenir_service_sync_jeux,
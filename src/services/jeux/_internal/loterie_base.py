@@ -10,9 +10,14 @@ Factorise les opérations CRUD identiques entre les jeux de type loterie:
 Chaque sous-classe définit les attributs de classe (_tirage_cls, _grille_cls,
 _cout_defaut, _nom_jeu) et implémente les méthodes template pour les champs
 spécifiques à chaque jeu (numéro chance pour le Loto, étoiles pour Euromillions).
+
+Les règles de chaque jeu (bornes, nombre de numéros, critères d'équilibre)
+sont décrites par ``ReglesLoterie``, partagées par les services de génération
+et le moteur de simulation (``simulation_loterie``).
 """
 
 import logging
+from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
@@ -22,6 +27,26 @@ from sqlalchemy.orm import Session
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ReglesLoterie:
+    """Règles d'un jeu de loterie et critères de qualité d'une grille."""
+
+    nom: str
+    nb_numeros: int
+    max_numero: int
+    nb_speciaux: int  # Numéro chance (Loto) ou étoiles (Euromillions)
+    max_special: int
+    seuil_haut: int = 25  # Numéros > seuil = "hauts"
+    somme_optimale: tuple[int, int] = (125, 175)
+    somme_acceptable: tuple[int, int] = (100, 200)
+
+
+REGLES_LOTO = ReglesLoterie(nom="loto", nb_numeros=5, max_numero=49, nb_speciaux=1, max_special=10)
+REGLES_EUROMILLIONS = ReglesLoterie(
+    nom="euromillions", nb_numeros=5, max_numero=50, nb_speciaux=2, max_special=12
+)
+
+
 class LoterieCrudBase:
     """Opérations CRUD communes pour les jeux de loterie.
 
@@ -12,6 +12,8 @@ Fournit:
 
 - Données pour le tracking "loi des séries"
 
+- Génération de grilles par simulation Monte Carlo (pondérée par la value)
+
 
 
 Source: https://www.data.gouv.fr/fr/datasets/nouveau-loto-nouveau-jeu-de-la-fdj/
@@ -32,12 +34,16 @@ import csv
 import io
 import logging
 from datetime import date, datetime
+from typing import Any
 
 import httpx
+import numpy as np
 from pydantic import BaseModel, Field
 
 from src.core.decorators import avec_resilience
 from src.services.core.registry import service_factory
+from src.services.jeux._internal.loterie_base import REGLES_LOTO
+from src.services.jeux._internal.simulation_loterie import MoteurMonteCarlo
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +77,13 @@ NB_NUMEROS_CHANCE = 10
 NUMEROS_PAR_TIRAGE = 5
 
 
+# Tirage d'une grille: candidats simulés et meilleures grilles parmi lesquelles tirer
+
+NB_CANDIDATS_TIRAGE = 20_000
+
+NB_MEILLEURES_TIRAGE = 100
+
+
 # ═══════════════════════════════════════════════════════════
 
 # TYPES ET SCHÉMAS
@@ -432,6 +445,84 @@ class LotoDataService:
             value=round(value, 2),
         )
 
+    def _statistiques_par_numero(
+        self, tirages: list[TirageLoto], type_numero: str = "principal"
+    ) -> dict[int, StatistiqueNumeroLoto]:
+        """
+
+        Statistiques de tous les numéros en un passage sur les tirages.
+
+
+
+        Construit une matrice de présence tirages × numéros; sorties, dernière
+
+        sortie et série en cours s'en déduisent par colonne. Même résultat que
+
+        ``calculer_statistiques_numero`` appelé pour chaque numéro.
+
+        """
+
+        if type_numero == "principal":
+            max_numero = NB_NUMEROS_PRINCIPAUX
+
+            freq_theorique = NUMEROS_PAR_TIRAGE / NB_NUMEROS_PRINCIPAUX
+
+            lignes = [i for i, tirage in enumerate(tirages) for _ in tirage.numeros]
+
+            valeurs = [n for tirage in tirages for n in tirage.numeros]
+
+        else:
+            max_numero = NB_NUMEROS_CHANCE
+
+            freq_theorique = 1 / NB_NUMEROS_CHANCE
+
+            lignes = list(range(len(tirages)))
+
+            valeurs = [tirage.numero_chance for tirage in tirages]
+
+        total_tirages = len(tirages)
+
+        lignes_np = np.asarray(lignes, dtype=np.int64)
+
+        valeurs_np = np.asarray(valeurs, dtype=np.int64)
+
+        valides = (valeurs_np >= 1) & (valeurs_np <= max_numero)
+
+        presence = np.zeros((total_tirages, max_numero), dtype=bool)
+
+        presence[lignes_np[valides], valeurs_np[valides] - 1] = True
+
+        nb_sorties = presence.sum(axis=0)
+
+        # Index du dernier tirage contenant chaque numéro (-1 si jamais sorti)
+
+        derniere = np.where(
+            nb_sorties > 0, total_tirages - 1 - np.argmax(presence[::-1], axis=0), -1
+        )
+
+        series = total_tirages - 1 - derniere
+
+        resultats = {}
+
+        for i in range(max_numero):
+            frequence = int(nb_sorties[i]) / total_tirages if total_tirages > 0 else 0.0
+
+            serie_actuelle = int(series[i])
+
+            resultats[i + 1] = StatistiqueNumeroLoto(
+                numero=i + 1,
+                type_numero=type_numero,
+                total_tirages=total_tirages,
+                nb_sorties=int(nb_sorties[i]),
+                frequence=round(frequence, 4),
+                frequence_theorique=round(freq_theorique, 4),
+                serie_actuelle=serie_actuelle,
+                derniere_sortie=tirages[derniere[i]].date_tirage if derniere[i] >= 0 else None,
+                value=round(frequence * serie_actuelle, 2),
+            )
+
+        return resultats
+
     def calculer_toutes_statistiques(
         self, tirages: list[TirageLoto] | None = None
     ) -> StatistiquesGlobalesLoto:
@@ -459,26 +550,12 @@ class LotoDataService:
         if not tirages:
             return StatistiquesGlobalesLoto()
 
-        # Stats numéros principaux (1-49)
-
-        stats_principaux = {}
-
-        for num in range(1, NB_NUMEROS_PRINCIPAUX + 1):
-            stats_principaux[num] = self.calculer_statistiques_numero(num, tirages, "principal")
-
-        # Stats numéros chance (1-10)
-
-        stats_chance = {}
-
-        for num in range(1, NB_NUMEROS_CHANCE + 1):
-            stats_chance[num] = self.calculer_statistiques_numero(num, tirages, "chance")
-
         return StatistiquesGlobalesLoto(
             total_tirages=len(tirages),
             date_premier_tirage=tirages[0].date_tirage,
             date_dernier_tirage=tirages[-1].date_tirage,
-            numeros_principaux=stats_principaux,
-            numeros_chance=stats_chance,
+            numeros_principaux=self._statistiques_par_numero(tirages, "principal"),
+            numeros_chance=self._statistiques_par_numero(tirages, "chance"),
         )
 
     def obtenir_numeros_en_retard(
@@ -515,15 +592,11 @@ class LotoDataService:
         if not tirages:
             return []
 
-        max_numero = NB_NUMEROS_PRINCIPAUX if type_numero == "principal" else NB_NUMEROS_CHANCE
-
-        stats = []
-
-        for num in range(1, max_numero + 1):
-            stat = self.calculer_statistiques_numero(num, tirages, type_numero)
-
-            if stat.value >= seuil_value:
-                stats.append(stat)
+        stats = [
+            stat
+            for stat in self._statistiques_par_numero(tirages, type_numero).values()
+            if stat.value >= seuil_value
+        ]
 
         # Trier par value décroissante
 
@@ -531,6 +604,146 @@ class LotoDataService:
 
         return stats
 
+    # ─────────────────────────────────────────────────────────────────
+
+    # GÉNÉRATION DE GRILLES
+
+    # ─────────────────────────────────────────────────────────────────
+
+    def generer_grilles(
+        self,
+        nb_candidats: int = 100_000,
+        nb_grilles: int = 5,
+        tirages: list[TirageLoto] | None = None,
+        graine: int | None = None,
+        nb_processus: int | None = None,
+        stats: StatistiquesGlobalesLoto | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+
+        Génère un pool de grilles et retourne les meilleures.
+
+
+
+        Les numéros sont tirés sans remise, pondérés par leur value (loi des
+
+        séries, plancher 0.1); les grilles sont classées par qualité de
+
+        distribution puis par value moyenne.
+
+
+
+        Args:
+
+            nb_candidats: Taille du pool simulé
+
+            nb_grilles: Nombre de grilles retournées
+
+            tirages: Liste de tirages (défaut: cache; uniforme si vide)
+
+            graine: Graine pour un résultat reproductible
+
+            nb_processus: Processus de calcul (None = automatique)
+
+            stats: Statistiques déjà calculées (sinon calculées depuis ``tirages``)
+
+
+
+        Returns:
+
+            Grilles {numeros, numero_chance, qualite, potentiel}
+
+        """
+
+        if stats is None:
+            if tirages is None:
+                tirages = self._tirages_cache
+
+            stats = self.calculer_toutes_statistiques(tirages) if tirages else None
+
+        poids_numeros = poids_chance = None
+
+        if stats is not None and stats.numeros_principaux:
+            poids_numeros = [max(s.value, 0.1) for s in stats.numeros_principaux.values()]
+
+            poids_chance = [max(s.value, 0.1) for s in stats.numeros_chance.values()]
+
+        moteur = MoteurMonteCarlo(
+            REGLES_LOTO,
+            poids_numeros=poids_numeros,
+            poids_speciaux=poids_chance,
+            nb_processus=nb_processus,
+        )
+
+        lot = moteur.meilleures_grilles(nb_candidats, nb_grilles, graine)
+
+        grilles = []
+
+        for i in range(len(lot)):
+            numeros, chance = lot.grille(i)
+
+            grilles.append(
+                {
+                    "numeros": numeros,
+                    "numero_chance": chance[0],
+                    "qualite": float(lot.qualite[i]),
+                    "potentiel": round(float(lot.potentiel[i]), 4),
+                }
+            )
+
+        return grilles
+
+    def tirer_grille(
+        self,
+        stats: StatistiquesGlobalesLoto | None = None,
+        nb_candidats: int = NB_CANDIDATS_TIRAGE,
+        parmi: int = NB_MEILLEURES_TIRAGE,
+        graine: int | None = None,
+    ) -> dict[str, Any]:
+        """
+
+        Tire une grille parmi les ``parmi`` meilleures d'un pool simulé.
+
+
+
+        La meilleure grille d'un pool dépend à peine du hasard (mêmes poids,
+
+        même grille): le tirage pondéré par le potentiel parmi les meilleures
+
+        garde des grilles de qualité tout en variant d'un appel à l'autre.
+
+
+
+        Args:
+
+            stats: Statistiques déjà calculées (défaut: depuis le cache)
+
+            nb_candidats: Taille du pool simulé
+
+            parmi: Nombre de meilleures grilles candidates au tirage
+
+            graine: Graine pour un résultat reproductible
+
+
+
+        Returns:
+
+            Grille {numeros, numero_chance, qualite, potentiel}
+
+        """
+
+        rng = np.random.default_rng(graine)
+
+        meilleures = self.generer_grilles(
+            nb_candidats, parmi, graine=int(rng.integers(2**32)), stats=stats
+        )
+
+        potentiels = np.array([g["potentiel"] for g in meilleures], dtype=float)
+
+        poids = potentiels / potentiels.sum() if potentiels.sum() > 0 else None
+
+        return meilleures[int(rng.choice(len(meilleures), p=poids))]
+
     def close(self):
         """Ferme le client HTTP."""
 
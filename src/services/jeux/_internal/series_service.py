@@ -34,12 +34,39 @@ Interprétation:
 
     - value > 2.5 : Forte opportunité
 
+
+
+Maintenance:
+
+    Les résultats d'une journée (matchs ou tirage) sont appliqués en une seule
+
+    requête ensembliste via ``appliquer_resultats``; lectures et agrégats sont
+
+    calculés en SQL sur l'expression ``VALUE_SQL`` (couverte par l'index
+
+    partiel ``ix_jeux_series_opportunites``).
+
 """
 
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Literal
 
+from sqlalchemy import (
+    Boolean,
+    Float,
+    String,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.orm import Session
 
 from src.core.decorators import avec_session_db
@@ -71,6 +98,22 @@ SEUIL_SERIES_MINIMUM = 3  # Ignorer séries < 3 (bruit statistique)
 TypeJeu = Literal["paris", "loto"]
 
 
+# Value calculée côté SQL (même expression que l'index ix_jeux_series_opportunites)
+
+VALUE_SQL = SerieJeux.frequence * SerieJeux.serie_actuelle
+
+
+@dataclass(frozen=True)
+class ResultatSerie:
+    """Résultat d'un marché pour une journée: événement survenu ou non."""
+
+    marche: str
+
+    survenu: bool
+
+    championnat: str | None = None
+
+
 # ═══════════════════════════════════════════════════════════════════
 
 # SERVICE PRINCIPAL
@@ -385,22 +428,9 @@ class SeriesService:
 
         """
 
-        serie = self.obtenir_serie(type_jeu, marche, championnat, db=db)
-
-        if serie:
-            serie.serie_actuelle += 1
-
-            serie.nb_total += 1
-
-            serie.frequence = self.calculer_frequence(serie.nb_occurrences, serie.nb_total)
+        self.appliquer_resultats(type_jeu, [ResultatSerie(marche, False, championnat)], db=db)
 
-            serie.derniere_mise_a_jour = datetime.utcnow()
-
-            db.commit()
-
-            db.refresh(serie)
-
-        return serie
+        return self.obtenir_serie(type_jeu, marche, championnat, db=db)
 
     @avec_session_db
     def reset_serie(
@@ -437,26 +467,214 @@ class SeriesService:
 
         """
 
-        serie = self.obtenir_serie(type_jeu, marche, championnat, db=db)
+        self.appliquer_resultats(
+            type_jeu, [ResultatSerie(marche, True, championnat)], date_occurrence, db=db
+        )
 
-        if serie:
-            serie.serie_actuelle = 0
+        return self.obtenir_serie(type_jeu, marche, championnat, db=db)
 
-            serie.nb_occurrences += 1
+    @staticmethod
+    def _valeurs_maj(survenu, date_resultat: date) -> dict:
+        """Colonnes SET d'une mise à jour (``survenu``: expression SQL booléenne)."""
 
-            serie.nb_total += 1
+        occurrences = SerieJeux.nb_occurrences + case((survenu, 1), else_=0)
 
-            serie.frequence = self.calculer_frequence(serie.nb_occurrences, serie.nb_total)
+        return {
+            SerieJeux.serie_actuelle: case((survenu, 0), else_=SerieJeux.serie_actuelle + 1),
+            SerieJeux.nb_occurrences: occurrences,
+            SerieJeux.nb_total: SerieJeux.nb_total + 1,
+            SerieJeux.frequence: cast(occurrences, Float) / (SerieJeux.nb_total + 1),
+            SerieJeux.derniere_occurrence: case(
+                (survenu, date_resultat), else_=SerieJeux.derniere_occurrence
+            ),
+            SerieJeux.derniere_mise_a_jour: datetime.utcnow(),
+        }
 
-            serie.derniere_occurrence = date_occurrence or date.today()
+    @avec_session_db
+    def appliquer_resultats(
+        self,
+        type_jeu: TypeJeu,
+        resultats: Iterable[ResultatSerie],
+        date_resultat: date | None = None,
+        db: Session | None = None,
+    ) -> int:
+        """
 
-            serie.derniere_mise_a_jour = datetime.utcnow()
+        Applique les résultats d'une journée à toutes les séries concernées.
 
-            db.commit()
+        Survenu: série remise à 0, occurrence comptée. Non survenu: série + 1.
 
-            db.refresh(serie)
 
-        return serie
+
+        PostgreSQL: une seule requête ``UPDATE ... FROM (VALUES ...)``.
+
+        Autres moteurs: un UPDATE par (championnat, survenu) avec ``marche IN``.
+
+        Les séries inexistantes sont ignorées (voir ``creer_ou_maj_serie``).
+
+
+
+        Args:
+
+            type_jeu: "paris" ou "loto"
+
+            resultats: Un résultat par marché (le dernier l'emporte en cas de doublon)
+
+            date_resultat: Date des occurrences (défaut: aujourd'hui)
+
+            db: Session injectée
+
+
+
+        Returns:
+
+            Nombre de séries mises à jour
+
+        """
+
+        par_cle = {(r.marche, r.championnat or None): bool(r.survenu) for r in resultats}
+
+        if not par_cle:
+            return 0
+
+        date_resultat = date_resultat or date.today()
+
+        filtre_jeu = SerieJeux.type_jeu == type_jeu
+
+        if db.get_bind().dialect.name == "postgresql":
+            lignes = values(
+                column("marche", String),
+                column("championnat", String),
+                column("survenu", Boolean),
+                name="resultats",
+            ).data([(marche, champ, survenu) for (marche, champ), survenu in par_cle.items()])
+
+            requetes = [
+                update(SerieJeux)
+                .where(
+                    filtre_jeu,
+                    SerieJeux.marche == lignes.c.marche,
+                    SerieJeux.championnat.is_not_distinct_from(lignes.c.championnat),
+                )
+                .values(self._valeurs_maj(lignes.c.survenu, date_resultat))
+            ]
+
+        else:
+            # SQLite ne sait pas nommer les colonnes d'un VALUES: un UPDATE par groupe
+
+            groupes: dict[tuple[str | None, bool], list[str]] = {}
+
+            for (marche, champ), survenu in par_cle.items():
+                groupes.setdefault((champ, survenu), []).append(marche)
+
+            requetes = [
+                update(SerieJeux)
+                .where(
+                    filtre_jeu,
+                    SerieJeux.marche.in_(marches),
+                    SerieJeux.championnat == champ if champ else SerieJeux.championnat.is_(None),
+                )
+                .values(self._valeurs_maj(literal(survenu), date_resultat))
+                for (champ, survenu), marches in groupes.items()
+            ]
+
+        nb_maj = 0
+
+        for requete in requetes:
+            nb_maj += db.execute(requete.execution_options(synchronize_session=False)).rowcount
+
+        db.commit()
+
+        # Les SerieJeux déjà chargées dans la session sont périmées
+
+        db.expire_all()
+
+        logger.debug(f"Séries {type_jeu}: {nb_maj} mises à jour ({len(par_cle)} résultats)")
+
+        emettre_evenement_simple(
+            "jeux.serie_modifiee",
+            {"type_jeu": str(type_jeu), "nb_series": nb_maj, "action": "resultats"},
+            source="series_service",
+        )
+
+        return nb_maj
+
+    def appliquer_tirage_loto(
+        self,
+        numeros_sortis: Iterable[int],
+        numero_chance: int | None = None,
+        date_tirage: date | None = None,
+        max_numero: int = 49,
+        max_chance: int = 10,
+        db: Session | None = None,
+    ) -> int:
+        """
+
+        Applique un tirage Loto aux séries "principal_N" (et "chance_N").
+
+
+
+        Args:
+
+            numeros_sortis: Numéros principaux tirés
+
+            numero_chance: Numéro chance tiré (None: séries chance non touchées)
+
+            date_tirage: Date du tirage (défaut: aujourd'hui)
+
+            max_numero: Plus grand numéro principal
+
+            max_chance: Plus grand numéro chance
+
+            db: Session (injectée par appliquer_resultats si absente)
+
+
+
+        Returns:
+
+            Nombre de séries mises à jour
+
+        """
+
+        sortis = set(numeros_sortis)
+
+        resultats = [ResultatSerie(f"principal_{n}", n in sortis) for n in range(1, max_numero + 1)]
+
+        if numero_chance is not None:
+            resultats += [
+                ResultatSerie(f"chance_{n}", n == numero_chance) for n in range(1, max_chance + 1)
+            ]
+
+        return self.appliquer_resultats("loto", resultats, date_tirage, db=db)
+
+    @avec_session_db
+    def nb_tirages_loto_appliques(
+        self, marches: Iterable[str], db: Session | None = None
+    ) -> int | None:
+        """
+
+        Nombre de tirages déjà comptés par les séries Loto ``marches``.
+
+
+
+        Returns:
+
+            Le ``nb_total`` commun, ou None si une série manque ou si elles divergent
+
+        """
+
+        marches = list(marches)
+
+        nb, minimum, maximum = db.execute(
+            select(
+                func.count(SerieJeux.id), func.min(SerieJeux.nb_total), func.max(SerieJeux.nb_total)
+            ).where(SerieJeux.type_jeu == "loto", SerieJeux.marche.in_(marches))
+        ).one()
+
+        if nb != len(marches) or minimum != maximum:
+            return None
+
+        return minimum
 
     # ─────────────────────────────────────────────────────────────────
 
@@ -493,22 +711,15 @@ class SeriesService:
 
         """
 
-        query = db.query(SerieJeux).filter(SerieJeux.serie_actuelle >= SEUIL_SERIES_MINIMUM)
+        query = db.query(SerieJeux).filter(
+            SerieJeux.serie_actuelle >= SEUIL_SERIES_MINIMUM,
+            VALUE_SQL >= seuil,
+        )
 
         if type_jeu:
             query = query.filter(SerieJeux.type_jeu == type_jeu)
 
-        series = query.all()
-
-        # Filtrer par value calculée
-
-        opportunites = [s for s in series if s.value >= seuil]
-
-        # Trier par value décroissante
-
-        opportunites.sort(key=lambda s: s.value, reverse=True)
-
-        return opportunites
+        return query.order_by(VALUE_SQL.desc(), SerieJeux.id).all()
 
     @avec_session_db
     def creer_alerte(
@@ -663,19 +874,16 @@ class SeriesService:
 
         """
 
-        series = (
+        return (
             db.query(SerieJeux)
             .filter(
                 SerieJeux.type_jeu == "paris",
                 SerieJeux.championnat == championnat,
             )
+            .order_by(VALUE_SQL.desc(), SerieJeux.id)
             .all()
         )
 
-        series.sort(key=lambda s: s.value, reverse=True)
-
-        return series
-
     @avec_session_db
     def obtenir_series_loto(
         self,
@@ -699,11 +907,12 @@ class SeriesService:
 
         """
 
-        series = db.query(SerieJeux).filter(SerieJeux.type_jeu == "loto").all()
-
-        series.sort(key=lambda s: s.serie_actuelle, reverse=True)
-
-        return series
+        return (
+            db.query(SerieJeux)
+            .filter(SerieJeux.type_jeu == "loto")
+            .order_by(SerieJeux.serie_actuelle.desc(), SerieJeux.id)
+            .all()
+        )
 
     @avec_session_db
     def statistiques_globales(
@@ -731,26 +940,23 @@ class SeriesService:
 
         """
 
-        query = db.query(SerieJeux)
+        query = db.query(
+            func.count(SerieJeux.id),
+            func.max(SerieJeux.serie_actuelle),
+            func.max(VALUE_SQL),
+            func.count(SerieJeux.id).filter(VALUE_SQL >= SEUIL_VALUE_ALERTE),
+        )
 
         if type_jeu:
             query = query.filter(SerieJeux.type_jeu == type_jeu)
 
-        series = query.all()
-
-        if not series:
-            return {
-                "nb_series": 0,
-                "serie_max": 0,
-                "value_max": 0.0,
-                "nb_opportunites": 0,
-            }
+        nb_series, serie_max, value_max, nb_opportunites = query.one()
 
         return {
-            "nb_series": len(series),
-            "serie_max": max(s.serie_actuelle for s in series),
-            "value_max": max(s.value for s in series),
-            "nb_opportunites": sum(1 for s in series if s.value >= SEUIL_VALUE_ALERTE),
+            "nb_series": nb_series or 0,
+            "serie_max": serie_max or 0,
+            "value_max": float(value_max or 0.0),
+            "nb_opportunites": nb_opportunites or 0,
         }
 
 
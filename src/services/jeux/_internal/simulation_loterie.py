@@ -0,0 +1,280 @@
+"""
+Moteur Monte Carlo de génération de grilles (Loto, Euromillions).
+
+Les candidats sont tirés et notés par blocs numpy plutôt qu'un à un:
+
+- tirage sans remise vectorisé: une clé aléatoire par numéro et par grille,
+  les ``k`` plus grandes clés retenues par ``argpartition``. Avec des poids,
+  la clé ``log(U) / w`` (Efraimidis-Spirakis) reproduit la loi de tirages
+  pondérés successifs sans remise;
+- notation de qualité (pairs/impairs, somme, hauts/bas) en opérations
+  colonne, identique à ``EuromillionsIAService._calculer_qualite``;
+- graines dérivées par ``SeedSequence.spawn``: un bloc donne toujours la même
+  sortie, qu'il soit calculé sur place ou dans un processus du pool;
+- processus lancés en ``spawn``: un ``fork`` du serveur (multi-thread)
+  pourrait hériter d'un verrou tenu par un autre thread et bloquer.
+
+Usage::
+
+    from src.services.jeux._internal.simulation_loterie import MoteurMonteCarlo
+
+    moteur = MoteurMonteCarlo(REGLES_LOTO, poids_numeros=poids)
+    meilleures = moteur.meilleures_grilles(100_000, nb_grilles=5, graine=42)
+    for lot in moteur.iterer(1_000_000, graine=42):  # résultats partiels
+        ...
+"""
+
+import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from multiprocessing import get_context
+
+import numpy as np
+
+from src.services.jeux._internal.loterie_base import ReglesLoterie
+
+logger = logging.getLogger(__name__)
+
+# Taille par défaut d'un bloc: ~10 Mo de clés aléatoires (25k × 50 float64)
+TAILLE_BLOC_DEFAUT = 25_000
+
+# En dessous, le démarrage des processus coûte plus qu'il ne rapporte
+SEUIL_PARALLELE = 1_000_000
+
+
+# ═══════════════════════════════════════════════════════════
+# LOT DE GRILLES
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass
+class LotGrilles:
+    """Grilles candidates en colonnes (une ligne par grille, numéros triés)."""
+
+    numeros: np.ndarray = field(repr=False)
+    speciaux: np.ndarray = field(repr=False)
+    qualite: np.ndarray = field(repr=False)
+    potentiel: np.ndarray = field(repr=False)  # Poids moyen normalisé des numéros (0-1)
+
+    def __len__(self) -> int:
+        return len(self.qualite)
+
+    def grille(self, i: int) -> tuple[list[int], list[int]]:
+        """Numéros et numéros spéciaux de la grille ``i``."""
+        return self.numeros[i].tolist(), self.speciaux[i].tolist()
+
+    def selection(self, indices: np.ndarray) -> "LotGrilles":
+        return LotGrilles(
+            numeros=self.numeros[indices],
+            speciaux=self.speciaux[indices],
+            qualite=self.qualite[indices],
+            potentiel=self.potentiel[indices],
+        )
+
+    def meilleures(self, nb: int) -> "LotGrilles":
+        """Les ``nb`` meilleures grilles: qualité puis potentiel décroissants."""
+        if len(self) > nb:
+            # Pré-sélection O(n) sur la qualité, tri complet sur le reste seulement
+            seuil = np.partition(self.qualite, len(self) - nb)[len(self) - nb]
+            candidats = np.flatnonzero(self.qualite >= seuil)
+        else:
+            candidats = np.arange(len(self))
+        ordre = np.lexsort((-self.potentiel[candidats], -self.qualite[candidats]))
+        return self.selection(candidats[ordre[:nb]])
+
+    @staticmethod
+    def concatener(lots: list["LotGrilles"]) -> "LotGrilles":
+        return LotGrilles(
+            numeros=np.concatenate([lot.numeros for lot in lots]),
+            speciaux=np.concatenate([lot.speciaux for lot in lots]),
+            qualite=np.concatenate([lot.qualite for lot in lots]),
+            potentiel=np.concatenate([lot.potentiel for lot in lots]),
+        )
+
+
+# ═══════════════════════════════════════════════════════════
+# PRIMITIVES VECTORISÉES
+# ═══════════════════════════════════════════════════════════
+
+
+def tirer_sans_remise(
+    rng: np.random.Generator,
+    nb_tirages: int,
+    nb_valeurs: int,
+    k: int,
+    poids: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    ``nb_tirages`` tirages de ``k`` valeurs distinctes parmi 1..``nb_valeurs``.
+
+    Un poids nul n'est retenu que si moins de ``k`` valeurs ont un poids
+    positif (tirage uniforme si tous sont nuls). Retourne une matrice
+    (nb_tirages, k) triée par ligne.
+    """
+    if not 0 < k <= nb_valeurs:
+        raise ValueError(f"Impossible de tirer {k} valeurs parmi {nb_valeurs}")
+    cles = rng.random((nb_tirages, nb_valeurs))
+    if poids is not None:
+        poids = np.asarray(poids, dtype=float)
+        if poids.shape != (nb_valeurs,) or (poids < 0).any():
+            raise ValueError("Les poids doivent être positifs, un par valeur")
+        positifs = poids > 0
+        if not positifs.all():
+            # Poids résiduel plutôt que nul: les clés restent aléatoires entre
+            # valeurs de poids nul, toujours classées après les autres
+            poids = np.where(positifs, poids, poids.max() * 1e-12) if positifs.any() else None
+    if poids is not None:
+        with np.errstate(divide="ignore"):
+            cles = np.log(cles) / poids
+    # Les k plus grandes clés de chaque ligne, sans trier les autres
+    choisis = np.argpartition(-cles, k - 1, axis=1)[:, :k]
+    return np.sort(choisis + 1, axis=1).astype(np.int16)
+
+
+def scorer_grilles(numeros: np.ndarray, regles: ReglesLoterie) -> np.ndarray:
+    """
+    Score de qualité 0-100 de chaque ligne de ``numeros``.
+
+    Mêmes pénalités que ``EuromillionsIAService._calculer_qualite``:
+    déséquilibre pairs/impairs, somme hors plage, déséquilibre hauts/bas.
+    """
+    nb = numeros.shape[1]
+    pairs = np.count_nonzero(numeros % 2 == 0, axis=1)
+    hauts = np.count_nonzero(numeros > regles.seuil_haut, axis=1)
+    somme = numeros.sum(axis=1)
+
+    def _desequilibre(compte: np.ndarray, extreme: float, marque: float) -> np.ndarray:
+        ecart = np.minimum(compte, nb - compte)
+        return np.select([ecart == 0, ecart == 1], [extreme, marque], 0.0)
+
+    optimale_min, optimale_max = regles.somme_optimale
+    acceptable_min, acceptable_max = regles.somme_acceptable
+    penalite_somme = np.select(
+        [
+            (somme < acceptable_min) | (somme > acceptable_max),
+            (somme < optimale_min) | (somme > optimale_max),
+        ],
+        [25.0, 10.0],
+        0.0,
+    )
+    score = 100.0 - _desequilibre(pairs, 30, 15) - penalite_somme - _desequilibre(hauts, 20, 10)
+    return np.clip(score, 0.0, 100.0)
+
+
+def _normaliser(poids: np.ndarray | None, taille: int) -> np.ndarray:
+    if poids is None:
+        return np.ones(taille)
+    poids = np.asarray(poids, dtype=float)
+    maximum = poids.max(initial=0.0)
+    return poids / maximum if maximum > 0 else np.ones(taille)
+
+
+def _generer_bloc(
+    regles: ReglesLoterie,
+    taille: int,
+    graine: np.random.SeedSequence,
+    poids_numeros: np.ndarray | None,
+    poids_speciaux: np.ndarray | None,
+) -> LotGrilles:
+    """Génère et note un bloc (fonction module: exécutable dans un processus)."""
+    rng = np.random.default_rng(graine)
+    numeros = tirer_sans_remise(rng, taille, regles.max_numero, regles.nb_numeros, poids_numeros)
+    speciaux = tirer_sans_remise(
+        rng, taille, regles.max_special, regles.nb_speciaux, poids_speciaux
+    )
+    return LotGrilles(
+        numeros=numeros,
+        speciaux=speciaux,
+        qualite=scorer_grilles(numeros, regles),
+        potentiel=_normaliser(poids_numeros, regles.max_numero)[numeros - 1].mean(axis=1),
+    )
+
+
+# ═══════════════════════════════════════════════════════════
+# MOTEUR
+# ═══════════════════════════════════════════════════════════
+
+
+class MoteurMonteCarlo:
+    """
+    Génère des pools de grilles par blocs, sur place ou dans un pool de processus.
+
+    Args:
+        regles: Règles du jeu (``REGLES_LOTO``, ``REGLES_EUROMILLIONS``).
+        poids_numeros: Poids des numéros 1..max_numero (uniforme si None).
+        poids_speciaux: Poids des numéros spéciaux 1..max_special.
+        taille_bloc: Nombre de grilles par bloc.
+        nb_processus: Processus du pool; None = automatique (tous les cœurs
+            au-delà de ``SEUIL_PARALLELE`` candidats, sinon sur place).
+    """
+
+    def __init__(
+        self,
+        regles: ReglesLoterie,
+        poids_numeros: np.ndarray | None = None,
+        poids_speciaux: np.ndarray | None = None,
+        taille_bloc: int = TAILLE_BLOC_DEFAUT,
+        nb_processus: int | None = None,
+    ):
+        if taille_bloc < 1:
+            raise ValueError(f"taille_bloc doit être >= 1: {taille_bloc}")
+        self.regles = regles
+        self.poids_numeros = None if poids_numeros is None else np.asarray(poids_numeros, float)
+        self.poids_speciaux = None if poids_speciaux is None else np.asarray(poids_speciaux, float)
+        self.taille_bloc = taille_bloc
+        self.nb_processus = nb_processus
+
+    def _processus(self, nb_candidats: int, nb_blocs: int) -> int:
+        if self.nb_processus is not None:
+            return max(1, min(self.nb_processus, nb_blocs))
+        if nb_candidats < SEUIL_PARALLELE:
+            return 1
+        return max(1, min(os.cpu_count() or 1, nb_blocs))
+
+    def iterer(self, nb_candidats: int, graine: int | None = None) -> Iterator[LotGrilles]:
+        """
+        Produit les blocs au fur et à mesure (résultats partiels exploitables).
+
+        À graine égale, la suite des blocs est identique quel que soit le
+        nombre de processus.
+        """
+        nb_blocs = -(-nb_candidats // self.taille_bloc)
+        if nb_blocs <= 0:
+            return
+        tailles = [self.taille_bloc] * (nb_blocs - 1)
+        tailles.append(nb_candidats - self.taille_bloc * (nb_blocs - 1))
+        graines = np.random.SeedSequence(graine).spawn(nb_blocs)
+        arguments = (
+            repeat(self.regles),
+            tailles,
+            graines,
+            repeat(self.poids_numeros),
+            repeat(self.poids_speciaux),
+        )
+
+        nb_processus = self._processus(nb_candidats, nb_blocs)
+        if nb_processus == 1:
+            yield from map(_generer_bloc, *arguments)
+            return
+
+        logger.debug(f"Simulation {self.regles.nom}: {nb_blocs} blocs sur {nb_processus} processus")
+        pool = ProcessPoolExecutor(max_workers=nb_processus, mp_context=get_context("spawn"))
+        try:
+            yield from pool.map(_generer_bloc, *arguments)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def meilleures_grilles(
+        self, nb_candidats: int, nb_grilles: int = 5, graine: int | None = None
+    ) -> LotGrilles:
+        """Les ``nb_grilles`` meilleures grilles d'un pool de ``nb_candidats``."""
+        meilleures: LotGrilles | None = None
+        for lot in self.iterer(nb_candidats, graine):
+            candidats = lot if meilleures is None else LotGrilles.concatener([meilleures, lot])
+            meilleures = candidats.meilleures(nb_grilles)
+        if meilleures is None:
+            raise ValueError("nb_candidats doit être >= 1")
+        return meilleures
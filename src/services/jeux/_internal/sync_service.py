@@ -30,7 +30,13 @@ from src.core.decorators import avec_resilience, avec_session_db
 from src.services.core.registry import service_factory
 
 from .football_data import FootballDataService, StatistiquesMarcheData
-from .loto_data import LotoDataService, StatistiqueNumeroLoto
+from .loto_data import (
+    NB_NUMEROS_CHANCE,
+    NB_NUMEROS_PRINCIPAUX,
+    LotoDataService,
+    StatistiqueNumeroLoto,
+    TirageLoto,
+)
 from .series_service import SEUIL_VALUE_ALERTE, obtenir_series_service
 
 logger = logging.getLogger(__name__)
@@ -289,12 +295,17 @@ class SyncService:
 
                 stats_globales = loto_service.calculer_toutes_statistiques(tirages)
 
+                # Séries déjà en base: seuls les nouveaux tirages sont appliqués
+
+                deja_persistees = self._appliquer_nouveaux_tirages_loto(tirages, type_numeros)
+
                 # Numéros principaux
 
                 if type_numeros in ("principal", "tous"):
                     for num, stats in stats_globales.numeros_principaux.items():
                         try:
-                            self._persister_stats_loto(stats)
+                            if not deja_persistees:
+                                self._persister_stats_loto(stats)
 
                             resultat["numeros_maj"] += 1
 
@@ -311,7 +322,8 @@ class SyncService:
                 if type_numeros in ("chance", "tous"):
                     for num, stats in stats_globales.numeros_chance.items():
                         try:
-                            self._persister_stats_loto(stats)
+                            if not deja_persistees:
+                                self._persister_stats_loto(stats)
 
                             resultat["numeros_maj"] += 1
 
@@ -353,6 +365,55 @@ class SyncService:
 
         return resultat
 
+    @avec_session_db
+    def _appliquer_nouveaux_tirages_loto(
+        self,
+        tirages: list[TirageLoto],
+        type_numeros: str,
+        db: Session | None = None,
+    ) -> bool:
+        """
+
+        Applique aux séries en base les tirages qu'elles ne comptent pas encore.
+
+        Un UPDATE ensembliste par nouveau tirage (``appliquer_tirage_loto``)
+        plutôt qu'un upsert par numéro.
+
+
+
+        Returns:
+
+            False si les stats complètes doivent être persistées numéro par
+
+            numéro (premier import, séries désalignées, trop de nouveaux tirages)
+
+        """
+
+        if type_numeros not in ("principal", "tous"):
+            return False
+
+        marches = [f"principal_{n}" for n in range(1, NB_NUMEROS_PRINCIPAUX + 1)]
+
+        if type_numeros == "tous":
+            marches += [f"chance_{n}" for n in range(1, NB_NUMEROS_CHANCE + 1)]
+
+        deja = self.series_service.nb_tirages_loto_appliques(marches, db=db)
+
+        # Au-delà d'un tirage par série, l'upsert par numéro coûte moins de requêtes
+
+        if deja is None or not 0 <= len(tirages) - deja <= len(marches):
+            return False
+
+        for tirage in tirages[deja:]:
+            self.series_service.appliquer_tirage_loto(
+                tirage.numeros,
+                tirage.numero_chance if type_numeros == "tous" else None,
+                tirage.date_tirage,
+                db=db,
+            )
+
+        return True
+
     @avec_session_db
     def _persister_stats_loto(
         self,
@@ -14,6 +14,8 @@ Implémente:
 
 - Backtest des grilles générées
 
+- Simulation Monte Carlo de pools de grilles (tirage et notation vectorisés)
+
 """
 
 import logging
@@ -23,6 +25,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
 import requests
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -30,6 +33,8 @@ from sqlalchemy.orm import Session
 from src.core.decorators import avec_session_db
 from src.core.models.jeux import GrilleEuromillions, TirageEuromillions
 from src.services.core.base import BaseAIService
+from src.services.jeux._internal.loterie_base import REGLES_EUROMILLIONS
+from src.services.jeux._internal.simulation_loterie import MoteurMonteCarlo, tirer_sans_remise
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +96,8 @@ class EuromillionsIAService(BaseAIService):
 
         self.db = db
 
+        self._rng = np.random.default_rng()
+
     def _normaliser_stats(self, stats: Any) -> dict[str, Any]:
         """Normalise une source de stats dict/object vers le format interne."""
 
@@ -301,101 +308,152 @@ class EuromillionsIAService(BaseAIService):
         if stats is None:
             stats = self.calculer_statistiques()
 
-        # Pondération: 50% fréquences + 50% retards
+        # Pondération: 50% fréquences + 50% retards, tirage sans remise
 
-        freq_numeros = stats.get("frequences_numeros", {})
+        poids_numeros, poids_etoiles = self._poids_equilibres(stats)
 
-        retards_numeros = stats.get("retards_numeros", {})
+        (numeros,) = tirer_sans_remise(
+            self._rng, 1, self.MAX_NUMERO, self.NB_NUMEROS, poids_numeros
+        )
 
-        # Score pour chaque numéro
+        (etoiles,) = tirer_sans_remise(
+            self._rng, 1, self.MAX_ETOILE, self.NB_ETOILES, poids_etoiles
+        )
+
+        numeros, etoiles = numeros.tolist(), etoiles.tolist()
+
+        # Analyser distribution
+
+        distribution = self._analyser_distribution(numeros, etoiles)
+
+        qualite = self._calculer_qualite(distribution)
+
+        return GrilleGeneree(
+            numeros=numeros,
+            etoiles=etoiles,
+            qualite=qualite,
+            strategie="équilibrée",
+            explication=f"Grille mixant fréquences historiques ({stats.get('nb_tirages', 0)} tirages) et numéros en retard. "
+            f"Distribution: {distribution['nb_pairs_numeros']} pairs, {distribution['nb_impairs_numeros']} impairs, "
+            f"somme {distribution['somme_numeros']}.",
+            distribution=distribution,
+        )
+
+    def _poids_equilibres(self, stats: dict[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+        """
+
+        Poids 50% fréquence + 50% retard (normalisés par le max) des numéros et étoiles.
 
-        scores = {}
 
-        for num in range(self.MIN_NUMERO, self.MAX_NUMERO + 1):
-            freq_norm = (
-                freq_numeros.get(num, 0) / max(freq_numeros.values()) if freq_numeros else 0.5
-            )
 
-            retard_norm = (
-                retards_numeros.get(num, 0) / max(retards_numeros.values())
-                if retards_numeros
-                else 0.5
+        Une source vide ou entièrement nulle compte pour 0.5.
+
+        """
+
+        def _normalise(valeurs: dict[int, float], maximum_valeur: int) -> np.ndarray:
+            serie = np.array(
+                [float(valeurs.get(v, 0)) for v in range(1, maximum_valeur + 1)], dtype=float
             )
 
-            scores[num] = (freq_norm * 0.5) + (retard_norm * 0.5)
+            maximum = max(valeurs.values(), default=0)
 
-        # Sélectionner 5 numéros avec probabilities
+            return serie / maximum if maximum > 0 else np.full(maximum_valeur, 0.5)
+
+        def _poids(frequences: dict, retards: dict, maximum_valeur: int) -> np.ndarray:
+            return 0.5 * _normalise(frequences, maximum_valeur) + 0.5 * _normalise(
+                retards, maximum_valeur
+            )
 
-        numeros = random.choices(
-            population=list(scores.keys()), weights=list(scores.values()), k=self.NB_NUMEROS
+        return (
+            _poids(
+                stats.get("frequences_numeros", {}),
+                stats.get("retards_numeros", {}),
+                self.MAX_NUMERO,
+            ),
+            _poids(
+                stats.get("frequences_etoiles", {}),
+                stats.get("retards_etoiles", {}),
+                self.MAX_ETOILE,
+            ),
         )
 
-        numeros = sorted(list(set(numeros)))  # Dédupliquer et trier
+    def generer_grilles_monte_carlo(
+        self,
+        stats: dict[str, Any] | None = None,
+        nb_candidats: int = 100_000,
+        nb_grilles: int = 5,
+        graine: int | None = None,
+        nb_processus: int | None = None,
+    ) -> list[GrilleGeneree]:
+        """
 
-        # Compléter si doublons
+        Simule un pool de grilles pondérées (stratégie équilibrée) et garde les meilleures.
 
-        while len(numeros) < self.NB_NUMEROS:
-            nouveau = random.choice(list(scores.keys()))
 
-            if nouveau not in numeros:
-                numeros.append(nouveau)
 
-        numeros = sorted(numeros[: self.NB_NUMEROS])
+        Les candidats sont tirés et notés par blocs numpy, en parallèle au-delà
 
-        # Étoiles (même stratégie)
+        d'un million de candidats; classement par qualité puis par poids moyen.
 
-        freq_etoiles = stats.get("frequences_etoiles", {})
 
-        retards_etoiles = stats.get("retards_etoiles", {})
 
-        scores_etoiles = {}
+        Args:
 
-        for etoile in range(self.MIN_ETOILE, self.MAX_ETOILE + 1):
-            freq_norm = (
-                freq_etoiles.get(etoile, 0) / max(freq_etoiles.values()) if freq_etoiles else 0.5
-            )
+            stats: Statistiques pré-calculées (optionnel)
 
-            retard_norm = (
-                retards_etoiles.get(etoile, 0) / max(retards_etoiles.values())
-                if retards_etoiles
-                else 0.5
-            )
+            nb_candidats: Taille du pool simulé
 
-            scores_etoiles[etoile] = (freq_norm * 0.5) + (retard_norm * 0.5)
+            nb_grilles: Nombre de grilles retournées
 
-        etoiles = random.choices(
-            population=list(scores_etoiles.keys()),
-            weights=list(scores_etoiles.values()),
-            k=self.NB_ETOILES,
-        )
+            graine: Graine pour un résultat reproductible
 
-        etoiles = sorted(list(set(etoiles)))
+            nb_processus: Processus de calcul (None = automatique)
 
-        while len(etoiles) < self.NB_ETOILES:
-            nouveau = random.choice(list(scores_etoiles.keys()))
 
-            if nouveau not in etoiles:
-                etoiles.append(nouveau)
 
-        etoiles = sorted(etoiles[: self.NB_ETOILES])
+        Returns:
 
-        # Analyser distribution
+            Grilles triées de la meilleure à la moins bonne
 
-        distribution = self._analyser_distribution(numeros, etoiles)
+        """
 
-        qualite = self._calculer_qualite(distribution)
+        if stats is None:
+            stats = self.calculer_statistiques()
 
-        return GrilleGeneree(
-            numeros=numeros,
-            etoiles=etoiles,
-            qualite=qualite,
-            strategie="équilibrée",
-            explication=f"Grille mixant fréquences historiques ({stats.get('nb_tirages', 0)} tirages) et numéros en retard. "
-            f"Distribution: {distribution['nb_pairs_numeros']} pairs, {distribution['nb_impairs_numeros']} impairs, "
-            f"somme {distribution['somme_numeros']}.",
-            distribution=distribution,
+        poids_numeros, poids_etoiles = self._poids_equilibres(stats)
+
+        moteur = MoteurMonteCarlo(
+            REGLES_EUROMILLIONS,
+            poids_numeros=poids_numeros,
+            poids_speciaux=poids_etoiles,
+            nb_processus=nb_processus,
         )
 
+        lot = moteur.meilleures_grilles(nb_candidats, nb_grilles, graine)
+
+        grilles = []
+
+        for i in range(len(lot)):
+            numeros, etoiles = lot.grille(i)
+
+            distribution = self._analyser_distribution(numeros, etoiles)
+
+            grilles.append(
+                GrilleGeneree(
+                    numeros=numeros,
+                    etoiles=etoiles,
+                    qualite=float(lot.qualite[i]),
+                    strategie="monte_carlo",
+                    explication=f"Meilleure grille n°{i + 1} sur {nb_candidats} simulées "
+                    f"(pondération fréquences + retards, {stats.get('nb_tirages', 0)} tirages). "
+                    f"Somme {distribution['somme_numeros']}, "
+                    f"{distribution['nb_pairs_numeros']} pairs.",
+                    distribution=distribution,
+                )
+            )
+
+        return grilles
+
     def generer_grille_frequences(self, stats: dict[str, Any] | None = None) -> GrilleGeneree:
         """Génère une grille basée sur les numéros les plus fréquents."""
 
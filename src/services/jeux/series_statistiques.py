@@ -3,24 +3,43 @@ Service d'analyse des patterns statistiques pour la détection de biais cognitif
 
 Implémente des tests statistiques rigoureux pour :
 - Régression vers la moyenne (z-score)
-- Hot hand fallacy (runs test)
+- Hot hand fallacy (runs test de Wald-Wolfowitz)
 - Gambler's fallacy (test d'indépendance Chi-square)
 
 Tous les tests suivent le principe que chaque événement est statistiquement indépendant.
+
+Les paris sont chargés une seule fois en colonnes numpy (:class:`SerieParis`):
+encodage des séries (run-length), probabilités conditionnelles, table de
+contingence et intervalles de confiance bootstrap sont calculés sans boucle
+Python. Les résultats sont mis en cache par utilisateur, invalidés dès qu'un
+pari est ajouté, résolu ou modifié (mise, gain, statut).
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 from scipy import stats
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from src.core.decorators import avec_session_db
 from src.core.exceptions import ErreurBaseDeDonnees
-from src.core.logging import logger
-from src.core.models import Match, PariSportif
+from src.core.models import PariSportif
+
+logger = logging.getLogger(__name__)
+
+_STATUTS_TERMINES = ("gagne", "perdu")
+
+# Indices tirés par bloc lors du bootstrap (borne la mémoire à ~8 Mo)
+_TAILLE_BLOC_BOOTSTRAP = 1 << 20
 
 
 @dataclass
@@ -34,18 +53,207 @@ class ResultatTest:
     type_pattern: str  # "regression_moyenne", "hot_hand", "gamblers_fallacy"
 
 
+# Analyses par (utilisateur, fenêtre, tirages, graine) → (signature, résultats), LRU
+_TAILLE_CACHE = 256
+_cache_analyses: OrderedDict[tuple, tuple[tuple, dict[str, ResultatTest]]] = OrderedDict()
+_verrou_cache = threading.Lock()
+
+
+# ═══════════════════════════════════════════════════════════
+# SÉRIE COLONNAIRE
+# ═══════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class SerieParis:
+    """
+    Paris en colonnes, ordre chronologique.
+
+    ``resultats`` vaut 1 (gagné), 0 (perdu) ou -1 (en attente / annulé).
+    """
+
+    ids: np.ndarray = field(repr=False)
+    resultats: np.ndarray = field(repr=False)
+    mises: np.ndarray = field(repr=False)
+    gains: np.ndarray = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self.resultats)
+
+    @classmethod
+    def depuis_lignes(cls, lignes: Iterable[Sequence[Any]]) -> SerieParis:
+        """Construit la série depuis des tuples ``(id, statut, mise, gain)``."""
+        lignes = list(lignes)
+        ids, statuts, mises, gains = zip(*lignes, strict=True) if lignes else ((), (), (), ())
+        codes = {"gagne": 1, "perdu": 0}
+        return cls(
+            ids=np.array([i or 0 for i in ids], dtype=np.int64),
+            resultats=np.array([codes.get(s, -1) for s in statuts], dtype=np.int8),
+            mises=np.array([float(m or 0) for m in mises], dtype=float),
+            gains=np.array([float(g or 0) for g in gains], dtype=float),
+        )
+
+    @classmethod
+    def depuis_paris(cls, paris: Iterable[PariSportif]) -> SerieParis:
+        """Construit la série depuis des objets ORM (ordre conservé)."""
+        return cls.depuis_lignes((p.id, p.statut, p.mise, p.gain) for p in paris)
+
+    def terminee(self) -> SerieParis:
+        """Sous-série des paris gagnés ou perdus."""
+        masque = self.resultats >= 0
+        return SerieParis(
+            ids=self.ids[masque],
+            resultats=self.resultats[masque],
+            mises=self.mises[masque],
+            gains=self.gains[masque],
+        )
+
+    @property
+    def profits(self) -> np.ndarray:
+        """Profit par pari terminé: ``gain - mise`` si gagné, ``-mise`` sinon."""
+        termines = self.terminee()
+        return np.where(termines.resultats == 1, termines.gains - termines.mises, -termines.mises)
+
+
+def _en_serie(paris: SerieParis | Sequence[PariSportif]) -> SerieParis:
+    return paris if isinstance(paris, SerieParis) else SerieParis.depuis_paris(paris)
+
+
+# ═══════════════════════════════════════════════════════════
+# PRIMITIVES VECTORISÉES
+# ═══════════════════════════════════════════════════════════
+
+
+def encoder_series(sequence: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodage run-length: valeur et longueur de chaque série consécutive.
+
+    Examples:
+        >>> encoder_series(np.array([1, 1, 0, 1]))
+        (array([1, 0, 1]), array([2, 1, 1]))
+    """
+    sequence = np.asarray(sequence)
+    if sequence.size == 0:
+        return sequence[:0], np.zeros(0, dtype=np.int64)
+    debuts = np.concatenate(([0], np.flatnonzero(np.diff(sequence)) + 1))
+    longueurs = np.diff(np.append(debuts, sequence.size))
+    return sequence[debuts], longueurs
+
+
+def statistique_runs(sequence: np.ndarray) -> tuple[int, float, float, float]:
+    """
+    Runs test de Wald-Wolfowitz (approximation normale) sur une séquence binaire.
+
+    Returns:
+        (nb_runs, runs_attendus, z, p_value bilatérale). Sans gain ou sans
+        perte, la statistique est indéfinie: z = 0 et p = 1.
+    """
+    sequence = np.asarray(sequence)
+    n = sequence.size
+    n1 = int(np.count_nonzero(sequence))
+    n0 = n - n1
+    nb_runs = int(np.count_nonzero(np.diff(sequence))) + 1 if n else 0
+    if n1 == 0 or n0 == 0:
+        return nb_runs, float(nb_runs), 0.0, 1.0
+
+    attendus = 2 * n1 * n0 / n + 1
+    variance = 2 * n1 * n0 * (2 * n1 * n0 - n) / (n**2 * (n - 1))
+    z = (nb_runs - attendus) / np.sqrt(variance)
+    return nb_runs, attendus, float(z), float(2 * stats.norm.sf(abs(z)))
+
+
+def _bornes_percentiles(tirages: np.ndarray, niveau: float) -> tuple[float | None, float | None]:
+    tirages = tirages[np.isfinite(tirages)]
+    if tirages.size == 0:
+        return None, None
+    alpha = (1 - niveau) / 2 * 100
+    bas, haut = np.percentile(tirages, [alpha, 100 - alpha])
+    return round(float(bas), 4), round(float(haut), 4)
+
+
+def intervalle_bootstrap_moyenne(
+    valeurs: np.ndarray,
+    rng: np.random.Generator,
+    nb_tirages: int = 1000,
+    niveau: float = 0.95,
+) -> tuple[float | None, float | None]:
+    """IC percentile de la moyenne par rééchantillonnage avec remise (tirages par blocs)."""
+    valeurs = np.asarray(valeurs, dtype=float)
+    n = valeurs.size
+    if n == 0:
+        return None, None
+    moyennes = np.empty(nb_tirages)
+    bloc = max(1, _TAILLE_BLOC_BOOTSTRAP // n)
+    for debut in range(0, nb_tirages, bloc):
+        fin = min(debut + bloc, nb_tirages)
+        moyennes[debut:fin] = valeurs[rng.integers(0, n, size=(fin - debut, n))].mean(axis=1)
+    return _bornes_percentiles(moyennes, niveau)
+
+
+def intervalle_bootstrap_ecart(
+    condition: np.ndarray,
+    evenement: np.ndarray,
+    rng: np.random.Generator,
+    nb_tirages: int = 1000,
+    niveau: float = 0.95,
+) -> tuple[float | None, float | None]:
+    """
+    IC de ``P(evenement | condition) - P(evenement | non condition)``.
+
+    Rééchantillonner n couples avec remise revient à tirer les effectifs des
+    4 cases (condition × événement) selon une multinomiale: même loi que le
+    bootstrap classique, en O(nb_tirages) au lieu de O(nb_tirages × n).
+    """
+    condition = np.asarray(condition, dtype=bool)
+    evenement = np.asarray(evenement, dtype=bool)
+    n = condition.size
+    if n == 0:
+        return None, None
+    cases = np.array(
+        [
+            np.count_nonzero(condition & evenement),
+            np.count_nonzero(condition & ~evenement),
+            np.count_nonzero(~condition & evenement),
+            np.count_nonzero(~condition & ~evenement),
+        ]
+    )
+    effectifs = rng.multinomial(n, cases / n, size=nb_tirages)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ecarts = effectifs[:, 0] / (effectifs[:, 0] + effectifs[:, 1]) - effectifs[:, 2] / (
+            effectifs[:, 2] + effectifs[:, 3]
+        )
+    return _bornes_percentiles(ecarts, niveau)
+
+
+def _proportion(evenement: np.ndarray, masque: np.ndarray) -> float | None:
+    total = np.count_nonzero(masque)
+    return round(float(np.count_nonzero(evenement & masque) / total), 4) if total else None
+
+
+# ═══════════════════════════════════════════════════════════
+# SERVICE
+# ═══════════════════════════════════════════════════════════
+
+
 class SeriesStatistiquesService:
     """
     Service d'analyse des patterns statistiques dans les paris sportifs.
 
     Détecte les biais cognitifs en appliquant des tests statistiques rigoureux.
+    Les tests acceptent une liste de ``PariSportif`` ou une :class:`SerieParis`.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | None = None, nb_tirages: int = 1000, graine: int = 0):
         self.db = db
+        self.nb_tirages = nb_tirages
+        # Graine fixe: mêmes paris → mêmes intervalles (cache cohérent)
+        self.graine = graine
+
+    def _rng(self) -> np.random.Generator:
+        return np.random.default_rng(self.graine)
 
     def test_regression_moyenne(
-        self, paris: list[PariSportif], seuil_z: float = 2.0
+        self, paris: SerieParis | list[PariSportif], seuil_z: float = 2.0
     ) -> ResultatTest:
         """
         Test de régression vers la moyenne via z-score.
@@ -57,45 +265,36 @@ class SeriesStatistiquesService:
         Le z-score mesure uniquement l'écart par rapport à la distribution normale.
 
         Args:
-            paris: Liste des paris récents (min 10 recommandé)
+            paris: Paris récents en ordre chronologique (min 10 recommandé)
             seuil_z: Seuil du z-score pour déclencher alerte (défaut 2.0 = 95% confiance)
 
         Returns:
             ResultatTest avec alerte si z-score dépasse seuil
         """
-        if len(paris) < 10:
+        serie = _en_serie(paris)
+        if len(serie) < 10:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris pour analyse statistique (min 10 requis)",
-                details={"nb_paris": len(paris), "z_score": None},
+                details={"nb_paris": len(serie), "z_score": None},
                 type_pattern="regression_moyenne",
             )
 
-        # Calculer gains/pertes (profit = gain - mise)
-        profits = []
-        for pari in paris:
-            if pari.statut == "gagne":
-                profit = (pari.gain or 0) - pari.mise
-            elif pari.statut == "perdu":
-                profit = -pari.mise
-            else:
-                continue  # Ignorer paris en attente
-
-            profits.append(float(profit))
+        # Profit = gain - mise (paris en attente ignorés)
+        profits = serie.profits
 
-        if len(profits) < 10:
+        if profits.size < 10:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris terminés pour analyse",
-                details={"nb_paris_termines": len(profits)},
+                details={"nb_paris_termines": int(profits.size)},
                 type_pattern="regression_moyenne",
             )
 
-        # Calculer statistiques
-        moyenne = np.mean(profits)
-        ecart_type = np.std(profits, ddof=1)
+        moyenne = float(profits.mean())
+        ecart_type = float(profits.std(ddof=1))
 
         if ecart_type == 0:
             # Tous les paris identiques - cas pathologique
@@ -109,12 +308,12 @@ class SeriesStatistiquesService:
 
         # Z-score des 5 derniers paris (moyenne récente vs globale)
         derniers_profits = profits[-5:]
-        moyenne_recente = np.mean(derniers_profits)
+        moyenne_recente = float(derniers_profits.mean())
 
         # Z-score = (x - μ) / (σ / sqrt(n))
-        z_score = (moyenne_recente - moyenne) / (ecart_type / np.sqrt(len(derniers_profits)))
+        z_score = (moyenne_recente - moyenne) / (ecart_type / np.sqrt(derniers_profits.size))
 
-        alerte = abs(z_score) > seuil_z
+        alerte = bool(abs(z_score) > seuil_z)
 
         if alerte:
             if z_score > 0:
@@ -139,18 +338,21 @@ class SeriesStatistiquesService:
             severite=severite,
             message=message,
             details={
-                "z_score": round(z_score, 2),
+                "z_score": round(float(z_score), 2),
                 "moyenne_globale": round(moyenne, 2),
                 "moyenne_recente": round(moyenne_recente, 2),
                 "ecart_type": round(ecart_type, 2),
-                "nb_paris": len(profits),
+                "ic95_moyenne_globale": intervalle_bootstrap_moyenne(
+                    profits, self._rng(), self.nb_tirages
+                ),
+                "nb_paris": int(profits.size),
                 "seuil": seuil_z,
             },
             type_pattern="regression_moyenne",
         )
 
     def test_hot_hand_fallacy(
-        self, paris: list[PariSportif], seuil_p: float = 0.05
+        self, paris: SerieParis | list[PariSportif], seuil_p: float = 0.05
     ) -> ResultatTest:
         """
         Test runs pour détecter le biais de la "main chaude" (hot hand fallacy).
@@ -160,67 +362,46 @@ class SeriesStatistiquesService:
         - Trop d'alternances : joueur change stratégie après chaque résultat (gambler's fallacy)
         - Trop peu d'alternances : joueur mise plus après gains (hot hand fallacy)
 
+        Les détails incluent P(gain | gain précédent), P(gain | perte précédente)
+        et l'IC bootstrap de leur écart.
+
         Args:
-            paris: Liste des paris récents (min 20 recommandé)
+            paris: Paris récents en ordre chronologique (min 20 recommandé)
             seuil_p: Seuil p-value (défaut 0.05)
 
         Returns:
             ResultatTest avec alerte si p-value < seuil
         """
-        if len(paris) < 20:
+        serie = _en_serie(paris)
+        if len(serie) < 20:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris pour runs test (min 20 requis)",
-                details={"nb_paris": len(paris)},
+                details={"nb_paris": len(serie)},
                 type_pattern="hot_hand",
             )
 
-        # Créer séquence binaire (1=gagne, 0=perdu)
-        sequence = []
-        for pari in paris:
-            if pari.statut == "gagne":
-                sequence.append(1)
-            elif pari.statut == "perdu":
-                sequence.append(0)
+        # Séquence binaire (1=gagne, 0=perdu)
+        sequence = serie.terminee().resultats.astype(bool)
 
-        if len(sequence) < 20:
+        if sequence.size < 20:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris terminés",
-                details={"nb_paris_termines": len(sequence)},
+                details={"nb_paris_termines": int(sequence.size)},
                 type_pattern="hot_hand",
             )
 
-        # Runs test de Wald-Wolfowitz
-        try:
-            _, p_value = stats.runs_test(np.array(sequence))
-        except Exception as e:
-            logger.error(f"Erreur runs test: {e}")
-            return ResultatTest(
-                alerte=False,
-                severite="faible",
-                message=f"Erreur calcul runs test: {e}",
-                details={},
-                type_pattern="hot_hand",
-            )
+        nb_runs, runs_attendus, z, p_value = statistique_runs(sequence)
+        valeurs, longueurs = encoder_series(sequence)
+        precedent, courant = sequence[:-1], sequence[1:]
 
         alerte = p_value < seuil_p
 
         if alerte:
-            # Compter runs (séquences consécutives)
-            nb_runs = 1
-            for i in range(1, len(sequence)):
-                if sequence[i] != sequence[i - 1]:
-                    nb_runs += 1
-
-            # Nombre attendu de runs pour séquence aléatoire
-            n1 = sum(sequence)  # Nb de 1 (gains)
-            n0 = len(sequence) - n1  # Nb de 0 (pertes)
-            expected_runs = (2 * n1 * n0) / (n1 + n0) + 1
-
-            if nb_runs < expected_runs:
+            if nb_runs < runs_attendus:
                 pattern_type = "clustering"
                 message = (
                     "Pattern 'Hot Hand' détecté: séquences de gains/pertes groupées. "
@@ -247,16 +428,26 @@ class SeriesStatistiquesService:
             message=message,
             details={
                 "p_value": round(p_value, 4),
+                "z_score": round(z, 2),
                 "pattern_type": pattern_type,
-                "nb_paris": len(sequence),
-                "taux_victoire": round(sum(sequence) / len(sequence) * 100, 1),
+                "nb_runs": nb_runs,
+                "runs_attendus": round(runs_attendus, 2),
+                "plus_longue_serie_gains": int(longueurs[valeurs].max(initial=0)),
+                "plus_longue_serie_pertes": int(longueurs[~valeurs].max(initial=0)),
+                "p_gain_apres_gain": _proportion(courant, precedent),
+                "p_gain_apres_perte": _proportion(courant, ~precedent),
+                "ic95_ecart_conditionnel": intervalle_bootstrap_ecart(
+                    precedent, courant, self._rng(), self.nb_tirages
+                ),
+                "nb_paris": int(sequence.size),
+                "taux_victoire": round(float(sequence.mean()) * 100, 1),
                 "seuil": seuil_p,
             },
             type_pattern="hot_hand",
         )
 
     def test_gamblers_fallacy(
-        self, paris: list[PariSportif], seuil_p: float = 0.05
+        self, paris: SerieParis | list[PariSportif], seuil_p: float = 0.05
     ) -> ResultatTest:
         """
         Test Chi-square d'indépendance pour détecter gambler's fallacy.
@@ -265,54 +456,50 @@ class SeriesStatistiquesService:
         Gambler's fallacy : augmenter mise après perte en espérant "se refaire".
 
         Args:
-            paris: Liste des paris récents (min 30 recommandé)
+            paris: Paris récents en ordre chronologique (min 30 recommandé)
             seuil_p: Seuil p-value (défaut 0.05)
 
         Returns:
             ResultatTest avec alerte si dépendance détectée
         """
-        if len(paris) < 30:
+        serie = _en_serie(paris)
+        if len(serie) < 30:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris pour test indépendance (min 30 requis)",
-                details={"nb_paris": len(paris)},
+                details={"nb_paris": len(serie)},
                 type_pattern="gamblers_fallacy",
             )
 
-        # Préparer données: paris[i].mise dépend-elle de paris[i-1].resultat ?
-        paris_termines = [p for p in paris if p.statut in ("gagne", "perdu")]
+        # paris[i].mise dépend-elle de paris[i-1].resultat ?
+        termines = serie.terminee()
 
-        if len(paris_termines) < 30:
+        if len(termines) < 30:
             return ResultatTest(
                 alerte=False,
                 severite="faible",
                 message="Pas assez de paris terminés",
-                details={"nb_paris_termines": len(paris_termines)},
+                details={"nb_paris_termines": len(termines)},
                 type_pattern="gamblers_fallacy",
             )
 
-        # Construire table contingence : mise (élevée/faible) vs résultat précédent (gain/perte)
-        mises = [float(p.mise) for p in paris_termines]
-        mediane_mise = np.median(mises)
+        # Table contingence : mise (élevée/faible) vs résultat précédent (gain/perte)
+        mediane_mise = float(np.median(termines.mises))
+        mise_elevee = termines.mises[1:] >= mediane_mise
+        perte_precedente = termines.resultats[:-1] == 0
 
-        # Tableau 2x2: [après gain: élevée, faible] [après perte: élevée, faible]
+        # [[apres_gain_eleve, apres_gain_faible], [apres_perte_eleve, apres_perte_faible]]
         table = [
-            [0, 0],
-            [0, 0],
-        ]  # [[apres_gain_eleve, apres_gain_faible], [apres_perte_eleve, apres_perte_faible]]
-
-        for i in range(1, len(paris_termines)):
-            pari_actuel = paris_termines[i]
-            pari_precedent = paris_termines[i - 1]
-
-            mise_elevee = pari_actuel.mise >= mediane_mise
-            perte_precedente = pari_precedent.statut == "perdu"
-
-            if perte_precedente:
-                table[1][0 if mise_elevee else 1] += 1
-            else:
-                table[0][0 if mise_elevee else 1] += 1
+            [
+                int(np.count_nonzero(~perte_precedente & mise_elevee)),
+                int(np.count_nonzero(~perte_precedente & ~mise_elevee)),
+            ],
+            [
+                int(np.count_nonzero(perte_precedente & mise_elevee)),
+                int(np.count_nonzero(perte_precedente & ~mise_elevee)),
+            ],
+        ]
 
         # Test Chi-square
         try:
@@ -327,7 +514,7 @@ class SeriesStatistiquesService:
                 type_pattern="gamblers_fallacy",
             )
 
-        alerte = p_value < seuil_p
+        alerte = bool(p_value < seuil_p)
 
         if alerte:
             # Analyser la direction de la dépendance
@@ -365,11 +552,15 @@ class SeriesStatistiquesService:
             severite=severite,
             message=message,
             details={
-                "p_value": round(p_value, 4),
-                "chi2": round(chi2, 2),
+                "p_value": round(float(p_value), 4),
+                "chi2": round(float(chi2), 2),
                 "table_contingence": table,
                 "mediane_mise": round(mediane_mise, 2),
-                "nb_paris": len(paris_termines) - 1,  # -1 car on compare paris[i] avec paris[i-1]
+                # Écart P(mise élevée | perte) - P(mise élevée | gain)
+                "ic95_ecart_mise_elevee": intervalle_bootstrap_ecart(
+                    perte_precedente, mise_elevee, self._rng(), self.nb_tirages
+                ),
+                "nb_paris": len(termines) - 1,  # -1 car on compare paris[i] avec paris[i-1]
                 "seuil": seuil_p,
             },
             type_pattern="gamblers_fallacy",
@@ -382,7 +573,11 @@ class SeriesStatistiquesService:
         """
         Analyse tous les patterns statistiques pour un utilisateur.
 
-        Exécute les 3 tests et retourne un dict de résultats.
+        Exécute les 3 tests et retourne un dict de résultats. Une requête
+        d'agrégat (dernier id, paris résolus et gagnés, sommes des mises et
+        gains) sert de signature: tant qu'elle ne change pas, les résultats
+        en cache sont réutilisés sans recharger les paris. Chaque appel
+        reçoit sa propre copie des résultats.
 
         Args:
             user_id: ID utilisateur (None = tous les paris)
@@ -395,16 +590,50 @@ class SeriesStatistiquesService:
         if db is None:
             raise ErreurBaseDeDonnees("Session DB requise")
 
-        # Récupérer paris récents
-        query = db.query(PariSportif).order_by(PariSportif.cree_le.desc())
+        filtres = [PariSportif.user_id == user_id] if user_id else []
+
+        signature = tuple(
+            db.execute(
+                select(
+                    func.max(PariSportif.id),
+                    func.count(PariSportif.id).filter(PariSportif.statut.in_(_STATUTS_TERMINES)),
+                    func.count(PariSportif.id).filter(PariSportif.statut == "gagne"),
+                    func.sum(PariSportif.mise),
+                    func.sum(PariSportif.gain),
+                ).where(*filtres)
+            ).one()
+        )
+        cle = (user_id or None, nb_paris, self.nb_tirages, self.graine)
+        with _verrou_cache:
+            en_cache = _cache_analyses.get(cle)
+            if en_cache is not None and en_cache[0] == signature:
+                _cache_analyses.move_to_end(cle)
+                return copy.deepcopy(en_cache[1])
+
+        # Derniers paris, remis en ordre chronologique
+        lignes = db.execute(
+            select(PariSportif.id, PariSportif.statut, PariSportif.mise, PariSportif.gain)
+            .where(*filtres)
+            .order_by(PariSportif.cree_le.desc(), PariSportif.id.desc())
+            .limit(nb_paris)
+        ).all()
+        serie = SerieParis.depuis_lignes(reversed(lignes))
+
+        resultats = {
+            "regression_moyenne": self.test_regression_moyenne(serie),
+            "hot_hand": self.test_hot_hand_fallacy(serie),
+            "gamblers_fallacy": self.test_gamblers_fallacy(serie),
+        }
 
-        if user_id:
-            query = query.filter(PariSportif.user_id == user_id)
+        with _verrou_cache:
+            _cache_analyses[cle] = (signature, resultats)
+            _cache_analyses.move_to_end(cle)
+            while len(_cache_analyses) > _TAILLE_CACHE:
+                _cache_analyses.popitem(last=False)
+        return copy.deepcopy(resultats)
 
-        paris = query.limit(nb_paris).all()
 
-        return {
-            "regression_moyenne": self.test_regression_moyenne(paris),
-            "hot_hand": self.test_hot_hand_fallacy(paris),
-            "gamblers_fallacy": self.test_gamblers_fallacy(paris),
-        }
+def invalider_cache_analyses() -> None:
+    """Vide le cache des analyses de patterns (tous utilisateurs)."""
+    with _verrou_cache:
+        _cache_analyses.clear()
@@ -2,18 +2,33 @@
 Service de statistiques personnelles pour le module Jeux.
 
 Calcule ROI, win rate, patterns gagnants pour Paris Sportifs, Loto et Euromillions.
+
+ROI et évolution mensuelle reposent sur des cumuls par mois: en base
+PostgreSQL, la table ``jeux_stats_mensuelles`` (tenue à jour par trigger)
+couvre les mois complets et seul le mois partiel en tête de période est
+agrégé sur les tables brutes; ailleurs, une requête ``GROUP BY mois`` par
+type de jeu couvre toute la fenêtre.
 """
 
 import logging
-from datetime import datetime, timedelta
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import and_, delete, func, literal, or_, select
 from sqlalchemy.orm import Session
 
+from src.core.db.periodes import cle_mois, expression_index_mois, index_mois
 from src.core.decorators import avec_session_db
 from src.core.exceptions import ErreurServiceIA
-from src.core.models.jeux import GrilleEuromillions, GrilleLoto, PariSportif
+from src.core.models.jeux import (
+    GrilleEuromillions,
+    GrilleLoto,
+    PariSportif,
+    StatsJeuxMensuelles,
+)
 from src.services.core.analytics import obtenir_analytics
 from src.services.jeux.bankroll_manager import get_bankroll_manager
 
@@ -29,6 +44,70 @@ def _has_attr(model: type, attr: str) -> bool:
     return hasattr(model, attr)
 
 
+@dataclass(frozen=True)
+class _SourceJeu:
+    """Table de jeu agrégée dans les cumuls mensuels."""
+
+    type_jeu: str
+    modele: type
+    colonne_date: str
+    tarif: float  # Mise retenue si la colonne ``mise`` est vide
+
+    @property
+    def colonne(self) -> Any:
+        return getattr(self.modele, self.colonne_date)
+
+    def cle_utilisateur(self, user_id: int) -> int:
+        """Clé ``user_id`` des cumuls (0 pour une table sans utilisateur)."""
+        return user_id if _has_attr(self.modele, "user_id") else 0
+
+
+_SOURCES: tuple[_SourceJeu, ...] = (
+    _SourceJeu("paris", PariSportif, "cree_le", 0.0),
+    _SourceJeu("loto", GrilleLoto, "date_creation", 2.2),  # Prix 1 grille Loto
+    _SourceJeu("euromillions", GrilleEuromillions, "date_creation", 2.5),
+)
+
+# {type_jeu: {index_mois: [nb, mises, gains]}}
+Cumuls = dict[str, dict[int, list[float]]]
+
+
+def _requete_par_mois(source: _SourceJeu, user_id: int | None, debut: datetime | None):
+    """
+    ``GROUP BY mois`` des paris / grilles résolus d'une table.
+
+    Colonnes: (user_id, index de mois, nb, mises, gains). Avec ``user_id``
+    à None, regroupe aussi par utilisateur (reconstruction des cumuls).
+    """
+    modele = source.modele
+    mois = expression_index_mois(source.colonne)
+    filtres = []
+    groupes = [mois]
+    utilisateur = literal(0)
+    if _has_attr(modele, "user_id"):
+        if user_id is None:
+            utilisateur = func.coalesce(modele.user_id, 0)
+            groupes.insert(0, utilisateur)
+        else:
+            filtres.append(modele.user_id == user_id)
+    if debut is not None:
+        filtres.append(source.colonne >= debut)
+    if _has_attr(modele, "statut"):
+        filtres.append(modele.statut.in_(_STATUTS_RESOLUS))
+
+    return (
+        select(
+            utilisateur.label("user_id"),
+            mois.label("mois"),
+            func.count(modele.id),
+            func.coalesce(func.sum(func.coalesce(modele.mise, source.tarif)), 0),
+            func.coalesce(func.sum(modele.gain), 0),
+        )
+        .where(*filtres)
+        .group_by(*groupes)
+    )
+
+
 class StatsPersonnellesService:
     """
     Service d'analyse des performances personnelles.
@@ -41,6 +120,15 @@ class StatsPersonnellesService:
     - Analyse comparative
     """
 
+    def __init__(self, utiliser_resumes: bool | None = None) -> None:
+        """
+        Args:
+            utiliser_resumes: Lire ``jeux_stats_mensuelles`` pour les mois
+                complets. None: seulement sur PostgreSQL, où les triggers
+                tiennent la table à jour.
+        """
+        self.utiliser_resumes = utiliser_resumes
+
     @avec_session_db
     def calculer_roi_global(
         self, user_id: int, jours: int = 30, session: Session | None = None
@@ -70,62 +158,14 @@ class StatsPersonnellesService:
         date_debut = datetime.now() - timedelta(days=jours)
 
         try:
-            # Paris sportifs
-            filtres_paris = []
-            if _has_attr(PariSportif, "user_id"):
-                filtres_paris.append(PariSportif.user_id == user_id)
-            if _has_attr(PariSportif, "cree_le"):
-                filtres_paris.append(PariSportif.cree_le >= date_debut)
-            if _has_attr(PariSportif, "statut"):
-                filtres_paris.append(
-                    PariSportif.statut.in_(["gagnant", "perdant", "gagne", "perdu"])
-                )
-
-            paris_query = session.query(PariSportif)
-            if filtres_paris:
-                paris_query = paris_query.filter(*filtres_paris)
-            paris = paris_query.all()
-
-            gains_paris = sum(float(p.gain) for p in paris if p.gain)
-            mises_paris = sum(float(getattr(p, "mise", 0) or 0) for p in paris)
-
-            # Loto
-            filtres_loto = []
-            if _has_attr(GrilleLoto, "user_id"):
-                filtres_loto.append(GrilleLoto.user_id == user_id)
-            if _has_attr(GrilleLoto, "date_creation"):
-                filtres_loto.append(GrilleLoto.date_creation >= date_debut)
-            if _has_attr(GrilleLoto, "statut"):
-                filtres_loto.append(GrilleLoto.statut.in_(["gagnant", "perdant", "gagne", "perdu"]))
-            grilles_loto_query = session.query(GrilleLoto)
-            if filtres_loto:
-                grilles_loto_query = grilles_loto_query.filter(*filtres_loto)
-            grilles_loto = grilles_loto_query.all()
-
-            gains_loto = sum(g.backtest.get("gain", 0) for g in grilles_loto if g.backtest)
-            mises_loto = len(grilles_loto) * 2.2  # Prix 1 grille Loto
-
-            # Euromillions
-            filtres_euro = []
-            if _has_attr(GrilleEuromillions, "user_id"):
-                filtres_euro.append(GrilleEuromillions.user_id == user_id)
-            if _has_attr(GrilleEuromillions, "date_creation"):
-                filtres_euro.append(GrilleEuromillions.date_creation >= date_debut)
-            if _has_attr(GrilleEuromillions, "statut"):
-                filtres_euro.append(
-                    GrilleEuromillions.statut.in_(["gagnant", "perdant", "gagne", "perdu"])
-                )
-            grilles_euro_query = session.query(GrilleEuromillions)
-            if filtres_euro:
-                grilles_euro_query = grilles_euro_query.filter(*filtres_euro)
-            grilles_euro = grilles_euro_query.all()
-
-            gains_euro = sum(g.backtest.get("gain", 0) for g in grilles_euro if g.backtest)
-            mises_euro = len(grilles_euro) * 2.5  # Prix 1 grille Euromillions
+            cumuls = self._cumuls_mensuels(session, user_id, date_debut)
+            totaux = {
+                type_jeu: [sum(c[k] for c in par_mois.values()) for k in range(3)]
+                for type_jeu, par_mois in cumuls.items()
+            }
 
-            # Agrégation
-            gains_totaux = gains_paris + gains_loto + gains_euro
-            mises_totales = mises_paris + mises_loto + mises_euro
+            gains_totaux = sum(t[2] for t in totaux.values())
+            mises_totales = sum(t[1] for t in totaux.values())
 
             roi = get_bankroll_manager().calculer_roi(mises_totales, gains_totaux)
 
@@ -136,8 +176,8 @@ class StatsPersonnellesService:
                 "gains_totaux": round(gains_totaux, 2),
                 "mises_totales": round(mises_totales, 2),
                 "benefice_net": round(benefice_net, 2),
-                "nb_paris": len(paris),
-                "nb_grilles": len(grilles_loto) + len(grilles_euro),
+                "nb_paris": int(totaux["paris"][0]),
+                "nb_grilles": int(totaux["loto"][0] + totaux["euromillions"][0]),
                 "periode_jours": jours,
             }
 
@@ -474,90 +514,25 @@ class StatsPersonnellesService:
 
         evolution = []
         date_reference = datetime.now()
+        index_fin = index_mois(date_reference.year, date_reference.month)
+        index_debut = index_fin - mois + 1
 
         try:
-            for i in range(mois):
-                # Calculer début/fin du mois
-                mois_courant = date_reference.month - i
-                annee_courante = date_reference.year
-
-                while mois_courant <= 0:
-                    mois_courant += 12
-                    annee_courante -= 1
-
-                date_debut = datetime(annee_courante, mois_courant, 1)
-
-                # Fin du mois
-                if mois_courant == 12:
-                    date_fin = datetime(annee_courante + 1, 1, 1)
-                else:
-                    date_fin = datetime(annee_courante, mois_courant + 1, 1)
-
-                # Calcul ROI pour ce mois
-                paris = (
-                    session.query(PariSportif)
-                    .filter(
-                        PariSportif.user_id == user_id,
-                        PariSportif.cree_le >= date_debut,
-                        PariSportif.cree_le < date_fin,
-                        PariSportif.statut.in_(["gagnant", "perdant", "gagne", "perdu"]),
-                    )
-                    .all()
-                )
-
-                gains_paris = sum(p.gain for p in paris if p.gain)
-                mises_paris = sum(p.mise for p in paris)
-
-                # Loto
-                filtres_loto = []
-                if _has_attr(GrilleLoto, "user_id"):
-                    filtres_loto.append(GrilleLoto.user_id == user_id)
-                if _has_attr(GrilleLoto, "date_creation"):
-                    filtres_loto.append(GrilleLoto.date_creation >= date_debut)
-                    filtres_loto.append(GrilleLoto.date_creation < date_fin)
-                if _has_attr(GrilleLoto, "statut"):
-                    filtres_loto.append(
-                        GrilleLoto.statut.in_(["gagnant", "perdant", "gagne", "perdu"])
-                    )
-
-                grilles_loto_query = session.query(GrilleLoto)
-                if filtres_loto:
-                    grilles_loto_query = grilles_loto_query.filter(*filtres_loto)
-                grilles_loto = grilles_loto_query.all()
-
-                gains_loto = sum(g.backtest.get("gain", 0) for g in grilles_loto if g.backtest)
-                mises_loto = len(grilles_loto) * 2.2
-
-                # Euromillions
-                filtres_euro = []
-                if _has_attr(GrilleEuromillions, "user_id"):
-                    filtres_euro.append(GrilleEuromillions.user_id == user_id)
-                if _has_attr(GrilleEuromillions, "date_creation"):
-                    filtres_euro.append(GrilleEuromillions.date_creation >= date_debut)
-                    filtres_euro.append(GrilleEuromillions.date_creation < date_fin)
-                if _has_attr(GrilleEuromillions, "statut"):
-                    filtres_euro.append(
-                        GrilleEuromillions.statut.in_(["gagnant", "perdant", "gagne", "perdu"])
-                    )
-
-                grilles_euro_query = session.query(GrilleEuromillions)
-                if filtres_euro:
-                    grilles_euro_query = grilles_euro_query.filter(*filtres_euro)
-                grilles_euro = grilles_euro_query.all()
-
-                gains_euro = sum(g.backtest.get("gain", 0) for g in grilles_euro if g.backtest)
-                mises_euro = len(grilles_euro) * 2.5
+            cumuls = self._cumuls_mensuels(
+                session, user_id, datetime(index_debut // 12, index_debut % 12 + 1, 1)
+            )
 
-                # Totaux
-                gains_total = gains_paris + gains_loto + gains_euro
-                mises_total = mises_paris + mises_loto + mises_euro
+            for index in range(index_fin, index_debut - 1, -1):
+                cumul_mois = [cumuls[s.type_jeu].get(index, [0, 0.0, 0.0]) for s in _SOURCES]
+                gains_total = sum(c[2] for c in cumul_mois)
+                mises_total = sum(c[1] for c in cumul_mois)
 
                 roi = obtenir_analytics().calculer_roi(mises_total, gains_total)
                 benefice = gains_total - mises_total
 
                 evolution.append(
                     {
-                        "mois": f"{annee_courante}-{mois_courant:02d}",
+                        "mois": cle_mois(index),
                         "roi": round(roi, 2),
                         "benefice": round(benefice, 2),
                         "gains": round(gains_total, 2),
@@ -574,3 +549,93 @@ class StatsPersonnellesService:
         except Exception as e:
             logger.error(f"❌ Erreur calcul évolution: {e}", exc_info=True)
             raise ErreurServiceIA(f"Échec calcul évolution: {e}")
+
+    # ─────────────────────────────────────────────────────────
+    # CUMULS MENSUELS
+    # ─────────────────────────────────────────────────────────
+
+    def _resumes_disponibles(self, session: Session) -> bool:
+        if self.utiliser_resumes is not None:
+            return self.utiliser_resumes
+        return session.get_bind().dialect.name == "postgresql"
+
+    def _cumuls_mensuels(self, session: Session, user_id: int, debut: datetime) -> Cumuls:
+        """Cumuls par jeu et par mois des paris / grilles résolus depuis ``debut``."""
+        cumuls: Cumuls = {
+            source.type_jeu: defaultdict(lambda: [0, 0.0, 0.0]) for source in _SOURCES
+        }
+
+        def _ajouter(type_jeu: str, mois: int, nb: int, mises: Any, gains: Any) -> None:
+            cumul = cumuls[type_jeu][int(mois)]
+            cumul[0] += int(nb or 0)
+            cumul[1] += float(mises or 0)
+            cumul[2] += float(gains or 0)
+
+        resumes_disponibles = self._resumes_disponibles(session)
+        frontiere = debut
+        if resumes_disponibles:
+            # Premier mois complet de la période: au-delà, les cumuls suffisent
+            index = index_mois(debut.year, debut.month)
+            if debut != datetime(debut.year, debut.month, 1):
+                index += 1
+            frontiere = datetime(index // 12, index % 12 + 1, 1)
+            resumes = session.execute(
+                select(
+                    StatsJeuxMensuelles.type_jeu,
+                    StatsJeuxMensuelles.mois,
+                    StatsJeuxMensuelles.nb,
+                    StatsJeuxMensuelles.mises,
+                    StatsJeuxMensuelles.gains,
+                ).where(
+                    StatsJeuxMensuelles.mois >= frontiere.date(),
+                    or_(
+                        *(
+                            and_(
+                                StatsJeuxMensuelles.type_jeu == source.type_jeu,
+                                StatsJeuxMensuelles.user_id == source.cle_utilisateur(user_id),
+                            )
+                            for source in _SOURCES
+                        )
+                    ),
+                )
+            )
+            for type_jeu, mois, nb, mises, gains in resumes:
+                _ajouter(type_jeu, index_mois(mois.year, mois.month), nb, mises, gains)
+
+        if frontiere > debut or not resumes_disponibles:
+            for source in _SOURCES:
+                requete = _requete_par_mois(source, user_id, debut)
+                if frontiere > debut:
+                    requete = requete.where(source.colonne < frontiere)
+                for _, mois, nb, mises, gains in session.execute(requete):
+                    _ajouter(source.type_jeu, mois, nb, mises, gains)
+
+        return cumuls
+
+    @avec_session_db
+    def reconstruire_stats_mensuelles(self, session: Session | None = None) -> int:
+        """
+        Recalcule ``jeux_stats_mensuelles`` depuis les tables brutes.
+
+        Les triggers maintiennent la table au fil de l'eau; cette méthode sert
+        à l'initialiser ou à la réparer. Retourne le nombre de lignes écrites.
+        """
+        session.execute(delete(StatsJeuxMensuelles))
+        lignes = [
+            StatsJeuxMensuelles(
+                user_id=int(utilisateur),
+                type_jeu=source.type_jeu,
+                mois=date(int(mois) // 12, int(mois) % 12 + 1, 1),
+                nb=int(nb),
+                mises=Decimal(str(mises)),
+                gains=Decimal(str(gains)),
+            )
+            for source in _SOURCES
+            for utilisateur, mois, nb, mises, gains in session.execute(
+                _requete_par_mois(source, None, None)
+            )
+        ]
+        session.add_all(lignes)
+        session.commit()
+        logger.info(f"✅ {len(lignes)} cumuls mensuels jeux reconstruits")
+        return len(lignes)
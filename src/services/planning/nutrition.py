@@ -22,6 +22,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from src.core.utils.classification_texte import ClassifieurMotsCles
+
 if TYPE_CHECKING:
     from src.core.models.planning import Repas
 
@@ -208,6 +210,39 @@ _MOTS_LAITAGE_IMPLICITES: list[str] = [
     "fondue",
 ]
 
+# Classifieur unique du nom du plat: protéines (par ordre de priorité) et
+# composants implicites détectés en une seule passe (casse/accents ignorés)
+_CLASSIFIEUR_PLAT = ClassifieurMotsCles(
+    {
+        **dict(_HEURISTIQUES_PROTEINES),
+        "legumes_implicites": _MOTS_LEGUMES_IMPLICITES,
+        "feculents_implicites": _MOTS_FECULENTS_IMPLICITES,
+        "laitage_implicite": _MOTS_LAITAGE_IMPLICITES,
+    }
+)
+
+# Texte libre de la protéine d'accompagnement (ordre = priorité)
+_CLASSIFIEUR_PROTEINE_ACCOMPAGNEMENT = ClassifieurMotsCles(
+    {
+        "proteines_poisson": [
+            "saumon", "cabillaud", "colin", "merlu", "thon", "truite", "maquereau",
+            "sardine", "dorade",
+        ],
+        "proteines_legumineuses": [
+            "lentille", "pois chiche", "haricot", "flageolet", "fève", "soja",
+        ],
+        "proteines_volaille": ["poulet", "dinde", "volaille", "lapin"],
+        "proteines_oeuf": ["oeuf", "omelette", "quiche"],
+        "proteines_viande_rouge": ["bœuf", "porc", "agneau", "veau", "steak", "côte", "bifteck"],
+    }
+)
+
+
+def _proteine_du_plat(texte: str | None) -> str | None:
+    """Catégorie protéique la plus prioritaire détectée dans un nom de plat."""
+    categorie = _CLASSIFIEUR_PLAT.premiere(texte)
+    return categorie if categorie in CATEGORIES_PROTEINES else None
+
 
 def _categorie_from_repas(repas: "Repas") -> str | None:
     """Déduit la catégorie nutritionnelle du plat principal.
@@ -223,23 +258,13 @@ def _categorie_from_repas(repas: "Repas") -> str | None:
             return recette.categorie_nutritionnelle
         if recette.type_proteines:
             return _MAP_TYPE_PROTEINES.get(recette.type_proteines.lower())
-        nom_recette = (recette.nom or "").lower()
-        if nom_recette:
-            for categorie, mots_cles in _HEURISTIQUES_PROTEINES:
-                for mot in mots_cles:
-                    if mot in nom_recette:
-                        return categorie
+        categorie = _proteine_du_plat(recette.nom)
+        if categorie:
+            return categorie
 
     # Fallback sur repas.notes (nom du plat) quand la recette n'est pas chargée —
     # typiquement lors de la génération IA avant flush de la session SQLAlchemy.
-    notes = (getattr(repas, "notes", None) or "").lower()
-    if notes:
-        for categorie, mots_cles in _HEURISTIQUES_PROTEINES:
-            for mot in mots_cles:
-                if mot in notes:
-                    return categorie
-
-    return None
+    return _proteine_du_plat(getattr(repas, "notes", None))
 
 
 def _valeur_repas_presente(valeur: object) -> bool:
@@ -263,8 +288,7 @@ def _a_legumes(repas: "Repas") -> bool:
     ):
         return True
     # Détection implicite : légumes déjà dans le nom du plat (champ vidé par _nettoyer_si_inclus_dans_nom)
-    notes = (getattr(repas, "notes", None) or "").lower()
-    return bool(notes) and any(mot in notes for mot in _MOTS_LEGUMES_IMPLICITES)
+    return _CLASSIFIEUR_PLAT.contient(getattr(repas, "notes", None), "legumes_implicites")
 
 
 def _a_feculents(repas: "Repas") -> bool:
@@ -274,8 +298,7 @@ def _a_feculents(repas: "Repas") -> bool:
     ):
         return True
     # Détection implicite : féculents déjà dans le nom du plat (champ vidé par _nettoyer_si_inclus_dans_nom)
-    notes = (getattr(repas, "notes", None) or "").lower()
-    return bool(notes) and any(mot in notes for mot in _MOTS_FECULENTS_IMPLICITES)
+    return _CLASSIFIEUR_PLAT.contient(getattr(repas, "notes", None), "feculents_implicites")
 
 
 def _a_laitage(repas: "Repas") -> bool:
@@ -288,8 +311,7 @@ def _a_laitage(repas: "Repas") -> bool:
     """
     if bool(getattr(repas, "laitage", None)):
         return True
-    notes = (getattr(repas, "notes", None) or "").lower()
-    return bool(notes) and any(mot in notes for mot in _MOTS_LAITAGE_IMPLICITES)
+    return _CLASSIFIEUR_PLAT.contient(getattr(repas, "notes", None), "laitage_implicite")
 
 
 def _a_proteines(repas: "Repas") -> bool:
@@ -510,17 +532,9 @@ def analyser_distribution_proteines_semaine(
                 compteurs[cat_acc] += 1
         elif prot_acc_text:
             # Heuristique sur le texte libre
-            txt = prot_acc_text.lower()
-            if any(mot in txt for mot in ("saumon", "cabillaud", "colin", "merlu", "thon", "truite", "maquereau", "sardine", "dorade")):
-                compteurs["proteines_poisson"] += 1
-            elif any(mot in txt for mot in ("lentille", "pois chiche", "haricot", "flageolet", "fève", "soja")):
-                compteurs["proteines_legumineuses"] += 1
-            elif any(mot in txt for mot in ("poulet", "dinde", "volaille", "lapin")):
-                compteurs["proteines_volaille"] += 1
-            elif any(mot in txt for mot in ("oeuf", "œuf", "omelette", "quiche")):
-                compteurs["proteines_oeuf"] += 1
-            elif any(mot in txt for mot in ("bœuf", "porc", "agneau", "veau", "steak", "côte", "bifteck")):
-                compteurs["proteines_viande_rouge"] += 1
+            cat_texte = _CLASSIFIEUR_PROTEINE_ACCOMPAGNEMENT.premiere(prot_acc_text)
+            if cat_texte:
+                compteurs[cat_texte] += 1
 
     alertes: list[str] = []
     recommandations: list[str] = []
@@ -12,6 +12,7 @@ et génère un résumé narratif via Mistral AI.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections import defaultdict
 from datetime import date
@@ -160,7 +161,9 @@ class BilanMensuelService(BaseAIService):
 
         fin = date(annee, num_mois, dernier_jour)
 
-        donnees = self._collecter_donnees(debut, fin)
+        # Collecte SQL synchrone: hors de la boucle (partagée par les ponts sync→async)
+
+        donnees = await asyncio.to_thread(self._collecter_donnees, debut, fin)
 
         # Générer le résumé IA
 
@@ -239,8 +239,9 @@ class BriefingMatinalService(BaseAIService):
     @avec_session_db
     def _section_budget(self, *, db=None) -> dict[str, Any]:
         """Résumé budget du mois en cours."""
-        from sqlalchemy import extract, func
+        from sqlalchemy import func
 
+        from src.core.db.periodes import filtre_mois
         from src.core.models import BudgetFamille
 
         aujourd_hui = date.today()
@@ -248,8 +249,7 @@ class BriefingMatinalService(BaseAIService):
         total = (
             db.query(func.sum(BudgetFamille.montant))
             .filter(
-                extract("month", BudgetFamille.date) == aujourd_hui.month,
-                extract("year", BudgetFamille.date) == aujourd_hui.year,
+                filtre_mois(BudgetFamille.date, aujourd_hui.year, aujourd_hui.month),
             )
             .scalar()
         )
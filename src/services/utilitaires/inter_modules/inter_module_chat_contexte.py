@@ -147,8 +147,9 @@ class ChatContexteMultiModuleService:
     @avec_session_db
     def _contexte_budget(self, *, db=None) -> dict[str, Any]:
         """Résumé du budget du mois en cours."""
-        from sqlalchemy import extract, func
+        from sqlalchemy import func
 
+        from src.core.db.periodes import filtre_mois
         from src.core.models import BudgetFamille
 
         aujourd_hui = date.today()
@@ -160,8 +161,7 @@ class ChatContexteMultiModuleService:
                 func.count(BudgetFamille.id),
             )
             .filter(
-                extract("month", BudgetFamille.date) == aujourd_hui.month,
-                extract("year", BudgetFamille.date) == aujourd_hui.year,
+                filtre_mois(BudgetFamille.date, aujourd_hui.year, aujourd_hui.month),
             )
             .group_by(BudgetFamille.categorie)
             .all()
@@ -15,6 +15,7 @@ from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 
 from src.core.db import obtenir_contexte_db
+from src.core.db.periodes import filtre_annee, filtre_mois
 from src.core.models.utilitaires import (
     ContactUtile,
     EntreeJournal,
@@ -130,11 +131,10 @@ class JournalService:
                 )
             elif mois and annee:
                 query = query.filter(
-                    func.extract("month", EntreeJournal.date_entree) == mois,
-                    func.extract("year", EntreeJournal.date_entree) == annee,
+                    filtre_mois(EntreeJournal.date_entree, annee, mois),
                 )
             elif annee:
-                query = query.filter(func.extract("year", EntreeJournal.date_entree) == annee)
+                query = query.filter(filtre_annee(EntreeJournal.date_entree, annee))
             return query.order_by(desc(EntreeJournal.date_entree)).all()
 
     def obtenir_par_date(self, date_entree: date) -> EntreeJournal | None:
@@ -175,7 +175,7 @@ class JournalService:
                 EntreeJournal.humeur.isnot(None)
             )
             if annee:
-                query = query.filter(func.extract("year", EntreeJournal.date_entree) == annee)
+                query = query.filter(filtre_annee(EntreeJournal.date_entree, annee))
             results = query.group_by(EntreeJournal.humeur).all()
             return {humeur: count for humeur, count in results}
 
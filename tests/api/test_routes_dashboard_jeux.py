@@ -215,6 +215,26 @@ class TestFormatDashboard:
         query.scalar.return_value = 0
         query.count.return_value = 0
         query.all.return_value = []
+        # Snapshot agrégé : une ligne de compteurs + des listes vides
+        execution = session.execute.return_value
+        execution.scalar_one_or_none.return_value = None
+        execution.all.return_value = []
+        execution.mappings.return_value.one.return_value = dict.fromkeys(
+            (
+                "recettes_total",
+                "repas_semaine",
+                "taches_retard",
+                "activites_a_venir",
+                "stocks_alerte",
+                "budget_total",
+                "habitat_alertes",
+                "budget_deco",
+                "zones_jardin",
+                "docs_expires",
+                "docs_bientot",
+            ),
+            0,
+        )
         mock_session.return_value = ctx
 
         response = await client.get("/api/v1/dashboard")
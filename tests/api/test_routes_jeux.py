@@ -170,3 +170,19 @@ class TestRoutesLoto:
         """GET /api/v1/jeux/loto/grilles?tirage_id=1 accepte le filtre."""
         response = client.get("/api/v1/jeux/loto/grilles?tirage_id=1")
         assert response.status_code in (200, 500)
+
+    def test_generer_grille_statistique_monte_carlo(self, client):
+        """POST /api/v1/jeux/loto/generer-grille tire parmi les meilleures grilles simulées."""
+        svc = MagicMock()
+        svc.tirer_grille.return_value = {
+            "numeros": [3, 17, 22, 38, 49],
+            "numero_chance": 4,
+            "qualite": 100.0,
+        }
+        with patch("src.services.jeux.obtenir_loto_data_service", return_value=svc):
+            response = client.post("/api/v1/jeux/loto/generer-grille", json={})
+
+        assert response.status_code == 200
+        assert response.json()["numeros"] == [3, 17, 22, 38, 49]
+        assert response.json()["special"] == [4]
+        svc.tirer_grille.assert_called_once_with(svc.calculer_toutes_statistiques.return_value)
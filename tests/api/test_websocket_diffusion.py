@@ -0,0 +1,184 @@
+"""
+Tests de la diffusion WebSocket (src/api/websocket/diffusion.py):
+- Encodage unique des broadcasts
+- Files d'envoi bornées (client lent fermé sans bloquer les autres)
+- Republication inter-workers via backplane
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.api.websocket import diffusion
+from src.api.websocket.diffusion import ConnexionWS, DiffuseurWS, encoder_message
+from src.api.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """WebSocket minimal enregistrant les trames texte envoyées."""
+
+    def __init__(self, bloquant: bool = False):
+        self.envoyes: list[str] = []
+        self.bloquant = bloquant
+        self.code_fermeture: int | None = None
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, data: str):
+        if self.bloquant:
+            await asyncio.Event().wait()
+        self.envoyes.append(data)
+
+    async def close(self, code: int = 1000):
+        self.code_fermeture = code
+
+
+class BackplaneMemoire:
+    """Backplane en mémoire reliant plusieurs diffuseurs (simule plusieurs workers)."""
+
+    nom = "memoire"
+
+    def __init__(self):
+        self.abonnes: list = []
+
+    def demarrer(self, callback):
+        self.abonnes.append(callback)
+
+    def publier(self, donnees: str):
+        for callback in list(self.abonnes):
+            callback(donnees)
+
+    def arreter(self):
+        self.abonnes.clear()
+
+
+@pytest.fixture
+def diffuseur_local():
+    """Diffuseur mono-processus isolé pour chaque test."""
+    diffuseur = DiffuseurWS(backplane=diffusion.BackplaneLocal())
+    with patch.object(diffusion, "_diffuseur", diffuseur):
+        yield diffuseur
+
+
+async def _vider_files():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestEncodage:
+    def test_format_identique_a_send_json(self):
+        assert encoder_message({"type": "sync", "nom": "Crème"}) == '{"type":"sync","nom":"Crème"}'
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encode_une_seule_fois(self, diffuseur_local):
+        manager = ConnectionManager("courses")
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for i, ws in enumerate(sockets):
+            await manager.connect(ws, 1, f"u{i}")
+        await _vider_files()
+        for ws in sockets:
+            ws.envoyes.clear()
+
+        with patch("src.api.websocket.manager.encoder_message", wraps=encoder_message) as encodeur:
+            await manager.broadcast(1, {"type": "sync", "action": "item_added"})
+            await _vider_files()
+
+        assert encodeur.call_count == 1
+        assert all(ws.envoyes == ['{"type":"sync","action":"item_added"}'] for ws in sockets)
+
+
+class TestFilesBornees:
+    @pytest.mark.asyncio
+    async def test_client_lent_ferme_sans_bloquer_les_autres(self, diffuseur_local):
+        manager = ConnectionManager("planning")
+        rapide, lent = FakeWebSocket(), FakeWebSocket(bloquant=True)
+        await manager.connect(rapide, 2, "rapide")
+        await manager.connect(lent, 2, "lent")
+        manager._connexions[2]["lent"]._file = asyncio.Queue(maxsize=3)
+        await _vider_files()
+        rapide.envoyes.clear()
+
+        for i in range(10):
+            await manager.broadcast(2, {"type": "sync", "n": i})
+        await _vider_files()
+
+        assert [json.loads(m)["n"] for m in rapide.envoyes] == list(range(10))
+        assert lent.code_fermeture == 1013
+        assert diffuseur_local.statistiques["connexions_saturees"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ordre_preserve_entre_personnel_et_broadcast(self, diffuseur_local):
+        manager = ConnectionManager("notes")
+        ws = FakeWebSocket()
+        await manager.connect(ws, 3, "seul")
+        await manager.broadcast(3, {"type": "a"})
+        await manager.send_personal(ws, {"type": "b"})
+        await _vider_files()
+
+        assert [json.loads(m)["type"] for m in ws.envoyes] == ["users_list", "a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_envoi_depuis_un_autre_thread(self):
+        ws = FakeWebSocket()
+        connexion = ConnexionWS(ws)
+
+        await asyncio.to_thread(connexion.envoyer, "x")
+        await _vider_files()
+
+        assert ws.envoyes == ["x"]
+        connexion.fermer()
+
+
+class TestBackplane:
+    @pytest.mark.asyncio
+    async def test_broadcast_atteint_un_autre_worker(self):
+        backplane = BackplaneMemoire()
+        worker_a = DiffuseurWS(backplane=backplane)
+        worker_b = DiffuseurWS(backplane=backplane)
+
+        with patch.object(diffusion, "_diffuseur", worker_a):
+            manager_a = ConnectionManager("courses")
+        with patch.object(diffusion, "_diffuseur", worker_b):
+            manager_b = ConnectionManager("courses")
+            ws_b = FakeWebSocket()
+            await manager_b.connect(ws_b, 9, "sur-b")
+        with patch.object(diffusion, "_diffuseur", worker_a):
+            ws_a = FakeWebSocket()
+            await manager_a.connect(ws_a, 9, "sur-a")
+            await _vider_files()
+            ws_a.envoyes.clear()
+            ws_b.envoyes.clear()
+
+            await manager_a.broadcast(9, {"type": "sync", "action": "item_checked"})
+            await _vider_files()
+
+        # Une seule copie côté émetteur: le worker ignore sa propre republication
+        assert ws_a.envoyes == ['{"type":"sync","action":"item_checked"}']
+        assert ws_b.envoyes == ws_a.envoyes
+        assert worker_b.statistiques["recus"] >= 1
+
+    def test_exclusion_transmise(self):
+        worker = DiffuseurWS(backplane=BackplaneMemoire())
+        recus = []
+
+        class ManagerStub:
+            resource_type = "planning"
+
+            def diffuser_local(self, resource_id, payload, exclude_user):
+                recus.append((resource_id, payload, exclude_user))
+
+        worker.enregistrer(ManagerStub())
+        worker.recevoir('["autre-worker", "planning", 4, "u1"]\n{"type":"sync"}')
+        worker.recevoir(f'["{worker.origine}", "planning", 4, null]\n{{}}')
+        worker.recevoir("enveloppe invalide")
+
+        assert recus == [(4, '{"type":"sync"}', "u1")]
+
+    def test_backplane_local_par_defaut_hors_postgres(self):
+        assert isinstance(diffusion.creer_backplane("auto"), diffusion.BackplaneLocal)
+        assert isinstance(diffusion.creer_backplane("local"), diffusion.BackplaneLocal)
@@ -0,0 +1,159 @@
+"""Benchmark: classification d'ingrédients compilée vs boucles de sous-chaînes.
+
+Vérifie que le classifieur compilé (et son cache) rend exactement les
+résultats des boucles de sous-chaînes qu'il remplace, puis compare leurs
+débits sur le même corpus. Les assertions portent sur des rapports (meilleur
+de plusieurs passes), jamais sur des durées absolues.
+"""
+
+import time
+
+import pytest
+
+# Une semaine réaliste: 14 repas (déjeuner + dîner) et leurs ingrédients de courses
+SEMAINE = [
+    "Saumon grillé, riz basmati et courgettes",
+    "Gratin dauphinois et salade verte",
+    "Curry de lentilles corail au lait de coco",
+    "Quiche lorraine et salade",
+    "Poulet rôti, pommes de terre grenaille",
+    "Lasagnes bolognaise",
+    "Omelette aux champignons",
+    "Dahl de lentilles et riz",
+    "Tajine d'agneau aux légumes",
+    "Pâtes carbonara",
+    "Risotto aux asperges",
+    "Bœuf bourguignon et purée",
+    "Soupe de potiron et tartines",
+    "Tartiflette",
+]
+INGREDIENTS = [
+    "lait demi-écrémé",
+    "lait d'avoine",
+    "crème fraîche",
+    "beurre doux",
+    "œufs frais",
+    "farine de blé",
+    "pâtes",
+    "riz basmati",
+    "pommes de terre",
+    "carottes",
+    "courgettes",
+    "tomates cerises",
+    "saumon",
+    "poulet fermier",
+    "bœuf haché",
+    "lentilles corail",
+    "emmental râpé",
+    "yaourt nature",
+    "pommes",
+    "bananes",
+    "huile d'olive",
+    "sel",
+    "poivre",
+] * 2
+
+
+def _contient(texte: str, mots) -> bool:
+    """Référence: boucle de sous-chaînes remplacée (casse ignorée, accents exacts)."""
+    texte = texte.casefold()
+    return any(m.casefold() in texte for m in mots)
+
+
+def _meilleure_duree(fonction, passes: int = 7) -> float:
+    durees = []
+    for _ in range(passes):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+
+def _famille_par_boucles(nom: str) -> tuple[str | None, str | None]:
+    """Ancienne détection: clés triées par longueur, première sous-chaîne trouvée."""
+    from src.services.cuisine.courses.constantes import MAPPING_FAMILLES
+
+    nom_normalise = nom.casefold().strip()
+    for mot_cle in sorted(MAPPING_FAMILLES, key=len, reverse=True):
+        if mot_cle.casefold() in nom_normalise:
+            return MAPPING_FAMILLES[mot_cle]
+    return (None, None)
+
+
+@pytest.mark.benchmark
+def test_classification_plats_semaine():
+    from src.services.planning.nutrition import (
+        _CLASSIFIEUR_PLAT,
+        _HEURISTIQUES_PROTEINES,
+        _MOTS_FECULENTS_IMPLICITES,
+        _MOTS_LAITAGE_IMPLICITES,
+        _MOTS_LEGUMES_IMPLICITES,
+        _proteine_du_plat,
+    )
+
+    def boucles(plat: str) -> tuple:
+        return (
+            next((c for c, mots in _HEURISTIQUES_PROTEINES if _contient(plat, mots)), None),
+            _contient(plat, _MOTS_LEGUMES_IMPLICITES),
+            _contient(plat, _MOTS_FECULENTS_IMPLICITES),
+            _contient(plat, _MOTS_LAITAGE_IMPLICITES),
+        )
+
+    def classifieur(plat: str) -> tuple:
+        return (
+            _proteine_du_plat(plat),
+            _CLASSIFIEUR_PLAT.contient(plat, "legumes_implicites"),
+            _CLASSIFIEUR_PLAT.contient(plat, "feculents_implicites"),
+            _CLASSIFIEUR_PLAT.contient(plat, "laitage_implicite"),
+        )
+
+    reference = [boucles(plat) for plat in SEMAINE]
+    _CLASSIFIEUR_PLAT.mots.cache_clear()
+    _CLASSIFIEUR_PLAT.categories.cache_clear()
+    froid = [classifieur(plat) for plat in SEMAINE]
+    chaud = [classifieur(plat) for plat in SEMAINE]
+
+    assert froid == reference
+    assert chaud == reference
+    assert _CLASSIFIEUR_PLAT.categories.cache_info().hits >= len(SEMAINE)
+
+
+@pytest.mark.benchmark
+def test_detection_familles_liste_courses():
+    from src.services.cuisine.courses.suggestion import _classifieur_familles, detecter_famille
+
+    _classifieur_familles().mots.cache_clear()
+    _classifieur_familles().categories.cache_clear()
+
+    attendu = [_famille_par_boucles(nom) for nom in INGREDIENTS]
+    assert [detecter_famille(nom) for nom in INGREDIENTS] == attendu
+    assert detecter_famille("lait d'avoine") != detecter_famille("lait demi-écrémé")
+
+
+@pytest.mark.benchmark
+def test_detection_familles_plus_rapide_que_les_boucles():
+    from src.services.cuisine.courses.suggestion import _classifieur_familles, detecter_famille
+
+    classifieur = _classifieur_familles()
+
+    def boucles():
+        for nom in INGREDIENTS:
+            _famille_par_boucles(nom)
+
+    def compile_froid():
+        classifieur.mots.cache_clear()
+        classifieur.categories.cache_clear()
+        for nom in INGREDIENTS:
+            detecter_famille(nom)
+
+    def compile_chaud():
+        for nom in INGREDIENTS:
+            detecter_famille(nom)
+
+    reference = _meilleure_duree(boucles)
+    froid = _meilleure_duree(compile_froid)
+    chaud = _meilleure_duree(compile_chaud)
+
+    # Mesuré ~x4 à froid et ~x25 avec cache: marges larges pour les CI chargées
+    assert froid * 2 < reference
+    assert chaud * 5 < reference
@@ -19,6 +19,9 @@ os.environ["RATE_LIMITING_DISABLED"] = "true"
 # CONFIGURER L'ENVIRONNEMENT DE TEST POUR ACTIVER L'AUTO-AUTH
 os.environ["ENVIRONMENT"] = "test"
 
+# PAS DE MAGASIN OPENFOODFACTS LOCAL PARTAGÉ ENTRE LES TESTS
+os.environ["OFF_MAGASIN_LOCAL"] = ""
+
 # Configurer le chemin pour les imports
 workspace_root = Path(__file__).parent.parent
 if str(workspace_root) not in sys.path:
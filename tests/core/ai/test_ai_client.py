@@ -89,7 +89,7 @@ class TestClientIAAppels:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.client.obtenir_client_http")
     async def test_appel_simple(self, mock_async_client, mock_params):
         """Test un appel API simple."""
         # Configurer les mocks
@@ -147,7 +147,7 @@ class TestClientIAAppels:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.client.obtenir_client_http")
     async def test_appel_avec_retry(self, mock_async_client, mock_params):
         """Test retry automatique sur erreur réseau."""
         mock_params.return_value = MagicMock(
@@ -447,7 +447,7 @@ class TestClientIAChatWithVision:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.vision.obtenir_client_http")
     async def test_chat_with_vision_success(self, mock_async_client, mock_params):
         """Test appel vision réussi."""
         mock_params.return_value = MagicMock(
@@ -494,7 +494,7 @@ class TestClientIAChatWithVision:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.vision.obtenir_client_http")
     async def test_chat_with_vision_empty_response(self, mock_async_client, mock_params):
         """Test erreur si réponse vide."""
         mock_params.return_value = MagicMock(
@@ -535,7 +535,7 @@ class TestClientIARetryLogic:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.client.obtenir_client_http")
     async def test_appel_all_retries_fail(self, mock_async_client, mock_params):
         """Test échec après toutes les tentatives."""
         mock_params.return_value = MagicMock(
@@ -597,7 +597,7 @@ class TestClientIARetryLogic:
 
     @pytest.mark.asyncio
     @patch("src.core.ai.client.obtenir_parametres")
-    @patch("src.core.ai.client.httpx.AsyncClient")
+    @patch("src.core.ai.client.obtenir_client_http")
     async def test_effectuer_appel_empty_response(self, mock_async_client, mock_params):
         """Test _effectuer_appel avec réponse vide."""
         mock_params.return_value = MagicMock(
@@ -0,0 +1,113 @@
+"""
+Tests pour src/core/ai/gabarits.py - Gabarits de prompts compilés.
+"""
+
+from src.core.ai.gabarits import (
+    GabaritPrompt,
+    SectionDynamique,
+    estimer_tokens,
+    partie_variable,
+)
+
+CONSIGNES = "Réponds en JSON.\n\nRÈGLES:\n1. Une recette par ligne\n2. Noms identiques"
+
+
+class TestEstimerTokens:
+    def test_ponctuation_et_mots(self):
+        assert estimer_tokens("") == 0
+        assert estimer_tokens("riz, pois.") == 4
+        # 13 caractères → 4 sous-mots
+        assert estimer_tokens("anticonstitut") == 4
+
+    def test_additif_sur_les_lignes(self):
+        lignes = ["- Poulet basquaise", "- Gratin dauphinois", "- Dal de lentilles"]
+        assert estimer_tokens("\n".join(lignes)) == sum(estimer_tokens(l) for l in lignes)
+
+
+class TestGabaritPrompt:
+    def test_prefixe_stable_et_empreinte(self):
+        gabarit = GabaritPrompt("test_stable", [CONSIGNES])
+        a = gabarit.rendre([SectionDynamique("donnees", "Recettes:\n1. Dal")])
+        b = gabarit.rendre([SectionDynamique("donnees", "Recettes:\n1. Paella\n2. Tajine")])
+
+        assert a.texte.startswith(gabarit.prefixe + "\n\n")
+        assert b.texte.startswith(gabarit.prefixe + "\n\n")
+        assert a.empreinte_prefixe == b.empreinte_prefixe == gabarit.empreinte
+        assert GabaritPrompt("autre", [CONSIGNES + "."]).empreinte != gabarit.empreinte
+
+    def test_sans_budget_rien_n_est_tronque(self):
+        gabarit = GabaritPrompt("test_complet", [CONSIGNES])
+        rendu = gabarit.rendre(
+            [SectionDynamique("a", "A"), SectionDynamique("vide", ""), SectionDynamique("b", "B")]
+        )
+
+        assert rendu.texte == f"{gabarit.prefixe}\n\nA\n\nB"
+        assert rendu.sections_tronquees == ()
+
+    def test_troncature_par_priorite_puis_par_lignes(self):
+        gabarit = GabaritPrompt("test_budget", [CONSIGNES])
+        favoris = "FAVORIS:\n" + "\n".join(f"- Recette numéro {i}" for i in range(40))
+        robots = "ROBOTS:\n- Cookeo\n- Thermomix"
+        sections = [
+            SectionDynamique("contexte", "CONTEXT: semaine du 13/04"),
+            SectionDynamique("robots", robots, priorite=1),
+            SectionDynamique("favoris", favoris, priorite=2, par_lignes=True),
+        ]
+        complet = gabarit.rendre(sections)
+        budget = complet.tokens_estimes - estimer_tokens(robots) - 30
+
+        rendu = gabarit.rendre(sections, budget_tokens=budget)
+
+        assert rendu.sections_tronquees == ("robots", "favoris")
+        assert rendu.tokens_estimes <= budget
+        assert "ROBOTS" not in rendu.texte
+        assert "CONTEXT: semaine du 13/04" in rendu.texte
+        assert "- Recette numéro 0\n" in rendu.texte
+        assert "- Recette numéro 39" not in rendu.texte
+        assert rendu.tokens_estimes == estimer_tokens(rendu.texte)
+
+    def test_sections_obligatoires_conservees_hors_budget(self):
+        gabarit = GabaritPrompt("test_obligatoire", [CONSIGNES])
+        rendu = gabarit.rendre(
+            [SectionDynamique("contexte", "CONTEXT: " + "mot " * 50)], budget_tokens=5
+        )
+
+        assert rendu.texte.count("mot") == 50
+        assert rendu.sections_tronquees == ()
+
+
+class TestPartieVariable:
+    def test_prefixe_connu_retire(self):
+        gabarit = GabaritPrompt("test_variable", [CONSIGNES, "SCHÉMA: {}"])
+        rendu = gabarit.rendre([SectionDynamique("donnees", "Recettes:\n1. Dal")])
+
+        assert partie_variable(rendu.texte) == (gabarit.empreinte, "Recettes:\n1. Dal")
+        assert partie_variable("Prompt libre") == (None, "Prompt libre")
+
+    def test_cache_semantique_isole_par_gabarit(self):
+        from src.core.ai.cache import CacheIA
+
+        gabarit = GabaritPrompt("test_cache", [CONSIGNES])
+        CacheIA.invalider_tout()
+        CacheIA.definir(
+            gabarit.rendre([SectionDynamique("r", "Recettes:\n1. Poulet basquaise")]).texte,
+            "réponse basquaise",
+            systeme="json",
+        )
+
+        # Même préfixe, recettes différentes: pas de réponse recyclée
+        autre = gabarit.rendre([SectionDynamique("r", "Recettes:\n1. Tarte tatin")]).texte
+        assert CacheIA.obtenir(autre, systeme="json") is None
+        # Même partie variable hors gabarit: index sémantique distinct
+        assert CacheIA.obtenir("Recettes:\n1. Poulet basquaise", systeme="json") is None
+
+    def test_cle_index_inchangee_sans_gabarit(self):
+        """Les index sémantiques existants restent valides pour les prompts libres."""
+        import hashlib
+
+        from src.core.ai.cache import CacheIA
+
+        ancienne = hashlib.sha256(b"modele|systeme").hexdigest()[:16]
+
+        assert CacheIA._cle_index_semantique("systeme", "modele").endswith(ancienne)
+        assert not CacheIA._cle_index_semantique("systeme", "modele", "abc").endswith(ancienne)
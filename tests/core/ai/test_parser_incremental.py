@@ -0,0 +1,135 @@
+"""
+Tests pour le chemin rapide et l'analyse incrémentale de src/core/ai/parser.py.
+"""
+
+import pytest
+from pydantic import BaseModel
+
+from src.core.ai.parser import (
+    AnalyseurIA,
+    AnalyseurJSONIncremental,
+    analyser_liste_reponse,
+    localiser_json,
+)
+
+
+class JourTest(BaseModel):
+    jour: str
+    plat: str
+
+
+REPONSE_PLANNING = (
+    'Voici le planning :\n```json\n{"semaine": "S16", "items": ['
+    '{"jour": "Lundi", "plat": "Dal {lentilles} [corail]"}, '
+    '{"jour": "Mardi", "plat": "Tarte \\"maison\\""}, '
+    '{"jour": "Mercredi"}]}\n```\nBon appétit !'
+)
+
+
+@pytest.fixture(autouse=True)
+def statistiques_vierges():
+    AnalyseurIA.reinitialiser_statistiques()
+    yield
+    AnalyseurIA.reinitialiser_statistiques()
+
+
+@pytest.mark.unit
+class TestLocaliserJson:
+    def test_delimiteurs_dans_les_chaines(self):
+        texte = 'Réponse: {"a": "}{ ][", "b": "\\"}"} suite {"c": 1}'
+        debut, fin = localiser_json(texte)
+
+        assert texte[debut:fin] == '{"a": "}{ ][", "b": "\\"}"}'
+        assert localiser_json(texte, fin) == (len(texte) - 8, len(texte))
+
+    def test_structure_incomplete(self):
+        assert localiser_json('{"a": [1, 2') is None
+        assert localiser_json("aucun json") is None
+
+
+@pytest.mark.unit
+class TestCheminRapide:
+    def test_reponse_bien_formee(self):
+        resultat = AnalyseurIA.analyser('Résultat : {"jour": "Lundi", "plat": "Dal"}', JourTest)
+
+        assert resultat == JourTest(jour="Lundi", plat="Dal")
+        assert AnalyseurIA.obtenir_statistiques() == {"rapide": 1}
+
+    def test_reparation_comptee(self):
+        resultat = AnalyseurIA.analyser('{"jour": "Lundi", "plat": "Dal",}', JourTest)
+
+        assert resultat.plat == "Dal"
+        stats = AnalyseurIA.obtenir_statistiques()
+        assert "rapide" not in stats
+        assert stats.get("reparation") == 1
+
+    def test_liste_sous_cle(self):
+        items = analyser_liste_reponse(REPONSE_PLANNING, JourTest)
+
+        assert [i.jour for i in items] == ["Lundi", "Mardi"]
+        assert AnalyseurIA.obtenir_statistiques() == {"liste_cle": 1}
+
+
+@pytest.mark.unit
+class TestAnalyseurJSONIncremental:
+    @pytest.mark.parametrize("taille", [1, 3, 17, len(REPONSE_PLANNING)])
+    def test_items_produits_au_fil_du_flux(self, taille):
+        analyseur = AnalyseurJSONIncremental(JourTest)
+        produits = []
+        for i in range(0, len(REPONSE_PLANNING), taille):
+            produits.extend(analyseur.ajouter(REPONSE_PLANNING[i : i + taille]))
+
+        assert produits == [
+            JourTest(jour="Lundi", plat="Dal {lentilles} [corail]"),
+            JourTest(jour="Mardi", plat='Tarte "maison"'),
+        ]
+        assert analyseur.nb_rejetes == 1
+        assert analyseur.termine
+        assert analyseur.resultat()["semaine"] == "S16"
+
+    def test_item_disponible_avant_la_fin(self):
+        analyseur = AnalyseurJSONIncremental(JourTest)
+
+        assert analyseur.ajouter('[{"jour": "Lundi", "plat": "Dal"}, {"jour": "Ma') == [
+            JourTest(jour="Lundi", plat="Dal")
+        ]
+        assert not analyseur.termine
+
+    def test_listes_imbriquees_hors_cle_ignorees(self):
+        analyseur = AnalyseurJSONIncremental(cle_liste="items")
+        produits = analyseur.ajouter('{"tags": [{"x": 1}], "items": [{"y": [2]}]}')
+
+        assert produits == [{"y": [2]}]
+
+
+class _ClientFactice:
+    """Hôte minimal du mixin: ``appeler_streaming`` rejoue des morceaux."""
+
+    def __init__(self, morceaux):
+        self.morceaux = morceaux
+
+    async def appeler_streaming(self, prompt, **kwargs):
+        for morceau in self.morceaux:
+            yield morceau
+
+
+def _client(morceaux):
+    from src.core.ai.streaming import StreamingMixin
+
+    return type("Client", (_ClientFactice, StreamingMixin), {})(morceaux)
+
+
+class TestStreamingItems:
+    @pytest.mark.asyncio
+    async def test_items_en_flux(self):
+        morceaux = [REPONSE_PLANNING[i : i + 10] for i in range(0, len(REPONSE_PLANNING), 10)]
+        items = [i async for i in _client(morceaux).appeler_streaming_items("p", JourTest)]
+
+        assert [i.jour for i in items] == ["Lundi", "Mardi"]
+
+    @pytest.mark.asyncio
+    async def test_repli_sur_l_analyseur_complet(self):
+        morceaux = ['{"items": [{"jour": "Lundi", ', '"plat": "Dal",}]}']
+        items = [i async for i in _client(morceaux).appeler_streaming_items("p", JourTest)]
+
+        assert items == [JourTest(jour="Lundi", plat="Dal")]
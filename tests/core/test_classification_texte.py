@@ -0,0 +1,100 @@
+"""Tests du classifieur de textes par mots-clés (classification_texte)."""
+
+import pytest
+
+from src.core.utils.classification_texte import ClassifieurMotsCles, normaliser_texte
+
+
+@pytest.fixture
+def classifieur():
+    return ClassifieurMotsCles(
+        {
+            "legumineuses": ["pois chiche", "lentille"],
+            "legumes": ["pois", "courgette", "légume"],
+            "feculents": [" riz", "pâtes"],
+        }
+    )
+
+
+class TestNormalisation:
+    @pytest.mark.parametrize(
+        "texte,attendu",
+        [
+            ("Pâtes à l'Œuf", "pates a l'oeuf"),
+            ("CRÈME brûlée", "creme brulee"),
+            ("carré d’agneau", "carre d'agneau"),
+        ],
+    )
+    def test_accents_casse_ligatures(self, texte, attendu):
+        assert normaliser_texte(texte) == attendu
+
+
+class TestClassifieurMotsCles:
+    def test_toutes_les_categories_en_une_passe(self, classifieur):
+        assert classifieur.categories("Curry de POIS CHICHES, riz et légumes") == {
+            "legumineuses",
+            "legumes",
+            "feculents",
+        }
+
+    def test_mots_chevauchants(self, classifieur):
+        # "pois" est contenu dans "pois chiche" trouvé à la même position
+        assert classifieur.mots("pois chiches rôtis") == {"pois chiche", "pois"}
+
+    def test_accents_indifferents(self, classifieur):
+        assert classifieur.contient("Gratin de pates", "feculents")
+        assert classifieur.contient("LEGUMES du soleil", "legumes")
+
+    def test_accent_du_texte_significatif(self, classifieur):
+        """Un accent écrit dans le texte doit correspondre: « pâtés » n'est pas « pâtes »."""
+        assert not classifieur.contient("Pâtés en croûte", "feculents")
+        assert classifieur.contient("PÂTES fraîches", "feculents")
+
+    def test_charcuterie_non_classee_en_pates(self):
+        from src.services.cuisine.courses.suggestion import detecter_famille
+
+        pates = detecter_famille("pâtes")
+        assert detecter_famille("pates") == pates
+        assert detecter_famille("pâtés de campagne") != pates
+        assert detecter_famille("pâté en croûte") != pates
+
+    def test_premiere_suit_l_ordre_de_la_table(self, classifieur):
+        assert classifieur.premiere("Courgettes et lentilles") == "legumineuses"
+        assert classifieur.premiere("Tarte aux courgettes") == "legumes"
+        assert classifieur.premiere("Tarte au citron") is None
+        assert classifieur.premiere(None) is None
+
+    def test_espaces_significatifs(self, classifieur):
+        assert not classifieur.contient("Riz au lait", "feculents")
+        assert classifieur.contient("Poulet riz", "feculents")
+
+    def test_resultats_mis_en_cache(self, classifieur):
+        classifieur.categories("Pâtes aux courgettes")
+        classifieur.categories("Pâtes aux courgettes")
+
+        assert classifieur.categories.cache_info().hits == 1
+
+    def test_equivalent_aux_boucles_de_sous_chaines(self):
+        from src.services.planning.nutrition import (
+            _CLASSIFIEUR_PLAT,
+            _HEURISTIQUES_PROTEINES,
+            _MOTS_FECULENTS_IMPLICITES,
+        )
+
+        plats = [
+            "saumon grillé, riz et courgettes",
+            "curry de lentilles corail",
+            "quiche lorraine",
+            "bar rôti aux herbes",
+            "tajine d'agneau aux pruneaux",
+            "soupe de potiron",
+        ]
+        for plat in plats:
+            attendu = next(
+                (c for c, mots in _HEURISTIQUES_PROTEINES if any(m in plat for m in mots)), None
+            )
+            trouve = _CLASSIFIEUR_PLAT.premiere(plat)
+            assert (trouve if trouve in dict(_HEURISTIQUES_PROTEINES) else None) == attendu
+            assert _CLASSIFIEUR_PLAT.contient(plat, "feculents_implicites") == any(
+                m in plat for m in _MOTS_FECULENTS_IMPLICITES
+            )
@@ -0,0 +1,151 @@
+"""
+Tests des filtres de période indexables (src/core/db/periodes.py):
+bornes semi-ouvertes, équivalence avec extract() et usage des index.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    create_engine,
+    extract,
+    select,
+    text,
+)
+
+from src.core.db.periodes import (
+    bornes_mois,
+    bornes_semaine_iso,
+    bornes_trimestre,
+    filtre_annee,
+    filtre_meme_jour,
+    filtre_mois,
+    filtre_semaine_iso,
+    filtre_trimestre,
+    mois_decale,
+)
+
+metadata = MetaData()
+depenses = Table(
+    "depenses_test",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("jour", Date, index=True),
+    Column("cree_le", DateTime, index=True),
+)
+
+
+@pytest.fixture(scope="module")
+def connexion():
+    moteur = create_engine("sqlite://")
+    metadata.create_all(moteur)
+    debut = date(2023, 11, 20)
+    with moteur.begin() as conn:
+        conn.execute(
+            depenses.insert(),
+            [
+                {
+                    "id": i,
+                    "jour": debut + timedelta(days=i),
+                    "cree_le": datetime.combine(debut, datetime.min.time())
+                    + timedelta(hours=7 * i + 5),
+                }
+                for i in range(900)
+            ],
+        )
+    with moteur.connect() as conn:
+        yield conn
+    moteur.dispose()
+
+
+def _ids(conn, *criteres) -> set[int]:
+    return set(conn.scalars(select(depenses.c.id).where(*criteres)))
+
+
+class TestBornes:
+    def test_mois_et_decalage(self):
+        assert bornes_mois(2025, 12) == (date(2025, 12, 1), date(2026, 1, 1))
+        assert mois_decale(2026, 1, -1) == (2025, 12)
+        assert mois_decale(2026, 3, -14) == (2025, 1)
+
+    def test_trimestre_et_semaine_iso(self):
+        assert bornes_trimestre(2026, 4) == (date(2026, 10, 1), date(2027, 1, 1))
+        assert bornes_semaine_iso(2026, 1) == (date(2025, 12, 29), date(2026, 1, 5))
+        with pytest.raises(ValueError):
+            bornes_trimestre(2026, 5)
+
+
+class TestEquivalenceExtract:
+    @pytest.mark.parametrize("colonne", ["jour", "cree_le"])
+    @pytest.mark.parametrize("annee, mois", [(2024, 2), (2024, 12), (2025, 1)])
+    def test_mois(self, connexion, colonne, annee, mois):
+        col = depenses.c[colonne]
+
+        assert _ids(connexion, filtre_mois(col, annee, mois)) == _ids(
+            connexion, extract("year", col) == annee, extract("month", col) == mois
+        )
+
+    @pytest.mark.parametrize("colonne", ["jour", "cree_le"])
+    def test_annee_trimestre(self, connexion, colonne):
+        col = depenses.c[colonne]
+
+        assert _ids(connexion, filtre_annee(col, 2024)) == _ids(
+            connexion, extract("year", col) == 2024
+        )
+        trimestre = _ids(connexion, filtre_trimestre(col, 2024, 3))
+        assert trimestre == _ids(
+            connexion, extract("year", col) == 2024, extract("month", col).between(7, 9)
+        )
+
+    def test_semaine_iso_et_meme_jour(self, connexion):
+        col = depenses.c.jour
+
+        semaine = list(connexion.scalars(select(col).where(filtre_semaine_iso(col, 2025, 1))))
+        assert (min(semaine), max(semaine), len(semaine)) == (
+            date(2024, 12, 30),
+            date(2025, 1, 5),
+            7,
+        )
+
+        anniversaires = _ids(connexion, filtre_meme_jour(col, date(2026, 3, 1)))
+        assert anniversaires == _ids(
+            connexion, extract("month", col) == 3, extract("day", col) == 1
+        )
+        assert len(anniversaires) == 3  # 2024, 2025, 2026
+
+
+class TestUsageIndex:
+    """EXPLAIN QUERY PLAN: la plage utilise l'index, extract() parcourt la table."""
+
+    @staticmethod
+    def _plan(conn, critere) -> str:
+        requete = select(depenses.c.id).where(critere)
+        sql = str(requete.compile(conn, compile_kwargs={"literal_binds": True}))
+        return " ".join(ligne[-1] for ligne in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    @pytest.mark.parametrize("colonne", ["jour", "cree_le"])
+    def test_plage_indexee(self, connexion, colonne):
+        col = depenses.c[colonne]
+
+        plan = self._plan(connexion, filtre_mois(col, 2024, 5))
+
+        assert f"INDEX ix_depenses_test_{colonne} ({colonne}>? AND {colonne}<?)" in plan
+        assert plan.startswith("SEARCH")
+
+    def test_meme_jour_indexe(self, connexion):
+        plan = self._plan(connexion, filtre_meme_jour(depenses.c.jour, date(2026, 3, 1)))
+
+        assert "INDEX ix_depenses_test_jour (jour=?)" in plan
+
+    def test_extract_parcourt_la_table(self, connexion):
+        col = depenses.c.jour
+
+        plan = self._plan(connexion, extract("month", col) == 5)
+
+        assert "SEARCH" not in plan
@@ -341,3 +341,24 @@ class TestAvecResilience:
 
         with pytest.raises(ValueError, match="fatal"):
             func_erreur()
+
+    @pytest.mark.asyncio
+    async def test_coroutine_policies_async(self):
+        """Une fonction async est protégée par les policies asyncio natives."""
+        import asyncio
+
+        from src.core.decorators import avec_resilience
+
+        annulee = asyncio.Event()
+
+        @avec_resilience(timeout_s=0.02, fallback="repli")
+        async def func_lente():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                annulee.set()
+                raise
+
+        assert asyncio.iscoroutinefunction(func_lente)
+        assert await func_lente() == "repli"
+        assert annulee.is_set()  # la coroutine est réellement interrompue
@@ -12,6 +12,7 @@ import pytest
 
 from src.core.monitoring import (
     CollecteurMetriques,
+    HistogrammeLogLineaire,
     MetriqueType,
     PointMetrique,
     chronometre,
@@ -277,6 +278,113 @@ class TestCollecteurThreadSafety:
         assert not errors
 
 
+# ═══════════════════════════════════════════════════════════
+# TESTS HISTOGRAMMES LOG-LINÉAIRES / STOCKAGE BORNÉ
+# ═══════════════════════════════════════════════════════════
+
+
+class TestHistogrammeLogLineaire:
+    """Tests pour les histogrammes à alvéoles fixes du collecteur."""
+
+    def test_quantiles_erreur_relative_bornee(self):
+        import random
+
+        alea = random.Random(7)
+        valeurs = sorted(alea.lognormvariate(4, 1.5) for _ in range(20_000))
+        histo = HistogrammeLogLineaire()
+        for v in valeurs:
+            histo.ajouter(v)
+
+        for q, estime in zip((0.5, 0.9, 0.99), histo.quantiles(0.5, 0.9, 0.99), strict=True):
+            exact = valeurs[int(q * (len(valeurs) - 1))]
+            assert abs(estime - exact) <= exact / 64
+        assert (histo.min, histo.max) == (valeurs[0], valeurs[-1])
+
+    def test_fusion_equivalente(self):
+        a, b, tout = HistogrammeLogLineaire(), HistogrammeLogLineaire(), HistogrammeLogLineaire()
+        for i in range(1, 500):
+            (a if i % 3 else b).ajouter(i * 1.7)
+            tout.ajouter(i * 1.7)
+
+        a.fusionner(b)
+
+        assert a.compteurs == tout.compteurs
+        assert a.quantiles(0.5, 0.99) == tout.quantiles(0.5, 0.99)
+        assert a.ecart_type == pytest.approx(tout.ecart_type)
+
+    def test_valeurs_nulles_et_extremes(self):
+        histo = HistogrammeLogLineaire()
+        for v in (0.0, 0.0, -3.0, 1e-12, 5.0, float("inf")):
+            histo.ajouter(v)
+
+        assert histo.quantiles(0.0, 1.0) == [-3.0, float("inf")]
+        assert histo.zeros == 4
+
+    def test_alveoles_allouees_a_la_demande(self):
+        histo = HistogrammeLogLineaire()
+        assert histo.compteurs == {}
+
+        for v in (12.0, 12.1, 250.0):
+            histo.ajouter(v)
+
+        assert len(histo.compteurs) == 2
+        assert sum(histo.compteurs.values()) == 3
+
+    def test_memoire_fixe_et_snapshot_sans_parcours(self):
+        c = CollecteurMetriques(taille_historique=100)
+        for i in range(20_000):
+            c.histogramme("db.duree_ms", float(i % 1000), labels={"table": "recettes"})
+
+        stats = c.snapshot()["metriques"]["db.duree_ms"]
+
+        assert stats["nb_points"] == 20_000
+        assert len(c.obtenir_serie("db.duree_ms")) == 100
+        # Statistiques sur la fenêtre récente (100 derniers points: 900..999)
+        assert stats["statistiques"]["mediane"] == pytest.approx(949.5, rel=1 / 64)
+        assert stats["statistiques"]["nb_points_fenetre"] == 100
+        assert c.obtenir_histogramme("db.duree_ms").nombre == 20_000
+        assert c.obtenir_histogramme("db.duree_ms", recent=True).nombre == 100
+
+    def test_regression_recente_visible_malgre_l_historique(self):
+        c = CollecteurMetriques(taille_historique=200)
+        for _ in range(100_000):
+            c.histogramme("api.latence_ms", 10.0)
+        for _ in range(150):
+            c.histogramme("api.latence_ms", 500.0)
+
+        stats = c.snapshot()["metriques"]["api.latence_ms"]["statistiques"]
+
+        assert stats["p95"] == pytest.approx(500.0, rel=1 / 64)
+        assert c.obtenir_histogramme("api.latence_ms").quantiles(0.95) == [
+            pytest.approx(10.0, rel=1 / 64)
+        ]
+
+    def test_labels_internes(self):
+        c = CollecteurMetriques()
+        c.definir_labels_globaux({"env": "test"})
+        c.histogramme("ia.latence", 1.0, labels={"service": "recettes"})
+        c.histogramme("ia.latence", 2.0, labels={"service": "recettes"})
+
+        serie = c._series["ia.latence"]
+        assert serie.labels[0] is serie.labels[1]
+        assert c.obtenir_serie("ia.latence")[1].labels == {"env": "test", "service": "recettes"}
+
+    def test_histogramme_concurrent(self):
+        c = CollecteurMetriques()
+
+        def worker(decalage: int):
+            for i in range(2000):
+                c.histogramme(f"serie.{decalage % 2}", float(i + decalage))
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(c.obtenir_histogramme(f"serie.{k}").nombre for k in range(2)) == 16_000
+
+
 # ═══════════════════════════════════════════════════════════
 # TESTS FONCTIONS MODULE-LEVEL
 # ═══════════════════════════════════════════════════════════
@@ -0,0 +1,324 @@
+"""Tests unitaires pour les policies de résilience async.
+
+Couvre:
+- RetryPolicyAsync (jitter complet, budget de retentatives)
+- TimeoutPolicyAsync (asyncio.timeout)
+- BulkheadPolicyAsync (file d'attente bornée, délestage)
+- ConcurrenceAdaptativePolicy (limite pilotée par la latence)
+- FallbackPolicyAsync et composition via +
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core.resilience import (
+    BudgetRetry,
+    BulkheadPolicyAsync,
+    ConcurrenceAdaptativePolicy,
+    ErreurSurcharge,
+    FallbackPolicyAsync,
+    PolicyComposeeAsync,
+    RetryPolicy,
+    RetryPolicyAsync,
+    TimeoutPolicyAsync,
+)
+
+
+def _instable(echecs: int, exception: type[Exception] = ConnectionError):
+    """Coroutine function qui échoue ``echecs`` fois puis retourne "ok"."""
+    appels = []
+
+    async def fn():
+        appels.append(1)
+        if len(appels) <= echecs:
+            raise exception("instable")
+        return "ok"
+
+    fn.appels = appels
+    return fn
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS RetryPolicyAsync
+# ═══════════════════════════════════════════════════════════
+
+
+class TestRetryPolicyAsync:
+    @pytest.mark.asyncio
+    async def test_reussit_apres_echecs(self):
+        fn = _instable(2)
+        policy = RetryPolicyAsync(max_tentatives=3, delai_base=0.001)
+
+        assert await policy.executer(fn) == "ok"
+        assert len(fn.appels) == 3
+
+    @pytest.mark.asyncio
+    async def test_exception_non_retentee(self):
+        fn = _instable(1, ValueError)
+        policy = RetryPolicyAsync(exceptions_a_retry=(ConnectionError,), delai_base=0.001)
+
+        with pytest.raises(ValueError):
+            await policy.executer(fn)
+        assert len(fn.appels) == 1
+
+    def test_jitter_complet_plafonne(self):
+        policy = RetryPolicyAsync(delai_base=1.0, facteur_backoff=10.0, delai_max=5.0)
+
+        delais = [policy._delai(4) for _ in range(200)]
+
+        assert all(0 <= d <= 5.0 for d in delais)
+        assert min(delais) < 1.0  # tiré dans [0, plafond], pas autour du plafond
+
+    @pytest.mark.asyncio
+    async def test_budget_limite_les_retries(self):
+        budget = BudgetRetry(ratio=0.25, min_par_seconde=0, capacite=2)
+        policy = RetryPolicyAsync(max_tentatives=5, delai_base=0, budget=budget)
+        appels = 0
+
+        async def panne():
+            nonlocal appels
+            appels += 1
+            raise ConnectionError("aval en panne")
+
+        for _ in range(10):
+            with pytest.raises(ConnectionError):
+                await policy.executer(panne)
+
+        # 10 appels + 2 jetons initiaux + 2 jetons déposés (0.25 par appel),
+        # au lieu de 50 tentatives
+        assert appels == 10 + 2 + 2
+        assert budget.jetons < 1
+
+    @pytest.mark.asyncio
+    async def test_surcharge_non_retentee(self):
+        fn = _instable(1, ErreurSurcharge)
+
+        with pytest.raises(ErreurSurcharge):
+            await RetryPolicyAsync(delai_base=0).executer(fn)
+        assert len(fn.appels) == 1
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS TimeoutPolicyAsync
+# ═══════════════════════════════════════════════════════════
+
+
+class TestTimeoutPolicyAsync:
+    @pytest.mark.asyncio
+    async def test_annule_la_coroutine(self):
+        annulee = asyncio.Event()
+
+        async def lente():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                annulee.set()
+                raise
+
+        with pytest.raises(TimeoutError, match="Timeout après 0.02s"):
+            await TimeoutPolicyAsync(timeout_secondes=0.02).executer(lente)
+        assert annulee.is_set()
+
+    @pytest.mark.asyncio
+    async def test_timeout_interne_propage_tel_quel(self):
+        async def fn():
+            raise TimeoutError("timeout du client HTTP")
+
+        with pytest.raises(TimeoutError, match="client HTTP"):
+            await TimeoutPolicyAsync(timeout_secondes=5).executer(fn)
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS BulkheadPolicyAsync
+# ═══════════════════════════════════════════════════════════
+
+
+class TestBulkheadPolicyAsync:
+    @pytest.mark.asyncio
+    async def test_concurrence_bornee(self):
+        policy = BulkheadPolicyAsync(max_concurrent=3)
+        en_cours = pic = 0
+
+        async def travail():
+            nonlocal en_cours, pic
+            en_cours += 1
+            pic = max(pic, en_cours)
+            await asyncio.sleep(0.005)
+            en_cours -= 1
+
+        await asyncio.gather(*(policy.executer(travail) for _ in range(12)))
+
+        assert pic == 3
+        assert (policy.en_cours, policy.en_attente) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_file_pleine_rejet_immediat(self):
+        policy = BulkheadPolicyAsync(max_concurrent=1, max_file=1)
+        libere = asyncio.Event()
+
+        async def bloque():
+            await libere.wait()
+            return "fini"
+
+        premier = asyncio.create_task(policy.executer(bloque))
+        second = asyncio.create_task(policy.executer(bloque))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ErreurSurcharge):
+            await policy.executer(bloque)
+
+        libere.set()
+        assert await asyncio.gather(premier, second) == ["fini", "fini"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_acquisition_libere_la_file(self):
+        policy = BulkheadPolicyAsync(max_concurrent=1, timeout_acquisition=0.01)
+        libere = asyncio.Event()
+        occupant = asyncio.create_task(policy.executer(libere.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ErreurSurcharge, match="après 0.01s"):
+            await policy.executer(libere.wait)
+
+        assert policy.en_attente == 0
+        libere.set()
+        await occupant
+        assert policy.en_cours == 0
+
+    def test_partage_entre_event_loops(self):
+        """Une instance utilisée depuis plusieurs threads / boucles à la fois."""
+        policy = BulkheadPolicyAsync(max_concurrent=2, timeout_acquisition=5)
+        en_cours, pic, verrou = [0], [0], threading.Lock()
+
+        async def travail():
+            with verrou:
+                en_cours[0] += 1
+                pic[0] = max(pic[0], en_cours[0])
+            await asyncio.sleep(0.002)
+            with verrou:
+                en_cours[0] -= 1
+
+        async def lot():
+            await asyncio.gather(*(policy.executer(travail) for _ in range(10)))
+
+        threads = [threading.Thread(target=asyncio.run, args=(lot(),)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        assert pic[0] <= 2
+        assert policy.en_cours == 0
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS ConcurrenceAdaptativePolicy
+# ═══════════════════════════════════════════════════════════
+
+
+class TestConcurrenceAdaptative:
+    def test_latence_degradee_reduit_la_limite(self):
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=40, limite_max=100)
+        for _ in range(50):
+            limiteur.observer(0.05)
+        stable = limiteur.limite
+
+        for _ in range(30):
+            limiteur.observer(0.5)
+
+        assert limiteur.limite < stable / 2
+
+    def test_croissance_seulement_si_utilisee(self):
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=10, limite_max=50)
+        for _ in range(100):
+            limiteur.observer(0.05)
+        assert limiteur.limite == 10  # aucun appel en cours: limite inutilisée
+
+        for _ in range(100):
+            limiteur._porte.en_cours = limiteur.limite
+            limiteur.observer(0.05)
+        assert limiteur.limite == 50
+
+    def test_surcharge_decroissance_multiplicative_bornee(self):
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=20, limite_min=2)
+
+        assert limiteur.observer(None, surcharge=True) == 14
+        for _ in range(20):
+            limiteur.observer(None, surcharge=True)
+        assert limiteur.limite == 2
+
+    @pytest.mark.asyncio
+    async def test_timeouts_deleste_au_lieu_de_faire_la_queue(self):
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=8, max_file=4, timeout_attente=0.05)
+        policy = limiteur + TimeoutPolicyAsync(timeout_secondes=0.02)
+
+        async def aval_sature():
+            await asyncio.sleep(1)
+
+        resultats = await asyncio.gather(
+            *(policy.executer(aval_sature) for _ in range(40)), return_exceptions=True
+        )
+
+        assert limiteur.limite < 8
+        assert any(isinstance(r, ErreurSurcharge) for r in resultats)
+        assert all(isinstance(r, (TimeoutError, ErreurSurcharge)) for r in resultats)
+        assert limiteur.statistiques()["en_attente"] == 0
+
+    @pytest.mark.asyncio
+    async def test_appel_annule_sans_echantillon_de_latence(self):
+        limiteur = ConcurrenceAdaptativePolicy(limite_initiale=8)
+        policy = TimeoutPolicyAsync(timeout_secondes=0.02) + limiteur
+
+        async def lent():
+            await asyncio.sleep(1)
+
+        with pytest.raises(TimeoutError):
+            await policy.executer(lent)
+
+        stats = limiteur.statistiques()
+        assert stats["latence_reference_ms"] == 0
+        assert stats["en_cours"] == 0
+        assert limiteur.limite == 8
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS Fallback et composition
+# ═══════════════════════════════════════════════════════════
+
+
+class TestCompositionAsync:
+    @pytest.mark.asyncio
+    async def test_retry_puis_fallback_async(self):
+        async def repli(e):
+            return f"repli: {e}"
+
+        policy = RetryPolicyAsync(max_tentatives=2, delai_base=0) + FallbackPolicyAsync(
+            fallback_fn=repli
+        )
+
+        async def panne():
+            raise ConnectionError("panne")
+
+        assert isinstance(policy, PolicyComposeeAsync)
+        assert await policy.executer(panne) == "repli: panne"
+
+    @pytest.mark.asyncio
+    async def test_ordre_onion(self):
+        policy = (TimeoutPolicyAsync(1) + RetryPolicyAsync(3, delai_base=0)) + BulkheadPolicyAsync(
+            2
+        )
+
+        assert [type(p).__name__ for p in policy.policies] == [
+            "TimeoutPolicyAsync",
+            "RetryPolicyAsync",
+            "BulkheadPolicyAsync",
+        ]
+        assert await policy.executer(_instable(2)) == "ok"
+
+    def test_melange_sync_async_refuse(self):
+        with pytest.raises(TypeError):
+            RetryPolicy() + TimeoutPolicyAsync()
+        with pytest.raises(TypeError):
+            TimeoutPolicyAsync() + RetryPolicy()
@@ -238,3 +238,117 @@ class TestSyncWrapperIntegration:
         assert result2 == ["a", "b"]
         assert result3 == ["a", "b", "c"]
         assert service.state == ["a", "b", "c"]
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS BOUCLE D'ARRIÈRE-PLAN PERSISTANTE
+# ═══════════════════════════════════════════════════════════
+
+
+class TestBoucleArrierePlan:
+    """Tests pour la boucle d'événements persistante partagée."""
+
+    def test_run_sync_reutilise_la_meme_boucle(self):
+        """Deux appels sync successifs s'exécutent sur la même boucle."""
+        from src.services.core.base.async_utils import run_sync
+
+        async def boucle_courante():
+            return asyncio.get_running_loop()
+
+        assert run_sync(boucle_courante()) is run_sync(boucle_courante())
+
+    def test_ressource_liee_a_la_boucle_survit_entre_appels(self):
+        """Un objet lié à la boucle (ex: client async) reste utilisable."""
+        from src.services.core.base.async_utils import run_sync
+
+        etat: dict = {}
+
+        async def creer():
+            etat["evenement"] = asyncio.Event()
+
+        async def utiliser():
+            etat["evenement"].set()
+            await etat["evenement"].wait()
+            return True
+
+        run_sync(creer())
+        assert run_sync(utiliser()) is True
+
+    def test_submit_retourne_un_future(self):
+        """submit() planifie sans bloquer et retourne un Future thread-safe."""
+        import concurrent.futures
+
+        from src.services.core.base.async_utils import submit
+
+        async def double(x: int) -> int:
+            await asyncio.sleep(0.01)
+            return x * 2
+
+        future = submit(double(21))
+
+        assert isinstance(future, concurrent.futures.Future)
+        assert future.result(timeout=5) == 42
+
+    @pytest.mark.asyncio
+    async def test_run_sync_depuis_une_boucle_active(self):
+        """run_sync fonctionne depuis une coroutine (boucle déjà active)."""
+        from src.services.core.base.async_utils import run_sync
+
+        async def valeur():
+            return "ok"
+
+        assert run_sync(valeur()) == "ok"
+
+    def test_appel_imbrique_depuis_la_boucle(self):
+        """Un appel sync depuis la boucle elle-même ne provoque pas de deadlock."""
+        from src.services.core.base.async_utils import run_sync
+
+        async def interne():
+            return 1
+
+        async def externe():
+            return run_sync(interne()) + 1
+
+        assert run_sync(externe(), timeout=5) == 2
+
+    def test_timeout_annule_la_coroutine(self):
+        """Un dépassement de délai lève TimeoutError."""
+        import concurrent.futures
+
+        from src.services.core.base.async_utils import run_sync
+
+        async def lente():
+            await asyncio.sleep(5)
+
+        with pytest.raises((TimeoutError, concurrent.futures.TimeoutError)):
+            run_sync(lente(), timeout=0.05)
+
+    def test_arreter_puis_redemarrer(self):
+        """Une boucle arrêtée redémarre paresseusement au prochain appel."""
+        from src.core.async_utils import BoucleArrierePlan
+
+        boucle = BoucleArrierePlan(nom="test-bridge")
+
+        async def valeur():
+            return 3
+
+        assert boucle.executer(valeur()) == 3
+        boucle.arreter()
+        assert not boucle.est_active
+        assert boucle.executer(valeur()) == 3
+        boucle.arreter()
+
+    def test_client_http_partage_par_boucle_et_ferme_a_l_arret(self):
+        """Un AsyncClient par boucle, réutilisé entre appels et fermé avec la boucle."""
+        from src.core.async_utils import BoucleArrierePlan, obtenir_client_http
+
+        boucle = BoucleArrierePlan(nom="test-http")
+
+        async def client():
+            return obtenir_client_http()
+
+        premier = boucle.executer(client())
+        assert boucle.executer(client()) is premier
+        assert asyncio.run(client()) is not premier
+        boucle.arreter()
+        assert premier.is_closed
@@ -0,0 +1,195 @@
+"""
+Tests pour le module bulk (upsert en masse).
+
+Vérifie le préchargement par clé, la fusion des doublons et le nombre
+constant d'aller-retours SQL quel que soit le volume.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from src.core.models import ArticleCourses, Ingredient, ListeCourses
+from src.services.core.base.bulk import (
+    ResultatUpsert,
+    bulk_upsert,
+    normaliser_cle,
+    precharger_par_cle,
+)
+
+# ═══════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════
+
+
+@pytest.fixture
+def compteur_requetes(db):
+    """Compte les requêtes émises sur la connexion de test."""
+    compteur = {"n": 0}
+
+    def _avant(conn, cursor, statement, parameters, context, executemany):
+        compteur["n"] += 1
+
+    event.listen(db.get_bind(), "before_cursor_execute", _avant)
+    yield compteur
+    event.remove(db.get_bind(), "before_cursor_execute", _avant)
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS
+# ═══════════════════════════════════════════════════════════
+
+
+class TestNormaliserCle:
+    def test_insensible_casse(self):
+        assert normaliser_cle("  Tomates ", insensible_casse=True) == "tomates"
+
+    def test_sensible_casse_par_defaut(self):
+        assert normaliser_cle("Tomates") == "Tomates"
+        assert normaliser_cle(42, insensible_casse=True) == 42
+
+
+class TestPrechargerParCle:
+    def test_une_requete_par_lot(self, db, compteur_requetes):
+        db.add_all([Ingredient(nom=f"Ingr {i}", unite="g") for i in range(10)])
+        db.commit()
+        compteur_requetes["n"] = 0
+
+        existants = precharger_par_cle(
+            db, Ingredient, "nom", [f"INGR {i}" for i in range(10)], insensible_casse=True
+        )
+
+        assert len(existants) == 10
+        assert existants["ingr 3"].nom == "Ingr 3"
+        assert compteur_requetes["n"] == 1
+
+    def test_lots_multiples(self, db, compteur_requetes):
+        db.add_all([Ingredient(nom=f"Ingr {i}", unite="g") for i in range(5)])
+        db.commit()
+        compteur_requetes["n"] = 0
+
+        existants = precharger_par_cle(
+            db, Ingredient, "nom", [f"Ingr {i}" for i in range(5)], taille_lot=2
+        )
+
+        assert len(existants) == 5
+        assert compteur_requetes["n"] == 3
+
+
+class TestBulkUpsert:
+    def test_insertion_et_fusion(self, db):
+        existant = Ingredient(nom="Tomates", unite="pcs", categorie="Légumes")
+        db.add(existant)
+        db.commit()
+
+        resultat = bulk_upsert(
+            db,
+            Ingredient,
+            [
+                {"nom": "tomates", "unite": "kg"},
+                {"nom": "Oignons", "unite": "g", "hors_modele": True},
+                {"nom": ""},
+            ],
+            cle="nom",
+            insensible_casse=True,
+            conflit_sur=("nom",),
+        )
+        db.commit()
+
+        assert isinstance(resultat, ResultatUpsert)
+        assert (resultat.crees, resultat.mis_a_jour) == (1, 1)
+        assert resultat.cles_creees == ["oignons"]
+        assert resultat.ids["tomates"] == existant.id
+        db.refresh(existant)
+        assert existant.unite == "kg"
+        oignons = db.get(Ingredient, resultat.ids["oignons"])
+        assert oignons.unite == "g"
+        assert oignons.categorie == "Autre"
+
+    def test_fusion_personnalisee_et_doublons(self, db):
+        liste = ListeCourses(nom="Liste")
+        ingredient = Ingredient(nom="Lait", unite="L")
+        db.add_all([liste, ingredient])
+        db.flush()
+        db.add(
+            ArticleCourses(liste_id=liste.id, ingredient_id=ingredient.id, quantite_necessaire=1.0)
+        )
+        db.commit()
+
+        def cumuler(existant, nouveau):
+            return {
+                "quantite_necessaire": existant["quantite_necessaire"]
+                + nouveau["quantite_necessaire"]
+            }
+
+        resultat = bulk_upsert(
+            db,
+            ArticleCourses,
+            [
+                {"liste_id": liste.id, "ingredient_id": ingredient.id, "quantite_necessaire": 2.0},
+                {"liste_id": liste.id, "ingredient_id": ingredient.id, "quantite_necessaire": 0.5},
+            ],
+            cle="ingredient_id",
+            fusion=cumuler,
+            filtres=(ArticleCourses.liste_id == liste.id, ArticleCourses.achete == False),  # noqa: E712
+        )
+        db.commit()
+
+        article = db.get(ArticleCourses, resultat.ids[ingredient.id])
+        assert article.quantite_necessaire == 3.5
+        assert resultat.crees == 0
+
+    def test_jeux_de_colonnes_differents(self, db):
+        """Des lignes aux colonnes différentes gardent chacune leurs valeurs et défauts."""
+        resultat = bulk_upsert(
+            db,
+            Ingredient,
+            [
+                {"nom": "Beurre", "unite": "g"},
+                {"nom": "Farine", "unite": "g", "categorie": "Épicerie"},
+                {"nom": "Sucre", "unite": "g", "categorie": "Épicerie"},
+            ],
+            cle="nom",
+        )
+        db.commit()
+
+        assert resultat.crees == 3
+        categories = {i.nom: i.categorie for i in db.query(Ingredient).all()}
+        assert categories == {"Farine": "Épicerie", "Beurre": "Autre", "Sucre": "Épicerie"}
+
+    def test_conflit_sans_prechargement(self, db):
+        """Une ligne insérée hors préchargement (filtre restrictif) est fusionnée, pas dupliquée."""
+        db.add(Ingredient(nom="Sel", unite="g", categorie="Épicerie"))
+        db.commit()
+
+        resultat = bulk_upsert(
+            db,
+            Ingredient,
+            [{"nom": "Sel", "categorie": "Condiments"}],
+            cle="nom",
+            filtres=(Ingredient.categorie == "Inexistante",),
+            conflit_sur=("nom",),
+        )
+        db.commit()
+
+        assert (resultat.crees, resultat.mis_a_jour) == (0, 1)
+        assert db.query(Ingredient).filter_by(nom="Sel").one().categorie == "Condiments"
+
+    def test_nombre_requetes_constant(self, db, compteur_requetes):
+        db.add_all([Ingredient(nom=f"Existant {i}", unite="g") for i in range(20)])
+        db.commit()
+        compteur_requetes["n"] = 0
+
+        lignes = [{"nom": f"Existant {i}", "unite": "kg"} for i in range(20)]
+        lignes += [{"nom": f"Nouveau {i}", "unite": "kg"} for i in range(40)]
+        resultat = bulk_upsert(db, Ingredient, lignes, cle="nom", conflit_sur=("nom",))
+
+        assert (resultat.crees, resultat.mis_a_jour) == (40, 20)
+        assert len(resultat.ids) == 60
+        # SELECT IN + UPDATE executemany + INSERT ... RETURNING (insertmanyvalues)
+        assert compteur_requetes["n"] <= 4
+
+    def test_aucune_ligne(self, db, compteur_requetes):
+        resultat = bulk_upsert(db, Ingredient, [{"unite": "g"}], cle="nom")
+
+        assert resultat.total == 0
+        assert compteur_requetes["n"] == 0
@@ -0,0 +1,221 @@
+"""
+Tests des agrégats d'usage incrémentaux (src/services/core/analytics.py):
+croquis de durées, requêtes par période et persistance des agrégats.
+"""
+
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models.systeme import AgregatUsage
+from src.services.core.analytics import PRECISION_CROQUIS, CroquisDurees, ServiceAnalytics
+
+MAINTENANT = datetime.now().replace(minute=30, second=0, microsecond=0)
+PAGES = ["cuisine.recettes", "cuisine.courses", "famille.jalons", "jeux.loto", "accueil"]
+
+
+def _evenements(n: int, graine: int = 1, etendue: timedelta = timedelta(hours=30)):
+    """Événements triés sur ``etendue`` jusqu'à MAINTENANT: (horodatage, type, cible, durée)."""
+    alea = random.Random(graine)
+    evenements = []
+    for _ in range(n):
+        horodatage = MAINTENANT - etendue * alea.random()
+        if alea.random() < 0.7:
+            evenements.append(
+                (horodatage, "page_vue", alea.choice(PAGES), alea.lognormvariate(7, 1))
+            )
+        else:
+            evenements.append((horodatage, "action", f"action.{alea.randint(1, 6)}", None))
+    return sorted(evenements)
+
+
+def _alimenter(service: ServiceAnalytics, evenements) -> None:
+    for horodatage, type_evt, cible, duree in evenements:
+        service._enregistrer(type_evt, cible, duree_ms=duree, horodatage=horodatage)
+
+
+@pytest.fixture
+def fabrique(tmp_path):
+    moteur = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    AgregatUsage.__table__.create(moteur)
+    Session = sessionmaker(bind=moteur, expire_on_commit=False)
+
+    @contextmanager
+    def _session():
+        with Session() as session:
+            yield session
+
+    yield _session
+    moteur.dispose()
+
+
+class TestCroquisDurees:
+    def test_quantiles_erreur_relative_bornee(self):
+        alea = random.Random(3)
+        valeurs = sorted(alea.lognormvariate(6, 1.5) for _ in range(20_000))
+        croquis = CroquisDurees()
+        for valeur in valeurs:
+            croquis.ajouter(valeur)
+
+        for q in (0.5, 0.9, 0.95, 0.99):
+            exact = valeurs[int(q * (len(valeurs) - 1))]
+            assert abs(croquis.quantile(q) - exact) <= PRECISION_CROQUIS * exact * 1.001
+        assert len(croquis.alveoles) < 1000
+
+    def test_fusion_et_serialisation(self):
+        a, b, tout = CroquisDurees(), CroquisDurees(), CroquisDurees()
+        for i, valeur in enumerate([0, 3.5, 12, 250, 250, 9000]):
+            (a if i % 2 else b).ajouter(valeur)
+            tout.ajouter(valeur)
+
+        a.fusionner(CroquisDurees.depuis_dict(b.vers_dict()))
+
+        assert a.vers_dict() == tout.vers_dict()
+        assert a.quantile(0) == 0
+        assert a.moyenne == pytest.approx(sum([0, 3.5, 12, 250, 250, 9000]) / 6)
+
+
+class TestAgregatsIncrementaux:
+    def test_statistiques_sans_parcourir_les_evenements(self):
+        evenements = _evenements(3000)
+        service = ServiceAnalytics(taille_buffer=10)
+        _alimenter(service, evenements)
+
+        stats = service.obtenir_statistiques()
+
+        pages = Counter(cible for _, t, cible, _ in evenements if t == "page_vue")
+        assert stats.total_pages_vues == sum(pages.values())
+        assert stats.total_actions == len(evenements) - sum(pages.values())
+        assert stats.pages_uniques == len(pages)
+        assert stats.top_pages[0]["page"] == pages.most_common(1)[0][0]
+        assert stats.repartition_modules["cuisine"] == (
+            pages["cuisine.recettes"] + pages["cuisine.courses"]
+        )
+        assert service.heures_actives() == dict(
+            sorted(Counter(h.hour for h, *_ in evenements).items())
+        )
+        assert len(service.parcours_recent(50)) == 10
+
+    @pytest.mark.parametrize(
+        "depuis, jusqu_a",
+        [
+            (MAINTENANT - timedelta(minutes=47), None),  # bords à la minute
+            (MAINTENANT - timedelta(hours=5), MAINTENANT - timedelta(hours=2)),
+            (None, MAINTENANT - timedelta(hours=20)),
+        ],
+    )
+    def test_periode_par_fusion(self, depuis, jusqu_a):
+        evenements = _evenements(4000, graine=2)
+        service = ServiceAnalytics()
+        _alimenter(service, evenements)
+
+        stats = service.obtenir_statistiques(depuis, jusqu_a)
+
+        def _pages(debut, fin):
+            return sum(
+                1
+                for h, t, *_ in evenements
+                if t == "page_vue" and (debut is None or h >= debut) and (fin is None or h <= fin)
+            )
+
+        heure = timedelta(hours=1)
+        exact = _pages(depuis, jusqu_a)
+        # Heures partielles hors rétention par minute: comptées entières
+        large = _pages(
+            depuis and depuis.replace(minute=0),
+            jusqu_a and jusqu_a.replace(minute=0) + heure,
+        )
+        assert exact <= stats.total_pages_vues <= large
+        if jusqu_a is None:
+            assert stats.total_pages_vues == exact
+        assert sum(stats.heures_actives.values()) == stats.total_pages_vues + stats.total_actions
+
+    def test_vider(self):
+        service = ServiceAnalytics()
+        _alimenter(service, _evenements(50))
+
+        assert service.vider() == 50
+        assert service.obtenir_statistiques().total_pages_vues == 0
+
+
+class TestPersistanceAgregats:
+    def test_historique_survit_au_redemarrage(self, fabrique):
+        evenements = _evenements(600, graine=4, etendue=timedelta(hours=3))
+        avant = ServiceAnalytics(fabrique_session=fabrique, asynchrone=False)
+        _alimenter(avant, evenements[:400])
+        assert avant.vidanger() > 0
+        _alimenter(avant, evenements[400:])
+        avant.vidanger()
+
+        apres = ServiceAnalytics(fabrique_session=fabrique, asynchrone=False)
+        apres.charger_historique()
+
+        attendu, obtenu = avant.obtenir_statistiques(), apres.obtenir_statistiques()
+        assert obtenu.total_pages_vues == attendu.total_pages_vues
+        assert obtenu.top_pages == attendu.top_pages
+        assert obtenu.heures_actives == attendu.heures_actives
+        recent = MAINTENANT - timedelta(minutes=20)
+        sans_bornes = {"periode_debut", "periode_fin"}
+        assert apres.obtenir_statistiques(recent).model_dump(exclude=sans_bornes) == (
+            avant.obtenir_statistiques(recent).model_dump(exclude=sans_bornes)
+        )
+        with fabrique() as session:
+            lignes = session.scalar(select(func.count()).select_from(AgregatUsage))
+        assert lignes <= 4 + 3 * 60  # une ligne par heure / minute, pas par événement
+
+    def test_deux_workers_fusionnent(self, fabrique):
+        evenements = _evenements(200, graine=5, etendue=timedelta(minutes=30))
+        workers = [ServiceAnalytics(fabrique_session=fabrique, asynchrone=False) for _ in range(2)]
+        for i, worker in enumerate(workers):
+            _alimenter(worker, evenements[i::2])
+            worker.vidanger()
+
+        lecteur = ServiceAnalytics(fabrique_session=fabrique, asynchrone=False)
+        lecteur.charger_historique()
+
+        assert lecteur.obtenir_statistiques().total_actions == sum(
+            1 for e in evenements if e[1] == "action"
+        )
+
+    def test_tranche_creee_par_un_autre_worker_entre_temps(self, fabrique):
+        """Un autre worker crée les mêmes tranches juste avant l'insertion."""
+        evenements = _evenements(100, graine=6, etendue=timedelta(minutes=10))
+        premier, second = (
+            ServiceAnalytics(fabrique_session=fabrique, asynchrone=False) for _ in range(2)
+        )
+        _alimenter(premier, evenements[::2])
+        _alimenter(second, evenements[1::2])
+        with fabrique() as session:
+            moteur = session.get_bind()
+        concurrent: list[int] = []
+
+        def _second_d_abord(conn, cursor, statement, *args):
+            if statement.startswith("INSERT") and not concurrent:
+                concurrent.append(0)
+                concurrent[0] = second.vidanger()
+
+        event.listen(moteur, "before_cursor_execute", _second_d_abord)
+        try:
+            assert premier.vidanger() > 0
+        finally:
+            event.remove(moteur, "before_cursor_execute", _second_d_abord)
+
+        assert concurrent[0] > 0
+        lecteur = ServiceAnalytics(fabrique_session=fabrique, asynchrone=False)
+        lecteur.charger_historique()
+        assert lecteur.obtenir_statistiques().total_actions == sum(
+            1 for e in evenements if e[1] == "action"
+        )
+
+    def test_echec_ecriture_conserve_les_deltas(self, fabrique):
+        service = ServiceAnalytics(fabrique_session=fabrique, asynchrone=False)
+        _alimenter(service, _evenements(20, etendue=timedelta(minutes=5)))
+        service._persister = lambda modifies: (_ for _ in ()).throw(RuntimeError("panne"))
+
+        assert service.vidanger() == 0
+        assert service._modifies
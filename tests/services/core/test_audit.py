@@ -0,0 +1,197 @@
+"""
+Tests du journal d'audit (src/services/core/audit.py): index mémoire,
+écriture par lots et consultation en base par curseur.
+"""
+
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models.systeme import JournalAudit
+from src.services.core.audit import ServiceAudit, decoder_curseur
+
+
+@pytest.fixture
+def fabrique(tmp_path):
+    """Base SQLite fichier partagée par plusieurs « workers »."""
+    moteur = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    JournalAudit.__table__.create(moteur)
+    requetes: list[str] = []
+    event.listen(moteur, "before_cursor_execute", lambda *a: requetes.append(a[2]))
+    Session = sessionmaker(bind=moteur, expire_on_commit=False)
+
+    @contextmanager
+    def _session():
+        with Session() as session:
+            yield session
+
+    _session.requetes = requetes
+    yield _session
+    moteur.dispose()
+
+
+def _remplir(service: ServiceAudit, n: int = 30) -> None:
+    for i in range(n):
+        service.enregistrer_action(
+            action="recette.creee" if i % 3 else "stock.modifie",
+            entite_type="recette" if i % 3 else "inventaire",
+            entite_id=i % 5,
+            source="cuisine" if i % 2 else "inventaire",
+            details={"i": i, "le": datetime(2026, 1, 1)},
+        )
+
+
+def _reference(service: ServiceAudit, **filtres) -> list[int]:
+    """Résultat attendu: filtrage linéaire naïf du buffer."""
+    entrees = [
+        e
+        for e in service._buffer
+        if (not filtres.get("entite_type") or e.entite_type == filtres["entite_type"])
+        and ("entite_id" not in filtres or e.entite_id == filtres["entite_id"])
+        and (not filtres.get("source") or e.source == filtres["source"])
+        and (not filtres.get("action") or filtres["action"] in e.action)
+    ]
+    return [e.id for e in reversed(entrees)]
+
+
+class TestJournalMemoire:
+    @pytest.mark.parametrize(
+        "filtres",
+        [
+            {},
+            {"entite_type": "recette"},
+            {"entite_type": "recette", "entite_id": 2},
+            {"source": "cuisine"},
+            {"entite_type": "recette", "source": "inventaire"},
+            {"action": "modifie"},
+            {"entite_id": 0},
+        ],
+    )
+    def test_index_equivalents_au_filtrage_lineaire(self, filtres):
+        service = ServiceAudit(taille_buffer=20)
+        _remplir(service, 45)
+
+        attendu = _reference(service, **filtres)
+        resultat = service.consulter(**filtres, limite=4, page=2)
+
+        assert [e.id for e in resultat.entrees] == attendu[4:8]
+        assert resultat.total == len(attendu)
+
+    def test_eviction_met_a_jour_les_index(self):
+        service = ServiceAudit(taille_buffer=10)
+        _remplir(service, 25)
+
+        assert sum(len(f) for f in service._journal.par_source.values()) == 10
+        assert min(e.id for f in service._journal.par_type.values() for e in f) == 16
+        assert service.statistiques()["total_entrees"] == 10
+
+    def test_curseur_parcourt_tout_sans_doublon(self):
+        service = ServiceAudit()
+        _remplir(service, 23)
+
+        vus, curseur = [], None
+        while True:
+            page = service.consulter(entite_type="recette", limite=5, curseur=curseur)
+            vus += [e.id for e in page.entrees]
+            curseur = page.curseur_suivant
+            if curseur is None:
+                break
+
+        assert vus == _reference(service, entite_type="recette")
+        assert page.total is None
+
+    def test_periode_dates_avec_fuseau(self):
+        service = ServiceAudit()
+        _remplir(service, 5)
+        maintenant = datetime.now().astimezone()
+
+        assert service.consulter(depuis=maintenant - timedelta(minutes=1)).total == 5
+        assert service.consulter(jusqu_a=maintenant - timedelta(hours=2)).total == 0
+
+    def test_curseur_invalide(self):
+        with pytest.raises(ValueError):
+            ServiceAudit().consulter(curseur="pas-un-curseur")
+
+
+class TestPersistanceParLots:
+    def test_insert_groupes(self, fabrique):
+        service = ServiceAudit(taille_lot=10, fabrique_session=fabrique, asynchrone=False)
+        _remplir(service, 25)
+
+        inserts = [r for r in fabrique.requetes if r.startswith("INSERT")]
+        assert len(inserts) == 2  # deux lots complets, 5 entrées en attente
+        assert service.vidanger() == 5
+        assert service.statistiques()["persistance"] == {"lots": 3, "lignes": 25}
+
+    def test_entrees_evincees_comptees(self, fabrique):
+        """File d'attente pleine (base lente): les évictions sont comptées."""
+        service = ServiceAudit(
+            taille_buffer=5, taille_lot=100, fabrique_session=fabrique, asynchrone=False
+        )
+        _remplir(service, 8)
+
+        assert service.vidanger() == 5
+        assert service.statistiques()["persistance"] == {"perdues": 3, "lots": 1, "lignes": 5}
+
+    def test_ecriture_en_arriere_plan(self, fabrique):
+        service = ServiceAudit(intervalle_ecriture=0.05, fabrique_session=fabrique)
+        _remplir(service, 3)
+
+        limite = time.monotonic() + 5
+        while service.statistiques()["persistance"].get("lignes", 0) < 3:
+            assert time.monotonic() < limite
+            time.sleep(0.02)
+
+    def test_base_indisponible_repli_memoire(self):
+        @contextmanager
+        def _panne():
+            raise RuntimeError("connexion refusée")
+            yield
+
+        service = ServiceAudit(fabrique_session=_panne, asynchrone=False, taille_lot=1)
+        _remplir(service, 3)
+
+        assert service.consulter().total == 3
+        assert service.statistiques()["persistance"]["echecs"] == 1
+
+
+class TestConsultationBase:
+    def test_meme_resultat_depuis_un_autre_worker(self, fabrique):
+        worker_a = ServiceAudit(fabrique_session=fabrique, asynchrone=False)
+        worker_b = ServiceAudit(fabrique_session=fabrique, asynchrone=False)
+        _remplir(worker_a, 30)
+        worker_a.vidanger()  # lot écrit par le thread de fond en production
+
+        resultat = worker_b.consulter(entite_type="recette", entite_id=2, limite=3)
+
+        assert resultat.total == len(_reference(worker_a, entite_type="recette", entite_id=2))
+        assert [e.details["i"] for e in resultat.entrees] == [22, 17, 7]
+        assert resultat.entrees[0].entite_id == 2
+        assert resultat.entrees[0].details["le"] == "2026-01-01 00:00:00"
+
+    def test_pagination_par_curseur_sans_offset(self, fabrique):
+        service = ServiceAudit(fabrique_session=fabrique, asynchrone=False)
+        _remplir(service, 30)
+        premiere = service.consulter(source="cuisine", limite=4)
+        fabrique.requetes.clear()
+
+        suivante = service.consulter(source="cuisine", limite=4, curseur=premiere.curseur_suivant)
+
+        (select,) = fabrique.requetes
+        assert "(journal_audit.timestamp, journal_audit.id) <" in select
+        assert "count" not in select.lower()
+        assert [e.details["i"] for e in premiere.entrees + suivante.entrees] == [
+            29,
+            27,
+            25,
+            23,
+            21,
+            19,
+            17,
+            15,
+        ]
+        assert decoder_curseur(suivante.curseur_suivant)[1] == suivante.entrees[-1].id
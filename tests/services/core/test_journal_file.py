@@ -0,0 +1,202 @@
+"""
+Tests du backend durable des files d'attente (journal_file) et des deux
+services de file qui l'utilisent (file_attente, offline_queue).
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src.services.core import offline_queue
+from src.services.core.file_attente import ServiceFileAttente, StatutOperation
+from src.services.core.journal_file import (
+    JournalFile,
+    PlanningRetries,
+    executer_en_parallele,
+)
+
+# ═══════════════════════════════════════════════════════════
+# JOURNAL
+# ═══════════════════════════════════════════════════════════
+
+
+class TestJournalFile:
+    def test_rejeu_du_journal(self, tmp_path):
+        journal = JournalFile(tmp_path / "file.json")
+        journal.ajouter(1, {"id": 1, "statut": "en_attente"})
+        journal.ajouter(2, {"id": 2, "statut": "en_attente"})
+        journal.modifier(1, {"statut": "echoue"})
+        journal.supprimer(2)
+        journal.fermer()
+
+        etat = JournalFile(tmp_path / "file.json").charger()
+
+        assert etat == {"1": {"id": 1, "statut": "echoue"}}
+
+    def test_ligne_tronquee_ignoree(self, tmp_path):
+        journal = JournalFile(tmp_path / "file.json")
+        journal.ajouter(1, {"id": 1})
+        journal.fermer()
+        with journal.journal.open("a", encoding="utf-8") as flux:
+            flux.write('{"t":"put","id":"2","d":{"id"')
+
+        assert list(JournalFile(tmp_path / "file.json").charger()) == ["1"]
+
+    def test_croissance_constante_par_operation(self, tmp_path):
+        journal = JournalFile(tmp_path / "file.json", seuil_compaction=10_000)
+        journal.ajouter(0, {"id": 0, "payload": "x" * 200})
+        taille_initiale = journal.journal.stat().st_size
+
+        for i in range(1, 100):
+            journal.ajouter(i, {"id": i, "payload": "x" * 200})
+
+        # Chaque ajout écrit une ligne de taille fixe, sans réécrire l'existant
+        assert journal.journal.stat().st_size < taille_initiale * 101
+        assert not journal.snapshot.exists()
+
+    def test_compaction(self, tmp_path):
+        journal = JournalFile(tmp_path / "file.json", seuil_compaction=3)
+        etat = {}
+        for i in range(3):
+            etat[i] = {"id": i}
+            journal.ajouter(i, etat[i])
+
+        assert journal.compacter_si_necessaire(etat.values())
+        assert not journal.journal.exists()
+        assert journal.entrees_journal == 0
+        assert json.loads(journal.snapshot.read_text()) == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+        journal.supprimer(0)
+        assert list(JournalFile(tmp_path / "file.json").charger()) == ["1", "2"]
+
+    def test_snapshot_historique_relu(self, tmp_path):
+        (tmp_path / "file.json").write_text(json.dumps([{"id": 7, "operation": "x"}]))
+
+        assert JournalFile(tmp_path / "file.json").charger() == {"7": {"id": 7, "operation": "x"}}
+
+
+# ═══════════════════════════════════════════════════════════
+# PLANNING / CONCURRENCE
+# ═══════════════════════════════════════════════════════════
+
+
+class TestPlanningRetries:
+    def test_ordre_par_priorite_puis_date(self):
+        planning = PlanningRetries()
+        planning.planifier("a", 10.0)
+        planning.planifier("b", 5.0)
+        planning.planifier("c", 20.0, priorite=2)
+        planning.planifier("futur", 100.0, priorite=9)
+
+        assert planning.extraire_dues(50.0) == ["c", "b", "a"]
+        assert len(planning) == 1
+        assert planning.prochaine() == 100.0
+
+    def test_replanification_et_retrait(self):
+        planning = PlanningRetries()
+        planning.planifier("a", 1.0)
+        planning.planifier("a", 1.0)
+        planning.planifier("b", 2.0)
+        planning.retirer("b")
+
+        assert planning.extraire_dues(10.0) == ["a"]
+        assert planning.extraire_dues(10.0) == []
+
+    def test_limite_conserve_le_reste(self):
+        planning = PlanningRetries()
+        for i in range(5):
+            planning.planifier(i, float(i))
+
+        assert planning.extraire_dues(10.0, limite=2) == [0, 1]
+        assert planning.extraire_dues(10.0) == [2, 3, 4]
+
+
+def test_executer_en_parallele_concurrence_bornee():
+    actifs, maximum = [0], [0]
+    verrou = threading.Lock()
+
+    def tache(n):
+        with verrou:
+            actifs[0] += 1
+            maximum[0] = max(maximum[0], actifs[0])
+        time.sleep(0.02)
+        with verrou:
+            actifs[0] -= 1
+        return n * 2
+
+    assert executer_en_parallele(tache, list(range(8)), concurrence=3) == list(range(0, 16, 2))
+    assert 1 < maximum[0] <= 3
+
+
+# ═══════════════════════════════════════════════════════════
+# SERVICES
+# ═══════════════════════════════════════════════════════════
+
+
+def _echouer(*args, **kwargs):
+    raise RuntimeError("indisponible")
+
+
+def _reussir(**kwargs):
+    return kwargs
+
+
+class TestServiceFileAttente:
+    def test_persistance_et_retry_planifie(self, tmp_path):
+        fichier = tmp_path / ".file.json"
+        service = ServiceFileAttente(fichier=fichier)
+        ok = service.enqueue("ok", {"n": 1}, callback=f"{__name__}._reussir")
+        ko = service.enqueue("ko", {}, callback=f"{__name__}._echouer")
+
+        resultat = service.traiter()
+
+        assert (resultat.reussies, resultat.echouees) == (1, 1)
+        # Le retry est planifié dans le futur: un second passage ne fait rien
+        assert service.traiter().traitees == 0
+
+        recharge = ServiceFileAttente(fichier=fichier)
+        ops = recharge.consulter()
+        assert [op.id for op in ops] == [ko.id]
+        assert ops[0].tentatives == 1
+        assert ops[0].statut == StatutOperation.EN_ATTENTE
+        assert ok.id not in [op.id for op in ops]
+
+
+class TestOfflineQueue:
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(offline_queue, "QUEUE_DIR", tmp_path)
+        monkeypatch.setattr(offline_queue, "QUEUE_FILE", tmp_path / "queue.json")
+        monkeypatch.setattr(offline_queue, "DEAD_LETTER_FILE", tmp_path / "dead_letter.json")
+        return offline_queue.ServiceFileAttente()
+
+    def test_traitement_par_priorite_sans_blocage(self, service):
+        ordre = []
+        service.enregistrer_handler("ok", lambda p: ordre.append(p["n"]))
+        service.enregistrer_handler("ko", _echouer)
+        service.ajouter("ok", {"n": "normal"})
+        service.ajouter("ok", {"n": "critique"}, priorite=2)
+        service.ajouter("ko", max_tentatives=2)
+
+        debut = time.monotonic()
+        traitees = service.traiter_file(concurrence=1)
+
+        assert time.monotonic() - debut < 1  # plus de sleep de backoff
+        assert ordre == ["critique", "normal"]
+        assert [op.operation for op in traitees] == ["ok", "ok", "ko"]
+        assert service.statut().en_attente == 1
+
+    def test_dead_letter_persistante(self, service):
+        service.enregistrer_handler("ko", _echouer)
+        op = service.ajouter("ko", max_tentatives=1)
+        service.traiter_file()
+
+        recharge = offline_queue.ServiceFileAttente()
+        assert [o.id for o in recharge.consulter_dead_letter()] == [op.id]
+        assert recharge.statut().en_attente == 0
+
+        rejouee = recharge.rejouer_dead_letter(op.id)
+        assert rejouee is not None and rejouee.tentatives == 0
+        assert offline_queue.ServiceFileAttente().statut().en_attente == 1
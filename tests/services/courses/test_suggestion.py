@@ -717,6 +717,22 @@ class TestAjouterAListeCourses:
         # L'article est ajouté avec succès
         assert len(result) == 1
 
+    def test_ajouter_doublons_cumules(self, db: Session, service_suggestions, patch_db_context):
+        """Test que deux articles du même ingrédient (casse différente) sont fusionnés."""
+        articles = [
+            ArticleCourse(nom="Carottes", quantite=1.0, unite="kg", a_acheter=1.0),
+            ArticleCourse(nom="carottes", quantite=0.5, unite="kg", a_acheter=0.5),
+            ArticleCourse(nom="Navets", quantite=2.0, a_acheter=2.0),
+        ]
+
+        result = service_suggestions.ajouter_a_liste_courses(articles)
+
+        assert len(result) == 3
+        assert result[0] == result[1]
+        article = db.get(ArticleCourses, result[0])
+        assert article.quantite_necessaire == 1.5
+        assert db.query(Ingredient).filter(Ingredient.nom.ilike("carottes")).count() == 1
+
 
 # ═══════════════════════════════════════════════════════════
 # TESTS SUGGESTIONS SUBSTITUTIONS
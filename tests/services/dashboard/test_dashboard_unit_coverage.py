@@ -6,6 +6,8 @@ from datetime import date, timedelta
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import numpy as np
+
 from src.services.dashboard.anomalies_financieres import ServiceAnomaliesFinancieres
 from src.services.dashboard.badges_triggers import (
     BadgesTriggersService,
@@ -14,6 +16,7 @@ from src.services.dashboard.badges_triggers import (
 from src.services.dashboard.points_famille import PointsFamilleService
 from src.services.dashboard.resume_famille_ia import ResumeFamilleIAService
 from src.services.dashboard.score_bienetre import ScoreBienEtreService
+from src.services.dashboard.series_depenses import MatriceDepenses
 from src.services.dashboard.service import AccueilDataService
 
 
@@ -92,14 +95,14 @@ class DummyProfilModel:
 class TestAnomaliesFinancieresCoverage:
     def test_detecter_anomalies_trie_et_qualifie_les_variations(self):
         service = object.__new__(ServiceAnomaliesFinancieres)
-        donnees = {
-            "2026-03": {"courses": 180.0, "energie": 220.0, "loisirs": 50.0},
-            "2026-02": {"courses": 100.0, "energie": 120.0, "loisirs": 45.0},
-            "2026-01": {"courses": 100.0, "energie": 100.0, "loisirs": 40.0},
-        }
+        donnees = MatriceDepenses(
+            categories=["courses", "energie", "loisirs"],
+            mois=["2026-01", "2026-02", "2026-03"],
+            valeurs=np.array([[100.0, 100.0, 180.0], [100.0, 120.0, 220.0], [40.0, 45.0, 50.0]]),
+        )
 
         with (
-            patch.object(service, "_collecter_depenses", return_value=donnees),
+            patch.object(service, "_matrice_depenses", return_value=donnees),
             patch.object(
                 service,
                 "_generer_resume_ia",
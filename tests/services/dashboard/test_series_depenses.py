@@ -0,0 +1,182 @@
+"""
+Tests des séries de dépenses (src/services/dashboard/series_depenses.py):
+matrice catégorie × mois en une requête et scores d'anomalie vectorisés.
+"""
+
+import random
+import statistics
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models import BudgetFamille
+from src.core.models.finances import DepenseMaison
+from src.services.dashboard.anomalies_financieres import ServiceAnomaliesFinancieres
+from src.services.dashboard.series_depenses import (
+    ServiceSeriesDepenses,
+    cle_mois,
+    index_mois,
+    scorer_anomalies,
+)
+
+REFERENCE = date(2026, 3, 15)
+
+
+@pytest.fixture
+def session():
+    moteur = create_engine("sqlite://")
+    BudgetFamille.__table__.create(moteur)
+    DepenseMaison.__table__.create(moteur)
+    requetes: list[str] = []
+    event.listen(moteur, "before_cursor_execute", lambda *a: requetes.append(a[2]))
+    with sessionmaker(bind=moteur)() as s:
+        s.requetes = requetes
+        yield s
+    moteur.dispose()
+
+
+def _remplir(session, graine: int = 1) -> list[tuple[str, int, float]]:
+    """Dépenses aléatoires sur 30 mois; retourne (categorie, index_mois, montant)."""
+    alea = random.Random(graine)
+    lignes = []
+    for _ in range(400):
+        jour = date.fromordinal(date(2024, 1, 1).toordinal() + alea.randrange(30 * 30))
+        categorie = alea.choice(["Courses", "supermarche", "Loisirs", "sante"])
+        montant = round(alea.uniform(5, 200), 2)
+        session.add(BudgetFamille(date=jour, categorie=categorie, montant=montant))
+        lignes.append((categorie, index_mois(jour.year, jour.month), montant))
+    for annee in (2024, 2025, 2026):
+        for mois in range(1, 13):
+            montant = round(alea.uniform(40, 90), 2)
+            session.add(
+                DepenseMaison(categorie="electricite", annee=annee, mois=mois, montant=montant)
+            )
+            lignes.append(("electricite", index_mois(annee, mois), montant))
+    session.commit()
+    return lignes
+
+
+class TestMatriceMensuelle:
+    @pytest.mark.parametrize("nb_mois", [3, 13, 24])
+    def test_une_seule_requete_quelle_que_soit_la_fenetre(self, session, nb_mois):
+        lignes = _remplir(session)
+        normaliser = ServiceAnomaliesFinancieres._normaliser_categorie
+        session.requetes.clear()
+
+        matrice = ServiceSeriesDepenses().matrice_mensuelle(
+            REFERENCE, nb_mois=nb_mois, normaliser=normaliser, db=session
+        )
+
+        (select,) = session.requetes
+        assert "UNION ALL" in select and "GROUP BY" in select
+        fin = index_mois(REFERENCE.year, REFERENCE.month)
+        attendu = defaultdict(float)
+        for categorie, mois, montant in lignes:
+            if fin - nb_mois < mois <= fin:
+                attendu[normaliser(categorie), cle_mois(mois)] += montant
+        assert matrice.mois[0] == cle_mois(fin - nb_mois + 1)
+        assert matrice.mois[-1] == "2026-03"
+        assert matrice.valeurs.shape == (len(matrice.categories), nb_mois)
+        assert "courses" in matrice.categories and "supermarche" not in matrice.categories
+        for i, categorie in enumerate(matrice.categories):
+            for j, cle in enumerate(matrice.mois):
+                assert matrice.valeurs[i, j] == pytest.approx(attendu[categorie, cle])
+
+    def test_fenetre_vide(self, session):
+        matrice = ServiceSeriesDepenses().matrice_mensuelle(REFERENCE, nb_mois=3, db=session)
+
+        assert matrice.categories == []
+        assert matrice.mois == ["2026-01", "2026-02", "2026-03"]
+        assert matrice.colonne("2026-03") == {}
+
+
+class TestScorerAnomalies:
+    def test_equivalent_au_calcul_par_categorie(self):
+        alea = np.random.default_rng(4)
+        valeurs = alea.gamma(2.0, 50.0, size=(6, 13))
+        valeurs[2, :-1] = 80.0  # historique constant: écart nul, scores indéfinis
+        valeurs[4, -13] = 0.0  # pas de base saisonnière
+
+        scores = scorer_anomalies(valeurs, nb_reference=12)
+
+        for i, ligne in enumerate(valeurs.tolist()):
+            base, courant = ligne[-13:-1], ligne[-1]
+            moyenne = statistics.fmean(base)
+            assert scores.variation_pct[i] == pytest.approx((courant - moyenne) / moyenne * 100)
+            ecart_type = statistics.stdev(base)
+            mediane = statistics.median(base)
+            mad = statistics.median(abs(v - mediane) for v in base)
+            if i == 2:
+                assert np.isnan(scores.zscore[i]) and np.isnan(scores.score_robuste[i])
+                continue
+            assert scores.zscore[i] == pytest.approx((courant - moyenne) / ecart_type)
+            assert scores.score_robuste[i] == pytest.approx(0.6745 * (courant - mediane) / mad)
+        assert np.isnan(scores.variation_saisonniere_pct[4])
+        assert scores.variation_saisonniere_pct[0] == pytest.approx(
+            (valeurs[0, -1] - valeurs[0, 0]) / valeurs[0, 0] * 100
+        )
+
+    def test_reference_courte(self):
+        scores = scorer_anomalies(np.array([[100.0, 100.0, 150.0], [0.0, 0.0, 10.0]]), 2)
+
+        assert scores.variation_pct[0] == pytest.approx(50.0)
+        assert np.isnan(scores.variation_pct[1])
+        assert np.isnan(scores.variation_saisonniere_pct).all()
+
+
+class TestDetecterAnomalies:
+    @pytest.fixture
+    def service(self, session):
+        with patch("src.services.dashboard.anomalies_financieres.obtenir_client_ia"):
+            service = ServiceAnomaliesFinancieres()
+        service._matrice_depenses = lambda ref, nb_mois: ServiceSeriesDepenses().matrice_mensuelle(
+            ref, nb_mois=nb_mois, normaliser=service._normaliser_categorie, db=session
+        )
+        service._generer_resume_ia = lambda anomalies, mois: {}
+        return service
+
+    def _mensuel(self, session, categorie: str, montants: list[float]) -> None:
+        """Un montant par mois, le dernier tombant sur REFERENCE."""
+        fin = index_mois(REFERENCE.year, REFERENCE.month)
+        for k, montant in enumerate(montants):
+            annee, mois = divmod(fin - len(montants) + 1 + k, 12)
+            session.add(
+                DepenseMaison(
+                    categorie=categorie, annee=annee, mois=mois + 1, montant=Decimal(montant)
+                )
+            )
+        session.commit()
+
+    def test_niveaux_et_pics_habituels(self, service, session):
+        # Pic majoritaire sur l'historique, N-1/N-2 bas → +100% mais habituel
+        self._mensuel(
+            session, "chauffage", [200, 210, 100, 190, 205, 100, 195, 200, 100, 210, 100, 100, 200]
+        )
+        # Stable puis dérive: anomalie critique
+        self._mensuel(session, "loisirs", [100] * 12 + [190])
+        # Hausse modérée sans historique long
+        self._mensuel(session, "sante", [100, 100, 130])
+        session.requetes.clear()
+
+        resultat = service.detecter_anomalies(REFERENCE)
+
+        assert len(session.requetes) == 1
+        par_categorie = {a["categorie"]: a for a in resultat["anomalies"]}
+        assert set(par_categorie) == {"loisirs", "sante"}
+        assert par_categorie["loisirs"]["niveau"] == "critique"
+        assert par_categorie["loisirs"]["moyenne_n1_n2"] == 100.0
+        assert par_categorie["loisirs"]["score_robuste"] is None  # MAD nulle
+        assert par_categorie["sante"]["niveau"] == "moyenne"
+        assert par_categorie["sante"]["variation_saisonniere_pct"] is None
+        assert resultat["mois_reference"] == "2026-03"
+        assert resultat["series_mensuelles"]["n_1"] == {
+            "energie": 100.0,
+            "loisirs": 100.0,
+            "sante": 100.0,
+        }
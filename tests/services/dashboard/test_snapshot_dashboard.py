@@ -0,0 +1,200 @@
+"""Tests pour le snapshot agrégé du dashboard principal."""
+
+# pyright: reportUnknownParameterType=false, reportMissingParameterType=false, reportPrivateUsage=false
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from src.services.dashboard.snapshot import (
+    NAMESPACE_SNAPSHOT,
+    USER_ID_SNAPSHOT,
+    ServiceSnapshotDashboard,
+)
+
+
+class _CacheFactice:
+    """Cache minimal (get/set/invalidate) pour isoler les tests du cache global."""
+
+    def __init__(self):
+        self.donnees: dict = {}
+
+    def get(self, key, default=None):
+        return self.donnees.get(key, default)
+
+    def set(self, key, value, ttl=300, tags=None, persistent=False):
+        self.donnees[key] = value
+
+    def invalidate(self, pattern=None, tags=None):
+        cles = [k for k in self.donnees if pattern and pattern in k]
+        for cle in cles:
+            del self.donnees[cle]
+        return len(cles)
+
+
+@pytest.fixture
+def cache():
+    cache = _CacheFactice()
+    with patch("src.core.caching.obtenir_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def service():
+    return ServiceSnapshotDashboard()
+
+
+def _compter_requetes(db):
+    compteur = {"n": 0}
+
+    def _avant(conn, cursor, statement, parameters, context, executemany):
+        compteur["n"] += 1
+
+    event.listen(db.get_bind(), "before_cursor_execute", _avant)
+    return compteur, lambda: event.remove(db.get_bind(), "before_cursor_execute", _avant)
+
+
+class TestCalculerSnapshot:
+    def test_structure_sur_base_vide(self, db, service):
+        snapshot = service.calculer_snapshot(db=db)
+
+        assert snapshot["statistiques"]["recettes_total"] == 0
+        assert snapshot["budget_mois"] == {"total_mois": 0.0, "par_categorie": {}}
+        assert snapshot["habitat"] == {"alertes": 0, "budget_deco_depense": 0.0, "zones_jardin": 0}
+        assert snapshot["prochaines_activites"] == []
+        assert snapshot["alertes"] == []
+        assert snapshot["repas_aujourd_hui"] == []
+
+    def test_agregats_et_listes(self, db, service):
+        from src.core.models import ActiviteFamille, Recette
+
+        aujourd_hui = date.today()
+        db.add_all(
+            [
+                Recette(nom="Tarte", temps_preparation=10, temps_cuisson=20, portions=4),
+                Recette(nom="Soupe", temps_preparation=10, temps_cuisson=20, portions=4),
+                ActiviteFamille(
+                    titre="Piscine",
+                    type_activite="sport",
+                    date_prevue=aujourd_hui + timedelta(days=2),
+                ),
+            ]
+        )
+        db.commit()
+
+        snapshot = service.calculer_snapshot(db=db)
+
+        assert snapshot["statistiques"]["recettes_total"] == 2
+        assert snapshot["statistiques"]["activites_a_venir"] == 1
+        assert snapshot["prochaines_activites"][0]["titre"] == "Piscine"
+        assert (
+            snapshot["prochaines_activites"][0]["date_prevue"]
+            == (aujourd_hui + timedelta(days=2)).isoformat()
+        )
+
+    def test_alertes_peremption(self, db, service):
+        from src.core.models import ArticleInventaire, Ingredient
+
+        aujourd_hui = date.today()
+        lait = Ingredient(nom="Lait", unite="L", categorie="produits laitiers")
+        riz = Ingredient(nom="Riz", unite="kg", categorie="epicerie")
+        db.add_all([lait, riz])
+        db.flush()
+        db.add_all(
+            [
+                ArticleInventaire(
+                    ingredient_id=lait.id,
+                    quantite=1,
+                    date_peremption=aujourd_hui + timedelta(days=1),
+                ),
+                ArticleInventaire(
+                    ingredient_id=riz.id,
+                    quantite=1,
+                    date_peremption=aujourd_hui + timedelta(days=90),
+                ),
+            ]
+        )
+        db.commit()
+
+        snapshot = service.calculer_snapshot(db=db)
+
+        assert snapshot["alertes"] == [
+            {"type": "peremption", "message": "Lait expire dans 1 jour(s)", "urgence": "haute"}
+        ]
+
+    def test_nombre_constant_de_requetes(self, db, service):
+        """Le calcul complet coûte 5 allers-retours, quel que soit le volume."""
+        compteur, retirer = _compter_requetes(db)
+        try:
+            service.calculer_snapshot(db=db)
+        finally:
+            retirer()
+
+        assert compteur["n"] <= 5
+
+
+class TestObtenirSnapshot:
+    def test_cache_hit_sans_requete(self, db, service, cache):
+        cache.set("dashboard_snapshot_u1", {"statistiques": {"recettes_total": 42}})
+
+        compteur, retirer = _compter_requetes(db)
+        try:
+            snapshot = service.obtenir_snapshot("u1", db=db)
+        finally:
+            retirer()
+
+        assert snapshot["statistiques"]["recettes_total"] == 42
+        assert compteur["n"] == 0
+
+    def test_miss_calcule_persiste_et_met_en_cache(self, db, service, cache):
+        snapshot = service.obtenir_snapshot("u1", db=db)
+
+        assert cache.get("dashboard_snapshot_u1") == snapshot
+        assert service.lire_snapshot_persistant(db=db) == snapshot
+
+    def test_snapshot_persistant_reutilise(self, db, service, cache):
+        """Un autre utilisateur/worker relit le snapshot précalculé en 1 requête."""
+        service.enregistrer_snapshot({"marqueur": True}, db=db)
+
+        compteur, retirer = _compter_requetes(db)
+        try:
+            snapshot = service.obtenir_snapshot("u2", db=db)
+        finally:
+            retirer()
+
+        assert snapshot == {"marqueur": True}
+        assert compteur["n"] == 1
+
+    def test_snapshot_persistant_perime_ignore(self, db, service):
+        hier = date.today() - timedelta(days=1)
+        service.enregistrer_snapshot({"marqueur": True}, aujourd_hui=hier, db=db)
+
+        assert service.lire_snapshot_persistant(db=db) is None
+
+
+class TestInvalidation:
+    def test_invalider_purge_cache_et_snapshot(self, db, service, cache):
+        from src.core.models import EtatPersistantDB
+
+        service.obtenir_snapshot("u1", db=db)
+        service.obtenir_snapshot("u2", db=db)
+
+        assert service.invalider(db=db) == 2
+        assert cache.donnees == {}
+        assert (
+            db.query(EtatPersistantDB)
+            .filter_by(namespace=NAMESPACE_SNAPSHOT, user_id=USER_ID_SNAPSHOT)
+            .count()
+            == 0
+        )
+
+    def test_subscriber_enregistre_sur_evenements_metier(self):
+        from src.services.core.events.subscribers import _invalider_snapshot_dashboard
+
+        evenement = type("Evt", (), {"type": "recette.creee"})()
+        with patch("src.services.dashboard.snapshot.obtenir_service_snapshot_dashboard") as factory:
+            _invalider_snapshot_dashboard(evenement)
+
+        factory.return_value.invalider.assert_called_once()
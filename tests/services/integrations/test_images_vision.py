@@ -0,0 +1,192 @@
+"""
+Tests du prétraitement des images vision et du cache perceptuel
+(src/services/integrations/images_vision.py).
+"""
+
+import io
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.services.integrations.images_vision import (
+    COTE_MAX_VISION,
+    SEUIL_HAMMING,
+    CachePerceptuel,
+    distance_hamming,
+    empreinte_perceptuelle,
+    pretraiter_image,
+)
+from src.services.integrations.multimodal import MultiModalAIService
+
+
+def _ticket(graine: int, taille=(1200, 3000)) -> Image.Image:
+    """Faux ticket de caisse: lignes de « texte » pseudo-aléatoires."""
+    alea = random.Random(graine)
+    image = Image.new("RGB", taille, "white")
+    dessin = ImageDraw.Draw(image)
+    for y in range(80, taille[1] - 80, 90):
+        x = 60
+        while x < taille[0] - 200:
+            largeur = alea.randint(30, 160)
+            dessin.rectangle([x, y, x + largeur, y + 40], fill=alea.randint(0, 90))
+            x += largeur + alea.randint(20, 60)
+    return image
+
+
+def _jpeg(image: Image.Image, qualite: int = 95, orientation: int | None = None) -> bytes:
+    tampon = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(tampon, format="JPEG", quality=qualite, exif=exif.tobytes())
+    return tampon.getvalue()
+
+
+class TestPretraitement:
+    def test_reduction_et_orientation_exif(self):
+        # Photo paysage 4000×3000 marquée « pivoter de 90° »
+        donnees = _jpeg(_ticket(1, (4000, 3000)), orientation=6)
+
+        image = pretraiter_image(donnees)
+
+        assert (image.largeur, image.hauteur) == (768, COTE_MAX_VISION)
+        assert image.mime == "image/jpeg"
+        assert len(image.donnees) < image.taille_origine / 4
+        assert Image.open(io.BytesIO(image.donnees)).size == (768, 1024)
+
+    def test_png_transparent_reencode(self):
+        tampon = io.BytesIO()
+        Image.new("RGBA", (300, 200), (255, 0, 0, 0)).save(tampon, format="PNG")
+
+        image = pretraiter_image(tampon.getvalue())
+
+        assert image.donnees[:3] == b"\xff\xd8\xff"
+        assert Image.open(io.BytesIO(image.donnees)).getpixel((10, 10)) == (255, 255, 255)
+
+    def test_petit_jpeg_conserve(self):
+        donnees = _jpeg(_ticket(2, (400, 600)), qualite=40)
+
+        assert pretraiter_image(donnees).donnees == donnees
+
+    def test_budget_octets(self):
+        alea = random.Random(3)
+        bruit = Image.frombytes("RGB", (1024, 1024), alea.randbytes(1024 * 1024 * 3))
+
+        image = pretraiter_image(_jpeg(bruit), taille_max_octets=150_000)
+
+        assert len(image.donnees) < len(_jpeg(bruit, qualite=85))
+
+    def test_image_illisible(self):
+        assert pretraiter_image(b"pas une image") is None
+
+
+class TestEmpreintePerceptuelle:
+    def test_quasi_doublons_proches(self):
+        ticket = _ticket(4)
+        rescanne = Image.open(io.BytesIO(_jpeg(ticket.resize((1150, 2880)), qualite=60)))
+
+        assert (
+            distance_hamming(empreinte_perceptuelle(ticket), empreinte_perceptuelle(rescanne))
+            <= SEUIL_HAMMING
+        )
+
+    def test_tickets_differents_eloignes(self):
+        assert (
+            distance_hamming(empreinte_perceptuelle(_ticket(5)), empreinte_perceptuelle(_ticket(6)))
+            > 3 * SEUIL_HAMMING
+        )
+
+
+class TestCachePerceptuel:
+    def test_espaces_cloisonnes_et_copies(self):
+        cache = CachePerceptuel(seuil=2)
+        cache.definir("facture", 0b1010, {"total": 12.5})
+
+        resultat = cache.obtenir("facture", 0b1011)
+        resultat["total"] = 0
+
+        assert cache.obtenir("facture", 0b1010) == {"total": 12.5}
+        assert cache.obtenir("recette", 0b1010) is None
+        assert cache.obtenir("facture", 0b0101) is None
+        assert (cache.succes, cache.echecs) == (2, 2)
+
+    def test_capacite_lru(self):
+        cache = CachePerceptuel(seuil=0, capacite=2)
+        cache.definir("a", 1, "un")
+        cache.definir("a", 2, "deux")
+        cache.obtenir("a", 1)
+        cache.definir("a", 4, "quatre")
+
+        assert cache.obtenir("a", 2) is None
+        assert cache.obtenir("a", 1) == "un"
+
+
+class TestServiceMultimodal:
+    @pytest.fixture
+    def service(self):
+        service = MultiModalAIService(client=MagicMock())
+        service.client.chat_with_vision = AsyncMock(return_value='{"magasin": "Biocoop"}')
+        return service
+
+    @pytest.mark.asyncio
+    async def test_ticket_identique_sans_nouvel_appel(self, service):
+        ticket = _jpeg(_ticket(7, (2400, 6000)), orientation=1)
+
+        premiere = await service.extraire_facture(ticket)
+        seconde = await service.extraire_facture(ticket)
+
+        assert premiere.magasin == seconde.magasin == "Biocoop"
+        assert service.client.chat_with_vision.await_count == 1
+        envoye = service.client.chat_with_vision.await_args.kwargs["image_base64"]
+        assert not envoye.startswith("data:")
+        assert len(envoye) < 400_000 * 4 / 3 + 4
+
+    @pytest.mark.asyncio
+    async def test_tickets_proches_non_confondus(self, service):
+        """Deux tickets de même mise en page ne partagent pas leurs totaux."""
+        ticket = _ticket(9, (1200, 3000))
+        autre = ticket.copy()
+        ImageDraw.Draw(autre).rectangle([700, 2800, 1100, 2850], fill=0)
+        service.client.chat_with_vision = AsyncMock(
+            side_effect=['{"total": 12.5}', '{"total": 48.9}']
+        )
+
+        assert (
+            distance_hamming(empreinte_perceptuelle(ticket), empreinte_perceptuelle(autre))
+            <= SEUIL_HAMMING
+        )
+        premier = await service.extraire_facture(_jpeg(ticket))
+        second = await service.extraire_facture(_jpeg(autre))
+
+        assert (premier.total, second.total) == (12.5, 48.9)
+        assert service.client.chat_with_vision.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_plat_rephotographie_sans_nouvel_appel(self, service):
+        plat = _ticket(10, (2400, 1800))
+
+        await service.analyser_plat(_jpeg(plat))
+        await service.analyser_plat(_jpeg(plat.resize((2300, 1725)), qualite=70))
+        await service.analyser_plat(_jpeg(_ticket(11, (2400, 1800))))
+
+        assert service.client.chat_with_vision.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pretraitement_hors_boucle(self, service, monkeypatch):
+        """diagnostiquer_photo_maison (awaité par les routes) ne décode pas sur la boucle."""
+        import threading
+
+        threads = []
+        preparer = service._preparer_image
+
+        def _preparer(image):
+            threads.append(threading.current_thread())
+            return preparer(image)
+
+        monkeypatch.setattr(service, "_preparer_image", _preparer)
+
+        await service.diagnostiquer_photo_maison(_jpeg(_ticket(12, (1600, 1200))))
+
+        assert threads and threads[0] is not threading.current_thread()
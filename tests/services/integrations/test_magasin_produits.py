@@ -0,0 +1,207 @@
+"""
+Tests du magasin local OpenFoodFacts (magasin_produits) et de la recherche
+à niveaux de OpenFoodFactsService.
+"""
+
+import gzip
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.integrations.magasin_produits import (
+    INCONNU,
+    MagasinProduits,
+    compacter_produit,
+)
+from src.services.integrations.produit import OpenFoodFactsService
+
+NUTELLA = {
+    "code": "3017620422003",
+    "product_name_fr": "Nutella",
+    "brands": "Ferrero",
+    "quantity": "400g",
+    "nutriscore_grade": "e",
+    "nutriments": {"energy-kcal_100g": 539, "sugars_100g": 56.3, "sodium_100g": 0.04},
+    "champ_inutile": "x" * 500,
+}
+
+
+@pytest.fixture
+def magasin(tmp_path):
+    return MagasinProduits(tmp_path / "produits.sqlite")
+
+
+@pytest.fixture
+def cache_vide():
+    cache = Mock()
+    cache.get.return_value = None
+    return cache
+
+
+def _client_http(reponse_json=None, status_code=200):
+    """Patch httpx.Client renvoyant une réponse fixe; retourne le mock de get."""
+    reponse = Mock(status_code=status_code)
+    reponse.json.return_value = reponse_json
+    get = Mock(return_value=reponse)
+    client = patch("httpx.Client")
+    mock_client = client.start()
+    mock_client.return_value.__enter__ = Mock(return_value=Mock(get=get))
+    mock_client.return_value.__exit__ = Mock(return_value=False)
+    return client, get
+
+
+class TestMagasinProduits:
+    def test_compactage(self):
+        compact = compacter_produit(NUTELLA)
+
+        assert "champ_inutile" not in compact
+        assert compact["nutriments"] == {"energy-kcal_100g": 539, "sugars_100g": 56.3}
+
+    def test_chargement_jsonl_gz(self, magasin, tmp_path):
+        export = tmp_path / "export.jsonl.gz"
+        with gzip.open(export, "wt", encoding="utf-8") as flux:
+            flux.write(json.dumps(NUTELLA) + "\n")
+            flux.write("ligne corrompue\n")
+            flux.write(json.dumps({"code": "123", "product_name": "Eau"}) + "\n")
+            flux.write(json.dumps({"product_name": "Sans code"}) + "\n")
+
+        assert magasin.charger_export(export, taille_lot=1) == 2
+        assert magasin.obtenir("3017620422003")["brands"] == "Ferrero"
+        assert magasin.statistiques()["produits"] == 2
+
+    def test_chargement_parquet(self, magasin, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pa.Table.from_pylist(
+            [
+                {
+                    "code": "3017620422003",
+                    "product_name": [
+                        {"lang": "main", "text": "Nutella"},
+                        {"lang": "fr", "text": "Pâte à tartiner"},
+                    ],
+                    "brands": "Ferrero",
+                    "nutriments": [{"name": "sugars", "100g": 56.3}],
+                }
+            ]
+        )
+        pq.write_table(table, tmp_path / "export.parquet")
+
+        assert magasin.charger_export(tmp_path / "export.parquet") == 1
+        produit = magasin.obtenir("3017620422003")
+        assert produit["product_name"] == "Pâte à tartiner"
+        assert produit["nutriments"] == {"sugars_100g": 56.3}
+
+    def test_cache_negatif(self, magasin):
+        magasin.marquer_inconnu("000", ttl=60)
+        magasin.marquer_inconnu("111", ttl=-1)
+
+        assert magasin.obtenir("000") is INCONNU
+        assert magasin.obtenir("111") is None
+        assert magasin.purger_inconnus_expires() == 1
+
+        magasin.enregistrer("000", {"product_name": "Finalement connu"})
+        assert magasin.obtenir("000")["product_name"] == "Finalement connu"
+
+    def test_persistance_entre_instances(self, magasin):
+        magasin.enregistrer("3017620422003", NUTELLA)
+
+        assert MagasinProduits(magasin.chemin).obtenir("3017620422003")["brands"] == "Ferrero"
+
+    def test_latence_lookup(self, magasin):
+        magasin._ecrire_lot([(str(i), {"product_name": f"P{i}"}) for i in range(20_000)])
+        durees = []
+        for i in range(0, 20_000, 20):
+            debut = time.perf_counter()
+            magasin.obtenir(str(i))
+            durees.append(time.perf_counter() - debut)
+
+        durees.sort()
+        # Sous-milliseconde attendu; marge pour les machines de CI chargées
+        assert durees[int(len(durees) * 0.99)] < 0.005
+
+
+class TestRechercheANiveaux:
+    def test_magasin_avant_reseau(self, magasin, cache_vide):
+        magasin.enregistrer("3017620422003", NUTELLA)
+        service = OpenFoodFactsService(magasin=magasin)
+        service.cache = cache_vide
+        client, get = _client_http()
+        try:
+            produit = service.rechercher_produit("3017620422003")
+        finally:
+            client.stop()
+
+        assert produit.nom == "Nutella"
+        assert produit.source == "openfoodfacts_local"
+        assert produit.nutrition.nutriscore == "E"
+        get.assert_not_called()
+
+    def test_resultat_live_reecrit_dans_le_magasin(self, magasin, cache_vide):
+        service = OpenFoodFactsService(magasin=magasin)
+        service.cache = cache_vide
+        client, get = _client_http({"status": 1, "product": NUTELLA})
+        try:
+            assert service.rechercher_produit("3017620422003").nom == "Nutella"
+        finally:
+            client.stop()
+
+        assert get.call_count == 1
+        assert magasin.obtenir("3017620422003")["product_name_fr"] == "Nutella"
+
+    def test_code_inconnu_non_reinterroge(self, magasin, cache_vide):
+        service = OpenFoodFactsService(magasin=magasin)
+        service.cache = cache_vide
+        client, get = _client_http({"status": 0})
+        try:
+            assert service.rechercher_produit("0000000000000") is None
+            assert service.rechercher_produit("0000000000000") is None
+        finally:
+            client.stop()
+
+        assert get.call_count == 1
+
+    def test_erreur_http_non_memorisee(self, magasin, cache_vide):
+        service = OpenFoodFactsService(magasin=magasin)
+        service.cache = cache_vide
+        client, _ = _client_http(status_code=503)
+        try:
+            assert service.rechercher_produit("3017620422003") is None
+        finally:
+            client.stop()
+
+        assert magasin.obtenir("3017620422003") is None
+
+    def test_sans_recherche_live(self, magasin, cache_vide):
+        service = OpenFoodFactsService(magasin=magasin, live=False)
+        service.cache = cache_vide
+        client, get = _client_http({"status": 1, "product": NUTELLA})
+        try:
+            assert service.rechercher_produit("3017620422003") is None
+        finally:
+            client.stop()
+
+        get.assert_not_called()
+
+
+def test_scanner_code_pre_remplit_depuis_le_magasin(magasin, cache_vide):
+    from src.services.integrations.codes_barres import BarcodeService
+
+    magasin.enregistrer("3017620422003", NUTELLA)
+    service_off = OpenFoodFactsService(magasin=magasin, live=False)
+    service_off.cache = cache_vide
+    session = Mock()
+    session.query.return_value.filter.return_value.first.return_value = None
+
+    with patch(
+        "src.services.integrations.produit.obtenir_service_openfoodfacts",
+        return_value=service_off,
+    ):
+        service = BarcodeService()
+        resultat = service.scanner_code.__wrapped__(service, "3017620422003", session=session)
+
+    assert resultat.type_scan == "inconnu"
+    assert resultat.details["produit"]["nom"] == "Nutella"
+    assert resultat.details["produit"]["marque"] == "Ferrero"
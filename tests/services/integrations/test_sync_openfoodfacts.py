@@ -0,0 +1,219 @@
+"""
+Tests du rafraîchissement OpenFoodFacts (sync_openfoodfacts) contre un faux
+serveur OpenFoodFacts local (HTTP réel sur 127.0.0.1).
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.services.integrations.sync_openfoodfacts import (
+    RafraichisseurOpenFoodFacts,
+    SeauJetons,
+)
+
+
+def _produit(code: str, nom: str) -> dict:
+    return {
+        "code": code,
+        "product_name_fr": nom,
+        "brands": "Marque",
+        "categories_tags": ["en:snacks"],
+        "nutriscore_grade": "b",
+        "nutriments": {"energy-kcal_100g": 100},
+    }
+
+
+class FauxServeurOFF:
+    """Faux OpenFoodFacts: ``/api/v2/product/<code>.json``, ETag et 304."""
+
+    def __init__(self, produits: dict[str, dict], latence: float = 0.0, etags: bool = True):
+        self.produits = produits
+        self.latence = latence
+        self.etags = etags
+        self.requetes = 0
+        self.en_vol = 0
+        self.max_en_vol = 0
+        self._verrou = threading.Lock()
+        serveur = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with serveur._verrou:
+                    serveur.requetes += 1
+                    serveur.en_vol += 1
+                    serveur.max_en_vol = max(serveur.max_en_vol, serveur.en_vol)
+                try:
+                    time.sleep(serveur.latence)
+                    code = self.path.rsplit("/", 1)[-1].removesuffix(".json")
+                    produit = serveur.produits.get(code)
+                    corps = json.dumps(
+                        {"status": 1, "product": produit} if produit else {"status": 0}
+                    ).encode()
+                    etag = f'"{hashlib.md5(corps).hexdigest()}"'
+                    if serveur.etags and self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(corps)))
+                    if serveur.etags:
+                        self.send_header("ETag", etag)
+                    self.end_headers()
+                    self.wfile.write(corps)
+                finally:
+                    with serveur._verrou:
+                        serveur.en_vol -= 1
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/api/v2/product"
+
+    def arreter(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def catalogue():
+    return {f"{i:013d}": _produit(f"{i:013d}", f"Produit {i}") for i in range(1, 13)}
+
+
+@pytest.fixture
+def serveur(catalogue):
+    faux = FauxServeurOFF(catalogue)
+    yield faux
+    faux.arreter()
+
+
+def _rafraichir(rafraichisseur, *args, **kwargs):
+    return asyncio.run(rafraichisseur.rafraichir(*args, **kwargs))
+
+
+class TestSeauJetons:
+    @pytest.mark.asyncio
+    async def test_cadence(self):
+        seau = SeauJetons(debit=50, capacite=1)
+        debut = time.monotonic()
+        for _ in range(6):
+            await seau.acquerir()
+
+        # 1 jeton initial puis 5 jetons à 50/s
+        assert time.monotonic() - debut >= 0.09
+
+
+class TestRafraichisseur:
+    def test_lots_et_concurrence_bornee(self, catalogue):
+        faux = FauxServeurOFF(catalogue, latence=0.05)
+        lots = []
+        try:
+            rafraichisseur = RafraichisseurOpenFoodFacts(
+                base_url=faux.url, concurrence=3, debit=0, taille_lot=5
+            )
+            metriques = _rafraichir(
+                rafraichisseur,
+                list(catalogue) + ["9999999999999"],
+                ecrire=lambda lignes: lots.append(lignes) or len(lignes),
+            )
+        finally:
+            faux.arreter()
+
+        assert [len(lot) for lot in lots] == [5, 5, 2]
+        assert 1 < faux.max_en_vol <= 3
+        assert (metriques.modifies, metriques.inconnus, metriques.ecrits) == (12, 1, 12)
+        assert metriques.lots == 3
+        assert metriques.debit > 0
+        ligne = lots[0][0]
+        assert ligne["nom"] == "Produit 1"
+        assert ligne["categorie"] == "Snacks"
+        assert ligne["nutriscore"] == "B"
+        assert ligne["etag"] and len(ligne["empreinte"]) == 64
+
+    def test_etag_evite_les_reecritures(self, serveur, catalogue):
+        lignes = []
+        rafraichisseur = RafraichisseurOpenFoodFacts(base_url=serveur.url, debit=0)
+        _rafraichir(rafraichisseur, catalogue, ecrire=lambda l: lignes.extend(l) or len(l))
+        etats = {l["code_barres"]: (l["etag"], l["empreinte"]) for l in lignes}
+        catalogue["0000000000001"]["product_name_fr"] = "Nouveau nom"
+
+        ecrits = []
+        metriques = _rafraichir(
+            rafraichisseur, catalogue, etats, ecrire=lambda l: ecrits.extend(l) or len(l)
+        )
+
+        assert metriques.inchanges == 11
+        assert [l["nom"] for l in ecrits] == ["Nouveau nom"]
+
+    def test_empreinte_sans_etag(self, catalogue):
+        faux = FauxServeurOFF(catalogue, etags=False)
+        try:
+            rafraichisseur = RafraichisseurOpenFoodFacts(base_url=faux.url, debit=0)
+            lignes = []
+            _rafraichir(rafraichisseur, catalogue, ecrire=lambda l: lignes.extend(l) or len(l))
+            etats = {l["code_barres"]: (None, l["empreinte"]) for l in lignes}
+
+            appels = []
+            metriques = _rafraichir(rafraichisseur, catalogue, etats, ecrire=appels.append)
+        finally:
+            faux.arreter()
+
+        assert metriques.inchanges == 12
+        assert appels == []
+
+    def test_debit_respecte(self, serveur, catalogue):
+        rafraichisseur = RafraichisseurOpenFoodFacts(base_url=serveur.url, concurrence=1, debit=40)
+        metriques = _rafraichir(rafraichisseur, list(catalogue)[:5])
+
+        # 1 jeton initial puis 4 requêtes cadencées à 40/s
+        assert metriques.duree_s >= 0.09
+        assert metriques.requetes == 5
+
+
+def test_job_sync_openfoodfacts(db, serveur, catalogue):
+    from src.core.models import ArticleInventaire, Ingredient
+    from src.core.models.user_preferences import OpenFoodFactsCache
+    from src.services.core.cron.jobs import _job_sync_openfoodfacts
+
+    ingredient = Ingredient(nom="Biscuits", unite="pcs")
+    db.add(ingredient)
+    db.flush()
+    codes = list(catalogue)[:3]
+    db.add_all(
+        [
+            ArticleInventaire(ingredient_id=ingredient.id, quantite=1, code_barres=code)
+            for code in codes
+        ]
+    )
+    db.add(OpenFoodFactsCache(code_barres=codes[0], nom="Ancien nom"))
+    db.commit()
+
+    @contextmanager
+    def _contexte():
+        yield db
+
+    with (
+        patch("src.core.db.obtenir_contexte_db", side_effect=_contexte),
+        patch(
+            "src.services.integrations.sync_openfoodfacts.RafraichisseurOpenFoodFacts",
+            partial(RafraichisseurOpenFoodFacts, base_url=serveur.url, debit=0),
+        ),
+    ):
+        _job_sync_openfoodfacts()
+
+    lignes = {c.code_barres: c for c in db.query(OpenFoodFactsCache).all()}
+    assert set(lignes) == set(codes)
+    assert lignes[codes[0]].nom == "Produit 1"
+    assert lignes[codes[0]].etag is not None
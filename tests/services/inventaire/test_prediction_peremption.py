@@ -0,0 +1,192 @@
+"""Tests de la prédiction de péremption et des statistiques de durée de vie
+matérialisées (``stats_duree_vie``)."""
+
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.core.models import ArticleInventaire, HistoriqueInventaire, Ingredient
+from src.core.models.inventaire import StatistiqueDureeVie
+from src.services.cuisine.prediction_peremption import (
+    ServicePredictionPeremption,
+    fusionner_welford,
+)
+
+T0 = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def service():
+    return ServicePredictionPeremption()
+
+
+def _article(db, nom: str, categorie: str, **kwargs) -> ArticleInventaire:
+    ingredient = Ingredient(nom=nom, unite="pcs", categorie=categorie)
+    db.add(ingredient)
+    db.flush()
+    article = ArticleInventaire(ingredient_id=ingredient.id, quantite=1, **kwargs)
+    db.add(article)
+    db.flush()
+    return article
+
+
+def _cycle(db, article: ArticleInventaire, debut: datetime, duree_jours: int) -> None:
+    """Ajout puis consommation complète ``duree_jours`` plus tard."""
+    for type_modif, quand, apres in (
+        ("ajout", debut, 1.0),
+        ("modification", debut + timedelta(days=duree_jours), 0.0),
+    ):
+        db.add(
+            HistoriqueInventaire(
+                article_id=article.id,
+                ingredient_id=article.ingredient_id,
+                type_modification=type_modif,
+                quantite_apres=apres,
+                date_modification=quand,
+            )
+        )
+    db.flush()
+
+
+def _stat(db, portee: str, cle: str) -> StatistiqueDureeVie:
+    return db.query(StatistiqueDureeVie).filter_by(portee=portee, cle=cle).one()
+
+
+class TestStatistiquesDureeVie:
+    def test_fusion_welford(self):
+        a, b = [3, 5, 4], [8, 2]
+        agregat = fusionner_welford(
+            (len(a), statistics.mean(a), statistics.variance(a) * (len(a) - 1)),
+            (len(b), statistics.mean(b), statistics.variance(b) * (len(b) - 1)),
+        )
+
+        assert agregat[0] == 5
+        assert agregat[1] == pytest.approx(statistics.mean(a + b))
+        assert agregat[2] / 4 == pytest.approx(statistics.variance(a + b))
+
+    def test_delta_incremental_equivaut_au_recalcul_complet(self, db, service):
+        pomme = _article(db, "Pomme", "Fruits")
+        poire = _article(db, "Poire", "Fruits")
+        _cycle(db, pomme, T0, 4)
+        _cycle(db, poire, T0, 8)
+
+        assert service.mettre_a_jour_statistiques(db=db)["evenements"] == 2
+
+        _cycle(db, pomme, T0 + timedelta(days=20), 6)
+        _cycle(db, pomme, T0 + timedelta(days=40), 3)
+        resultat = service.mettre_a_jour_statistiques(db=db)
+
+        assert resultat == {"evenements": 2, "observations": 2}
+        fruits = _stat(db, "categorie", "fruits")
+        assert fruits.nb_observations == 4
+        assert fruits.moyenne_jours == pytest.approx(statistics.mean([4, 8, 6, 3]))
+        assert fruits.variance == pytest.approx(statistics.variance([4, 8, 6, 3]))
+        assert fruits.derniere_observation == T0 + timedelta(days=43)
+        assert _stat(db, "ingredient", str(pomme.ingredient_id)).nb_observations == 3
+
+    def test_watermark_evite_le_double_comptage(self, db, service):
+        lait = _article(db, "Lait", "Produits laitiers")
+        _cycle(db, lait, T0, 5)
+
+        service.mettre_a_jour_statistiques(db=db)
+        assert service.mettre_a_jour_statistiques(db=db)["evenements"] == 0
+        assert service.calculer_durees_vie_moyennes(db=db) == {"produits laitiers": 5.0}
+        assert _stat(db, "categorie", "produits laitiers").nb_observations == 1
+
+    def test_lecture_sans_mise_a_jour(self, db, service):
+        lait = _article(db, "Lait", "Produits laitiers")
+        _cycle(db, lait, T0, 5)
+
+        assert service.calculer_durees_vie_moyennes(db=db)["viandes"] == 4.0  # défauts
+        assert db.query(StatistiqueDureeVie).count() == 0
+
+    def test_ligne_validee_en_retard_rattrapee(self, db, service):
+        lait = _article(db, "Lait", "Produits laitiers")
+        beurre = _article(db, "Beurre", "Produits laitiers")
+        _cycle(db, beurre, T0, 9)
+        _cycle(db, lait, T0, 5)
+        # Consommation du beurre (id < celles du lait) pas encore validée au premier passage
+        en_retard = (
+            db.query(HistoriqueInventaire)
+            .filter_by(article_id=beurre.id, type_modification="modification")
+            .one()
+        )
+        db.expunge(en_retard)
+        db.query(HistoriqueInventaire).filter_by(id=en_retard.id).delete()
+
+        assert service.mettre_a_jour_statistiques(db=db)["evenements"] == 1
+
+        db.add(
+            HistoriqueInventaire(
+                id=en_retard.id,
+                article_id=beurre.id,
+                ingredient_id=beurre.ingredient_id,
+                type_modification="modification",
+                quantite_apres=0.0,
+                date_modification=en_retard.date_modification,
+            )
+        )
+        db.flush()
+
+        assert service.mettre_a_jour_statistiques(db=db)["evenements"] == 1
+        assert service.mettre_a_jour_statistiques(db=db)["evenements"] == 0
+        stat = _stat(db, "categorie", "produits laitiers")
+        assert (stat.nb_observations, stat.moyenne_jours) == (2, 7.0)
+
+    def test_consommation_sans_ajout_ignoree(self, db, service):
+        article = _article(db, "Riz", "Epicerie")
+        db.add(
+            HistoriqueInventaire(
+                article_id=article.id,
+                ingredient_id=article.ingredient_id,
+                type_modification="suppression",
+                date_modification=T0,
+            )
+        )
+        db.flush()
+
+        assert service.mettre_a_jour_statistiques(db=db)["observations"] == 0
+        assert service.calculer_durees_vie_moyennes(db=db)["viandes"] == 4.0
+
+
+class TestPrediction:
+    def test_duree_propre_a_l_ingredient_prioritaire(self, db, service):
+        yaourt = _article(db, "Yaourt", "Produits laitiers", emplacement="Frigo")
+        creme = _article(db, "Crème", "Produits laitiers", emplacement="Frigo")
+        for i in range(3):
+            _cycle(db, yaourt, T0 + timedelta(days=30 * i), 1)
+        for i in range(3):
+            _cycle(db, creme, T0 + timedelta(days=30 * i), 20)
+        for article in (yaourt, creme):
+            article.derniere_maj = datetime.now()
+        db.flush()
+        service.mettre_a_jour_statistiques(db=db)
+
+        items = service.predire_peremptions_personnalisees(horizon_jours=7, db=db)["items"]
+
+        # Catégorie: moyenne 10.5 j (hors horizon); yaourt: 1 j observé sur 3 cycles
+        assert [item["nom"] for item in items] == ["Yaourt"]
+        assert items[0]["niveau"] == "critique"
+
+    def test_nombre_de_requetes_independant_du_garde_manger(self, db, service):
+        for i in range(30):
+            article = _article(db, f"Produit {i}", "Legumes", emplacement="Placard")
+            _cycle(db, article, T0, 3)
+        service.mettre_a_jour_statistiques(db=db)
+        requetes = []
+        moteur = db.get_bind()
+
+        def _compter(*args):
+            requetes.append(args[2])
+
+        event.listen(moteur, "before_cursor_execute", _compter)
+        try:
+            resultat = service.predire_peremptions_personnalisees(horizon_jours=30, db=db)
+        finally:
+            event.remove(moteur, "before_cursor_execute", _compter)
+
+        assert resultat["total"] == 30
+        # stats catégories + garde-manger complet (aucun verrou ni commit)
+        assert len(requetes) == 2
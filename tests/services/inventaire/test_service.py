@@ -1035,3 +1035,81 @@ class TestArticleInventaireProperties:
         repr_str = repr(historique)
         assert "HistoriqueInventaire" in repr_str
         assert "modification" in repr_str
+
+
+# ═══════════════════════════════════════════════════════════
+# TESTS IMPORT EN LOT
+# ═══════════════════════════════════════════════════════════
+
+
+class TestImporterArticles:
+    """Tests pour importer_articles."""
+
+    @staticmethod
+    def _ligne(nom: str, **extra) -> dict:
+        return {"nom": nom, "quantite": 2.0, "quantite_min": 1.0, "unite": "kg", **extra}
+
+    def test_import_cree_ingredients_et_articles(self, service, patch_db_context, db: Session):
+        resultats = service.importer_articles([self._ligne("Carottes"), self._ligne("Navets")])
+
+        assert [r["status"] for r in resultats] == ["✅", "✅"]
+        noms = {a.ingredient.nom for a in db.query(ArticleInventaire).all()}
+        assert noms == {"Carottes", "Navets"}
+
+    def test_ligne_en_echec_isolee(self, service, patch_db_context, db: Session):
+        """Une ligne rejetée en base n'empêche pas l'import des autres."""
+        from src.services.core.base import bulk
+
+        upsert_reel = bulk.bulk_upsert
+
+        def upsert_rejetant(session, model, lignes, *args, **kwargs):
+            if any(ligne.get("nom") == "Rejetée" for ligne in lignes):
+                raise ValueError("contrainte violée")
+            return upsert_reel(session, model, lignes, *args, **kwargs)
+
+        with patch.object(bulk, "bulk_upsert", upsert_rejetant):
+            resultats = service.importer_articles(
+                [self._ligne("Carottes"), self._ligne("Rejetée"), self._ligne("x")]
+            )
+
+        assert [r["status"] for r in resultats] == ["✅", "❌", "❌"]
+        assert resultats[1]["message"] == "contrainte violée"
+        assert {i.nom for i in db.query(Ingredient).all()} == {"Carottes"}
+        assert db.query(ArticleInventaire).count() == 1
+
+    def test_article_existant_non_reimporte(self, service, patch_db_context, db: Session):
+        """Un article déjà en stock (en base ou plus haut dans le fichier) est signalé."""
+        service.importer_articles([self._ligne("Carottes")])
+
+        resultats = service.importer_articles(
+            [self._ligne("Carottes"), self._ligne("Navets"), self._ligne("Navets", quantite=9.0)]
+        )
+
+        assert [r["status"] for r in resultats] == ["❌", "✅", "❌"]
+        assert resultats[0]["message"] == "Article déjà présent dans l'inventaire"
+        assert db.query(ArticleInventaire).count() == 2
+        navets = db.query(ArticleInventaire).join(Ingredient).filter(Ingredient.nom == "Navets")
+        assert navets.one().quantite == 2.0
+
+    def test_articles_inseres_en_un_lot(self, service, patch_db_context, db: Session):
+        """Les articles partent en une seule écriture groupée, sans ajouter_article."""
+        from src.services.core.base import bulk
+
+        upsert_reel = bulk.bulk_upsert
+        appels: list[str] = []
+
+        def upsert_trace(session, model, lignes, *args, **kwargs):
+            appels.append(model.__name__)
+            return upsert_reel(session, model, lignes, *args, **kwargs)
+
+        lignes = [self._ligne(f"Légume {i}") for i in range(20)]
+        with (
+            patch.object(bulk, "bulk_upsert", upsert_trace),
+            patch.object(service, "ajouter_article") as ajouter,
+        ):
+            resultats = service.importer_articles(lignes)
+
+        assert all(r["status"] == "✅" for r in resultats)
+        assert appels == ["Ingredient", "ArticleInventaire"]
+        ajouter.assert_not_called()
+        assert db.query(ArticleInventaire).count() == 20
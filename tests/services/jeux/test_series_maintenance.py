@@ -0,0 +1,252 @@
+"""
+Tests de la maintenance ensembliste des séries (src/services/jeux/_internal/series_service.py):
+application des résultats du jour en lot, lectures et agrégats calculés en SQL.
+"""
+
+import random
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models import SerieJeux
+from src.services.jeux import SEUIL_VALUE_ALERTE, ResultatSerie, SeriesService
+from src.services.jeux._internal.loto_data import TirageLoto
+from src.services.jeux._internal.series_service import VALUE_SQL
+from src.services.jeux._internal.sync_service import SyncService
+
+JOUR = date(2026, 10, 18)
+
+
+def _etat(session) -> dict:
+    session.expire_all()
+    return {
+        (s.type_jeu, s.championnat, s.marche): (
+            s.serie_actuelle,
+            s.nb_occurrences,
+            s.nb_total,
+            round(s.frequence, 9),
+            s.derniere_occurrence,
+        )
+        for s in session.query(SerieJeux).all()
+    }
+
+
+@pytest.fixture
+def session():
+    moteur = create_engine("sqlite://")
+    SerieJeux.__table__.create(moteur)
+    requetes: list[str] = []
+    event.listen(moteur, "before_cursor_execute", lambda *a: requetes.append(a[2]))
+    alea = random.Random(4)
+    with sessionmaker(bind=moteur)() as s:
+        for championnat in (None, "Ligue 1", "Serie A"):
+            for marche in ("nul", "domicile_mi_temps", "plus_2_5"):
+                total = alea.randint(10, 40)
+                occurrences = alea.randint(1, total)
+                s.add(
+                    SerieJeux(
+                        type_jeu="paris",
+                        championnat=championnat,
+                        marche=marche,
+                        serie_actuelle=alea.randint(0, 12),
+                        nb_occurrences=occurrences,
+                        nb_total=total,
+                        frequence=occurrences / total,
+                    )
+                )
+        marches_loto = [f"principal_{n}" for n in range(1, 50)]
+        marches_loto += [f"chance_{n}" for n in range(1, 11)]
+        for marche in marches_loto:
+            s.add(
+                SerieJeux(
+                    type_jeu="loto",
+                    marche=marche,
+                    serie_actuelle=alea.randint(0, 30),
+                    nb_occurrences=20,
+                    nb_total=200,
+                    frequence=0.1,
+                )
+            )
+        s.commit()
+        s.requetes = requetes
+        yield s
+    moteur.dispose()
+
+
+class TestAppliquerResultats:
+    def test_equivalent_aux_mises_a_jour_unitaires(self, session):
+        service = SeriesService()
+        resultats = [
+            ResultatSerie(marche, (i + j) % 3 == 0, championnat)
+            for i, championnat in enumerate((None, "Ligue 1", "Serie A"))
+            for j, marche in enumerate(("nul", "domicile_mi_temps", "plus_2_5"))
+        ]
+        avant = _etat(session)
+
+        for r in resultats:
+            if r.survenu:
+                service.reset_serie("paris", r.marche, r.championnat, JOUR, db=session)
+            else:
+                service.incrementer_serie("paris", r.marche, r.championnat, db=session)
+        unitaire = _etat(session)
+
+        for cle, valeurs in avant.items():
+            serie = (
+                session.query(SerieJeux)
+                .filter_by(type_jeu=cle[0], championnat=cle[1], marche=cle[2])
+                .one()
+            )
+            serie.serie_actuelle, serie.nb_occurrences, serie.nb_total = valeurs[:3]
+            serie.frequence, serie.derniere_occurrence = valeurs[3:]
+        session.commit()
+
+        assert service.appliquer_resultats("paris", resultats, JOUR, db=session) == 9
+        assert _etat(session) == unitaire
+        remis = unitaire[("paris", "Ligue 1", "plus_2_5")]
+        assert remis[0] == 0 and remis[4] == JOUR
+
+    def test_tirage_loto(self, session):
+        service = SeriesService()
+        avant = _etat(session)
+        sortis = {"principal_3", "principal_17", "principal_22", "principal_38", "principal_49"}
+        sortis.add("chance_4")
+
+        nb = service.appliquer_tirage_loto([3, 17, 22, 38, 49], 4, JOUR, db=session)
+
+        apres = _etat(session)
+        assert nb == 59
+        for cle, precedent in avant.items():
+            if cle[0] != "loto":
+                continue
+            serie, occurrences, total, frequence, derniere = apres[cle]
+            assert total == 201
+            assert occurrences == 21 if cle[2] in sortis else occurrences == 20
+            assert serie == (0 if cle[2] in sortis else precedent[0] + 1)
+            assert frequence == round(occurrences / 201, 9)
+            assert derniere == (JOUR if cle[2] in sortis else None)
+        # Les séries paris ne sont pas touchées
+        assert all(apres[cle] == valeurs for cle, valeurs in avant.items() if cle[0] == "paris")
+
+    def test_requete_postgresql_unique(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute.return_value.rowcount = 2
+
+        SeriesService().appliquer_resultats(
+            "paris",
+            [ResultatSerie("nul", True, "Ligue 1"), ResultatSerie("nul", False)],
+            JOUR,
+            db=session,
+        )
+
+        assert session.execute.call_count == 1
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in sql
+        assert "IS NOT DISTINCT FROM resultats.championnat" in sql
+
+    def test_tirage_loto_sans_chance(self, session):
+        avant = _etat(session)
+
+        assert SeriesService().appliquer_tirage_loto([1, 2, 3, 4, 5], db=session) == 49
+        apres = _etat(session)
+        assert all(apres[cle] == avant[cle] for cle in avant if cle[2].startswith("chance_"))
+
+    def test_sans_resultat(self, session):
+        session.requetes.clear()
+
+        assert SeriesService().appliquer_resultats("loto", [], db=session) == 0
+        assert session.requetes == []
+
+
+class TestLecturesSQL:
+    def test_opportunites_et_tris(self, session):
+        service = SeriesService()
+        series = session.query(SerieJeux).all()
+        attendu = sorted(
+            (s for s in series if s.serie_actuelle >= 3 and s.value >= 1.5),
+            key=lambda s: (-s.value, s.id),
+        )
+
+        assert service.detecter_opportunites(seuil=1.5, db=session) == attendu
+        assert service.detecter_opportunites("loto", seuil=1.5, db=session) == [
+            s for s in attendu if s.type_jeu == "loto"
+        ]
+        loto = service.obtenir_series_loto(db=session)
+        assert [s.serie_actuelle for s in loto] == sorted(
+            (s.serie_actuelle for s in series if s.type_jeu == "loto"), reverse=True
+        )
+        ligue = service.obtenir_series_par_championnat("Ligue 1", db=session)
+        assert [s.value for s in ligue] == sorted((s.value for s in ligue), reverse=True)
+
+    def test_statistiques_globales_en_une_requete(self, session):
+        series = session.query(SerieJeux).filter_by(type_jeu="loto").all()
+        session.requetes.clear()
+
+        stats = SeriesService().statistiques_globales("loto", db=session)
+
+        assert len(session.requetes) == 1
+        assert stats == {
+            "nb_series": 59,
+            "serie_max": max(s.serie_actuelle for s in series),
+            "value_max": pytest.approx(max(s.value for s in series)),
+            "nb_opportunites": sum(s.value >= SEUIL_VALUE_ALERTE for s in series),
+        }
+        assert SeriesService().statistiques_globales("absent", db=session) == {
+            "nb_series": 0,
+            "serie_max": 0,
+            "value_max": 0.0,
+            "nb_opportunites": 0,
+        }
+
+    def test_index_partiel(self):
+        index = next(
+            i for i in SerieJeux.__table__.indexes if i.name == "ix_jeux_series_opportunites"
+        )
+        where = str(index.dialect_options["postgresql"]["where"])
+
+        assert "serie_actuelle >= 3" in where
+        assert f"{VALUE_SQL.left.name} * {VALUE_SQL.right.name} >= 2.0" in where
+
+
+class TestSyncLoto:
+    @staticmethod
+    def _tirages(nb: int) -> list[TirageLoto]:
+        return [
+            TirageLoto(
+                date_tirage=date.fromordinal(JOUR.toordinal() - nb + i),
+                numeros=[1 + i % 45, 46, 47, 48, 49],
+                numero_chance=1 + i % 10,
+            )
+            for i in range(1, nb + 1)
+        ]
+
+    def test_nouveaux_tirages_appliques_en_lot(self, session):
+        avant = _etat(session)
+        session.requetes.clear()
+
+        assert SyncService()._appliquer_nouveaux_tirages_loto(
+            self._tirages(202), "tous", db=session
+        )
+
+        apres = _etat(session)
+        assert {cle: valeurs[2] for cle, valeurs in apres.items() if cle[0] == "loto"} == {
+            cle: 202 for cle in avant if cle[0] == "loto"
+        }
+        assert apres[("loto", None, "principal_49")][:2] == (0, 22)
+        assert apres[("loto", None, "chance_3")][4] == JOUR
+        assert not any(r.lstrip().upper().startswith("INSERT") for r in session.requetes)
+
+    def test_persistance_complete_si_series_desalignees(self, session):
+        session.query(SerieJeux).filter_by(marche="chance_3").delete()
+        session.commit()
+        service = SyncService()
+
+        assert not service._appliquer_nouveaux_tirages_loto(self._tirages(201), "tous", db=session)
+        assert service._appliquer_nouveaux_tirages_loto(self._tirages(201), "principal", db=session)
+        assert not service._appliquer_nouveaux_tirages_loto(
+            self._tirages(190), "principal", db=session
+        )
@@ -0,0 +1,220 @@
+"""
+Tests du moteur colonnaire de détection de biais (src/services/jeux/series_statistiques.py):
+encodage des séries, runs test, bootstrap vectorisé et cache par utilisateur.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy import stats
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models import PariSportif
+from src.services.jeux.series_statistiques import (
+    SerieParis,
+    SeriesStatistiquesService,
+    encoder_series,
+    intervalle_bootstrap_ecart,
+    intervalle_bootstrap_moyenne,
+    invalider_cache_analyses,
+    statistique_runs,
+)
+
+
+def _paris(nb: int, graine: int = 3, p_gain: float = 0.45) -> list[SimpleNamespace]:
+    alea = random.Random(graine)
+    paris = []
+    for i in range(nb):
+        if alea.random() < 0.05:
+            statut = "en_attente"
+        else:
+            statut = "gagne" if alea.random() < p_gain else "perdu"
+        mise = Decimal(alea.choice([5, 10, 10, 20, 50]))
+        gain = mise * Decimal("2.1") if statut == "gagne" else None
+        paris.append(SimpleNamespace(id=i + 1, statut=statut, mise=mise, gain=gain))
+    return paris
+
+
+class TestPrimitives:
+    def test_encoder_series(self):
+        valeurs, longueurs = encoder_series(np.array([1, 1, 0, 0, 0, 1, 0, 0]))
+
+        assert valeurs.tolist() == [1, 0, 1, 0]
+        assert longueurs.tolist() == [2, 3, 1, 2]
+        assert encoder_series(np.array([], dtype=bool))[1].size == 0
+
+    def test_statistique_runs_formule(self):
+        sequence = np.array([1, 1, 0, 1, 0, 0, 0, 1, 1, 1, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0])
+        n1, n0, n = 10, 10, 20
+        runs = 1 + sum(a != b for a, b in zip(sequence, sequence[1:], strict=False))
+        attendus = 2 * n1 * n0 / n + 1
+        variance = 2 * n1 * n0 * (2 * n1 * n0 - n) / (n**2 * (n - 1))
+        z = (runs - attendus) / variance**0.5
+
+        assert statistique_runs(sequence) == pytest.approx(
+            (runs, attendus, z, 2 * stats.norm.sf(abs(z)))
+        )
+        assert statistique_runs(np.ones(25))[3] == 1.0
+
+    def test_bootstrap_deterministe_et_couvrant(self):
+        valeurs = np.random.default_rng(1).normal(3.0, 2.0, 400)
+
+        bas, haut = intervalle_bootstrap_moyenne(valeurs, np.random.default_rng(0))
+
+        assert bas < valeurs.mean() < haut
+        assert (bas, haut) == intervalle_bootstrap_moyenne(valeurs, np.random.default_rng(0))
+
+    def test_bootstrap_ecart_conditionnel(self):
+        alea = np.random.default_rng(2)
+        condition = alea.random(2000) < 0.5
+        evenement = np.where(condition, alea.random(2000) < 0.7, alea.random(2000) < 0.3)
+
+        bas, haut = intervalle_bootstrap_ecart(condition, evenement, np.random.default_rng(0))
+
+        assert 0.3 < bas < 0.4 < haut < 0.5
+
+
+class TestTestsVectorises:
+    def test_equivalence_avec_les_objets_orm(self):
+        paris = _paris(200)
+        service = SeriesStatistiquesService()
+        termines = [p for p in paris if p.statut in ("gagne", "perdu")]
+        profits = [
+            float((p.gain or 0) - p.mise) if p.statut == "gagne" else -float(p.mise)
+            for p in termines
+        ]
+
+        regression = service.test_regression_moyenne(paris)
+        hot_hand = service.test_hot_hand_fallacy(paris)
+        gamblers = service.test_gamblers_fallacy(SerieParis.depuis_paris(paris))
+
+        attendu_z = (np.mean(profits[-5:]) - np.mean(profits)) / (
+            np.std(profits, ddof=1) / np.sqrt(5)
+        )
+        assert regression.details["z_score"] == round(attendu_z, 2)
+        assert regression.details["nb_paris"] == len(termines)
+        bas, haut = regression.details["ic95_moyenne_globale"]
+        assert bas < np.mean(profits) < haut
+
+        sequence = [p.statut == "gagne" for p in termines]
+        apres_gain = [b for a, b in zip(sequence, sequence[1:], strict=False) if a]
+        assert hot_hand.details["p_gain_apres_gain"] == round(sum(apres_gain) / len(apres_gain), 4)
+        assert hot_hand.details["nb_runs"] == 1 + sum(
+            a != b for a, b in zip(sequence, sequence[1:], strict=False)
+        )
+
+        mediane = np.median([float(p.mise) for p in termines])
+        table = [[0, 0], [0, 0]]
+        for precedent, actuel in zip(termines, termines[1:], strict=False):
+            table[precedent.statut == "perdu"][0 if actuel.mise >= mediane else 1] += 1
+        assert gamblers.details["table_contingence"] == table
+        assert gamblers.details["p_value"] == round(stats.chi2_contingency(table)[1], 4)
+
+    def test_series_groupees_detectees(self):
+        statuts = (["gagne"] * 8 + ["perdu"] * 8) * 3
+        paris = [SimpleNamespace(id=i, statut=s, mise=10, gain=20) for i, s in enumerate(statuts)]
+
+        resultat = SeriesStatistiquesService().test_hot_hand_fallacy(paris)
+
+        assert resultat.alerte
+        assert resultat.details["pattern_type"] == "clustering"
+        assert resultat.details["plus_longue_serie_gains"] == 8
+
+    def test_milliers_de_paris_en_millisecondes(self):
+        serie = SerieParis.depuis_paris(_paris(5000))
+        service = SeriesStatistiquesService()
+
+        debut = time.perf_counter()
+        for test in (
+            service.test_regression_moyenne,
+            service.test_hot_hand_fallacy,
+            service.test_gamblers_fallacy,
+        ):
+            test(serie)
+
+        assert time.perf_counter() - debut < 1.0
+
+
+class TestAnalyseUtilisateur:
+    @pytest.fixture
+    def session(self):
+        moteur = create_engine("sqlite://")
+        PariSportif.__table__.create(moteur)
+        requetes: list[str] = []
+        event.listen(moteur, "before_cursor_execute", lambda *a: requetes.append(a[2]))
+        invalider_cache_analyses()
+        with sessionmaker(bind=moteur)() as s:
+            depart = datetime(2026, 1, 1)
+            for i, p in enumerate(_paris(80)):
+                s.add(
+                    PariSportif(
+                        user_id=1,
+                        prediction="1",
+                        cote=2.1,
+                        statut=p.statut,
+                        mise=p.mise,
+                        gain=p.gain,
+                        cree_le=depart + timedelta(hours=i),
+                    )
+                )
+            s.commit()
+            s.requetes = requetes
+            yield s
+        invalider_cache_analyses()
+        moteur.dispose()
+
+    def test_ordre_chronologique(self, session):
+        resultats = SeriesStatistiquesService().analyser_patterns_utilisateur(
+            1, nb_paris=50, db=session
+        )
+
+        paris = session.query(PariSportif).order_by(PariSportif.cree_le).all()[-50:]
+        attendu = SeriesStatistiquesService().test_regression_moyenne(paris)
+        assert resultats["regression_moyenne"].details == attendu.details
+
+    def test_cache_invalide_par_nouveau_pari_ou_resolution(self, session):
+        service = SeriesStatistiquesService()
+        premier = service.analyser_patterns_utilisateur(1, db=session)
+        session.requetes.clear()
+
+        assert service.analyser_patterns_utilisateur(1, db=session) == premier
+        assert len(session.requetes) == 1  # signature seule
+
+        en_attente = session.query(PariSportif).filter_by(statut="en_attente").first()
+        en_attente.statut, en_attente.gain = "gagne", Decimal("50")
+        session.commit()
+        session.requetes.clear()
+
+        service.analyser_patterns_utilisateur(1, db=session)
+        assert len(session.requetes) == 2
+
+    def test_cache_invalide_par_modification_pari_resolu(self, session):
+        service = SeriesStatistiquesService()
+        service.analyser_patterns_utilisateur(1, db=session)
+
+        resolu = session.query(PariSportif).filter_by(statut="perdu").first()
+        resolu.mise = resolu.mise + Decimal("5")
+        session.commit()
+        session.requetes.clear()
+
+        service.analyser_patterns_utilisateur(1, db=session)
+        assert len(session.requetes) == 2
+
+    def test_resultats_en_cache_non_partages(self, session):
+        service = SeriesStatistiquesService()
+        premier = service.analyser_patterns_utilisateur(1, db=session)
+        premier["hot_hand"].details["nb_paris"] = -1
+        premier["hot_hand"].alerte = None
+        del premier["regression_moyenne"]
+
+        second = service.analyser_patterns_utilisateur(1, db=session)
+
+        assert second["hot_hand"].details["nb_paris"] != -1
+        assert second["hot_hand"].alerte is not None
+        assert "regression_moyenne" in second
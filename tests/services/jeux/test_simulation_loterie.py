@@ -0,0 +1,198 @@
+"""
+Tests du moteur Monte Carlo de grilles (src/services/jeux/_internal/simulation_loterie.py):
+tirage sans remise vectorisé, notation en bloc, reproductibilité et intégration
+Loto / Euromillions.
+"""
+
+import itertools
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.services.jeux import (
+    REGLES_EUROMILLIONS,
+    REGLES_LOTO,
+    LotGrilles,
+    LotoDataService,
+    MoteurMonteCarlo,
+    TirageLoto,
+    scorer_grilles,
+    tirer_sans_remise,
+)
+from src.services.jeux.euromillions_ia import EuromillionsIAService
+
+
+class TestTirerSansRemise:
+    def test_valeurs_distinctes_triees(self):
+        tirages = tirer_sans_remise(np.random.default_rng(0), 5000, 49, 5)
+
+        assert tirages.shape == (5000, 5)
+        assert (np.diff(tirages, axis=1) > 0).all()
+        assert tirages.min() >= 1 and tirages.max() <= 49
+
+    def test_loi_des_tirages_ponderes_successifs(self):
+        poids = np.array([1.0, 2.0, 3.0, 4.0])
+        # Probabilité exacte que chaque paire sorte en tirant 2 fois sans remise
+        attendu = dict.fromkeys(itertools.combinations(range(1, 5), 2), 0.0)
+        for a, b in itertools.permutations(range(4), 2):
+            p = poids[a] / poids.sum() * poids[b] / (poids.sum() - poids[a])
+            attendu[tuple(sorted((a + 1, b + 1)))] += p
+
+        tirages = tirer_sans_remise(np.random.default_rng(1), 200_000, 4, 2, poids)
+
+        paires, comptes = np.unique(tirages, axis=0, return_counts=True)
+        for paire, compte in zip(map(tuple, paires.tolist()), comptes, strict=True):
+            assert compte / len(tirages) == pytest.approx(attendu[paire], abs=0.005)
+
+    def test_poids_nuls(self):
+        poids = np.zeros(10)
+        poids[[2, 5, 7]] = 1.0
+
+        complets = tirer_sans_remise(np.random.default_rng(2), 2000, 10, 3, poids)
+        completes = tirer_sans_remise(np.random.default_rng(2), 2000, 10, 4, poids)
+
+        assert (complets == [3, 6, 8]).all()
+        # Le 4e numéro est tiré au hasard parmi les poids nuls
+        assert len(np.unique(completes)) == 10
+        uniformes = tirer_sans_remise(np.random.default_rng(3), 500, 10, 2, poids * 0)
+        assert len(np.unique(uniformes)) == 10
+
+    def test_parametres_invalides(self):
+        with pytest.raises(ValueError):
+            tirer_sans_remise(np.random.default_rng(), 1, 5, 6)
+        with pytest.raises(ValueError):
+            tirer_sans_remise(np.random.default_rng(), 1, 3, 2, np.array([1.0, -1.0, 1.0]))
+
+
+class TestScorerGrilles:
+    def test_equivalent_au_score_par_grille(self):
+        service = EuromillionsIAService()
+        grilles = tirer_sans_remise(np.random.default_rng(4), 3000, 50, 5)
+
+        scores = scorer_grilles(grilles, REGLES_EUROMILLIONS)
+
+        for grille, score in zip(grilles.tolist(), scores, strict=True):
+            assert score == service.calculer_qualite_grille(grille, [1, 2])
+
+
+class TestMoteurMonteCarlo:
+    def test_reproductible_quel_que_soit_le_nombre_de_processus(self):
+        moteur = MoteurMonteCarlo(REGLES_LOTO, taille_bloc=2_000, nb_processus=1)
+        parallele = MoteurMonteCarlo(REGLES_LOTO, taille_bloc=2_000, nb_processus=2)
+
+        sequentiel = list(moteur.iterer(7_000, graine=11))
+        distribue = list(parallele.iterer(7_000, graine=11))
+
+        assert [len(lot) for lot in sequentiel] == [2_000, 2_000, 2_000, 1_000]
+        for a, b in zip(sequentiel, distribue, strict=True):
+            assert (a.numeros == b.numeros).all() and (a.speciaux == b.speciaux).all()
+        assert not (sequentiel[0].numeros == sequentiel[1].numeros).all()
+
+    def test_pool_sans_fork(self, monkeypatch):
+        from src.services.jeux._internal import simulation_loterie
+
+        contextes = []
+
+        class _Pool:
+            def __init__(self, max_workers, mp_context):
+                contextes.append(mp_context.get_start_method())
+
+            def map(self, fonction, *arguments):
+                return map(fonction, *arguments)
+
+            def shutdown(self, cancel_futures):
+                pass
+
+        monkeypatch.setattr(simulation_loterie, "ProcessPoolExecutor", _Pool)
+        moteur = MoteurMonteCarlo(REGLES_LOTO, taille_bloc=1_000, nb_processus=2)
+
+        assert len(list(moteur.iterer(3_000, graine=1))) == 3
+        assert contextes == ["spawn"]
+
+    def test_meilleures_grilles_sur_le_flux(self):
+        poids = np.linspace(0.1, 1.0, 49)
+        moteur = MoteurMonteCarlo(REGLES_LOTO, poids_numeros=poids, taille_bloc=3_000)
+
+        meilleures = moteur.meilleures_grilles(10_000, nb_grilles=4, graine=5)
+
+        tout = LotGrilles.concatener(list(moteur.iterer(10_000, graine=5)))
+        ordre = sorted(
+            zip(tout.qualite.tolist(), tout.potentiel.tolist(), strict=True), reverse=True
+        )[:4]
+        obtenu = zip(meilleures.qualite.tolist(), meilleures.potentiel.tolist(), strict=True)
+        assert list(obtenu) == ordre
+        assert (meilleures.speciaux >= 1).all() and (meilleures.speciaux <= 10).all()
+
+    def test_pool_de_100k_interactif(self):
+        debut = time.perf_counter()
+
+        meilleures = MoteurMonteCarlo(REGLES_EUROMILLIONS).meilleures_grilles(100_000, 5, graine=1)
+
+        assert time.perf_counter() - debut < 2.0
+        assert meilleures.qualite.tolist() == [100.0] * 5
+        assert meilleures.speciaux.shape == (5, 2)
+
+
+class TestIntegrationJeux:
+    @pytest.fixture
+    def tirages(self):
+        alea = random.Random(9)
+        return [
+            TirageLoto(
+                date_tirage=date(2024, 1, 1) + timedelta(days=3 * i),
+                numeros=alea.sample(range(1, 50), 5),
+                numero_chance=alea.randint(1, 10),
+            )
+            for i in range(300)
+        ]
+
+    def test_statistiques_vectorisees_loto(self, tirages):
+        service = LotoDataService()
+
+        globales = service.calculer_toutes_statistiques(tirages)
+
+        for numero, stat in globales.numeros_principaux.items():
+            assert stat == service.calculer_statistiques_numero(numero, tirages, "principal")
+        for numero, stat in globales.numeros_chance.items():
+            assert stat == service.calculer_statistiques_numero(numero, tirages, "chance")
+
+    def test_generer_grilles_loto(self, tirages):
+        service = LotoDataService()
+
+        grilles = service.generer_grilles(20_000, nb_grilles=3, tirages=tirages, graine=8)
+
+        assert grilles == service.generer_grilles(20_000, nb_grilles=3, tirages=tirages, graine=8)
+        assert len(grilles) == 3
+        for grille in grilles:
+            assert len(set(grille["numeros"])) == 5
+            assert 1 <= grille["numero_chance"] <= 10
+
+    def test_tirer_grille_varie_sans_graine(self, tirages, monkeypatch):
+        service = LotoDataService()
+        stats = service.calculer_toutes_statistiques(tirages)
+        monkeypatch.setattr(
+            service, "calculer_toutes_statistiques", lambda *a: pytest.fail("stats recalculées")
+        )
+
+        grilles = [service.tirer_grille(stats, nb_candidats=5_000) for _ in range(5)]
+
+        assert len({tuple(g["numeros"]) for g in grilles}) > 1
+        assert service.tirer_grille(stats, 5_000, graine=4) == service.tirer_grille(
+            stats, 5_000, graine=4
+        )
+
+    def test_euromillions_statistiques_par_defaut(self):
+        service = EuromillionsIAService()
+        stats = service._statistiques_par_defaut()  # retards tous nuls
+
+        grille = service.generer_grille_equilibree(stats)
+        grilles = service.generer_grilles_monte_carlo(stats, nb_candidats=5_000, graine=2)
+
+        assert len(set(grille.numeros)) == 5 and len(set(grille.etoiles)) == 2
+        assert len(grilles) == 5
+        assert grilles[0].qualite == service.calculer_qualite_grille(
+            grilles[0].numeros, grilles[0].etoiles
+        )
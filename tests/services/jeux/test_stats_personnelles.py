@@ -20,41 +20,41 @@ from tests.services.jeux.conftest import creer_match_test
 
 class TestStatsPersonnellesService:
     """Tests pour le service StatsPersonnellesService."""
-    
+
     @pytest.fixture
     def service(self):
         """Fixture service."""
         return StatsPersonnellesService()
-    
+
     @pytest.fixture
     def user_id_test(self):
         """User ID pour tests."""
         return 1
-    
+
     def test_calculer_roi_global_sans_donnees(self, service, user_id_test):
         """Test ROI avec aucun pari/grille."""
         with obtenir_contexte_db() as session:
             # User fictif sans données
             result = service.calculer_roi_global(user_id=99999, jours=30, session=session)
-        
+
         assert result["roi"] == 0.0
         assert result["gains_totaux"] == 0.0
         assert result["mises_totales"] == 0.0
         assert result["benefice_net"] == 0.0
         assert result["nb_paris"] == 0
         assert result["nb_grilles"] == 0
-    
+
     @pytest.mark.integration
     def test_calculer_roi_global_avec_paris(self, service, user_id_test):
         """Test ROI avec paris mockés."""
         with obtenir_contexte_db() as session:
             # Nettoyer données test
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
-            
+
             # Créer matchs de test
             for mid in (1, 2, 3):
                 creer_match_test(session, mid)
-            
+
             # Créer 3 paris: 2 gagnants, 1 perdant
             paris = [
                 PariSportif(
@@ -91,14 +91,14 @@ class TestStatsPersonnellesService:
                     date_pari=datetime.now()
                 ),
             ]
-            
+
             for p in paris:
                 session.add(p)
             session.commit()
-            
+
             # Calculer ROI
             result = service.calculer_roi_global(user_id=user_id_test, jours=30, session=session)
-            
+
             # Gains = 20 + 30 = 50€
             # Mises = 10 + 10 + 10 = 30€
             # ROI = (50 - 30) / 30 * 100 = 66.67%
@@ -107,34 +107,34 @@ class TestStatsPersonnellesService:
             assert result["benefice_net"] == 20.0
             assert 65.0 <= result["roi"] <= 67.0
             assert result["nb_paris"] == 3
-            
+
             # Nettoyage
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
             session.commit()
-    
+
     def test_calculer_win_rate_sans_donnees(self, service, user_id_test):
         """Test win rate sans données."""
         with obtenir_contexte_db() as session:
             result = service.calculer_win_rate(user_id=99999, jours=30, session=session)
-        
+
         assert result["win_rate_global"] == 0.0
         assert result["nb_gagnants"] == 0
         assert result["nb_total"] == 0
-    
+
     @pytest.mark.integration
     def test_calculer_win_rate_avec_paris(self, service, user_id_test):
         """Test win rate avec paris mockés."""
         with obtenir_contexte_db() as session:
             # Nettoyer
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
-            
+
             # Créer matchs de test
             for mid in range(5):
                 creer_match_test(session, mid)
-            
+
             # 3 gagnants / 5 total = 60%
             statuts = ["gagnant", "gagnant", "gagnant", "perdant", "perdant"]
-            
+
             for i, statut in enumerate(statuts):
                 pari = PariSportif(
                     user_id=user_id_test,
@@ -149,41 +149,41 @@ class TestStatsPersonnellesService:
                 )
                 session.add(pari)
             session.commit()
-            
+
             result = service.calculer_win_rate(user_id=user_id_test, jours=30, session=session)
-            
+
             assert result["nb_total"] == 5
             assert result["nb_gagnants"] == 3
             assert result["win_rate_global"] == 60.0
             assert result["win_rate_paris"] == 60.0
-            
+
             # Nettoyage
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
             session.commit()
-    
+
     @pytest.mark.integration
     def test_analyser_patterns_gagnants_sans_donnees(self, service, user_id_test):
         """Test patterns sans données."""
         with obtenir_contexte_db() as session:
             result = service.analyser_patterns_gagnants(user_id=99999, jours=90, session=session)
-        
+
         assert result["meilleur_type_pari"] is None
         assert result["meilleure_strategie_loto"] is None
         assert result["meilleure_strategie_euro"] is None
         assert len(result["roi_par_type"]) == 0
         assert len(result["recommandations"]) == 0
-    
+
     @pytest.mark.integration
     def test_analyser_patterns_gagnants_avec_donnees(self, service, user_id_test):
         """Test patterns avec paris variés."""
         with obtenir_contexte_db() as session:
             # Nettoyer
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
-            
+
             # Créer matchs de test
             for mid in (1, 2, 3):
                 creer_match_test(session, mid)
-            
+
             # Type "1" très rentable: 2 gagnés
             paris_type_1 = [
                 PariSportif(
@@ -209,7 +209,7 @@ class TestStatsPersonnellesService:
                     date_pari=datetime.now()
                 ),
             ]
-            
+
             # Type "X" peu rentable: 1 perdu
             paris_type_x = [
                 PariSportif(
@@ -224,54 +224,54 @@ class TestStatsPersonnellesService:
                     date_pari=datetime.now()
                 ),
             ]
-            
+
             for p in paris_type_1 + paris_type_x:
                 session.add(p)
             session.commit()
-            
+
             result = service.analyser_patterns_gagnants(user_id=user_id_test, jours=90, session=session)
-            
+
             # Type "1" devrait être meilleur
             assert result["meilleur_type_pari"] == "1"
-            
+
             # ROI type 1: (45 - 20) / 20 * 100 = 125%
             assert "1" in result["roi_par_type"]
             assert result["roi_par_type"]["1"]["roi"] > 100
-            
+
             # ROI type X: (0 - 10) / 10 * 100 = -100%
             assert "X" in result["roi_par_type"]
             assert result["roi_par_type"]["X"]["roi"] < 0
-            
+
             # Recommandation
             assert len(result["recommandations"]) > 0
             assert any("1" in rec for rec in result["recommandations"])
-            
+
             # Nettoyage
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
             session.commit()
-    
+
     def test_obtenir_evolution_mensuelle_sans_donnees(self, service, user_id_test):
         """Test évolution sans données."""
         with obtenir_contexte_db() as session:
             result = service.obtenir_evolution_mensuelle(user_id=99999, mois=6, session=session)
-        
+
         assert "evolution" in result
         assert len(result["evolution"]) == 6  # 6 mois demandés
-        
+
         # Tous les mois devraient avoir ROI = 0
         assert all(m["roi"] == 0.0 for m in result["evolution"])
-    
+
     @pytest.mark.integration
     def test_obtenir_evolution_mensuelle_avec_donnees(self, service, user_id_test):
         """Test évolution mensuelle avec paris répartis."""
         with obtenir_contexte_db() as session:
             # Nettoyer
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
-            
+
             # Créer matchs de test
             for mid in (1, 2):
                 creer_match_test(session, mid)
-            
+
             # Mois courant: 1 gagnant
             pari_courant = PariSportif(
                 user_id=user_id_test,
@@ -284,7 +284,7 @@ class TestStatsPersonnellesService:
                 statut="gagnant",
                 date_pari=datetime.now()
             )
-            
+
             # Mois -1: 1 perdant
             pari_ancien = PariSportif(
                 user_id=user_id_test,
@@ -297,22 +297,22 @@ class TestStatsPersonnellesService:
                 statut="perdant",
                 date_pari=datetime.now() - timedelta(days=35)
             )
-            
+
             session.add(pari_courant)
             session.add(pari_ancien)
             session.commit()
-            
+
             result = service.obtenir_evolution_mensuelle(user_id=user_id_test, mois=3, session=session)
-            
+
             assert len(result["evolution"]) == 3
-            
+
             # Dernier mois (index -1) devrait avoir ROI positif
             dernier_mois = result["evolution"][-1]
             assert dernier_mois["roi"] > 0
             assert dernier_mois["gains"] == 20.0
             assert dernier_mois["mises"] == 10.0
             assert dernier_mois["benefice"] == 10.0
-            
+
             # Nettoyage
             session.query(PariSportif).filter(PariSportif.user_id == user_id_test).delete()
             session.commit()
@@ -320,26 +320,164 @@ class TestStatsPersonnellesService:
 
 class TestStatsPersonnellesEdgeCases:
     """Tests cas limites."""
-    
+
     def test_roi_avec_mises_nulles(self):
         """Test ROI quand mises = 0 (division par zéro)."""
         service = StatsPersonnellesService()
-        
+
         with obtenir_contexte_db() as session:
             # Devrait retourner ROI = 0 sans crash
             result = service.calculer_roi_global(user_id=99999, jours=30, session=session)
-            
+
             assert result["roi"] == 0.0
-    
+
     def test_win_rate_avec_zero_paris(self):
         """Test win rate sans aucun pari."""
         service = StatsPersonnellesService()
-        
+
         with obtenir_contexte_db() as session:
             result = service.calculer_win_rate(user_id=99999, jours=30, session=session)
-            
+
             assert result["win_rate_global"] == 0.0
 
 
+# ═══════════════════════════════════════════════════════════
+# CUMULS MENSUELS (GROUP BY mois / jeux_stats_mensuelles)
+# ═══════════════════════════════════════════════════════════
+
+
+@pytest.fixture
+def base_jeux(tmp_path):
+    """Base SQLite avec paris et grilles répartis sur 14 mois, requêtes tracées."""
+    import random
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from src.core.models.base import Base
+    from src.core.models.jeux import StatsJeuxMensuelles
+
+    moteur = create_engine(f"sqlite:///{tmp_path / 'jeux.db'}")
+    tables = [PariSportif, GrilleLoto, GrilleEuromillions, StatsJeuxMensuelles]
+    Base.metadata.create_all(moteur, tables=[m.__table__ for m in tables])
+    requetes: list[str] = []
+    event.listen(moteur, "before_cursor_execute", lambda *a: requetes.append(a[2]))
+
+    alea = random.Random(7)
+    maintenant = datetime.now()
+
+    def _quand():
+        return maintenant - timedelta(days=alea.randrange(420), hours=12)
+
+    session = sessionmaker(bind=moteur)()
+    for _ in range(300):
+        gagne = alea.random() < 0.4
+        session.add(
+            PariSportif(
+                user_id=alea.choice([1, 1, 2]),
+                prediction="1",
+                cote=2.0,
+                mise=alea.choice([5, 10, 20]),
+                gain=alea.choice([10, 25, 40]) if gagne else 0,
+                statut=alea.choice(["gagne" if gagne else "perdu", "en_attente"]),
+                cree_le=_quand(),
+            )
+        )
+    for modele in (GrilleLoto, GrilleEuromillions):
+        for _ in range(80):
+            grille = modele(
+                numero_1=1, numero_2=2, numero_3=3, numero_4=4, numero_5=5,
+                gain=alea.choice([None, 0, 5.5]), date_creation=_quand(),
+            )
+            if modele is GrilleLoto:
+                grille.numero_chance = 1
+            else:
+                grille.etoile_1, grille.etoile_2 = 1, 2
+            session.add(grille)
+    session.commit()
+    session.requetes = requetes
+    yield session
+    session.close()
+    moteur.dispose()
+
+
+def _attendu(session, user_id: int, debut: datetime) -> dict[str, list[float]]:
+    """Référence naïve: chargement de toutes les lignes, somme en Python."""
+    par_mois: dict[str, list[float]] = {}
+
+    def _ajouter(quand, mise, gain):
+        cumul = par_mois.setdefault(f"{quand.year}-{quand.month:02d}", [0, 0.0, 0.0])
+        cumul[0] += 1
+        cumul[1] += float(mise)
+        cumul[2] += float(gain or 0)
+
+    for p in session.query(PariSportif).all():
+        if p.user_id == user_id and p.cree_le >= debut and p.statut in ("gagne", "perdu"):
+            _ajouter(p.cree_le, p.mise, p.gain)
+    for g in session.query(GrilleLoto).all() + session.query(GrilleEuromillions).all():
+        if g.date_creation >= debut:
+            _ajouter(g.date_creation, g.mise, g.gain)
+    return par_mois
+
+
+class TestCumulsMensuels:
+    @pytest.mark.parametrize("resumes", [False, True])
+    def test_evolution_equivalente_au_calcul_ligne_a_ligne(self, base_jeux, resumes):
+        service = StatsPersonnellesService(utiliser_resumes=resumes)
+        if resumes:
+            service.reconstruire_stats_mensuelles(session=base_jeux)
+        base_jeux.requetes.clear()
+
+        evolution = service.obtenir_evolution_mensuelle(user_id=1, mois=12, session=base_jeux)[
+            "evolution"
+        ]
+
+        selects = [r for r in base_jeux.requetes if r.lstrip().startswith("SELECT")]
+        # Un GROUP BY par jeu, ou une seule lecture des cumuls (fenêtre alignée sur le mois)
+        assert len(selects) == (1 if resumes else 3)
+        if not resumes:
+            assert all("GROUP BY" in r for r in selects)
+        maintenant = datetime.now()
+        index = maintenant.year * 12 + maintenant.month - 12
+        attendu = _attendu(base_jeux, 1, datetime(index // 12, index % 12 + 1, 1))
+        assert [m["mois"] for m in evolution] == sorted(attendu)[-12:]
+        for mois in evolution:
+            nb, mises, gains = attendu[mois["mois"]]
+            assert mois["mises"] == pytest.approx(mises)
+            assert mois["gains"] == pytest.approx(gains)
+            assert mois["benefice"] == pytest.approx(gains - mises)
+
+    @pytest.mark.parametrize("resumes", [False, True])
+    def test_roi_periode_glissante(self, base_jeux, resumes):
+        service = StatsPersonnellesService(utiliser_resumes=resumes)
+        if resumes:
+            service.reconstruire_stats_mensuelles(session=base_jeux)
+
+        resultat = service.calculer_roi_global(user_id=1, jours=75, session=base_jeux)
+
+        attendu = _attendu(base_jeux, 1, datetime.now() - timedelta(days=75)).values()
+        assert resultat["mises_totales"] == pytest.approx(sum(c[1] for c in attendu))
+        assert resultat["gains_totaux"] == pytest.approx(sum(c[2] for c in attendu))
+        assert resultat["nb_paris"] + resultat["nb_grilles"] == sum(c[0] for c in attendu)
+
+    def test_reconstruction_une_ligne_par_utilisateur_jeu_mois(self, base_jeux):
+        from src.core.models.jeux import StatsJeuxMensuelles
+
+        service = StatsPersonnellesService()
+        service.reconstruire_stats_mensuelles(session=base_jeux)
+        lignes = base_jeux.query(StatsJeuxMensuelles).all()
+
+        assert {(l.type_jeu, l.user_id) for l in lignes} == {
+            ("paris", 1),
+            ("paris", 2),
+            ("loto", 0),
+            ("euromillions", 0),
+        }
+        assert sum(l.nb for l in lignes if l.type_jeu == "loto") == 80
+        assert len(lignes) == len({(l.user_id, l.type_jeu, l.mois) for l in lignes})
+        # Reconstruire deux fois ne duplique rien
+        assert service.reconstruire_stats_mensuelles(session=base_jeux) == len(lignes)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,189 @@
+"""Tests de la recherche des candidats d'une semaine en une requête (candidats)."""
+
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from src.core.models import EtapeRecette, Planning, Repas
+from src.core.models.recettes import Recette
+from src.services.cuisine.planning.candidats import (
+    Creneau,
+    affecter_candidats,
+    charger_candidats,
+    classe_proteine,
+)
+from src.services.cuisine.planning.types import ParametresEquilibre
+
+LUNDI = date(2026, 4, 13)
+
+
+@pytest.fixture
+def service():
+    from src.services.cuisine.planning import ServicePlanning
+
+    with patch("src.services.cuisine.planning.service.obtenir_client_ia"):
+        return ServicePlanning()
+
+
+def _recette(db, nom: str, **kwargs) -> Recette:
+    valeurs = {
+        "description": f"{nom} maison",
+        "temps_preparation": 15,
+        "temps_cuisson": 20,
+        "portions": 4,
+        "est_equilibre": True,
+        **kwargs,
+    }
+    recette = Recette(nom=nom, **valeurs)
+    db.add(recette)
+    db.flush()
+    return recette
+
+
+@pytest.fixture
+def catalogue(db):
+    recettes = {}
+    for i in range(8):
+        recettes[f"poisson{i}"] = _recette(db, f"Poisson {i}", type_proteines="poisson")
+    for i in range(4):
+        recettes[f"viande{i}"] = _recette(db, f"Boeuf {i}", type_proteines="viande")
+    for i in range(4):
+        recettes[f"vege{i}"] = _recette(db, f"Dal {i}", est_vegetarien=True)
+    for i in range(10):
+        recettes[f"volaille{i}"] = _recette(db, f"Poulet {i}", type_proteines="volaille")
+    recettes["hors_equilibre"] = _recette(db, "Frites", est_equilibre=False)
+    db.commit()
+    return recettes
+
+
+@contextmanager
+def _compter_requetes(db):
+    requetes = []
+    moteur = db.get_bind()
+
+    def _compter(*args):
+        requetes.append(args[2])
+
+    event.listen(moteur, "before_cursor_execute", _compter)
+    try:
+        yield requetes
+    finally:
+        event.remove(moteur, "before_cursor_execute", _compter)
+
+
+class TestCandidats:
+    def test_classe_proteine(self):
+        assert classe_proteine("poisson_blanc") == "poisson"
+        assert classe_proteine("viande_rouge") == "viande"
+        assert classe_proteine("vegetarien") == "vegetarien"
+        assert classe_proteine("volaille") == "equilibre"
+
+    def test_une_requete_pour_toute_la_semaine(self, db, catalogue):
+        types = ["poisson_blanc", "viande_rouge", "vegetarien", "poisson_gras", "volaille"]
+        creneaux = [
+            Creneau(jour, repas, types[(jour + j) % len(types)])
+            for jour in range(7)
+            for j, repas in enumerate(("dejeuner", "diner", "gouter"))
+        ]
+
+        with _compter_requetes(db) as requetes:
+            candidats = charger_candidats(db, creneaux)
+
+        assert len(requetes) == 1
+        assert {r["nom"] for r in candidats["poisson"]} == {f"Poisson {i}" for i in range(8)}
+        assert all(r["nom"].startswith("Boeuf") for r in candidats["viande"])
+        assert "Frites" not in {r["nom"] for r in candidats["equilibre"]}
+        assert "Frites" in {r["nom"] for r in candidats["repli"]}
+
+    def test_quota_par_classe(self, db, catalogue):
+        candidats = charger_candidats(db, [Creneau(0, "diner", "poisson_blanc")], nb_options=3)
+
+        assert [r["nom"] for r in candidats["poisson"]] == ["Poisson 0", "Poisson 1", "Poisson 2"]
+        assert len(candidats["repli"]) == 3
+
+    def test_ingredients_exclus(self, db, catalogue):
+        _recette(db, "Poisson sauce arachide", type_proteines="poisson", description="Arachide")
+        candidats = charger_candidats(
+            db, [Creneau(i, "diner", "poisson_blanc") for i in range(7)], ["arachide"]
+        )
+
+        assert all("arachide" not in r["nom"].lower() for r in candidats["poisson"])
+
+    def test_affectation_diversifiee(self):
+        pool = [{"id": i, "nom": f"R{i}"} for i in range(9)]
+        creneaux = [Creneau(i, "diner", "poisson") for i in range(3)]
+
+        affectation = affecter_candidats(creneaux, {"poisson": pool, "repli": []})
+
+        ids = [[o["id"] for o in options] for options in affectation]
+        assert ids == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+
+    def test_repli_quand_classe_insuffisante(self):
+        affectation = affecter_candidats(
+            [Creneau(0, "diner", "vegetarien")],
+            {"vegetarien": [{"id": 1}], "repli": [{"id": 1}, {"id": 2}, {"id": 3}]},
+        )
+
+        assert [(o["id"], o["repli"]) for o in affectation[0]] == [
+            (1, False),
+            (2, True),
+            (3, True),
+        ]
+
+
+class TestSuggestionsEquilibrees:
+    def test_semaine_en_nombre_constant_de_requetes(self, db, service, catalogue):
+        with _compter_requetes(db) as requetes:
+            semaine = service.suggerer_recettes_equilibrees(
+                semaine_debut=LUNDI, parametres=ParametresEquilibre(), db=db
+            )
+
+        assert len(requetes) == 1
+        assert [jour["jour_index"] for jour in semaine] == list(range(7))
+        assert all(len(jour["suggestions"]) == 3 for jour in semaine)
+        # Lundi poisson blanc, mardi viande rouge (paramètres par défaut)
+        assert semaine[0]["suggestions"][0]["nom"].startswith("Poisson")
+        assert semaine[1]["suggestions"][0]["nom"].startswith("Boeuf")
+        # Les jours « volaille » ne se voient pas proposer les mêmes recettes
+        libres = [j for j in semaine if j["suggestions"][0]["nom"].startswith("Poulet")]
+        premiers = [j["suggestions"][0]["id"] for j in libres]
+        assert len(premiers) == len(set(premiers))
+
+
+class TestStubsSansEtapes:
+    def test_enrichissement_planning_charge_les_stubs_en_une_requete(self, db, service):
+        stub = _recette(db, "Stub")
+        complete = _recette(db, "Complète")
+        dessert = _recette(db, "Dessert stub")
+        db.add(EtapeRecette(recette_id=complete.id, ordre=1, description="Cuire"))
+        planning = Planning(nom="S16", semaine_debut=LUNDI, semaine_fin=LUNDI)
+        db.add(planning)
+        db.flush()
+        for recette in (stub, complete):
+            db.add(
+                Repas(
+                    planning_id=planning.id,
+                    date_repas=LUNDI,
+                    recette_id=recette.id,
+                    dessert_recette_id=dessert.id,
+                )
+            )
+        db.commit()
+        planning_id, attendus = planning.id, [(stub.id, "Stub"), (dessert.id, "Dessert stub")]
+
+        @contextmanager
+        def _contexte():
+            yield db
+
+        with (
+            patch("src.core.db.obtenir_contexte_db", side_effect=_contexte),
+            patch.object(service, "_enrichir_stubs_data") as enrichir,
+            _compter_requetes(db) as requetes,
+        ):
+            service.enrichir_recettes_stub_planning(planning_id)
+
+        assert len(requetes) == 1
+        assert enrichir.call_args.args[0] == attendus
@@ -440,3 +440,51 @@ class TestCombinaisonFeatures:
         assert "4 PORTIONS" in prompt_avec
         assert "4 PORTIONS" not in prompt_sans
         assert "préparation fraîche" in prompt_sans.lower()
+
+
+# ═══════════════════════════════════════════════════════════
+# GABARIT COMPILÉ — préfixe stable, budget de tokens
+# ═══════════════════════════════════════════════════════════
+
+
+class TestGabaritPlanning:
+    """Vérifie que les consignes statiques forment un préfixe identique."""
+
+    def test_prefixe_identique_quelles_que_soient_les_preferences(
+        self, service, mock_db, sept_jours_ia
+    ):
+        """Deux semaines aux préférences différentes partagent le même préfixe."""
+        from src.services.cuisine.planning.prompts import GABARIT_PLANNING
+
+        prompt_a = _capturer_prompt(service, mock_db, sept_jours_ia, {})
+        prompt_b = _capturer_prompt(
+            service,
+            mock_db,
+            sept_jours_ia,
+            {"viande_rouge_max": 3, "jules_present": False, "cuisines_souhaitees": ["Japonais"]},
+        )
+
+        assert prompt_a.startswith(GABARIT_PLANNING.prefixe)
+        assert prompt_b.startswith(GABARIT_PLANNING.prefixe)
+        assert "{viande_rouge_max" not in GABARIT_PLANNING.prefixe
+        assert "CONTEXT:" not in GABARIT_PLANNING.prefixe
+        assert prompt_a.index("QUOTAS PROTÉINES DE LA SEMAINE") > len(GABARIT_PLANNING.prefixe)
+
+    def test_recettes_favorites_tronquees_au_budget(self, service, mock_db, sept_jours_ia):
+        """Une liste de favoris démesurée est tronquée, le contexte est conservé."""
+        from src.core.ai.gabarits import estimer_tokens
+        from src.services.cuisine.planning.prompts import BUDGET_TOKENS_PLANNING
+
+        favorites = [{"nom": f"Recette favorite {i}", "frequence": 2} for i in range(2000)]
+        prompt = _capturer_prompt(
+            service,
+            mock_db,
+            sept_jours_ia,
+            {"recettes_favorites": favorites, "allergies": ["Arachide"]},
+        )
+
+        assert estimer_tokens(prompt) <= BUDGET_TOKENS_PLANNING
+        assert "- Recette favorite 0 (préparé 2 fois)" in prompt
+        assert "Recette favorite 1999" not in prompt
+        assert "Arachide" in prompt
+        assert prompt.endswith("no code blocks.")
@@ -0,0 +1,256 @@
+"""
+Tests de l'import de recettes en lot (import_lot) contre des pages de recettes
+servies localement (HTTP réel sur 127.0.0.1).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.services.cuisine.recettes.import_lot import CacheHTML, ImportateurLot
+from src.services.cuisine.recettes.import_url import RecipeImportService
+from src.services.cuisine.recettes.parsers import GenericRecipeParser, extraire_recette_jsonld
+
+
+def _page_jsonld(nom: str, graphe: bool = False) -> str:
+    recette = {
+        "@type": ["Recipe", "NewsArticle"] if graphe else "Recipe",
+        "name": nom,
+        "image": {"url": f"https://img.example/{nom}.jpg"},
+        "prepTime": "PT15M",
+        "recipeYield": "4",
+        "recipeIngredient": ["200 g de farine", "3 oeufs"],
+        "recipeInstructions": [
+            {"@type": "HowToSection", "itemListElement": [{"text": "Mélanger."}]},
+            {"text": "Cuire 20 min."},
+        ],
+    }
+    donnees = {"@graph": [{"@type": "WebPage"}, recette]} if graphe else recette
+    return (
+        f"<html><head><script type='application/ld+json'>{json.dumps(donnees)}</script>"
+        f"</head><body><h1>{nom}</h1></body></html>"
+    )
+
+
+PAGE_HTML = """
+<html><body>
+  <h1>Gratin dauphinois</h1>
+  <ul class="ingredients"><li>1 kg de pommes de terre</li><li>50 cl de crème</li></ul>
+  <div class="steps"><li>Éplucher et émincer les pommes de terre.</li>
+  <li>Enfourner 1h à 160°C dans un plat beurré.</li></div>
+</body></html>
+"""
+
+
+class ServeurRecettes:
+    """Pages de recettes locales: ETag, 304 et suivi de la concurrence par hôte."""
+
+    def __init__(self, pages: dict[str, str], latence: float = 0.0):
+        self.pages = pages
+        self.latence = latence
+        self.requetes: Counter[str] = Counter()
+        self.revalidations = 0
+        self.en_vol: Counter[str] = Counter()
+        self.max_en_vol: Counter[str] = Counter()
+        self.max_total = 0
+        self._verrou = threading.Lock()
+        serveur = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                hote = self.headers.get("Host", "").split(":")[0]
+                with serveur._verrou:
+                    serveur.requetes[self.path] += 1
+                    serveur.en_vol[hote] += 1
+                    serveur.max_en_vol[hote] = max(serveur.max_en_vol[hote], serveur.en_vol[hote])
+                    serveur.max_total = max(serveur.max_total, sum(serveur.en_vol.values()))
+                try:
+                    time.sleep(serveur.latence)
+                    page = serveur.pages.get(self.path)
+                    if page is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    etag = f'"{abs(hash(page))}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        serveur.revalidations += 1
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    corps = page.encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(corps)))
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    self.wfile.write(corps)
+                finally:
+                    with serveur._verrou:
+                        serveur.en_vol[hote] -= 1
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        self.port = self._httpd.server_port
+
+    def url(self, chemin: str, hote: str = "127.0.0.1") -> str:
+        return f"http://{hote}:{self.port}{chemin}"
+
+    def arreter(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def service():
+    with patch(
+        "src.services.cuisine.recettes.import_url.obtenir_client_ia", side_effect=RuntimeError
+    ):
+        return RecipeImportService()
+
+
+@pytest.fixture
+def pages():
+    pages = {f"/recette/{i}": _page_jsonld(f"Recette {i}", graphe=i % 2 == 0) for i in range(8)}
+    pages["/gratin"] = PAGE_HTML
+    return pages
+
+
+def _importer(importateur, urls, **kwargs):
+    return asyncio.run(importateur.importer(urls, **kwargs))
+
+
+class TestExtractionJsonLd:
+    def test_graphe_et_sections(self):
+        recette = extraire_recette_jsonld(_page_jsonld("Clafoutis", graphe=True), "https://a.fr/c")
+
+        assert recette.nom == "Clafoutis"
+        assert recette.source_site == "a.fr"
+        assert recette.image_url == "https://img.example/Clafoutis.jpg"
+        assert recette.etapes == ["Mélanger.", "Cuire 20 min."]
+        assert [i.nom for i in recette.ingredients] == ["Farine", "Oeufs"]
+
+    def test_sans_jsonld_repli_dom(self, service):
+        assert extraire_recette_jsonld(PAGE_HTML, "https://a.fr/g") is None
+
+        with patch.object(GenericRecipeParser, "parse", wraps=GenericRecipeParser.parse) as parse:
+            resultat = service._analyser_page(PAGE_HTML, "https://a.fr/g", use_ai_fallback=False)
+
+        parse.assert_called_once()
+        assert resultat.recipe.nom == "Gratin dauphinois"
+        assert len(resultat.recipe.ingredients) == 2
+
+    def test_jsonld_sans_dom(self, service):
+        with patch("src.services.cuisine.recettes.import_url.construire_soupe") as soupe:
+            resultat = service._analyser_page(_page_jsonld("Tarte"), "https://a.fr/t")
+
+        soupe.assert_not_called()
+        assert resultat.success
+        assert resultat.recipe.confiance_score == 0.9
+
+
+class TestCacheHTML:
+    def test_contenu_dedoublonne(self, tmp_path):
+        cache = CacheHTML(tmp_path)
+        cache.enregistrer("https://a.fr/1", "<html>même page</html>", etag='"v1"')
+        cache.enregistrer("https://a.fr/1?utm_source=x", "<html>même page</html>")
+
+        assert len(list((tmp_path / "objets").rglob("*.html"))) == 1
+        entree = cache.lire("https://a.fr/1")
+        assert entree.corps == "<html>même page</html>"
+        assert CacheHTML.entetes_conditionnels(entree) == {"If-None-Match": '"v1"'}
+        assert cache.lire("https://a.fr/inconnue") is None
+
+
+class TestImportateurLot:
+    def test_concurrence_bornee_par_hote(self, service, pages, tmp_path):
+        serveur = ServeurRecettes(pages, latence=0.05)
+        try:
+            urls = [
+                serveur.url(f"/recette/{i}", hote="127.0.0.1" if i < 4 else "localhost")
+                for i in range(8)
+            ]
+            importateur = ImportateurLot(
+                service, CacheHTML(tmp_path), concurrence=3, par_hote=2, intervalle_hote=0
+            )
+            resultats = _importer(importateur, urls + [urls[0]])
+        finally:
+            serveur.arreter()
+
+        assert [r.recipe.nom for r in resultats] == [f"Recette {i}" for i in range(8)] + [
+            "Recette 0"
+        ]
+        assert serveur.max_en_vol["127.0.0.1"] <= 2
+        assert serveur.max_en_vol["localhost"] <= 2
+        assert 1 < serveur.max_total <= 3
+        # URL en double: téléchargée une seule fois
+        assert serveur.requetes["/recette/0"] == 1
+        assert importateur.metriques.reussis == 8
+
+    def test_intervalle_par_hote(self, service, pages):
+        serveur = ServeurRecettes(pages)
+        try:
+            urls = [serveur.url(f"/recette/{i}") for i in range(3)]
+            importateur = ImportateurLot(service, concurrence=3, intervalle_hote=0.1)
+            debut = time.monotonic()
+            _importer(importateur, urls)
+        finally:
+            serveur.arreter()
+
+        # Première requête immédiate, puis une toutes les 100 ms
+        assert time.monotonic() - debut >= 0.19
+
+    def test_cache_frais_puis_revalidation(self, service, pages, tmp_path):
+        serveur = ServeurRecettes(pages)
+        try:
+            urls = [serveur.url("/recette/1"), serveur.url("/gratin")]
+            cache = CacheHTML(tmp_path)
+            _importer(ImportateurLot(service, cache, intervalle_hote=0), urls)
+
+            frais = ImportateurLot(service, cache, intervalle_hote=0)
+            _importer(frais, urls)
+
+            cache.ttl_frais = 0
+            revalidation = ImportateurLot(service, cache, intervalle_hote=0)
+            resultats = _importer(revalidation, urls, use_ai_fallback=False)
+        finally:
+            serveur.arreter()
+
+        assert (frais.metriques.requetes, frais.metriques.depuis_cache) == (0, 2)
+        assert revalidation.metriques.revalides == 2
+        assert serveur.revalidations == 2
+        assert [r.recipe.nom for r in resultats] == ["Recette 1", "Gratin dauphinois"]
+
+    def test_erreurs_isolees(self, service, pages):
+        serveur = ServeurRecettes(pages)
+        try:
+            resultats = _importer(
+                ImportateurLot(service, intervalle_hote=0),
+                [serveur.url("/recette/1"), serveur.url("/absente"), "ftp://a.fr/x"],
+            )
+        finally:
+            serveur.arreter()
+
+        assert [r.success for r in resultats] == [True, False, False]
+        assert resultats[1].message == "Erreur HTTP 404"
+
+    def test_import_batch(self, service, pages, tmp_path):
+        serveur = ServeurRecettes(pages)
+        service.cache_html = CacheHTML(tmp_path)
+        try:
+            resultats = service.import_batch(
+                [serveur.url("/recette/1"), serveur.url("/recette/2", hote="localhost")]
+            )
+        finally:
+            serveur.arreter()
+
+        assert all(r.success for r in resultats)
@@ -1,10 +1,11 @@
 """Tests pour src/services/recettes/import_url.py"""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from bs4 import BeautifulSoup
 
+from src.services.cuisine.recettes.import_lot import ImportateurLot
 from src.services.cuisine.recettes.import_url import (
     CuisineAZParser,
     GenericRecipeParser,
@@ -549,9 +550,9 @@ class TestRecipeImportService:
         """Test import en lot."""
         service = RecipeImportService()
 
-        # Mock import_from_url
-        with patch.object(service, "import_from_url") as mock_import:
-            mock_import.return_value = ImportResult(success=True, message="OK")
+        # Mock de l'import concurrent
+        with patch.object(ImportateurLot, "importer", new_callable=AsyncMock) as mock_import:
+            mock_import.return_value = [ImportResult(success=True, message="OK")] * 2
 
             results = service.import_batch(
                 [
@@ -884,9 +885,9 @@ class TestRecipeImportServiceAdditional:
     def test_import_batch_mixed_results(self):
         """Test import lot avec rÃ©sultats mixtes."""
         service = RecipeImportService()
-        with patch.object(service, "import_from_url") as mock_import:
+        with patch.object(ImportateurLot, "importer", new_callable=AsyncMock) as mock_import:
             # Premier succÃ¨s, deuxiÃ¨me Ã©chec
-            mock_import.side_effect = [
+            mock_import.return_value = [
                 ImportResult(success=True, message="OK"),
                 ImportResult(success=False, message="Erreur"),
             ]
@@ -0,0 +1,152 @@
+"""Tests du registre des modèles ML (ml_registre) et de l'inférence par lot."""
+
+import pickle
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.services.cuisine.suggestions.ml_anomalies import DetecteurAnomaliesDepenses
+from src.services.cuisine.suggestions.ml_consommation import ModeleConsommationML
+from src.services.cuisine.suggestions.ml_registre import (
+    EncodeurHachage,
+    RegistreModeles,
+    hachage_stable,
+)
+from src.services.cuisine.suggestions.ml_satisfaction import ScoreSatisfactionRepas
+
+pytest.importorskip("sklearn")
+
+
+@pytest.fixture
+def registre(tmp_path):
+    return RegistreModeles(tmp_path, intervalle_verification=0)
+
+
+def _historique_repas(n: int = 40) -> list[dict]:
+    debut = datetime(2026, 1, 5)
+    return [
+        {
+            "nom": f"Recette {i}",
+            "note": (i % 5) + (1 if i % 7 == 0 else 0) * 0.5,
+            "nb_ingredients": 3 + i % 10,
+            "temps_preparation": 10 + (i * 7) % 60,
+            "temps_cuisson": (i * 13) % 90,
+            "categorie": ["Rapide", "Plat", "Dessert"][i % 3],
+            "date": (debut + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "nb_personnes": 2 + i % 3,
+        }
+        for i in range(n)
+    ]
+
+
+def _historique_achats(n: int = 60) -> list[dict]:
+    debut = datetime(2026, 1, 1)
+    return [
+        {
+            "date": (debut + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "article": ["Tomates", "Lait", "Pain"][i % 3],
+            "quantite": 1 + (i % 4),
+        }
+        for i in range(n)
+    ]
+
+
+class TestEncodage:
+    def test_hachage_stable(self):
+        assert hachage_stable("tomates") == zlib.crc32(b"tomates") % 1000
+
+    def test_encodeur_independant_de_l_ordre(self):
+        encodeur = EncodeurHachage(dimension=16)
+        a = encodeur.transformer([{"categorie": "Plat", "saison": "hiver", "portions": 4}])
+        b = encodeur.transformer([{"portions": 4, "saison": "HIVER ", "categorie": "plat"}])
+
+        assert a.shape == (1, 16)
+        np.testing.assert_array_equal(a, b)
+        assert np.count_nonzero(a) >= 2
+
+
+class TestRegistre:
+    def test_modele_partage_entre_instances(self, registre):
+        scorer = ScoreSatisfactionRepas(registre=registre)
+        assert scorer.entrainer(_historique_repas())["trained"]
+
+        autre = ScoreSatisfactionRepas(registre=registre)
+
+        assert autre._modele is scorer._modele
+        assert registre.chemin("satisfaction").exists()
+
+    def test_hot_swap_apres_republication(self, registre, tmp_path):
+        scorer = ScoreSatisfactionRepas(registre=registre)
+        scorer.entrainer(_historique_repas())
+        generation = scorer._generation
+
+        # Un autre processus (autre registre) republie le modèle
+        ScoreSatisfactionRepas(registre=RegistreModeles(tmp_path)).entrainer(_historique_repas(50))
+        scorer.predire({"nom": "X"})
+
+        assert scorer._generation != generation
+
+    def test_format_obsolete_ignore(self, registre):
+        # Ancien fichier pickle sans format: features incompatibles pour la v2
+        with open(registre.chemin("satisfaction"), "wb") as f:
+            pickle.dump({"modele": object(), "scaler": object(), "categories": []}, f)
+
+        scorer = ScoreSatisfactionRepas(registre=registre)
+
+        assert scorer._modele is None
+        assert scorer.predire({"nom": "X"}).score_predit == 3.0
+
+    def test_ancien_pickle_compatible_charge(self, registre):
+        detecteur = DetecteurAnomaliesDepenses(registre=registre)
+        depenses = [
+            {"montant": 20 + i % 5, "date": f"2026-01-{1 + i % 28:02d}", "categorie": "Courses"}
+            for i in range(30)
+        ]
+        assert detecteur.entrainer(depenses)["trained"]
+        with open(registre.chemin("anomalies"), "wb") as f:
+            pickle.dump(
+                {
+                    "modele": detecteur._modele,
+                    "scaler": detecteur._scaler,
+                    "categories": detecteur._categories,
+                },
+                f,
+            )
+        registre.oublier()
+
+        assert DetecteurAnomaliesDepenses(registre=registre)._modele is not None
+
+
+class TestPredictionParLot:
+    def test_satisfaction_lot_equivaut_aux_appels_unitaires(self, registre):
+        scorer = ScoreSatisfactionRepas(registre=registre)
+        scorer.entrainer(_historique_repas())
+        semaine = _historique_repas(14)
+        appels = []
+        predict = scorer._modele.predict
+        scorer._modele.predict = lambda X: appels.append(len(X)) or predict(X)
+
+        lot = scorer.predire_lot(semaine)
+        unitaires = [scorer.predire(r) for r in semaine]
+
+        assert appels[0] == 14
+        assert [s.score_predit for s in lot] == [s.score_predit for s in unitaires]
+        assert [s.recette for s in lot] == [r["nom"] for r in semaine]
+
+    def test_consommation_lot(self, registre):
+        modele = ModeleConsommationML(registre=registre)
+        assert modele.entrainer(_historique_achats())["trained"]
+        depart = datetime(2026, 3, 2)
+
+        lot = modele.predire_lot(["Tomates", "Lait", "Inconnu"], 7, depart)
+
+        assert [p.article for p in lot] == ["Tomates", "Lait", "Inconnu"]
+        assert lot[0] == modele.predire("Tomates", 7, depart)
+        assert lot[2].confiance < lot[0].confiance
+
+    def test_fallback_sans_modele(self, registre):
+        lot = ModeleConsommationML(registre=registre).predire_lot(["Lait", "Pain"])
+
+        assert [p.methode for p in lot] == ["statistique", "statistique"]
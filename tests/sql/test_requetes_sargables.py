@@ -0,0 +1,71 @@
+"""
+Analyse statique: aucun ``extract()`` comparé dans un filtre de requête.
+
+``extract("month", col) == m`` empêche l'usage de l'index sur ``col``; les
+périodes passent par ``src.core.db.periodes`` (filtre_mois, filtre_annee,
+filtre_meme_jour...). ``extract()`` reste permis en SELECT / GROUP BY.
+Un cas délibéré se marque d'un commentaire ``# sargable: ok`` sur la ligne.
+"""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parents[2]
+MARQUEUR = "# sargable: ok"
+
+
+def _est_extract(noeud: ast.AST) -> bool:
+    """``extract(...)``, ``func.extract(...)`` ou ``sa.extract(...)``."""
+    if not isinstance(noeud, ast.Call):
+        return False
+    fonction = noeud.func
+    if isinstance(fonction, ast.Name):
+        return fonction.id == "extract"
+    return (
+        isinstance(fonction, ast.Attribute)
+        and fonction.attr == "extract"
+        and isinstance(fonction.value, ast.Name)
+        and fonction.value.id in {"func", "sa", "sqlalchemy"}
+    )
+
+
+def _comparaisons_extract(source: str) -> list[tuple[int, str]]:
+    """(ligne, expression) des comparaisons dont un membre est un extract()."""
+    lignes = source.splitlines()
+    resultats = []
+    for noeud in ast.walk(ast.parse(source)):
+        if not isinstance(noeud, ast.Compare):
+            continue
+        if not any(_est_extract(membre) for membre in (noeud.left, *noeud.comparators)):
+            continue
+        if MARQUEUR in lignes[noeud.lineno - 1]:
+            continue
+        resultats.append((noeud.lineno, ast.unparse(noeud)))
+    return resultats
+
+
+def test_detecte_les_predicats_non_indexables():
+    source = (
+        "q.filter(func.extract('month', T.date) == m, T.actif)\n"
+        "q.filter(extract('year', T.date) >= a)\n"
+        "q.group_by(extract('dow', T.date))\n"
+        "q.filter(extract('day', T.date) == 1)  # sargable: ok\n"
+    )
+
+    assert [ligne for ligne, _ in _comparaisons_extract(source)] == [1, 2]
+
+
+def test_aucun_extract_dans_les_filtres():
+    violations = []
+    for chemin in sorted((RACINE / "src").rglob("*.py")):
+        # Certains fichiers n'utilisent que CR comme fin de ligne
+        source = chemin.read_bytes().decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        for ligne, expression in _comparaisons_extract(source):
+            violations.append(f"{chemin.relative_to(RACINE)}:{ligne}: {expression}")
+
+    assert not violations, (
+        "Prédicats extract() non indexables (utiliser src.core.db.periodes):\n"
+        + "\n".join(violations)
+    )